@@ -64,6 +64,9 @@ LOG_PRIVACY_BANNER_MIN_VISIBLE_SECONDS = 5.0
 LOG_PRIVACY_BANNER_POLL_INTERVAL_MS = 200
 CLAMD_SIZE_LIMIT_MIGRATION_KEY = "clamd_size_limit_unit_migration_done"
 
+# Coalesce settings writes from preference toggles; flushed on shutdown
+SETTINGS_WRITE_DELAY_SECONDS = 0.5
+
 
 class ClamUIApp(Adw.Application):
     """
@@ -103,7 +106,7 @@ class ClamUIApp(Adw.Application):
         self._version = __version__
 
         # Settings and notification management
-        self._settings_manager = SettingsManager()
+        self._settings_manager = SettingsManager(write_delay=SETTINGS_WRITE_DELAY_SECONDS)
         self._notification_manager = NotificationManager(self._settings_manager)
 
         # Profile management
@@ -149,6 +152,9 @@ class ClamUIApp(Adw.Application):
         # Device monitor (initialized in do_startup)
         self._device_monitor = None
 
+        # In-app scheduled scan timer (started in do_startup when enabled)
+        self._resident_scheduler = None
+
         # Scan state tracking
         self._is_scan_active = False
 
@@ -490,6 +496,7 @@ class ClamUIApp(Adw.Application):
 
         self._lifecycle_manager.ensure_clamav_database_dir()
         self._lifecycle_manager.setup_device_monitor()
+        self._lifecycle_manager.setup_resident_scheduler()
 
         if self._tray_indicator is None:
             self._setup_tray_indicator()
@@ -967,9 +974,15 @@ class ClamUIApp(Adw.Application):
         def scan_thread():
             try:
                 from .core.virustotal import VirusTotalClient
+                from .core.virustotal_cache import create_verdict_cache
 
-                vt_client = VirusTotalClient(api_key)
-                result = vt_client.scan_file_sync(file_path)
+                vt_client = VirusTotalClient(
+                    api_key, cache=create_verdict_cache(self._settings_manager)
+                )
+                try:
+                    result = vt_client.scan_file_sync(file_path)
+                finally:
+                    vt_client.close()
                 GLib.idle_add(on_scan_complete, result)
             except Exception as e:
                 logger.error(f"VirusTotal scan failed: {e}")
@@ -9,7 +9,10 @@ sequences, including resource initialization and cleanup.
 import logging
 from pathlib import Path
 
+from .cli.scheduled_scan import ResidentScanRunner
 from .core.device_monitor import DeviceMonitor
+from .core.resident_scheduler import SCHEDULE_SETTING_KEYS, ResidentScheduler
+from .core.scanner import Scanner
 
 logger = logging.getLogger(__name__)
 
@@ -49,9 +52,15 @@ class AppLifecycleManager:
     def setup_device_monitor(self) -> None:
         """Initialize the device monitor for auto-scanning on file changes."""
         try:
+            scanner = Scanner(
+                log_manager=self._app.log_manager,
+                settings_manager=self._app.settings_manager,
+            )
             self._app._device_monitor = DeviceMonitor(
                 self._app.settings_manager,
-                self._app.quarantine_manager,
+                scanner,
+                notification_callback=self._app._on_device_scan_event,
+                quarantine_manager=self._app.quarantine_manager,
             )
             logger.info("Device monitor initialized")
         except Exception as e:
@@ -68,6 +77,48 @@ class AppLifecycleManager:
             except Exception as e:
                 logger.warning(f"Error stopping device monitor: {e}")
 
+    def setup_resident_scheduler(self) -> None:
+        """Run scheduled scans from the app while "schedule_resident" is enabled."""
+        settings = self._app.settings_manager
+        settings.add_listener("schedule_resident", self._on_resident_setting_changed)
+        settings.add_change_listener(self._on_schedule_settings_changed)
+        if settings.get("schedule_resident", False):
+            self.start_resident_scheduler()
+
+    def start_resident_scheduler(self) -> None:
+        """Start the in-app scheduled scan timer."""
+        if self._app._resident_scheduler is not None:
+            return
+        try:
+            runner = ResidentScanRunner(
+                self._app.settings_manager, log_manager=self._app.log_manager
+            )
+            resident = ResidentScheduler(
+                self._app.settings_manager, runner.run, cancel_scan=runner.cancel
+            )
+            if resident.start():
+                self._app._resident_scheduler = resident
+        except Exception as e:
+            logger.error(f"Failed to start resident scheduler: {e}")
+
+    def stop_resident_scheduler(self) -> None:
+        """Stop the in-app scheduled scan timer; the system timer takes over."""
+        resident = self._app._resident_scheduler
+        if resident is not None:
+            self._app._resident_scheduler = None
+            resident.stop()
+
+    def _on_resident_setting_changed(self, enabled) -> None:
+        if enabled:
+            self.start_resident_scheduler()
+        else:
+            self.stop_resident_scheduler()
+
+    def _on_schedule_settings_changed(self, keys: frozenset[str]) -> None:
+        resident = self._app._resident_scheduler
+        if resident is not None and keys & set(SCHEDULE_SETTING_KEYS):
+            resident.wake()
+
     def preinit_heavy_resources(self) -> None:
         """Pre-initialize heavy resources in the background."""
         self._app._preinit_quarantine_async()
@@ -86,10 +137,12 @@ class AppLifecycleManager:
         """Perform application shutdown cleanup."""
         cleanup_tasks = [
             ("device_monitor", self._cleanup_device_monitor),
+            ("resident_scheduler", self.stop_resident_scheduler),
             ("scan", self._cleanup_scan),
             ("tray", self._cleanup_tray),
             ("vt_client", self._cleanup_vt_client),
             ("quarantine", self._cleanup_quarantine),
+            ("settings", self._flush_settings),
         ]
 
         for task_name, cleanup_func in cleanup_tasks:
@@ -113,6 +166,8 @@ class AppLifecycleManager:
                 self._app._scan_view._scanner.cancel()
             except Exception as e:
                 logger.warning(f"Error cancelling scan: {e}")
+        if self._app._scan_view is not None:
+            self._app._scan_view.cleanup()
 
     def _cleanup_tray(self) -> None:
         """Cleanup tray indicator resources."""
@@ -134,3 +189,8 @@ class AppLifecycleManager:
                 self._app._quarantine_manager.close()
             except Exception as e:
                 logger.warning(f"Error closing quarantine manager: {e}")
+
+    def _flush_settings(self) -> None:
+        """Write settings changes still waiting for the write delay."""
+        if self._app._settings_manager is not None:
+            self._app._settings_manager.flush()
@@ -0,0 +1,208 @@
+# ClamUI Audit Command
+"""
+CLI command for running the Tier 1 security audit headlessly.
+
+Runs the same checks as the Security Audit view (ClamAV health, firewall,
+access control, automatic updates, intrusion detection, SSH, Portmaster)
+concurrently and prints each section as it completes. Like the view, it reuses
+cached sections whose inputs are unchanged and reports what changed since the
+previous audit.
+
+Usage:
+    clamui audit
+    clamui audit --json
+    clamui audit --force --timeout 60
+"""
+
+import argparse
+import time
+
+from ..core.audit_cache import AuditChange, run_incremental_audit
+from ..core.i18n import _
+from ..core.system_audit import (
+    AUDIT_CHECK_TIMEOUT,
+    AuditReport,
+    AuditSectionResult,
+    AuditStatus,
+)
+from .output import print_json
+
+# Text markers per status, kept ASCII so output survives any terminal/pipe
+_STATUS_MARKERS = {
+    AuditStatus.PASS: "[ OK ]",
+    AuditStatus.WARNING: "[WARN]",
+    AuditStatus.FAIL: "[FAIL]",
+    AuditStatus.UNKNOWN: "[ ?? ]",
+    AuditStatus.SKIPPED: "[SKIP]",
+    AuditStatus.CHECKING: "[ .. ]",
+}
+
+
+def positive_float(value: str) -> float:
+    """Argparse type for a strictly positive number of seconds."""
+    try:
+        parsed = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(_("--timeout must be a positive number")) from None
+    if parsed <= 0:
+        raise argparse.ArgumentTypeError(_("--timeout must be a positive number"))
+    return parsed
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    """Register the audit subcommand with the CLI router."""
+    parser = subparsers.add_parser(
+        "audit",
+        help=_("Run the system security audit"),
+        description=_(
+            "Check ClamAV health, firewall, access control, automatic updates, "
+            "intrusion detection and SSH settings.\n\n"
+            "Exit codes: 0 = no failures, 1 = at least one check failed."
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help=_("Output as JSON"),
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=_("Re-run every check instead of reusing unchanged cached results"),
+    )
+    parser.add_argument(
+        "--timeout",
+        type=positive_float,
+        default=AUDIT_CHECK_TIMEOUT,
+        metavar="SECONDS",
+        help=_("Deadline for each check (default: {seconds:.0f})").format(
+            seconds=AUDIT_CHECK_TIMEOUT
+        ),
+    )
+    parser.set_defaults(func=run)
+
+
+def section_to_dict(section: AuditSectionResult) -> dict:
+    """
+    Convert an audit section to a JSON-serializable dict.
+
+    Args:
+        section: Completed audit section.
+
+    Returns:
+        Dict with category, title, status and the individual checks.
+    """
+    return {
+        "category": section.category.value,
+        "title": section.title,
+        "status": section.overall_status.value,
+        "checks": [
+            {
+                "name": check.name,
+                "status": check.status.value,
+                "detail": check.detail,
+                "recommendation": check.recommendation,
+                "install_command": check.install_command,
+                "info_url": check.info_url,
+            }
+            for check in section.checks
+        ],
+    }
+
+
+def change_to_dict(change: AuditChange) -> dict:
+    """Convert an audit change to a JSON-serializable dict."""
+    return {
+        "category": change.category.value,
+        "name": change.name,
+        "old_status": change.old_status.value if change.old_status else None,
+        "new_status": change.new_status.value if change.new_status else None,
+    }
+
+
+def report_to_dict(
+    report: AuditReport,
+    duration: float,
+    changes: list[AuditChange] | None = None,
+    cached: list | None = None,
+) -> dict:
+    """
+    Convert an audit report to a JSON-serializable dict.
+
+    Args:
+        report: Completed audit report.
+        duration: Wall-clock seconds the audit took.
+        changes: Differences against the previous audit.
+        cached: Categories served from the audit cache.
+
+    Returns:
+        Dict with timestamp, duration, per-status summary, sections, changes
+        and cached categories.
+    """
+    return {
+        "timestamp": report.timestamp,
+        "duration": round(duration, 3),
+        "summary": {status.value: count for status, count in report.summary.items()},
+        "sections": [section_to_dict(section) for section in report.sections],
+        "changes": [change_to_dict(change) for change in changes or []],
+        "cached": [category.value for category in cached or []],
+    }
+
+
+def _print_change(change: AuditChange) -> None:
+    """Print one change against the previous audit as text."""
+    old = change.old_status.value if change.old_status else _("new")
+    new = change.new_status.value if change.new_status else _("removed")
+    print(f"    {change.name}: {old} -> {new}")
+
+
+def _print_section(section: AuditSectionResult) -> None:
+    """Print one section and its checks as text."""
+    print(f"{_STATUS_MARKERS[section.overall_status]} {section.title}")
+    for check in section.checks:
+        print(f"    {_STATUS_MARKERS[check.status]} {check.name}: {check.detail}")
+        if check.recommendation and check.status in (AuditStatus.WARNING, AuditStatus.FAIL):
+            print(_("           Recommendation: {text}").format(text=check.recommendation))
+        if check.install_command and check.status in (AuditStatus.WARNING, AuditStatus.FAIL):
+            print(f"           $ {check.install_command}")
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run the Tier 1 security audit.
+
+    Args:
+        args: Parsed CLI arguments (expects json_output and timeout).
+
+    Returns:
+        Exit code: 0 = no failing section, 1 = at least one section failed.
+    """
+    start = time.monotonic()
+    # Text output streams sections in completion order; JSON waits for all
+    on_result = None if args.json_output else _print_section
+    result = run_incremental_audit(
+        force=args.force, check_timeout=args.timeout, on_result=on_result
+    )
+    report = result.report
+    duration = time.monotonic() - start
+
+    if args.json_output:
+        print_json(report_to_dict(report, duration, result.changes, result.cached))
+    else:
+        if result.changes:
+            print(_("\nChanges since last audit:"))
+            for change in result.changes:
+                _print_change(change)
+        summary = report.summary
+        print(
+            _("\n{passed} passed, {warnings} warnings, {failed} failed ({seconds:.1f}s)").format(
+                passed=summary.get(AuditStatus.PASS, 0),
+                warnings=summary.get(AuditStatus.WARNING, 0),
+                failed=summary.get(AuditStatus.FAIL, 0),
+                seconds=duration,
+            )
+        )
+
+    return 1 if report.summary.get(AuditStatus.FAIL, 0) else 0
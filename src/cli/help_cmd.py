@@ -61,6 +61,22 @@ _COMMANDS: dict[str, dict[str, str | list[str]]] = {
             "clamui history --type scan --json",
         ],
     },
+    "audit": {
+        "summary": N_("Run the system security audit"),
+        "examples": [
+            "clamui audit",
+            "clamui audit --json",
+            "clamui audit --timeout 60",
+        ],
+    },
+    "update": {
+        "summary": N_("Update the ClamAV signature databases"),
+        "examples": [
+            "clamui update",
+            "clamui update --force",
+            "clamui update --rollback",
+        ],
+    },
     "install-privileged-helper": {
         "summary": N_(
             "Install the polkit helper for saving system ClamAV configs (native host only)"
@@ -2,7 +2,8 @@
 """
 Subcommand router for the ClamUI command-line interface.
 
-Dispatches CLI subcommands (scan, quarantine, profile, status, history)
+Dispatches CLI subcommands (scan, quarantine, profile, status, history, audit,
+update)
 to their respective handler modules. This module is only imported when
 a CLI subcommand is detected, avoiding GTK initialization overhead.
 
@@ -12,6 +13,8 @@ Usage:
     clamui profile list
     clamui status
     clamui history
+    clamui audit --json
+    clamui update --rollback
 """
 
 import argparse
@@ -27,6 +30,8 @@ CLI_SUBCOMMANDS = frozenset(
         "profile",
         "status",
         "history",
+        "audit",
+        "update",
         "help",
         "install-privileged-helper",
     }
@@ -60,6 +65,7 @@ def cli_main() -> int:
     )
 
     # Register all subcommands (lazy imports to avoid unnecessary loading)
+    from .audit_cmd import register as register_audit
     from .help_cmd import register as register_help
     from .history_cmd import register as register_history
     from .install_helper import register as register_install_helper
@@ -67,12 +73,15 @@ def cli_main() -> int:
     from .quarantine_cmd import register as register_quarantine
     from .scan_cmd import register as register_scan
     from .status_cmd import register as register_status
+    from .update_cmd import register as register_update
 
     register_scan(subparsers)
     register_quarantine(subparsers)
     register_profile(subparsers)
     register_status(subparsers)
     register_history(subparsers)
+    register_audit(subparsers)
+    register_update(subparsers)
     register_help(subparsers)
     register_install_helper(subparsers)
 
@@ -10,19 +10,24 @@ Usage:
     clamui scan /path/to/file
     clamui scan /home/user/Downloads --profile "Quick Scan"
     clamui scan /tmp --quarantine --json
+    clamui scan ~/Downloads --trace scan-trace.json
 """
 
 import argparse
+import json
 import time
 from pathlib import Path
 
 from ..core.i18n import _
 from ..core.log_manager import LogManager
 from ..core.quarantine import QuarantineManager
+from ..core.resource_governor import ResourcePolicy, resolve_policy
 from ..core.sanitize import sanitize_log_line
+from ..core.scan_timing import ScanTiming, build_chrome_trace
 from ..core.scanner import Scanner
 from ..core.scanner_types import ScanStatus
 from ..core.settings_manager import SettingsManager
+from ..profiles.models import ScanProfile
 from ..profiles.profile_manager import ProfileManager
 from .output import get_config_dir, print_error, print_info, print_json
 
@@ -54,7 +59,7 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         "--profile",
         "-p",
         metavar="NAME",
-        help=_("Use a named scan profile for exclusions"),
+        help=_("Use a named scan profile for exclusions and resource limits"),
     )
     parser.add_argument(
         "--quarantine",
@@ -68,6 +73,11 @@ def register(subparsers: argparse._SubParsersAction) -> None:
         dest="json_output",
         help=_("Output results as JSON"),
     )
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        help=_("Write per-phase scan timing as Chrome trace JSON to FILE"),
+    )
     parser.add_argument(
         "--verbose",
         "-v",
@@ -97,16 +107,16 @@ def _validate_paths(paths: list[str]) -> list[str]:
     return valid
 
 
-def _resolve_profile_exclusions(profile_name: str, verbose: bool) -> dict | None:
+def _resolve_profile(profile_name: str, verbose: bool) -> ScanProfile | None:
     """
-    Look up a scan profile by name and return its exclusions.
+    Look up a scan profile by name.
 
     Args:
         profile_name: Name of the scan profile.
         verbose: Whether to log info messages.
 
     Returns:
-        Exclusions dict from the profile, or None on failure.
+        The profile, or None on failure.
     """
     pm = ProfileManager(get_config_dir())
     profile = pm.get_profile_by_name(profile_name)
@@ -115,7 +125,7 @@ def _resolve_profile_exclusions(profile_name: str, verbose: bool) -> dict | None
         return None
     if verbose:
         print_info(_("Using profile: {name}").format(name=profile.name))
-    return profile.exclusions
+    return profile
 
 
 def _execute_scans(
@@ -124,6 +134,7 @@ def _execute_scans(
     recursive: bool,
     exclusions: dict | None,
     verbose: bool,
+    resource_policy: ResourcePolicy | None = None,
 ) -> tuple[list, float]:
     """
     Run scans on all validated paths.
@@ -134,6 +145,7 @@ def _execute_scans(
         recursive: Whether to recurse into directories.
         exclusions: Profile exclusion dict, or None.
         verbose: Whether to log progress.
+        resource_policy: CPU/I/O/memory limits for the scans, or None.
 
     Returns:
         Tuple of (list of ScanResult, duration in seconds).
@@ -143,7 +155,12 @@ def _execute_scans(
     for path in paths:
         if verbose:
             print_info(_("Scanning: {path}").format(path=path))
-        result = scanner.scan_sync(path, recursive=recursive, profile_exclusions=exclusions)
+        result = scanner.scan_sync(
+            path,
+            recursive=recursive,
+            profile_exclusions=exclusions,
+            resource_policy=resource_policy,
+        )
         results.append(result)
     return results, time.monotonic() - start
 
@@ -210,9 +227,35 @@ def _format_json_output(
     if errors:
         output["errors"] = errors
 
+    timings = [
+        {"target": r.path, **r.timing.to_dict()}
+        for r in results
+        if isinstance(r.timing, ScanTiming)
+    ]
+    if timings:
+        output["timings"] = timings
+
     return output
 
 
+def _write_trace(results: list, trace_path: str) -> None:
+    """
+    Write the scans' phase timings as a Chrome trace file.
+
+    A write failure is reported on stderr but does not change the exit code.
+
+    Args:
+        results: List of ScanResult objects.
+        trace_path: Destination file path.
+    """
+    timings = [(r.path, r.timing) for r in results if isinstance(r.timing, ScanTiming)]
+    try:
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(build_chrome_trace(timings), f)
+    except OSError as e:
+        print_error(_("Could not write trace file: {error}").format(error=e))
+
+
 def _print_text_output(
     results: list,
     duration: float,
@@ -277,16 +320,20 @@ def run(args: argparse.Namespace) -> int:
     if args.verbose:
         print_info(_("ClamAV version: {version}").format(version=version_or_error))
 
-    # Resolve profile exclusions
+    # Resolve profile exclusions and resource limits
     exclusions = None
+    profile_options = None
     if args.profile:
-        exclusions = _resolve_profile_exclusions(args.profile, args.verbose)
-        if exclusions is None:
+        profile = _resolve_profile(args.profile, args.verbose)
+        if profile is None:
             return 2
+        exclusions = profile.exclusions
+        profile_options = profile.options
+    policy = resolve_policy(settings_manager, profile_options=profile_options)
 
     # Execute scans
     results, duration = _execute_scans(
-        scanner, valid_paths, not args.no_recursive, exclusions, args.verbose
+        scanner, valid_paths, not args.no_recursive, exclusions, args.verbose, policy
     )
 
     # Auto-quarantine if requested
@@ -300,6 +347,8 @@ def run(args: argparse.Namespace) -> int:
         print_json(_format_json_output(results, valid_paths, duration, quarantine_info))
     else:
         _print_text_output(results, duration, quarantine_info)
+    if args.trace:
+        _write_trace(results, args.trace)
 
     # Determine exit code
     total_infected = sum(r.infected_count for r in results)
@@ -17,6 +17,8 @@ Options:
     --auto-quarantine     Automatically quarantine detected threats
     --target PATH         Path to scan (can be specified multiple times)
     --dry-run             Show what would be done without executing
+    --resident            Keep running and trigger scans from an internal timer
+    --force               Scan even if a resident scheduler handles the schedule
     --verbose             Enable verbose output
     --help                Show this help message
 
@@ -29,12 +31,23 @@ Examples:
 
     # Scan with auto-quarantine enabled
     clamui-scheduled-scan --auto-quarantine --target /home/user/Downloads
+
+    # Run the schedule from a long-lived user service
+    clamui-scheduled-scan --resident
+
+While a resident scheduler (the ClamUI app or --resident) is active, runs
+started by the systemd timer or cron job exit without scanning. Those are
+recognized by passing no --target or exactly the saved schedule targets;
+runs with other targets, or with --force, always scan.
 """
 
 import argparse
+import dataclasses
 import os
+import signal
 import subprocess
 import sys
+import threading
 import time
 from dataclasses import dataclass, field
 from pathlib import Path
@@ -43,6 +56,8 @@ from ..core.battery_manager import BatteryManager
 from ..core.i18n import _
 from ..core.log_manager import LogEntry, LogManager
 from ..core.quarantine import QuarantineManager
+from ..core.resident_scheduler import ResidentScheduler, is_resident_scheduler_running
+from ..core.resource_governor import resolve_policy
 from ..core.scanner import Scanner, ScanResult, ScanStatus
 from ..core.settings_manager import SettingsManager
 
@@ -141,6 +156,18 @@ def parse_arguments() -> argparse.Namespace:
         help=_("Show what would be done without executing"),
     )
 
+    parser.add_argument(
+        "--resident",
+        action="store_true",
+        help=_("Keep running and start scans from an internal timer"),
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=_("Scan even if a resident scheduler is handling the schedule"),
+    )
+
     parser.add_argument("--verbose", "-v", action="store_true", help=_("Enable verbose output"))
 
     return parser.parse_args()
@@ -366,10 +393,12 @@ def _execute_scans(ctx: ScanContext, valid_targets: list[str]) -> ScanAggregateR
 
     agg = ScanAggregateResult(valid_targets=valid_targets)
     start_time = time.monotonic()
+    # Scheduled scans must not slow down whatever the user is doing
+    policy = resolve_policy(ctx.settings, background=True)
 
     for target in valid_targets:
         log_message(_("Scanning: {target}").format(target=target), ctx.verbose)
-        result = ctx.scanner.scan_sync(target, recursive=True)
+        result = ctx.scanner.scan_sync(target, recursive=True, resource_policy=policy)
         agg.all_results.append(result)
 
         agg.total_scanned += result.scanned_files
@@ -626,6 +655,7 @@ def run_scheduled_scan(
     auto_quarantine: bool,
     dry_run: bool = False,
     verbose: bool = False,
+    context: ScanContext | None = None,
 ) -> int:
     """
     Execute a scheduled scan.
@@ -639,18 +669,30 @@ def run_scheduled_scan(
         auto_quarantine: Whether to quarantine detected threats
         dry_run: If True, show what would be done without executing
         verbose: Enable verbose output
+        context: Optional context whose managers and scanner are reused
+            (the resident scheduler keeps them warm between runs)
 
     Returns:
         Exit code (0 for success/clean, 1 for threats found, 2 for error)
     """
     # Initialize context with all managers and configuration
-    ctx = ScanContext(
-        targets=targets,
-        skip_on_battery=skip_on_battery,
-        auto_quarantine=auto_quarantine,
-        dry_run=dry_run,
-        verbose=verbose,
-    )
+    if context is not None:
+        ctx = dataclasses.replace(
+            context,
+            targets=targets,
+            skip_on_battery=skip_on_battery,
+            auto_quarantine=auto_quarantine,
+            dry_run=dry_run,
+            verbose=verbose,
+        )
+    else:
+        ctx = ScanContext(
+            targets=targets,
+            skip_on_battery=skip_on_battery,
+            auto_quarantine=auto_quarantine,
+            dry_run=dry_run,
+            verbose=verbose,
+        )
 
     log_message(_("ClamUI scheduled scan starting..."), verbose)
 
@@ -696,6 +738,131 @@ def run_scheduled_scan(
     return _determine_exit_code(agg)
 
 
+def resolve_scan_options(
+    settings,
+    targets: list[str] | None = None,
+    skip_on_battery: bool | None = None,
+    auto_quarantine: bool | None = None,
+) -> tuple[list[str], bool, bool]:
+    """
+    Combine explicit options with the saved scheduled-scan settings.
+
+    Args:
+        settings: SettingsManager (or snapshot) with the schedule settings
+        targets: Explicit targets, or None/empty to use the settings
+        skip_on_battery: Explicit value, or None to use the settings
+        auto_quarantine: Explicit value, or None to use the settings
+
+    Returns:
+        Tuple of (targets, skip_on_battery, auto_quarantine)
+    """
+    if skip_on_battery is None:
+        skip_on_battery = settings.get("schedule_skip_on_battery", True)
+    if auto_quarantine is None:
+        auto_quarantine = settings.get("schedule_auto_quarantine", False)
+
+    if not targets:
+        targets = list(settings.get("schedule_targets", []))
+        # If no targets configured, default to home directory
+        if not targets:
+            targets = [os.path.expanduser("~")]
+
+    return targets, skip_on_battery, auto_quarantine
+
+
+def is_schedule_invocation(settings, targets: list[str] | None) -> bool:
+    """
+    Check whether a run looks like the one the systemd timer or cron starts.
+
+    The installed timer passes the saved schedule targets as --target, so a
+    run with no targets or exactly those targets is the schedule; anything
+    else was started by hand.
+
+    Args:
+        settings: SettingsManager (or snapshot) with the schedule settings
+        targets: Explicit targets from the command line
+    """
+    if not targets:
+        return True
+    return sorted(targets) == sorted(settings.get("schedule_targets", []) or [])
+
+
+class ResidentScanRunner:
+    """
+    Runs scheduled scans for a ResidentScheduler.
+
+    One ScanContext, and with it the Scanner and its exclusion and backend
+    caches, is kept for the lifetime of the process.
+    """
+
+    def __init__(self, settings: SettingsManager, verbose: bool = False, **managers):
+        """
+        Initialize the runner.
+
+        Args:
+            settings: SettingsManager with the scheduled-scan settings
+            verbose: Enable verbose output
+            **managers: Optional battery_manager, log_manager and scanner to
+                share with the host process
+        """
+        self._context = ScanContext(
+            targets=[],
+            skip_on_battery=True,
+            auto_quarantine=False,
+            dry_run=False,
+            verbose=verbose,
+            settings=settings,
+            **managers,
+        )
+
+    def run(self) -> int:
+        """Run one scheduled scan with the current settings."""
+        targets, skip_on_battery, auto_quarantine = resolve_scan_options(self._context.settings)
+        return run_scheduled_scan(
+            targets=targets,
+            skip_on_battery=skip_on_battery,
+            auto_quarantine=auto_quarantine,
+            verbose=self._context.verbose,
+            context=self._context,
+        )
+
+    def cancel(self) -> None:
+        """Stop a running scan."""
+        self._context.scanner.cancel()
+
+
+def run_resident(verbose: bool = False) -> int:
+    """
+    Run scheduled scans from an internal timer until SIGTERM or SIGINT.
+
+    Args:
+        verbose: Enable verbose output
+
+    Returns:
+        Exit code (0 when stopped, also when another process already runs
+        the schedule)
+    """
+    settings = SettingsManager()
+    runner = ResidentScanRunner(settings, verbose=verbose)
+    resident = ResidentScheduler(
+        settings, runner.run, cancel_scan=runner.cancel, reload_settings=True
+    )
+    if not resident.start():
+        log_message(_("Scheduled scans are already handled by another ClamUI process"), verbose)
+        return 0
+
+    log_message(_("ClamUI resident scheduler running"), verbose)
+    stop_event = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_args: stop_event.set())
+    while not stop_event.wait(1.0):
+        pass
+
+    resident.stop()
+    log_message(_("ClamUI resident scheduler stopped"), verbose)
+    return 0
+
+
 def main() -> int:
     """
     Main entry point for the scheduled scan CLI.
@@ -705,29 +872,33 @@ def main() -> int:
     """
     args = parse_arguments()
 
+    if args.resident:
+        return run_resident(verbose=args.verbose)
+
     # Load settings
     settings = SettingsManager()
 
-    # Determine effective settings (CLI args override config)
-    if args.skip_on_battery is not None:
-        skip_on_battery = args.skip_on_battery
-    else:
-        skip_on_battery = settings.get("schedule_skip_on_battery", True)
-
-    if args.auto_quarantine is not None:
-        auto_quarantine = args.auto_quarantine
-    else:
-        auto_quarantine = settings.get("schedule_auto_quarantine", False)
+    # A resident scheduler runs the schedule itself; the timer run would be a
+    # duplicate. Manual runs with their own targets are not affected.
+    if (
+        not args.dry_run
+        and not args.force
+        and is_schedule_invocation(settings, args.targets)
+        and is_resident_scheduler_running()
+    ):
+        log_message(
+            _(
+                "A resident ClamUI scheduler is active; skipping this scheduled scan "
+                "(use --force to scan anyway)"
+            ),
+            args.verbose,
+        )
+        return 0
 
-    # Determine targets (CLI args override config)
-    if args.targets:
-        targets = args.targets
-    else:
-        targets = settings.get("schedule_targets", [])
-        # If no targets configured, default to home directory
-        if not targets:
-            home = os.path.expanduser("~")
-            targets = [home]
+    # Determine effective settings (CLI args override config)
+    targets, skip_on_battery, auto_quarantine = resolve_scan_options(
+        settings, args.targets, args.skip_on_battery, args.auto_quarantine
+    )
 
     return run_scheduled_scan(
         targets=targets,
@@ -2,8 +2,8 @@
 """
 CLI command for displaying ClamAV and ClamUI status.
 
-Shows ClamAV availability, active backend, daemon status,
-and quarantine/log statistics.
+Shows ClamAV availability, active backend, daemon status, installed
+signature databases and quarantine/log statistics.
 
 Usage:
     clamui status
@@ -12,6 +12,7 @@ Usage:
 
 import argparse
 
+from ..core.database_inventory import get_database_inventory
 from ..core.i18n import _
 from ..core.log_manager import LogManager
 from ..core.quarantine import QuarantineManager
@@ -56,6 +57,35 @@ def _collect_clamav_info(scanner: Scanner, log_manager: LogManager) -> dict:
     }
 
 
+def _collect_database_info() -> dict:
+    """
+    Gather installed signature database information.
+
+    Returns:
+        Dict with one entry per database, total signatures and any
+        directory errors.
+    """
+    snapshot = get_database_inventory().get()
+    return {
+        "databases": [
+            {
+                "name": info.name,
+                "path": info.path,
+                "version": info.version,
+                "signatures": info.signatures,
+                "flevel": info.flevel,
+                "build_date": info.build_date,
+                "age_days": info.age_days(),
+                "size": info.size,
+                "error": info.error,
+            }
+            for info in snapshot.databases()
+        ],
+        "total_signatures": snapshot.total_signatures,
+        "errors": snapshot.errors if snapshot.is_empty else {},
+    }
+
+
 def _collect_quarantine_stats() -> dict:
     """
     Gather quarantine statistics.
@@ -104,12 +134,14 @@ def run(args: argparse.Namespace) -> int:
     scanner = Scanner(log_manager=log_manager, settings_manager=settings)
 
     clamav_info = _collect_clamav_info(scanner, log_manager)
+    database_info = _collect_database_info()
     quarantine_stats = _collect_quarantine_stats()
     log_stats = _collect_log_stats(log_manager)
 
     if args.json_output:
         data = {
             "clamav": clamav_info,
+            "databases": database_info,
             "quarantine": quarantine_stats,
             "logs": log_stats,
             "settings": {
@@ -130,6 +162,30 @@ def run(args: argparse.Namespace) -> int:
     print(_("  Backend:  {backend}").format(backend=clamav_info["backend"]))
     print(_("  Daemon:   {status}").format(status=clamav_info["daemon_status"]))
 
+    print(_("\nDatabases"))
+    for db in database_info["databases"]:
+        if db["version"] is None:
+            print(
+                _("  {name}: {error}").format(name=db["name"], error=db["error"] or _("unreadable"))
+            )
+            continue
+        age = db["age_days"]
+        print(
+            _("  {name}: version {version}, {sigs} signatures, built {date}{age}").format(
+                name=db["name"],
+                version=db["version"],
+                sigs=db["signatures"] if db["signatures"] is not None else "?",
+                date=db["build_date"] or "?",
+                age=_(" ({days} days ago)").format(days=age) if age is not None else "",
+            )
+        )
+    if database_info["databases"]:
+        print(_("  Total:    {sigs} signatures").format(sigs=database_info["total_signatures"]))
+    else:
+        print(_("  No database files found"))
+        for directory, error in database_info["errors"].items():
+            print(_("  {path}: {error}").format(path=directory, error=error))
+
     print(_("\nQuarantine"))
     print(_("  Entries:  {count}").format(count=quarantine_stats["entries"]))
     print(_("  Size:     {size}").format(size=format_size(quarantine_stats["total_size"])))
@@ -0,0 +1,102 @@
+# ClamUI Update Command
+"""
+CLI command for updating the ClamAV signature databases.
+
+Runs freshclam (or triggers the freshclam service), or rolls back to the
+database set that the last successful forced update replaced.
+
+Usage:
+    clamui update
+    clamui update --force
+    clamui update --rollback
+    clamui update --json
+"""
+
+import argparse
+
+from ..core.i18n import _
+from ..core.updater import FreshclamUpdater, UpdateResult
+from .output import print_error, print_json
+
+# Exit codes
+EXIT_SUCCESS = 0
+EXIT_ERROR = 2
+
+
+def register(subparsers: argparse._SubParsersAction) -> None:
+    """Register the update subcommand with the CLI router."""
+    parser = subparsers.add_parser(
+        "update",
+        help=_("Update the ClamAV signature databases"),
+        description=_(
+            "Update the ClamAV signature databases, or roll back to the set "
+            "replaced by the last forced update."
+        ),
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--force",
+        action="store_true",
+        help=_("Download fresh copies of all databases"),
+    )
+    mode.add_argument(
+        "--rollback",
+        action="store_true",
+        help=_("Restore the databases replaced by the last forced update"),
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help=_("Output as JSON"),
+    )
+    parser.set_defaults(func=run)
+
+
+def _result_to_dict(result: UpdateResult) -> dict:
+    """Convert an UpdateResult to a JSON-serializable dict."""
+    return {
+        "status": result.status.value,
+        "databases_updated": result.databases_updated,
+        "updated_databases": result.updated_databases,
+        "up_to_date_databases": result.up_to_date_databases,
+        "error": result.error_message,
+        "clamd_reloaded": (
+            result.clamd_reload.reloaded if result.clamd_reload is not None else None
+        ),
+    }
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Update or roll back the signature databases.
+
+    Args:
+        args: Parsed CLI arguments (expects force, rollback, json_output).
+
+    Returns:
+        Exit code (0=success, 2=error).
+    """
+    updater = FreshclamUpdater()
+
+    if args.rollback:
+        if not updater.has_last_known_good():
+            print_error(_("No previous database set is available to roll back to"))
+            return EXIT_ERROR
+        result = updater.rollback_sync()
+    else:
+        result = updater.update_sync(force=args.force)
+
+    if args.json_output:
+        print_json(_result_to_dict(result))
+    elif result.is_success:
+        if args.rollback:
+            print(_("Restored {count} database file(s)").format(count=result.databases_updated))
+        elif result.updated_databases:
+            print(_("Updated: {databases}").format(databases=", ".join(result.updated_databases)))
+        else:
+            print(_("Databases are up to date"))
+    else:
+        print_error(result.error_message or _("Update failed"))
+
+    return EXIT_SUCCESS if result.is_success else EXIT_ERROR
@@ -177,8 +177,11 @@ class AppContext:
         """
         if self._vt_client is None:
             from .virustotal import VirusTotalClient
+            from .virustotal_cache import create_verdict_cache
 
-            self._vt_client = VirusTotalClient(api_key)
+            self._vt_client = VirusTotalClient(
+                api_key, cache=create_verdict_cache(self._settings_manager)
+            )
         else:
             self._vt_client.set_api_key(api_key)
         return self._vt_client
@@ -0,0 +1,503 @@
+# ClamUI Audit Cache Module
+"""
+Persistent, incremental Tier 1 security audit results.
+
+Most audit inputs change rarely: sshd_config, firewall and AppArmor
+configuration, update settings, installed packages and enabled services.
+Re-running every check each time the Security Audit page opens costs seconds
+of subprocess calls for an answer that is almost always the same.
+
+AuditCache persists each section together with a fingerprint of the host
+state its check reads (see system_audit.CHECK_INPUTS): the stat of its input
+files and directories, the states of the audited systemd units and the boot
+id. run_incremental_audit() serves sections whose fingerprint still matches
+straight from the cache, re-runs only the others (or all of them when
+forced), and reports what changed against the previous audit.
+
+Checks without declared inputs (open ports, Portmaster) depend on live
+runtime state and always re-run.
+"""
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .flatpak import is_flatpak
+from .host_broker import HostBrokerError, get_host_broker
+from .system_audit import (
+    AUDIT_CHECK_TIMEOUT,
+    CHECK_INPUTS,
+    TIER1_CHECKS,
+    AuditCategory,
+    AuditCheckResult,
+    AuditInputs,
+    AuditReport,
+    AuditSectionResult,
+    AuditStatus,
+    check_category,
+    get_systemd_unit_states,
+    iter_tier1_audit,
+    sort_report_sections,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout changes; older files are ignored
+CACHE_VERSION = 1
+
+_BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+
+# =============================================================================
+# Serialization
+# =============================================================================
+
+
+def section_to_dict(section: AuditSectionResult) -> dict:
+    """Serialize a section with every check field."""
+    return {
+        "category": section.category.value,
+        "title": section.title,
+        "icon_name": section.icon_name,
+        "checks": [
+            {
+                "name": check.name,
+                "status": check.status.value,
+                "detail": check.detail,
+                "recommendation": check.recommendation,
+                "install_command": check.install_command,
+                "info_url": check.info_url,
+                "launch_command": check.launch_command,
+                "launch_label": check.launch_label,
+            }
+            for check in section.checks
+        ],
+    }
+
+
+def section_from_dict(data: dict) -> AuditSectionResult:
+    """
+    Rebuild a section from section_to_dict() output.
+
+    Raises:
+        KeyError, ValueError, TypeError: If the data is malformed
+    """
+    return AuditSectionResult(
+        category=AuditCategory(data["category"]),
+        title=data["title"],
+        icon_name=data["icon_name"],
+        checks=[
+            AuditCheckResult(
+                name=check["name"],
+                status=AuditStatus(check["status"]),
+                detail=check["detail"],
+                recommendation=check.get("recommendation"),
+                install_command=check.get("install_command"),
+                info_url=check.get("info_url"),
+                launch_command=check.get("launch_command"),
+                launch_label=check.get("launch_label"),
+            )
+            for check in data["checks"]
+        ],
+    )
+
+
+# =============================================================================
+# Fingerprints
+# =============================================================================
+
+
+def _read_boot_id() -> str | None:
+    """The boot id changes on every reboot; the sandbox shares the host kernel."""
+    try:
+        return Path(_BOOT_ID_PATH).read_text(encoding="ascii").strip()
+    except OSError:
+        return None
+
+
+def _stat_native(paths: Iterable[str], dirs: Iterable[str]) -> dict[str, list | None]:
+    stats: dict[str, list | None] = {}
+
+    def stat(path: str) -> list | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+    for path in paths:
+        stats[path] = stat(path)
+    for directory in dirs:
+        stats[directory] = stat(directory)
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    stats[entry.path] = stat(entry.path)
+        except OSError:
+            continue
+    return stats
+
+
+def _stat_host(paths: Iterable[str], dirs: Iterable[str]) -> dict[str, list | None] | None:
+    """Stat host paths through the host broker; None if it is unavailable."""
+    broker = get_host_broker()
+    if broker is None:
+        return None
+
+    targets = list(dict.fromkeys([*paths, *dirs]))
+    try:
+        for directory in dirs:
+            try:
+                targets.extend(broker.glob(directory, ["*"]))
+            except HostBrokerError as e:
+                if e.code not in ("not_found", "permission"):
+                    raise
+        replies = broker.batch([("stat", {"path": path}) for path in targets])
+    except HostBrokerError as e:
+        logger.debug("Cannot fingerprint audit inputs on the host: %s", e)
+        return None
+
+    stats: dict[str, list | None] = {}
+    for path, reply in zip(targets, replies, strict=True):
+        if isinstance(reply, HostBrokerError):
+            if reply.code not in ("not_found", "permission"):
+                return None
+            stats[path] = None
+        elif reply.get("exists"):
+            stats[path] = [reply.get("mtime_ns"), reply.get("size")]
+        else:
+            stats[path] = None
+    return stats
+
+
+def compute_fingerprint(
+    inputs: AuditInputs, unit_states: dict[str, str] | None, boot_id: str | None
+) -> str | None:
+    """
+    Fingerprint the host state a check reads.
+
+    Args:
+        inputs: The check's declared inputs
+        unit_states: Snapshot of the audited systemd unit states
+        boot_id: Current boot id
+
+    Returns:
+        Hex digest, or None if the state cannot be observed (the check must
+        then re-run)
+    """
+    if unit_states is None or boot_id is None:
+        return None
+    if is_flatpak():
+        stats = _stat_host(inputs.paths, inputs.dirs)
+        if stats is None:
+            return None
+    else:
+        stats = _stat_native(inputs.paths, inputs.dirs)
+
+    payload = json.dumps(
+        {"stats": stats, "units": unit_states, "boot_id": boot_id},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Change detection
+# =============================================================================
+
+
+@dataclass
+class AuditChange:
+    """A check whose status differs from the previous audit."""
+
+    category: AuditCategory
+    name: str
+    # None when the check did not exist in the previous audit
+    old_status: AuditStatus | None
+    # None when the check is gone from the current audit
+    new_status: AuditStatus | None
+
+
+def diff_reports(old: AuditReport | None, new: AuditReport) -> list[AuditChange]:
+    """
+    Compare two reports check by check.
+
+    Checks are matched by section category and check name.
+
+    Returns:
+        Changes in the order of the new report, followed by removed checks
+    """
+    if old is None:
+        return []
+
+    def index(report: AuditReport) -> dict[tuple[AuditCategory, str], AuditStatus]:
+        return {
+            (section.category, check.name): check.status
+            for section in report.sections
+            for check in section.checks
+        }
+
+    before = index(old)
+    after = index(new)
+    changes = [
+        AuditChange(category, name, before.get((category, name)), status)
+        for (category, name), status in after.items()
+        if before.get((category, name)) != status
+    ]
+    changes.extend(
+        AuditChange(category, name, status, None)
+        for (category, name), status in before.items()
+        if (category, name) not in after
+    )
+    return changes
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+
+class AuditCache:
+    """
+    JSON-file cache of audit sections and the last full report.
+
+    Usage:
+        cache = AuditCache()
+        section = cache.get(AuditCategory.SSH_HARDENING, fingerprint, max_age)
+        cache.put(section, fingerprint)
+        cache.set_report(report)
+        cache.save()
+    """
+
+    # Cache file permissions: 0o600 (owner read/write only); the file
+    # describes the machine's security posture
+    FILE_PERMISSIONS = 0o600
+
+    def __init__(self, cache_path: str | None = None):
+        """
+        Initialize the audit cache.
+
+        Args:
+            cache_path: Optional custom file path.
+                        Defaults to XDG_CACHE_HOME/clamui/audit_cache.json
+        """
+        if cache_path:
+            self._path = Path(cache_path)
+        else:
+            xdg_cache_home = os.environ.get("XDG_CACHE_HOME", "~/.cache")
+            self._path = Path(xdg_cache_home).expanduser() / "clamui" / "audit_cache.json"
+        self._entries: dict[str, dict] = {}
+        self._report: dict | None = None
+        self._load()
+
+    @property
+    def path(self) -> Path:
+        """Location of the cache file."""
+        return self._path
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable audit cache %s: %s", self._path, e)
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
+        entries = data.get("checks")
+        if isinstance(entries, dict):
+            self._entries = entries
+        report = data.get("report")
+        if isinstance(report, dict):
+            self._report = report
+
+    def get(
+        self, category: AuditCategory, fingerprint: str | None, max_age: float
+    ) -> AuditSectionResult | None:
+        """
+        Get a cached section if its fingerprint matches and it is recent enough.
+
+        Returns:
+            The cached section, or None on a miss
+        """
+        if fingerprint is None:
+            return None
+        entry = self._entries.get(category.value)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return None
+        age = time.time() - float(entry.get("checked_at", 0))
+        if age < 0 or age > max_age:
+            return None
+        try:
+            return section_from_dict(entry["section"])
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    def put(self, section: AuditSectionResult, fingerprint: str | None) -> None:
+        """Store a freshly computed section; sections without a fingerprint are dropped."""
+        if fingerprint is None:
+            self._entries.pop(section.category.value, None)
+            return
+        self._entries[section.category.value] = {
+            "fingerprint": fingerprint,
+            "checked_at": time.time(),
+            "section": section_to_dict(section),
+        }
+
+    def previous_report(self) -> AuditReport | None:
+        """The last report stored with set_report(), or None."""
+        if self._report is None:
+            return None
+        try:
+            return AuditReport(
+                sections=[section_from_dict(s) for s in self._report["sections"]],
+                timestamp=float(self._report.get("timestamp", 0.0)),
+            )
+        except (KeyError, ValueError, TypeError):
+            return None
+
+    def set_report(self, report: AuditReport) -> None:
+        """Remember a full report for the next diff."""
+        self._report = {
+            "timestamp": report.timestamp,
+            "sections": [section_to_dict(s) for s in report.sections],
+        }
+
+    def clear(self) -> None:
+        """Forget all cached sections and the stored report."""
+        self._entries = {}
+        self._report = None
+
+    def save(self) -> bool:
+        """
+        Write the cache atomically.
+
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        data = {"version": CACHE_VERSION, "checks": self._entries, "report": self._report}
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                suffix=".json", prefix="audit_cache_", dir=self._path.parent
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.chmod(temp_path, self.FILE_PERMISSIONS)
+                Path(temp_path).replace(self._path)
+            except Exception:
+                with contextlib.suppress(OSError):
+                    Path(temp_path).unlink(missing_ok=True)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not save audit cache %s: %s", self._path, e)
+            return False
+        return True
+
+
+# =============================================================================
+# Incremental runner
+# =============================================================================
+
+
+@dataclass
+class IncrementalAuditResult:
+    """Outcome of run_incremental_audit()."""
+
+    report: AuditReport
+    # Differences against the previous audit; empty on the first audit
+    changes: list[AuditChange] = field(default_factory=list)
+    # Categories served from the cache instead of re-running their check
+    cached: list[AuditCategory] = field(default_factory=list)
+    # Timestamp of the audit the changes are relative to
+    previous_timestamp: float | None = None
+
+
+def run_incremental_audit(
+    checks: Iterable[Callable[[], AuditSectionResult]] | None = None,
+    cache: AuditCache | None = None,
+    force: bool = False,
+    check_timeout: float = AUDIT_CHECK_TIMEOUT,
+    on_result: Callable[[AuditSectionResult], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+) -> IncrementalAuditResult:
+    """
+    Run the Tier 1 audit, re-running only checks whose inputs changed.
+
+    Cached sections are passed to ``on_result`` first, before any check runs,
+    so a view can show them immediately. The remaining checks run
+    concurrently through iter_tier1_audit().
+
+    Args:
+        checks: Check functions; defaults to TIER1_CHECKS
+        cache: Cache to use; defaults to AuditCache() at the default path
+        force: Re-run every check regardless of the cache
+        check_timeout: Per-check deadline in seconds
+        on_result: Called with each section, cached or fresh
+        should_cancel: Polled while checks run; a cancelled run is not saved
+
+    Returns:
+        IncrementalAuditResult with the report in check order
+    """
+    check_list = list(TIER1_CHECKS if checks is None else checks)
+    if cache is None:
+        cache = AuditCache()
+
+    previous = cache.previous_report()
+    report = AuditReport(timestamp=time.time())
+    cached: list[AuditCategory] = []
+
+    unit_states = get_systemd_unit_states() if any(c in CHECK_INPUTS for c in check_list) else None
+    boot_id = _read_boot_id()
+
+    fingerprints: dict[AuditCategory, str | None] = {}
+    to_run = []
+    for check_func in check_list:
+        inputs = CHECK_INPUTS.get(check_func)
+        category = check_category(check_func)
+        if inputs is None or category is None:
+            to_run.append(check_func)
+            continue
+        fingerprint = compute_fingerprint(inputs, unit_states, boot_id)
+        fingerprints[category] = fingerprint
+        section = None if force else cache.get(category, fingerprint, inputs.max_age)
+        if section is None:
+            to_run.append(check_func)
+            continue
+        cached.append(category)
+        report.sections.append(section)
+        if on_result is not None:
+            on_result(section)
+
+    for section in iter_tier1_audit(
+        to_run, check_timeout=check_timeout, should_cancel=should_cancel
+    ):
+        report.sections.append(section)
+        # UNKNOWN covers timeouts and failures; try again next time
+        if section.overall_status != AuditStatus.UNKNOWN:
+            cache.put(section, fingerprints.get(section.category))
+        if on_result is not None:
+            on_result(section)
+
+    sort_report_sections(report, check_list)
+
+    result = IncrementalAuditResult(
+        report=report,
+        changes=diff_reports(previous, report),
+        cached=cached,
+        previous_timestamp=previous.timestamp if previous is not None else None,
+    )
+    if should_cancel is None or not should_cancel():
+        cache.set_report(report)
+        cache.save()
+    return result
@@ -11,12 +11,16 @@ This module provides functions for:
 
 import logging
 import os
+import shutil
 import subprocess
-from pathlib import Path
+from collections.abc import Callable
 
+from .clamav_probe import get_probe_registry
 from .flatpak import (
     get_clean_env,
+    host_path_exists,
     is_flatpak,
+    run_host_command,
     which_host_command,
     wrap_host_command,
 )
@@ -24,8 +28,6 @@ from .i18n import _
 
 logger = logging.getLogger(__name__)
 
-# Database file extensions that ClamAV uses
-_DATABASE_EXTENSIONS = {".cvd", ".cld", ".cud"}
 _DEFAULT_DATABASE_DIRS = ("/var/lib/clamav", "/usr/local/share/clamav")
 
 
@@ -58,15 +60,8 @@ def systemd_unit_exists(unit_name: str) -> bool:
     return result.returncode == 0 and result.stdout.strip() == "loaded"
 
 
-def check_clamav_installed() -> tuple[bool, str | None]:
-    """
-    Check if ClamAV (clamscan) is installed and accessible.
-
-    Returns:
-        Tuple of (is_installed, version_or_error):
-        - (True, version_string) if ClamAV is installed
-        - (False, error_message) if ClamAV is not found or inaccessible
-    """
+def _probe_clamscan() -> tuple[bool, str | None]:
+    """Run the clamscan availability probe (uncached)."""
     # First check if clamscan exists in PATH (checking host if in Flatpak)
     clamscan_path = which_host_command("clamscan")
 
@@ -78,13 +73,7 @@ def check_clamav_installed() -> tuple[bool, str | None]:
 
     # Try to get version to verify it's working
     try:
-        result = subprocess.run(
-            wrap_host_command(["clamscan", "--version"]),
-            capture_output=True,
-            text=True,
-            timeout=10,
-            env=get_clean_env(),
-        )
+        result = run_host_command(["clamscan", "--version"], timeout=10)
 
         if result.returncode == 0:
             version = result.stdout.strip()
@@ -105,15 +94,8 @@ def check_clamav_installed() -> tuple[bool, str | None]:
         return (False, _("Error checking ClamAV: {error}").format(error=str(e)))
 
 
-def check_freshclam_installed() -> tuple[bool, str | None]:
-    """
-    Check if freshclam (ClamAV database updater) is installed and accessible.
-
-    Returns:
-        Tuple of (is_installed, version_or_error):
-        - (True, version_string) if freshclam is installed
-        - (False, error_message) if freshclam is not found or inaccessible
-    """
+def _probe_freshclam() -> tuple[bool, str | None]:
+    """Run the freshclam availability probe (uncached)."""
     # First check if freshclam exists in PATH (checking host if in Flatpak)
     freshclam_path = which_host_command("freshclam")
 
@@ -129,13 +111,7 @@ def check_freshclam_installed() -> tuple[bool, str | None]:
 
     # Try to get version to verify it's working
     try:
-        result = subprocess.run(
-            wrap_host_command(cmd),
-            capture_output=True,
-            text=True,
-            timeout=10,
-            env=get_clean_env(),
-        )
+        result = run_host_command(cmd, timeout=10)
 
         if result.returncode == 0:
             version = result.stdout.strip()
@@ -158,15 +134,8 @@ def check_freshclam_installed() -> tuple[bool, str | None]:
         return (False, _("Error checking freshclam: {error}").format(error=str(e)))
 
 
-def check_clamdscan_installed() -> tuple[bool, str | None]:
-    """
-    Check if clamdscan (ClamAV daemon scanner) is installed and accessible.
-
-    Returns:
-        Tuple of (is_installed, version_or_error):
-        - (True, version_string) if clamdscan is installed
-        - (False, error_message) if clamdscan is not found or inaccessible
-    """
+def _probe_clamdscan() -> tuple[bool, str | None]:
+    """Run the clamdscan availability probe (uncached)."""
     # First check if clamdscan exists in PATH (checking host if in Flatpak)
     clamdscan_path = which_host_command("clamdscan")
 
@@ -177,15 +146,9 @@ def check_clamdscan_installed() -> tuple[bool, str | None]:
         )
 
     # Try to get version to verify it's working
-    # Use force_host=True because clamdscan must communicate with the host clamd daemon.
+    # clamdscan must run on the host to reach the host clamd daemon.
     try:
-        result = subprocess.run(
-            wrap_host_command(["clamdscan", "--version"], force_host=True),
-            capture_output=True,
-            text=True,
-            timeout=10,
-            env=get_clean_env(),
-        )
+        result = run_host_command(["clamdscan", "--version"], timeout=10)
 
         if result.returncode == 0:
             version = result.stdout.strip()
@@ -265,25 +228,11 @@ def get_clamd_socket_path(config_path: str | None = None) -> str | None:
     return None
 
 
-def check_clamd_connection(
+def _probe_clamd_connection(
     socket_path: str | None = None,
     config_path: str | None = None,
 ) -> tuple[bool, str | None]:
-    """
-    Check if clamd is accessible and responding.
-
-    Uses 'clamdscan --ping' to test the connection to the daemon.
-
-    Args:
-        socket_path: Optional socket path. If not provided, uses auto-detection.
-        config_path: Optional clamd.conf path. When provided, clamdscan is pointed
-            at this config so it uses the same LocalSocket or TCPSocket as the daemon.
-
-    Returns:
-        Tuple of (is_connected, message):
-        - (True, "PONG") if daemon is responding
-        - (False, error_message) if daemon is not accessible
-    """
+    """Ping clamd with ``clamdscan --ping`` (uncached)."""
     # First check if clamdscan is installed
     is_installed, error = check_clamdscan_installed()
     if not is_installed:
@@ -305,17 +254,14 @@ def check_clamd_connection(
         resolved_config_path = detect_clamd_conf_path()
 
     # Try to ping the daemon (--ping requires a timeout argument in seconds)
-    # Use force_host=True because the clamd daemon runs on the host, not in the
-    # Flatpak sandbox.
+    # Run on the host because the clamd daemon runs there, not in the Flatpak
+    # sandbox.
     try:
         cmd = ["clamdscan"]
         if resolved_config_path:
             cmd.extend(["--config-file", resolved_config_path])
         cmd.extend(["--ping", "3"])
-        cmd = wrap_host_command(cmd, force_host=True)
-        result = subprocess.run(
-            cmd, capture_output=True, text=True, timeout=10, env=get_clean_env()
-        )
+        result = run_host_command(cmd, timeout=10)
 
         if result.returncode == 0 and "PONG" in result.stdout:
             return (True, "PONG")
@@ -364,75 +310,6 @@ def get_freshclam_path() -> str | None:
     return which_host_command("freshclam")
 
 
-def _path_contains_database_file(db_dir: Path) -> tuple[bool, str | None]:
-    """Check a directly accessible database directory for ClamAV database files."""
-    if not db_dir.exists():
-        return (False, _("Database directory does not exist: {path}").format(path=db_dir))
-
-    try:
-        for file in db_dir.iterdir():
-            if file.suffix.lower() in _DATABASE_EXTENSIONS:
-                return (True, None)
-    except PermissionError:
-        return (False, _("Permission denied accessing: {path}").format(path=db_dir))
-    except OSError as e:
-        return (False, _("Error accessing database: {error}").format(error=e))
-
-    return (False, _("No virus database files found. Please download the database first."))
-
-
-def _host_path_contains_database_file(db_dir: str) -> tuple[bool, str | None]:
-    """Check a host database directory from inside Flatpak."""
-    try:
-        result = subprocess.run(
-            [
-                "flatpak-spawn",
-                "--host",
-                "find",
-                db_dir,
-                "-maxdepth",
-                "1",
-                "-type",
-                "f",
-                "(",
-                "-iname",
-                "*.cvd",
-                "-o",
-                "-iname",
-                "*.cld",
-                "-o",
-                "-iname",
-                "*.cud",
-                ")",
-                "-print",
-                "-quit",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-    except subprocess.TimeoutExpired:
-        return (False, _("Timed out checking host database directory: {path}").format(path=db_dir))
-    except FileNotFoundError:
-        return (False, _("flatpak-spawn not available"))
-    except OSError as e:
-        return (False, _("Error checking host database directory: {error}").format(error=e))
-
-    if result.returncode != 0:
-        error = result.stderr.strip() or result.stdout.strip()
-        return (
-            False,
-            _("Error accessing host database directory {path}: {error}").format(
-                path=db_dir, error=error
-            ),
-        )
-
-    if result.stdout.strip():
-        return (True, None)
-
-    return (False, _("No virus database files found in host directory: {path}").format(path=db_dir))
-
-
 def _detect_database_dirs_from_host_freshclam_config() -> list[str]:
     """Read DatabaseDirectory values from the host freshclam config when available."""
     config_path = resolve_freshclam_conf_path()
@@ -457,7 +334,7 @@ def _detect_database_dirs_from_host_freshclam_config() -> list[str]:
     return []
 
 
-def _host_database_dirs_to_check() -> list[str]:
+def get_host_database_dirs() -> list[str]:
     """Return host ClamAV database directories in priority order."""
     dirs: list[str] = []
     for db_dir in [*_detect_database_dirs_from_host_freshclam_config(), *_DEFAULT_DATABASE_DIRS]:
@@ -466,6 +343,189 @@ def _host_database_dirs_to_check() -> list[str]:
     return dirs
 
 
+def _probe_database() -> tuple[bool, str | None]:
+    """Look for virus database files via the shared database inventory (uncached)."""
+    from .database_inventory import get_database_inventory
+
+    inventory = get_database_inventory()
+    # The probe registry decides when to re-check; make sure that re-check
+    # actually looks at the directories again
+    snapshot = inventory.get(refresh=True)
+    if not snapshot.is_empty:
+        return (True, None)
+
+    if is_flatpak():
+        errors = [
+            snapshot.errors.get(db_dir)
+            or _("No virus database files found in host directory: {path}").format(path=db_dir)
+            for db_dir in snapshot.directories
+        ]
+        detail = "; ".join(errors) if errors else _("No host database directories were found")
+        return (
+            False,
+            _(
+                "No host ClamAV virus database files found. Update the host database with freshclam. Details: {detail}"
+            ).format(detail=detail),
+        )
+
+    primary = snapshot.directories[0] if snapshot.directories else None
+    if primary in snapshot.errors:
+        return (False, snapshot.errors[primary])
+    return (False, _("No virus database files found. Please download the database first."))
+
+
+# --- Cached probes ---
+#
+# The public check_* functions below read through the shared probe registry,
+# so the scanner, daemon scanner, views and CLI reuse one result instead of
+# spawning helpers on every call.
+
+_BINARY_TTL = 300.0
+_DAEMON_TTL = 30.0
+_DAEMON_NEGATIVE_TTL = 5.0
+
+
+def _watch_binary(binary: str) -> Callable[[], list[str]]:
+    """Watch the resolved binary natively; host paths are not visible in Flatpak."""
+
+    def watch() -> list[str]:
+        if is_flatpak():
+            return []
+        path = shutil.which(binary)
+        return [path] if path else []
+
+    return watch
+
+
+def _watch_clamd(socket_path: str | None, config_path: str | None) -> list[str]:
+    if is_flatpak():
+        return []
+    paths = [socket_path or get_clamd_socket_path(config_path)]
+    if config_path:
+        paths.append(config_path)
+    return [p for p in paths if p]
+
+
+def _watch_database() -> list[str]:
+    return [] if is_flatpak() else list(_DEFAULT_DATABASE_DIRS)
+
+
+def _register_probes() -> None:
+    registry = get_probe_registry()
+    registry.register("clamscan", _probe_clamscan, _BINARY_TTL, watch=_watch_binary("clamscan"))
+    registry.register("freshclam", _probe_freshclam, _BINARY_TTL, watch=_watch_binary("freshclam"))
+    registry.register("clamdscan", _probe_clamdscan, _BINARY_TTL, watch=_watch_binary("clamdscan"))
+    registry.register(
+        "clamd",
+        _probe_clamd_connection,
+        _DAEMON_TTL,
+        negative_ttl=_DAEMON_NEGATIVE_TTL,
+        watch=_watch_clamd,
+    )
+    registry.register("database", _probe_database, _BINARY_TTL, watch=_watch_database)
+
+
+_register_probes()
+
+
+def refresh_clamav_probes(force: bool = True, include_daemon: bool = True) -> None:
+    """
+    Run the ClamAV probes concurrently so later check_* calls hit the cache.
+
+    Args:
+        force: Re-run probes even if fresh results are cached
+        include_daemon: Also ping clamd with auto-detected settings
+    """
+    probes: list = ["clamscan", "freshclam", "clamdscan", "database"]
+    if include_daemon:
+        probes.append(("clamd", None, None))
+    get_probe_registry().refresh(probes, force=force)
+
+
+def invalidate_clamav_probes(name: str | None = None) -> None:
+    """
+    Forget cached probe results.
+
+    Args:
+        name: One of "clamscan", "freshclam", "clamdscan", "clamd" or
+              "database"; None forgets all of them
+    """
+    get_probe_registry().invalidate(name)
+    if name in (None, "database"):
+        from .database_inventory import get_database_inventory
+
+        get_database_inventory().invalidate()
+
+
+def check_clamav_installed() -> tuple[bool, str | None]:
+    """
+    Check if ClamAV (clamscan) is installed and accessible.
+
+    The result is cached in the shared probe registry (see clamav_probe);
+    use refresh_clamav_probes() to force a re-check.
+
+    Returns:
+        Tuple of (is_installed, version_or_error):
+        - (True, version_string) if ClamAV is installed
+        - (False, error_message) if ClamAV is not found or inaccessible
+    """
+    return get_probe_registry().get("clamscan")
+
+
+def check_freshclam_installed() -> tuple[bool, str | None]:
+    """
+    Check if freshclam (ClamAV database updater) is installed and accessible.
+
+    The result is cached in the shared probe registry (see clamav_probe);
+    use refresh_clamav_probes() to force a re-check.
+
+    Returns:
+        Tuple of (is_installed, version_or_error):
+        - (True, version_string) if freshclam is installed
+        - (False, error_message) if freshclam is not found or inaccessible
+    """
+    return get_probe_registry().get("freshclam")
+
+
+def check_clamdscan_installed() -> tuple[bool, str | None]:
+    """
+    Check if clamdscan (ClamAV daemon scanner) is installed and accessible.
+
+    The result is cached in the shared probe registry (see clamav_probe);
+    use refresh_clamav_probes() to force a re-check.
+
+    Returns:
+        Tuple of (is_installed, version_or_error):
+        - (True, version_string) if clamdscan is installed
+        - (False, error_message) if clamdscan is not found or inaccessible
+    """
+    return get_probe_registry().get("clamdscan")
+
+
+def check_clamd_connection(
+    socket_path: str | None = None,
+    config_path: str | None = None,
+) -> tuple[bool, str | None]:
+    """
+    Check if clamd is accessible and responding.
+
+    Uses 'clamdscan --ping' to test the connection to the daemon. The result
+    is cached in the shared probe registry for a short time (see clamav_probe);
+    use refresh_clamav_probes() to force a re-check.
+
+    Args:
+        socket_path: Optional socket path. If not provided, uses auto-detection.
+        config_path: Optional clamd.conf path. When provided, clamdscan is pointed
+            at this config so it uses the same LocalSocket or TCPSocket as the daemon.
+
+    Returns:
+        Tuple of (is_connected, message):
+        - (True, "PONG") if daemon is responding
+        - (False, error_message) if daemon is not accessible
+    """
+    return get_probe_registry().get("clamd", socket_path, config_path)
+
+
 def check_database_available() -> tuple[bool, str | None]:
     """
     Check if ClamAV virus database files are available.
@@ -473,28 +533,15 @@ def check_database_available() -> tuple[bool, str | None]:
     The database files have extensions .cvd (compressed), .cld (incremental),
     or .cud (diff). At least one of these must exist for ClamAV to scan.
 
+    The result is cached in the shared probe registry (see clamav_probe);
+    use refresh_clamav_probes() to force a re-check.
+
     Returns:
         Tuple of (is_available, error_message):
         - (True, None) if database files exist
         - (False, error_message) if no database files found
     """
-    if is_flatpak():
-        errors = []
-        for db_dir in _host_database_dirs_to_check():
-            available, error = _host_path_contains_database_file(db_dir)
-            if available:
-                return (True, None)
-            if error:
-                errors.append(error)
-        detail = "; ".join(errors) if errors else _("No host database directories were found")
-        return (
-            False,
-            _(
-                "No host ClamAV virus database files found. Update the host database with freshclam. Details: {detail}"
-            ).format(detail=detail),
-        )
-
-    return _path_contains_database_file(Path("/var/lib/clamav"))
+    return get_probe_registry().get("database")
 
 
 # --- Config file path detection ---
@@ -515,8 +562,8 @@ def config_file_exists(path: str) -> bool:
     """
     Check if a config file exists on the host filesystem.
 
-    In Flatpak, uses flatpak-spawn to check the host filesystem.
-    Natively, uses os.path.isfile().
+    In Flatpak, checks the host filesystem through the host helper (or
+    flatpak-spawn). Natively, uses os.path.isfile().
 
     Args:
         path: Absolute path to the config file
@@ -525,16 +572,7 @@ def config_file_exists(path: str) -> bool:
         True if the file exists, False otherwise
     """
     if is_flatpak():
-        try:
-            result = subprocess.run(
-                ["flatpak-spawn", "--host", "test", "-f", path],
-                capture_output=True,
-                timeout=5,
-            )
-            return result.returncode == 0
-        except Exception as e:
-            logger.debug("Failed to check host file %s: %s", path, e)
-            return False
+        return host_path_exists(path)
     return os.path.isfile(path)
 
 
@@ -0,0 +1,277 @@
+# ClamUI ClamAV Probe Registry
+"""
+Shared cache for ClamAV capability probes.
+
+Checking whether ClamAV is usable means spawning helpers: ``which`` plus
+``clamscan --version``, ``clamdscan --version`` and ``clamdscan --ping``.
+The scanner, daemon scanner, Components view, Security Audit and
+``clamui status`` all asked the same questions, so back-to-back scans from
+the tray or file manager paid two to four process spawns each.
+
+ProbeRegistry memoizes probe results:
+
+- Each probe has a TTL, with a shorter one for failures so a freshly
+  installed or started component is noticed quickly
+- Each result can record the paths it depends on (binary, socket, database
+  directory). A lookup re-stats them, which costs no process spawn, and
+  drops the entry if any changed. These stat fingerprints take the place of
+  file monitors; where they can't see the paths (host files in Flatpak),
+  the TTL applies and the updater calls invalidate() after an update.
+- Concurrent lookups of the same probe share one in-flight run
+- refresh() re-runs several probes concurrently
+
+The ClamAV probes themselves are registered by clamav_detection, whose
+public check_* functions read through the shared registry.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Successful binary/version probes rarely change; watched paths catch upgrades
+DEFAULT_TTL = 300.0
+
+# Failed probes are retried soon so a fix is picked up without a restart
+DEFAULT_NEGATIVE_TTL = 15.0
+
+# Threads used by refresh()
+DEFAULT_MAX_WORKERS = 4
+
+Fingerprint = tuple[tuple[str, tuple[int, int, int] | None], ...]
+
+
+@dataclass
+class ProbeSpec:
+    """How to run and cache one kind of probe."""
+
+    func: Callable[..., Any]
+    ttl: float = DEFAULT_TTL
+    negative_ttl: float = DEFAULT_NEGATIVE_TTL
+    # Returns the paths whose change invalidates a result; called with the
+    # probe arguments after the probe ran
+    watch: Callable[..., Iterable[str]] | None = None
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    fingerprint: Fingerprint = field(default_factory=tuple)
+
+
+def _is_success(value: Any) -> bool:
+    """Probes return (ok, message) tuples or an optional value."""
+    if isinstance(value, tuple) and value:
+        return bool(value[0])
+    return value is not None
+
+
+def _stat_identity(path: str) -> tuple[int, int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _fingerprint(paths: Iterable[str]) -> Fingerprint:
+    return tuple((path, _stat_identity(path)) for path in dict.fromkeys(paths) if path)
+
+
+class ProbeRegistry:
+    """
+    Thread-safe, TTL-based cache of probe results.
+
+    Usage:
+        registry = get_probe_registry()
+        registry.register("clamscan", _probe_clamscan, ttl=300)
+        is_installed, version = registry.get("clamscan")
+        registry.refresh(["clamscan", "freshclam"])
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        """
+        Initialize the registry.
+
+        Args:
+            max_workers: Threads used to run probes concurrently in refresh()
+        """
+        self._specs: dict[str, ProbeSpec] = {}
+        self._entries: dict[tuple[Hashable, ...], _Entry] = {}
+        self._inflight: dict[tuple[Hashable, ...], Future] = {}
+        # Bumped by register()/invalidate() so a run that started before
+        # them can tell its result is stale
+        self._generation = 0
+        self._name_generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._max_workers = max(1, max_workers)
+        self._hits = 0
+        self._misses = 0
+
+    def register(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        ttl: float = DEFAULT_TTL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        watch: Callable[..., Iterable[str]] | None = None,
+    ) -> None:
+        """
+        Register (or replace) a probe.
+
+        Args:
+            name: Probe name used with get()
+            func: Function running the probe; its positional arguments become
+                  part of the cache key
+            ttl: Seconds a successful result stays fresh
+            negative_ttl: Seconds a failed result stays fresh
+            watch: Optional callable returning paths whose change invalidates
+                   a result; called with the probe arguments
+        """
+        with self._lock:
+            self._specs[name] = ProbeSpec(func, ttl, negative_ttl, watch)
+            self._drop_entries_locked(name)
+
+    def get(self, name: str, *args: Hashable, refresh: bool = False) -> Any:
+        """
+        Get a probe result, running the probe only if no fresh result exists.
+
+        Args:
+            name: Registered probe name
+            *args: Probe arguments (hashable)
+            refresh: Ignore any cached result
+
+        Returns:
+            The probe's return value
+
+        Raises:
+            KeyError: If no probe is registered under name
+        """
+        key = (name, *args)
+        with self._lock:
+            spec = self._specs[name]
+            generation = (self._generation, self._name_generations.get(name, 0))
+            if not refresh:
+                entry = self._entries.get(key)
+                if entry is not None and self._is_fresh(entry):
+                    self._hits += 1
+                    return entry.value
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self._misses += 1
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = spec.func(*args)
+            paths = spec.watch(*args) if spec.watch is not None else ()
+            fingerprint = _fingerprint(paths)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        ttl = spec.ttl if _is_success(value) else spec.negative_ttl
+        with self._lock:
+            self._inflight.pop(key, None)
+            # A registration or invalidation during the run means the result
+            # may describe the state from before it; don't cache it.
+            if generation == (self._generation, self._name_generations.get(name, 0)):
+                self._entries[key] = _Entry(value, time.monotonic() + ttl, fingerprint)
+        future.set_result(value)
+        return value
+
+    def peek(self, name: str, *args: Hashable) -> Any | None:
+        """Get a fresh cached result without running the probe, or None."""
+        with self._lock:
+            entry = self._entries.get((name, *args))
+            if entry is not None and self._is_fresh(entry):
+                return entry.value
+        return None
+
+    def refresh(
+        self, probes: Iterable[str | tuple[Hashable, ...]], force: bool = True
+    ) -> dict[str | tuple[Hashable, ...], Any]:
+        """
+        Run several probes concurrently.
+
+        Args:
+            probes: Probe names, or (name, *args) tuples for probes with arguments
+            force: Re-run probes even if a fresh result is cached
+
+        Returns:
+            Mapping of each requested probe to its result, or to the exception
+            it raised
+        """
+        requests = list(dict.fromkeys(probes))
+        if not requests:
+            return {}
+
+        def run(request):
+            name, *args = (request,) if isinstance(request, str) else request
+            return self.get(name, *args, refresh=force)
+
+        results: dict[str | tuple[Hashable, ...], Any] = {}
+        workers = min(self._max_workers, len(requests))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clamui-probe") as pool:
+            futures = {request: pool.submit(run, request) for request in requests}
+            for request, future in futures.items():
+                try:
+                    results[request] = future.result()
+                except Exception as e:
+                    results[request] = e
+        return results
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop cached results for one probe, or for all probes."""
+        with self._lock:
+            if name is None:
+                self._generation += 1
+                self._entries.clear()
+                return
+            self._drop_entries_locked(name)
+
+    def _drop_entries_locked(self, name: str) -> None:
+        self._name_generations[name] = self._name_generations.get(name, 0) + 1
+        for key in [k for k in self._entries if k[0] == name]:
+            del self._entries[key]
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, hits and misses
+        """
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self._hits, "misses": self._misses}
+
+    def _is_fresh(self, entry: _Entry) -> bool:
+        if time.monotonic() >= entry.expires_at:
+            return False
+        return all(_stat_identity(path) == identity for path, identity in entry.fingerprint)
+
+
+_registry = ProbeRegistry()
+
+
+def get_probe_registry() -> ProbeRegistry:
+    """
+    Get the process-wide ProbeRegistry instance.
+
+    Returns:
+        The shared ProbeRegistry
+    """
+    return _registry
@@ -0,0 +1,215 @@
+# ClamUI clamd Reload Module
+"""
+Post-update reload coordination for the ClamAV daemon.
+
+After freshclam replaces database files, clamd keeps scanning with the old
+signatures until its SelfCheck interval notices the change, and with large
+signature sets the reload itself can stall scans for a noticeable time.
+reload_clamd() asks clamd to reload straight away and polls VERSION until it
+reports a daily version different from the one it served before, so the
+update log can record how long the reload took.
+
+While a reload is in progress, daemon scans started through ClamUI wait (up
+to SCAN_HOLD_TIMEOUT) in wait_for_clamd_reload() instead of hitting a daemon
+that is busy swapping engines.
+
+clamd is reached over its local socket (zRELOAD/zVERSION); when the socket is
+not reachable, e.g. from inside Flatpak or with a TCP-only clamd,
+``clamdscan --reload`` and ``clamdscan --version`` are used instead.
+"""
+
+import logging
+import re
+import socket
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .clamav_detection import get_clamd_socket_path
+from .flatpak import is_flatpak, run_host_command
+
+logger = logging.getLogger(__name__)
+
+# Longest a daemon scan waits for a reload before going ahead anyway
+SCAN_HOLD_TIMEOUT = 30.0
+
+# Longest reload_clamd() polls VERSION for the new database
+RELOAD_TIMEOUT = 180.0
+_POLL_INTERVAL = 0.5
+_SOCKET_TIMEOUT = 5.0
+_CLAMDSCAN_TIMEOUT = 15
+
+# "ClamAV 1.0.3/27303/Mon Oct 19 08:21:02 2026"
+_VERSION_RE = re.compile(r"ClamAV\s+[^/\s]+/(?P<daily>\d+)")
+
+# Set while no reload is running; daemon scans wait on it
+_reload_idle = threading.Event()
+_reload_idle.set()
+
+
+@dataclass
+class ClamdReloadResult:
+    """Outcome of a post-update clamd reload."""
+
+    reloaded: bool
+    latency: float = 0.0
+    daily_version: int | None = None
+    error: str | None = None
+
+
+def parse_daily_version(reply: str) -> int | None:
+    """Extract the daily database version from a clamd VERSION reply."""
+    match = _VERSION_RE.search(reply or "")
+    return int(match.group("daily")) if match else None
+
+
+def wait_for_clamd_reload(timeout: float = SCAN_HOLD_TIMEOUT) -> bool:
+    """
+    Hold the caller while clamd reloads its database.
+
+    Returns:
+        True if no reload is running (any more), False if the wait timed out
+    """
+    if _reload_idle.is_set():
+        return True
+    logger.info("Waiting for clamd to finish reloading its database")
+    return _reload_idle.wait(timeout)
+
+
+def _socket_command(socket_path: str, command: str) -> str:
+    """
+    Send one NUL-delimited command to clamd and return its reply.
+
+    Raises:
+        OSError: If clamd cannot be reached or closes without replying
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(_SOCKET_TIMEOUT)
+        conn.connect(socket_path)
+        conn.sendall(f"z{command}\0".encode())
+        chunks = []
+        while True:
+            chunk = conn.recv(4096)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            if chunk.endswith(b"\0"):
+                break
+    reply = b"".join(chunks).rstrip(b"\0").decode("utf-8", errors="replace").strip()
+    if not reply:
+        raise OSError(f"clamd closed the connection without replying to {command}")
+    return reply
+
+
+def _clamdscan_command(command: str) -> str:
+    """
+    Run the clamdscan equivalent of a clamd command on the host.
+
+    Raises:
+        OSError: If clamdscan fails or is missing
+    """
+    flag = {"RELOAD": "--reload", "VERSION": "--version"}[command]
+    try:
+        result = run_host_command(["clamdscan", flag], timeout=_CLAMDSCAN_TIMEOUT)
+    except subprocess.TimeoutExpired as e:
+        raise OSError(f"clamdscan {flag} timed out") from e
+    if result.returncode != 0:
+        raise OSError(result.stderr.strip() or f"clamdscan {flag} failed")
+    return result.stdout.strip()
+
+
+class _ClamdConnection:
+    """Talks to clamd over its socket, or through clamdscan if that fails."""
+
+    def __init__(self, socket_path: str | None):
+        self._socket_path = socket_path
+
+    def probe(self) -> str:
+        """Send the first VERSION and settle on a transport for the run."""
+        if self._socket_path:
+            try:
+                return _socket_command(self._socket_path, "VERSION")
+            except OSError as e:
+                logger.debug("clamd socket %s unusable (%s); using clamdscan", self._socket_path, e)
+                self._socket_path = None
+        return _clamdscan_command("VERSION")
+
+    def command(self, command: str) -> str:
+        if self._socket_path:
+            return _socket_command(self._socket_path, command)
+        return _clamdscan_command(command)
+
+
+def reload_clamd(
+    expected_daily: int | None = None,
+    socket_path: str | None = None,
+    timeout: float = RELOAD_TIMEOUT,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> ClamdReloadResult:
+    """
+    Reload clamd's database and wait until it serves the new signatures.
+
+    Daemon scans started through ClamUI are held while this runs.
+
+    The reload counts as done once VERSION reports a daily version other
+    than the one clamd served before RELOAD, which also covers a rollback to
+    an older set. When no change is expected (the installed daily version is
+    unknown or already served, e.g. only main or bytecode changed), VERSION
+    cannot tell the engines apart; the first reply after RELOAD is used then.
+    clamd answers it only after a blocking reload, and a concurrent reload
+    keeps serving scans from the old engine.
+
+    Args:
+        expected_daily: Daily version now installed on disk, if known
+        socket_path: clamd socket; auto-detected when None
+        timeout: Seconds to wait for the new version
+        clock: Monotonic clock (injectable for tests)
+        sleep: Sleep function (injectable for tests)
+
+    Returns:
+        ClamdReloadResult; reloaded is False if clamd could not be asked to
+        reload or never reported the new version in time
+    """
+    if socket_path is None and not is_flatpak():
+        socket_path = get_clamd_socket_path()
+    connection = _ClamdConnection(socket_path)
+
+    try:
+        # Make sure clamd is there at all before holding any scans
+        served_daily = parse_daily_version(connection.probe())
+    except OSError as e:
+        return ClamdReloadResult(reloaded=False, error=str(e))
+    wait_for_change = (
+        expected_daily is not None and served_daily is not None and expected_daily != served_daily
+    )
+
+    _reload_idle.clear()
+    start = clock()
+    try:
+        try:
+            connection.command("RELOAD")
+        except OSError as e:
+            return ClamdReloadResult(reloaded=False, error=str(e))
+
+        while True:
+            elapsed = clock() - start
+            try:
+                daily = parse_daily_version(connection.command("VERSION"))
+            except OSError:
+                # A blocking reload refuses or stalls connections until done
+                daily = None
+            if daily is not None and (not wait_for_change or daily != served_daily):
+                return ClamdReloadResult(reloaded=True, latency=elapsed, daily_version=daily)
+            if elapsed >= timeout:
+                return ClamdReloadResult(
+                    reloaded=False,
+                    latency=elapsed,
+                    daily_version=daily,
+                    error=f"clamd did not report the new database within {timeout:.0f}s",
+                )
+            sleep(_POLL_INTERVAL)
+    finally:
+        _reload_idle.set()
@@ -4,36 +4,49 @@ Daemon scanner module for ClamUI using clamdscan for clamd communication.
 Provides faster scanning by leveraging the ClamAV daemon's in-memory database.
 """
 
-import contextlib
 import fnmatch
 import logging
 import os
 import subprocess
-import tempfile
 import threading
-import time
 from collections.abc import Callable
 from pathlib import Path
 
-from gi.repository import GLib
-
-from .flatpak import is_flatpak, wrap_host_command
+from .clamd_reload import wait_for_clamd_reload
+from .flatpak import wrap_host_command
 from .log_manager import LogManager
-from .sanitize import sanitize_surrogate_path
+from .main_loop import idle_add
+from .resource_governor import ResourceGovernor, ResourcePolicy, governed_command, resolve_policy
+from .scan_timing import (
+    PHASE_COUNT,
+    PHASE_FILE_LIST,
+    PHASE_FILTER,
+    PHASE_PARSE,
+    PHASE_PROBE,
+    PHASE_SCAN,
+    PHASE_VALIDATE,
+    ScanTimer,
+)
 from .scanner_base import (
+    GlobalExclusions,
     cleanup_process,
     collect_clamav_warnings,
     communicate_with_cancel_check,
     create_cancelled_result,
     create_error_result,
+    file_list_temp_dir,
+    finish_scan,
     is_genuine_error_line,
+    read_global_exclusions,
+    remove_file_list,
     resolve_exit2_status,
     save_scan_log,
     stream_process_output,
     terminate_process_gracefully,
+    write_file_list,
 )
 from .scanner_types import ScanProgress, ScanResult, ScanStatus, ThreatDetail
-from .settings_manager import SettingsManager
+from .settings_manager import SettingsManager, SnapshotCache, settings_view
 from .threat_classifier import (
     categorize_threat,
     classify_threat_severity_str,
@@ -42,6 +55,7 @@ from .utils import (
     check_clamd_connection,
     check_clamdscan_installed,
     get_clean_env,
+    invalidate_clamav_probes,
     resolve_clamd_conf_path,
     validate_path,
 )
@@ -61,6 +75,7 @@ class DaemonScanner:
         self,
         log_manager: LogManager | None = None,
         settings_manager: SettingsManager | None = None,
+        config_path: str | None = None,
     ):
         """
         Initialize the daemon scanner.
@@ -69,15 +84,26 @@ class DaemonScanner:
             log_manager: Optional LogManager instance for saving scan logs.
             settings_manager: Optional SettingsManager instance for reading
                               exclusion patterns and daemon settings.
+            config_path: Optional clamd.conf to use instead of the configured
+                         one (e.g. the private daemon's generated config).
         """
         self._current_process: subprocess.Popen | None = None
         self._process_lock = threading.Lock()
         self._cancel_event = threading.Event()
         self._log_manager = log_manager if log_manager else LogManager()
         self._settings_manager = settings_manager
+        self._config_path = config_path
+        # Rebuilt only when the settings version changes
+        self._exclusions_cache = SnapshotCache(read_global_exclusions)
+
+    def _global_exclusions(self) -> GlobalExclusions:
+        """Enabled global exclusions, read from the current settings snapshot."""
+        return self._exclusions_cache.get(settings_view(self._settings_manager))
 
     def _get_clamd_config_path(self) -> str | None:
         """Resolve the configured clamd.conf path when settings are available."""
+        if self._config_path is not None:
+            return self._config_path
         if self._settings_manager is None:
             return None
 
@@ -127,6 +153,8 @@ class DaemonScanner:
         count_targets: bool = True,
         progress_callback: Callable[[ScanProgress], None] | None = None,
         force_stream: bool = False,
+        file_paths: list[str] | None = None,
+        resource_policy: ResourcePolicy | None = None,
     ) -> ScanResult:
         """
         Execute a synchronous scan using clamdscan.
@@ -147,44 +175,63 @@ class DaemonScanner:
                               ScanProgress updates as files are scanned.
             force_stream: Force clamdscan to use the INSTREAM protocol for this
                           scan instead of the faster fdpass/multiscan path.
+            file_paths: Optional files under ``path`` to scan instead of the
+                        whole tree, in scan order. Skips target counting.
+            resource_policy: Optional limits for the clamdscan client and the
+                        file walk. clamd itself keeps its own priority.
+                        Defaults to the interactive scan priority.
 
         Returns:
             ScanResult with scan details
         """
-        start_time = time.monotonic()
+        timer = ScanTimer()
 
         # Reset cancel event at the start of every scan
         # This ensures a previous cancelled scan doesn't affect new scans
         self._cancel_event.clear()
 
         # Validate the path first
+        timer.begin(PHASE_VALIDATE)
         is_valid, error = validate_path(path)
         if not is_valid:
             result = create_error_result(path, error or "Invalid path")
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
+
+        # A post-update database reload may be in progress; give clamd a
+        # moment rather than scanning against a daemon that is swapping engines
+        timer.begin(PHASE_PROBE)
+        if not wait_for_clamd_reload():
+            logger.warning("clamd is still reloading its database; scanning anyway")
 
         # Check daemon is available
         is_available, error_msg = self.check_available()
         if not is_available:
             result = create_error_result(path, error_msg or "Daemon not available")
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
 
         # Count files/directories before scanning (clamdscan doesn't report these).
         # Also collect file paths whenever live progress is enabled or exclusions
         # are active, because clamdscan only respects exclusions when ClamUI feeds
         # an explicit file list instead of a directory root.
-        use_file_list = progress_callback is not None or self._has_active_exclusions(
-            profile_exclusions
+        use_file_list = (
+            file_paths is not None
+            or progress_callback is not None
+            or self._has_active_exclusions(profile_exclusions)
         )
         should_count = count_targets or use_file_list
         file_list_path: str | None = None
-        file_paths: list[str] | None = None
+        if resource_policy is None:
+            resource_policy = resolve_policy(settings_view(self._settings_manager))
 
-        if should_count:
+        if file_paths is not None:
+            file_count, dir_count = len(file_paths), 0
+        elif should_count:
+            timer.begin(PHASE_COUNT)
             file_count, dir_count, file_paths = self._count_scan_targets(
-                path, profile_exclusions, collect_paths=use_file_list
+                path,
+                profile_exclusions,
+                collect_paths=use_file_list,
+                governor=ResourceGovernor(resource_policy),
             )
         else:
             file_count, dir_count = 0, 0
@@ -192,8 +239,7 @@ class DaemonScanner:
         # Check if cancelled during counting phase
         if self._cancel_event.is_set():
             result = create_cancelled_result(path)
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
 
         try:
             if use_file_list and not file_paths:
@@ -210,30 +256,17 @@ class DaemonScanner:
                     error_message=None,
                     threat_details=[],
                 )
-                self._save_scan_log(result, time.monotonic() - start_time)
-                return result
+                return self._finish_scan(result, timer)
 
             # Write file list to temp file for progress mode
             # clamdscan only emits per-file output with --file-list, not when
             # scanning a directory (which produces a single summary line)
             if use_file_list and file_paths:
-                fd, file_list_path = tempfile.mkstemp(
-                    prefix="clamui_filelist_",
-                    suffix=".txt",
-                    dir=self._get_file_list_temp_dir(),
-                )
-                os.fchmod(fd, 0o600)
-                try:
-                    f = os.fdopen(fd, "w")
-                except Exception:
-                    with contextlib.suppress(OSError):
-                        os.close(fd)
-                    raise
-
-                with f:
-                    f.write("\n".join(sanitize_surrogate_path(p) for p in file_paths))
+                timer.begin(PHASE_FILE_LIST)
+                file_list_path = write_file_list(file_paths, self._get_file_list_temp_dir())
 
             # Build clamdscan command (use verbose mode if progress callback provided)
+            timer.begin(PHASE_SCAN, watch_output=progress_callback is not None)
             cmd = self._build_command(
                 path,
                 recursive,
@@ -241,6 +274,7 @@ class DaemonScanner:
                 verbose=progress_callback is not None,
                 file_list_path=file_list_path,
                 force_stream=force_stream,
+                resource_policy=resource_policy,
             )
 
             with self._process_lock:
@@ -268,7 +302,7 @@ class DaemonScanner:
                         progress_infected_count,
                         progress_infected_files,
                     ) = self._scan_with_progress(
-                        self._current_process, progress_callback, file_count
+                        self._current_process, timer.observe(progress_callback), file_count
                     )
                 else:
                     # Use standard blocking communication
@@ -299,41 +333,34 @@ class DaemonScanner:
                     infected_files=progress_infected_files,
                     infected_count=progress_infected_count,
                 )
-                self._save_scan_log(result, time.monotonic() - start_time)
-                return result
+                return self._finish_scan(result, timer)
 
             # Parse the results
+            timer.begin(PHASE_PARSE)
             result = self._parse_results(path, stdout, stderr, exit_code, file_count, dir_count)
+            if result.status == ScanStatus.ERROR:
+                # The daemon may have gone away; re-ping it before the next scan
+                invalidate_clamav_probes("clamd")
 
             # Apply exclusion filtering (clamdscan doesn't support --exclude)
+            timer.begin(PHASE_FILTER)
             result = self._filter_excluded_threats(result, profile_exclusions)
 
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
 
         except FileNotFoundError:
             result = create_error_result(path, "clamdscan executable not found")
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
         except PermissionError as e:
             result = create_error_result(path, f"Permission denied: {e}", str(e))
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
         except Exception as e:
             result = create_error_result(path, f"Scan failed: {e}", str(e))
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
         finally:
             # Clean up temp file list
             if file_list_path is not None:
-                try:
-                    os.unlink(file_list_path)
-                except OSError:
-                    logger.debug(
-                        "Failed to remove temporary clamd file list %s",
-                        file_list_path,
-                        exc_info=True,
-                    )
+                remove_file_list(file_list_path)
 
     def scan_async(
         self,
@@ -368,7 +395,7 @@ class DaemonScanner:
             result = self.scan_sync(
                 path, recursive, profile_exclusions, count_targets, progress_callback
             )
-            GLib.idle_add(callback, result)
+            idle_add(callback, result)
 
         thread = threading.Thread(target=scan_thread)
         thread.daemon = True
@@ -397,6 +424,7 @@ class DaemonScanner:
         verbose: bool = False,
         file_list_path: str | None = None,
         force_stream: bool = False,
+        resource_policy: ResourcePolicy | None = None,
     ) -> list[str]:
         """
         Build the clamdscan command arguments.
@@ -419,6 +447,8 @@ class DaemonScanner:
             file_list_path: Path to temp file containing one file path per line.
                     Used in verbose mode for per-file progress output.
             force_stream: Whether to force client-side streaming for this scan.
+            resource_policy: Optional limits; adds systemd-run, nice and
+                    ionice prefixes for the clamdscan client.
 
         Returns:
             List of command arguments (wrapped with flatpak-spawn if in Flatpak)
@@ -471,7 +501,7 @@ class DaemonScanner:
             cmd.append("--")
             cmd.append(path)
 
-        return wrap_host_command(cmd, force_host=True)
+        return wrap_host_command(governed_command(cmd, resource_policy), force_host=True)
 
     def _get_file_list_temp_dir(self) -> str | None:
         """
@@ -482,17 +512,7 @@ class DaemonScanner:
         are not necessarily visible to that host process, so daemon file lists
         must live in a host-visible app cache directory.
         """
-        if is_flatpak():
-            cache_dir = Path.home() / ".cache" / "clamui"
-            cache_dir.mkdir(parents=True, exist_ok=True)
-            with contextlib.suppress(OSError):
-                os.chmod(cache_dir, 0o700)
-            return str(cache_dir)
-
-        runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
-        if runtime_dir and os.path.isdir(runtime_dir):
-            return runtime_dir
-        return None
+        return file_list_temp_dir()
 
     def _scan_with_progress(
         self,
@@ -627,6 +647,7 @@ class DaemonScanner:
         path: str,
         profile_exclusions: dict | None = None,
         collect_paths: bool = False,
+        governor: ResourceGovernor | None = None,
     ) -> tuple[int, int, list[str] | None]:
         """
         Count files and directories that will be scanned.
@@ -649,6 +670,7 @@ class DaemonScanner:
             path: Path to scan
             profile_exclusions: Optional exclusions from a scan profile.
             collect_paths: If True, collect and return all file paths.
+            governor: Optional governor that pauses the walk under load.
 
         Returns:
             Tuple of (file_count, dir_count, file_paths).
@@ -670,19 +692,9 @@ class DaemonScanner:
         exclude_dirs: list[str] = []
 
         # Global exclusions from settings
-        if self._settings_manager is not None:
-            exclusions = self._settings_manager.get("exclusion_patterns", [])
-            for exclusion in exclusions:
-                if not exclusion.get("enabled", True):
-                    continue
-                pattern = exclusion.get("pattern", "")
-                if not pattern:
-                    continue
-                exclusion_type = exclusion.get("type", "pattern")
-                if exclusion_type == "directory":
-                    exclude_dirs.append(pattern)
-                else:
-                    exclude_patterns.append(pattern)
+        global_exclusions = self._global_exclusions()
+        exclude_dirs.extend(global_exclusions.directories)
+        exclude_patterns.extend(global_exclusions.patterns)
 
         # Profile exclusions
         if profile_exclusions:
@@ -707,6 +719,8 @@ class DaemonScanner:
                 if self._cancel_event.is_set():
                     logger.info("File counting cancelled by user")
                     return (0, 0, None)
+                if governor is not None:
+                    governor.wait_for_headroom(self._cancel_event.is_set)
 
                 # Filter out excluded directories (modifies dirs in-place)
                 dirs[:] = [
@@ -737,11 +751,8 @@ class DaemonScanner:
 
     def _has_active_exclusions(self, profile_exclusions: dict | None = None) -> bool:
         """Return True when any enabled exclusion requires file-list filtering."""
-        if self._settings_manager is not None:
-            exclusions = self._settings_manager.get("exclusion_patterns", [])
-            for exclusion in exclusions:
-                if exclusion.get("enabled", True) and exclusion.get("pattern", ""):
-                    return True
+        if self._global_exclusions().entries:
+            return True
 
         if profile_exclusions:
             if any(path for path in profile_exclusions.get("paths", [])):
@@ -919,14 +930,7 @@ class DaemonScanner:
         patterns: list[str] = []
 
         # Global exclusions from settings
-        if self._settings_manager is not None:
-            exclusions = self._settings_manager.get("exclusion_patterns", [])
-            for exclusion in exclusions:
-                if not exclusion.get("enabled", True):
-                    continue
-                pattern = exclusion.get("pattern", "")
-                if pattern:
-                    patterns.append(pattern)
+        patterns.extend(self._global_exclusions().all_patterns)
 
         # Profile exclusions - patterns
         if profile_exclusions:
@@ -1086,3 +1090,7 @@ class DaemonScanner:
     def _save_scan_log(self, result: ScanResult, duration: float) -> None:
         """Save scan result to log."""
         save_scan_log(self._log_manager, result, duration, suffix="(daemon)")
+
+    def _finish_scan(self, result: ScanResult, timer: ScanTimer) -> ScanResult:
+        """Attach timing to the result and save it to the log."""
+        return finish_scan(result, timer, self._save_scan_log)
@@ -0,0 +1,403 @@
+# ClamUI Database Inventory Module
+"""
+One-pass inventory of the installed ClamAV signature databases.
+
+Every ``.cvd``/``.cld``/``.cud`` file starts with a 512-byte text header:
+
+    ClamAV-VDB:build_date:version:signatures:flevel:md5:dsig:builder:stime
+
+DatabaseInventory lists every known database directory (DatabaseDirectory
+from freshclam.conf first, then distro defaults), reads all headers in one
+pass and caches the result until a directory's mtime changes. freshclam
+installs databases by renaming files into place, so a directory mtime change
+is exactly "the database set changed".
+
+Headers are read concurrently: natively with a small thread pool, in Flatpak
+as one pipelined batch through the host helper (or one host shell command
+when the helper is unavailable). The audit, the clamd health probe, the
+preferences database page and ``clamui status`` all read the same snapshot.
+"""
+
+import base64
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from .flatpak import is_flatpak, run_host_command
+from .host_broker import HostBrokerError, get_host_broker
+from .i18n import _
+
+logger = logging.getLogger(__name__)
+
+DATABASE_SUFFIXES = (".cvd", ".cld", ".cud")
+_GLOB_PATTERNS = ["*.cvd", "*.cld", "*.cud"]
+_HEADER_SIZE = 512
+_MAX_READ_WORKERS = 8
+
+# Snapshots whose directories cannot be stat'ed cheaply (Flatpak without the
+# host helper) are reused for this long
+_UNOBSERVABLE_TTL = 60.0
+
+# Prints "<path>\t<size>\t<header>" per database file for one directory;
+# NULs and newlines in the header are dropped so each file stays on one line
+_HOST_LIST_SCRIPT = r"""
+for f in "$1"/*.[cC][vV][dD] "$1"/*.[cC][lL][dD] "$1"/*.[cC][uU][dD]; do
+    [ -f "$f" ] || continue
+    printf '%s\t%s\t' "$f" "$(stat -c %s "$f" 2>/dev/null || echo 0)"
+    head -c 512 "$f" 2>/dev/null | tr -d '\000\n\t'
+    printf '\n'
+done
+"""
+
+
+@dataclass(frozen=True)
+class DatabaseFileInfo:
+    """Header fields of one installed database file."""
+
+    name: str
+    path: str
+    size: int = 0
+    version: int | None = None
+    signatures: int | None = None
+    flevel: int | None = None
+    build_date: str | None = None
+    build_time: int | None = None  # Unix time the database was built
+    error: str | None = None
+
+    @property
+    def database(self) -> str:
+        """Database name without extension, e.g. "daily"."""
+        return os.path.splitext(self.name)[0]
+
+    def age_days(self, now: float | None = None) -> int | None:
+        """Whole days since the database was built, if known."""
+        if self.build_time is None:
+            return None
+        return int(((now if now is not None else time.time()) - self.build_time) / 86400)
+
+
+@dataclass
+class DatabaseInventorySnapshot:
+    """All database files found in one inventory pass."""
+
+    directories: list[str] = field(default_factory=list)
+    files: list[DatabaseFileInfo] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)  # directory -> error
+    scanned_at: float = 0.0
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.files
+
+    @property
+    def total_signatures(self) -> int:
+        return sum(info.signatures or 0 for info in self.databases())
+
+    def databases(self) -> list[DatabaseFileInfo]:
+        """
+        One file per database name, from the highest-priority directory.
+
+        A database may exist in several known directories (e.g. a stale copy
+        under /usr/local/share/clamav); the one clamd would load wins.
+        """
+        seen: dict[str, DatabaseFileInfo] = {}
+        for info in self.files:
+            seen.setdefault(info.database, info)
+        return list(seen.values())
+
+    def find(self, database: str) -> DatabaseFileInfo | None:
+        """Return the file for a database name such as "daily", if installed."""
+        for info in self.files:
+            if info.database == database:
+                return info
+        return None
+
+
+def parse_cvd_header(data: bytes | str) -> dict | None:
+    """
+    Parse the header of a .cvd/.cld/.cud file.
+
+    Args:
+        data: At least the first few hundred bytes of the file
+
+    Returns:
+        Dict with build_date, version, signatures, flevel and build_time
+        (build_time None if unparseable), or None if this is not a database
+        header at all
+    """
+    header = data.decode("ascii", errors="ignore") if isinstance(data, bytes) else data
+    fields = header.split(":")
+    if len(fields) < 9 or not fields[0].startswith("ClamAV-VDB"):
+        return None
+
+    def number(value: str) -> int | None:
+        value = value.strip()
+        return int(value) if value.isdigit() else None
+
+    # The stime field is followed directly by the compressed payload (or by
+    # padding) with no delimiter, so only its leading digits are the time
+    match = re.match(r"\d+", fields[8].strip().strip("\x00"))
+    return {
+        "build_date": fields[1].strip() or None,
+        "version": number(fields[2]),
+        "signatures": number(fields[3]),
+        "flevel": number(fields[4]),
+        "build_time": int(match.group()) if match else None,
+    }
+
+
+def _file_info(path: str, size: int, header: bytes | str | None, error: str | None = None):
+    name = os.path.basename(path)
+    if header is None:
+        return DatabaseFileInfo(name=name, path=path, size=size, error=error)
+    parsed = parse_cvd_header(header)
+    if parsed is None:
+        return DatabaseFileInfo(
+            name=name, path=path, size=size, error=_("Invalid database file format")
+        )
+    return DatabaseFileInfo(name=name, path=path, size=size, **parsed)
+
+
+def _read_local_file(path: str) -> DatabaseFileInfo:
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            return _file_info(path, size, f.read(_HEADER_SIZE))
+    except PermissionError:
+        return _file_info(path, 0, None, _("Permission denied reading database"))
+    except OSError as e:
+        return _file_info(path, 0, None, str(e))
+
+
+def _list_local_dir(directory: str) -> tuple[list[str], str | None]:
+    try:
+        with os.scandir(directory) as entries:
+            paths = [
+                entry.path
+                for entry in entries
+                if entry.name.lower().endswith(DATABASE_SUFFIXES) and entry.is_file()
+            ]
+    except FileNotFoundError:
+        return [], _("Database directory does not exist: {path}").format(path=directory)
+    except PermissionError:
+        return [], _("Permission denied accessing: {path}").format(path=directory)
+    except OSError as e:
+        return [], _("Error accessing database: {error}").format(error=e)
+    return sorted(paths), None
+
+
+def _scan_local(directories: list[str]) -> DatabaseInventorySnapshot:
+    snapshot = DatabaseInventorySnapshot(directories=list(directories))
+    paths: list[str] = []
+    for directory in directories:
+        found, error = _list_local_dir(directory)
+        if error:
+            snapshot.errors[directory] = error
+        paths.extend(found)
+    if paths:
+        with ThreadPoolExecutor(max_workers=min(_MAX_READ_WORKERS, len(paths))) as pool:
+            snapshot.files = list(pool.map(_read_local_file, paths))
+    return snapshot
+
+
+def _broker_error_text(error: HostBrokerError, directory: str) -> str:
+    if error.code == "not_found":
+        return _("Database directory does not exist: {path}").format(path=directory)
+    if error.code == "permission":
+        return _("Permission denied accessing: {path}").format(path=directory)
+    return _("Error accessing host database directory {path}: {error}").format(
+        path=directory, error=error
+    )
+
+
+def _scan_host_broker(broker, directories: list[str]) -> DatabaseInventorySnapshot:
+    snapshot = DatabaseInventorySnapshot(directories=list(directories))
+    listings = broker.batch(
+        [
+            (
+                "glob",
+                {
+                    "directory": d,
+                    "patterns": _GLOB_PATTERNS,
+                    "ignore_case": True,
+                    "files_only": True,
+                },
+            )
+            for d in directories
+        ]
+    )
+    paths: list[str] = []
+    for directory, listing in zip(directories, listings, strict=True):
+        if isinstance(listing, HostBrokerError):
+            snapshot.errors[directory] = _broker_error_text(listing, directory)
+        else:
+            paths.extend(listing["paths"])
+
+    # Size and header of every file in one pipelined round trip
+    requests: list[tuple[str, dict]] = []
+    for path in paths:
+        requests.append(("stat", {"path": path}))
+        requests.append(("read_range", {"path": path, "offset": 0, "length": _HEADER_SIZE}))
+    replies = broker.batch(requests) if requests else []
+    for index, path in enumerate(paths):
+        stat_reply, read_reply = replies[2 * index], replies[2 * index + 1]
+        size = stat_reply.get("size", 0) if isinstance(stat_reply, dict) else 0
+        if isinstance(read_reply, HostBrokerError):
+            error = (
+                _("Permission denied reading database")
+                if read_reply.code == "permission"
+                else str(read_reply)
+            )
+            snapshot.files.append(_file_info(path, size, None, error))
+        else:
+            snapshot.files.append(_file_info(path, size, base64.b64decode(read_reply["data"])))
+    return snapshot
+
+
+def _scan_host_shell(directories: list[str]) -> DatabaseInventorySnapshot:
+    snapshot = DatabaseInventorySnapshot(directories=list(directories))
+    for directory in directories:
+        try:
+            result = run_host_command(
+                ["sh", "-c", _HOST_LIST_SCRIPT, "sh", directory], timeout=10, text=False
+            )
+        except subprocess.TimeoutExpired:
+            snapshot.errors[directory] = _(
+                "Timed out checking host database directory: {path}"
+            ).format(path=directory)
+            continue
+        except OSError as e:
+            snapshot.errors[directory] = _(
+                "Error checking host database directory: {error}"
+            ).format(error=e)
+            continue
+        for raw_line in result.stdout.split(b"\n"):
+            parts = raw_line.split(b"\t", 2)
+            if len(parts) != 3:
+                continue
+            path = parts[0].decode("utf-8", errors="replace")
+            size = int(parts[1]) if parts[1].isdigit() else 0
+            snapshot.files.append(_file_info(path, size, parts[2]))
+    return snapshot
+
+
+def _default_directories() -> list[str]:
+    from . import clamav_detection
+
+    return clamav_detection.get_host_database_dirs()
+
+
+class DatabaseInventory:
+    """
+    Cached inventory of installed ClamAV databases.
+
+    Usage:
+        snapshot = get_database_inventory().get()
+        daily = snapshot.find("daily")
+    """
+
+    def __init__(
+        self,
+        directories: Callable[[], list[str]] = _default_directories,
+        unobservable_ttl: float = _UNOBSERVABLE_TTL,
+    ):
+        """
+        Initialize the inventory.
+
+        Args:
+            directories: Returns the database directories to scan, in
+                priority order
+            unobservable_ttl: Reuse period when directory mtimes cannot be
+                checked cheaply
+        """
+        self._directories = directories
+        self._unobservable_ttl = unobservable_ttl
+        self._lock = threading.Lock()
+        self._snapshot: DatabaseInventorySnapshot | None = None
+        self._fingerprint: tuple | None = None
+
+    def _fingerprint_for(self, directories: list[str]) -> tuple | None:
+        """Directory mtimes, or None when they cannot be observed cheaply."""
+        if is_flatpak():
+            broker = get_host_broker()
+            if broker is None:
+                return None
+            try:
+                replies = broker.batch([("stat", {"path": d}) for d in directories])
+            except HostBrokerError as e:
+                logger.debug("Host helper cannot stat database directories: %s", e)
+                return None
+            return tuple(
+                (d, reply.get("mtime_ns") if isinstance(reply, dict) else None)
+                for d, reply in zip(directories, replies, strict=True)
+            )
+        identities = []
+        for directory in directories:
+            try:
+                identities.append((directory, os.stat(directory).st_mtime_ns))
+            except OSError:
+                identities.append((directory, None))
+        return tuple(identities)
+
+    def _scan(self, directories: list[str]) -> DatabaseInventorySnapshot:
+        if not is_flatpak():
+            return _scan_local(directories)
+        broker = get_host_broker()
+        if broker is not None:
+            try:
+                return _scan_host_broker(broker, directories)
+            except HostBrokerError as e:
+                logger.debug("Host helper database inventory failed: %s", e)
+        return _scan_host_shell(directories)
+
+    def get(self, refresh: bool = False) -> DatabaseInventorySnapshot:
+        """
+        Return the current inventory, rescanning only if a directory changed.
+
+        Args:
+            refresh: Rescan even if nothing appears to have changed
+        """
+        with self._lock:
+            directories = self._directories()
+            fingerprint = self._fingerprint_for(directories)
+            snapshot = self._snapshot
+            if snapshot is not None and not refresh and snapshot.directories == directories:
+                if fingerprint is not None and fingerprint == self._fingerprint:
+                    return snapshot
+                if (
+                    fingerprint is None
+                    and self._fingerprint is None
+                    and time.monotonic() - snapshot.scanned_at < self._unobservable_ttl
+                ):
+                    return snapshot
+
+            snapshot = self._scan(directories)
+            snapshot.scanned_at = time.monotonic()
+            self._snapshot = snapshot
+            self._fingerprint = fingerprint
+            return snapshot
+
+    def invalidate(self) -> None:
+        """Forget the cached snapshot so the next get() rescans."""
+        with self._lock:
+            self._snapshot = None
+            self._fingerprint = None
+
+
+_inventory: DatabaseInventory | None = None
+_inventory_lock = threading.Lock()
+
+
+def get_database_inventory() -> DatabaseInventory:
+    """Return the shared DatabaseInventory instance."""
+    global _inventory
+    with _inventory_lock:
+        if _inventory is None:
+            _inventory = DatabaseInventory()
+        return _inventory
@@ -0,0 +1,173 @@
+# ClamUI Database Snapshot Module
+"""
+Cheap snapshots of ClamAV signature database files.
+
+A forced update used to copy every ``*.cvd``/``*.cld``/``*.cud`` file (main.cvd
+alone is well over 100 MB) before freshclam ran, and copy them all back on
+failure. freshclam and the force-update transaction replace database files
+with rename(2) instead of rewriting them, so a hard link to the old inode is a
+complete, zero-I/O snapshot: the live name moves on to a new inode while the
+link keeps the old generation.
+
+clone_file() tries, in order:
+
+- a hard link (same filesystem, no data I/O)
+- a FICLONE reflink (copy-on-write filesystems such as Btrfs and XFS, where
+  hard links are not allowed)
+- a plain copy
+
+snapshot_matches() is the cheap verification: identical inode, or identical
+size and CVD header block. It never reads whole files.
+"""
+
+import errno
+import logging
+import os
+import shutil
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Database file globs handled by snapshots
+DATABASE_PATTERNS = ("*.cvd", "*.cld", "*.cud")
+
+# Directory inside the database directory that keeps the database set replaced
+# by the last successful forced update, for rollback
+LAST_KNOWN_GOOD_DIRNAME = ".clamui-last-good"
+
+# Snapshot methods reported by clone_file()
+HARDLINK = "hardlink"
+REFLINK = "reflink"
+COPY = "copy"
+
+# CVD/CLD/CUD files start with a 512-byte text header (name, version,
+# signature count, build time, digest)
+_HEADER_SIZE = 512
+
+# ioctl(2) request for FICLONE, _IOW(0x94, 9, int)
+_FICLONE = 0x40049409
+
+# Errors that mean "this kind of link is not possible here", as opposed to a
+# real failure such as a missing source or a full disk
+_UNSUPPORTED_ERRNOS = frozenset(
+    {
+        errno.EXDEV,
+        errno.EPERM,
+        errno.EACCES,
+        errno.EMLINK,
+        errno.ENOTSUP,
+        errno.EOPNOTSUPP,
+        errno.EINVAL,
+        errno.ENOTTY,
+        errno.ENOSYS,
+    }
+)
+
+
+def iter_database_files(directory: Path) -> list[Path]:
+    """Return the database files directly inside directory, sorted by name."""
+    files: list[Path] = []
+    for pattern in DATABASE_PATTERNS:
+        files.extend(path for path in directory.glob(pattern) if path.is_file())
+    return sorted(files, key=lambda path: path.name)
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Try a FICLONE reflink of src to dst; returns False if unsupported."""
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - non-POSIX
+        return False
+
+    cloned = False
+    try:
+        with open(src, "rb") as src_file, open(dst, "xb") as dst_file:
+            try:
+                fcntl.ioctl(dst_file.fileno(), _FICLONE, src_file.fileno())
+                cloned = True
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+    except OSError:
+        dst.unlink(missing_ok=True)
+        raise
+    if not cloned:
+        dst.unlink(missing_ok=True)
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def clone_file(src: Path, dst: Path) -> str:
+    """
+    Snapshot src at dst as cheaply as the filesystem allows.
+
+    Args:
+        src: Existing database file
+        dst: New path; must not exist
+
+    Returns:
+        The method used: HARDLINK, REFLINK or COPY
+
+    Raises:
+        OSError: If no method could create the snapshot
+    """
+    try:
+        os.link(src, dst)
+        return HARDLINK
+    except OSError as e:
+        if e.errno not in _UNSUPPORTED_ERRNOS:
+            raise
+        logger.debug("Hard link of %s not possible: %s", src.name, e)
+
+    if _reflink(src, dst):
+        return REFLINK
+
+    shutil.copy2(src, dst)
+    return COPY
+
+
+def _read_header(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read(_HEADER_SIZE)
+
+
+def snapshot_matches(src: Path, dst: Path) -> bool:
+    """
+    Check that dst is a usable snapshot of src without reading either fully.
+
+    Hard links are verified by inode; reflinks and copies by size plus the
+    512-byte database header, which carries the version and build time.
+    """
+    try:
+        src_stat = src.stat()
+        dst_stat = dst.stat()
+        if (src_stat.st_dev, src_stat.st_ino) == (dst_stat.st_dev, dst_stat.st_ino):
+            return True
+        if src_stat.st_size != dst_stat.st_size:
+            return False
+        return _read_header(src) == _read_header(dst)
+    except OSError:
+        return False
+
+
+def replace_from_snapshot(snapshot: Path, target: Path) -> str:
+    """
+    Atomically replace target with a clone of snapshot.
+
+    The clone is made next to target and renamed over it, so readers see
+    either the old or the restored file, and the snapshot stays intact for
+    further rollbacks.
+
+    Returns:
+        The clone method used
+    """
+    temp_path = target.with_name(f".{target.name}.clamui-restore")
+    temp_path.unlink(missing_ok=True)
+    try:
+        method = clone_file(snapshot, temp_path)
+        os.replace(temp_path, target)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return method
@@ -2,7 +2,12 @@
 """
 Device monitor module for ClamUI providing automatic scanning of newly
 connected storage devices. Uses Gio.VolumeMonitor to detect mount events
-and triggers background ClamAV scans with configurable options.
+and queues background ClamAV scans with the shared ScanScheduler, which
+runs the smallest devices first within the scan concurrency limit.
+
+In quick mode the mount is walked first (see device_scan_plan) so that
+autorun files and executables are scanned before bulk media, and the
+scan-started notification carries a time estimate.
 """
 
 import logging
@@ -15,16 +20,24 @@ from enum import Enum
 from gi.repository import Gio, GLib
 
 from .battery_manager import BatteryManager
+from .device_scan_plan import DEVICE_SCAN_MODE_QUICK, QuickScanPlan, plan_quick_scan
 from .i18n import _
+from .main_loop import idle_add
+from .resource_governor import ResourceGovernor, ResourcePolicy, resolve_policy
+from .scan_scheduler import (
+    JobPriority,
+    JobState,
+    ScanJob,
+    ScanScheduler,
+    concurrency_limit,
+    get_scan_scheduler,
+)
 from .scanner import Scanner
 from .scanner_types import ScanResult
 from .settings_manager import SettingsManager
 
 logger = logging.getLogger(__name__)
 
-# Maximum concurrent device scans to prevent resource exhaustion
-MAX_CONCURRENT_SCANS = 2
-
 # Time (seconds) to suppress duplicate scans for the same mount point
 RECENTLY_SCANNED_TTL = 60
 
@@ -64,18 +77,23 @@ class DeviceMonitor:
         scanner: Scanner,
         notification_callback: Callable | None = None,
         quarantine_manager=None,
+        scheduler: ScanScheduler | None = None,
     ):
         """
         Initialize the DeviceMonitor.
 
         Args:
             settings_manager: For reading device scan settings.
-            scanner: Scanner instance for running background scans.
+            scanner: Scanner instance for running background scans; further
+                instances are created (and reused) when scans run in parallel.
             notification_callback: Called with (event_type, info_dict) for notifications.
             quarantine_manager: Optional QuarantineManager for auto-quarantine.
+            scheduler: ScanScheduler to queue scans with (defaults to the
+                shared one).
         """
         self._settings_manager = settings_manager
         self._scanner = scanner
+        self._scheduler = scheduler if scheduler is not None else get_scan_scheduler()
         self._notification_callback = notification_callback
         self._quarantine_manager = quarantine_manager
         self._battery_manager = BatteryManager()
@@ -87,11 +105,18 @@ class DeviceMonitor:
         self._mount_added_id: int = 0
         self._mount_removed_id: int = 0
 
-        # Track active and queued scans
-        self._active_scans: dict[str, Scanner] = {}
+        # Track scans: waiting for the mount delay, queued/running as a job,
+        # and the scanner of each running job
         self._scan_queue: dict[str, MountInfo] = {}
+        self._jobs: dict[str, ScanJob] = {}
+        self._active_scans: dict[str, Scanner] = {}
+        self._idle_scanners: list[Scanner] = [scanner]
         self._recently_scanned: dict[str, float] = {}  # mount_point -> timestamp
         self._scheduled_sources: dict[str, int] = {}  # mount_point -> GLib source id
+        self._bytes_per_second: float | None = None  # Last measured scan throughput
+        # Backend seen by the last scan; resolving it may probe clamd, so it
+        # is refreshed on scan threads rather than in the limit provider
+        self._active_backend = "clamscan"
         self._lock = threading.Lock()
 
         self._running = False
@@ -110,6 +135,7 @@ class DeviceMonitor:
         self._mount_removed_id = self._volume_monitor.connect(
             "mount-removed", self._on_mount_removed
         )
+        self._scheduler.set_limit_provider(self._concurrency_limit)
         self._running = True
         logger.info("Device monitor started")
 
@@ -133,13 +159,15 @@ class DeviceMonitor:
                 GLib.source_remove(source_id)
             self._scheduled_sources.clear()
 
-            # Cancel active scans
-            for mount_point, scanner in list(self._active_scans.items()):
-                logger.info("Cancelling device scan for %s", mount_point)
-                scanner.cancel()
-            self._active_scans.clear()
+            jobs = list(self._jobs.items())
+            self._jobs.clear()
             self._scan_queue.clear()
 
+        # Drop queued scans and cancel running ones
+        for mount_point, job in jobs:
+            logger.info("Cancelling device scan for %s", mount_point)
+            self._scheduler.cancel(job.job_id)
+
         self._volume_monitor = None
         self._running = False
         logger.info("Device monitor stopped")
@@ -317,22 +345,21 @@ class DeviceMonitor:
                 GLib.source_remove(self._scheduled_sources.pop(mount_point))
                 self._scan_queue.pop(mount_point, None)
                 logger.info("Cancelled scheduled scan for removed device: %s", mount_point)
+            job = self._jobs.pop(mount_point, None)
 
-            # Cancel active scan
-            if mount_point in self._active_scans:
-                scanner = self._active_scans.pop(mount_point)
-                scanner.cancel()
-                logger.info("Cancelled active scan for removed device: %s", mount_point)
+        # Drop the queued job, or cancel the running scan
+        if job is not None and self._scheduler.cancel(job.job_id):
+            logger.info("Cancelled device scan for removed device: %s", mount_point)
 
     def _schedule_scan(self, info: MountInfo) -> None:
         """Schedule a scan after the configured delay."""
         delay = self._settings_manager.get("device_auto_scan_delay_seconds", 3)
 
         with self._lock:
-            # Don't schedule if already queued or active
+            # Don't schedule if already waiting, queued or running
             if info.mount_point in self._scan_queue:
                 return
-            if info.mount_point in self._active_scans:
+            if info.mount_point in self._jobs:
                 return
 
             self._scan_queue[info.mount_point] = info
@@ -353,76 +380,125 @@ class DeviceMonitor:
         with self._lock:
             self._scheduled_sources[info.mount_point] = source_id
 
+    def _concurrency_limit(self) -> int:
+        """Scan concurrency limit for the last seen backend and this machine."""
+        return concurrency_limit(self._active_backend)
+
     def _start_background_scan(self, info: MountInfo) -> None:
-        """Create a Scanner instance and start a background scan."""
+        """Queue a background scan of the mount with the scan scheduler."""
         with self._lock:
-            # If a scan for this mount is already running, bail out. A late-firing
-            # requeue timer can race here after a slot freed and the scan was
-            # restarted via _on_scan_complete; without this guard it would start a
-            # second concurrent scan of the same mount.
-            if info.mount_point in self._active_scans:
-                return
-            # Enforce concurrent scan limit
-            if len(self._active_scans) >= MAX_CONCURRENT_SCANS:
-                logger.info(
-                    "Max concurrent scans reached, requeueing %s",
-                    info.device_name,
-                )
-                # Re-schedule after a short delay. Track the source id in
-                # _scheduled_sources so stop() / _on_mount_removed can cancel
-                # it; otherwise a pending re-queue can fire after monitor
-                # shutdown and instantiate a Scanner against a torn-down
-                # DeviceMonitor (BUG-009).
-                self._scan_queue[info.mount_point] = info
-                mount_point = info.mount_point
-
-                def on_requeue_expired() -> bool:
-                    with self._lock:
-                        self._scheduled_sources.pop(mount_point, None)
-                    self._start_background_scan(info)
-                    return GLib.SOURCE_REMOVE
-
-                requeue_source_id = GLib.timeout_add_seconds(10, on_requeue_expired)
-                self._scheduled_sources[mount_point] = requeue_source_id
+            self._scan_queue.pop(info.mount_point, None)
+            # A late delay timer must not queue a second scan of the same mount
+            if info.mount_point in self._jobs:
                 return
+            job = ScanJob(
+                label=info.device_name,
+                priority=JobPriority.BACKGROUND,
+                run=lambda: self._run_device_scan(info),
+                cancel=lambda: self._cancel_device_scan(info.mount_point),
+                size_bytes=info.size_bytes,
+            )
+            self._jobs[info.mount_point] = job
 
-            self._scan_queue.pop(info.mount_point, None)
+        logger.info("Queueing device scan: %s at %s", info.device_name, info.mount_point)
+        self._scheduler.submit(job)
 
-            # Cancel any pending requeue timer for this mount. When a slot frees,
-            # _on_scan_complete restarts the queued mount here directly; the
-            # requeue source stored under this mount must be removed so it cannot
-            # later fire and start a duplicate concurrent scan. The timer-callback
-            # paths already pop _scheduled_sources before calling, so this is a
-            # harmless no-op there.
-            sid = self._scheduled_sources.pop(info.mount_point, None)
-            if sid is not None:
-                GLib.source_remove(sid)
-
-            # Create a dedicated scanner for this device scan
-            scanner = Scanner(settings_manager=self._settings_manager)
+    def _run_device_scan(self, info: MountInfo) -> None:
+        """Scan a mount on a scheduler thread with a pooled Scanner."""
+        with self._lock:
+            job = self._jobs.get(info.mount_point)
+            if job is None:
+                return  # Cancelled between dispatch and start
+            scanner = (
+                self._idle_scanners.pop()
+                if self._idle_scanners
+                else Scanner(settings_manager=self._settings_manager)
+            )
             self._active_scans[info.mount_point] = scanner
 
         logger.info("Starting device scan: %s at %s", info.device_name, info.mount_point)
 
-        # Notify scan started
-        if self._notification_callback:
-            self._notification_callback(
-                "scan_started",
-                {
-                    "device_name": info.device_name,
-                    "mount_point": info.mount_point,
-                },
-            )
-
-        def on_scan_complete(result: ScanResult) -> None:
-            self._on_scan_complete(info, result)
+        try:
+            self._active_backend = scanner.get_active_backend()
+            # Auto-scans run unattended, so they use the background priority
+            policy = resolve_policy(self._settings_manager, background=True)
+            plan = None
+            if self._settings_manager.get("device_auto_scan_mode", "full") == (
+                DEVICE_SCAN_MODE_QUICK
+            ):
+                plan = self._plan_quick_scan(info, job, policy)
+                if plan.cancelled:
+                    return
+
+            idle_add(self._on_scan_started, info, plan)
+
+            if plan is not None:
+                result = scanner.scan_sync(
+                    info.mount_point, file_paths=plan.files, resource_policy=policy
+                )
+            else:
+                result = scanner.scan_sync(info.mount_point, resource_policy=policy)
+        finally:
+            with self._lock:
+                if self._jobs.get(info.mount_point) is job:
+                    del self._jobs[info.mount_point]
+                self._active_scans.pop(info.mount_point, None)
+                self._idle_scanners.append(scanner)
+
+        if result.timing is not None and result.timing.bytes_per_second:
+            self._bytes_per_second = result.timing.bytes_per_second
+        idle_add(self._on_scan_complete, info, result, plan)
+
+    def _plan_quick_scan(
+        self, info: MountInfo, job: ScanJob, policy: ResourcePolicy | None = None
+    ) -> QuickScanPlan:
+        """Select and order the files of a mount for a quick scan."""
+        max_file_mb = self._settings_manager.get("device_auto_scan_quick_max_file_mb", 100)
+        plan = plan_quick_scan(
+            info.mount_point,
+            max(0, int(max_file_mb)) * 1024 * 1024,
+            should_stop=lambda: job.state is JobState.CANCELLED,
+            governor=ResourceGovernor(policy) if policy is not None else None,
+        )
+        logger.info(
+            "Quick scan plan for %s: %d files (%d high-risk, %.1f MB), %d large files "
+            "skipped (%.1f MB), estimated %.0f s",
+            info.device_name,
+            len(plan.files),
+            plan.risky_files,
+            plan.total_bytes / (1024 * 1024),
+            plan.skipped_files,
+            plan.skipped_bytes / (1024 * 1024),
+            plan.estimated_seconds(self._bytes_per_second),
+        )
+        return plan
 
-        scanner.scan_async(info.mount_point, on_scan_complete)
+    def _on_scan_started(self, info: MountInfo, plan: QuickScanPlan | None = None) -> bool:
+        """Send the scan-started notification (main loop)."""
+        if self._notification_callback:
+            event = {
+                "device_name": info.device_name,
+                "mount_point": info.mount_point,
+            }
+            if plan is not None:
+                event["file_count"] = len(plan.files)
+                event["skipped_count"] = plan.skipped_files
+                event["estimated_seconds"] = plan.estimated_seconds(self._bytes_per_second)
+            self._notification_callback("scan_started", event)
+        return False
+
+    def _cancel_device_scan(self, mount_point: str) -> None:
+        """Stop the running scan of a mount, if any."""
+        with self._lock:
+            scanner = self._active_scans.get(mount_point)
+        if scanner is not None:
+            scanner.cancel()
 
-    def _on_scan_complete(self, info: MountInfo, result: ScanResult) -> None:
+    def _on_scan_complete(
+        self, info: MountInfo, result: ScanResult, plan: QuickScanPlan | None = None
+    ) -> None:
         """Handle scan completion: auto-quarantine if enabled, send notification."""
         with self._lock:
-            self._active_scans.pop(info.mount_point, None)
             self._recently_scanned[info.mount_point] = time.monotonic()
 
         quarantined_count = 0
@@ -463,16 +539,10 @@ class DeviceMonitor:
                     "infected_count": result.infected_count,
                     "scanned_count": result.scanned_files,
                     "quarantined_count": quarantined_count,
+                    "skipped_count": plan.skipped_files if plan is not None else 0,
                 },
             )
 
-        # Check if queued scans can now start
-        with self._lock:
-            queued = list(self._scan_queue.values())
-        for queued_info in queued:
-            self._start_background_scan(queued_info)
-            break  # Start one at a time
-
     @property
     def is_running(self) -> bool:
         """Whether the monitor is actively watching for mount events."""
@@ -7,6 +7,7 @@ This module provides functions for:
 - Wrapping host commands to bridge the sandbox boundary
 - Resolving Flatpak document portal paths to user-friendly display paths
 - Finding host binaries when running in Flatpak
+- Running host commands through the persistent host helper (host_broker)
 """
 
 import logging
@@ -300,6 +301,104 @@ def wrap_host_command(command: list[str], force_host: bool = False) -> list[str]
     return list(command)
 
 
+def _get_host_broker():
+    """Get the persistent host helper, or None to spawn per call."""
+    from .host_broker import get_host_broker
+
+    return get_host_broker()
+
+
+def run_host_command(
+    command: list[str],
+    timeout: float | None = None,
+    text: bool = True,
+    env: dict[str, str] | None = None,
+) -> subprocess.CompletedProcess:
+    """
+    Run a command on the host and capture its output.
+
+    In Flatpak the command goes through the persistent host helper when it is
+    available, avoiding a portal round-trip and spawn per call; otherwise it
+    falls back to ``subprocess.run(wrap_host_command(command))``.
+
+    Args:
+        command: The command to run (unwrapped)
+        timeout: Timeout in seconds
+        text: Decode stdout/stderr as UTF-8 text (errors replaced)
+        env: Environment for the fallback subprocess; defaults to get_clean_env()
+
+    Returns:
+        CompletedProcess with captured stdout/stderr
+
+    Raises:
+        subprocess.TimeoutExpired: If the command timed out
+        FileNotFoundError: If the binary (or flatpak-spawn) is missing
+    """
+    broker = _get_host_broker() if is_flatpak() else None
+    if broker is not None:
+        from .host_broker import HostBrokerError
+
+        try:
+            result = broker.run(list(command), timeout=timeout)
+        except HostBrokerError as e:
+            logger.debug("Host helper exec failed, spawning directly: %s", e)
+        else:
+            if text:
+                result.stdout = result.stdout.decode("utf-8", errors="replace")
+                result.stderr = result.stderr.decode("utf-8", errors="replace")
+            return result
+
+    return subprocess.run(
+        wrap_host_command(command),
+        capture_output=True,
+        text=text,
+        timeout=timeout,
+        env=env if env is not None else get_clean_env(),
+    )
+
+
+def host_path_exists(path: str | Path, kind: str = "file") -> bool:
+    """
+    Check whether a path exists on the host filesystem from inside Flatpak.
+
+    Uses the host helper's stat when available, otherwise
+    ``flatpak-spawn --host test``.
+
+    Args:
+        path: Path to check
+        kind: "file" (like ``test -f``), "dir" (``test -d``) or "any" (``test -e``)
+
+    Returns:
+        True if the path exists and is of the requested kind
+    """
+    broker = _get_host_broker()
+    if broker is not None:
+        from .host_broker import HostBrokerError
+
+        try:
+            st = broker.stat(str(path))
+        except HostBrokerError as e:
+            logger.debug("Host helper stat failed for %s: %s", path, e)
+        else:
+            if kind == "file":
+                return bool(st.get("is_file"))
+            if kind == "dir":
+                return bool(st.get("is_dir"))
+            return bool(st.get("exists"))
+
+    flag = {"file": "-f", "dir": "-d"}.get(kind, "-e")
+    try:
+        result = subprocess.run(
+            ["flatpak-spawn", "--host", "test", flag, str(path)],
+            capture_output=True,
+            timeout=5,
+        )
+        return result.returncode == 0
+    except Exception as e:
+        logger.debug("Failed to check host path %s: %s", path, e)
+        return False
+
+
 def get_xdg_user_dir(dir_type: str) -> str | None:
     """
     Get the XDG user directory path for a given type.
@@ -372,6 +471,14 @@ def which_host_command(binary: str) -> str | None:
         The full path to the binary if found, None otherwise
     """
     if is_flatpak():
+        broker = _get_host_broker()
+        if broker is not None:
+            from .host_broker import HostBrokerError
+
+            try:
+                return broker.which(binary)
+            except HostBrokerError as e:
+                logger.debug("Host helper which failed for '%s': %s", binary, e)
         try:
             result = subprocess.run(
                 ["flatpak-spawn", "--host", "which", binary],
@@ -675,6 +782,21 @@ def read_host_file(file_path: str, timeout: int = 10) -> tuple[str | None, str |
         - (None, error_message) on failure
     """
     if is_flatpak():
+        broker = _get_host_broker()
+        if broker is not None:
+            from .host_broker import HostBrokerError
+
+            try:
+                data = broker.read_range(file_path)
+            except HostBrokerError as e:
+                if e.code in ("not_found", "permission", "os_error"):
+                    return (None, f"Cannot read {file_path}: {e}")
+                logger.debug("Host helper read failed for %s: %s", file_path, e)
+            else:
+                try:
+                    return (data.decode("utf-8"), None)
+                except UnicodeDecodeError:
+                    return (data.decode("latin-1"), None)
         try:
             result = subprocess.run(
                 ["flatpak-spawn", "--host", "cat", file_path],
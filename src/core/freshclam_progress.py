@@ -0,0 +1,380 @@
+# ClamUI Freshclam Progress Module
+"""
+Line-by-line parsing of freshclam output into per-database progress events.
+
+freshclam reports each database in turn: whether an update is available, the
+CDIFF patches or full CVD it downloads (with a curl-style progress bar), the
+database test, and the outcome. FreshclamProgressParser turns those lines
+into DatabaseProgress events while the update runs, and keeps per-database
+timing and byte counts for the update log.
+
+Example output it understands (freshclam 0.103+, older "Retrieving" lines
+are recognised too):
+
+    daily database available for update (local version: 27301, remote version: 27303)
+    Downloading database patch # 27302...
+    Time:    0.3s, ETA:    0.0s [========================>]    8.40KiB/8.40KiB
+    Testing database: '/var/lib/clamav/tmp.4d1/clamav-a7c.tmp-daily.cld' ...
+    daily.cld updated (version: 27303, sigs: 2071380, f-level: 90, builder: raynman)
+    main.cvd database is up-to-date (version: 62, sigs: 6647427, f-level: 90, builder: sigmgr)
+
+This module has no GLib dependency; callers marshal events to the UI thread.
+"""
+
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import Enum
+
+from .clipboard import format_size
+
+# Rate-limit markers in freshclam output (mirror CDN responses and freshclam's
+# own cool-down notices)
+RATE_LIMIT_PATTERNS = (
+    "rate limit",
+    "rate-limit",
+    "rate limited",
+    "429",
+    "too many requests",
+    "temporarily blocked",
+    "blocked temporarily",
+)
+COOLDOWN_UNTIL_RE = re.compile(r"cool[- ]down until after:\s*(.+)$", re.IGNORECASE)
+
+_AVAILABLE_RE = re.compile(
+    r"\b(?P<db>[A-Za-z0-9_-]+) database available for (?P<what>update|download)", re.IGNORECASE
+)
+_PATCH_RE = re.compile(r"Downloading database patch #\s*(?P<number>\d+)", re.IGNORECASE)
+_RETRIEVING_RE = re.compile(
+    r"Retrieving\s+(?:\S*/)?(?P<db>[A-Za-z0-9_-]+?)(?:-\d+)?\.(?P<ext>cdiff|cvd|cld)\b",
+    re.IGNORECASE,
+)
+_TRANSFER_RE = re.compile(
+    r"^Time:.*?(?P<done>\d+(?:\.\d+)?)\s*(?P<done_unit>[KMG]i?B|B)\s*/\s*"
+    r"(?P<total>\d+(?:\.\d+)?)\s*(?P<total_unit>[KMG]i?B|B)\s*$"
+)
+_DATABASE_FILE_RE = re.compile(r"\b(?P<db>[A-Za-z0-9_-]+)\.(?:cvd|cld|cud)\b", re.IGNORECASE)
+_UPDATED_RE = re.compile(r"\b(?P<db>[A-Za-z0-9_-]+)\.(?:cvd|cld|cud) updated\b", re.IGNORECASE)
+_UP_TO_DATE_RE = re.compile(
+    r"\b(?P<db>[A-Za-z0-9_-]+)\.(?:cvd|cld|cud) database is up[- ]to[- ]date", re.IGNORECASE
+)
+
+_UNIT_BYTES = {
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+    "KIB": 1024,
+    "MIB": 1024**2,
+    "GIB": 1024**3,
+}
+
+
+class DatabaseStage(Enum):
+    """Where a single database is in the update run."""
+
+    DOWNLOADING = "downloading"
+    TESTING = "testing"
+    UPDATED = "updated"
+    UP_TO_DATE = "up_to_date"
+    RATE_LIMITED = "rate_limited"
+    FAILED = "failed"
+
+
+# Stages after which freshclam moves on to the next database
+FINAL_STAGES = frozenset(
+    {
+        DatabaseStage.UPDATED,
+        DatabaseStage.UP_TO_DATE,
+        DatabaseStage.RATE_LIMITED,
+        DatabaseStage.FAILED,
+    }
+)
+
+
+class DownloadKind(Enum):
+    """How a database is being fetched."""
+
+    CDIFF = "cdiff"  # Incremental patches against the local copy
+    FULL = "full"  # The complete CVD
+
+
+@dataclass(frozen=True)
+class DatabaseProgress:
+    """A progress event for one database."""
+
+    database: str
+    stage: DatabaseStage
+    kind: DownloadKind | None = None
+    bytes_done: int = 0  # Current transfer (one patch or the full CVD)
+    bytes_total: int | None = None
+    bytes_downloaded: int = 0  # Every transfer for this database so far
+    message: str | None = None  # Cool-down time or failure line
+
+    @property
+    def percent(self) -> float | None:
+        """Percentage of the current transfer, if its size is known."""
+        if not self.bytes_total:
+            return None
+        return min(100.0, 100.0 * self.bytes_done / self.bytes_total)
+
+
+@dataclass
+class DatabaseStats:
+    """Download telemetry for one database over a whole update run."""
+
+    database: str
+    outcome: DatabaseStage
+    kind: DownloadKind | None = None
+    bytes_downloaded: int = 0
+    patches: int = 0
+    duration: float = 0.0
+
+
+@dataclass
+class _Tracker:
+    """Mutable per-database state while the run is in progress."""
+
+    stats: DatabaseStats
+    started: float
+    finished: bool = False
+    transfer_done: int = 0
+    transfer_total: int | None = None
+    last_percent: int = -1
+
+
+def parse_size(value: str, unit: str) -> int:
+    """Convert a freshclam/curl size such as ("1.34", "KiB") to bytes."""
+    return int(float(value) * _UNIT_BYTES.get(unit.upper(), 1))
+
+
+def is_transfer_line(line: str) -> bool:
+    """Return True for a freshclam download progress-bar line."""
+    return line.lstrip().startswith("Time:") and "ETA:" in line
+
+
+def is_rate_limit_line(line_lower: str) -> bool:
+    """Return True if a lower-cased freshclam line reports rate limiting."""
+    return (
+        any(pattern in line_lower for pattern in RATE_LIMIT_PATTERNS)
+        or "cloudfront" in line_lower
+        or "cloudflare" in line_lower
+    )
+
+
+class FreshclamProgressParser:
+    """
+    Incremental parser for freshclam output.
+
+    Feed it each output line (stdout and stderr, in arrival order); feed()
+    returns the progress events that line produced. Progress-bar events are
+    only emitted when the whole-number percentage changes, so a UI can show
+    every event without being flooded.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._trackers: dict[str, _Tracker] = {}
+        self._current: str | None = None
+        self._rate_limited: str | None = None
+        self._pending_cooldown: str | None = None
+
+    @property
+    def stats(self) -> list[DatabaseStats]:
+        """Per-database telemetry so far, in the order databases appeared."""
+        return [tracker.stats for tracker in self._trackers.values()]
+
+    def _tracker(self, database: str) -> _Tracker:
+        tracker = self._trackers.get(database)
+        if tracker is None:
+            tracker = _Tracker(
+                stats=DatabaseStats(database=database, outcome=DatabaseStage.DOWNLOADING),
+                started=self._clock(),
+            )
+            self._trackers[database] = tracker
+        return tracker
+
+    def _start_transfer(self, tracker: _Tracker) -> None:
+        """Fold the finished transfer into the byte count before a new one."""
+        tracker.stats.bytes_downloaded += tracker.transfer_done
+        tracker.transfer_done = 0
+        tracker.transfer_total = None
+        tracker.last_percent = -1
+
+    def _event(
+        self, tracker: _Tracker, stage: DatabaseStage, message: str | None = None
+    ) -> DatabaseProgress:
+        stats = tracker.stats
+        # A later success supersedes an earlier rate-limit notice
+        if not tracker.finished or stage in (DatabaseStage.UPDATED, DatabaseStage.UP_TO_DATE):
+            stats.outcome = stage
+            stats.duration = self._clock() - tracker.started
+            tracker.finished = stage in FINAL_STAGES
+        return DatabaseProgress(
+            database=stats.database,
+            stage=stage,
+            kind=stats.kind,
+            bytes_done=tracker.transfer_done,
+            bytes_total=tracker.transfer_total,
+            bytes_downloaded=stats.bytes_downloaded + tracker.transfer_done,
+            message=message,
+        )
+
+    def _finish(
+        self, database: str, stage: DatabaseStage, message: str | None = None
+    ) -> DatabaseProgress:
+        tracker = self._tracker(database)
+        self._start_transfer(tracker)
+        event = self._event(tracker, stage, message)
+        if self._current == database:
+            self._current = None
+        if stage == DatabaseStage.RATE_LIMITED:
+            self._rate_limited = database
+        return event
+
+    def feed(self, line: str) -> list[DatabaseProgress]:
+        """
+        Parse one line of freshclam output.
+
+        Args:
+            line: A single output line, with or without its line terminator
+
+        Returns:
+            The progress events the line produced (usually zero or one)
+        """
+        line = line.strip()
+        if not line:
+            return []
+
+        match = _TRANSFER_RE.search(line)
+        if match:
+            if self._current is None:
+                return []
+            tracker = self._tracker(self._current)
+            done = parse_size(match.group("done"), match.group("done_unit"))
+            total = parse_size(match.group("total"), match.group("total_unit"))
+            if done < tracker.transfer_done:
+                self._start_transfer(tracker)
+            tracker.transfer_done = done
+            tracker.transfer_total = total or None
+            percent = int(100 * done / total) if total else 0
+            if percent == tracker.last_percent:
+                return []
+            tracker.last_percent = percent
+            return [self._event(tracker, DatabaseStage.DOWNLOADING)]
+
+        match = _AVAILABLE_RE.search(line)
+        if match:
+            database = match.group("db")
+            self._current = database
+            tracker = self._tracker(database)
+            if match.group("what").lower() == "download":
+                tracker.stats.kind = DownloadKind.FULL
+            return [self._event(tracker, DatabaseStage.DOWNLOADING)]
+
+        match = _PATCH_RE.search(line)
+        if match and self._current is not None:
+            tracker = self._tracker(self._current)
+            self._start_transfer(tracker)
+            tracker.stats.kind = DownloadKind.CDIFF
+            tracker.stats.patches += 1
+            return [self._event(tracker, DatabaseStage.DOWNLOADING)]
+
+        match = _RETRIEVING_RE.search(line)
+        if match:
+            database = match.group("db")
+            self._current = database
+            tracker = self._tracker(database)
+            self._start_transfer(tracker)
+            if match.group("ext").lower() == "cdiff":
+                tracker.stats.kind = DownloadKind.CDIFF
+                tracker.stats.patches += 1
+            else:
+                tracker.stats.kind = DownloadKind.FULL
+            return [self._event(tracker, DatabaseStage.DOWNLOADING)]
+
+        line_lower = line.lower()
+        if "incremental update failed" in line_lower and self._current is not None:
+            # freshclam falls back to downloading the whole CVD
+            tracker = self._tracker(self._current)
+            self._start_transfer(tracker)
+            tracker.stats.kind = DownloadKind.FULL
+            return [self._event(tracker, DatabaseStage.DOWNLOADING)]
+
+        if line_lower.startswith("testing database") and self._current is not None:
+            tracker = self._tracker(self._current)
+            self._start_transfer(tracker)
+            return [self._event(tracker, DatabaseStage.TESTING)]
+
+        match = _UPDATED_RE.search(line)
+        if match:
+            self._pending_cooldown = None
+            return [self._finish(match.group("db"), DatabaseStage.UPDATED)]
+
+        match = _UP_TO_DATE_RE.search(line)
+        if match:
+            self._pending_cooldown = None
+            return [self._finish(match.group("db"), DatabaseStage.UP_TO_DATE)]
+
+        file_match = _DATABASE_FILE_RE.search(line)
+        database = file_match.group("db") if file_match else self._current
+
+        match = COOLDOWN_UNTIL_RE.search(line)
+        if match:
+            # The cool-down notice follows the rate-limit line it belongs to
+            self._pending_cooldown = match.group(1).strip()
+            database = database or self._rate_limited
+            if database is None:
+                return []
+            return [self._finish(database, DatabaseStage.RATE_LIMITED, self._pending_cooldown)]
+
+        if is_rate_limit_line(line_lower):
+            if database is None:
+                return []
+            return [self._finish(database, DatabaseStage.RATE_LIMITED, self._pending_cooldown)]
+
+        if (
+            "can't download" in line_lower
+            or "cannot download" in line_lower
+            or ("failed to update" in line_lower)
+        ):
+            if database is None:
+                return []
+            tracker = self._tracker(database)
+            if tracker.stats.outcome == DatabaseStage.RATE_LIMITED:
+                return []
+            return [self._finish(database, DatabaseStage.FAILED, line)]
+
+        return []
+
+    def finish(self) -> list[DatabaseStats]:
+        """Close out any database still in progress and return the final stats."""
+        for tracker in self._trackers.values():
+            self._start_transfer(tracker)
+            if not tracker.finished:
+                tracker.stats.duration = self._clock() - tracker.started
+                tracker.finished = True
+        self._current = None
+        return self.stats
+
+
+def format_database_stats(stats: list[DatabaseStats]) -> str:
+    """
+    Format per-database telemetry for the update log, one database per line.
+
+    Example: "daily: updated, 3 CDIFF patch(es), 25.2 KB in 0.9s"
+    """
+    lines = []
+    for entry in stats:
+        parts = [entry.outcome.value.replace("_", " ")]
+        if entry.kind == DownloadKind.CDIFF:
+            parts.append(f"{entry.patches} CDIFF patch(es)")
+        elif entry.kind == DownloadKind.FULL:
+            parts.append("full download")
+        if entry.bytes_downloaded:
+            parts.append(f"{format_size(entry.bytes_downloaded)} in {entry.duration:.1f}s")
+        elif entry.duration >= 0.05:
+            parts.append(f"{entry.duration:.1f}s")
+        lines.append(f"{entry.database}: {', '.join(parts)}")
+    return "\n".join(lines)
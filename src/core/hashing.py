@@ -0,0 +1,282 @@
+# ClamUI Hashing Module
+"""
+Shared file hashing service for ClamUI.
+
+Several features need the SHA-256 of the same file: VirusTotal lookups and
+quarantine integrity checks. Each used to read the file again with its own
+buffer size. This module hashes a file once per content version:
+
+- Large read buffers; hashlib releases the GIL while digesting blocks of
+  this size, so hash_files() (used for VirusTotal batches) scales across a
+  small thread pool
+- Results are memoized in a bounded LRU keyed by the file's identity
+  (st_dev, st_ino, st_size, st_mtime_ns), so an unchanged file is never
+  re-read
+
+The identity is taken with fstat() on the descriptor actually read, and the
+result is only memoized if the file did not change while it was being read.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# 1 MiB reads: few syscalls per file, and large enough that hashlib drops the
+# GIL for the whole update() call.
+HASH_BUFFER_SIZE = 1024 * 1024
+
+# Memoized digests kept before least-recently-used entries are evicted
+DEFAULT_CACHE_ENTRIES = 1024
+
+# Worker threads for hash_files()/submit(); hashing is I/O and memory bound,
+# so a handful of threads saturates typical disks.
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+@dataclass(frozen=True)
+class FileDigests:
+    """Digest of one version of a file's content."""
+
+    sha256: str
+    size: int
+
+
+class Digester:
+    """
+    Incremental digest for callers that stream data themselves.
+
+    Usage:
+        digester = Digester()
+        for block in blocks:
+            digester.update(block)
+        digests = digester.result()
+    """
+
+    def __init__(self):
+        """Initialize the digester."""
+        self._hasher = hashlib.sha256()
+        self._size = 0
+
+    def update(self, block: bytes | bytearray | memoryview) -> None:
+        """Feed a block of data."""
+        self._hasher.update(block)
+        self._size += len(block)
+
+    def result(self) -> FileDigests:
+        """Get the digest of everything fed so far."""
+        return FileDigests(sha256=self._hasher.hexdigest(), size=self._size)
+
+
+def _identity(st: os.stat_result) -> tuple[int, int, int, int]:
+    """Memoization key identifying one version of a file."""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class HashingService:
+    """
+    Thread-safe, memoizing file hasher.
+
+    Usage:
+        service = get_hashing_service()
+        sha256 = service.sha256("/path/to/file")
+        digests = service.hash_files(["/path/to/a", "/path/to/b"])
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        buffer_size: int = HASH_BUFFER_SIZE,
+    ):
+        """
+        Initialize the hashing service.
+
+        Args:
+            max_entries: Maximum memoized files before LRU eviction
+            max_workers: Threads used by hash_files() and submit()
+            buffer_size: Bytes read per syscall
+        """
+        self._max_entries = max(1, max_entries)
+        self._max_workers = max(1, max_workers)
+        self._buffer_size = buffer_size
+        self._cache: OrderedDict[tuple[int, int, int, int], FileDigests] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._hits = 0
+        self._misses = 0
+
+    def hash_file(
+        self,
+        file_path: str | os.PathLike,
+        use_cache: bool = True,
+        follow_symlinks: bool = True,
+    ) -> FileDigests:
+        """
+        Hash a file, reusing memoized digests when the file is unchanged.
+
+        Args:
+            file_path: File to hash
+            use_cache: Consult the memo before reading. Integrity checks that
+                       must observe the bytes on disk pass False.
+            follow_symlinks: If False, open with O_NOFOLLOW so a symlink is
+                             rejected instead of hashing its target
+
+        Returns:
+            FileDigests for the file's current content
+
+        Raises:
+            OSError: If the file cannot be opened or read
+        """
+        flags = os.O_RDONLY | getattr(os, "O_CLOEXEC", 0)
+        if not follow_symlinks:
+            flags |= os.O_NOFOLLOW
+
+        fd = os.open(file_path, flags)
+        try:
+            st = os.fstat(fd)
+            key = _identity(st)
+            if use_cache:
+                cached = self._lookup(key)
+                if cached is not None:
+                    return cached
+
+            digests = self._digest_fd(fd)
+
+            # Only memoize if the file did not change underneath the read
+            if _identity(os.fstat(fd)) == key and digests.size == st.st_size:
+                self._store(key, digests)
+            return digests
+        finally:
+            os.close(fd)
+
+    def sha256(self, file_path: str | os.PathLike, follow_symlinks: bool = True) -> str:
+        """
+        Get the lowercase SHA-256 hex digest of a file.
+
+        Raises:
+            OSError: If the file cannot be opened or read
+        """
+        return self.hash_file(file_path, follow_symlinks=follow_symlinks).sha256
+
+    def submit(self, file_path: str | os.PathLike) -> Future:
+        """
+        Hash a file on the service's thread pool.
+
+        Returns:
+            Future resolving to FileDigests (or raising OSError)
+        """
+        return self._get_executor().submit(self.hash_file, file_path)
+
+    def hash_files(self, file_paths: Iterable[str]) -> dict[str, FileDigests | OSError]:
+        """
+        Hash several files concurrently.
+
+        Args:
+            file_paths: Files to hash
+
+        Returns:
+            Mapping of path to FileDigests, or to the OSError raised for it
+        """
+        futures = {path: self.submit(path) for path in dict.fromkeys(file_paths)}
+        results: dict[str, FileDigests | OSError] = {}
+        for path, future in futures.items():
+            try:
+                results[path] = future.result()
+            except OSError as e:
+                results[path] = e
+        return results
+
+    def remember(self, st: os.stat_result, digests: FileDigests) -> None:
+        """
+        Memoize digests computed elsewhere (e.g. while copying a file).
+
+        Args:
+            st: fstat() of the file the digests describe, taken after writing
+            digests: Digests of the full content
+        """
+        if digests.size == st.st_size:
+            self._store(_identity(st), digests)
+
+    def clear(self) -> None:
+        """Forget all memoized digests."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Get memoization statistics.
+
+        Returns:
+            Dictionary with entries, max_entries, hits and misses
+        """
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; the service can still hash synchronously."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _digest_fd(self, fd: int) -> FileDigests:
+        """Read a descriptor to EOF and digest it."""
+        digester = Digester()
+        buffer = bytearray(self._buffer_size)
+        view = memoryview(buffer)
+        while True:
+            n = os.readv(fd, [buffer])
+            if not n:
+                break
+            digester.update(view[:n])
+        return digester.result()
+
+    def _lookup(self, key: tuple[int, int, int, int]) -> FileDigests | None:
+        with self._lock:
+            digests = self._cache.get(key)
+            if digests is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return digests
+            self._misses += 1
+            return None
+
+    def _store(self, key: tuple[int, int, int, int], digests: FileDigests) -> None:
+        with self._lock:
+            self._cache[key] = digests
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers, thread_name_prefix="clamui-hash"
+                )
+            return self._executor
+
+
+_service = HashingService()
+
+
+def get_hashing_service() -> HashingService:
+    """
+    Get the process-wide HashingService instance.
+
+    Returns:
+        The shared HashingService
+    """
+    return _service
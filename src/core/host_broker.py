@@ -0,0 +1,403 @@
+# ClamUI Host Broker
+"""
+Persistent host-command broker for the Flatpak sandbox.
+
+Every ``flatpak-spawn --host`` call costs a D-Bus round-trip to the Flatpak
+portal plus a host process spawn. Views such as Components and Security Audit
+issue dozens of tiny host calls (``which``, ``test -f``, ``head -c 512``,
+``find``), so that latency dominated them.
+
+The broker starts one long-lived helper on the host (``host_helper.py`` run
+by the host's ``python3``) over a single ``flatpak-spawn`` pipe and sends it
+line-delimited JSON requests:
+
+- exec: run a command, returning exit code, stdout and stderr
+- stat: existence, type, size and mtime of a path
+- read_range: bytes from a file at an offset
+- glob: names matching patterns in one directory
+- which: resolve a binary on the host PATH
+
+Requests are multiplexed by id, so several threads can share the helper and
+batch() can pipeline many requests in one write. If the helper cannot be
+started (no host python3, portal denied), get_host_broker() returns None and
+callers keep using one flatpak-spawn per call.
+"""
+
+import atexit
+import base64
+import itertools
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+
+from .flatpak import is_flatpak
+
+logger = logging.getLogger(__name__)
+
+HELPER_SCRIPT = Path(__file__).with_name("host_helper.py")
+
+# Seconds to wait for the helper's hello reply before giving up
+START_TIMEOUT = 5.0
+
+# Default reply timeout for non-exec requests
+REQUEST_TIMEOUT = 10.0
+
+# Extra time allowed on top of an exec timeout for the reply to arrive
+EXEC_REPLY_GRACE = 2.0
+
+# Seconds before a failed helper start is retried
+RESTART_BACKOFF = 60.0
+
+# Set to "0" to disable the broker and use one flatpak-spawn per call
+BROKER_ENV_VAR = "CLAMUI_HOST_BROKER"
+
+
+class HostBrokerError(Exception):
+    """A broker request failed; ``code`` carries the helper's error code."""
+
+    def __init__(self, message: str, code: str = "broker"):
+        super().__init__(message)
+        self.code = code
+
+
+def helper_command() -> list[str]:
+    """
+    Build the command that starts the helper on the host.
+
+    ``--watch-bus`` ties the helper's lifetime to ClamUI's session bus
+    connection, so it exits with the app even if the pipe is leaked.
+    """
+    return [
+        "flatpak-spawn",
+        "--host",
+        "--watch-bus",
+        "python3",
+        "-c",
+        HELPER_SCRIPT.read_text(encoding="utf-8"),
+    ]
+
+
+class HostBroker:
+    """
+    Client for the host helper process.
+
+    Usage:
+        broker = HostBroker()
+        broker.start()
+        path = broker.which("clamscan")
+        stats = broker.batch([("stat", {"path": p}) for p in paths])
+        broker.close()
+    """
+
+    def __init__(self, command: list[str] | None = None, start_timeout: float = START_TIMEOUT):
+        """
+        Initialize the broker.
+
+        Args:
+            command: Command that starts the helper; defaults to helper_command().
+                     Tests pass ``[sys.executable, "host_helper.py"]`` to run it locally.
+            start_timeout: Seconds to wait for the helper handshake
+        """
+        self._command = command
+        self._start_timeout = start_timeout
+        self._process: subprocess.Popen | None = None
+        self._reader: threading.Thread | None = None
+        self._pending: dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._alive = False
+
+    @property
+    def is_alive(self) -> bool:
+        """Whether the helper process is running and answering."""
+        return self._alive
+
+    def start(self) -> None:
+        """
+        Start the helper and wait for its handshake.
+
+        Raises:
+            HostBrokerError: If the helper cannot be spawned or does not answer
+        """
+        command = self._command or helper_command()
+        try:
+            self._process = subprocess.Popen(
+                command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+            )
+        except OSError as e:
+            raise HostBrokerError(f"Cannot start host helper: {e}") from e
+
+        self._alive = True
+        self._reader = threading.Thread(
+            target=self._read_replies, name="clamui-host-broker", daemon=True
+        )
+        self._reader.start()
+
+        try:
+            hello = self.request("hello", timeout=self._start_timeout)
+        except HostBrokerError:
+            self.close()
+            raise
+        logger.debug(
+            "Host helper started (pid %s, protocol %s)", hello.get("pid"), hello.get("version")
+        )
+
+    def request(self, op: str, timeout: float = REQUEST_TIMEOUT, **params) -> dict:
+        """
+        Send one request and wait for its reply.
+
+        Returns:
+            The reply's result dictionary
+
+        Raises:
+            HostBrokerError: On helper errors, timeouts or a dead helper
+        """
+        return self._wait(self._send([(op, params)])[0], timeout)
+
+    def batch(
+        self, requests: list[tuple[str, dict]], timeout: float = REQUEST_TIMEOUT
+    ) -> list[dict | HostBrokerError]:
+        """
+        Pipeline several requests in one write and collect every reply.
+
+        Args:
+            requests: (op, params) pairs
+            timeout: Seconds to wait for all replies
+
+        Returns:
+            Result dictionaries in request order; failed requests are returned
+            as HostBrokerError instances instead of raising
+        """
+        futures = self._send(requests)
+        deadline = time.monotonic() + timeout
+        results: list[dict | HostBrokerError] = []
+        for future in futures:
+            try:
+                results.append(self._wait(future, max(0.0, deadline - time.monotonic())))
+            except HostBrokerError as e:
+                results.append(e)
+        return results
+
+    def run(
+        self, argv: list[str], timeout: float | None = None, env: dict[str, str] | None = None
+    ) -> subprocess.CompletedProcess:
+        """
+        Run a command on the host.
+
+        Mirrors ``subprocess.run(argv, capture_output=True)`` so call sites keep
+        their existing handling. As there, ``timeout=None`` waits for the
+        command however long it runs; the wait still ends if the helper dies.
+
+        Returns:
+            CompletedProcess with bytes stdout/stderr
+
+        Raises:
+            subprocess.TimeoutExpired: If the command exceeded ``timeout``
+            FileNotFoundError: If the binary does not exist on the host
+            HostBrokerError: On any other broker failure
+        """
+        reply_timeout = timeout + EXEC_REPLY_GRACE if timeout is not None else None
+        try:
+            future = self._send([("exec", {"argv": argv, "timeout": timeout, "env": env})])[0]
+            result = self._wait(future, reply_timeout)
+        except HostBrokerError as e:
+            if e.code == "timeout":
+                raise subprocess.TimeoutExpired(argv, timeout) from e
+            if e.code == "not_found":
+                raise FileNotFoundError(str(e)) from e
+            raise
+        return subprocess.CompletedProcess(
+            argv,
+            result["returncode"],
+            base64.b64decode(result["stdout"]),
+            base64.b64decode(result["stderr"]),
+        )
+
+    def stat(self, path: str) -> dict:
+        """Stat a host path; the result has ``exists`` False for missing paths."""
+        return self.request("stat", path=str(path))
+
+    def read_range(self, path: str, offset: int = 0, length: int | None = None) -> bytes:
+        """
+        Read bytes from a host file.
+
+        Raises:
+            HostBrokerError: With code ``not_found`` or ``permission`` on failure
+        """
+        result = self.request("read_range", path=str(path), offset=offset, length=length)
+        return base64.b64decode(result["data"])
+
+    def glob(
+        self,
+        directory: str,
+        patterns: list[str],
+        ignore_case: bool = False,
+        files_only: bool = False,
+        limit: int | None = None,
+    ) -> list[str]:
+        """List entries of one host directory whose names match any pattern."""
+        result = self.request(
+            "glob",
+            directory=str(directory),
+            patterns=patterns,
+            ignore_case=ignore_case,
+            files_only=files_only,
+            limit=limit,
+        )
+        return result["paths"]
+
+    def which(self, name: str) -> str | None:
+        """Resolve a binary on the host PATH."""
+        return self.request("which", name=name)["path"]
+
+    def close(self) -> None:
+        """Stop the helper; pending requests fail with HostBrokerError."""
+        process, self._process = self._process, None
+        self._alive = False
+        if process is None:
+            return
+        try:
+            if process.stdin:
+                process.stdin.close()
+            process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        if self._reader is not None and self._reader is not threading.current_thread():
+            self._reader.join(timeout=2)
+        if process.stdout:
+            process.stdout.close()
+        self._fail_pending("Host helper stopped")
+
+    def _send(self, requests: list[tuple[str, dict]]) -> list[Future]:
+        futures = []
+        lines = []
+        with self._lock:
+            if not self._alive or self._process is None:
+                raise HostBrokerError("Host helper is not running")
+            for op, params in requests:
+                request_id = next(self._ids)
+                future: Future = Future()
+                self._pending[request_id] = future
+                futures.append(future)
+                message = {"id": request_id, "op": op, **params}
+                lines.append(json.dumps(message, separators=(",", ":")))
+            process = self._process
+
+        try:
+            with self._write_lock:
+                process.stdin.write("\n".join(lines) + "\n")
+                process.stdin.flush()
+        except (OSError, ValueError) as e:
+            self._alive = False
+            self._fail_pending(f"Host helper pipe closed: {e}")
+        return futures
+
+    def _wait(self, future: Future, timeout: float | None) -> dict:
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError as e:
+            with self._lock:
+                for request_id, pending in list(self._pending.items()):
+                    if pending is future:
+                        del self._pending[request_id]
+            raise HostBrokerError("Host helper did not reply in time", "timeout") from e
+
+    def _read_replies(self) -> None:
+        process = self._process
+        if process is None or process.stdout is None:
+            return
+        for line in process.stdout:
+            try:
+                reply = json.loads(line)
+            except ValueError:
+                logger.debug("Ignoring malformed host helper reply: %r", line[:200])
+                continue
+            with self._lock:
+                future = self._pending.pop(reply.get("id"), None)
+            if future is None:
+                continue
+            if reply.get("ok"):
+                future.set_result(reply.get("result") or {})
+            else:
+                future.set_exception(
+                    HostBrokerError(
+                        reply.get("message") or "Host helper request failed",
+                        reply.get("error") or "broker",
+                    )
+                )
+        self._alive = False
+        self._fail_pending("Host helper exited")
+
+    def _fail_pending(self, message: str) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(HostBrokerError(message))
+
+
+_broker: HostBroker | None = None
+_broker_failed_at: float | None = None
+_broker_lock = threading.Lock()
+_atexit_registered = False
+
+
+def get_host_broker() -> HostBroker | None:
+    """
+    Get the shared host broker, starting the helper on first use.
+
+    Returns:
+        A running HostBroker inside Flatpak, or None outside Flatpak, when
+        disabled via CLAMUI_HOST_BROKER=0, or while a failed start is backing off
+    """
+    global _broker, _broker_failed_at, _atexit_registered
+
+    if not is_flatpak() or os.environ.get(BROKER_ENV_VAR) == "0":
+        return None
+
+    with _broker_lock:
+        if _broker is not None and _broker.is_alive:
+            return _broker
+        if _broker_failed_at is not None and (
+            time.monotonic() - _broker_failed_at < RESTART_BACKOFF
+        ):
+            return None
+
+        broker = HostBroker()
+        try:
+            broker.start()
+        except HostBrokerError as e:
+            logger.info("Host helper unavailable, using flatpak-spawn per call: %s", e)
+            _broker = None
+            _broker_failed_at = time.monotonic()
+            return None
+
+        _broker = broker
+        _broker_failed_at = None
+        if not _atexit_registered:
+            atexit.register(shutdown_host_broker)
+            _atexit_registered = True
+        return broker
+
+
+def shutdown_host_broker() -> None:
+    """Stop the shared host helper if it is running."""
+    global _broker
+    with _broker_lock:
+        broker, _broker = _broker, None
+    if broker is not None:
+        broker.close()
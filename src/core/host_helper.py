@@ -0,0 +1,201 @@
+# ClamUI Host Helper
+"""
+Host-side request loop for the Flatpak host-command broker.
+
+This file is not imported by ClamUI. Its source is handed to the host's
+``python3 -c`` through a single ``flatpak-spawn --host`` call (see
+``host_broker.py``) and then serves requests for the lifetime of the app.
+It must therefore stay standalone and stdlib-only.
+
+Protocol: one JSON object per line in both directions.
+
+Request:  {"id": 7, "op": "stat", "path": "/etc/clamd.d/scan.conf"}
+Reply:    {"id": 7, "ok": true, "result": {...}}
+          {"id": 7, "ok": false, "error": "permission", "message": "..."}
+
+Cheap filesystem operations are answered inline, in request order. ``exec``
+runs on a small thread pool so a slow command does not hold up other
+requests; its reply is written whenever it finishes, so replies are matched
+to requests by ``id`` rather than by order. Binary payloads are base64.
+"""
+
+import base64
+import fnmatch
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+PROTOCOL_VERSION = 1
+
+# Upper bound for a single read_range reply
+MAX_READ_SIZE = 16 * 1024 * 1024
+
+# Concurrent exec requests
+MAX_EXEC_WORKERS = 8
+
+_write_lock = threading.Lock()
+
+
+class HelperError(Exception):
+    """A request failure reported back to the broker with an error code."""
+
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+def _encode(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _os_error(e):
+    if isinstance(e, FileNotFoundError):
+        return HelperError("not_found", str(e))
+    if isinstance(e, PermissionError):
+        return HelperError("permission", str(e))
+    return HelperError("os_error", str(e))
+
+
+def op_hello(request):
+    return {"version": PROTOCOL_VERSION, "pid": os.getpid()}
+
+
+def op_exec(request):
+    argv = request["argv"]
+    env = None
+    if request.get("env"):
+        env = dict(os.environ)
+        env.update(request["env"])
+    try:
+        proc = subprocess.run(
+            argv,
+            capture_output=True,
+            timeout=request.get("timeout"),
+            env=env,
+            check=False,
+        )
+    except subprocess.TimeoutExpired as e:
+        raise HelperError("timeout", f"Command timed out: {argv[0]}") from e
+    except OSError as e:
+        raise _os_error(e) from e
+    return {
+        "returncode": proc.returncode,
+        "stdout": _encode(proc.stdout),
+        "stderr": _encode(proc.stderr),
+    }
+
+
+def op_stat(request):
+    try:
+        st = os.stat(request["path"])
+    except (FileNotFoundError, NotADirectoryError):
+        return {"exists": False}
+    except OSError as e:
+        raise _os_error(e) from e
+    return {
+        "exists": True,
+        "is_file": os.path.isfile(request["path"]),
+        "is_dir": os.path.isdir(request["path"]),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "mode": st.st_mode,
+    }
+
+
+def op_read_range(request):
+    offset = max(0, int(request.get("offset", 0)))
+    length = request.get("length")
+    length = MAX_READ_SIZE if length is None else min(max(0, int(length)), MAX_READ_SIZE)
+    try:
+        with open(request["path"], "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+    except OSError as e:
+        raise _os_error(e) from e
+    return {"data": _encode(data)}
+
+
+def op_glob(request):
+    """Match names in one directory (non-recursive), like ``find -maxdepth 1``."""
+    patterns = request.get("patterns") or ["*"]
+    ignore_case = request.get("ignore_case", False)
+    files_only = request.get("files_only", False)
+    limit = request.get("limit")
+    if ignore_case:
+        patterns = [p.lower() for p in patterns]
+
+    paths = []
+    try:
+        with os.scandir(request["directory"]) as entries:
+            for entry in entries:
+                name = entry.name.lower() if ignore_case else entry.name
+                if not any(fnmatch.fnmatchcase(name, p) for p in patterns):
+                    continue
+                if files_only and not entry.is_file():
+                    continue
+                paths.append(entry.path)
+                if limit is not None and len(paths) >= limit:
+                    break
+    except OSError as e:
+        raise _os_error(e) from e
+    return {"paths": sorted(paths)}
+
+
+def op_which(request):
+    return {"path": shutil.which(request["name"])}
+
+
+OPS = {
+    "hello": op_hello,
+    "exec": op_exec,
+    "stat": op_stat,
+    "read_range": op_read_range,
+    "glob": op_glob,
+    "which": op_which,
+}
+
+
+def _reply(message):
+    line = json.dumps(message, separators=(",", ":"))
+    with _write_lock:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+
+
+def handle(request):
+    request_id = request.get("id")
+    op = OPS.get(request.get("op"))
+    try:
+        if op is None:
+            raise HelperError("unknown_op", f"Unknown operation: {request.get('op')}")
+        _reply({"id": request_id, "ok": True, "result": op(request)})
+    except HelperError as e:
+        _reply({"id": request_id, "ok": False, "error": e.code, "message": str(e)})
+    except Exception as e:
+        _reply({"id": request_id, "ok": False, "error": "internal", "message": repr(e)})
+
+
+def main():
+    with ThreadPoolExecutor(max_workers=MAX_EXEC_WORKERS) as pool:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                continue
+            if not isinstance(request, dict):
+                continue
+            if request.get("op") == "exec":
+                pool.submit(handle, request)
+            else:
+                handle(request)
+
+
+if __name__ == "__main__":
+    main()
@@ -149,10 +149,16 @@ from datetime import datetime
 from enum import Enum
 from pathlib import Path
 
-from gi.repository import GLib
-
+from .main_loop import idle_add
 from .sanitize import redact_sensitive_log_data, sanitize_log_line, sanitize_log_text
-from .utils import get_clean_env, is_flatpak, which_host_command, wrap_host_command
+from .scan_timing import ScanTiming
+from .utils import (
+    get_clean_env,
+    host_path_exists,
+    is_flatpak,
+    which_host_command,
+    wrap_host_command,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -187,6 +193,16 @@ def _sanitize_private_text(text: str | None) -> str:
     return redact_sensitive_log_data(sanitize_log_text(text))
 
 
+def _sanitize_timing(data) -> dict | None:
+    """Normalize stored scan timing, dropping it if it is malformed."""
+    timing = ScanTiming.from_dict(data)
+    if timing is None:
+        return None
+    for phase in timing.phases:
+        phase.name = sanitize_log_line(phase.name)
+    return timing.to_dict()
+
+
 def _extract_first_int(pattern: str, text: str) -> int | None:
     """Extract the first integer captured by pattern from text."""
     match = re.search(pattern, text)
@@ -449,6 +465,7 @@ class LogEntry:
     path: str | None = None  # Scanned path (for scans)
     duration: float = 0.0  # Operation duration in seconds
     scheduled: bool = False  # Whether this was a scheduled automatic scan
+    timing: dict | None = None  # Per-phase scan timing (ScanTiming.to_dict())
 
     @classmethod
     def create(
@@ -460,6 +477,7 @@ class LogEntry:
         path: str | None = None,
         duration: float = 0.0,
         scheduled: bool = False,
+        timing: dict | None = None,
     ) -> "LogEntry":
         """
         Create a new LogEntry with auto-generated id and timestamp.
@@ -472,6 +490,7 @@ class LogEntry:
             path: Scanned path (for scan operations)
             duration: Operation duration in seconds
             scheduled: Whether this was a scheduled automatic scan
+            timing: Per-phase scan timing (ScanTiming.to_dict())
 
         Returns:
             New LogEntry instance
@@ -491,6 +510,7 @@ class LogEntry:
             path=None,
             duration=duration,
             scheduled=scheduled,
+            timing=timing,
         )
 
     def to_dict(self) -> dict:
@@ -541,6 +561,7 @@ class LogEntry:
             path=sanitize_log_line(raw_path) if raw_path else None,
             duration=duration,
             scheduled=data.get("scheduled", False),
+            timing=_sanitize_timing(data.get("timing")),
         )
 
     @classmethod
@@ -557,6 +578,7 @@ class LogEntry:
         stdout: str = "",
         suffix: str = "",
         scheduled: bool = False,
+        timing: dict | None = None,
     ) -> "LogEntry":
         """
         Create a LogEntry from scan result data.
@@ -576,6 +598,7 @@ class LogEntry:
             stdout: Raw stdout from scan command
             suffix: Optional suffix for summary (e.g., "(daemon)")
             scheduled: Whether this was a scheduled scan
+            timing: Per-phase scan timing (ScanTiming.to_dict())
 
         Returns:
             New LogEntry instance
@@ -623,6 +646,7 @@ class LogEntry:
             path=None,
             duration=duration,
             scheduled=scheduled,
+            timing=timing,
         )
 
     @classmethod
@@ -1585,7 +1609,7 @@ class LogManager:
                 logger.debug("Async log loading failed: %s", e)
                 entries = []
             # Schedule callback on main thread - always called to reset loading state
-            GLib.idle_add(callback, entries)
+            idle_add(callback, entries)
 
         thread = threading.Thread(target=_load_logs_thread)
         thread.daemon = True
@@ -1998,16 +2022,7 @@ class LogManager:
             True if file exists, False otherwise
         """
         if is_flatpak():
-            try:
-                result = subprocess.run(
-                    ["flatpak-spawn", "--host", "test", "-f", path],
-                    capture_output=True,
-                    timeout=5,
-                )
-                return result.returncode == 0
-            except Exception as e:
-                logger.debug("Failed to check host file existence for %s: %s", path, e)
-                return False
+            return host_path_exists(path)
         return Path(path).exists()
 
     def get_daemon_log_path(self) -> str | None:
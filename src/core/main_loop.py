@@ -0,0 +1,28 @@
+# ClamUI Main Loop Dispatch
+"""
+Main-loop dispatch for the core modules' ``*_async`` helpers.
+
+The core runs scans, updates and log queries on worker threads and hands
+results back to the GTK main loop with ``GLib.idle_add``. Importing
+``gi.repository`` costs a noticeable slice of startup (GObject introspection
+plus typelib loading), and the CLI and scheduled-scan entry points never need
+it. Core modules therefore call idle_add() from here, which imports GLib on
+first use only, so they import with the standard library alone.
+"""
+
+from collections.abc import Callable
+
+
+def idle_add(callback: Callable[..., object], *args) -> int:
+    """
+    Schedule ``callback(*args)`` on the GLib main loop.
+
+    Same contract as ``GLib.idle_add``: the callback runs once unless it
+    returns True.
+
+    Returns:
+        The GLib source id
+    """
+    from gi.repository import GLib
+
+    return GLib.idle_add(callback, *args)
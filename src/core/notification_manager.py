@@ -285,13 +285,16 @@ class NotificationManager:
             default_action="app.show-preferences",
         )
 
-    def notify_device_scan_started(self, device_name: str, mount_point: str) -> bool:
+    def notify_device_scan_started(
+        self, device_name: str, mount_point: str, estimated_seconds: float | None = None
+    ) -> bool:
         """
         Send notification when a device scan starts.
 
         Args:
             device_name: Human-readable device name
             mount_point: Filesystem path where device is mounted
+            estimated_seconds: Expected scan duration, if known (quick mode)
 
         Returns:
             True if notification was sent, False otherwise
@@ -302,10 +305,19 @@ class NotificationManager:
         if not self._settings.get("device_auto_scan_notify", True):
             return False
 
+        body = _("Scanning {device} ({path})").format(device=device_name, path=mount_point)
+        if estimated_seconds is not None:
+            minutes = max(1, round(estimated_seconds / 60))
+            body += "\n" + ngettext(
+                "Estimated time: about {count} minute",
+                "Estimated time: about {count} minutes",
+                minutes,
+            ).format(count=minutes)
+
         return self._send(
             notification_id=self.NOTIFICATION_ID_DEVICE_SCAN_STARTED,
             title=_("Scanning Device"),
-            body=_("Scanning {device} ({path})").format(device=device_name, path=mount_point),
+            body=body,
             priority=Gio.NotificationPriority.NORMAL,
             default_action="app.show-scan",
         )
@@ -0,0 +1,401 @@
+# ClamUI Private clamd Module
+"""
+On-demand, user-level clamd for installations without a system daemon.
+
+Without a running clamd, every scan goes through clamscan, which loads the
+whole signature set (tens of seconds, around 1 GB of memory) before looking
+at the first file. That cost is paid again for each file-manager scan and each
+device auto-scan.
+
+When the "private_clamd_enabled" setting is on, PrivateClamd starts clamd as
+the current user on a socket under ``$XDG_RUNTIME_DIR/clamui`` with a config
+generated from the system clamd.conf (scan limits and detection options are
+inherited; socket, logging and user settings are ClamUI's own). Later scans,
+from any ClamUI process, find the warm daemon on that socket.
+
+clamd has no idle shutdown of its own, so it runs under a small shell
+watchdog that stops it once the ``last-used`` stamp file is older than the
+idle timeout. Scans hold a lease() that keeps the stamp fresh, so a long scan
+is never cut off.
+
+Flatpak is not supported: clamd would have to run on the host, outside the
+sandbox's runtime directory.
+"""
+
+import contextlib
+import fcntl
+import logging
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from .clamav_config import ClamAVConfig, parse_config
+from .clamav_detection import (
+    detect_clamd_conf_path,
+    get_host_database_dirs,
+    invalidate_clamav_probes,
+)
+from .clamd_reload import _socket_command
+from .flatpak import get_clean_env, is_flatpak
+from .i18n import _
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 15 * 60
+
+# Loading the full signature set can take a while on slow disks
+START_TIMEOUT = 180.0
+_START_POLL_INTERVAL = 0.25
+
+# Seconds between watchdog idle checks (and lease stamp refreshes)
+_WATCHDOG_INTERVAL = 30
+
+# clamd.conf options that change what is detected or how much is scanned;
+# the private daemon should behave like the system configuration
+_INHERITED_KEYS = (
+    "MaxFileSize",
+    "MaxScanSize",
+    "MaxRecursion",
+    "MaxFiles",
+    "MaxEmbeddedPE",
+    "MaxHTMLNormalize",
+    "MaxHTMLNoTags",
+    "MaxScriptNormalize",
+    "MaxZipTypeRcg",
+    "MaxPartitions",
+    "MaxIconsPE",
+    "PCREMatchLimit",
+    "PCRERecMatchLimit",
+    "PCREMaxFileSize",
+    "ScanPE",
+    "ScanELF",
+    "ScanOLE2",
+    "ScanPDF",
+    "ScanSWF",
+    "ScanXMLDOCS",
+    "ScanHWP3",
+    "ScanMail",
+    "ScanHTML",
+    "ScanArchive",
+    "Bytecode",
+    "BytecodeSecurity",
+    "HeuristicAlerts",
+    "HeuristicScanPrecedence",
+    "DetectPUA",
+    "ExcludePUA",
+    "IncludePUA",
+    "AlertBrokenExecutables",
+    "AlertEncrypted",
+    "AlertOLE2Macros",
+    "AlertPhishingSSLMismatch",
+    "AlertPhishingCloak",
+    "PhishingSignatures",
+    "PhishingScanURLs",
+    "StructuredDataDetection",
+    "CrossFilesystems",
+    "FollowDirectorySymlinks",
+    "FollowFileSymlinks",
+    "ExcludePath",
+    "MaxThreads",
+    "OfficialDatabaseOnly",
+)
+
+# Runs clamd ($5) and stops it once the stamp file ($2) is older than $3
+# seconds, checking every $4 seconds. The shell exits with clamd's status, so
+# a clamd that fails to start is noticed straight away.
+_WATCHDOG_SCRIPT = r"""
+"$5" --config-file="$1" &
+pid=$!
+(
+    while sleep "$4"; do
+        last=$(stat -c %Y "$2" 2>/dev/null || echo 0)
+        if [ $(( $(date +%s) - last )) -ge "$3" ]; then
+            kill $pid 2>/dev/null
+            exit 0
+        fi
+    done
+) &
+watch=$!
+trap 'kill $pid 2>/dev/null; wait $pid; kill $watch 2>/dev/null; exit 0' TERM INT HUP
+wait $pid
+status=$?
+kill $watch 2>/dev/null
+exit $status
+"""
+
+_CLAMD_FALLBACK_PATHS = ("/usr/sbin/clamd", "/usr/local/sbin/clamd")
+
+
+def _find_clamd() -> str | None:
+    """Locate the clamd binary; distros often install it outside the user PATH."""
+    found = shutil.which("clamd")
+    if found:
+        return found
+    for path in _CLAMD_FALLBACK_PATHS:
+        if os.access(path, os.X_OK):
+            return path
+    return None
+
+
+def build_private_config(
+    socket_path: str, system_config: ClamAVConfig | None, database_dir: str
+) -> ClamAVConfig:
+    """
+    Generate the private daemon's clamd.conf.
+
+    Args:
+        socket_path: LocalSocket for the private daemon
+        system_config: Parsed system clamd.conf to inherit scan options from
+        database_dir: DatabaseDirectory to load signatures from
+
+    Returns:
+        ClamAVConfig ready for to_string()
+    """
+    config = ClamAVConfig(file_path=Path(socket_path).with_name("clamd.conf"))
+    config.add_value("Foreground", "yes")
+    config.add_value("LocalSocket", socket_path)
+    config.add_value("LocalSocketMode", "600")
+    config.add_value("DatabaseDirectory", database_dir)
+    # Pick up freshclam updates without a restart
+    config.add_value("SelfCheck", "600")
+    if system_config is not None:
+        for key in _INHERITED_KEYS:
+            for value in system_config.get_values(key):
+                config.add_value(key, value)
+    return config
+
+
+class PrivateClamd:
+    """
+    Supervises a user-level clamd under the runtime directory.
+
+    Usage:
+        private = get_private_clamd()
+        ok, error = private.ensure_running(idle_timeout=900)
+        if ok:
+            with private.lease():
+                ...  # clamdscan --config-file private.config_path
+    """
+
+    def __init__(self, runtime_dir: Path | None = None):
+        """
+        Initialize the supervisor.
+
+        Args:
+            runtime_dir: Directory for socket, config and stamp files;
+                defaults to $XDG_RUNTIME_DIR/clamui
+        """
+        if runtime_dir is None:
+            xdg_runtime = os.environ.get("XDG_RUNTIME_DIR")
+            runtime_dir = Path(xdg_runtime) / "clamui" if xdg_runtime else None
+        self._runtime_dir = runtime_dir
+        self._lock = threading.Lock()
+        self._process: subprocess.Popen | None = None
+        self._leases = 0
+        self._lease_stop: threading.Event | None = None
+
+    @property
+    def socket_path(self) -> str | None:
+        return str(self._runtime_dir / "clamd.sock") if self._runtime_dir else None
+
+    @property
+    def config_path(self) -> str | None:
+        return str(self._runtime_dir / "clamd.conf") if self._runtime_dir else None
+
+    @property
+    def _stamp_path(self) -> Path:
+        return self._runtime_dir / "last-used"
+
+    @property
+    def _pid_path(self) -> Path:
+        return self._runtime_dir / "watchdog.pid"
+
+    def unavailable_reason(self) -> str | None:
+        """Return why a private daemon cannot be used here, or None."""
+        if is_flatpak():
+            return _("A private scan daemon is not available in Flatpak")
+        if self._runtime_dir is None:
+            return _("XDG_RUNTIME_DIR is not set")
+        if _find_clamd() is None:
+            return _("clamd is not installed")
+        return None
+
+    def is_running(self) -> bool:
+        """Return True if the private daemon answers PING."""
+        if self.socket_path is None or not os.path.exists(self.socket_path):
+            return False
+        try:
+            return _socket_command(self.socket_path, "PING") == "PONG"
+        except OSError:
+            return False
+
+    def touch(self) -> None:
+        """Mark the daemon as used now, postponing its idle shutdown."""
+        try:
+            self._stamp_path.touch()
+        except OSError as e:
+            logger.debug("Could not update private clamd stamp: %s", e)
+
+    def ensure_running(
+        self, idle_timeout: int = DEFAULT_IDLE_TIMEOUT, timeout: float = START_TIMEOUT
+    ) -> tuple[bool, str | None]:
+        """
+        Start the private daemon unless it is already serving.
+
+        Safe to call from several threads and several ClamUI processes; only
+        one of them starts clamd.
+
+        Args:
+            idle_timeout: Seconds without use before the daemon shuts down
+            timeout: Seconds to wait for the signatures to load
+
+        Returns:
+            (True, None) once the daemon answers, (False, error) otherwise
+        """
+        reason = self.unavailable_reason()
+        if reason:
+            return (False, reason)
+
+        with self._lock:
+            if self.is_running():
+                self.touch()
+                return (True, None)
+            try:
+                self._runtime_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+                with open(self._runtime_dir / "start.lock", "w") as lock_file:
+                    # Serialize starts across ClamUI processes
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    if self.is_running():
+                        self.touch()
+                        return (True, None)
+                    return self._start(idle_timeout, timeout)
+            except OSError as e:
+                return (False, _("Could not start private scan daemon: {error}").format(error=e))
+
+    def _start(self, idle_timeout: int, timeout: float) -> tuple[bool, str | None]:
+        self._reap()
+        system_config = None
+        system_path = detect_clamd_conf_path()
+        if system_path:
+            system_config, _error = parse_config(system_path)
+        database_dir = (
+            system_config.get_value("DatabaseDirectory") if system_config is not None else None
+        ) or get_host_database_dirs()[0]
+
+        config = build_private_config(self.socket_path, system_config, database_dir)
+        Path(self.config_path).write_text(config.to_string())
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(self.socket_path)
+        self.touch()
+
+        log_path = self._runtime_dir / "clamd.log"
+        with open(log_path, "ab") as log_file:
+            self._process = subprocess.Popen(
+                [
+                    "sh",
+                    "-c",
+                    _WATCHDOG_SCRIPT,
+                    "sh",
+                    self.config_path,
+                    str(self._stamp_path),
+                    str(int(idle_timeout)),
+                    str(min(_WATCHDOG_INTERVAL, max(1, int(idle_timeout)))),
+                    _find_clamd(),
+                ],
+                stdin=subprocess.DEVNULL,
+                stdout=log_file,
+                stderr=log_file,
+                env=get_clean_env(),
+                # Outlive this process so the next ClamUI invocation finds it warm
+                start_new_session=True,
+            )
+        self._pid_path.write_text(str(self._process.pid))
+        logger.info("Starting private clamd (idle timeout %ss)", idle_timeout)
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.is_running():
+                invalidate_clamav_probes("clamd")
+                return (True, None)
+            if self._process.poll() is not None:
+                return (False, self._start_error(log_path))
+            time.sleep(_START_POLL_INTERVAL)
+        self.stop()
+        return (
+            False,
+            _("Private scan daemon did not start within {seconds:.0f}s").format(seconds=timeout),
+        )
+
+    @staticmethod
+    def _start_error(log_path: Path) -> str:
+        """Summarize why clamd exited during startup from its log."""
+        try:
+            lines = [line for line in log_path.read_text(errors="replace").splitlines() if line]
+        except OSError:
+            lines = []
+        detail = lines[-1] if lines else _("clamd exited during startup")
+        return _("Private scan daemon failed to start: {error}").format(error=detail)
+
+    def _reap(self) -> None:
+        """Collect an exited watchdog this process started."""
+        if self._process is not None and self._process.poll() is not None:
+            self._process = None
+
+    def stop(self) -> None:
+        """Stop the private daemon now, whichever ClamUI process started it."""
+        if self._runtime_dir is None:
+            return
+        try:
+            pid = int(self._pid_path.read_text().strip())
+        except (OSError, ValueError):
+            return
+        with contextlib.suppress(ProcessLookupError, PermissionError):
+            os.kill(pid, signal.SIGTERM)
+        with contextlib.suppress(OSError):
+            self._pid_path.unlink()
+        if self._process is not None:
+            with contextlib.suppress(subprocess.TimeoutExpired):
+                self._process.wait(timeout=5)
+            self._reap()
+
+    @contextlib.contextmanager
+    def lease(self) -> Iterator[None]:
+        """Keep the daemon from idling out while the block runs."""
+        with self._lock:
+            self._leases += 1
+            if self._leases == 1:
+                self._lease_stop = threading.Event()
+                threading.Thread(
+                    target=self._refresh_stamp, args=(self._lease_stop,), daemon=True
+                ).start()
+        self.touch()
+        try:
+            yield
+        finally:
+            self.touch()
+            with self._lock:
+                self._leases -= 1
+                if self._leases == 0:
+                    self._lease_stop.set()
+
+    def _refresh_stamp(self, stop: threading.Event) -> None:
+        while not stop.wait(_WATCHDOG_INTERVAL / 2):
+            self.touch()
+
+
+_private_clamd: PrivateClamd | None = None
+_private_clamd_lock = threading.Lock()
+
+
+def get_private_clamd() -> PrivateClamd:
+    """Return the shared PrivateClamd instance."""
+    global _private_clamd
+    with _private_clamd_lock:
+        if _private_clamd is None:
+            _private_clamd = PrivateClamd()
+        return _private_clamd
@@ -26,10 +26,38 @@ from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from .connection_pool import ConnectionPool
+from .connection_pool import STATEMENT_CACHE_SIZE, ConnectionPool, configure_connection
 
 logger = logging.getLogger(__name__)
 
+# Schema version stored in PRAGMA user_version. Bump this and extend
+# QuarantineDatabase._migrate_schema() whenever the schema changes.
+# 1 = original_permissions column, 2 = state column.
+SCHEMA_VERSION = 2
+
+# SQL text is kept in constants so that every call issues byte-identical
+# statements, letting sqlite3's per-connection statement cache reuse the
+# compiled statement instead of re-preparing it on each operation.
+_ENTRY_COLUMNS = """
+    SELECT id, original_path, quarantine_path, threat_name,
+           detection_date, file_size, file_hash, original_permissions
+    FROM quarantine"""
+
+_SQL_INSERT_ENTRY = """
+    INSERT INTO quarantine
+    (original_path, quarantine_path, threat_name, detection_date,
+     file_size, file_hash, original_permissions)
+    VALUES (?, ?, ?, ?, ?, ?, ?)"""
+_SQL_SELECT_BY_ID = _ENTRY_COLUMNS + " WHERE id = ?"
+_SQL_SELECT_BY_ORIGINAL_PATH = _ENTRY_COLUMNS + " WHERE original_path = ?"
+_SQL_SELECT_ALL = _ENTRY_COLUMNS + " ORDER BY detection_date DESC"
+_SQL_SELECT_OLDER_THAN = _ENTRY_COLUMNS + " WHERE detection_date < ? ORDER BY detection_date ASC"
+_SQL_DELETE_BY_ID = "DELETE FROM quarantine WHERE id = ?"
+_SQL_DELETE_OLDER_THAN = "DELETE FROM quarantine WHERE detection_date < ?"
+_SQL_TOTAL_SIZE = "SELECT COALESCE(SUM(file_size), 0) FROM quarantine"
+_SQL_COUNT = "SELECT COUNT(*) FROM quarantine"
+_SQL_EXISTS = "SELECT 1 FROM quarantine WHERE original_path = ? LIMIT 1"
+
 
 @dataclass
 class QuarantineEntry:
@@ -170,7 +198,9 @@ class QuarantineDatabase:
                 yield conn
         else:
             # Fallback to per-operation connections when pooling is disabled
-            conn = sqlite3.connect(str(self._db_path), timeout=30.0)
+            conn = sqlite3.connect(
+                str(self._db_path), timeout=30.0, cached_statements=STATEMENT_CACHE_SIZE
+            )
             try:
                 # WAL (Write-Ahead Log) mode concurrency implications:
                 # - Allows MULTIPLE concurrent readers + ONE writer (vs rollback journal: exclusive writer lock)
@@ -178,9 +208,8 @@ class QuarantineDatabase:
                 # - Better performance for mixed read/write workloads
                 # - Creates .db-wal and .db-shm files (also secured to 0o600)
                 # - Auto-checkpoints every 1000 pages (configurable with PRAGMA wal_autocheckpoint)
-                # Enable WAL mode for better concurrency and corruption prevention
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA foreign_keys=ON")
+                # Same WAL/synchronous/cache tuning as pooled connections
+                configure_connection(conn)
                 yield conn
             finally:
                 conn.close()
@@ -237,63 +266,22 @@ class QuarantineDatabase:
                 os.close(fd)
 
     def _init_database(self) -> None:
-        """Initialize the database schema if it doesn't exist."""
+        """
+        Initialize the database schema if it doesn't exist.
+
+        The schema version is read once from PRAGMA user_version. An up-to-date
+        database skips DDL and column introspection entirely; older databases
+        are migrated by _migrate_schema() and stamped with SCHEMA_VERSION.
+        """
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    conn.execute(
-                        """
-                        CREATE TABLE IF NOT EXISTS quarantine (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            original_path TEXT NOT NULL,
-                            quarantine_path TEXT NOT NULL UNIQUE,
-                            threat_name TEXT NOT NULL,
-                            detection_date TEXT NOT NULL,
-                            file_size INTEGER NOT NULL,
-                            file_hash TEXT NOT NULL,
-                            original_permissions INTEGER NOT NULL DEFAULT 420
-                                CHECK (original_permissions BETWEEN 0 AND 511),
-                            state TEXT NOT NULL DEFAULT 'active'
-                                CHECK (state IN ('active', 'restored', 'deleted'))
-                        )
-                        """
-                    )
-                    # Create index for faster lookups
-                    conn.execute(
-                        """
-                        CREATE INDEX IF NOT EXISTS idx_quarantine_detection_date
-                        ON quarantine(detection_date)
-                        """
-                    )
-                    conn.execute(
-                        """
-                        CREATE INDEX IF NOT EXISTS idx_quarantine_original_path
-                        ON quarantine(original_path)
-                        """
-                    )
-
-                    # Migration: Add original_permissions column if it doesn't exist
-                    # This handles existing databases that were created before this column
-                    cursor = conn.execute("PRAGMA table_info(quarantine)")
-                    columns = [row[1] for row in cursor.fetchall()]
-                    if "original_permissions" not in columns:
-                        conn.execute(
-                            """
-                            ALTER TABLE quarantine
-                            ADD COLUMN original_permissions INTEGER NOT NULL DEFAULT 420
-                                CHECK (original_permissions BETWEEN 0 AND 511)
-                            """
-                        )
-                    if "state" not in columns:
-                        conn.execute(
-                            """
-                            ALTER TABLE quarantine
-                            ADD COLUMN state TEXT NOT NULL DEFAULT 'active'
-                                CHECK (state IN ('active', 'restored', 'deleted'))
-                            """
-                        )
-
-                    conn.commit()
+                    version = conn.execute("PRAGMA user_version").fetchone()[0]
+                    if version < SCHEMA_VERSION:
+                        self._migrate_schema(conn, version)
+                        # PRAGMA does not accept bound parameters; SCHEMA_VERSION is an int
+                        conn.execute(f"PRAGMA user_version = {int(SCHEMA_VERSION)}")
+                        conn.commit()
 
                     # SECURITY: Secure database file permissions after schema creation
                     # Applies 0o600 permissions to prevent unauthorized access to sensitive metadata
@@ -305,6 +293,69 @@ class QuarantineDatabase:
             except sqlite3.Error as e:
                 logger.error("Failed to initialize quarantine database at %s: %s", self._db_path, e)
 
+    def _migrate_schema(self, conn: sqlite3.Connection, version: int) -> None:
+        """
+        Create or upgrade the quarantine schema to SCHEMA_VERSION.
+
+        Args:
+            conn: Open connection; the caller commits and updates user_version
+            version: Current PRAGMA user_version of the database
+        """
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS quarantine (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                original_path TEXT NOT NULL,
+                quarantine_path TEXT NOT NULL UNIQUE,
+                threat_name TEXT NOT NULL,
+                detection_date TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                file_hash TEXT NOT NULL,
+                original_permissions INTEGER NOT NULL DEFAULT 420
+                    CHECK (original_permissions BETWEEN 0 AND 511),
+                state TEXT NOT NULL DEFAULT 'active'
+                    CHECK (state IN ('active', 'restored', 'deleted'))
+            )
+            """
+        )
+        # Create index for faster lookups
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_quarantine_detection_date
+            ON quarantine(detection_date)
+            """
+        )
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_quarantine_original_path
+            ON quarantine(original_path)
+            """
+        )
+
+        if version > 0:
+            return
+
+        # Migration: databases created before user_version was tracked report 0
+        # and may lack columns added later. Introspect once and add them.
+        cursor = conn.execute("PRAGMA table_info(quarantine)")
+        columns = [row[1] for row in cursor.fetchall()]
+        if "original_permissions" not in columns:
+            conn.execute(
+                """
+                ALTER TABLE quarantine
+                ADD COLUMN original_permissions INTEGER NOT NULL DEFAULT 420
+                    CHECK (original_permissions BETWEEN 0 AND 511)
+                """
+            )
+        if "state" not in columns:
+            conn.execute(
+                """
+                ALTER TABLE quarantine
+                ADD COLUMN state TEXT NOT NULL DEFAULT 'active'
+                    CHECK (state IN ('active', 'restored', 'deleted'))
+                """
+            )
+
     def add_entry(
         self,
         original_path: str,
@@ -336,12 +387,7 @@ class QuarantineDatabase:
             try:
                 with self._get_connection() as conn:
                     cursor = conn.execute(
-                        """
-                        INSERT INTO quarantine
-                        (original_path, quarantine_path, threat_name, detection_date,
-                         file_size, file_hash, original_permissions)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
+                        _SQL_INSERT_ENTRY,
                         (
                             original_path,
                             quarantine_path,
@@ -371,14 +417,7 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute(
-                        """
-                        SELECT id, original_path, quarantine_path, threat_name,
-                               detection_date, file_size, file_hash, original_permissions
-                        FROM quarantine WHERE id = ?
-                        """,
-                        (entry_id,),
-                    )
+                    cursor = conn.execute(_SQL_SELECT_BY_ID, (entry_id,))
                     row = cursor.fetchone()
                     if row:
                         return QuarantineEntry.from_row(row)
@@ -399,14 +438,7 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute(
-                        """
-                        SELECT id, original_path, quarantine_path, threat_name,
-                               detection_date, file_size, file_hash, original_permissions
-                        FROM quarantine WHERE original_path = ?
-                        """,
-                        (original_path,),
-                    )
+                    cursor = conn.execute(_SQL_SELECT_BY_ORIGINAL_PATH, (original_path,))
                     row = cursor.fetchone()
                     if row:
                         return QuarantineEntry.from_row(row)
@@ -429,16 +461,8 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute(
-                        """
-                        SELECT id, original_path, quarantine_path, threat_name,
-                               detection_date, file_size, file_hash, original_permissions
-                        FROM quarantine
-                        ORDER BY detection_date DESC
-                        """
-                    )
-                    for row in cursor.fetchall():
-                        entries.append(QuarantineEntry.from_row(row))
+                    cursor = conn.execute(_SQL_SELECT_ALL)
+                    entries = [QuarantineEntry.from_row(row) for row in cursor.fetchall()]
             except sqlite3.Error as e:
                 logger.error("Failed to get all quarantine entries: %s", e)
         return entries
@@ -456,10 +480,7 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute(
-                        "DELETE FROM quarantine WHERE id = ?",
-                        (entry_id,),
-                    )
+                    cursor = conn.execute(_SQL_DELETE_BY_ID, (entry_id,))
                     conn.commit()
                     return cursor.rowcount > 0
             except sqlite3.Error as e:
@@ -476,7 +497,7 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute("SELECT COALESCE(SUM(file_size), 0) FROM quarantine")
+                    cursor = conn.execute(_SQL_TOTAL_SIZE)
                     row = cursor.fetchone()
                     if row:
                         return row[0]
@@ -494,7 +515,7 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute("SELECT COUNT(*) FROM quarantine")
+                    cursor = conn.execute(_SQL_COUNT)
                     row = cursor.fetchone()
                     if row:
                         return row[0]
@@ -518,18 +539,8 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute(
-                        """
-                        SELECT id, original_path, quarantine_path, threat_name,
-                               detection_date, file_size, file_hash, original_permissions
-                        FROM quarantine
-                        WHERE detection_date < ?
-                        ORDER BY detection_date ASC
-                        """,
-                        (cutoff_date,),
-                    )
-                    for row in cursor.fetchall():
-                        entries.append(QuarantineEntry.from_row(row))
+                    cursor = conn.execute(_SQL_SELECT_OLDER_THAN, (cutoff_date,))
+                    entries = [QuarantineEntry.from_row(row) for row in cursor.fetchall()]
             except sqlite3.Error as e:
                 logger.error("Failed to get old quarantine entries (days=%s): %s", days, e)
         return entries
@@ -552,10 +563,7 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute(
-                        "DELETE FROM quarantine WHERE detection_date < ?",
-                        (cutoff_date,),
-                    )
+                    cursor = conn.execute(_SQL_DELETE_OLDER_THAN, (cutoff_date,))
                     conn.commit()
                     return cursor.rowcount
             except sqlite3.Error as e:
@@ -575,10 +583,7 @@ class QuarantineDatabase:
         with self._lock:
             try:
                 with self._get_connection() as conn:
-                    cursor = conn.execute(
-                        "SELECT 1 FROM quarantine WHERE original_path = ? LIMIT 1",
-                        (original_path,),
-                    )
+                    cursor = conn.execute(_SQL_EXISTS, (original_path,))
                     return cursor.fetchone() is not None
             except sqlite3.Error as e:
                 logger.error(
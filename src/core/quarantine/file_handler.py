@@ -11,7 +11,6 @@ Provides secure file movement to/from quarantine with:
 
 import contextlib
 import errno
-import hashlib
 import logging
 import os
 import shutil
@@ -22,6 +21,8 @@ from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 
+from .. import hashing
+
 logger = logging.getLogger(__name__)
 
 # O_NOFOLLOW is required on every code path that opens user-controlled paths.
@@ -119,8 +120,8 @@ class SecureFileHandler:
     # File permission: owner read-only (prevents execution)
     QUARANTINE_FILE_PERMISSIONS = 0o400
 
-    # Buffer size for hash calculation (64KB)
-    HASH_BUFFER_SIZE = 65536
+    # Read/write block size for hashing copies (shared with core.hashing)
+    HASH_BUFFER_SIZE = hashing.HASH_BUFFER_SIZE
 
     def __init__(self, quarantine_directory: str | None = None):
         """
@@ -183,22 +184,21 @@ class SecureFileHandler:
                 )
             return (False, f"Error creating quarantine directory: {e}")
 
-    def calculate_hash(self, file_path: Path) -> tuple[str | None, str | None]:
+    def calculate_hash(
+        self, file_path: Path, use_cache: bool = True
+    ) -> tuple[str | None, str | None]:
         """
         Calculate SHA256 hash of a file for integrity verification.
 
-        Buffered Reading Benefit:
-        - Reads file in 64KB chunks (HASH_BUFFER_SIZE) instead of loading entire file
-        - Memory efficient for large files (e.g., 2GB file uses only 64KB RAM)
-        - Prevents MemoryError on systems with limited RAM
-        - Performance: ~same speed as read-all for small files, much better for large files
-        - Example: Can hash a 10GB file using only 64KB of memory
-
-        Uses buffered reading to handle large files efficiently without
-        loading the entire file into memory.
+        Uses the shared hashing service, which reads in large blocks and
+        memoizes digests by file identity, so a file already hashed for a
+        VirusTotal lookup is not read again. The file is opened with
+        O_NOFOLLOW, so symlinks are rejected.
 
         Args:
             file_path: Path to the file to hash
+            use_cache: Reuse a memoized digest if the file is unchanged.
+                       Integrity checks pass False to re-read the bytes.
 
         Returns:
             Tuple of (hash_string, error_message):
@@ -212,22 +212,10 @@ class SecureFileHandler:
             ...     print(f"SHA256: {hash_value}")
         """
         try:
-            sha256_hash = hashlib.sha256()
-            flags = os.O_RDONLY | os.O_NOFOLLOW
-            fd: int | None = None
-            try:
-                fd = os.open(file_path, flags)
-                with os.fdopen(fd, "rb") as f:
-                    fd = None  # fdopen owns it now
-                    for block in iter(lambda: f.read(self.HASH_BUFFER_SIZE), b""):
-                        sha256_hash.update(block)
-            except Exception:
-                if fd is not None:
-                    with contextlib.suppress(OSError):
-                        os.close(fd)
-                raise
-
-            return (sha256_hash.hexdigest(), None)
+            digests = hashing.get_hashing_service().hash_file(
+                file_path, use_cache=use_cache, follow_symlinks=False
+            )
+            return (digests.sha256, None)
 
         except FileNotFoundError:
             return (None, f"File not found: {file_path}")
@@ -289,7 +277,7 @@ class SecureFileHandler:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        actual_hash, error = self.calculate_hash(Path(file_path))
+        actual_hash, error = self.calculate_hash(Path(file_path), use_cache=False)
         if error:
             return (False, error)
         if actual_hash != expected_hash:
@@ -650,20 +638,24 @@ class SecureFileHandler:
                         self.QUARANTINE_FILE_PERMISSIONS,
                     )
                     dst_created = True
-                    sha256_hash = hashlib.sha256()
+                    digester = hashing.Digester()
                     while True:
                         block = os.read(src_fd, self.HASH_BUFFER_SIZE)
                         if not block:
                             break
-                        sha256_hash.update(block)
+                        digester.update(block)
                         _write_all(dst_fd, block)
                     os.fsync(dst_fd)
                     # fchmod via fd before close — no path-based TOCTOU window, and
                     # bypasses umask so permissions are applied exactly as specified.
                     os.fchmod(dst_fd, self.QUARANTINE_FILE_PERMISSIONS)
+                    digests = digester.result()
+                    # The copy was hashed on the way through; let later lookups
+                    # of the quarantined file reuse it instead of re-reading.
+                    hashing.get_hashing_service().remember(os.fstat(dst_fd), digests)
                     os.close(dst_fd)
                     dst_fd = None
-                    file_hash = sha256_hash.hexdigest()
+                    file_hash = digests.sha256
                 except OSError as e:
                     if dst_fd is not None:
                         with contextlib.suppress(OSError):
@@ -915,19 +907,21 @@ class SecureFileHandler:
                         masked_permissions,
                     )
                     dst_created = True
-                    sha256_hash = hashlib.sha256()
+                    digester = hashing.Digester()
                     while True:
                         block = os.read(src_fd, self.HASH_BUFFER_SIZE)
                         if not block:
                             break
-                        sha256_hash.update(block)
+                        digester.update(block)
                         _write_all(dst_fd, block)
                     os.fsync(dst_fd)
                     # fchmod via fd — no path-based window, bypasses umask.
                     os.fchmod(dst_fd, masked_permissions)
+                    digests = digester.result()
+                    hashing.get_hashing_service().remember(os.fstat(dst_fd), digests)
                     os.close(dst_fd)
                     dst_fd = None
-                    file_hash = sha256_hash.hexdigest()
+                    file_hash = digests.sha256
                 except OSError as e:
                     if dst_fd is not None:
                         with contextlib.suppress(OSError):
@@ -22,9 +22,8 @@ from enum import Enum
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from gi.repository import GLib
-
 from ..i18n import _
+from ..main_loop import idle_add
 from .database import QuarantineDatabase, QuarantineEntry
 from .file_handler import (
     FileOperationStatus,
@@ -268,7 +267,7 @@ class QuarantineManager:
 
         def _quarantine_thread():
             result = self.quarantine_file(file_path, threat_name)
-            GLib.idle_add(callback, result)
+            idle_add(callback, result)
 
         thread = threading.Thread(target=_quarantine_thread)
         thread.daemon = True
@@ -382,7 +381,7 @@ class QuarantineManager:
 
         def _restore_thread():
             result = self.restore_file(entry_id)
-            GLib.idle_add(callback, result)
+            idle_add(callback, result)
 
         thread = threading.Thread(target=_restore_thread)
         thread.daemon = True
@@ -474,7 +473,7 @@ class QuarantineManager:
 
         def _delete_thread():
             result = self.delete_file(entry_id)
-            GLib.idle_add(callback, result)
+            idle_add(callback, result)
 
         thread = threading.Thread(target=_delete_thread)
         thread.daemon = True
@@ -543,7 +542,7 @@ class QuarantineManager:
             except Exception as e:
                 logger.debug("Failed to get quarantine entries async: %s", e)
                 entries = []
-            GLib.idle_add(callback, entries)
+            idle_add(callback, entries)
 
         thread = threading.Thread(target=_get_entries_thread)
         thread.daemon = True
@@ -670,7 +669,7 @@ class QuarantineManager:
 
         def _cleanup_thread():
             removed_count = self.cleanup_orphaned_entries()
-            GLib.idle_add(callback, removed_count)
+            idle_add(callback, removed_count)
 
         thread = threading.Thread(target=_cleanup_thread)
         thread.daemon = True
@@ -767,7 +766,7 @@ class QuarantineManager:
                 logger.info("Periodic cleanup removed %d orphaned quarantine entries", removed)
 
             if callback is not None:
-                GLib.idle_add(callback, removed)
+                idle_add(callback, removed)
 
         thread = threading.Thread(target=_cleanup_thread)
         thread.daemon = True
@@ -825,7 +824,7 @@ class QuarantineManager:
 
         def _cleanup_thread():
             removed_count = self.cleanup_old_entries(days)
-            GLib.idle_add(callback, removed_count)
+            idle_add(callback, removed_count)
 
         thread = threading.Thread(target=_cleanup_thread)
         thread.daemon = True
@@ -0,0 +1,340 @@
+# ClamUI Resident Scheduler Module
+"""
+In-process timer for scheduled scans.
+
+The systemd timer or cron job behind scheduled scans starts
+``clamui-scheduled-scan`` from scratch on every run. Each run pays for a new
+Python process, a fresh settings load and new ClamAV probes. With the
+clamscan backend it also pays for a signature load per target. For hourly
+schedules on a laptop, that start-up is a noticeable part of every run.
+
+ResidentScheduler runs the same schedule from a long-lived process: the
+ClamUI app, or ``clamui-scheduled-scan --resident`` as a user service. The
+scan callback it is given keeps its scanner, probe cache and exclusion caches
+warm between runs. Runs are queued as background jobs with the shared
+ScanScheduler.
+
+While active, the resident scheduler holds an flock on
+``resident-scheduler.lock``. The timer-started CLI sees the lock and skips
+its own run, so a scheduled scan never runs twice. When no resident
+scheduler is active, the systemd/cron path works exactly as before.
+"""
+
+import contextlib
+import fcntl
+import logging
+import os
+import threading
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from .i18n import _
+from .scan_scheduler import JobPriority, JobState, ScanJob, ScanScheduler, get_scan_scheduler
+from .settings_manager import settings_view
+
+logger = logging.getLogger(__name__)
+
+LOCK_FILE_NAME = "resident-scheduler.lock"
+
+# Longest sleep between schedule checks; also bounds the delay after a
+# suspend/resume or wall-clock change and before settings changes are seen
+MAX_SLEEP_SECONDS = 60.0
+
+SCHEDULE_SETTING_KEYS = (
+    "scheduled_scans_enabled",
+    "schedule_frequency",
+    "schedule_time",
+    "schedule_day_of_week",
+    "schedule_day_of_month",
+)
+
+
+def parse_schedule_time(value: str) -> tuple[int, int]:
+    """
+    Parse an HH:MM schedule time.
+
+    Invalid values fall back to 02:00, like the systemd and cron schedules.
+
+    Args:
+        value: Time of day in 24-hour HH:MM format
+
+    Returns:
+        Tuple of (hour, minute)
+    """
+    try:
+        hour_text, minute_text = value.split(":")
+        hour, minute = int(hour_text), int(minute_text)
+    except (ValueError, AttributeError):
+        return (2, 0)
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        return (2, 0)
+    return (hour, minute)
+
+
+def next_run_after(
+    now: datetime,
+    frequency: str,
+    time: str,
+    day_of_week: int = 0,
+    day_of_month: int = 1,
+) -> datetime:
+    """
+    Return the first scheduled run strictly after ``now``.
+
+    Matches the OnCalendar expressions generated by Scheduler: hourly runs
+    on the hour, and monthly runs are limited to days 1-28.
+
+    Args:
+        now: Reference time (naive local time)
+        frequency: "hourly", "daily", "weekly" or "monthly"
+        time: Time of day in HH:MM format (ignored for hourly)
+        day_of_week: Day for weekly runs (0=Monday)
+        day_of_month: Day for monthly runs (1-28)
+
+    Returns:
+        Next run time
+    """
+    if frequency == "hourly":
+        return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+    hour, minute = parse_schedule_time(time)
+    at_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+    if frequency == "weekly":
+        candidate = at_time + timedelta(days=(day_of_week % 7 - now.weekday()) % 7)
+        return candidate if candidate > now else candidate + timedelta(days=7)
+
+    if frequency == "monthly":
+        candidate = at_time.replace(day=max(1, min(28, day_of_month)))
+        if candidate > now:
+            return candidate
+        if candidate.month == 12:
+            return candidate.replace(year=candidate.year + 1, month=1)
+        return candidate.replace(month=candidate.month + 1)
+
+    # Daily, and the fallback for unknown frequencies
+    return at_time if at_time > now else at_time + timedelta(days=1)
+
+
+def default_lock_path() -> Path:
+    """Return the lock file path shared by the app and the scheduled-scan CLI."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "clamui" / LOCK_FILE_NAME
+    config_home = os.environ.get("XDG_CONFIG_HOME", "~/.config")
+    return Path(config_home).expanduser() / "clamui" / LOCK_FILE_NAME
+
+
+def is_resident_scheduler_running(lock_path: Path | None = None) -> bool:
+    """
+    Check whether a resident scheduler holds the lock.
+
+    Args:
+        lock_path: Lock file to check (defaults to default_lock_path())
+
+    Returns:
+        True if another process (or ResidentScheduler) holds the lock
+    """
+    path = lock_path or default_lock_path()
+    try:
+        with open(path, "a") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return True
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+    except OSError:
+        return False
+    return False
+
+
+class ResidentScheduler:
+    """
+    Timer that triggers scheduled scans inside a long-running process.
+
+    The schedule is read from the scheduled-scan settings on every check,
+    so saved changes apply without a restart. A run that comes due while the
+    previous one is still queued or running is skipped. When the process
+    was suspended past a due time, the missed run starts on resume. Later
+    runs then follow the schedule from that point.
+    """
+
+    def __init__(
+        self,
+        settings_manager,
+        run_scan: Callable[[], object],
+        cancel_scan: Callable[[], None] | None = None,
+        scheduler: ScanScheduler | None = None,
+        lock_path: Path | None = None,
+        reload_settings: bool = False,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
+        """
+        Initialize the ResidentScheduler.
+
+        Args:
+            settings_manager: Source of the scheduled-scan settings
+            run_scan: Blocking callable that performs one scheduled scan
+            cancel_scan: Optional callable that stops a running scan
+            scheduler: ScanScheduler to queue runs with (defaults to the
+                shared one)
+            lock_path: Lock file marking the resident scheduler as active
+                (defaults to default_lock_path())
+            reload_settings: Re-read the settings file before every check.
+                Use this in processes where the app cannot change the
+                settings directly (the standalone service).
+            clock: Returns the current local time (for tests)
+        """
+        self._settings_manager = settings_manager
+        self._run_scan = run_scan
+        self._cancel_scan = cancel_scan
+        self._scheduler = scheduler if scheduler is not None else get_scan_scheduler()
+        self._lock_path = lock_path or default_lock_path()
+        self._reload_settings = reload_settings
+        self._clock = clock
+
+        self._lock_file = None
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._schedule_key: tuple | None = None
+        self._next_run: datetime | None = None
+        self._job: ScanJob | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the timer thread is active."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def next_run(self) -> datetime | None:
+        """Time of the next scheduled run, or None when schedules are disabled."""
+        return self._next_run
+
+    def start(self) -> bool:
+        """
+        Take the resident lock and start the timer thread.
+
+        Returns:
+            True if started, False if another process already runs the
+            schedule or the lock file cannot be created
+        """
+        if self.is_running:
+            return True
+        if not self._acquire_lock():
+            return False
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._loop, name="clamui-resident-scheduler", daemon=True
+        )
+        self._thread.start()
+        logger.info("Resident scheduler started")
+        return True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the timer, cancel a pending run and release the lock."""
+        self._stop_event.set()
+        self._wake_event.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self._thread = None
+
+        job = self._job
+        if job is not None and job.state in (JobState.QUEUED, JobState.RUNNING):
+            self._scheduler.cancel(job.job_id)
+        self._release_lock()
+        logger.info("Resident scheduler stopped")
+
+    def wake(self) -> None:
+        """Re-check the schedule now, for example after its settings changed."""
+        self._wake_event.set()
+
+    def _acquire_lock(self) -> bool:
+        try:
+            self._lock_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            lock_file = open(self._lock_path, "a")  # noqa: SIM115 - held while active
+        except OSError:
+            logger.warning("Cannot create resident scheduler lock %s", self._lock_path)
+            return False
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            logger.info("Scheduled scans are already handled by another ClamUI process")
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _release_lock(self) -> None:
+        lock_file = self._lock_file
+        self._lock_file = None
+        if lock_file is not None:
+            with contextlib.suppress(OSError):
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+
+    def _loop(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                delay = self._tick()
+            except Exception:
+                logger.exception("Resident scheduler check failed")
+                delay = MAX_SLEEP_SECONDS
+            self._wake_event.wait(delay)
+            self._wake_event.clear()
+
+    def _tick(self) -> float:
+        """Run a due scan if needed; return the seconds until the next check."""
+        if self._reload_settings:
+            reload = getattr(self._settings_manager, "reload", None)
+            if reload is not None:
+                reload()
+
+        settings = settings_view(self._settings_manager)
+        now = self._clock()
+        key = tuple(settings.get(name) for name in SCHEDULE_SETTING_KEYS)
+        if key != self._schedule_key:
+            self._schedule_key = key
+            self._next_run = self._compute_next_run(settings, now)
+            if self._next_run is not None:
+                logger.info("Next resident scheduled scan at %s", self._next_run.isoformat())
+
+        if self._next_run is None:
+            return MAX_SLEEP_SECONDS
+
+        if now >= self._next_run:
+            self._submit_run()
+            self._next_run = self._compute_next_run(settings, now)
+
+        remaining = (self._next_run - now).total_seconds()
+        return max(1.0, min(MAX_SLEEP_SECONDS, remaining))
+
+    @staticmethod
+    def _compute_next_run(settings, now: datetime) -> datetime | None:
+        if not settings.get("scheduled_scans_enabled", False):
+            return None
+        return next_run_after(
+            now,
+            settings.get("schedule_frequency", "weekly"),
+            settings.get("schedule_time", "02:00"),
+            settings.get("schedule_day_of_week", 0),
+            settings.get("schedule_day_of_month", 1),
+        )
+
+    def _submit_run(self) -> None:
+        job = self._job
+        if job is not None and job.state in (JobState.QUEUED, JobState.RUNNING):
+            logger.info("Skipping scheduled scan; the previous run is still active")
+            return
+        self._job = self._scheduler.submit(
+            ScanJob(
+                label=_("Scheduled scan"),
+                priority=JobPriority.BACKGROUND,
+                run=self._run_scan,
+                cancel=self._cancel_scan,
+            )
+        )
+        logger.info("Resident scheduler queued a scheduled scan")
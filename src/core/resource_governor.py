@@ -0,0 +1,470 @@
+# ClamUI Resource Governor Module
+"""
+CPU, I/O and memory controls for scan processes.
+
+By default a scan runs with the same priority as the desktop session. A
+clamscan run then competes with the IDE, the browser and the compiler. A
+scheduled scan of a home directory can make a developer workstation feel
+sluggish for the length of the run. ResourcePolicy describes how much a
+scan may take:
+
+- Priority presets lower the CPU nice value and the I/O class of the
+  scanner process (nice/ionice, which sets ioprio on exec).
+- Optional ceilings run the scanner in a transient systemd user scope with
+  CPUQuota, IOWeight and MemoryMax. They are used only when
+  ``systemd-run --user`` works on this system.
+- Under the "low" and "idle" presets, ResourceGovernor pauses the file walk
+  (counting and file-list collection) while system load or pressure stall
+  information (/proc/pressure/*) is above the configured thresholds. Under
+  "idle" it also stops a running clamscan process until pressure drops.
+
+Scans started by the user use the interactive priority ("normal" by
+default). Scheduled scans and device auto-scans use the background
+priority ("low" by default). A scan profile can override either with its
+``priority`` option, plus the ``cpu_quota_percent``, ``io_weight``,
+``memory_max_mb`` and ``systemd_scope`` options.
+
+With the clamd backend the scanning happens inside clamd. The process
+controls then only affect the clamdscan client and ClamUI's own file walk.
+"""
+
+import contextlib
+import logging
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .flatpak import is_flatpak, which_host_command, wrap_host_command
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+PRIORITY_IDLE = "idle"
+PRIORITY_LEVELS = (PRIORITY_NORMAL, PRIORITY_LOW, PRIORITY_IDLE)
+
+IO_CLASS_BEST_EFFORT = "best-effort"
+IO_CLASS_IDLE = "idle"
+
+PRESSURE_DIR = Path("/proc/pressure")
+PRESSURE_RESOURCES = ("cpu", "io", "memory")
+
+# Profile option keys that override the global resource settings
+PROFILE_RESOURCE_OPTIONS = (
+    "priority",
+    "systemd_scope",
+    "cpu_quota_percent",
+    "io_weight",
+    "memory_max_mb",
+)
+
+# How often the walker re-reads pressure, and how long it waits at most
+# before it continues regardless. After such a forced resume the scan runs
+# for at least MIN_RUN_SECONDS before it can be paused again, so a busy
+# system still finishes scans (the scanner's own I/O stalls count toward PSI)
+CHECK_INTERVAL_SECONDS = 1.0
+POLL_INTERVAL_SECONDS = 2.0
+MAX_WAIT_SECONDS = 120.0
+MIN_RUN_SECONDS = MAX_WAIT_SECONDS
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """
+    Resource limits for one scan.
+
+    Attributes:
+        nice: CPU nice value for the scanner process (0 = unchanged)
+        io_class: ionice class ("best-effort" or "idle"), or None to leave
+            the I/O priority alone
+        io_level: Priority within the best-effort class (0 highest, 7 lowest)
+        systemd_scope: Run the scanner in a transient systemd user scope
+        cpu_quota_percent: CPUQuota of the scope (0 = unlimited; 100 = one CPU)
+        io_weight: IOWeight of the scope (0 = systemd default of 100)
+        memory_max_mb: MemoryMax of the scope (0 = unlimited)
+        pressure_threshold: Pause the walk while the "some avg10" pressure
+            of CPU, I/O or memory is above this percentage (0 = off)
+        load_threshold: Pause the walk while the 1-minute load average per
+            CPU is above this value (0 = off)
+        pause_process: Also stop a running clamscan process under pressure
+    """
+
+    nice: int = 0
+    io_class: str | None = None
+    io_level: int = 4
+    systemd_scope: bool = False
+    cpu_quota_percent: int = 0
+    io_weight: int = 0
+    memory_max_mb: int = 0
+    pressure_threshold: float = 0.0
+    load_threshold: float = 0.0
+    pause_process: bool = False
+
+    @property
+    def has_scope_limits(self) -> bool:
+        """Whether any systemd scope property is set."""
+        return self.cpu_quota_percent > 0 or self.io_weight > 0 or self.memory_max_mb > 0
+
+    @property
+    def throttles(self) -> bool:
+        """Whether the walk waits for system pressure to drop."""
+        return self.pressure_threshold > 0 or self.load_threshold > 0
+
+
+# (nice, io_class, io_level, throttles, pause_process) per priority preset
+_PRESETS: dict[str, tuple[int, str | None, int, bool, bool]] = {
+    PRIORITY_NORMAL: (0, None, 4, False, False),
+    PRIORITY_LOW: (10, IO_CLASS_BEST_EFFORT, 7, True, False),
+    PRIORITY_IDLE: (19, IO_CLASS_IDLE, 7, True, True),
+}
+
+
+def _number(value, default: float) -> float:
+    """Return ``value`` if it is a non-negative number, else ``default``."""
+    if isinstance(value, bool) or not isinstance(value, int | float) or value < 0:
+        return default
+    return value
+
+
+def resolve_policy(
+    settings,
+    background: bool = False,
+    profile_options: dict | None = None,
+) -> ResourcePolicy:
+    """
+    Build the resource policy for a scan from settings and profile options.
+
+    Args:
+        settings: SettingsManager or settings snapshot (may be None)
+        background: True for scheduled scans and device auto-scans
+        profile_options: ScanProfile.options of the profile used, if any
+
+    Returns:
+        ResourcePolicy for the scan
+    """
+
+    def setting(key: str, default):
+        return settings.get(key, default) if settings is not None else default
+
+    options = profile_options if isinstance(profile_options, dict) else {}
+
+    priority_key = "scan_priority_background" if background else "scan_priority_interactive"
+    default_priority = PRIORITY_LOW if background else PRIORITY_NORMAL
+    priority = options.get("priority", setting(priority_key, default_priority))
+    if priority not in PRIORITY_LEVELS:
+        priority = setting(priority_key, default_priority)
+        if priority not in PRIORITY_LEVELS:
+            priority = default_priority
+    nice, io_class, io_level, throttles, pause_process = _PRESETS[priority]
+
+    def limit(option: str, key: str) -> int:
+        value = _number(setting(key, 0), 0)
+        return int(_number(options.get(option), value))
+
+    scope = options.get("systemd_scope", setting("scan_systemd_scope", False))
+    pressure = _number(setting("scan_pressure_threshold", 20.0), 20.0)
+    load = _number(setting("scan_load_threshold", 1.5), 1.5)
+
+    return ResourcePolicy(
+        nice=nice,
+        io_class=io_class,
+        io_level=io_level,
+        systemd_scope=scope is True,
+        cpu_quota_percent=limit("cpu_quota_percent", "scan_cpu_quota_percent"),
+        io_weight=min(10000, limit("io_weight", "scan_io_weight")),
+        memory_max_mb=limit("memory_max_mb", "scan_memory_max_mb"),
+        pressure_threshold=float(pressure) if throttles else 0.0,
+        load_threshold=float(load) if throttles else 0.0,
+        pause_process=pause_process,
+    )
+
+
+_tool_cache: dict[str, str | None] = {}
+_scope_available: bool | None = None
+_cache_lock = threading.Lock()
+
+
+def _find_tool(name: str) -> str | None:
+    """Locate a helper binary on the host, caching the result per process."""
+    with _cache_lock:
+        if name in _tool_cache:
+            return _tool_cache[name]
+    path = which_host_command(name)
+    with _cache_lock:
+        _tool_cache[name] = path
+    return path
+
+
+def systemd_scope_available() -> bool:
+    """
+    Check once per process whether transient user scopes can be created.
+
+    systemd-run exits with status 1 when it cannot reach the user manager,
+    which clamscan would report as "virus found", so scopes are only used
+    after a successful trial run.
+    """
+    global _scope_available
+    with _cache_lock:
+        if _scope_available is not None:
+            return _scope_available
+    available = False
+    if _find_tool("systemd-run") is not None:
+        try:
+            result = subprocess.run(
+                wrap_host_command(["systemd-run", "--user", "--scope", "--quiet", "--", "true"]),
+                capture_output=True,
+                timeout=10,
+            )
+            available = result.returncode == 0
+        except (OSError, subprocess.SubprocessError):
+            logger.debug("systemd-run trial failed", exc_info=True)
+    if not available:
+        logger.info("systemd user scopes unavailable; scan resource ceilings are not applied")
+    with _cache_lock:
+        _scope_available = available
+    return available
+
+
+def governed_command(command: list[str], policy: ResourcePolicy | None) -> list[str]:
+    """
+    Prefix a scanner command with the policy's process controls.
+
+    Apply this before wrap_host_command(): in Flatpak the prefix tools then
+    run on the host together with the scanner. Missing tools are skipped.
+
+    Args:
+        command: Scanner command line
+        policy: Resource policy, or None for no controls
+
+    Returns:
+        Command line with systemd-run, nice and ionice prefixes as needed
+    """
+    if policy is None:
+        return list(command)
+
+    prefix: list[str] = []
+    if policy.systemd_scope and policy.has_scope_limits and systemd_scope_available():
+        prefix.extend(["systemd-run", "--user", "--scope", "--quiet", "--collect"])
+        if policy.cpu_quota_percent > 0:
+            prefix.extend(["-p", f"CPUQuota={policy.cpu_quota_percent}%"])
+        if policy.io_weight > 0:
+            prefix.extend(["-p", f"IOWeight={policy.io_weight}"])
+        if policy.memory_max_mb > 0:
+            prefix.extend(["-p", f"MemoryMax={policy.memory_max_mb}M"])
+        prefix.append("--")
+    if policy.nice > 0 and _find_tool("nice") is not None:
+        prefix.extend(["nice", "-n", str(policy.nice)])
+    if policy.io_class is not None and _find_tool("ionice") is not None:
+        if policy.io_class == IO_CLASS_IDLE:
+            prefix.extend(["ionice", "-c", "3"])
+        else:
+            prefix.extend(["ionice", "-c", "2", "-n", str(policy.io_level)])
+    return prefix + list(command)
+
+
+def read_pressure(resource: str, pressure_dir: Path = PRESSURE_DIR) -> float | None:
+    """
+    Read the "some avg10" stall percentage of a resource.
+
+    Args:
+        resource: "cpu", "io" or "memory"
+        pressure_dir: Directory with the PSI files
+
+    Returns:
+        Percentage of the last 10 seconds in which some task stalled, or
+        None if PSI is not available (kernel < 4.20 or psi=0)
+    """
+    try:
+        with open(pressure_dir / resource) as psi_file:
+            for line in psi_file:
+                if line.startswith("some "):
+                    for field in line.split()[1:]:
+                        key, _sep, value = field.partition("=")
+                        if key == "avg10":
+                            return float(value)
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def system_pressure(pressure_dir: Path = PRESSURE_DIR) -> float | None:
+    """Return the highest CPU, I/O or memory "some avg10" pressure, if known."""
+    values = [read_pressure(resource, pressure_dir) for resource in PRESSURE_RESOURCES]
+    known = [value for value in values if value is not None]
+    return max(known) if known else None
+
+
+def load_per_cpu() -> float | None:
+    """Return the 1-minute load average divided by the number of CPUs."""
+    try:
+        load = os.getloadavg()[0]
+    except OSError:
+        return None
+    return load / (os.cpu_count() or 1)
+
+
+class ResourceGovernor:
+    """
+    Applies a ResourcePolicy's throttling while a scan runs.
+
+    The file walkers call wait_for_headroom() once per directory. It reads
+    the pressure at most once per second, so the walk itself stays cheap.
+    pause_under_pressure() watches a running clamscan process.
+    """
+
+    def __init__(
+        self,
+        policy: ResourcePolicy,
+        pressure_reader: Callable[[], float | None] = system_pressure,
+        load_reader: Callable[[], float | None] = load_per_cpu,
+        sleep: Callable[[float], object] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the governor.
+
+        Args:
+            policy: Policy with the thresholds
+            pressure_reader: Returns the current pressure percentage
+            load_reader: Returns the current load per CPU
+            sleep: Sleep function (for tests)
+            clock: Monotonic clock (for tests)
+        """
+        self._policy = policy
+        self._pressure_reader = pressure_reader
+        self._load_reader = load_reader
+        self._sleep = sleep
+        self._clock = clock
+        self._next_check = 0.0
+
+    @property
+    def policy(self) -> ResourcePolicy:
+        """The policy being applied."""
+        return self._policy
+
+    def is_pressured(self) -> bool:
+        """Whether load or pressure is above the policy's thresholds."""
+        policy = self._policy
+        if policy.pressure_threshold > 0:
+            pressure = self._pressure_reader()
+            if pressure is not None and pressure > policy.pressure_threshold:
+                return True
+        if policy.load_threshold > 0:
+            load = self._load_reader()
+            if load is not None and load > policy.load_threshold:
+                return True
+        return False
+
+    def wait_for_headroom(self, should_stop: Callable[[], bool] | None = None) -> float:
+        """
+        Block while the system is under pressure.
+
+        Returns early when ``should_stop`` returns True, and after
+        MAX_WAIT_SECONDS. A wait that hits the cap is followed by at least
+        MIN_RUN_SECONDS without waits, so scans still finish on a busy system.
+
+        Args:
+            should_stop: Polled between checks; True ends the wait
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self._policy.throttles:
+            return 0.0
+        now = self._clock()
+        if now < self._next_check:
+            return 0.0
+        self._next_check = now + CHECK_INTERVAL_SECONDS
+
+        started = now
+        next_interval = CHECK_INTERVAL_SECONDS
+        while self.is_pressured():
+            if should_stop is not None and should_stop():
+                break
+            if self._clock() - started >= MAX_WAIT_SECONDS:
+                logger.debug("System still under pressure; continuing the scan")
+                next_interval = MIN_RUN_SECONDS
+                break
+            self._sleep(POLL_INTERVAL_SECONDS)
+        waited = self._clock() - started
+        if waited > 0:
+            logger.debug("Scan walk paused %.1fs for system pressure", waited)
+        self._next_check = self._clock() + next_interval
+        return waited
+
+    @contextlib.contextmanager
+    def pause_under_pressure(
+        self,
+        process: subprocess.Popen,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> Iterator[None]:
+        """
+        Stop ``process`` with SIGSTOP while the system is under pressure.
+
+        The process is resumed when pressure drops, after MAX_WAIT_SECONDS,
+        when ``should_stop`` returns True (so it can be terminated) and when
+        the block exits. After a resume forced by MAX_WAIT_SECONDS it runs
+        for at least MIN_RUN_SECONDS before it can be stopped again. Does
+        nothing unless the policy pauses processes, or inside Flatpak, where
+        ``process`` is flatpak-spawn rather than the scanner.
+
+        Args:
+            process: Running scanner process
+            should_stop: Polled regularly; True resumes the process
+        """
+        if not (self._policy.pause_process and self._policy.throttles) or is_flatpak():
+            yield
+            return
+
+        done = threading.Event()
+        thread = threading.Thread(
+            target=self._watch_process,
+            args=(process, should_stop, done),
+            name="clamui-scan-governor",
+            daemon=True,
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join(POLL_INTERVAL_SECONDS * 2)
+
+    def _watch_process(
+        self,
+        process: subprocess.Popen,
+        should_stop: Callable[[], bool] | None,
+        done: threading.Event,
+    ) -> None:
+        paused_at: float | None = None
+        run_until = 0.0
+        try:
+            while not done.wait(POLL_INTERVAL_SECONDS) and process.poll() is None:
+                stopping = should_stop is not None and should_stop()
+                if paused_at is None:
+                    if stopping or self._clock() < run_until:
+                        continue
+                    if self.is_pressured():
+                        process.send_signal(signal.SIGSTOP)
+                        paused_at = self._clock()
+                        logger.debug("Paused scanner process %d for system pressure", process.pid)
+                else:
+                    now = self._clock()
+                    forced = now - paused_at >= MAX_WAIT_SECONDS
+                    if stopping or forced or not self.is_pressured():
+                        process.send_signal(signal.SIGCONT)
+                        paused_at = None
+                        if forced:
+                            run_until = now + MIN_RUN_SECONDS
+                        logger.debug("Resumed scanner process %d", process.pid)
+        except (OSError, ProcessLookupError):
+            logger.debug("Scanner process governor stopped", exc_info=True)
+        finally:
+            if paused_at is not None:
+                with contextlib.suppress(OSError, ProcessLookupError):
+                    process.send_signal(signal.SIGCONT)
@@ -0,0 +1,308 @@
+# ClamUI Scan Scheduler Module
+"""
+Shared job scheduler for background and interactive scans.
+
+Device auto-scans, and scans the user starts from the scan view (including
+tray quick scans and file-manager requests), all register with one
+ScanScheduler so that they share a single concurrency budget:
+
+- User-initiated jobs start immediately and count against the limit.
+- Background jobs wait in a priority queue, smallest device first.
+- When a job finishes, the next queued job is dispatched right away.
+
+The limit comes from concurrency_limit(): clamdscan jobs are thin clients
+of one shared daemon and can run several at a time, while every clamscan
+job loads its own copy of the signature database.
+"""
+
+import contextlib
+import itertools
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from enum import Enum, IntEnum
+
+logger = logging.getLogger(__name__)
+
+_job_ids = itertools.count(1)
+
+
+class JobPriority(IntEnum):
+    """Queue priority; lower values run first."""
+
+    USER = 0  # Started by the user; never waits
+    BACKGROUND = 10  # Device auto-scans and other unattended work
+
+
+class JobState(Enum):
+    """Lifecycle of a scan job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    FINISHED = "finished"
+    CANCELLED = "cancelled"
+
+
+@dataclass(eq=False)
+class ScanJob:
+    """
+    One unit of scan work.
+
+    Attributes:
+        label: Human-readable name (device name or path) for logs and the UI
+        priority: Queue priority
+        run: Blocking callable executed on a scheduler thread
+        cancel: Optional callable that stops ``run`` once it has started
+        size_bytes: Size of the target if known (0 = unknown); smaller
+            background jobs run first
+    """
+
+    label: str
+    priority: JobPriority = JobPriority.BACKGROUND
+    run: Callable[[], None] | None = None
+    cancel: Callable[[], None] | None = None
+    size_bytes: int = 0
+    job_id: int = field(default_factory=lambda: next(_job_ids))
+    state: JobState = JobState.QUEUED
+    submitted_at: float = field(default_factory=time.monotonic)
+
+    def sort_key(self) -> tuple[int, float, int]:
+        """Queue order: priority, then size (unknown sizes last), then age."""
+        size = self.size_bytes if self.size_bytes > 0 else float("inf")
+        return (int(self.priority), size, self.job_id)
+
+
+@dataclass(frozen=True)
+class QueueState:
+    """Point-in-time view of the scheduler for display."""
+
+    running: tuple[ScanJob, ...] = ()
+    queued: tuple[ScanJob, ...] = ()
+    limit: int = 1
+
+    @property
+    def background_running(self) -> int:
+        """Number of running background jobs."""
+        return sum(1 for job in self.running if job.priority != JobPriority.USER)
+
+
+def concurrency_limit(backend: str, cpu_count: int | None = None) -> int:
+    """
+    Return how many scans may run at once for a backend.
+
+    Args:
+        backend: Active backend, "daemon" or "clamscan" (anything else is
+            treated like clamscan)
+        cpu_count: Number of CPUs (defaults to os.cpu_count())
+
+    Returns:
+        Maximum number of concurrent scan jobs (at least 1)
+    """
+    cpus = cpu_count if cpu_count is not None else (os.cpu_count() or 1)
+    if backend == "daemon":
+        # clamd does the work on its own thread pool; more clients only queue there
+        return max(2, min(4, cpus // 2))
+    # Each clamscan process loads the full signature database (~1 GB RAM)
+    return 2 if cpus >= 8 else 1
+
+
+class ScanScheduler:
+    """
+    Priority queue with a concurrency limit for scan jobs.
+
+    Jobs submitted with submit() run on their own daemon thread once a slot
+    is free. Callers that already run on a worker thread use
+    run_interactive() to occupy a user slot for the duration of their scan.
+    Listeners are called with a QueueState after every change, from
+    whichever thread made it.
+    """
+
+    def __init__(self, limit_provider: Callable[[], int] | None = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            limit_provider: Returns the current concurrency limit; evaluated
+                on every dispatch. Defaults to the clamscan limit.
+        """
+        self._limit_provider = limit_provider or (lambda: concurrency_limit("clamscan"))
+        self._lock = threading.Lock()
+        self._queued: list[ScanJob] = []
+        self._running: dict[int, ScanJob] = {}
+        self._listeners: list[Callable[[QueueState], None]] = []
+        self._current_limit = 1
+
+    def set_limit_provider(self, limit_provider: Callable[[], int]) -> None:
+        """Replace the concurrency limit source and dispatch under the new limit."""
+        with self._lock:
+            self._limit_provider = limit_provider
+        self._dispatch()
+
+    def submit(self, job: ScanJob) -> ScanJob:
+        """
+        Queue a job; it starts as soon as a slot is free.
+
+        Args:
+            job: Job with a ``run`` callable
+
+        Returns:
+            The same job, for cancel() and state inspection
+
+        Raises:
+            ValueError: If the job has nothing to run
+        """
+        if job.run is None:
+            raise ValueError("ScanJob.run is required for submitted jobs")
+        with self._lock:
+            job.state = JobState.QUEUED
+            self._queued.append(job)
+        logger.debug("Queued scan job %d (%s)", job.job_id, job.label)
+        self._dispatch()
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Remove a queued job, or ask a running one to stop.
+
+        Args:
+            job_id: ScanJob.job_id of the job
+
+        Returns:
+            True if the job was found
+        """
+        with self._lock:
+            queued = next((job for job in self._queued if job.job_id == job_id), None)
+            if queued is not None:
+                self._queued.remove(queued)
+                queued.state = JobState.CANCELLED
+            running = self._running.get(job_id)
+            if running is not None:
+                running.state = JobState.CANCELLED
+
+        if queued is not None:
+            self._notify()
+            return True
+        if running is None:
+            return False
+        if running.cancel is not None:
+            running.cancel()
+        return True
+
+    @contextlib.contextmanager
+    def run_interactive(
+        self, label: str, cancel: Callable[[], None] | None = None
+    ) -> Iterator[ScanJob]:
+        """
+        Occupy a user slot while the caller scans on its own thread.
+
+        The job starts immediately, regardless of the limit, and holds back
+        queued background jobs until the block exits.
+
+        Args:
+            label: Name shown for the job
+            cancel: Optional callable that stops the caller's scan
+
+        Yields:
+            The running ScanJob
+        """
+        job = ScanJob(label=label, priority=JobPriority.USER, cancel=cancel)
+        with self._lock:
+            job.state = JobState.RUNNING
+            self._running[job.job_id] = job
+        self._notify()
+        try:
+            yield job
+        finally:
+            self._finish(job)
+
+    def state(self) -> QueueState:
+        """Return the current running and queued jobs."""
+        with self._lock:
+            return self._state_locked()
+
+    def add_listener(self, callback: Callable[[QueueState], None]) -> None:
+        """Register a callback for queue changes."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[QueueState], None]) -> None:
+        """Remove a callback registered with add_listener()."""
+        with self._lock:
+            self._listeners = [listener for listener in self._listeners if listener != callback]
+
+    def _state_locked(self) -> QueueState:
+        return QueueState(
+            running=tuple(self._running.values()),
+            queued=tuple(sorted(self._queued, key=ScanJob.sort_key)),
+            limit=self._current_limit,
+        )
+
+    def _dispatch(self) -> None:
+        """Start queued jobs while slots are free."""
+        try:
+            limit = max(1, int(self._limit_provider()))
+        except Exception:
+            logger.debug("Scan concurrency limit unavailable, using 1", exc_info=True)
+            limit = 1
+
+        started: list[ScanJob] = []
+        with self._lock:
+            self._current_limit = limit
+            self._queued.sort(key=ScanJob.sort_key)
+            while self._queued and (
+                len(self._running) < limit or self._queued[0].priority == JobPriority.USER
+            ):
+                job = self._queued.pop(0)
+                job.state = JobState.RUNNING
+                self._running[job.job_id] = job
+                started.append(job)
+
+        for job in started:
+            logger.debug("Starting scan job %d (%s)", job.job_id, job.label)
+            thread = threading.Thread(
+                target=self._run_job, args=(job,), name=f"scan-job-{job.job_id}", daemon=True
+            )
+            thread.start()
+        self._notify()
+
+    def _run_job(self, job: ScanJob) -> None:
+        try:
+            if job.state is JobState.RUNNING:
+                job.run()
+        except Exception:
+            logger.exception("Scan job %d (%s) failed", job.job_id, job.label)
+        finally:
+            self._finish(job)
+
+    def _finish(self, job: ScanJob) -> None:
+        with self._lock:
+            self._running.pop(job.job_id, None)
+            if job.state is JobState.RUNNING:
+                job.state = JobState.FINISHED
+        self._dispatch()
+
+    def _notify(self) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+            state = self._state_locked()
+        for listener in listeners:
+            try:
+                listener(state)
+            except Exception:
+                logger.exception("Scan queue listener failed")
+
+
+_scheduler: ScanScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scan_scheduler() -> ScanScheduler:
+    """Return the process-wide ScanScheduler."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ScanScheduler()
+        return _scheduler
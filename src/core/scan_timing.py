@@ -0,0 +1,334 @@
+# ClamUI Scan Timing Module
+"""
+Per-phase timing for scan operations.
+
+A scan's single duration hides where the time went. ScanTimer records the
+sequential phases of Scanner.scan_sync() and DaemonScanner.scan_sync()
+(path validation, backend probe, target counting, file-list writing, the
+ClamAV run itself, output parsing, exclusion filtering and log persistence)
+together with stall periods: stretches of a streaming scan in which the
+scanner produced no output for STALL_THRESHOLD seconds.
+
+The resulting ScanTiming is attached to ScanResult.timing, persisted with
+the scan's log entry, and can be exported as Chrome trace JSON
+(chrome://tracing, Perfetto) for a closer look.
+"""
+
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+# Phase names, in the order a scan runs through them
+PHASE_VALIDATE = "validate"
+PHASE_PROBE = "probe"
+PHASE_COUNT = "count"
+PHASE_FILE_LIST = "file_list"
+PHASE_SCAN = "scan"
+PHASE_PARSE = "parse"
+PHASE_FILTER = "filter"
+PHASE_LOG = "log"
+
+# Seconds without scanner output before a streaming scan counts as stalled
+STALL_THRESHOLD = 5.0
+
+# "Data scanned: 12.34 MB" (ClamAV < 1.0) or "Data scanned: 12.34 MiB"
+_DATA_SCANNED_RE = re.compile(r"^Data scanned:\s*([\d.]+)\s*([KMGT]?i?B)\s*$", re.MULTILINE)
+_UNIT_SCALE = {"B": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_data_scanned(stdout: str) -> int | None:
+    """
+    Extract the byte count from clamscan's "Data scanned" summary line.
+
+    clamdscan does not report it, so daemon scans return None.
+
+    Args:
+        stdout: Scanner output
+
+    Returns:
+        Bytes scanned, or None if the summary line is missing
+    """
+    if not stdout:
+        return None
+    match = _DATA_SCANNED_RE.search(stdout)
+    if match is None:
+        return None
+    try:
+        value = float(match.group(1))
+    except ValueError:
+        return None
+    return int(value * _UNIT_SCALE[match.group(2)[0]])
+
+
+@dataclass
+class PhaseTiming:
+    """One phase of a scan; times are seconds since the scan started."""
+
+    name: str
+    start: float
+    duration: float
+
+
+@dataclass
+class StallPeriod:
+    """A stretch of a streaming scan without scanner output."""
+
+    start: float
+    duration: float
+
+
+@dataclass
+class ScanTiming:
+    """Where the time of one scan went."""
+
+    total_seconds: float
+    phases: list[PhaseTiming] = field(default_factory=list)
+    stalls: list[StallPeriod] = field(default_factory=list)
+    files_scanned: int = 0
+    bytes_scanned: int | None = None
+
+    def phase_seconds(self, name: str) -> float:
+        """Total time spent in the named phase (0.0 if it did not run)."""
+        return sum(phase.duration for phase in self.phases if phase.name == name)
+
+    @property
+    def files_per_second(self) -> float | None:
+        """Files scanned per second of the ClamAV run, if it ran."""
+        seconds = self.phase_seconds(PHASE_SCAN)
+        if seconds <= 0 or self.files_scanned <= 0:
+            return None
+        return self.files_scanned / seconds
+
+    @property
+    def bytes_per_second(self) -> float | None:
+        """Bytes scanned per second of the ClamAV run, if known."""
+        seconds = self.phase_seconds(PHASE_SCAN)
+        if seconds <= 0 or not self.bytes_scanned:
+            return None
+        return self.bytes_scanned / seconds
+
+    @property
+    def stalled_seconds(self) -> float:
+        """Total time spent in stall periods."""
+        return sum(stall.duration for stall in self.stalls)
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        files_per_second = self.files_per_second
+        bytes_per_second = self.bytes_per_second
+        return {
+            "total_seconds": round(self.total_seconds, 4),
+            "phases": [
+                {
+                    "name": phase.name,
+                    "start": round(phase.start, 4),
+                    "duration": round(phase.duration, 4),
+                }
+                for phase in self.phases
+            ],
+            "stalls": [
+                {"start": round(stall.start, 4), "duration": round(stall.duration, 4)}
+                for stall in self.stalls
+            ],
+            "files_scanned": self.files_scanned,
+            "bytes_scanned": self.bytes_scanned,
+            "files_per_second": (
+                round(files_per_second, 1) if files_per_second is not None else None
+            ),
+            "bytes_per_second": (
+                round(bytes_per_second, 1) if bytes_per_second is not None else None
+            ),
+        }
+
+    @classmethod
+    def from_dict(cls, data) -> "ScanTiming | None":
+        """
+        Create a ScanTiming from to_dict() output.
+
+        Stored logs may be corrupt or tampered with, so anything that does
+        not look like timing data yields None instead of raising.
+        """
+        if not isinstance(data, dict):
+            return None
+        try:
+            total = float(data.get("total_seconds", 0.0))
+            phases = [
+                PhaseTiming(str(item["name"]), float(item["start"]), float(item["duration"]))
+                for item in data.get("phases") or []
+            ]
+            stalls = [
+                StallPeriod(float(item["start"]), float(item["duration"]))
+                for item in data.get("stalls") or []
+            ]
+            files = int(data.get("files_scanned") or 0)
+            raw_bytes = data.get("bytes_scanned")
+            bytes_scanned = int(raw_bytes) if raw_bytes is not None else None
+        except (TypeError, ValueError, KeyError):
+            return None
+        return cls(
+            total_seconds=total,
+            phases=phases,
+            stalls=stalls,
+            files_scanned=files,
+            bytes_scanned=bytes_scanned,
+        )
+
+    def to_chrome_trace(self, label: str = "scan", pid: int = 1) -> list[dict]:
+        """
+        Return Chrome trace events for this scan.
+
+        Phases go on thread 1 and stalls on thread 2 of process ``pid``, so
+        several scans can share one trace file (see build_chrome_trace()).
+
+        Args:
+            label: Process name shown in the trace viewer
+            pid: Process id to file the events under
+
+        Returns:
+            List of trace event dictionaries
+        """
+        events: list[dict] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 1, "args": {"name": "phases"}},
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": 2, "args": {"name": "stalls"}},
+        ]
+        for phase in self.phases:
+            events.append(
+                {
+                    "name": phase.name,
+                    "cat": "phase",
+                    "ph": "X",
+                    "ts": round(phase.start * 1_000_000),
+                    "dur": round(phase.duration * 1_000_000),
+                    "pid": pid,
+                    "tid": 1,
+                }
+            )
+        for stall in self.stalls:
+            events.append(
+                {
+                    "name": "stall",
+                    "cat": "stall",
+                    "ph": "X",
+                    "ts": round(stall.start * 1_000_000),
+                    "dur": round(stall.duration * 1_000_000),
+                    "pid": pid,
+                    "tid": 2,
+                }
+            )
+        return events
+
+
+def build_chrome_trace(timings: list[tuple[str, ScanTiming]]) -> dict:
+    """
+    Build a Chrome trace document from labelled scan timings.
+
+    Args:
+        timings: (label, timing) pairs, one trace process each
+
+    Returns:
+        Trace document ready for json.dump()
+    """
+    events: list[dict] = []
+    for pid, (label, timing) in enumerate(timings, start=1):
+        events.extend(timing.to_chrome_trace(label, pid))
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+class ScanTimer:
+    """
+    Records the sequential phases of one scan.
+
+    Each begin() ends the running phase and starts the next one; snapshot()
+    returns a ScanTiming of everything recorded so far. Phases started with
+    ``watch_output=True`` also track stalls, fed by output_received().
+
+    Not thread-safe; a timer belongs to the thread running the scan.
+    """
+
+    def __init__(
+        self,
+        stall_threshold: float = STALL_THRESHOLD,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._stall_threshold = stall_threshold
+        self._clock = clock
+        self._origin = clock()
+        self._phases: list[PhaseTiming] = []
+        self._stalls: list[StallPeriod] = []
+        self._current: str | None = None
+        self._current_start = 0.0
+        self._last_output: float | None = None
+
+    def elapsed(self) -> float:
+        """Seconds since the timer was created."""
+        return self._clock() - self._origin
+
+    def begin(self, name: str, watch_output: bool = False) -> None:
+        """
+        End the running phase (if any) and start the named one.
+
+        Args:
+            name: Phase name, normally one of the PHASE_* constants
+            watch_output: Track stall periods until the phase ends
+        """
+        now = self.elapsed()
+        self._end(now)
+        self._current = name
+        self._current_start = now
+        self._last_output = now if watch_output else None
+
+    def output_received(self) -> None:
+        """Note scanner output, closing a stall if one was in progress."""
+        if self._last_output is None:
+            return
+        now = self.elapsed()
+        self._close_gap(now)
+        self._last_output = now
+
+    def observe(self, callback: Callable) -> Callable:
+        """Wrap a progress callback so each call counts as scanner output."""
+
+        def observed(*args, **kwargs):
+            self.output_received()
+            return callback(*args, **kwargs)
+
+        return observed
+
+    def snapshot(self, files_scanned: int = 0, bytes_scanned: int | None = None) -> ScanTiming:
+        """
+        End the running phase and return everything recorded so far.
+
+        Args:
+            files_scanned: Files the scan covered, for throughput
+            bytes_scanned: Bytes the scan covered, if known
+
+        Returns:
+            ScanTiming with copies of the recorded phases and stalls
+        """
+        now = self.elapsed()
+        self._end(now)
+        self._current = None
+        return ScanTiming(
+            total_seconds=now,
+            phases=list(self._phases),
+            stalls=list(self._stalls),
+            files_scanned=files_scanned,
+            bytes_scanned=bytes_scanned,
+        )
+
+    def _end(self, now: float) -> None:
+        if self._current is None:
+            return
+        if self._last_output is not None:
+            self._close_gap(now)
+            self._last_output = None
+        self._phases.append(
+            PhaseTiming(self._current, self._current_start, now - self._current_start)
+        )
+
+    def _close_gap(self, now: float) -> None:
+        gap = now - self._last_output
+        if gap >= self._stall_threshold:
+            self._stalls.append(StallPeriod(self._last_output, gap))
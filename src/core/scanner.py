@@ -14,23 +14,38 @@ from collections.abc import Callable
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from gi.repository import GLib
-
 from .clamav_config import parse_config
 from .log_manager import LogManager
+from .main_loop import idle_add
+from .private_clamd import get_private_clamd
+from .resource_governor import ResourceGovernor, ResourcePolicy, governed_command, resolve_policy
+from .scan_timing import (
+    PHASE_COUNT,
+    PHASE_FILE_LIST,
+    PHASE_PARSE,
+    PHASE_PROBE,
+    PHASE_SCAN,
+    PHASE_VALIDATE,
+    ScanTimer,
+)
 from .scanner_base import (
     cleanup_process,
     collect_clamav_warnings,
     communicate_with_cancel_check,
     create_cancelled_result,
     create_error_result,
+    file_list_temp_dir,
+    finish_scan,
+    read_global_exclusions,
+    remove_file_list,
     resolve_exit2_status,
     save_scan_log,
     stream_process_output,
     terminate_process_gracefully,
+    write_file_list,
 )
 from .scanner_types import ScanProgress, ScanResult, ScanStatus, ThreatDetail
-from .settings_manager import SettingsManager
+from .settings_manager import SettingsManager, SnapshotCache, settings_view
 from .threat_classifier import (
     categorize_threat,
     classify_threat_severity_str,
@@ -126,12 +141,22 @@ __all__ = [
 ]
 
 
+def _clamscan_exclusion_args(settings) -> tuple[str, ...]:
+    """Build clamscan --exclude/--exclude-dir arguments for the global exclusions."""
+    args: list[str] = []
+    for exclusion_type, pattern in read_global_exclusions(settings).entries:
+        flag = "--exclude-dir" if exclusion_type == "directory" else "--exclude"
+        args.extend([flag, glob_to_regex(pattern)])
+    return tuple(args)
+
+
 class Scanner:
     """
     ClamAV scanner with async execution support.
 
     Supports multiple scan backends:
-    - "auto": Prefer daemon if available, fallback to clamscan
+    - "auto": Prefer daemon if available, then the private on-demand daemon
+      (if enabled), fallback to clamscan
     - "daemon": Use clamd daemon only (error if unavailable)
     - "clamscan": Use standalone clamscan only
 
@@ -163,6 +188,16 @@ class Scanner:
         self._log_manager = log_manager if log_manager else LogManager()
         self._settings_manager = settings_manager
         self._daemon_scanner: DaemonScanner | None = None
+        self._private_daemon_scanner: DaemonScanner | None = None
+        # Derived from settings; rebuilt only when the settings version changes
+        self._exclusions_cache = SnapshotCache(read_global_exclusions)
+        self._exclusion_args_cache = SnapshotCache(_clamscan_exclusion_args)
+        # ((config path, mtime_ns, size), args) of the last parsed clamd.conf
+        self._limit_args_cache: tuple[tuple[str, int, int], tuple[str, ...]] | None = None
+
+    def _settings_view(self):
+        """Lock-free view of the current settings (None without a manager)."""
+        return settings_view(self._settings_manager)
 
     def _get_backend(self) -> str:
         """Get the configured scan backend.
@@ -172,7 +207,7 @@ class Scanner:
         flatpak-spawn --host, where they can access clamd normally.
         """
         if self._settings_manager:
-            return self._settings_manager.get("scan_backend", "auto")
+            return self._settings_view().get("scan_backend", "auto")
         return "auto"
 
     def _get_daemon_scanner(self) -> "DaemonScanner":
@@ -185,6 +220,38 @@ class Scanner:
             )
         return self._daemon_scanner
 
+    def _private_clamd_enabled(self) -> bool:
+        if self._settings_manager is None:
+            return False
+        return self._settings_view().get("private_clamd_enabled", False) is True
+
+    def _get_private_daemon_scanner(self) -> "DaemonScanner | None":
+        """
+        Start (or reuse) the private on-demand clamd and return a scanner for it.
+
+        Returns None when the private daemon is disabled or cannot be started,
+        so the caller falls back to clamscan.
+        """
+        if not self._private_clamd_enabled():
+            return None
+
+        private = get_private_clamd()
+        idle_minutes = self._settings_manager.get("private_clamd_idle_minutes", 15)
+        is_running, error = private.ensure_running(idle_timeout=int(idle_minutes) * 60)
+        if not is_running:
+            logger.info("Private clamd unavailable, using clamscan: %s", error)
+            return None
+
+        if self._private_daemon_scanner is None:
+            from .daemon_scanner import DaemonScanner
+
+            self._private_daemon_scanner = DaemonScanner(
+                log_manager=self._log_manager,
+                settings_manager=self._settings_manager,
+                config_path=private.config_path,
+            )
+        return self._private_daemon_scanner
+
     def _get_clamd_config_path(self) -> str | None:
         """Resolve clamd.conf when settings contain a path-like value."""
         if self._settings_manager is None:
@@ -226,11 +293,24 @@ class Scanner:
         the preferences silently have no effect on clamscan scans. Best-effort: if
         clamd.conf is unavailable or unparseable we return no args and clamscan
         falls back to its own defaults (preserving prior behavior).
+
+        The result is cached until clamd.conf's mtime or size changes, so
+        repeated scans do not re-parse an unchanged file.
         """
         config_path = self._get_clamd_config_path()
         if not config_path:
             return []
 
+        try:
+            stat = os.stat(config_path)
+            cache_key = (config_path, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            # Not visible from here (e.g. a host path inside Flatpak)
+            cache_key = None
+        cached = self._limit_args_cache
+        if cache_key is not None and cached is not None and cached[0] == cache_key:
+            return list(cached[1])
+
         config, error = parse_config(config_path)
         if config is None or error:
             return []
@@ -243,6 +323,8 @@ class Scanner:
             if value is None or not value.strip():
                 continue
             args.append(f"{flag}={value.strip()}")
+        if cache_key is not None:
+            self._limit_args_cache = (cache_key, tuple(args))
         return args
 
     def _is_daemon_available_cached(self) -> bool:
@@ -272,7 +354,9 @@ class Scanner:
             is_available, _msg = self._get_daemon_scanner().check_available()
             return "daemon" if is_available else "unavailable"
         else:  # auto
-            is_available = self._is_daemon_available_cached()
+            is_available = self._is_daemon_available_cached() or (
+                self._private_clamd_enabled() and get_private_clamd().is_running()
+            )
             return "daemon" if is_available else "clamscan"
 
     def check_available(self) -> tuple[bool, str | None]:
@@ -313,6 +397,8 @@ class Scanner:
         progress_callback: Callable[[ScanProgress], None] | None = None,
         backend_override: str | None = None,
         daemon_force_stream: bool = False,
+        file_paths: list[str] | None = None,
+        resource_policy: ResourcePolicy | None = None,
     ) -> ScanResult:
         """
         Execute a synchronous scan on the given path.
@@ -323,7 +409,7 @@ class Scanner:
         Progress Callback Threading Behavior:
         - progress_callback is called directly from the background thread running scan_sync()
         - Callback receives ScanProgress updates on the SAME thread (background thread)
-        - For GTK UI updates, wrap callback logic with GLib.idle_add() inside the callback
+        - For GTK UI updates, wrap callback logic with idle_add() inside the callback
         - Callback is invoked for each file scanned and each infection detected
 
         Args:
@@ -338,25 +424,32 @@ class Scanner:
                               Uses the provided backend without changing saved settings.
             daemon_force_stream: Force the daemon backend to use clamdscan's
                                  --stream mode for this scan.
+            file_paths: Optional files under ``path`` to scan instead of the
+                        whole tree, in scan order (passed via --file-list).
+            resource_policy: Optional CPU/I/O/memory limits for this scan.
+                             Defaults to the interactive scan priority.
 
         Returns:
             ScanResult with scan details
         """
-        start_time = time.monotonic()
+        timer = ScanTimer()
 
         # Reset cancel event at the start of every scan
         # This ensures a previous cancelled scan doesn't affect new scans
         self._cancel_event.clear()
 
         # Validate the path first
+        timer.begin(PHASE_VALIDATE)
         is_valid, error = validate_path(path)
         if not is_valid:
             result = create_error_result(path, error or "Invalid path")
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
 
         # Determine which backend to use
+        timer.begin(PHASE_PROBE)
         backend = backend_override if backend_override is not None else self._get_backend()
+        if resource_policy is None:
+            resource_policy = resolve_policy(self._settings_view())
 
         # For daemon-only mode, delegate entirely to daemon scanner
         if backend == "daemon":
@@ -366,6 +459,8 @@ class Scanner:
                 profile_exclusions,
                 progress_callback=progress_callback,
                 force_stream=daemon_force_stream,
+                file_paths=file_paths,
+                resource_policy=resource_policy,
             )
 
         # For auto mode, try daemon first if available
@@ -378,28 +473,78 @@ class Scanner:
                     profile_exclusions,
                     progress_callback=progress_callback,
                     force_stream=daemon_force_stream,
+                    file_paths=file_paths,
+                    resource_policy=resource_policy,
                 )
 
+            # No system daemon: use the private warm daemon when enabled
+            private_scanner = self._get_private_daemon_scanner()
+            if private_scanner is not None:
+                with get_private_clamd().lease():
+                    return private_scanner.scan_sync(
+                        path,
+                        recursive,
+                        profile_exclusions,
+                        progress_callback=progress_callback,
+                        force_stream=daemon_force_stream,
+                        file_paths=file_paths,
+                        resource_policy=resource_policy,
+                    )
+
         # Fall through to clamscan for "clamscan" mode or auto fallback
         is_installed, version_or_error = check_clamav_installed()
         if not is_installed:
             result = create_error_result(path, version_or_error or "ClamAV not installed")
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
+
+        governor = ResourceGovernor(resource_policy)
 
         # Count files for progress tracking (if callback is provided)
         files_total: int | None = None
-        if progress_callback is not None:
-            files_total = self._count_files(path, profile_exclusions)
+        if file_paths is not None:
+            files_total = len(file_paths)
+        elif progress_callback is not None:
+            timer.begin(PHASE_COUNT)
+            files_total = self._count_files(path, profile_exclusions, governor)
             # Check if cancelled during file counting
             if self._cancel_event.is_set():
                 result = create_cancelled_result(path)
-                self._save_scan_log(result, time.monotonic() - start_time)
-                return result
+                return self._finish_scan(result, timer)
+
+        # Scan an explicit file selection through --file-list
+        file_list_path: str | None = None
+        if file_paths is not None:
+            if not file_paths:
+                result = ScanResult(
+                    status=ScanStatus.CLEAN,
+                    path=path,
+                    stdout="",
+                    stderr="",
+                    exit_code=0,
+                    infected_files=[],
+                    scanned_files=0,
+                    scanned_dirs=0,
+                    infected_count=0,
+                    error_message=None,
+                    threat_details=[],
+                )
+                return self._finish_scan(result, timer)
+            timer.begin(PHASE_FILE_LIST)
+            try:
+                file_list_path = write_file_list(file_paths, file_list_temp_dir())
+            except OSError as e:
+                result = create_error_result(path, f"Could not write file list: {e}", str(e))
+                return self._finish_scan(result, timer)
 
         # Build clamscan command (use verbose mode if progress callback provided)
+        timer.begin(PHASE_SCAN, watch_output=progress_callback is not None)
         cmd = self._build_command(
-            path, recursive, profile_exclusions, verbose=progress_callback is not None
+            path,
+            recursive,
+            profile_exclusions,
+            verbose=progress_callback is not None,
+            file_list_path=file_list_path,
+            resource_policy=resource_policy,
         )
 
         try:
@@ -418,23 +563,27 @@ class Scanner:
             progress_infected_files: list[str] = []
 
             try:
-                if progress_callback is not None:
-                    # Use streaming mode for real-time progress
-                    (
-                        stdout,
-                        stderr,
-                        was_cancelled,
-                        progress_files_scanned,
-                        progress_infected_count,
-                        progress_infected_files,
-                    ) = self._scan_with_progress(
-                        self._current_process, progress_callback, files_total
-                    )
-                else:
-                    # Use standard blocking communication
-                    stdout, stderr, was_cancelled = communicate_with_cancel_check(
-                        self._current_process, self._cancel_event.is_set
-                    )
+                # Under the idle priority, SIGSTOP clamscan while the system is busy
+                with governor.pause_under_pressure(
+                    self._current_process, self._cancel_event.is_set
+                ):
+                    if progress_callback is not None:
+                        # Use streaming mode for real-time progress
+                        (
+                            stdout,
+                            stderr,
+                            was_cancelled,
+                            progress_files_scanned,
+                            progress_infected_count,
+                            progress_infected_files,
+                        ) = self._scan_with_progress(
+                            self._current_process, timer.observe(progress_callback), files_total
+                        )
+                    else:
+                        # Use standard blocking communication
+                        stdout, stderr, was_cancelled = communicate_with_cancel_check(
+                            self._current_process, self._cancel_event.is_set
+                        )
                 exit_code = self._current_process.returncode
             finally:
                 # Ensure process is cleaned up even if communicate() raises
@@ -456,28 +605,32 @@ class Scanner:
                     infected_files=progress_infected_files,
                     infected_count=progress_infected_count,
                 )
-                self._save_scan_log(result, time.monotonic() - start_time)
-                return result
+                return self._finish_scan(result, timer)
 
             # Parse the results
+            timer.begin(PHASE_PARSE)
             result = self._parse_results(path, stdout, stderr, exit_code)
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
 
         except FileNotFoundError:
             result = create_error_result(path, "ClamAV executable not found")
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
         except PermissionError as e:
             result = create_error_result(path, f"Permission denied: {e}", str(e))
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
         except Exception as e:
             result = create_error_result(path, f"Scan failed: {e}", str(e))
-            self._save_scan_log(result, time.monotonic() - start_time)
-            return result
+            return self._finish_scan(result, timer)
+        finally:
+            if file_list_path is not None:
+                remove_file_list(file_list_path)
 
-    def _count_files(self, path: str, profile_exclusions: dict | None = None) -> int | None:
+    def _count_files(
+        self,
+        path: str,
+        profile_exclusions: dict | None = None,
+        governor: ResourceGovernor | None = None,
+    ) -> int | None:
         """
         Pre-count files for progress calculation.
 
@@ -486,6 +639,7 @@ class Scanner:
         Args:
             path: Path to scan
             profile_exclusions: Optional exclusions from a scan profile
+            governor: Optional governor that pauses the walk under load
 
         Returns:
             Total number of files to scan, or None if counting was skipped
@@ -512,19 +666,9 @@ class Scanner:
         exclude_dirs: list[str] = []
 
         # Global exclusions from settings
-        if self._settings_manager is not None:
-            exclusions = self._settings_manager.get("exclusion_patterns", [])
-            for exclusion in exclusions:
-                if not exclusion.get("enabled", True):
-                    continue
-                pattern = exclusion.get("pattern", "")
-                if not pattern:
-                    continue
-                exclusion_type = exclusion.get("type", "pattern")
-                if exclusion_type == "directory":
-                    exclude_dirs.append(pattern)
-                else:
-                    exclude_patterns.append(pattern)
+        global_exclusions = self._exclusions_cache.get(self._settings_view())
+        exclude_dirs.extend(global_exclusions.directories)
+        exclude_patterns.extend(global_exclusions.patterns)
 
         # Profile exclusions
         if profile_exclusions:
@@ -546,6 +690,8 @@ class Scanner:
                 if self._cancel_event.is_set():
                     logger.info("File counting cancelled by user")
                     return 0
+                if governor is not None:
+                    governor.wait_for_headroom(self._cancel_event.is_set)
 
                 # Filter out excluded directories (modifies dirs in-place)
                 dirs[:] = [
@@ -693,17 +839,17 @@ class Scanner:
         The scan runs in a background thread and the callback is invoked
         on the main GTK thread via GLib.idle_add when complete.
 
-        GLib.idle_add() Pattern for Thread-Safe UI Updates:
+        idle_add() Pattern for Thread-Safe UI Updates:
         - scan_sync() runs in a background thread (blocks for entire scan duration)
         - Direct GTK widget updates from background threads are UNSAFE and will crash
-        - GLib.idle_add() schedules callback on the main GTK event loop thread
+        - idle_add() schedules callback on the main GTK event loop thread
         - This ensures all UI updates happen on the main thread where GTK expects them
         - The callback is queued and executed during the next GTK main loop iteration
-        - Multiple GLib.idle_add() calls are serialized automatically by GTK
+        - Multiple idle_add() calls are serialized automatically by GTK
 
         Why This Matters:
         - GTK is not thread-safe - only the main thread can update widgets
-        - Without GLib.idle_add(), you'll get race conditions and segfaults
+        - Without idle_add(), you'll get race conditions and segfaults
         - This is the standard pattern for async operations in GTK applications
 
         Args:
@@ -728,7 +874,7 @@ class Scanner:
                 daemon_force_stream=daemon_force_stream,
             )
             # Schedule callback on main thread
-            GLib.idle_add(callback, result)
+            idle_add(callback, result)
 
         thread = threading.Thread(target=scan_thread)
         thread.daemon = True
@@ -764,6 +910,8 @@ class Scanner:
         # Also cancel daemon scanner if it exists
         if self._daemon_scanner is not None:
             self._daemon_scanner.cancel()
+        if self._private_daemon_scanner is not None:
+            self._private_daemon_scanner.cancel()
 
     def _build_command(
         self,
@@ -771,6 +919,8 @@ class Scanner:
         recursive: bool,
         profile_exclusions: dict | None = None,
         verbose: bool = False,
+        file_list_path: str | None = None,
+        resource_policy: ResourcePolicy | None = None,
     ) -> list[str]:
         """
         Build the clamscan command arguments.
@@ -785,6 +935,10 @@ class Scanner:
                                Format: {"paths": ["/path1", ...], "patterns": ["*.ext", ...]}
             verbose: Whether to enable verbose mode for progress tracking.
                     When True, clamscan outputs each file as it's scanned.
+            file_list_path: Optional file listing the paths to scan, one per
+                    line; replaces ``path`` on the command line.
+            resource_policy: Optional limits; adds systemd-run, nice and
+                    ionice prefixes as needed.
 
         Returns:
             List of command arguments (wrapped with flatpak-spawn if in Flatpak)
@@ -794,7 +948,7 @@ class Scanner:
 
         # -r / --recursive: Scan subdirectories recursively
         # Add recursive flag for directories
-        if recursive and Path(path).is_dir():
+        if recursive and file_list_path is None and Path(path).is_dir():
             cmd.append("-r")
 
         # -v / --verbose: Output each file as it's scanned (enables progress tracking)
@@ -812,23 +966,7 @@ class Scanner:
         cmd.extend(self._get_clamscan_limit_args())
 
         # Inject exclusion patterns from settings
-        if self._settings_manager is not None:
-            exclusions = self._settings_manager.get("exclusion_patterns", [])
-            for exclusion in exclusions:
-                if not exclusion.get("enabled", True):
-                    continue
-
-                pattern = exclusion.get("pattern", "")
-                if not pattern:
-                    continue
-
-                regex = glob_to_regex(pattern)
-                exclusion_type = exclusion.get("type", "pattern")
-
-                if exclusion_type == "directory":
-                    cmd.extend(["--exclude-dir", regex])
-                else:  # file or pattern
-                    cmd.extend(["--exclude", regex])
+        cmd.extend(self._exclusion_args_cache.get(self._settings_view()))
 
         # Apply profile exclusions (paths and patterns)
         if profile_exclusions:
@@ -852,11 +990,15 @@ class Scanner:
 
         # Add the path to scan. Use "--" so a filename starting with "-"
         # is not reinterpreted as a clamscan flag.
-        cmd.append("--")
-        cmd.append(path)
+        if file_list_path is not None:
+            cmd.append(f"--file-list={file_list_path}")
+        else:
+            cmd.append("--")
+            cmd.append(path)
 
-        # Wrap with flatpak-spawn if running inside Flatpak sandbox
-        return wrap_host_command(cmd)
+        # Apply the resource policy, then wrap with flatpak-spawn if running
+        # inside Flatpak sandbox so the prefixes run on the host as well
+        return wrap_host_command(governed_command(cmd, resource_policy))
 
     def _parse_results(self, path: str, stdout: str, stderr: str, exit_code: int) -> ScanResult:
         """
@@ -984,3 +1126,7 @@ class Scanner:
     def _save_scan_log(self, result: ScanResult, duration: float) -> None:
         """Save scan result to log."""
         save_scan_log(self._log_manager, result, duration)
+
+    def _finish_scan(self, result: ScanResult, timer: ScanTimer) -> ScanResult:
+        """Attach timing to the result and save it to the log."""
+        return finish_scan(result, timer, self._save_scan_log)
@@ -7,19 +7,29 @@ DaemonScanner (clamdscan) to avoid code duplication:
 - Process communication with cancellation support
 - Streaming output with progress callbacks
 - Process termination with graceful shutdown
-- Scan log saving
+- Scan log saving and timing capture
+- Global exclusion lookup from settings snapshots
+- Temporary --file-list files
 - Error result creation
 """
 
+import contextlib
 import logging
 import os
 import re
 import select
 import subprocess
+import tempfile
 from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
 
+from .flatpak import is_flatpak
 from .i18n import _
 from .log_manager import LogEntry, LogManager
+from .sanitize import sanitize_surrogate_path
+from .scan_timing import PHASE_LOG, ScanTimer, parse_data_scanned
 from .scanner_types import ScanResult, ScanStatus
 
 logger = logging.getLogger(__name__)
@@ -84,6 +94,111 @@ _NONFATAL_TIME_LIMIT_MARKER = ": Time limit reached"
 _TOTAL_ERRORS_RE = re.compile(r"^Total errors:\s*(\d+)$")
 
 
+@dataclass(frozen=True)
+class GlobalExclusions:
+    """Enabled, non-empty global exclusions as (type, pattern) in settings order."""
+
+    entries: tuple[tuple[str, str], ...] = ()
+
+    @property
+    def directories(self) -> list[str]:
+        """Patterns of "directory" exclusions."""
+        return [pattern for kind, pattern in self.entries if kind == "directory"]
+
+    @property
+    def patterns(self) -> list[str]:
+        """Patterns of every other exclusion type (file or pattern)."""
+        return [pattern for kind, pattern in self.entries if kind != "directory"]
+
+    @property
+    def all_patterns(self) -> list[str]:
+        """Every pattern, regardless of type."""
+        return [pattern for _kind, pattern in self.entries]
+
+
+def read_global_exclusions(settings: Any) -> GlobalExclusions:
+    """
+    Extract the enabled global exclusions from a settings view.
+
+    Args:
+        settings: SettingsSnapshot, SettingsManager or None
+
+    Returns:
+        GlobalExclusions (empty when there are no settings)
+    """
+    if settings is None:
+        return GlobalExclusions()
+    entries = []
+    for exclusion in settings.get("exclusion_patterns", []):
+        if not exclusion.get("enabled", True):
+            continue
+        pattern = exclusion.get("pattern", "")
+        if not pattern:
+            continue
+        entries.append((exclusion.get("type", "pattern"), pattern))
+    return GlobalExclusions(tuple(entries))
+
+
+def file_list_temp_dir() -> str | None:
+    """
+    Return a temp directory that a host-side ClamAV process can read.
+
+    In Flatpak, clamscan/clamdscan run on the host through flatpak-spawn.
+    Files created in the sandbox runtime directory (for example
+    /run/user/$UID) are not necessarily visible to that host process, so
+    file lists must live in a host-visible app cache directory.
+    """
+    if is_flatpak():
+        cache_dir = Path.home() / ".cache" / "clamui"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(OSError):
+            os.chmod(cache_dir, 0o700)
+        return str(cache_dir)
+
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return runtime_dir
+    return None
+
+
+def write_file_list(file_paths: list[str], directory: str | None = None) -> str:
+    """
+    Write paths to a private temp file for ClamAV's --file-list option.
+
+    Args:
+        file_paths: Paths to scan, in scan order
+        directory: Directory for the file (see file_list_temp_dir())
+
+    Returns:
+        Path of the file list; the caller removes it with remove_file_list()
+    """
+    fd, file_list_path = tempfile.mkstemp(
+        prefix="clamui_filelist_",
+        suffix=".txt",
+        dir=directory,
+    )
+    try:
+        os.fchmod(fd, 0o600)
+        f = os.fdopen(fd, "w")
+    except Exception:
+        with contextlib.suppress(OSError):
+            os.close(fd)
+        remove_file_list(file_list_path)
+        raise
+
+    with f:
+        f.write("\n".join(sanitize_surrogate_path(p) for p in file_paths))
+    return file_list_path
+
+
+def remove_file_list(file_list_path: str) -> None:
+    """Remove a file list written by write_file_list(), logging failures."""
+    try:
+        os.unlink(file_list_path)
+    except OSError:
+        logger.debug("Failed to remove temporary file list %s", file_list_path, exc_info=True)
+
+
 def parse_total_errors(stdout: str) -> int:
     """Extract the error count from the ClamAV scan-summary block.
 
@@ -691,10 +806,38 @@ def save_scan_log(
         stdout=result.stdout,
         suffix=suffix,
         scheduled=scheduled,
+        timing=result.timing.to_dict() if result.timing is not None else None,
     )
     log_manager.save_log(entry)
 
 
+def finish_scan(
+    result: ScanResult,
+    timer: ScanTimer,
+    save_log: Callable[[ScanResult, float], None],
+) -> ScanResult:
+    """
+    Attach timing to a finished scan result and save its log entry.
+
+    The persisted timing ends where log persistence begins; the in-memory
+    result gets a final snapshot that includes the log phase as well.
+
+    Args:
+        result: The scan result.
+        timer: The timer that recorded the scan's phases.
+        save_log: Saves the result's log entry; called with (result, duration).
+
+    Returns:
+        The same result, for convenient ``return finish_scan(...)``.
+    """
+    bytes_scanned = parse_data_scanned(result.stdout)
+    result.timing = timer.snapshot(result.scanned_files, bytes_scanned)
+    timer.begin(PHASE_LOG)
+    save_log(result, result.timing.total_seconds)
+    result.timing = timer.snapshot(result.scanned_files, bytes_scanned)
+    return result
+
+
 def create_error_result(
     path: str,
     error_message: str,
@@ -11,6 +11,8 @@ This module defines the shared data types used by scanner implementations:
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .scan_timing import ScanTiming
+
 
 class ScanStatus(Enum):
     """Status of a scan operation."""
@@ -95,6 +97,7 @@ class ScanResult:
     skipped_count: int = 0  # Count of skipped files
     warning_message: str | None = None  # User-friendly warning about skipped files
     nonfatal_warnings: list[str] = field(default_factory=list)  # Non-fatal ClamAV warning lines
+    timing: ScanTiming | None = None  # Per-phase timing, set by the scanner
 
     @property
     def is_clean(self) -> bool:
@@ -14,7 +14,13 @@ from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 
-from .utils import get_clean_env, is_flatpak, which_host_command, wrap_host_command
+from .utils import (
+    get_clean_env,
+    host_path_exists,
+    is_flatpak,
+    which_host_command,
+    wrap_host_command,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -526,8 +532,8 @@ class Scheduler:
         """
         Check if a path exists, accounting for Flatpak sandbox.
 
-        When running inside Flatpak, uses flatpak-spawn to check the host
-        filesystem since the venv is installed on the host, not in the sandbox.
+        When running inside Flatpak, checks the host filesystem since the
+        venv is installed on the host, not in the sandbox.
 
         Args:
             path: Path to check for existence
@@ -536,19 +542,7 @@ class Scheduler:
             True if the path exists, False otherwise
         """
         if is_flatpak():
-            try:
-                result = subprocess.run(
-                    ["flatpak-spawn", "--host", "test", "-f", str(path)],
-                    capture_output=True,
-                    timeout=5,
-                )
-                return result.returncode == 0
-            except (subprocess.TimeoutExpired, FileNotFoundError) as e:
-                logger.debug("Path existence check failed for %s: %s", path, e)
-                return False
-            except Exception as e:
-                logger.debug("Unexpected error checking path existence for %s: %s", path, e)
-                return False
+            return host_path_exists(path)
         return path.exists()
 
     def _get_cli_command_path(self) -> list[str] | None:
@@ -2,22 +2,123 @@
 """
 Settings manager module for ClamUI providing user preferences storage.
 Stores user settings in JSON format following XDG conventions.
+
+Every set() rewrites settings.json atomically. Code that changes several
+keys at once should group them in ``with settings.batch():`` so the file is
+written once and listeners hear about each changed key once. With a
+write_delay, writes are deferred and coalesced instead; call flush() before
+exiting to write what is still pending.
+
+Each committed change also publishes a new SettingsSnapshot: an immutable
+copy of all settings with an increasing version number. Hot paths such as
+the scanners read the snapshot without taking the manager's lock, and
+SnapshotCache keeps values derived from it until the version changes.
 """
 
 import contextlib
 import copy
+import itertools
 import json
 import logging
 import os
 import tempfile
 import threading
 import weakref
-from collections.abc import Callable
+from collections.abc import Callable, Iterator, Mapping
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Generic, TypeVar
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Shared by all managers so a version never repeats within the process
+_snapshot_versions = itertools.count(1)
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only deep copy of a JSON-like value."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list | tuple):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set | frozenset):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+
+class SettingsSnapshot(Mapping):
+    """
+    Immutable view of all settings at one version.
+
+    Values are frozen copies: lists become tuples and dicts become read-only
+    mappings. Use SettingsManager.get() for values that will be modified.
+    """
+
+    __slots__ = ("_data", "_version")
+
+    def __init__(self, settings: dict, version: int):
+        self._data = {key: _freeze(value) for key, value in settings.items()}
+        self._version = version
+
+    @property
+    def version(self) -> int:
+        """Version number; a later snapshot always has a larger one."""
+        return self._version
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"SettingsSnapshot(version={self._version}, keys={len(self._data)})"
+
+
+def settings_view(settings: Any) -> Any:
+    """
+    Return a lock-free view of settings for read-only callers.
+
+    A SettingsManager yields its current SettingsSnapshot; None and other
+    objects with a get(key, default) method are returned unchanged.
+    """
+    snapshot = getattr(settings, "snapshot", None)
+    if snapshot is not None:
+        view = snapshot()
+        if isinstance(view, SettingsSnapshot):
+            return view
+    return settings
+
+
+class SnapshotCache(Generic[T]):
+    """
+    Memoizes a value derived from settings until the snapshot version changes.
+
+    Views other than a SettingsSnapshot (see settings_view()) have no version,
+    so the value is derived afresh each time. Concurrent callers may both
+    derive the value; the last one stored wins.
+    """
+
+    def __init__(self, derive: Callable[[Any], T]):
+        self._derive = derive
+        self._entry: tuple[int, T] | None = None
+
+    def get(self, settings: Any) -> T:
+        """Return the derived value for the given settings view."""
+        if not isinstance(settings, SettingsSnapshot):
+            return self._derive(settings)
+        entry = self._entry
+        if entry is not None and entry[0] == settings.version:
+            return entry[1]
+        value = self._derive(settings)
+        self._entry = (settings.version, value)
+        return value
+
 
 class _ListenerRef:
     """Track a settings listener without unnecessarily retaining bound methods."""
@@ -49,6 +150,27 @@ class _ListenerRef:
         return self.get() == callback
 
 
+class SettingsBatch:
+    """Outcome of a SettingsManager.batch() block, filled in when it ends."""
+
+    def __init__(self):
+        self.changed_keys: frozenset[str] = frozenset()
+        self.saved = True
+
+
+class _BatchState(threading.local):
+    """
+    Open batch() blocks of the current thread.
+
+    depth counts nested blocks; pending holds the values set inside them,
+    which only this thread's get() sees until the outermost block commits.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.pending: dict[str, Any] = {}
+
+
 class SettingsManager:
     """
     Manager for user settings persistence.
@@ -75,11 +197,24 @@ class SettingsManager:
         "schedule_auto_quarantine": False,
         "schedule_day_of_week": 0,  # 0=Monday, 6=Sunday (for weekly scans)
         "schedule_day_of_month": 1,  # 1-28 (for monthly scans)
+        "schedule_resident": False,  # Run scheduled scans from the running app
         "exclusion_patterns": [],
         # Scan backend settings
         "scan_backend": "auto",  # "auto", "daemon", "clamscan"
         "daemon_socket_path": "",  # Empty = auto-detect
         "clamd_conf_path": "",  # Empty = auto-detect
+        # Start a user-level clamd when no system daemon runs ("auto" backend)
+        "private_clamd_enabled": False,
+        "private_clamd_idle_minutes": 15,
+        # Scan resource limits (see core/resource_governor.py)
+        "scan_priority_interactive": "normal",  # "normal", "low", "idle"
+        "scan_priority_background": "low",  # Scheduled scans and device auto-scans
+        "scan_systemd_scope": False,  # Apply the ceilings below via systemd-run --scope
+        "scan_cpu_quota_percent": 0,  # 0 = unlimited, 100 = one CPU
+        "scan_io_weight": 0,  # 0 = systemd default (100); range 1-10000
+        "scan_memory_max_mb": 0,  # 0 = unlimited
+        "scan_pressure_threshold": 20.0,  # Pause low/idle walks above this PSI avg10 %
+        "scan_load_threshold": 1.5,  # ...or above this 1-minute load per CPU
         "freshclam_conf_path": "",  # Empty = auto-detect
         "clamd_size_limit_unit_migration_done": False,
         # VirusTotal settings
@@ -88,6 +223,12 @@ class SettingsManager:
         # when the user has explicitly opted in via preferences)
         "allow_plaintext_api_key_fallback": False,
         "virustotal_remember_no_key_action": "none",  # "none", "open_website", "prompt"
+        # Local verdict cache (keyed by SHA-256) to save API quota on re-checks
+        "virustotal_cache_enabled": True,
+        "virustotal_cache_ttl_clean_hours": 168,  # 7 days
+        "virustotal_cache_ttl_malicious_hours": 720,  # 30 days
+        "virustotal_cache_ttl_not_found_hours": 24,
+        "virustotal_cache_max_entries": 5000,
         # Debug logging settings
         "debug_log_level": "WARNING",  # "DEBUG", "INFO", "WARNING", "ERROR"
         "debug_log_max_size_mb": 5,  # Max size per log file in MB
@@ -102,15 +243,19 @@ class SettingsManager:
         "device_auto_scan_delay_seconds": 3,
         "device_auto_scan_auto_quarantine": False,
         "device_auto_scan_skip_on_battery": True,
+        "device_auto_scan_mode": "full",  # "full" or "quick" (risky files first)
+        "device_auto_scan_quick_max_file_mb": 100,  # Quick mode skips larger media files
     }
 
-    def __init__(self, config_dir: Path | None = None):
+    def __init__(self, config_dir: Path | None = None, write_delay: float = 0.0):
         """
         Initialize the SettingsManager.
 
         Args:
             config_dir: Optional custom config directory.
                         Defaults to XDG_CONFIG_HOME/clamui or ~/.config/clamui
+            write_delay: Seconds to defer and coalesce writes after a change.
+                         0 (the default) writes on every change.
         """
         if config_dir is not None:
             self._config_dir = Path(config_dir)
@@ -123,9 +268,22 @@ class SettingsManager:
         # Thread lock for safe concurrent access
         self._lock = threading.Lock()
         self._listeners: dict[str, list[_ListenerRef]] = {}
+        self._change_listeners: list[_ListenerRef] = []
+
+        # Batching is per thread, so a batch open in the UI does not capture
+        # set() calls from worker threads, and its values stay out of
+        # _settings until it commits.
+        self._batch_state = _BatchState()
+
+        # Write-behind state
+        self._write_delay = write_delay
+        self._write_timer: threading.Timer | None = None
+        self._dirty = False
 
         # Load settings on initialization
+        self._file_stamp = self._read_file_stamp()
         self._settings = self._load()
+        self._publish_snapshot()
 
     def _load(self) -> dict:
         """
@@ -194,6 +352,8 @@ class SettingsManager:
                     # Harden file permissions (owner read/write only)
                     # Settings may contain sensitive data like API keys in fallback storage
                     self._settings_file.chmod(0o600)
+                    self._dirty = False
+                    self._file_stamp = self._read_file_stamp()
                     return True
                 except Exception:
                     # Clean up temp file on failure
@@ -205,6 +365,49 @@ class SettingsManager:
                 # Catch all exceptions (including OSError, PermissionError)
                 return False
 
+    def _read_file_stamp(self) -> tuple[int, int] | None:
+        """Return (mtime_ns, size) of the settings file, or None if it is missing."""
+        try:
+            stat_result = self._settings_file.stat()
+        except OSError:
+            return None
+        return (stat_result.st_mtime_ns, stat_result.st_size)
+
+    def reload(self) -> bool:
+        """
+        Re-read the settings file if another process changed it.
+
+        Long-running processes that do not own the preferences UI (the
+        resident scheduled-scan service) call this to pick up settings
+        saved by the app. Nothing is re-read while local changes are still
+        waiting for the write delay.
+
+        Returns:
+            True if the settings were reloaded
+        """
+        stamp = self._read_file_stamp()
+        with self._lock:
+            if stamp == self._file_stamp or self._dirty:
+                return False
+
+        settings = self._load()
+        changed_values: dict[str, Any] = {}
+        with self._lock:
+            previous_settings = self._settings
+            self._settings = settings
+            self._file_stamp = stamp
+            for key in set(previous_settings) | set(settings):
+                if previous_settings.get(key) != settings.get(key):
+                    changed_values[key] = settings.get(key)
+            if changed_values:
+                self._publish_snapshot()
+
+        for key, value in changed_values.items():
+            self._notify_listeners(key, value)
+        if changed_values:
+            self._notify_change_listeners(frozenset(changed_values))
+        return True
+
     def _backup_corrupted_file(self) -> None:
         """
         Create a backup of a corrupted settings file.
@@ -247,6 +450,9 @@ class SettingsManager:
         Returns:
             The setting value or default
         """
+        pending = self._batch_state.pending
+        if key in pending:
+            return pending[key]
         with self._lock:
             return self._settings.get(key, default)
 
@@ -254,24 +460,126 @@ class SettingsManager:
         """
         Set a setting value and save to file.
 
+        Inside a batch() block opened by the calling thread the value is
+        only visible to that thread's get() until the outermost block ends;
+        then it is stored, saved and announced. Calls from other threads are
+        not affected.
+
         Args:
             key: The setting key to set
             value: The value to store
 
         Returns:
-            True if saved successfully, False otherwise
+            True if saved successfully (or deferred by a batch or write
+            delay), False otherwise
         """
-        should_notify = False
+        batch = self._batch_state
+        if batch.depth:
+            batch.pending[key] = value
+            return True
+
         with self._lock:
             previous = self._settings.get(key)
             self._settings[key] = value
             should_notify = previous != value
+            self._publish_snapshot()
 
-        saved = self.save()
+        saved = self._persist()
         if should_notify:
             self._notify_listeners(key, value)
+            self._notify_change_listeners(frozenset((key,)))
         return saved
 
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[SettingsBatch]:
+        """
+        Group several set() calls into one save and one round of notifications.
+
+        When the outermost block ends, settings.json is written once (if any
+        value changed), each changed key's listeners are called once with the
+        final value, and change listeners get the set of changed keys. If an
+        exception leaves the outermost block, its changes are discarded
+        without ever having been visible to other threads or saved. Blocks
+        may be nested. A batch only groups set() calls made by the thread
+        that opened it.
+
+        Yields:
+            SettingsBatch whose changed_keys and saved are set when the
+            outermost block ends
+        """
+        handle = SettingsBatch()
+        batch = self._batch_state
+        batch.depth += 1
+        try:
+            yield handle
+        except BaseException:
+            batch.depth -= 1
+            if batch.depth == 0:
+                batch.pending = {}
+            raise
+
+        batch.depth -= 1
+        if batch.depth:
+            return
+        pending, batch.pending = batch.pending, {}
+        changed: dict[str, Any] = {}
+        with self._lock:
+            for key, value in pending.items():
+                current = self._settings.get(key)
+                # A list or dict from get() changed in place and set again is
+                # already in _settings, so it compares equal but is a change
+                in_place = value is current and isinstance(value, dict | list | set)
+                if in_place or key not in self._settings or current != value:
+                    changed[key] = value
+                self._settings[key] = value
+            if changed:
+                self._publish_snapshot()
+
+        handle.changed_keys = frozenset(changed)
+        if not changed:
+            return
+        handle.saved = self._persist()
+        for key, value in changed.items():
+            self._notify_listeners(key, value)
+        self._notify_change_listeners(handle.changed_keys)
+
+    def flush(self) -> bool:
+        """
+        Write changes still waiting for the write delay.
+
+        Call before the application exits when a write_delay is in use.
+
+        Returns:
+            True if nothing was pending or the write succeeded
+        """
+        with self._lock:
+            timer = self._write_timer
+            self._write_timer = None
+            pending = self._dirty
+        if timer is not None:
+            timer.cancel()
+        if not pending:
+            return True
+        saved = self.save()
+        if not saved:
+            logger.warning("Failed to write pending settings to %s", self._settings_file)
+        return saved
+
+    def _persist(self) -> bool:
+        """Save now, or schedule a deferred save when a write delay is set."""
+        if self._write_delay <= 0:
+            return self.save()
+
+        timer = threading.Timer(self._write_delay, self.flush)
+        timer.daemon = True
+        with self._lock:
+            self._dirty = True
+            if self._write_timer is not None:
+                self._write_timer.cancel()
+            self._write_timer = timer
+        timer.start()
+        return True
+
     def reset_to_defaults(self) -> bool:
         """
         Reset all settings to defaults and save.
@@ -288,12 +596,36 @@ class SettingsManager:
                 new_value = self._settings.get(key)
                 if previous_settings.get(key) != new_value:
                     changed_values[key] = new_value
+            self._publish_snapshot()
 
-        saved = self.save()
+        saved = self._persist()
         for key, value in changed_values.items():
             self._notify_listeners(key, value)
+        if changed_values:
+            self._notify_change_listeners(frozenset(changed_values))
         return saved
 
+    def snapshot(self) -> SettingsSnapshot:
+        """
+        Get an immutable view of the committed settings.
+
+        Does not take the lock, so it is cheap enough for scan hot paths.
+        Values set inside an unfinished batch() are not visible yet.
+
+        Returns:
+            The current SettingsSnapshot
+        """
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Version of the current snapshot; increases with every change."""
+        return self._snapshot.version
+
+    def _publish_snapshot(self) -> None:
+        """Replace the current snapshot; the caller must hold the lock."""
+        self._snapshot = SettingsSnapshot(self._settings, next(_snapshot_versions))
+
     def get_all(self) -> dict:
         """
         Get a copy of all settings.
@@ -302,7 +634,9 @@ class SettingsManager:
             Dictionary with all current settings
         """
         with self._lock:
-            return dict(self._settings)
+            settings = dict(self._settings)
+        settings.update(self._batch_state.pending)
+        return settings
 
     def add_listener(self, key: str, callback: Callable[[Any], None]) -> None:
         """
@@ -340,6 +674,47 @@ class SettingsManager:
             else:
                 self._listeners.pop(key, None)
 
+    def add_change_listener(self, callback: Callable[[frozenset[str]], None]) -> None:
+        """
+        Register a callback for any settings change.
+
+        The callback receives the set of changed keys: one key per plain
+        set(), every changed key once per batch().
+
+        Args:
+            callback: Called with a frozenset of changed keys
+        """
+        with self._lock:
+            self._change_listeners.append(_ListenerRef(callback))
+
+    def remove_change_listener(self, callback: Callable[[frozenset[str]], None]) -> None:
+        """
+        Remove a callback previously passed to add_change_listener().
+
+        Args:
+            callback: Callback to remove
+        """
+        with self._lock:
+            self._change_listeners = [
+                listener
+                for listener in self._change_listeners
+                if listener.get() is not None and not listener.matches(callback)
+            ]
+
+    def _notify_change_listeners(self, keys: frozenset[str]) -> None:
+        """Notify change listeners about a set of changed keys."""
+        with self._lock:
+            listeners = list(self._change_listeners)
+
+        for listener in listeners:
+            callback = listener.get()
+            if callback is None:
+                continue
+            try:
+                callback(keys)
+            except Exception:
+                logger.exception("Settings change listener failed for keys %s", sorted(keys))
+
     def _notify_listeners(self, key: str, value: Any) -> None:
         """Notify listeners registered for a changed setting key."""
         with self._lock:
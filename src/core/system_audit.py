@@ -16,27 +16,40 @@ Tier 1 checks (no root required, run automatically):
 Tier 2 deep scans (root via pkexec, opt-in):
 - Lynis: comprehensive security audit with hardening score
 - chkrootkit: rootkit detection scan
+Both stream their output: findings and the current test phase are reported
+while the scan runs, the scan can be cancelled, and the last result is kept
+until the next run.
+
+iter_tier1_audit() / run_tier1_audit() run the Tier 1 checks concurrently with
+per-check deadlines, sharing identical host commands between checks. They
+back both the Security Audit view and ``clamui audit``.
 """
 
+import contextvars
 import logging
 import re
 import subprocess
+import threading
 import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
+from typing import Any
 
 from .clamav_detection import (
-    _host_database_dirs_to_check,
     check_clamav_installed,
     check_clamd_connection,
     check_database_available,
 )
-from .flatpak import get_clean_env, is_flatpak, wrap_host_command
-from .i18n import _
+from .database_inventory import get_database_inventory
+from .flatpak import get_clean_env, is_flatpak, run_host_command, wrap_host_command
+from .i18n import N_, _
 from .keyring_manager import delete_portmaster_token, get_portmaster_token
 from .portmaster_client import PortmasterStatus, probe_portmaster
 from .sanitize import sanitize_log_line, sanitize_log_text
+from .scanner_base import stream_process_output
 
 logger = logging.getLogger(__name__)
 
@@ -168,21 +181,108 @@ class AuditReport:
 
 _SUBPROCESS_TIMEOUT = 10
 
+# Units queried by the Tier 1 checks. The audit runner asks systemd for all of
+# them in one ``systemctl is-active`` call instead of one call per unit.
+_SYSTEMD_UNITS = (
+    "clamav-daemon",
+    "clamd@scan",
+    "clamd",
+    "clamav-freshclam",
+    "clamav-freshclam.timer",
+    "ufw",
+    "nftables",
+    "dnf-automatic.timer",
+    "fail2ban",
+    "crowdsec",
+    "sshd",
+    "ssh",
+)
+
+
+class _CommandMemo:
+    """Per-audit memo so checks sharing a host command run it only once.
+
+    Several checks ask the same questions (``which apt``, ``systemctl
+    is-active ufw``). While an audit runner is active, identical calls from
+    any worker share a single in-flight result; outside a runner every call
+    goes straight to the host as before.
+    """
+
+    def __init__(self):
+        self._results: dict[tuple, Future] = {}
+        self._lock = threading.Lock()
+
+    def call(self, key: tuple, func: Callable[[], Any]) -> Any:
+        """Return func()'s result for key, running it at most once."""
+        with self._lock:
+            future = self._results.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._results[key] = future
+        if owner:
+            try:
+                future.set_result(func())
+            except BaseException as e:
+                future.set_exception(e)
+        return future.result()
+
+
+_command_memo: contextvars.ContextVar[_CommandMemo | None] = contextvars.ContextVar(
+    "clamui_audit_command_memo", default=None
+)
+
+
+def get_systemd_unit_states() -> dict[str, str] | None:
+    """Query every unit in _SYSTEMD_UNITS with one ``systemctl is-active`` call.
+
+    ``is-active`` prints one state per unit in argument order and resolves
+    aliases and template instances the same way the single-unit query does.
+
+    Returns:
+        Mapping of unit name to state, or None if the output was unusable
+    """
+    try:
+        result = run_host_command(
+            ["systemctl", "is-active", *_SYSTEMD_UNITS], timeout=_SUBPROCESS_TIMEOUT
+        )
+    except (subprocess.TimeoutExpired, OSError) as e:
+        logger.debug("Batched systemctl query failed: %s", e)
+        return None
+    states = [sanitize_log_line(line.strip()) for line in result.stdout.splitlines()]
+    if len(states) != len(_SYSTEMD_UNITS):
+        return None
+    return dict(zip(_SYSTEMD_UNITS, states, strict=True))
+
 
 def _check_systemd_service(service_name: str) -> tuple[bool, str]:
     """Check if a systemd service is active.
 
+    Inside an audit run, the state comes from a shared snapshot of all
+    _SYSTEMD_UNITS when possible.
+
     Returns:
         (is_active, status_text) where status_text is the raw output
         like "active", "inactive", "failed", or an error message.
     """
+    memo = _command_memo.get()
+    if memo is not None:
+        states = memo.call(("systemd-units",), get_systemd_unit_states)
+        if states is not None and service_name in states:
+            status = states[service_name]
+            return (status == "active", status)
+        return memo.call(
+            ("systemctl", "is-active", service_name),
+            lambda: _query_systemd_service(service_name),
+        )
+    return _query_systemd_service(service_name)
+
+
+def _query_systemd_service(service_name: str) -> tuple[bool, str]:
+    """Ask systemd for the state of one unit."""
     try:
-        result = subprocess.run(
-            wrap_host_command(["systemctl", "is-active", service_name]),
-            capture_output=True,
-            text=True,
-            timeout=_SUBPROCESS_TIMEOUT,
-            env=get_clean_env(),
+        result = run_host_command(
+            ["systemctl", "is-active", service_name], timeout=_SUBPROCESS_TIMEOUT
         )
         status = sanitize_log_line(result.stdout.strip())
         return (status == "active", status)
@@ -220,15 +320,19 @@ def _run_command(args: list[str], timeout: int = _SUBPROCESS_TIMEOUT) -> tuple[i
     (e.g. ``ss``, ``sshd -T``, lynis-report); collapsing newlines would merge
     every line into one and silently break that parsing. stderr is surfaced in
     single-line error details, so it keeps the single-line sanitizer.
+
+    Inside an audit run, identical commands are run once and shared.
     """
+    memo = _command_memo.get()
+    if memo is not None:
+        return memo.call(tuple(args), lambda: _execute_command(args, timeout))
+    return _execute_command(args, timeout)
+
+
+def _execute_command(args: list[str], timeout: int) -> tuple[int, str, str]:
+    """Run a command on the host and sanitize its output for _run_command."""
     try:
-        result = subprocess.run(
-            wrap_host_command(args),
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            env=get_clean_env(),
-        )
+        result = run_host_command(args, timeout=timeout)
         return (
             result.returncode,
             sanitize_log_text(result.stdout.strip()),
@@ -242,139 +346,6 @@ def _run_command(args: list[str], timeout: int = _SUBPROCESS_TIMEOUT) -> tuple[i
         return (-1, "", str(e))
 
 
-def _read_cvd_header(cvd_path: str) -> tuple[str | None, str | None]:
-    """Read the first 512 bytes of a .cvd/.cld file (its colon-delimited header).
-
-    In Flatpak the database lives on the host, so the header is read via
-    ``flatpak-spawn --host head -c 512`` rather than direct file I/O.
-
-    Returns:
-        (header_text, None) on success or (None, error_message) on failure.
-    """
-    if is_flatpak():
-        try:
-            result = subprocess.run(
-                wrap_host_command(["head", "-c", "512", cvd_path]),
-                capture_output=True,
-                timeout=5,
-                env=get_clean_env(),
-            )
-        except subprocess.TimeoutExpired:
-            return (None, _("Timed out reading database"))
-        except FileNotFoundError:
-            return (None, _("flatpak-spawn not available"))
-        except OSError as e:
-            return (None, str(e))
-        if result.returncode != 0:
-            return (None, _("Permission denied reading database"))
-        return (result.stdout.decode("ascii", errors="ignore"), None)
-
-    try:
-        with open(cvd_path, "rb") as f:
-            return (f.read(512).decode("ascii", errors="ignore"), None)
-    except FileNotFoundError:
-        return (None, _("Database file not found"))
-    except PermissionError:
-        return (None, _("Permission denied reading database"))
-    except OSError as e:
-        return (None, str(e))
-
-
-def _parse_cvd_age(cvd_path: str) -> tuple[int | None, str | None]:
-    """Parse a ClamAV .cvd/.cld file header to determine database age.
-
-    The CVD header is in the first 512 bytes, colon-delimited:
-    ClamAV-VDB:build_time:version:sigs:flevel:md5:dsig:builder:stime
-
-    Returns:
-        (days_old, build_date_string) or (None, error_message).
-    """
-    header, error = _read_cvd_header(cvd_path)
-    if header is None:
-        return (None, error)
-
-    fields = header.split(":")
-    if len(fields) < 9 or not fields[0].startswith("ClamAV-VDB"):
-        return (None, _("Invalid database file format"))
-
-    try:
-        # The stime field (field 9) is immediately followed by the gzip-
-        # compressed database payload with no delimiter. Ascii-decoding the
-        # raw 512-byte header leaves arbitrary binary bytes appended to the
-        # timestamp, so int() on the whole field raises ValueError. Take only
-        # the leading run of digits.
-        match = re.match(r"\d+", fields[8].strip().strip("\x00"))
-        if match is None:
-            raise ValueError("no numeric stime found")
-        build_timestamp = int(match.group())
-        age_seconds = time.time() - build_timestamp
-        days_old = int(age_seconds / 86400)
-        return (days_old, fields[1])
-    except (ValueError, IndexError):
-        return (None, _("Could not parse database timestamp"))
-
-
-def _host_find_daily_cvd(db_dir: str) -> str | None:
-    """Locate daily.cvd/daily.cld inside a host database directory (Flatpak)."""
-    try:
-        result = subprocess.run(
-            [
-                "flatpak-spawn",
-                "--host",
-                "find",
-                db_dir,
-                "-maxdepth",
-                "1",
-                "-type",
-                "f",
-                "(",
-                "-iname",
-                "daily.cvd",
-                "-o",
-                "-iname",
-                "daily.cld",
-                ")",
-                "-print",
-                "-quit",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=5,
-            env=get_clean_env(),
-        )
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
-        return None
-    if result.returncode != 0:
-        return None
-    lines = result.stdout.strip().splitlines()
-    return lines[0] if lines else None
-
-
-def _find_daily_cvd_path() -> str | None:
-    """Find the path to the daily.cvd or daily.cld database file.
-
-    Checks every database directory ClamUI knows about -- the DatabaseDirectory
-    from freshclam.conf first, then distro defaults -- rather than assuming
-    /var/lib/clamav, which is wrong for custom setups and some distros.
-    """
-    for db_dir in _host_database_dirs_to_check():
-        if is_flatpak():
-            found = _host_find_daily_cvd(db_dir)
-            if found:
-                return found
-            continue
-        for ext in (".cvd", ".cld"):
-            path = Path(db_dir) / f"daily{ext}"
-            try:
-                if path.exists():
-                    return str(path)
-            except OSError:
-                # e.g. parent directory not searchable (Fedora /var/lib/clamav
-                # is mode 0750); fall through to the daemon-based fallback.
-                continue
-    return None
-
-
 def _database_age_from_daemon() -> tuple[int | None, str | None]:
     """Determine database age by asking the running clamd daemon.
 
@@ -411,14 +382,15 @@ def _database_age_from_daemon() -> tuple[int | None, str | None]:
 def _get_database_age() -> tuple[int | None, str | None]:
     """Best-effort virus database age.
 
-    Tries the database file header first (a precise build timestamp), then
-    falls back to the daemon when the file is missing or unreadable.
+    Uses the daily database header from the shared inventory first (a
+    precise build timestamp), then falls back to the daemon when the file is
+    missing or unreadable.
     """
-    daily_path = _find_daily_cvd_path()
-    if daily_path:
-        days_old, date_str = _parse_cvd_age(daily_path)
+    daily = get_database_inventory().get().find("daily")
+    if daily is not None:
+        days_old = daily.age_days()
         if days_old is not None:
-            return (days_old, date_str)
+            return (days_old, daily.build_date)
     return _database_age_from_daemon()
 
 
@@ -1317,13 +1289,194 @@ def _parse_sshd_config() -> dict[str, str] | None:
 # =============================================================================
 # Tier 2 Deep Scan Functions
 # =============================================================================
+#
+# Lynis and chkrootkit run for minutes. Both are streamed line by line through
+# scanner_base.stream_process_output so findings and the current test phase
+# reach the caller while the scan runs, and a cancel request stops reading
+# within a poll interval. The last completed result of each scan is kept
+# until the next run (see get_last_deep_scan()).
 
 _DEEP_SCAN_TIMEOUT = 300  # 5 minutes
 
+# At most this many individual findings are listed in a deep scan section
+_MAX_DEEP_SCAN_FINDINGS = 5
+
+# Lynis result tags that indicate a problem, e.g. "  - Checking ... [ WARNING ]"
+_LYNIS_PROBLEM_TAGS = frozenset({"WARNING", "UNSAFE", "EXPOSED", "DANGEROUS", "VULNERABLE"})
+_LYNIS_RESULT_RE = re.compile(r"^\s*-\s+(?P<test>.+?)\s*\[\s*(?P<tag>[A-Z][A-Z ]*?)\s*\]\s*$")
+_LYNIS_PHASE_RE = re.compile(r"^\[\+\]\s+(?P<phase>.+?)\s*$")
+_LYNIS_HARDENING_RE = re.compile(r"Hardening index\s*:\s*(?P<score>\d+)")
+_CHKROOTKIT_TEST_RE = re.compile(
+    r"^(?:Checking\s+`(?P<test>[^']+)'|Searching for\s+(?P<search>.+?)\.{3})"
+)
+
+_last_deep_scans: dict[AuditCategory, AuditSectionResult] = {}
+_last_deep_scans_lock = threading.Lock()
+
+
+@dataclass
+class DeepScanProgress:
+    """Progress of a running Lynis or chkrootkit scan."""
+
+    # Test phase currently running (Lynis section, chkrootkit test name)
+    phase: str
+    # Number of phases started so far
+    phases: int = 0
+    # Findings parsed so far, in output order
+    findings: list[AuditCheckResult] = field(default_factory=list)
+
+
+def get_last_deep_scan(category: AuditCategory) -> AuditSectionResult | None:
+    """Return the last completed deep scan result for a category, if any."""
+    with _last_deep_scans_lock:
+        return _last_deep_scans.get(category)
+
+
+def _remember_deep_scan(section: AuditSectionResult) -> AuditSectionResult:
+    with _last_deep_scans_lock:
+        _last_deep_scans[section.category] = section
+    return section
+
 
-def run_lynis_audit() -> AuditSectionResult:
+class _LynisOutputParser:
+    """Incremental parser for ``lynis audit system`` output."""
+
+    def __init__(self):
+        self.phase = ""
+        self.phases = 0
+        self.findings: list[AuditCheckResult] = []
+        self.hardening_index: int | None = None
+
+    def feed(self, line: str) -> bool:
+        """Parse one output line; returns True if progress changed."""
+        line = sanitize_log_line(line).rstrip()
+        if match := _LYNIS_PHASE_RE.match(line):
+            self.phase = match.group("phase")
+            self.phases += 1
+            return True
+        if match := _LYNIS_HARDENING_RE.search(line):
+            self.hardening_index = int(match.group("score"))
+            return False
+        match = _LYNIS_RESULT_RE.match(line)
+        if match and match.group("tag") in _LYNIS_PROBLEM_TAGS:
+            self.findings.append(
+                AuditCheckResult(
+                    name=self.phase or _("Lynis"),
+                    status=AuditStatus.WARNING,
+                    detail=_("{test}: {result}").format(
+                        test=match.group("test"), result=match.group("tag").lower()
+                    ),
+                    info_url=_URLS["lynis"],
+                )
+            )
+            return True
+        return False
+
+
+class _ChkrootkitOutputParser:
+    """Incremental parser for chkrootkit output."""
+
+    def __init__(self):
+        self.phase = ""
+        self.phases = 0
+        self.findings: list[AuditCheckResult] = []
+
+    def feed(self, line: str) -> bool:
+        """Parse one output line; returns True if progress changed."""
+        line = sanitize_log_line(line).strip()
+        changed = False
+        if match := _CHKROOTKIT_TEST_RE.match(line):
+            self.phase = match.group("test") or match.group("search")
+            self.phases += 1
+            changed = True
+        if "INFECTED" in line:
+            self.findings.append(
+                AuditCheckResult(
+                    name=_("Finding"),
+                    status=AuditStatus.FAIL,
+                    detail=line,
+                    info_url=_URLS["chkrootkit"],
+                )
+            )
+            changed = True
+        return changed
+
+
+def _stream_deep_scan(
+    argv: list[str],
+    on_line: Callable[[str], None],
+    is_cancelled: Callable[[], bool] | None = None,
+    timeout: float = _DEEP_SCAN_TIMEOUT,
+) -> tuple[int | None, str, str, bool]:
+    """Run a privileged deep scan on the host, streaming stdout to on_line.
+
+    Returns:
+        (returncode, stdout, stderr, was_cancelled); returncode is None when
+        the scan was cancelled
+
+    Raises:
+        subprocess.TimeoutExpired: If the scan ran longer than timeout
+        OSError: If the command could not be started
+    """
+    deadline = time.monotonic() + timeout
+    timed_out = False
+
+    def should_stop() -> bool:
+        nonlocal timed_out
+        if time.monotonic() >= deadline:
+            timed_out = True
+            return True
+        return is_cancelled is not None and is_cancelled()
+
+    process = subprocess.Popen(
+        wrap_host_command(argv),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=get_clean_env(),
+    )
+    try:
+        stdout, stderr, was_cancelled = stream_process_output(process, should_stop, on_line)
+    except PermissionError:
+        # After authentication pkexec has exec'd the tool as root, so it
+        # cannot be signalled. Stop reading; closing the pipes makes its next
+        # write fail and it is reaped in the background.
+        logger.info("Cannot stop privileged %s; detaching from it", argv[1:2])
+        threading.Thread(target=process.wait, daemon=True).start()
+        stdout, stderr, was_cancelled = "", "", True
+    finally:
+        for stream in (process.stdout, process.stderr):
+            if stream is not None:
+                stream.close()
+
+    if timed_out:
+        raise subprocess.TimeoutExpired(argv, timeout)
+    return (None if was_cancelled else process.returncode), stdout, stderr, was_cancelled
+
+
+def _cancelled_check(name: str, info_url: str) -> AuditCheckResult:
+    return AuditCheckResult(
+        name=name,
+        status=AuditStatus.SKIPPED,
+        detail=_("Scan was cancelled"),
+        info_url=info_url,
+    )
+
+
+def run_lynis_audit(
+    progress_callback: Callable[[DeepScanProgress], None] | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> AuditSectionResult:
     """Run a Lynis security audit (requires root via pkexec).
 
+    Output is parsed while Lynis runs: each ``[+]`` section is reported as a
+    phase and problem results become findings.
+
+    Args:
+        progress_callback: Called from the scan thread whenever the phase
+            changes or a finding is parsed
+        is_cancelled: Polled while the scan runs; returning True stops it
+
     Returns an AuditSectionResult with the hardening index and key findings.
     """
     section = AuditSectionResult(
@@ -1347,23 +1500,19 @@ def run_lynis_audit() -> AuditSectionResult:
         )
         return section
 
-    # Run lynis audit with pkexec
+    parser = _LynisOutputParser()
+
+    def on_line(line: str) -> None:
+        if parser.feed(line) and progress_callback is not None:
+            progress_callback(DeepScanProgress(parser.phase, parser.phases, list(parser.findings)))
+
+    # Run lynis audit with pkexec. --quick skips interactive pauses; output is
+    # not suppressed (no --quiet) so phases and findings can be streamed.
     try:
-        result = subprocess.run(
-            wrap_host_command(
-                [
-                    "pkexec",
-                    "lynis",
-                    "audit",
-                    "system",
-                    "--cronjob",
-                    "--quiet",
-                ]
-            ),
-            capture_output=True,
-            text=True,
-            timeout=_DEEP_SCAN_TIMEOUT,
-            env=get_clean_env(),
+        returncode, _stdout, _stderr, cancelled = _stream_deep_scan(
+            ["pkexec", "lynis", "audit", "system", "--no-colors", "--quick"],
+            on_line,
+            is_cancelled,
         )
     except subprocess.TimeoutExpired:
         section.checks.append(
@@ -1386,8 +1535,12 @@ def run_lynis_audit() -> AuditSectionResult:
         )
         return section
 
+    if cancelled:
+        section.checks.append(_cancelled_check(_("Lynis Audit"), _URLS["lynis"]))
+        return section
+
     # pkexec cancelled by user
-    if result.returncode in (126, 127):
+    if returncode in (126, 127):
         section.checks.append(
             AuditCheckResult(
                 name=_("Lynis Audit"),
@@ -1398,8 +1551,11 @@ def run_lynis_audit() -> AuditSectionResult:
         )
         return section
 
-    # Parse lynis-report.dat for hardening index
-    hardening_index = _parse_lynis_report()
+    # The score is printed in the scan details; lynis-report.dat is the
+    # fallback for versions that do not print it.
+    hardening_index = parser.hardening_index
+    if hardening_index is None:
+        hardening_index = _parse_lynis_report()
     if hardening_index is not None:
         if hardening_index >= 70:
             status = AuditStatus.PASS
@@ -1423,13 +1579,14 @@ def run_lynis_audit() -> AuditSectionResult:
         section.checks.append(
             AuditCheckResult(
                 name=_("Lynis Audit"),
-                status=AuditStatus.PASS if result.returncode == 0 else AuditStatus.WARNING,
-                detail=_("Audit completed (exit code {code})").format(code=result.returncode),
+                status=AuditStatus.PASS if returncode == 0 else AuditStatus.WARNING,
+                detail=_("Audit completed (exit code {code})").format(code=returncode),
                 info_url=_URLS["lynis"],
             )
         )
 
-    return section
+    section.checks.extend(parser.findings[:_MAX_DEEP_SCAN_FINDINGS])
+    return _remember_deep_scan(section)
 
 
 def _parse_lynis_report() -> int | None:
@@ -1458,9 +1615,20 @@ def _parse_lynis_report() -> int | None:
     return None
 
 
-def run_rootkit_check() -> AuditSectionResult:
+def run_rootkit_check(
+    progress_callback: Callable[[DeepScanProgress], None] | None = None,
+    is_cancelled: Callable[[], bool] | None = None,
+) -> AuditSectionResult:
     """Run chkrootkit scan (requires root via pkexec).
 
+    Output is parsed while chkrootkit runs: each test it starts is reported as
+    a phase and INFECTED lines become findings.
+
+    Args:
+        progress_callback: Called from the scan thread whenever the test
+            changes or a finding is parsed
+        is_cancelled: Polled while the scan runs; returning True stops it
+
     Returns an AuditSectionResult with scan results.
     """
     section = AuditSectionResult(
@@ -1484,14 +1652,17 @@ def run_rootkit_check() -> AuditSectionResult:
         )
         return section
 
-    # Run chkrootkit with pkexec in quiet mode
+    parser = _ChkrootkitOutputParser()
+
+    def on_line(line: str) -> None:
+        if parser.feed(line) and progress_callback is not None:
+            progress_callback(DeepScanProgress(parser.phase, parser.phases, list(parser.findings)))
+
+    # Run chkrootkit with pkexec. Not in quiet mode (-q): the "Checking `x'..."
+    # lines are what drive per-test progress.
     try:
-        result = subprocess.run(
-            wrap_host_command(["pkexec", "chkrootkit", "-q"]),
-            capture_output=True,
-            text=True,
-            timeout=_DEEP_SCAN_TIMEOUT,
-            env=get_clean_env(),
+        returncode, _stdout, stderr, cancelled = _stream_deep_scan(
+            ["pkexec", "chkrootkit"], on_line, is_cancelled
         )
     except subprocess.TimeoutExpired:
         section.checks.append(
@@ -1514,8 +1685,12 @@ def run_rootkit_check() -> AuditSectionResult:
         )
         return section
 
+    if cancelled:
+        section.checks.append(_cancelled_check(_("Rootkit Scan"), _URLS["chkrootkit"]))
+        return section
+
     # pkexec cancelled by user
-    if result.returncode in (126, 127):
+    if returncode in (126, 127):
         section.checks.append(
             AuditCheckResult(
                 name=_("Rootkit Scan"),
@@ -1529,11 +1704,9 @@ def run_rootkit_check() -> AuditSectionResult:
     # Abnormal termination (crash, missing helper, non-zero exit). chkrootkit
     # itself exits 0 even when it finds infections, so a non-zero code here
     # means the scan did not complete — do not infer "no rootkits".
-    if result.returncode != 0:
-        stderr = sanitize_log_line(result.stderr.strip())
-        detail = _("Rootkit scan could not be completed (exit {code})").format(
-            code=result.returncode
-        )
+    if returncode != 0:
+        stderr = sanitize_log_line(stderr.strip())
+        detail = _("Rootkit scan could not be completed (exit {code})").format(code=returncode)
         if stderr:
             detail = f"{detail}: {stderr}"
         section.checks.append(
@@ -1546,35 +1719,19 @@ def run_rootkit_check() -> AuditSectionResult:
         )
         return section
 
-    # Parse output for INFECTED lines. Use sanitize_log_text (preserves newlines)
-    # so each finding stays on its own line; sanitize_log_line collapses newlines
-    # into spaces, which would merge every INFECTED line into one and undercount
-    # the detected rootkits as a single finding.
-    output = sanitize_log_text(result.stdout)
-    infected_lines = [
-        sanitize_log_line(line.strip()) for line in output.splitlines() if "INFECTED" in line
-    ]
-
-    if infected_lines:
+    if parser.findings:
         section.checks.append(
             AuditCheckResult(
                 name=_("Rootkit Scan"),
                 status=AuditStatus.FAIL,
-                detail=_("{count} potential rootkit(s) detected").format(count=len(infected_lines)),
+                detail=_("{count} potential rootkit(s) detected").format(
+                    count=len(parser.findings)
+                ),
                 recommendation=_("Investigate the detected threats immediately"),
                 info_url=_URLS["chkrootkit"],
             )
         )
-        # Add individual findings
-        for finding in infected_lines[:5]:  # Limit to 5
-            section.checks.append(
-                AuditCheckResult(
-                    name=_("Finding"),
-                    status=AuditStatus.FAIL,
-                    detail=finding,
-                    info_url=_URLS["chkrootkit"],
-                )
-            )
+        section.checks.extend(parser.findings[:_MAX_DEEP_SCAN_FINDINGS])
     else:
         section.checks.append(
             AuditCheckResult(
@@ -1585,7 +1742,7 @@ def run_rootkit_check() -> AuditSectionResult:
             )
         )
 
-    return section
+    return _remember_deep_scan(section)
 
 
 # =============================================================================
@@ -1711,3 +1868,262 @@ TIER1_CHECKS = [
     check_ssh_hardening,
     check_portmaster,
 ]
+
+# Section metadata per check, used for placeholder results when a check times
+# out or raises. Titles match the ones each check builds.
+_CHECK_SECTIONS: dict[Callable[[], AuditSectionResult], tuple[AuditCategory, str, str]] = {
+    check_clamav_health: (
+        AuditCategory.CLAMAV_HEALTH,
+        N_("ClamAV Health"),
+        "security-high-symbolic",
+    ),
+    check_firewall: (AuditCategory.FIREWALL, N_("Firewall"), "security-medium-symbolic"),
+    check_mac_framework: (
+        AuditCategory.MAC_FRAMEWORK,
+        N_("Access Control"),
+        "system-lock-screen-symbolic",
+    ),
+    check_auto_updates: (
+        AuditCategory.AUTO_UPDATES,
+        N_("Automatic Updates"),
+        "software-update-available-symbolic",
+    ),
+    check_intrusion_detection: (
+        AuditCategory.INTRUSION_DETECTION,
+        N_("Intrusion Detection"),
+        "dialog-warning-symbolic",
+    ),
+    check_ssh_hardening: (
+        AuditCategory.SSH_HARDENING,
+        N_("SSH Security"),
+        "network-server-symbolic",
+    ),
+    check_portmaster: (AuditCategory.PORTMASTER, N_("Portmaster"), "network-vpn-symbolic"),
+}
+
+
+@dataclass(frozen=True)
+class AuditInputs:
+    """Host state a Tier 1 check reads, used to fingerprint cached results.
+
+    A cached section is reused only while the stat of every path, the entries
+    of every directory in ``dirs``, the systemd unit states and the boot id
+    are unchanged, and for at most ``max_age`` seconds.
+    """
+
+    paths: tuple[str, ...] = ()
+    dirs: tuple[str, ...] = ()
+    max_age: float = 24 * 3600
+
+
+# Installing or removing packages touches the package database
+_PACKAGE_DB_PATHS = ("/var/lib/dpkg/status", "/var/lib/rpm", "/var/lib/pacman/local")
+
+# Enabling, adding or removing units touches these directories
+_UNIT_FILE_DIRS = ("/etc/systemd/system", "/usr/lib/systemd/system", "/lib/systemd/system")
+
+# Inputs per cacheable check. Checks missing here depend on live runtime state
+# (listening ports, the Portmaster API) and always re-run.
+CHECK_INPUTS: dict[Callable[[], AuditSectionResult], AuditInputs] = {
+    check_clamav_health: AuditInputs(
+        paths=("/var/lib/clamav", "/etc/clamav", "/etc/clamd.d", *_PACKAGE_DB_PATHS),
+        dirs=("/var/lib/clamav",),
+        # The detail reports the database age in days
+        max_age=3600,
+    ),
+    check_mac_framework: AuditInputs(
+        paths=("/etc/selinux/config", *_PACKAGE_DB_PATHS),
+        dirs=("/etc/apparmor.d",),
+    ),
+    check_auto_updates: AuditInputs(
+        paths=(
+            "/var/run/reboot-required",
+            "/etc/dnf/automatic.conf",
+            *_PACKAGE_DB_PATHS,
+            *_UNIT_FILE_DIRS,
+        ),
+        dirs=("/etc/apt/apt.conf.d",),
+    ),
+    check_intrusion_detection: AuditInputs(
+        paths=("/etc/fail2ban", "/etc/crowdsec", *_PACKAGE_DB_PATHS, *_UNIT_FILE_DIRS),
+        dirs=("/etc/fail2ban/jail.d",),
+    ),
+    check_ssh_hardening: AuditInputs(
+        paths=("/etc/ssh/sshd_config", *_PACKAGE_DB_PATHS, *_UNIT_FILE_DIRS),
+        dirs=("/etc/ssh/sshd_config.d",),
+    ),
+}
+
+# Worker threads for concurrent checks; checks mostly wait on subprocesses
+AUDIT_MAX_WORKERS = 4
+
+# Seconds a single check may run before it is reported as timed out. Each
+# subprocess already has its own _SUBPROCESS_TIMEOUT; a check runs several.
+AUDIT_CHECK_TIMEOUT = 30.0
+
+# Longest wait between cancellation/deadline checks in the runner loop
+_POLL_INTERVAL = 0.25
+
+
+def _placeholder_section(
+    check_func: Callable[[], AuditSectionResult], detail: str
+) -> AuditSectionResult | None:
+    """Build an UNKNOWN section for a check that timed out or failed."""
+    meta = _CHECK_SECTIONS.get(check_func)
+    if meta is None:
+        return None
+    category, title, icon_name = meta
+    return AuditSectionResult(
+        category=category,
+        title=_(title),
+        icon_name=icon_name,
+        checks=[AuditCheckResult(name=_(title), status=AuditStatus.UNKNOWN, detail=detail)],
+    )
+
+
+def iter_tier1_audit(
+    checks: Iterable[Callable[[], AuditSectionResult]] | None = None,
+    max_workers: int = AUDIT_MAX_WORKERS,
+    check_timeout: float = AUDIT_CHECK_TIMEOUT,
+    should_cancel: Callable[[], bool] | None = None,
+) -> Iterator[AuditSectionResult]:
+    """Run audit checks concurrently and yield each section as it completes.
+
+    Checks run on a bounded thread pool and share one _CommandMemo, so a
+    command several checks need (``which apt``, the systemd unit snapshot)
+    runs once. Total time is roughly that of the slowest check rather than
+    the sum of all checks.
+
+    A check still running after ``check_timeout`` seconds, or one that
+    raises, yields an UNKNOWN placeholder section for its category. Its
+    thread is abandoned rather than interrupted; every subprocess it runs
+    has its own timeout.
+
+    Args:
+        checks: Check functions to run; defaults to TIER1_CHECKS
+        max_workers: Maximum number of checks running at once
+        check_timeout: Per-check deadline in seconds, measured from its start
+        should_cancel: Polled while waiting; returning True stops the run
+            without yielding further results
+
+    Yields:
+        AuditSectionResult for each check, in completion order
+    """
+    check_list = list(TIER1_CHECKS if checks is None else checks)
+    if not check_list:
+        return
+
+    memo = _CommandMemo()
+    # Start time of each check by index; queued checks have no deadline yet
+    started: dict[int, float] = {}
+
+    def run_check(index: int, check_func: Callable[[], AuditSectionResult]):
+        started[index] = time.monotonic()
+        token = _command_memo.set(memo)
+        try:
+            return check_func()
+        finally:
+            _command_memo.reset(token)
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(check_list))),
+        thread_name_prefix="clamui-audit",
+    )
+    pending: dict[Future, int] = {
+        executor.submit(run_check, index, check_func): index
+        for index, check_func in enumerate(check_list)
+    }
+    try:
+        while pending:
+            if should_cancel is not None and should_cancel():
+                return
+
+            now = time.monotonic()
+            deadlines = [started[i] + check_timeout for i in list(pending.values()) if i in started]
+            timeout = _POLL_INTERVAL
+            if deadlines:
+                timeout = min(timeout, max(0.0, min(deadlines) - now))
+            done, _not_done = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                check_func = check_list[pending.pop(future)]
+                try:
+                    yield future.result()
+                except Exception as e:
+                    logger.exception("Audit check failed: %s", check_func.__name__)
+                    placeholder = _placeholder_section(
+                        check_func,
+                        _("Check failed: {error}").format(error=sanitize_log_line(str(e))),
+                    )
+                    if placeholder is not None:
+                        yield placeholder
+
+            now = time.monotonic()
+            expired = [
+                future
+                for future, i in pending.items()
+                if i in started and now - started[i] >= check_timeout
+            ]
+            for future in expired:
+                check_func = check_list[pending.pop(future)]
+                logger.warning(
+                    "Audit check %s exceeded %.0fs, reporting as unknown",
+                    check_func.__name__,
+                    check_timeout,
+                )
+                placeholder = _placeholder_section(
+                    check_func,
+                    _("Check did not finish within {seconds} seconds").format(
+                        seconds=int(check_timeout)
+                    ),
+                )
+                if placeholder is not None:
+                    yield placeholder
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_tier1_audit(
+    checks: Iterable[Callable[[], AuditSectionResult]] | None = None,
+    max_workers: int = AUDIT_MAX_WORKERS,
+    check_timeout: float = AUDIT_CHECK_TIMEOUT,
+    on_result: Callable[[AuditSectionResult], None] | None = None,
+) -> AuditReport:
+    """Run audit checks concurrently and collect them into a report.
+
+    Args:
+        checks: Check functions to run; defaults to TIER1_CHECKS
+        max_workers: Maximum number of checks running at once
+        check_timeout: Per-check deadline in seconds
+        on_result: Called with each section as it completes
+
+    Returns:
+        AuditReport with sections in check order
+    """
+    check_list = list(TIER1_CHECKS if checks is None else checks)
+    report = AuditReport(timestamp=time.time())
+    for section in iter_tier1_audit(check_list, max_workers, check_timeout):
+        report.sections.append(section)
+        if on_result is not None:
+            on_result(section)
+
+    sort_report_sections(report, check_list)
+    return report
+
+
+def check_category(check_func: Callable[[], AuditSectionResult]) -> AuditCategory | None:
+    """Return the section category a Tier 1 check produces, or None if unknown."""
+    meta = _CHECK_SECTIONS.get(check_func)
+    return meta[0] if meta is not None else None
+
+
+def sort_report_sections(
+    report: AuditReport, checks: Iterable[Callable[[], AuditSectionResult]]
+) -> None:
+    """Sort a report's sections into the order of the checks that produced them."""
+    order = {
+        category: index
+        for index, check_func in enumerate(checks)
+        if (category := check_category(check_func)) is not None
+    }
+    report.sections.sort(key=lambda s: order.get(s.category, len(order)))
@@ -18,19 +18,40 @@ from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 
-from gi.repository import GLib
-
+from .clamd_reload import ClamdReloadResult, reload_clamd
+from .database_inventory import get_database_inventory
+from .db_snapshot import (
+    LAST_KNOWN_GOOD_DIRNAME,
+    clone_file,
+    iter_database_files,
+    replace_from_snapshot,
+    snapshot_matches,
+)
 from .flatpak import (
     get_clamav_database_dir,
+    host_path_exists,
     is_flatpak,
     which_host_command,
 )
+from .freshclam_progress import (
+    COOLDOWN_UNTIL_RE,
+    RATE_LIMIT_PATTERNS,
+    DatabaseProgress,
+    DatabaseStats,
+    FreshclamProgressParser,
+    format_database_stats,
+    is_rate_limit_line,
+    is_transfer_line,
+)
 from .i18n import _
 from .log_manager import LogEntry, LogManager
+from .main_loop import idle_add
 from .utils import (
+    check_clamd_connection,
     check_freshclam_installed,
     get_clean_env,
     get_freshclam_path,
+    invalidate_clamav_probes,
     systemd_unit_exists,
     wrap_host_command,
 )
@@ -41,17 +62,8 @@ logger = logging.getLogger(__name__)
 _TERMINATE_GRACE_TIMEOUT = 5  # Time to wait after SIGTERM before SIGKILL
 _KILL_WAIT_TIMEOUT = 2  # Time to wait after SIGKILL
 _UPDATE_COMMUNICATE_TIMEOUT = 600  # 10 minutes for freshclam (network operations)
+_DAILY_UPDATED_RE = re.compile(r"\bdaily\.c[lv]d updated \(version: (\d+)", re.IGNORECASE)
 _DATABASE_FILE_RE = re.compile(r"\b([A-Za-z0-9_.-]+\.(?:cvd|cld|cud))\b", re.IGNORECASE)
-_COOLDOWN_UNTIL_RE = re.compile(r"cool[- ]down until after:\s*(.+)$", re.IGNORECASE)
-_RATE_LIMIT_PATTERNS = (
-    "rate limit",
-    "rate-limit",
-    "rate limited",
-    "429",
-    "too many requests",
-    "temporarily blocked",
-    "blocked temporarily",
-)
 
 
 def _build_force_update_script(database_dir: str = "/var/lib/clamav") -> str:
@@ -62,6 +74,12 @@ def _build_force_update_script(database_dir: str = "/var/lib/clamav") -> str:
     download containing at least one database file is promoted.  The script
     keeps freshclam as positional ``$1`` data rather than interpolating its
     path into shell source.
+
+    The live set is snapshotted with hard links (reflink or copy as fallback)
+    rather than copied, and after a successful promotion the replaced
+    generation is kept in ``LAST_KNOWN_GOOD_DIRNAME`` for rollback_sync().
+    clamd is not reloaded here; FreshclamUpdater does that afterwards so
+    daemon scans are held during the reload.
     """
     quoted_database_dir = shlex.quote(database_dir)
     return (
@@ -72,7 +90,9 @@ def _build_force_update_script(database_dir: str = "/var/lib/clamav") -> str:
 staging=
 staged_manifest=
 original_manifest=
+snapshot_manifest=
 backup=
+last_good="$d/.clamui-last-good"
 promoting=0
 freshclam_pid=
 
@@ -143,8 +163,8 @@ chown "$dir_owner:$dir_group" "$staging" || exit 1
 
 # Keep every live database name in place while freshclam is blocked or
 # downloading.  Freshclam may notify clamd while staging according to its
-# configuration; the explicit reload after promotion below ensures daemon
-# scans observe the promoted generation.
+# configuration; ClamUI reloads clamd once this script has promoted the new
+# generation, so daemon scans observe it.
 # Preserve the caller's stdin explicitly: POSIX shells otherwise connect
 # asynchronous commands to /dev/null.
 exec 3<&0
@@ -170,16 +190,27 @@ done
 # sees an otherwise empty staging datadir.
 backup="$staging/.original"
 original_manifest="$staging/.originals"
+snapshot_manifest="$staging/.snapshot"
 staged_manifest="$staging/.staged"
 mkdir -- "$backup" || exit 1
 
-# Back up the complete live database set.  Force semantics remove old-only
+# Snapshot the complete live database set.  Force semantics remove old-only
 # names after successful promotion; rollback restores every original name.
+# Promotion replaces live names with rename(2), so a hard link keeps the old
+# generation without copying any data.  Filesystems without hard links get a
+# reflink where supported, else a copy.  A snapshot whose size differs from
+# its source cannot be used for rollback, so the update stops there.
 for f in "$d"/*.cvd "$d"/*.cld "$d"/*.cud; do
     [ -f "$f" ] || continue
     name=${f##*/}
-    cp -p -- "$f" "$backup/$name" || exit 1
+    ln -- "$f" "$backup/$name" 2>/dev/null \
+        || cp --reflink=auto -p -- "$f" "$backup/$name" 2>/dev/null \
+        || cp -p -- "$f" "$backup/$name" \
+        || exit 1
+    size=$(stat -c '%s' "$f") || exit 1
+    [ "$(stat -c '%s' "$backup/$name")" = "$size" ] || exit 1
     printf '%s\n' "$name" >> "$original_manifest" || exit 1
+    printf '%s %s\n' "$size" "$name" >> "$snapshot_manifest" || exit 1
 done
 
 # Record every staged name so rollback can remove newly introduced files.
@@ -214,21 +245,111 @@ for f in "$d"/*.cvd "$d"/*.cld "$d"/*.cud; do
     fi
 done
 promoting=0
-# Notify a running clamd only after the complete promoted generation is live.
-# The daemon is optional, and an unavailable daemon must not undo a successful
-# database promotion.  Track the best-effort child so cancellation still
-# reaches it if a daemon command hangs.
-if command -v clamdscan >/dev/null 2>&1; then
-    clamdscan --reload </dev/null >/dev/null 2>&1 &
-    freshclam_pid=$!
-    wait "$freshclam_pid" || :
-    freshclam_pid=
+
+# Keep the replaced generation as the last-known-good set for an instant
+# rollback (see _build_rollback_script).  Its files are the snapshot links, so
+# this costs the disk space of the replaced files but no I/O.  Best effort: a
+# failure here must not undo the promoted update.
+if [ -f "$snapshot_manifest" ] && mv -f -- "$snapshot_manifest" "$backup/.manifest"; then
+    rm -rf -- "$last_good.old" || :
+    if [ -e "$last_good" ]; then
+        mv -- "$last_good" "$last_good.old" || :
+    fi
+    if [ ! -e "$last_good" ] && mv -- "$backup" "$last_good"; then
+        rm -rf -- "$last_good.old" || :
+    fi
 fi
 exit 0
 """
     )
 
 
+# Exit codes of the rollback script besides 0 (success) and 1 (I/O failure)
+_ROLLBACK_NO_SNAPSHOT = 3
+_ROLLBACK_DAMAGED_SNAPSHOT = 4
+
+
+def _build_rollback_script(database_dir: str = "/var/lib/clamav") -> str:
+    """Build the shell script that restores the last-known-good database set.
+
+    A successful forced update keeps the generation it replaced in
+    ``LAST_KNOWN_GOOD_DIRNAME`` with a ``.manifest`` of sizes and names.
+    Each file is linked (or copied) next to its live name and renamed over it,
+    so every name switches atomically and the set stays available for
+    another rollback.  Names the set does not contain are removed afterwards.
+    """
+    quoted_database_dir = shlex.quote(database_dir)
+    return (
+        "d="
+        + quoted_database_dir
+        + r"""
+last_good="$d/.clamui-last-good"
+manifest="$last_good/.manifest"
+work=
+
+cleanup() {
+    rc=$?
+    trap '' HUP INT QUIT TERM
+    trap - 0
+    if [ -n "$work" ] && [ -d "$work" ]; then
+        rm -rf -- "$work" || :
+    fi
+    exit "$rc"
+}
+trap cleanup 0
+trap 'exit 129' HUP
+trap 'exit 130' INT
+trap 'exit 131' QUIT
+trap 'exit 143' TERM
+
+[ -d "$d" ] || exit 1
+[ -s "$manifest" ] || exit """
+        + str(_ROLLBACK_NO_SNAPSHOT)
+        + r"""
+
+# Verify the whole set by size before touching the live directory.
+while IFS=' ' read -r size name; do
+    [ -n "$name" ] || continue
+    [ -f "$last_good/$name" ] || exit """
+        + str(_ROLLBACK_DAMAGED_SNAPSHOT)
+        + r"""
+    [ "$(stat -c '%s' "$last_good/$name")" = "$size" ] || exit """
+        + str(_ROLLBACK_DAMAGED_SNAPSHOT)
+        + r"""
+done < "$manifest"
+
+work=$(mktemp -d "$d/.clamui-rollback.XXXXXX") || exit 1
+while IFS=' ' read -r size name; do
+    [ -n "$name" ] || continue
+    ln -- "$last_good/$name" "$work/$name" 2>/dev/null \
+        || cp -p -- "$last_good/$name" "$work/$name" \
+        || exit 1
+done < "$manifest"
+
+restored=0
+while IFS=' ' read -r size name; do
+    [ -n "$name" ] || continue
+    mv -f -- "$work/$name" "$d/$name" || exit 1
+    restored=$((restored + 1))
+done < "$manifest"
+for f in "$d"/*.cvd "$d"/*.cld "$d"/*.cud; do
+    [ -f "$f" ] || continue
+    name=${f##*/}
+    keep=0
+    while IFS=' ' read -r size kept_name; do
+        if [ "$kept_name" = "$name" ]; then
+            keep=1
+            break
+        fi
+    done < "$manifest"
+    [ "$keep" -eq 1 ] || rm -f -- "$f" || exit 1
+done
+printf 'Restored %s database file(s)\n' "$restored"
+exit 0
+"""
+    )
+
+
 def get_pkexec_path() -> str | None:
     """
     Get the full path to the pkexec executable for privilege elevation.
@@ -279,6 +400,8 @@ class UpdateResult:
     updated_databases: list[str] = field(default_factory=list)
     up_to_date_databases: list[str] = field(default_factory=list)
     rate_limited_databases: dict[str, str | None] = field(default_factory=dict)
+    database_stats: list[DatabaseStats] = field(default_factory=list)
+    clamd_reload: ClamdReloadResult | None = None
 
     @property
     def is_success(self) -> bool:
@@ -567,6 +690,8 @@ class FreshclamUpdater:
         duration = time.monotonic() - start_time
         self._save_update_log(result, duration)
         self._cleanup_backup()
+        # Database files may have changed (Flatpak can't watch host paths)
+        invalidate_clamav_probes("database")
         return result
 
     def _check_availability_result(self) -> UpdateResult | None:
@@ -643,15 +768,6 @@ class FreshclamUpdater:
             ).format(pid=running_pid),
         )
 
-    @staticmethod
-    def _decode_timeout_stream(stream: bytes | str | None) -> str:
-        """Normalize TimeoutExpired stdout/stderr values to text."""
-        if not stream:
-            return ""
-        if isinstance(stream, str):
-            return stream
-        return stream.decode("utf-8", errors="replace")
-
     @staticmethod
     def _process_group_exists(pid: int | None) -> bool:
         """Return whether a POSIX process group still has any members."""
@@ -725,22 +841,36 @@ class FreshclamUpdater:
             return None
         return False
 
-    def _collect_timeout_output(
-        self,
-        process: subprocess.Popen,
-        timeout_error: subprocess.TimeoutExpired,
-    ) -> tuple[str, str]:
-        """Collect partial subprocess output after a communicate timeout."""
-        partial_stdout = self._decode_timeout_stream(timeout_error.stdout)
-        partial_stderr = self._decode_timeout_stream(timeout_error.stderr)
+    @staticmethod
+    def _read_stream(
+        stream,
+        lines: list[str],
+        on_line: Callable[[str], None] | None,
+        line_lock: threading.Lock,
+    ) -> None:
+        """
+        Collect one output stream line by line, forwarding lines to on_line.
 
+        Text-mode pipes translate the carriage returns freshclam redraws its
+        progress bar with into newlines, so every redraw arrives as a line.
+        Only the latest redraw of a bar is kept in the collected output.
+        """
         try:
-            remaining_stdout, remaining_stderr = process.communicate(timeout=_KILL_WAIT_TIMEOUT)
-            return partial_stdout + (remaining_stdout or ""), partial_stderr + (
-                remaining_stderr or ""
-            )
-        except subprocess.TimeoutExpired:
-            return partial_stdout, partial_stderr
+            for raw_line in stream:
+                line = raw_line.rstrip("\n")
+                with line_lock:
+                    if lines and is_transfer_line(line) and is_transfer_line(lines[-1]):
+                        lines[-1] = line
+                    else:
+                        lines.append(line)
+                    if on_line is not None:
+                        try:
+                            on_line(line)
+                        except Exception:
+                            logger.exception("Update output callback failed")
+        except (OSError, ValueError):
+            # Pipe closed underneath us during forced cleanup
+            logger.debug("Stopped reading update output", exc_info=True)
 
     def _cleanup_current_process(self) -> None:
         """Clear the active process handle and ensure the process is no longer running."""
@@ -756,8 +886,18 @@ class FreshclamUpdater:
         except (OSError, ProcessLookupError, subprocess.TimeoutExpired):
             logger.debug("Failed to forcefully terminate update process", exc_info=True)
 
-    def _run_update_process(self, cmd: list[str]) -> tuple[str, str, int, bool]:
-        """Execute the freshclam subprocess and return its output and timeout state."""
+    def _run_update_process(
+        self,
+        cmd: list[str],
+        on_line: Callable[[str], None] | None = None,
+    ) -> tuple[str, str, int, bool]:
+        """
+        Execute the freshclam subprocess and return its output and timeout state.
+
+        stdout and stderr are read by two threads while the process runs;
+        on_line receives every line from either stream, in arrival order and
+        from one thread at a time.
+        """
         self._update_cancelled = False
         with self._process_lock:
             popen_kwargs = {
@@ -772,14 +912,29 @@ class FreshclamUpdater:
             self._current_process = process
 
         timed_out = False
-        stdout = ""
-        stderr = ""
         exit_code = -1
+        stdout_lines: list[str] = []
+        stderr_lines: list[str] = []
+        line_lock = threading.Lock()
+        readers = [
+            (
+                stream,
+                threading.Thread(
+                    target=self._read_stream,
+                    args=(stream, lines, on_line, line_lock),
+                    daemon=True,
+                ),
+            )
+            for stream, lines in ((process.stdout, stdout_lines), (process.stderr, stderr_lines))
+            if stream is not None
+        ]
+        for _stream, reader in readers:
+            reader.start()
 
         try:
-            stdout, stderr = process.communicate(timeout=_UPDATE_COMMUNICATE_TIMEOUT)
+            process.wait(timeout=_UPDATE_COMMUNICATE_TIMEOUT)
             exit_code = process.returncode
-        except subprocess.TimeoutExpired as e:
+        except subprocess.TimeoutExpired:
             logger.warning("Update process timed out, requesting graceful shutdown")
             timed_out = True
             terminate_mode = self._signal_process_group(
@@ -820,22 +975,113 @@ class FreshclamUpdater:
                         "Update process disappeared during graceful timeout cleanup",
                         exc_info=True,
                     )
-            stdout, stderr = self._collect_timeout_output(process, e)
         finally:
             self._cleanup_current_process()
-
+            # A descendant that escaped the kill can hold the pipes open;
+            # return what was read rather than wait on it
+            for stream, reader in readers:
+                reader.join(timeout=_KILL_WAIT_TIMEOUT)
+                if not reader.is_alive():
+                    stream.close()
+
+        with line_lock:
+            stdout = "\n".join(stdout_lines)
+            stderr = "\n".join(stderr_lines)
         return stdout, stderr, exit_code, timed_out
 
-    def _run_manual_update(self, *, force: bool, start_time: float) -> UpdateResult:
+    def has_last_known_good(self) -> bool:
+        """Check whether a last-known-good database set is available for rollback."""
+        manifest = Path("/var/lib/clamav") / LAST_KNOWN_GOOD_DIRNAME / ".manifest"
+        if is_flatpak():
+            return host_path_exists(manifest)
+        return manifest.is_file()
+
+    def _build_rollback_command(self) -> list[str]:
+        """Build the privileged command that restores the last-known-good set."""
+        cmd = ["sh", "-c", _build_rollback_script(), "clamui-rollback"]
+        pkexec = get_pkexec_path()
+        if pkexec:
+            cmd.insert(0, pkexec)
+        return wrap_host_command(cmd)
+
+    def rollback_sync(self) -> UpdateResult:
+        """
+        Restore the database set replaced by the last successful forced update.
+
+        The set is kept as hard links next to the live database, so this
+        is a handful of renames rather than a re-download or a copy.
+
+        WARNING: This will block the calling thread.
+
+        Returns:
+            UpdateResult; databases_updated is the number of restored files
+        """
+        start_time = time.monotonic()
+        try:
+            stdout, stderr, exit_code, timed_out = self._run_update_process(
+                self._build_rollback_command()
+            )
+        except OSError as e:
+            return self._finish_update(
+                self._create_result(
+                    UpdateStatus.ERROR,
+                    stderr=str(e),
+                    error_message=_("Rollback failed: {error}").format(error=e),
+                ),
+                start_time,
+            )
+
+        if self._update_cancelled:
+            status, error_message = UpdateStatus.CANCELLED, _("Rollback cancelled by user")
+        elif timed_out:
+            status, error_message = UpdateStatus.ERROR, _("Rollback timed out")
+        elif exit_code == 0:
+            status, error_message = UpdateStatus.SUCCESS, None
+        elif exit_code == _ROLLBACK_NO_SNAPSHOT:
+            status = UpdateStatus.ERROR
+            error_message = _("No previous database set is available to roll back to")
+        elif exit_code == _ROLLBACK_DAMAGED_SNAPSHOT:
+            status = UpdateStatus.ERROR
+            error_message = _("The previous database set is incomplete and was not restored")
+        else:
+            status = UpdateStatus.ERROR
+            error_message = _("Rollback failed (exit code {code})").format(code=exit_code)
+
+        match = re.search(r"Restored (\d+) database file", stdout)
+        result = self._create_result(
+            status,
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=exit_code,
+            databases_updated=int(match.group(1)) if match else 0,
+            error_message=error_message,
+        )
+        if status == UpdateStatus.SUCCESS:
+            result.clamd_reload = self._reload_clamd("")
+        return self._finish_update(result, start_time)
+
+    def _run_manual_update(
+        self,
+        *,
+        force: bool,
+        start_time: float,
+        progress_callback: Callable[[DatabaseProgress], None] | None = None,
+    ) -> UpdateResult:
         """Execute the manual freshclam path once preconditions have passed."""
         running_result = self._get_running_instance_result()
         if running_result is not None:
             return self._finish_update(running_result, start_time)
 
         cmd = self._build_command(force=force)
+        parser = FreshclamProgressParser()
+
+        def on_line(line: str) -> None:
+            for event in parser.feed(line):
+                if progress_callback is not None:
+                    progress_callback(event)
 
         try:
-            stdout, stderr, exit_code, timed_out = self._run_update_process(cmd)
+            stdout, stderr, exit_code, timed_out = self._run_update_process(cmd, on_line)
         except FileNotFoundError:
             return self._finish_update(
                 self._create_result(
@@ -865,33 +1111,67 @@ class FreshclamUpdater:
             )
 
         if timed_out and not self._update_cancelled:
-            return self._finish_update(
-                self._create_result(
-                    UpdateStatus.ERROR,
-                    stdout=stdout,
-                    stderr=stderr,
-                    error_message=_("Update timed out after 10 minutes"),
-                ),
-                start_time,
+            result = self._create_result(
+                UpdateStatus.ERROR,
+                stdout=stdout,
+                stderr=stderr,
+                error_message=_("Update timed out after 10 minutes"),
             )
-
-        if self._update_cancelled:
-            return self._finish_update(
-                self._create_result(
-                    UpdateStatus.CANCELLED,
-                    stdout=stdout,
-                    stderr=stderr,
-                    exit_code=exit_code,
-                    error_message=_("Update cancelled by user"),
-                ),
-                start_time,
+        elif self._update_cancelled:
+            result = self._create_result(
+                UpdateStatus.CANCELLED,
+                stdout=stdout,
+                stderr=stderr,
+                exit_code=exit_code,
+                error_message=_("Update cancelled by user"),
             )
+        else:
+            result = self._parse_results(stdout, stderr, exit_code)
+            if result.status == UpdateStatus.SUCCESS:
+                result.clamd_reload = self._reload_clamd(stdout)
 
-        result = self._parse_results(stdout, stderr, exit_code)
-
+        result.database_stats = parser.finish()
         return self._finish_update(result, start_time)
 
-    def update_sync(self, force: bool = False, prefer_service: bool = True) -> UpdateResult:
+    def _reload_clamd(self, stdout: str) -> ClamdReloadResult | None:
+        """
+        Make a running clamd pick up freshly installed databases.
+
+        Without this, clamd keeps the old signatures until its SelfCheck
+        interval comes round. Daemon scans are held while it reloads.
+
+        Returns:
+            The reload outcome, or None if clamd is not in use
+        """
+        is_connected, _message = check_clamd_connection()
+        if not is_connected:
+            return None
+        match = _DAILY_UPDATED_RE.search(stdout)
+        reload = reload_clamd(
+            expected_daily=int(match.group(1)) if match else self._installed_daily_version()
+        )
+        if reload.reloaded:
+            logger.info("clamd reloaded in %.1fs (daily %s)", reload.latency, reload.daily_version)
+        else:
+            logger.warning("clamd reload not confirmed: %s", reload.error)
+        return reload
+
+    @staticmethod
+    def _installed_daily_version() -> int | None:
+        """Read the daily version now on disk, for updates that did not log it."""
+        try:
+            daily = get_database_inventory().get(refresh=True).find("daily")
+        except Exception:
+            logger.debug("Cannot read the installed daily version", exc_info=True)
+            return None
+        return daily.version if daily is not None else None
+
+    def update_sync(
+        self,
+        force: bool = False,
+        prefer_service: bool = True,
+        progress_callback: Callable[[DatabaseProgress], None] | None = None,
+    ) -> UpdateResult:
         """
         Execute a synchronous database update.
 
@@ -907,6 +1187,9 @@ class FreshclamUpdater:
                            freshclam systemd service using SIGUSR1 when available.
                            Falls back to manual method if service not running.
                            Force updates always use manual method.
+            progress_callback: Optional callback receiving a DatabaseProgress
+                               event per database step of a manual update.
+                               Called from the thread running update_sync().
 
         Returns:
             UpdateResult with update details
@@ -921,13 +1204,16 @@ class FreshclamUpdater:
         if service_result is not None:
             return self._finish_update(service_result, start_time)
 
-        return self._run_manual_update(force=force, start_time=start_time)
+        return self._run_manual_update(
+            force=force, start_time=start_time, progress_callback=progress_callback
+        )
 
     def update_async(
         self,
         callback: Callable[[UpdateResult], None],
         force: bool = False,
         prefer_service: bool = True,
+        progress_callback: Callable[[DatabaseProgress], None] | None = None,
     ) -> None:
         """
         Execute an asynchronous database update.
@@ -944,12 +1230,21 @@ class FreshclamUpdater:
             prefer_service: If True (default), attempt to trigger update via
                            freshclam systemd service using SIGUSR1 when available.
                            Force updates always use manual method.
+            progress_callback: Optional function receiving DatabaseProgress
+                               events, invoked on the main GTK thread
         """
 
+        def on_progress(event: DatabaseProgress) -> None:
+            idle_add(progress_callback, event)
+
         def update_thread():
-            result = self.update_sync(force=force, prefer_service=prefer_service)
+            result = self.update_sync(
+                force=force,
+                prefer_service=prefer_service,
+                progress_callback=on_progress if progress_callback is not None else None,
+            )
             # Schedule callback on main thread
-            GLib.idle_add(callback, result)
+            idle_add(callback, result)
 
         thread = threading.Thread(target=update_thread)
         thread.daemon = True
@@ -1186,7 +1481,7 @@ class FreshclamUpdater:
                     current_database_context = None
                 continue
 
-            cooldown_match = _COOLDOWN_UNTIL_RE.search(line)
+            cooldown_match = COOLDOWN_UNTIL_RE.search(line)
             if cooldown_match:
                 pending_rate_limit = True
                 pending_cooldown_until = cooldown_match.group(1).strip()
@@ -1196,11 +1491,7 @@ class FreshclamUpdater:
                     parsed.rate_limited_databases[target_database] = pending_cooldown_until
                 continue
 
-            rate_limit_detected = any(pattern in line_lower for pattern in _RATE_LIMIT_PATTERNS)
-            if "cloudfront" in line_lower or "cloudflare" in line_lower:
-                rate_limit_detected = True
-
-            if rate_limit_detected:
+            if is_rate_limit_line(line_lower):
                 pending_rate_limit = True
                 target_database = database or current_database_context
                 if target_database:
@@ -1302,7 +1593,7 @@ class FreshclamUpdater:
             return _("Update rate limited for: {details}.").format(details=details)
 
         # Rate limiting errors
-        if any(pattern in output_lower for pattern in _RATE_LIMIT_PATTERNS):
+        if any(pattern in output_lower for pattern in RATE_LIMIT_PATTERNS):
             return _("Update rate limited by mirror. Please wait a few minutes and try again.")
 
         # CDN/Proxy errors (often indicate rate limiting)
@@ -1380,6 +1671,17 @@ class FreshclamUpdater:
             details_parts.append(result.stdout)
         if result.stderr:
             details_parts.append(f"--- Errors ---\n{result.stderr}")
+        if result.database_stats:
+            details_parts.append(
+                f"--- Databases ---\n{format_database_stats(result.database_stats)}"
+            )
+        if result.clamd_reload is not None:
+            reload = result.clamd_reload
+            if reload.reloaded:
+                reload_text = f"Reloaded in {reload.latency:.1f}s (daily {reload.daily_version})"
+            else:
+                reload_text = f"Reload not confirmed after {reload.latency:.1f}s: {reload.error}"
+            details_parts.append(f"--- clamd ---\n{reload_text}")
         details = "\n".join(details_parts) if details_parts else "(No output)"
 
         # Create and save log entry
@@ -1396,7 +1698,11 @@ class FreshclamUpdater:
 
     def _backup_local_databases(self) -> tuple[bool, str | None, list[Path]]:
         """
-        Backup local ClamAV database files to a temporary directory.
+        Snapshot local ClamAV database files before a forced update.
+
+        Files are hard-linked where possible, reflinked or copied otherwise
+        (see db_snapshot.clone_file), and each snapshot is verified by inode
+        or by size and header.
 
         Returns:
             Tuple of (success, error_message, list_of_backed_files)
@@ -1412,31 +1718,41 @@ class FreshclamUpdater:
         if not db_dir.exists():
             return False, "Database directory not found", []
 
-        # Create backup directory with timestamp
-        backup_dir = Path(tempfile.mkdtemp(prefix="clamav_backup_"))
+        # The snapshot lives inside the database directory so hard links
+        # (same filesystem) are possible; the leading dot keeps it out of
+        # the *.cvd globs used by freshclam and clamd.
+        try:
+            backup_dir = Path(tempfile.mkdtemp(prefix=".clamui-snapshot-", dir=db_dir))
+        except OSError as e:
+            return False, f"Failed to create backup directory: {e}", []
         self._force_update_backup_dir = backup_dir
 
-        # Common ClamAV database files
-        db_patterns = ["*.cvd", "*.cld", "*.cud"]
         backed_up = []
-
-        for pattern in db_patterns:
-            for db_file in db_dir.glob(pattern):
-                try:
-                    backup_path = backup_dir / db_file.name
-                    shutil.copy2(db_file, backup_path)
-                    backed_up.append(backup_path)
-                    logger.debug("Backed up database file: %s", db_file.name)
-                except OSError as e:
-                    # Cleanup on failure
-                    shutil.rmtree(backup_dir, ignore_errors=True)
-                    return False, f"Failed to backup {db_file.name}: {e}", []
+        methods: dict[str, int] = {}
+        for db_file in iter_database_files(db_dir):
+            backup_path = backup_dir / db_file.name
+            try:
+                method = clone_file(db_file, backup_path)
+            except OSError as e:
+                self._cleanup_backup()
+                return False, f"Failed to backup {db_file.name}: {e}", []
+            if not snapshot_matches(db_file, backup_path):
+                self._cleanup_backup()
+                return False, f"Backup of {db_file.name} could not be verified", []
+            backed_up.append(backup_path)
+            methods[method] = methods.get(method, 0) + 1
+            logger.debug("Backed up database file %s (%s)", db_file.name, method)
 
         if not backed_up:
-            shutil.rmtree(backup_dir, ignore_errors=True)
+            self._cleanup_backup()
             return False, "No database files found to backup", []
 
-        logger.info("Backed up %d database file(s) to %s", len(backed_up), backup_dir)
+        logger.info(
+            "Backed up %d database file(s) to %s (%s)",
+            len(backed_up),
+            backup_dir,
+            ", ".join(f"{count} {method}" for method, count in sorted(methods.items())),
+        )
         return True, None, backed_up
 
     def _restore_databases_from_backup(self) -> tuple[bool, str | None]:
@@ -1461,13 +1777,14 @@ class FreshclamUpdater:
         if not db_dir.exists():
             return False, "Database directory not found"
 
+        # Each name is swapped in with rename(2), so a reader never sees a
+        # missing or half-written database file.
         restored_count = 0
-        for backup_file in backup_dir.glob("*"):
+        for backup_file in iter_database_files(backup_dir):
             try:
-                target_path = db_dir / backup_file.name
-                shutil.copy2(backup_file, target_path)
+                method = replace_from_snapshot(backup_file, db_dir / backup_file.name)
                 restored_count += 1
-                logger.debug("Restored database file: %s", backup_file.name)
+                logger.debug("Restored database file %s (%s)", backup_file.name, method)
             except OSError as e:
                 return False, f"Failed to restore {backup_file.name}: {e}"
 
@@ -28,6 +28,8 @@ from .clamav_detection import (
     get_clamav_path,
     get_clamd_socket_path,
     get_freshclam_path,
+    invalidate_clamav_probes,
+    refresh_clamav_probes,
     resolve_clamd_conf_path,
     resolve_freshclam_conf_path,
     systemd_unit_exists,
@@ -43,7 +45,9 @@ from .flatpak import (
     get_clamav_database_dir,
     get_clean_env,
     get_freshclam_config_path,
+    host_path_exists,
     is_flatpak,
+    run_host_command,
     which_host_command,
     wrap_host_command,
 )
@@ -87,9 +91,13 @@ __all__ = [
     "get_freshclam_config_path",
     "get_freshclam_path",
     "get_path_info",
+    "host_path_exists",
+    "invalidate_clamav_probes",
     "is_flatpak",
+    "refresh_clamav_probes",
     "resolve_clamd_conf_path",
     "resolve_freshclam_conf_path",
+    "run_host_command",
     "systemd_unit_exists",
     "validate_dropped_files",
     "validate_path",
@@ -8,12 +8,12 @@ the VirusTotal API. It supports:
 - File upload for unknown files
 - Rate limiting (4 requests/minute for free tier)
 - Exponential backoff for retries
+- Optional persistent verdict cache (see virustotal_cache.VTVerdictCache)
 - Async scanning using threading + GLib.idle_add pattern
 """
 
 from __future__ import annotations
 
-import hashlib
 import logging
 import os
 import threading
@@ -22,13 +22,19 @@ from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import certifi
 import requests
 
+from .hashing import get_hashing_service
 from .i18n import _
 
+if TYPE_CHECKING:
+    from .virustotal_async import AsyncVirusTotalEngine
+    from .virustotal_batch import VirusTotalScheduler
+    from .virustotal_cache import VTVerdictCache
+
 logger = logging.getLogger(__name__)
 
 # VirusTotal API configuration
@@ -43,6 +49,23 @@ VT_MAX_RETRIES = 3
 VT_RETRY_BASE_DELAY = 2  # seconds
 
 
+class _RequestWindow:
+    """
+    Sliding window of request timestamps shared by every client.
+
+    VirusTotal counts the quota per API key and ClamUI uses a single key, so
+    clients created by different dialogs must share one window to stay
+    within it.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.times: list[float] = []
+
+
+_request_window = _RequestWindow()
+
+
 class VTScanStatus(Enum):
     """Status of a VirusTotal scan operation."""
 
@@ -78,6 +101,12 @@ class VTScanResult:
     permalink: str | None = None
     error_message: str | None = None
     duration: float = 0.0
+    cached_at: str | None = None  # ISO time the verdict was fetched, if served from cache
+
+    @property
+    def from_cache(self) -> bool:
+        """Check if this result was served from the local verdict cache."""
+        return self.cached_at is not None
 
     @property
     def is_clean(self) -> bool:
@@ -109,6 +138,7 @@ class VirusTotalClient:
     - Rate limiting (4 req/min for free tier)
     - Exponential backoff retries for network failures
     - File size validation (650MB limit)
+    - Optional verdict cache so repeated checks of the same hash cost no quota
 
     Usage:
         client = VirusTotalClient(api_key="your_api_key")
@@ -120,18 +150,22 @@ class VirusTotalClient:
         client.scan_file_async("/path/to/file", callback=on_scan_complete)
     """
 
-    def __init__(self, api_key: str | None = None):
+    def __init__(self, api_key: str | None = None, cache: VTVerdictCache | None = None):
         """
         Initialize the VirusTotal client.
 
         Args:
             api_key: VirusTotal API key. If None, must be set before scanning.
+            cache: Optional verdict cache consulted by scan_file_sync().
         """
         self._api_key = api_key
-        self._request_times: list[float] = []
+        self._cache = cache
         self._lock = threading.Lock()
         self._session: requests.Session | None = None
         self._cancelled = False
+        # Private scheduler override; None uses the process-wide scheduler
+        self._scheduler: VirusTotalScheduler | None = None
+        self._engine: AsyncVirusTotalEngine | None = None
 
     def _get_session(self) -> requests.Session:
         """Get or create a requests session with API key header."""
@@ -159,6 +193,73 @@ class VirusTotalClient:
             self._session.close()
             self._session = None
 
+    @property
+    def api_key(self) -> str | None:
+        """Get the configured API key."""
+        return self._api_key
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Check whether cancel() was called."""
+        return self._cancelled
+
+    @property
+    def cache(self) -> VTVerdictCache | None:
+        """Get the verdict cache (None if caching is disabled)."""
+        return self._cache
+
+    def set_cache(self, cache: VTVerdictCache | None) -> None:
+        """
+        Set or remove the verdict cache.
+
+        Args:
+            cache: Verdict cache to use, or None to disable caching.
+        """
+        self._cache = cache
+
+    @property
+    def _request_times(self) -> list[float]:
+        """Timestamps of recent requests (shared by every client)."""
+        return _request_window.times
+
+    @_request_times.setter
+    def _request_times(self, times: list[float]) -> None:
+        with _request_window.lock:
+            _request_window.times = times
+
+    def get_scheduler(self) -> VirusTotalScheduler:
+        """
+        Get the request scheduler used for this client's lookups.
+
+        This is the process-wide scheduler, so requests from every client are
+        paced and prioritized in one place.
+
+        Returns:
+            The shared VirusTotalScheduler.
+        """
+        if self._scheduler is not None:
+            return self._scheduler
+        from .virustotal_batch import get_virustotal_scheduler
+
+        return get_virustotal_scheduler()
+
+    def get_engine(self) -> AsyncVirusTotalEngine:
+        """
+        Get the asyncio engine used for multiplexed requests and uploads.
+
+        Created on first use; its event loop thread starts with the first
+        submitted request.
+
+        Returns:
+            The client's AsyncVirusTotalEngine.
+        """
+        with self._lock:
+            if self._engine is None:
+                from .virustotal_async import AsyncVirusTotalEngine
+
+                self._engine = AsyncVirusTotalEngine(self)
+            return self._engine
+
     def cancel(self) -> None:
         """Cancel any ongoing scan operation."""
         self._cancelled = True
@@ -167,7 +268,7 @@ class VirusTotalClient:
         """
         Check if we're within rate limits using a sliding window algorithm.
 
-        Maintains a list of request timestamps and removes those older than
+        Maintains a process-wide list of request timestamps and removes those older than
         VT_RATE_LIMIT_WINDOW (60 seconds). If fewer than VT_RATE_LIMIT_REQUESTS
         (4) remain in the window, allows the request and appends the current
         timestamp.
@@ -175,17 +276,46 @@ class VirusTotalClient:
         Returns:
             True if OK to proceed, False if rate limited.
         """
-        with self._lock:
+        with _request_window.lock:
             now = time.time()
             # Remove requests older than the rate limit window
-            self._request_times = [t for t in self._request_times if now - t < VT_RATE_LIMIT_WINDOW]
+            _request_window.times = [
+                t for t in _request_window.times if now - t < VT_RATE_LIMIT_WINDOW
+            ]
 
-            if len(self._request_times) >= VT_RATE_LIMIT_REQUESTS:
+            if len(_request_window.times) >= VT_RATE_LIMIT_REQUESTS:
                 return False
 
-            self._request_times.append(now)
+            _request_window.times.append(now)
             return True
 
+    def try_acquire_request_slot(self) -> bool:
+        """
+        Consume a rate-limit slot if one is free, without waiting.
+
+        Returns:
+            True if a request may be sent now, False if rate limited.
+        """
+        return self._check_rate_limit()
+
+    def rate_limit_delay(self) -> float:
+        """
+        Get the seconds until the rate limit allows another request.
+
+        Does not consume a request slot; used by the batch scheduler to sleep
+        exactly until the next slot frees up.
+
+        Returns:
+            0.0 if a request may be sent now, otherwise the wait in seconds.
+        """
+        with _request_window.lock:
+            now = time.time()
+            recent = [t for t in _request_window.times if now - t < VT_RATE_LIMIT_WINDOW]
+            if len(recent) < VT_RATE_LIMIT_REQUESTS:
+                return 0.0
+            oldest = min(recent)
+            return max(0.1, VT_RATE_LIMIT_WINDOW - (now - oldest) + 0.1)
+
     def _wait_for_rate_limit(self) -> bool:
         """
         Wait until rate limit allows a new request.
@@ -197,12 +327,7 @@ class VirusTotalClient:
             if self._cancelled:
                 return False
             # Calculate wait time until oldest request expires
-            with self._lock:
-                if self._request_times:
-                    oldest = min(self._request_times)
-                    wait_time = max(0.1, VT_RATE_LIMIT_WINDOW - (time.time() - oldest) + 0.1)
-                else:
-                    wait_time = 1
+            wait_time = self.rate_limit_delay() or 1
 
             logger.info(f"Rate limited, waiting {wait_time:.1f}s")
             time.sleep(min(wait_time, 5))  # Check cancellation every 5s max
@@ -211,14 +336,10 @@ class VirusTotalClient:
     @staticmethod
     def calculate_sha256(file_path: str) -> str:
         """
-        Calculate SHA256 hash of a file using streaming for large files.
+        Calculate SHA256 hash of a file.
 
-        Performance Note:
-        - Reads file in 8KB chunks (buffered reading)
-        - Memory efficient: constant ~8KB RAM usage regardless of file size
-        - Can hash 650MB files (VT limit) without memory issues
-        - Typical speed: ~500MB/s on SSD, ~100MB/s on HDD
-        - Example: 100MB file takes ~0.2s on SSD
+        Delegates to the shared hashing service, so a file already hashed
+        (e.g. for quarantine) and unchanged since is not read again.
 
         Args:
             file_path: Path to the file.
@@ -230,11 +351,7 @@ class VirusTotalClient:
             FileNotFoundError: If file doesn't exist.
             PermissionError: If file can't be read.
         """
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                sha256_hash.update(chunk)
-        return sha256_hash.hexdigest().lower()
+        return get_hashing_service().sha256(file_path)
 
     def _make_request(
         self,
@@ -671,26 +788,19 @@ class VirusTotalClient:
             result.error_message = _("Analysis still in progress")
         return result
 
-    def scan_file_sync(self, file_path: str) -> VTScanResult:
+    def validate_scan_target(self, file_path: str) -> VTScanResult | None:
         """
-        Scan a file with VirusTotal (synchronous).
+        Check that a file can be submitted to VirusTotal.
 
-        This is the main scanning method that:
-        1. Validates the file exists and is within size limits
-        2. Calculates SHA256 hash
-        3. Checks if hash is already known
-        4. Uploads file if unknown
-        5. Returns scan results
+        Validates the API key, that the path is an existing non-empty regular
+        file, and that it is within VT_MAX_FILE_SIZE.
 
         Args:
             file_path: Path to the file to scan.
 
         Returns:
-            VTScanResult with scan results.
+            VTScanResult describing the problem, or None if the file is scannable.
         """
-        start_time = time.time()
-        self._cancelled = False
-
         # Validate API key
         if not self._api_key:
             return VTScanResult(
@@ -741,6 +851,34 @@ class VirusTotalClient:
                 error_message=_("Cannot scan empty files"),
             )
 
+        return None
+
+    def scan_file_sync(self, file_path: str, force_refresh: bool = False) -> VTScanResult:
+        """
+        Scan a file with VirusTotal (synchronous).
+
+        This is the main scanning method that:
+        1. Validates the file exists and is within size limits
+        2. Calculates SHA256 hash
+        3. Serves a fresh cached verdict if one exists
+        4. Checks if hash is already known
+        5. Uploads file if unknown
+        6. Caches and returns scan results
+
+        Args:
+            file_path: Path to the file to scan.
+            force_refresh: Bypass the verdict cache and query the API.
+
+        Returns:
+            VTScanResult with scan results.
+        """
+        start_time = time.time()
+        self._cancelled = False
+
+        error_result = self.validate_scan_target(file_path)
+        if error_result is not None:
+            return error_result
+
         # Calculate SHA256
         logger.info(f"Calculating SHA256 for {file_path}")
         try:
@@ -754,6 +892,15 @@ class VirusTotalClient:
 
         logger.info(f"SHA256: {sha256}")
 
+        cached = None
+        if self._cache is not None and not force_refresh:
+            cached = self._cache.get(sha256)
+            if cached is not None and cached.status != VTScanStatus.NOT_FOUND:
+                logger.info("Using cached VirusTotal verdict from %s", cached.cached_at)
+                cached.file_path = file_path
+                cached.duration = time.time() - start_time
+                return cached
+
         # Upload vs Hash Lookup Decision Logic:
         # 1. Always check hash first (fast, ~1s API call)
         # 2. If hash is known (status != NOT_FOUND):
@@ -771,8 +918,14 @@ class VirusTotalClient:
         # - Most malware has known signatures already in VT database
         # - Hash lookup only uses 1 API request vs upload (uses 2-4 requests)
         # Check if hash is known
-        logger.info("Checking if file is known to VirusTotal")
-        result = self.check_file_hash(sha256)
+        #
+        # A cached NOT_FOUND verdict skips straight to the upload, saving the
+        # hash lookup request.
+        if cached is not None:
+            result = cached
+        else:
+            logger.info("Checking if file is known to VirusTotal")
+            result = self.check_file_hash(sha256)
         result.file_path = file_path
 
         if result.status == VTScanStatus.NOT_FOUND:
@@ -781,6 +934,9 @@ class VirusTotalClient:
             result = self.upload_file(file_path, sha256)
             result.file_path = file_path
 
+        if self._cache is not None:
+            self._cache.put(result)
+
         result.duration = time.time() - start_time
         return result
 
@@ -788,33 +944,55 @@ class VirusTotalClient:
         self,
         file_path: str,
         callback: Callable[[VTScanResult], None],
+        force_refresh: bool = False,
     ) -> None:
         """
         Scan a file with VirusTotal (asynchronous).
 
-        Runs the scan in a background thread and calls the callback
-        on the GTK main thread using GLib.idle_add.
+        Runs the scan as a one-file VirusTotalBatch through the shared
+        scheduler, so it is paced and prioritized with every other request,
+        and calls the callback on the GTK main thread using GLib.idle_add.
+        Unknown files are uploaded, as with scan_file_sync().
 
         Args:
             file_path: Path to the file to scan.
             callback: Function to call with VTScanResult when complete.
+            force_refresh: Bypass the verdict cache and query the API.
         """
+        from .virustotal_batch import VirusTotalBatch
 
-        def scan_thread():
-            result = self.scan_file_sync(file_path)
+        def on_complete(results: list[VTScanResult]) -> None:
             try:
                 from gi.repository import GLib
 
-                GLib.idle_add(callback, result)
+                GLib.idle_add(callback, results[0])
             except ImportError:
                 # If GLib not available, call directly (for testing)
-                callback(result)
+                callback(results[0])
 
-        thread = threading.Thread(target=scan_thread, daemon=True)
-        thread.start()
+        self._cancelled = False
+        VirusTotalBatch(
+            self,
+            [file_path],
+            on_complete=on_complete,
+            upload_unknown=True,
+            force_refresh=force_refresh,
+        ).start()
 
     def close(self) -> None:
         """Close the client and release resources."""
+        if self._scheduler is not None:
+            self._scheduler.shutdown()
+            self._scheduler = None
+        else:
+            from .virustotal_batch import get_virustotal_scheduler
+
+            get_virustotal_scheduler().discard_client(self)
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
         if self._session:
             self._session.close()
             self._session = None
+        if self._cache is not None:
+            self._cache.close()
@@ -0,0 +1,779 @@
+# ClamUI VirusTotal Async Engine Module
+"""
+Asyncio HTTP engine for VirusTotal requests.
+
+VirusTotalClient issues blocking ``requests`` calls, so every upload holds a
+thread for the whole transfer plus up to two minutes of analysis polling,
+and multipart bodies are built from a full in-memory copy of the file. This
+module runs requests for any number of files on one event loop thread:
+
+- AsyncHTTPTransport: a small HTTP/1.1 client on asyncio streams with
+  keep-alive connection reuse, Retry-After aware exponential backoff and
+  bounded response sizes
+- MultipartFileBody: a multipart/form-data body streamed from disk in
+  fixed-size chunks, reopened on every retry (memory stays constant up to
+  the 650 MB VirusTotal limit)
+- AsyncVirusTotalEngine: coroutine versions of hash lookup, upload and
+  analysis polling that share the client's API key, rate limiter, result
+  parsing and verdict cache
+
+Security Considerations:
+    TLS is verified against the bundled certifi CA store only, and no
+    environment variables are consulted (no proxies, no REQUESTS_CA_BUNDLE),
+    matching the ``trust_env = False`` policy of the blocking client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import email.utils
+import json
+import logging
+import os
+import ssl
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlsplit
+
+import certifi
+
+from .i18n import _
+from .virustotal import (
+    VT_API_BASE,
+    VT_DIRECT_UPLOAD_MAX,
+    VT_MAX_RETRIES,
+    VT_REQUEST_TIMEOUT,
+    VT_RETRY_BASE_DELAY,
+    VT_UPLOAD_TIMEOUT,
+    VTScanResult,
+    VTScanStatus,
+)
+
+if TYPE_CHECKING:
+    from .virustotal import VirusTotalClient
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from disk and written to the socket per upload step
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# Largest response body accepted; VirusTotal file reports are well below this
+MAX_RESPONSE_SIZE = 32 * 1024 * 1024
+
+# Upper bound on a server-requested Retry-After delay
+MAX_RETRY_AFTER = 60.0
+
+# Idle keep-alive connections kept per (scheme, host, port)
+MAX_IDLE_CONNECTIONS = 4
+
+# Statuses that are retried with backoff before being returned to the caller.
+# 429 is not among them: resending would only spend more of the quota, so it
+# is reported to the caller as rate limited.
+RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+# Methods that are safe to resend when a reply is lost (timeout or a
+# truncated response). A POST may already have been processed, so an
+# upload is not sent twice.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+USER_AGENT = "ClamUI"
+
+
+class TransportError(Exception):
+    """Raised when a request fails without an HTTP response."""
+
+
+def create_ssl_context() -> ssl.SSLContext:
+    """Create a TLS context that trusts only the bundled certifi CA store."""
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date).
+
+    Returns:
+        Seconds to wait (clamped to 0..MAX_RETRY_AFTER), or None if absent
+        or unparseable.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            when = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=UTC)
+        seconds = (when - datetime.now(UTC)).total_seconds()
+    return min(max(0.0, seconds), MAX_RETRY_AFTER)
+
+
+@dataclass
+class HTTPResponse:
+    """A fully read HTTP response."""
+
+    status_code: int
+    headers: dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        """Decode the body as JSON (raises ValueError on invalid JSON)."""
+        return json.loads(self.body)
+
+    @property
+    def retry_after(self) -> float | None:
+        """Get the server-requested retry delay in seconds, if any."""
+        return parse_retry_after(self.headers.get("retry-after"))
+
+
+class MultipartFileBody:
+    """
+    multipart/form-data body with a single file field, streamed from disk.
+
+    The Content-Length is fixed from the file size when the body is created;
+    if the file changes size before or during the upload, the write fails
+    rather than sending a malformed body.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        field_name: str = "file",
+        chunk_size: int = UPLOAD_CHUNK_SIZE,
+    ):
+        """
+        Initialize the body.
+
+        Args:
+            file_path: File to upload
+            field_name: Form field name
+            chunk_size: Bytes read per chunk
+
+        Raises:
+            OSError: If the file cannot be stat'ed
+        """
+        self._file_path = file_path
+        self._chunk_size = chunk_size
+        self._file_size = os.stat(file_path).st_size
+        boundary = uuid.uuid4().hex
+        filename = os.path.basename(file_path)
+        for bad in ('"', "\r", "\n"):
+            filename = filename.replace(bad, "_")
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self._head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        self._tail = f"\r\n--{boundary}--\r\n".encode()
+
+    @property
+    def file_size(self) -> int:
+        """Get the size of the file part in bytes."""
+        return self._file_size
+
+    @property
+    def content_length(self) -> int:
+        """Get the total encoded body length in bytes."""
+        return len(self._head) + self._file_size + len(self._tail)
+
+    async def write_to(self, writer: asyncio.StreamWriter) -> None:
+        """
+        Stream the body to a connection.
+
+        The file is opened and read on worker threads, so slow media does
+        not stall the other requests sharing the event loop.
+
+        Raises:
+            OSError: If the file cannot be read or changed size
+        """
+        writer.write(self._head)
+        remaining = self._file_size
+        f = await asyncio.to_thread(open, self._file_path, "rb")
+        try:
+            while remaining > 0:
+                chunk = await asyncio.to_thread(f.read, min(self._chunk_size, remaining))
+                if not chunk:
+                    raise OSError(f"File shrank during upload: {self._file_path}")
+                remaining -= len(chunk)
+                writer.write(chunk)
+                await writer.drain()
+        finally:
+            f.close()
+        writer.write(self._tail)
+        await writer.drain()
+
+
+@dataclass
+class _Connection:
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    reused: bool = False
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class AsyncHTTPTransport:
+    """
+    Minimal HTTP/1.1 client on asyncio streams with keep-alive pooling.
+
+    Only what the VirusTotal API needs is implemented: request bodies from
+    bytes or MultipartFileBody, Content-Length and chunked responses, and
+    retries for connection failures and RETRYABLE_STATUSES.
+    """
+
+    def __init__(
+        self,
+        ssl_context: ssl.SSLContext | None = None,
+        max_retries: int = VT_MAX_RETRIES,
+        retry_base_delay: float = VT_RETRY_BASE_DELAY,
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            ssl_context: TLS context for https URLs (defaults to certifi-only)
+            max_retries: Attempts per request
+            retry_base_delay: First backoff delay in seconds, doubled per retry
+        """
+        self._ssl = ssl_context or create_ssl_context()
+        self._max_retries = max(1, max_retries)
+        self._retry_base_delay = retry_base_delay
+        self._idle: dict[tuple[str, str, int], list[_Connection]] = {}
+        self.connections_opened = 0
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        body: bytes | MultipartFileBody | None = None,
+        timeout: float = VT_REQUEST_TIMEOUT,
+        acquire_retry: Callable[[], Awaitable[bool]] | None = None,
+    ) -> HTTPResponse:
+        """
+        Send a request, retrying transient failures.
+
+        Connection errors, timeouts and RETRYABLE_STATUSES are retried with
+        exponential backoff; a Retry-After header overrides the computed
+        delay. After the last attempt a retryable status is returned as is.
+        Requests that are not in IDEMPOTENT_METHODS are not resent after a
+        timeout or a truncated reply.
+
+        Args:
+            acquire_retry: Awaited before every resend, so each attempt can
+                take its own rate-limit slot; returning False stops retrying
+
+        Raises:
+            TransportError: If no response could be obtained
+            OSError: If a MultipartFileBody cannot be read
+        """
+        last_error: Exception | None = None
+        last_response: HTTPResponse | None = None
+        for attempt in range(self._max_retries):
+            if attempt > 0 and acquire_retry is not None and not await acquire_retry():
+                break
+            try:
+                response = await asyncio.wait_for(
+                    self._send(method, url, headers or {}, body), timeout
+                )
+            except (TimeoutError, ConnectionError, asyncio.IncompleteReadError, ssl.SSLError) as e:
+                last_error, last_response = e, None
+                logger.warning(
+                    "VirusTotal request failed (attempt %d/%d): %s",
+                    attempt + 1,
+                    self._max_retries,
+                    e or type(e).__name__,
+                )
+                if method.upper() not in IDEMPOTENT_METHODS and isinstance(
+                    e, (TimeoutError, asyncio.IncompleteReadError)
+                ):
+                    break
+                delay = self._retry_base_delay * (2**attempt)
+            else:
+                if (
+                    response.status_code not in RETRYABLE_STATUSES
+                    or attempt == self._max_retries - 1
+                ):
+                    return response
+                last_error, last_response = None, response
+                retry_after = response.retry_after
+                delay = (
+                    retry_after
+                    if retry_after is not None
+                    else self._retry_base_delay * (2**attempt)
+                )
+                logger.info(
+                    "VirusTotal returned HTTP %d, retrying in %.1fs",
+                    response.status_code,
+                    delay,
+                )
+
+            if attempt < self._max_retries - 1:
+                await asyncio.sleep(delay)
+
+        if last_response is not None:
+            return last_response
+        if isinstance(last_error, TimeoutError):
+            raise TransportError(_("Request timed out after retries")) from last_error
+        raise TransportError(_("Network connection failed after retries")) from last_error
+
+    async def close(self) -> None:
+        """Close all idle connections."""
+        idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        body: bytes | MultipartFileBody | None,
+    ) -> HTTPResponse:
+        """Send one request, transparently replacing a stale pooled connection."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise TransportError(f"Unsupported URL: {url}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+        host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+
+        while True:
+            conn = await self._get_connection(key)
+            try:
+                await self._write_request(conn, method, target, host_header, headers, body)
+                response, keep_alive = await self._read_response(conn, method)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                conn.close()
+                if conn.reused:
+                    # The server closed an idle keep-alive connection; this
+                    # is not a real failure, so retry on a fresh one.
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+
+            if keep_alive:
+                self._release(key, conn)
+            else:
+                conn.close()
+            return response
+
+    async def _get_connection(self, key: tuple[str, str, int]) -> _Connection:
+        pool = self._idle.get(key)
+        while pool:
+            conn = pool.pop()
+            if not conn.reader.at_eof() and not conn.writer.is_closing():
+                conn.reused = True
+                return conn
+            conn.close()
+
+        scheme, host, port = key
+        reader, writer = await asyncio.open_connection(
+            host,
+            port,
+            ssl=self._ssl if scheme == "https" else None,
+            server_hostname=host if scheme == "https" else None,
+        )
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    def _release(self, key: tuple[str, str, int], conn: _Connection) -> None:
+        pool = self._idle.setdefault(key, [])
+        if len(pool) < MAX_IDLE_CONNECTIONS:
+            conn.reused = False
+            pool.append(conn)
+        else:
+            conn.close()
+
+    async def _write_request(
+        self,
+        conn: _Connection,
+        method: str,
+        target: str,
+        host_header: str,
+        headers: dict[str, str],
+        body: bytes | MultipartFileBody | None,
+    ) -> None:
+        lines = [
+            f"{method} {target} HTTP/1.1",
+            f"Host: {host_header}",
+            f"User-Agent: {USER_AGENT}",
+            "Accept: application/json",
+            "Accept-Encoding: identity",
+        ]
+        for name, value in headers.items():
+            if "\r" in value or "\n" in value:
+                raise ValueError(f"Invalid header value for {name}")
+            lines.append(f"{name}: {value}")
+        if isinstance(body, MultipartFileBody):
+            lines.append(f"Content-Type: {body.content_type}")
+            lines.append(f"Content-Length: {body.content_length}")
+        elif body is not None:
+            lines.append(f"Content-Length: {len(body)}")
+        elif method in ("POST", "PUT", "PATCH"):
+            lines.append("Content-Length: 0")
+
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        if isinstance(body, MultipartFileBody):
+            await body.write_to(conn.writer)
+        elif body:
+            conn.writer.write(body)
+        await conn.writer.drain()
+
+    async def _read_response(self, conn: _Connection, method: str) -> tuple[HTTPResponse, bool]:
+        reader = conn.reader
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed before response")
+        try:
+            version, status, *_reason = status_line.decode("latin-1").split(" ", 2)
+            status_code = int(status)
+        except ValueError as e:
+            raise TransportError(f"Malformed status line: {status_line!r}") from e
+
+        headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _sep, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+        if method == "HEAD" or status_code in (204, 304) or 100 <= status_code < 200:
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked(reader)
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if length > MAX_RESPONSE_SIZE:
+                raise TransportError("Response too large")
+            body = await reader.readexactly(length)
+        else:
+            body = await reader.read(MAX_RESPONSE_SIZE + 1)
+            if len(body) > MAX_RESPONSE_SIZE:
+                raise TransportError("Response too large")
+            keep_alive = False
+
+        return HTTPResponse(status_code, headers, body), keep_alive
+
+    @staticmethod
+    async def _read_chunked(reader: asyncio.StreamReader) -> bytes:
+        chunks: list[bytes] = []
+        total = 0
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+            except ValueError as e:
+                raise TransportError("Malformed chunked response") from e
+            if size == 0:
+                # Skip trailers up to the terminating blank line
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            total += size
+            if total > MAX_RESPONSE_SIZE:
+                raise TransportError("Response too large")
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)  # CRLF after each chunk
+
+
+class AsyncVirusTotalEngine:
+    """
+    Coroutine-based VirusTotal operations on a dedicated event loop thread.
+
+    The engine borrows the client's API key, rate limiter, report parser and
+    verdict cache, so it paces and caches exactly like the blocking client.
+
+    Usage:
+        engine = client.get_engine()
+        future = engine.submit(engine.upload_file(path, sha256))
+        future.add_done_callback(lambda f: print(f.result().status))
+    """
+
+    def __init__(
+        self,
+        client: VirusTotalClient,
+        transport: AsyncHTTPTransport | None = None,
+        base_url: str = VT_API_BASE,
+        poll_interval: float = 5.0,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            client: Client providing the API key, rate limiter and parser
+            transport: HTTP transport (a certifi-pinned one is created if None)
+            base_url: API base URL (tests point this at a local stub server)
+            poll_interval: Seconds between analysis status polls
+        """
+        self._client = client
+        self._transport = transport or AsyncHTTPTransport()
+        self._base_url = base_url.rstrip("/")
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def transport(self) -> AsyncHTTPTransport:
+        """Get the HTTP transport."""
+        return self._transport
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the engine's event loop.
+
+        Returns:
+            A concurrent.futures.Future for the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """Run a coroutine on the engine's loop and wait for its result."""
+        return self.submit(coro).result()
+
+    def close(self) -> None:
+        """Close pooled connections and stop the event loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._transport.close(), loop).result(timeout=5)
+        except (concurrent.futures.TimeoutError, RuntimeError):
+            logger.debug("Timed out closing VirusTotal connections")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=self._run_loop, args=(loop,), name="clamui-virustotal-io", daemon=True
+                )
+                self._loop, self._thread = loop, thread
+                thread.start()
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def _error(self, file_path: str, sha256: str, message: str, status=VTScanStatus.ERROR):
+        return VTScanResult(
+            status=status, file_path=file_path, sha256=sha256, error_message=message
+        )
+
+    async def _acquire_slot(self) -> bool:
+        """Wait for a rate-limit slot without blocking the loop."""
+        while not self._client.try_acquire_request_slot():
+            if self._client.is_cancelled:
+                return False
+            await asyncio.sleep(min(self._client.rate_limit_delay() or 1, 5))
+        return not self._client.is_cancelled
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        body: bytes | MultipartFileBody | None = None,
+        timeout: float = VT_REQUEST_TIMEOUT,
+    ) -> tuple[HTTPResponse | None, str | None]:
+        """Send an API request, mapping failures like VirusTotalClient._make_request."""
+        if self._client.is_cancelled:
+            return None, _("Scan cancelled")
+
+        url = endpoint if endpoint.startswith("http") else f"{self._base_url}{endpoint}"
+        headers = {"x-apikey": self._client.api_key or ""}
+        try:
+            response = await self._transport.request(
+                method,
+                url,
+                headers=headers,
+                body=body,
+                timeout=timeout,
+                acquire_retry=self._acquire_slot,
+            )
+        except TransportError as e:
+            return None, str(e)
+        except OSError as e:
+            return None, _("Request failed: {error}").format(error=e)
+
+        if response.status_code == 429:
+            logger.warning("VirusTotal API rate limit hit")
+            return response, _("API rate limit exceeded")
+        if response.status_code == 401:
+            return response, _("Invalid API key")
+        if response.status_code == 403:
+            return response, _("API key lacks required permissions")
+        return response, None
+
+    async def check_file_hash(self, sha256: str, slot_reserved: bool = False) -> VTScanResult:
+        """
+        Look up a file hash (coroutine version of VirusTotalClient.check_file_hash).
+
+        Args:
+            sha256: SHA256 hash of the file
+            slot_reserved: The caller already consumed a rate-limit slot
+        """
+        if not slot_reserved and not await self._acquire_slot():
+            return self._error("", sha256, _("Scan cancelled"))
+
+        response, error = await self._request("GET", f"/files/{sha256}")
+        if error:
+            status = (
+                VTScanStatus.RATE_LIMITED
+                if response is not None and response.status_code == 429
+                else VTScanStatus.ERROR
+            )
+            return self._error("", sha256, error, status)
+        if response.status_code == 404:
+            return VTScanResult(status=VTScanStatus.NOT_FOUND, file_path="", sha256=sha256)
+        if response.status_code != 200:
+            return self._error(
+                "", sha256, _("API error: HTTP {code}").format(code=response.status_code)
+            )
+        try:
+            data = response.json()
+        except ValueError:
+            return self._error("", sha256, _("Invalid JSON response from API"))
+        return self._client._parse_file_report(data, sha256)
+
+    async def upload_file(
+        self, file_path: str, sha256: str, slot_reserved: bool = False
+    ) -> VTScanResult:
+        """
+        Upload a file, streaming it from disk, and wait for the analysis.
+
+        Args:
+            file_path: File to upload
+            sha256: Pre-calculated SHA256 of the file
+            slot_reserved: The caller already consumed a rate-limit slot
+        """
+        if not slot_reserved and not await self._acquire_slot():
+            return self._error(file_path, sha256, _("Scan cancelled"))
+
+        try:
+            body = await asyncio.to_thread(MultipartFileBody, file_path)
+        except FileNotFoundError:
+            return self._error(file_path, sha256, _("File not found"))
+        except PermissionError:
+            return self._error(file_path, sha256, _("Permission denied"))
+        except OSError as e:
+            return self._error(file_path, sha256, _("Cannot read file: {error}").format(error=e))
+
+        upload_endpoint = "/files"
+        if body.file_size > VT_DIRECT_UPLOAD_MAX:
+            url_response, url_error = await self._request("GET", "/files/upload_url")
+            if url_error:
+                status = (
+                    VTScanStatus.RATE_LIMITED
+                    if url_response is not None and url_response.status_code == 429
+                    else VTScanStatus.ERROR
+                )
+                return self._error(file_path, sha256, url_error, status)
+            try:
+                upload_endpoint = url_response.json().get("data")
+            except (ValueError, AttributeError):
+                upload_endpoint = None
+            if not isinstance(upload_endpoint, str) or not upload_endpoint:
+                return self._error(
+                    file_path, sha256, _("Failed to obtain upload URL for large file")
+                )
+            if not await self._acquire_slot():
+                return self._error(file_path, sha256, _("Scan cancelled"))
+
+        response, error = await self._request(
+            "POST", upload_endpoint, body=body, timeout=VT_UPLOAD_TIMEOUT
+        )
+        if error:
+            status = (
+                VTScanStatus.RATE_LIMITED
+                if response is not None and response.status_code == 429
+                else VTScanStatus.ERROR
+            )
+            return self._error(file_path, sha256, error, status)
+        if response.status_code != 200:
+            return self._error(
+                file_path, sha256, _("Upload failed: HTTP {code}").format(code=response.status_code)
+            )
+
+        try:
+            analysis_id = response.json().get("data", {}).get("id")
+        except (ValueError, AttributeError):
+            analysis_id = None
+        if analysis_id:
+            return await self.poll_analysis(analysis_id, file_path, sha256)
+
+        await asyncio.sleep(self._poll_interval)
+        result = await self.check_file_hash(sha256)
+        result.file_path = file_path
+        return result
+
+    async def poll_analysis(
+        self, analysis_id: str, file_path: str, sha256: str, max_wait: float = 120
+    ) -> VTScanResult:
+        """
+        Poll an analysis until it completes, then fetch the file report.
+
+        Waiting happens with asyncio.sleep, so many analyses can be polled
+        concurrently on the one loop.
+        """
+        deadline = time.monotonic() + max_wait
+        while time.monotonic() < deadline:
+            if not await self._acquire_slot():
+                return self._error(file_path, sha256, _("Scan cancelled"))
+
+            response, error = await self._request("GET", f"/analyses/{analysis_id}")
+            if error:
+                logger.warning("Poll error: %s, trying hash lookup", error)
+                break
+
+            if response.status_code == 200:
+                try:
+                    status = response.json().get("data", {}).get("attributes", {}).get("status")
+                except (ValueError, AttributeError):
+                    status = None
+                if status == "completed":
+                    result = await self.check_file_hash(sha256)
+                    result.file_path = file_path
+                    return result
+
+            await asyncio.sleep(self._poll_interval)
+        else:
+            logger.warning("Analysis polling timeout, getting available results")
+
+        result = await self.check_file_hash(sha256)
+        result.file_path = file_path
+        if result.status == VTScanStatus.NOT_FOUND:
+            result.status = VTScanStatus.PENDING
+            result.error_message = _("Analysis still in progress")
+        return result
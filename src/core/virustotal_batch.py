@@ -0,0 +1,602 @@
+# ClamUI VirusTotal Batch Module
+"""
+Batched VirusTotal lookups driven by a single priority request scheduler.
+
+VirusTotalClient.scan_file_async() starts one thread per file, and each
+thread waits on the rate limit independently. Checking every detection of a
+scan that way leaves dozens of threads sleeping on the same 4-requests-per-
+minute budget in no particular order.
+
+This module provides:
+- VirusTotalScheduler: one worker thread that paces requests against the
+  shared rate limit, issues them in priority order (hash lookups before
+  uploads, user-initiated before background) and merges identical requests.
+  get_virustotal_scheduler() returns the process-wide instance that every
+  VirusTotalClient submits to.
+- VirusTotalBatch: a job that hashes a list of files concurrently on the
+  shared hashing pool, answers what it can from the verdict cache and
+  streams one VTScanResult per file through a callback as the scheduler
+  completes requests
+
+Callbacks are invoked from worker threads. GTK callers must marshal them
+onto the main loop themselves (e.g. with GLib.idle_add).
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field, replace
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+from .hashing import get_hashing_service
+from .i18n import _
+from .virustotal import VirusTotalClient, VTScanResult, VTScanStatus
+
+if TYPE_CHECKING:
+    from .virustotal_async import AsyncVirusTotalEngine
+
+logger = logging.getLogger(__name__)
+
+# Seconds the scheduler worker lingers without work before exiting. A new
+# submission restarts it.
+SCHEDULER_IDLE_TIMEOUT = 30.0
+
+_scheduler: VirusTotalScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+class VTRequestKind(IntEnum):
+    """Kind of VirusTotal request; lower values are dispatched first."""
+
+    HASH_LOOKUP = 0
+    UPLOAD = 1
+
+
+class VTRequestOrigin(IntEnum):
+    """Who asked for the request; lower values are dispatched first."""
+
+    USER = 0
+    BACKGROUND = 1
+
+
+@dataclass
+class _Request:
+    """A queued request shared by every caller waiting on the same hash."""
+
+    kind: VTRequestKind
+    sha256: str
+    file_path: str
+    origin: VTRequestOrigin
+    client: VirusTotalClient
+    callbacks: list[tuple[object, Callable[[VTScanResult], None]]] = field(default_factory=list)
+    done: bool = False
+
+    @property
+    def key(self) -> tuple[VTRequestKind, str]:
+        return (self.kind, self.sha256)
+
+
+class VirusTotalScheduler:
+    """
+    Central dispatcher for VirusTotal requests.
+
+    A single worker thread pulls the highest-priority request, sleeps only
+    until the rate limit has a free slot, and runs it through the client
+    that submitted it. Submitting a hash that is already queued or in flight
+    attaches the caller to that request instead of spending another API call.
+
+    Usage:
+        scheduler = client.get_scheduler()
+        scheduler.submit(VTRequestKind.HASH_LOOKUP, sha256, on_result, client=client)
+    """
+
+    def __init__(
+        self,
+        client: VirusTotalClient | None = None,
+        engine: AsyncVirusTotalEngine | None = None,
+        use_client_engines: bool = False,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            client: Client used for submissions that do not pass their own
+            engine: Optional asyncio engine. When set, requests run as
+                    coroutines on its event loop, so long uploads and
+                    analysis polls do not hold up later lookups. Without
+                    it, requests run one at a time on the worker thread.
+            use_client_engines: Run each request on the asyncio engine of
+                    the client that submitted it (used by the process-wide
+                    scheduler)
+        """
+        self._client = client
+        self._engine = engine
+        self._use_client_engines = use_client_engines
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, int, _Request]] = []
+        self._pending: dict[tuple[VTRequestKind, str], _Request] = {}
+        self._in_flight: list[_Request] = []
+        self._seq = itertools.count()
+        self._worker: threading.Thread | None = None
+        self._shutdown = False
+
+    @property
+    def pending_count(self) -> int:
+        """Get the number of distinct requests waiting to be sent."""
+        with self._cond:
+            return len(self._pending)
+
+    def submit(
+        self,
+        kind: VTRequestKind,
+        sha256: str,
+        callback: Callable[[VTScanResult], None],
+        origin: VTRequestOrigin = VTRequestOrigin.USER,
+        file_path: str = "",
+        owner: object = None,
+        client: VirusTotalClient | None = None,
+    ) -> None:
+        """
+        Queue a request, merging it with an identical queued or in-flight one.
+
+        Args:
+            kind: Hash lookup or upload
+            sha256: SHA-256 of the file
+            callback: Called from the worker thread with the VTScanResult
+            origin: USER requests are dispatched before BACKGROUND ones
+            file_path: File to upload (required for UPLOAD requests)
+            owner: Optional token used by cancel() to drop this callback
+            client: Client that issues the request (defaults to the
+                    scheduler's own client)
+        """
+        client = client or self._client
+        if client is None:
+            raise ValueError("A VirusTotal client is required to submit a request")
+
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("VirusTotal scheduler has been shut down")
+
+            request = self._pending.get((kind, sha256))
+            if request is None:
+                request = self._find_in_flight((kind, sha256))
+                if request is not None:
+                    # _complete() snapshots callbacks under _cond, so this one
+                    # still gets the result
+                    request.callbacks.append((owner, callback))
+                    return
+                request = _Request(
+                    kind=kind, sha256=sha256, file_path=file_path, origin=origin, client=client
+                )
+                self._pending[request.key] = request
+                self._push(request)
+            elif origin < request.origin:
+                # Promote: the stale heap entry is skipped when popped
+                request.origin = origin
+                self._push(request)
+            request.callbacks.append((owner, callback))
+
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="clamui-virustotal-scheduler", daemon=True
+                )
+                self._worker.start()
+            self._cond.notify()
+
+    def cancel(self, owner: object) -> None:
+        """
+        Drop every callback registered with the given owner.
+
+        Queued requests left without callbacks are removed from the queue. A
+        request already in flight still completes (and its result is still
+        cached), but its callbacks for this owner are not called.
+
+        Args:
+            owner: Token passed to submit()
+        """
+        with self._cond:
+            for request in self._in_flight:
+                request.callbacks = [cb for cb in request.callbacks if cb[0] is not owner]
+            for key, request in list(self._pending.items()):
+                request.callbacks = [cb for cb in request.callbacks if cb[0] is not owner]
+                if not request.callbacks:
+                    request.done = True
+                    del self._pending[key]
+
+    def discard_client(self, client: VirusTotalClient) -> None:
+        """
+        Drop queued requests that would be issued through a closed client.
+
+        Args:
+            client: Client being closed
+        """
+        with self._cond:
+            for key, request in list(self._pending.items()):
+                if request.client is client:
+                    request.done = True
+                    del self._pending[key]
+
+    def shutdown(self) -> None:
+        """Stop the worker and discard all queued requests."""
+        with self._cond:
+            self._shutdown = True
+            for request in self._pending.values():
+                request.done = True
+            self._pending.clear()
+            self._heap.clear()
+            self._cond.notify_all()
+
+    def _find_in_flight(self, key: tuple[VTRequestKind, str]) -> _Request | None:
+        """Return the in-flight request for a key, if any. Caller holds _cond."""
+        for request in self._in_flight:
+            if request.key == key:
+                return request
+        return None
+
+    def _push(self, request: _Request) -> None:
+        """Push a heap entry for the request's current priority. Caller holds _cond."""
+        heapq.heappush(
+            self._heap, (int(request.kind), int(request.origin), next(self._seq), request)
+        )
+
+    def _pop_next(self) -> _Request | None:
+        """Pop the best live request, skipping stale entries. Caller holds _cond."""
+        while self._heap:
+            _kind, origin, _seq, request = heapq.heappop(self._heap)
+            if request.done or origin != request.origin:
+                continue
+            request.done = True
+            self._pending.pop(request.key, None)
+            self._in_flight.append(request)
+            return request
+        return None
+
+    def _peek_next(self) -> _Request | None:
+        """Return the best live request without removing it. Caller holds _cond."""
+        while self._heap:
+            _kind, origin, _seq, request = self._heap[0]
+            if request.done or origin != request.origin:
+                heapq.heappop(self._heap)
+                continue
+            return request
+        return None
+
+    def _run(self) -> None:
+        """Worker loop: wait for work and a rate-limit slot, then dispatch."""
+        while True:
+            with self._cond:
+                idle_deadline = time.monotonic() + SCHEDULER_IDLE_TIMEOUT
+                while not self._shutdown:
+                    head = self._peek_next()
+                    if head is not None:
+                        delay = head.client.rate_limit_delay()
+                        if delay <= 0:
+                            break
+                        # Wake early if a submission or shutdown arrives
+                        self._cond.wait(timeout=delay)
+                        continue
+                    remaining = idle_deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._worker = None
+                        return
+                    self._cond.wait(timeout=remaining)
+
+                if self._shutdown:
+                    self._worker = None
+                    return
+                request = self._pop_next()
+
+            if request is not None:
+                self._dispatch(request)
+
+    def _dispatch(self, request: _Request) -> None:
+        """Execute one request and fan the result out to its callbacks."""
+        client = request.client
+        engine = self._engine
+        if engine is None and self._use_client_engines:
+            engine = client.get_engine()
+        if engine is not None:
+            # Reserve the slot here so dispatch order follows priority; the
+            # coroutine waits for one itself if another request took it.
+            reserved = client.try_acquire_request_slot()
+            if request.kind == VTRequestKind.HASH_LOOKUP:
+                coro = engine.check_file_hash(request.sha256, slot_reserved=reserved)
+            else:
+                coro = engine.upload_file(request.file_path, request.sha256, slot_reserved=reserved)
+            future = engine.submit(coro)
+            future.add_done_callback(lambda f: self._complete(request, self._future_result(f)))
+            return
+
+        try:
+            if request.kind == VTRequestKind.HASH_LOOKUP:
+                result = client.check_file_hash(request.sha256)
+            else:
+                result = client.upload_file(request.file_path, request.sha256)
+        except Exception as e:
+            logger.exception("VirusTotal request failed for %s", request.sha256)
+            result = self._error_result(request, e)
+        self._complete(request, result)
+
+    def _future_result(self, future) -> VTScanResult | BaseException:
+        try:
+            return future.result()
+        except BaseException as e:  # includes CancelledError on shutdown
+            return e
+
+    @staticmethod
+    def _error_result(request: _Request, error: BaseException) -> VTScanResult:
+        return VTScanResult(
+            status=VTScanStatus.ERROR,
+            file_path=request.file_path,
+            sha256=request.sha256,
+            error_message=str(error) or type(error).__name__,
+        )
+
+    def _complete(self, request: _Request, result: VTScanResult | BaseException) -> None:
+        """Cache a finished request's result and notify its callbacks."""
+        if isinstance(result, BaseException):
+            logger.error("VirusTotal request failed for %s: %r", request.sha256, result)
+            result = self._error_result(request, result)
+
+        cache = request.client.cache
+        if cache is not None:
+            cache.put(result)
+
+        with self._cond:
+            self._in_flight = [r for r in self._in_flight if r is not request]
+            callbacks = list(request.callbacks)
+        for _owner, callback in callbacks:
+            try:
+                callback(result)
+            except Exception:
+                logger.exception("VirusTotal result callback failed")
+
+
+def get_virustotal_scheduler() -> VirusTotalScheduler:
+    """
+    Get the process-wide VirusTotal scheduler.
+
+    Every VirusTotalClient submits through it, so the 4-requests-per-minute
+    quota and the request priorities hold across all dialogs and scans.
+
+    Returns:
+        The shared VirusTotalScheduler (created on first use)
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = VirusTotalScheduler(use_client_engines=True)
+        return _scheduler
+
+
+class VirusTotalBatch:
+    """
+    Check a set of files against VirusTotal through the shared scheduler.
+
+    Files are hashed together on the shared hashing pool; fresh cached
+    verdicts are returned immediately and the rest become hash lookups.
+    Files sharing a hash cost a single request. Unknown files are optionally
+    uploaded.
+
+    Usage:
+        batch = VirusTotalBatch(
+            client,
+            [threat.file_path for threat in scan_result.threat_details],
+            on_result=lambda r: GLib.idle_add(show_result, r),
+            on_complete=lambda results: GLib.idle_add(show_summary, results),
+        )
+        batch.start()
+    """
+
+    def __init__(
+        self,
+        client: VirusTotalClient,
+        file_paths: list[str],
+        on_result: Callable[[VTScanResult], None] | None = None,
+        on_complete: Callable[[list[VTScanResult]], None] | None = None,
+        origin: VTRequestOrigin = VTRequestOrigin.USER,
+        upload_unknown: bool = False,
+        force_refresh: bool = False,
+    ):
+        """
+        Initialize the batch.
+
+        Args:
+            client: VirusTotal client whose scheduler and cache are used
+            file_paths: Files to check (duplicates are checked once)
+            on_result: Called once per file with its VTScanResult
+            on_complete: Called once with all results when every file is done
+            origin: Priority class for this batch's requests
+            upload_unknown: Upload files VirusTotal has never seen
+            force_refresh: Ignore cached verdicts
+        """
+        self._client = client
+        self._file_paths = list(dict.fromkeys(file_paths))
+        self._on_result = on_result
+        self._on_complete = on_complete
+        self._origin = origin
+        self._upload_unknown = upload_unknown
+        self._force_refresh = force_refresh
+
+        self._lock = threading.Lock()
+        self._results: dict[str, VTScanResult] = {}
+        self._started_at: dict[str, float] = {}
+        # Files waiting on each hash, and hashes already answered
+        self._waiting: dict[str, list[str]] = {}
+        self._hash_results: dict[str, VTScanResult] = {}
+        self._cancelled = False
+        self._completed = False
+
+    @property
+    def total(self) -> int:
+        """Get the number of distinct files in the batch."""
+        return len(self._file_paths)
+
+    @property
+    def completed_count(self) -> int:
+        """Get the number of files with a result so far."""
+        with self._lock:
+            return len(self._results)
+
+    @property
+    def is_cancelled(self) -> bool:
+        """Check whether cancel() was called."""
+        return self._cancelled
+
+    def start(self) -> None:
+        """Start hashing and submitting files in the background."""
+        thread = threading.Thread(target=self._prepare, name="clamui-virustotal-batch", daemon=True)
+        thread.start()
+
+    def cancel(self) -> None:
+        """Stop the batch; queued requests for it are dropped from the scheduler."""
+        self._cancelled = True
+        self._client.get_scheduler().cancel(self)
+
+    def _prepare(self) -> None:
+        """Validate, hash and submit every file (runs on the batch thread)."""
+        if not self._file_paths:
+            self._maybe_complete()
+            return
+
+        scheduler = self._client.get_scheduler()
+        cache = None if self._force_refresh else self._client.cache
+
+        targets = []
+        for file_path in self._file_paths:
+            self._started_at[file_path] = time.time()
+            error_result = self._client.validate_scan_target(file_path)
+            if error_result is not None:
+                self._record(file_path, error_result)
+            else:
+                targets.append(file_path)
+
+        # Hash every target on the shared hashing pool in one go
+        digests = get_hashing_service().hash_files(targets)
+
+        for file_path in targets:
+            if self._cancelled:
+                return
+
+            digest = digests[file_path]
+            if isinstance(digest, OSError):
+                self._record(
+                    file_path,
+                    VTScanResult(
+                        status=VTScanStatus.ERROR,
+                        file_path=file_path,
+                        error_message=_("Cannot read file: {error}").format(error=digest),
+                    ),
+                )
+                continue
+            sha256 = digest.sha256
+
+            cached = cache.get(sha256) if cache is not None else None
+            if cached is not None and not (
+                cached.status == VTScanStatus.NOT_FOUND and self._upload_unknown
+            ):
+                self._record(file_path, cached)
+                continue
+
+            with self._lock:
+                known = self._hash_results.get(sha256)
+                waiters = self._waiting.setdefault(sha256, [])
+                waiters.append(file_path)
+            if known is not None:
+                # Same content already answered earlier in this batch
+                self._record(file_path, known)
+                continue
+            if len(waiters) > 1:
+                continue  # Same content already submitted by this batch
+
+            if cached is not None:
+                # Cached NOT_FOUND with uploads enabled: skip the lookup
+                self._submit_upload(scheduler, sha256, file_path)
+            else:
+                scheduler.submit(
+                    VTRequestKind.HASH_LOOKUP,
+                    sha256,
+                    lambda result, sha256=sha256, file_path=file_path: self._on_lookup_done(
+                        scheduler, sha256, file_path, result
+                    ),
+                    origin=self._origin,
+                    owner=self,
+                    client=self._client,
+                )
+
+    def _submit_upload(self, scheduler: VirusTotalScheduler, sha256: str, file_path: str) -> None:
+        """Queue an upload of a file with this hash."""
+        scheduler.submit(
+            VTRequestKind.UPLOAD,
+            sha256,
+            lambda result: self._deliver(sha256, result),
+            origin=self._origin,
+            file_path=file_path,
+            owner=self,
+            client=self._client,
+        )
+
+    def _on_lookup_done(
+        self,
+        scheduler: VirusTotalScheduler,
+        sha256: str,
+        file_path: str,
+        result: VTScanResult,
+    ) -> None:
+        """Handle a hash lookup result, chaining an upload if requested."""
+        if result.status == VTScanStatus.NOT_FOUND and self._upload_unknown and not self._cancelled:
+            self._submit_upload(scheduler, sha256, file_path)
+            return
+        self._deliver(sha256, result)
+
+    def _deliver(self, sha256: str, result: VTScanResult) -> None:
+        """Record a result for every file of this batch with the given hash."""
+        with self._lock:
+            self._hash_results[sha256] = result
+            waiters = list(self._waiting.get(sha256, []))
+        for file_path in waiters:
+            self._record(file_path, result)
+
+    def _record(self, file_path: str, result: VTScanResult) -> None:
+        """Store a per-file copy of the result and notify callbacks."""
+        if self._cancelled:
+            return
+
+        started = self._started_at.get(file_path, time.time())
+        file_result = replace(
+            result,
+            file_path=file_path,
+            detection_details=list(result.detection_details),
+            duration=time.time() - started,
+        )
+        with self._lock:
+            if file_path in self._results:
+                return
+            self._results[file_path] = file_result
+
+        if self._on_result is not None:
+            try:
+                self._on_result(file_result)
+            except Exception:
+                logger.exception("VirusTotal batch result callback failed")
+        self._maybe_complete()
+
+    def _maybe_complete(self) -> None:
+        """Fire on_complete once every file has a result."""
+        with self._lock:
+            if self._completed or len(self._results) < len(self._file_paths):
+                return
+            self._completed = True
+            results = [self._results[path] for path in self._file_paths]
+
+        if self._on_complete is not None:
+            try:
+                self._on_complete(results)
+            except Exception:
+                logger.exception("VirusTotal batch completion callback failed")
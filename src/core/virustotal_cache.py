@@ -0,0 +1,356 @@
+# ClamUI VirusTotal Verdict Cache Module
+"""
+Persistent SQLite cache of VirusTotal verdicts keyed by SHA-256.
+
+The free VirusTotal tier allows only 4 requests per minute, so re-checking a
+sample that was already looked up (in this session, a previous one, or by a
+file-manager integration) should be answered locally. Each cached verdict
+stores the parsed VTScanResult, its detection counts and the time it was
+fetched. Freshness is decided by a per-verdict-class TTL (clean, malicious,
+not found) and the table is bounded with least-recently-used eviction.
+
+Security Considerations:
+    The cache reveals which files were checked and which were flagged, so the
+    database file and its WAL/SHM companions are restricted to 0o600, matching
+    the quarantine database.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .virustotal import VTDetection, VTScanResult, VTScanStatus
+
+if TYPE_CHECKING:
+    from .settings_manager import SettingsManager
+
+logger = logging.getLogger(__name__)
+
+# Default freshness per verdict class, in seconds. Malicious verdicts rarely
+# flip back, clean verdicts can change as engines add signatures, and
+# not-found hashes may be submitted by someone else at any time.
+DEFAULT_TTL_CLEAN = 7 * 24 * 3600
+DEFAULT_TTL_MALICIOUS = 30 * 24 * 3600
+DEFAULT_TTL_NOT_FOUND = 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+# Only definitive verdicts are cached; errors, rate limits and pending
+# analyses must always be retried against the API.
+CACHEABLE_STATUSES = (VTScanStatus.CLEAN, VTScanStatus.DETECTED, VTScanStatus.NOT_FOUND)
+
+
+def _result_to_json(result: VTScanResult) -> str:
+    """Serialize the verdict-relevant fields of a VTScanResult."""
+    data = asdict(result)
+    data["status"] = result.status.value
+    # Per-file and per-call fields are not part of the verdict
+    for key in ("file_path", "duration", "error_message", "cached_at"):
+        data.pop(key, None)
+    return json.dumps(data)
+
+
+def _result_from_json(payload: str) -> VTScanResult:
+    """Rebuild a VTScanResult from _result_to_json() output."""
+    data = json.loads(payload)
+    return VTScanResult(
+        status=VTScanStatus(data["status"]),
+        file_path="",
+        sha256=data.get("sha256", ""),
+        detections=data.get("detections", 0),
+        total_engines=data.get("total_engines", 0),
+        detection_details=[VTDetection(**d) for d in data.get("detection_details", [])],
+        scan_date=data.get("scan_date"),
+        permalink=data.get("permalink"),
+    )
+
+
+class VTVerdictCache:
+    """
+    Thread-safe persistent cache of VirusTotal verdicts.
+
+    Usage:
+        cache = VTVerdictCache()
+        result = cache.get(sha256)
+        if result is None:
+            result = client.check_file_hash(sha256)
+            cache.put(result)
+    """
+
+    # Cache file permissions: 0o600 (owner read/write only)
+    DB_FILE_PERMISSIONS = 0o600
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        ttl_clean: float = DEFAULT_TTL_CLEAN,
+        ttl_malicious: float = DEFAULT_TTL_MALICIOUS,
+        ttl_not_found: float = DEFAULT_TTL_NOT_FOUND,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Initialize the verdict cache.
+
+        Args:
+            db_path: Optional custom database path.
+                     Defaults to XDG_CACHE_HOME/clamui/virustotal_cache.db
+            ttl_clean: Seconds a CLEAN verdict stays fresh
+            ttl_malicious: Seconds a DETECTED verdict stays fresh
+            ttl_not_found: Seconds a NOT_FOUND verdict stays fresh
+            max_entries: Maximum cached verdicts before LRU eviction
+        """
+        if db_path:
+            self._db_path = Path(db_path)
+        else:
+            xdg_cache_home = os.environ.get("XDG_CACHE_HOME", "~/.cache")
+            self._db_path = Path(xdg_cache_home).expanduser() / "clamui" / "virustotal_cache.db"
+
+        self._ttls = {
+            VTScanStatus.CLEAN: ttl_clean,
+            VTScanStatus.DETECTED: ttl_malicious,
+            VTScanStatus.NOT_FOUND: ttl_not_found,
+        }
+        self._max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._hits = 0
+        self._misses = 0
+
+    def _get_conn(self) -> sqlite3.Connection:
+        """Open the database on first use. Caller must hold _lock."""
+        if self._conn is None:
+            self._db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self._db_path), timeout=10.0, check_same_thread=False)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS verdicts (
+                        sha256 TEXT PRIMARY KEY,
+                        status TEXT NOT NULL,
+                        detections INTEGER NOT NULL,
+                        total_engines INTEGER NOT NULL,
+                        result_json TEXT NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        last_access REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_verdicts_last_access ON verdicts(last_access)"
+                )
+                conn.commit()
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._secure_db_file_permissions()
+            self._conn = conn
+        return self._conn
+
+    def _secure_db_file_permissions(self) -> None:
+        """Restrict the cache database and its WAL/SHM files to the owner."""
+        for db_file in (
+            self._db_path,
+            Path(str(self._db_path) + "-wal"),
+            Path(str(self._db_path) + "-shm"),
+        ):
+            try:
+                fd = os.open(db_file, os.O_RDONLY | os.O_NOFOLLOW)
+            except OSError:
+                continue
+            try:
+                os.fchmod(fd, self.DB_FILE_PERMISSIONS)
+            except OSError:
+                logger.debug("Failed to enforce permissions on %s", db_file, exc_info=True)
+            finally:
+                os.close(fd)
+
+    def ttl_for(self, status: VTScanStatus) -> float:
+        """
+        Get the freshness window for a verdict class.
+
+        Args:
+            status: Verdict status
+
+        Returns:
+            TTL in seconds (0 for statuses that are never cached)
+        """
+        return self._ttls.get(status, 0)
+
+    def get(self, sha256: str) -> VTScanResult | None:
+        """
+        Look up a fresh cached verdict.
+
+        Args:
+            sha256: Lowercase SHA-256 hex digest
+
+        Returns:
+            VTScanResult with cached_at set, or None if missing or stale
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                row = conn.execute(
+                    "SELECT status, result_json, fetched_at FROM verdicts WHERE sha256 = ?",
+                    (sha256,),
+                ).fetchone()
+                if row is None:
+                    self._misses += 1
+                    return None
+
+                status = VTScanStatus(row[0])
+                if now - row[2] > self.ttl_for(status):
+                    self._misses += 1
+                    return None
+
+                conn.execute("UPDATE verdicts SET last_access = ? WHERE sha256 = ?", (now, sha256))
+                conn.commit()
+                result = _result_from_json(row[1])
+            except (sqlite3.Error, OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning("VirusTotal cache lookup failed: %s", e)
+                return None
+
+            self._hits += 1
+            result.cached_at = datetime.fromtimestamp(row[2], tz=UTC).isoformat()
+            return result
+
+    def put(self, result: VTScanResult) -> bool:
+        """
+        Store a verdict, evicting least-recently-used entries if over capacity.
+
+        Args:
+            result: Scan result to cache. Only CACHEABLE_STATUSES with a
+                    SHA-256 are stored.
+
+        Returns:
+            True if the verdict was stored, False otherwise
+        """
+        if result.status not in CACHEABLE_STATUSES or not result.sha256:
+            return False
+
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO verdicts
+                    (sha256, status, detections, total_engines, result_json,
+                     fetched_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        result.sha256,
+                        result.status.value,
+                        result.detections,
+                        result.total_engines,
+                        _result_to_json(result),
+                        now,
+                        now,
+                    ),
+                )
+                conn.execute(
+                    """
+                    DELETE FROM verdicts WHERE sha256 IN (
+                        SELECT sha256 FROM verdicts
+                        ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self._max_entries,),
+                )
+                conn.commit()
+                return True
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Failed to cache VirusTotal verdict: %s", e)
+                return False
+
+    def invalidate(self, sha256: str) -> None:
+        """Drop a cached verdict so the next lookup goes to the API."""
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                conn.execute("DELETE FROM verdicts WHERE sha256 = ?", (sha256,))
+                conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Failed to invalidate VirusTotal cache entry: %s", e)
+
+    def clear(self) -> None:
+        """Remove all cached verdicts."""
+        with self._lock:
+            try:
+                conn = self._get_conn()
+                conn.execute("DELETE FROM verdicts")
+                conn.commit()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning("Failed to clear VirusTotal cache: %s", e)
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with entries, max_entries, hits and misses
+        """
+        with self._lock:
+            try:
+                entries = self._get_conn().execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+            except (sqlite3.Error, OSError):
+                entries = 0
+            return {
+                "entries": entries,
+                "max_entries": self._max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_verdict_cache(settings_manager: SettingsManager | None) -> VTVerdictCache | None:
+    """
+    Build a verdict cache configured from user settings.
+
+    Args:
+        settings_manager: Settings source; None uses the built-in defaults.
+
+    Returns:
+        VTVerdictCache, or None if caching is disabled in settings
+    """
+    if settings_manager is None:
+        return VTVerdictCache()
+    if not settings_manager.get("virustotal_cache_enabled", True):
+        return None
+
+    def hours(key: str, default_seconds: int) -> float:
+        value = settings_manager.get(key, default_seconds / 3600)
+        try:
+            return max(0.0, float(value)) * 3600
+        except (TypeError, ValueError):
+            return default_seconds
+
+    try:
+        max_entries = int(settings_manager.get("virustotal_cache_max_entries", DEFAULT_MAX_ENTRIES))
+    except (TypeError, ValueError):
+        max_entries = DEFAULT_MAX_ENTRIES
+
+    return VTVerdictCache(
+        ttl_clean=hours("virustotal_cache_ttl_clean_hours", DEFAULT_TTL_CLEAN),
+        ttl_malicious=hours("virustotal_cache_ttl_malicious_hours", DEFAULT_TTL_MALICIOUS),
+        ttl_not_found=hours("virustotal_cache_ttl_not_found_hours", DEFAULT_TTL_NOT_FOUND),
+        max_entries=max_entries,
+    )
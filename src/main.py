@@ -78,8 +78,9 @@ def _configure_logging():
     """
     Configure the logging system early in startup.
 
-    This must be called before importing modules that use logging
-    so they inherit the correct log level and handlers.
+    Called at the start of main() rather than at import time, so importing
+    this module (tests, ``python -X importtime``) does not read settings or
+    open log files.
     """
     from .core.logging_config import configure_logging
     from .core.settings_manager import SettingsManager
@@ -92,9 +93,6 @@ def _configure_logging():
     )
 
 
-# Configure logging before other imports
-_configure_logging()
-
 # NOTE: ClamUIApp (GTK4) import is deferred to main() to allow CLI
 # subcommands to run without initializing GTK.
 
@@ -223,6 +221,8 @@ def main():
     Returns:
         int: Exit code from the application (0 for success).
     """
+    _configure_logging()
+
     # Route to CLI if first argument is a known subcommand
     from .cli.router import CLI_SUBCOMMANDS
 
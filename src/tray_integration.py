@@ -215,3 +215,17 @@ class TrayIntegration:
         elif event_type == "file_modified":
             if self._app.settings_manager.get("scan_modified", False):
                 self._app.scan_view._scan_file(info)
+        elif event_type == "scan_started":
+            self._app.notification_manager.notify_device_scan_started(
+                info["device_name"],
+                info["mount_point"],
+                estimated_seconds=info.get("estimated_seconds"),
+            )
+        elif event_type == "scan_complete":
+            self._app.notification_manager.notify_device_scan_complete(
+                info["device_name"],
+                info["is_clean"],
+                infected_count=info.get("infected_count", 0),
+                scanned_count=info.get("scanned_count", 0),
+                quarantined_count=info.get("quarantined_count", 0),
+            )
@@ -14,7 +14,6 @@ Provides a comprehensive security posture overview by checking:
 
 import logging
 import threading
-import time
 
 import gi
 
@@ -23,7 +22,8 @@ gi.require_version("Adw", "1")
 gi.require_version("Gdk", "4.0")
 from gi.repository import Adw, Gdk, Gio, GLib, Gtk
 
-from ..core.i18n import _
+from ..core.audit_cache import AuditChange, run_incremental_audit
+from ..core.i18n import _, ngettext
 from ..core.system_audit import (
     TIER1_CHECKS,
     AuditCategory,
@@ -31,6 +31,8 @@ from ..core.system_audit import (
     AuditReport,
     AuditSectionResult,
     AuditStatus,
+    DeepScanProgress,
+    get_last_deep_scan,
     is_binary_installed,
     run_lynis_audit,
     run_rootkit_check,
@@ -94,6 +96,7 @@ class AuditView(Gtk.Box):
         self._is_checking = False
         self._destroyed = False
         self._cached_report: AuditReport | None = None
+        self._audit_changes: list[AuditChange] = []
         self._notification_manager = notification_manager
         self._is_first_run = True
 
@@ -116,6 +119,9 @@ class AuditView(Gtk.Box):
         self._lynis_spinner: Gtk.Spinner | None = None
         self._rootkit_spinner: Gtk.Spinner | None = None
         self._deep_scan_install_rows: dict[str, Adw.ActionRow] = {}
+        # Per-scan cancel requests and idle row subtitles, keyed by scan type
+        self._deep_scan_cancel: dict[str, threading.Event] = {}
+        self._deep_scan_subtitles: dict[str, str] = {}
 
         # Track whether initial data load has happened
         self._initial_load_done = False
@@ -357,9 +363,11 @@ class AuditView(Gtk.Box):
             if tool_name == "lynis":
                 self._lynis_button = button
                 self._lynis_spinner = spinner
+                self._deep_scan_subtitles["lynis"] = description
             else:
                 self._rootkit_button = button
                 self._rootkit_spinner = spinner
+                self._deep_scan_subtitles["rootkit"] = description
         else:
             # Show "Not Installed" status + install command
             row.set_subtitle(_("{tool} is not installed").format(tool=tool_name))
@@ -400,32 +408,36 @@ class AuditView(Gtk.Box):
             self._run_audit()
         return False  # Don't repeat
 
-    def _run_audit(self):
-        """Start background Tier 1 audit."""
+    def _run_audit(self, force: bool = False):
+        """Start background Tier 1 audit.
+
+        Args:
+            force: Re-run every check instead of reusing cached sections
+                   whose inputs are unchanged
+        """
         if self._is_checking:
             return
         self._set_checking_state(True)
         self._reset_sections_to_checking()
-        thread = threading.Thread(target=self._run_checks_background, daemon=True)
+        thread = threading.Thread(target=self._run_checks_background, args=(force,), daemon=True)
         thread.start()
 
-    def _run_checks_background(self):
+    def _run_checks_background(self, force: bool = False):
         """Run all Tier 1 checks and deep scan availability in background thread."""
         if self._destroyed:
             return
 
-        report = AuditReport(timestamp=time.time())
+        # Unchanged sections come from the persistent cache immediately; the
+        # rest run concurrently and are pushed to the UI as they complete
+        result = run_incremental_audit(
+            TIER1_CHECKS,
+            force=force,
+            on_result=lambda section: GLib.idle_add(self._update_section_ui, section),
+            should_cancel=lambda: self._destroyed,
+        )
 
-        for check_func in TIER1_CHECKS:
-            if self._destroyed:
-                return
-            try:
-                result = check_func()
-                report.sections.append(result)
-                # Progressive update: push each result to UI as it completes
-                GLib.idle_add(self._update_section_ui, result)
-            except Exception:
-                logger.exception("Audit check failed: %s", check_func.__name__)
+        if self._destroyed:
+            return
 
         # Check deep scan tool availability (runs in background, updates UI)
         if not self._destroyed:
@@ -438,7 +450,7 @@ class AuditView(Gtk.Box):
             )
 
         if not self._destroyed:
-            GLib.idle_add(self._finalize_audit, report)
+            GLib.idle_add(self._finalize_audit, result.report, result.changes)
 
     def _update_deep_scan_availability(
         self, lynis_installed: bool, chkrootkit_installed: bool
@@ -481,14 +493,24 @@ class AuditView(Gtk.Box):
             self._on_run_rootkit,
         )
 
+        # Results of deep scans that completed earlier stay valid until the
+        # next run, so show them again after the rows are rebuilt.
+        for category in (AuditCategory.DEEP_SCAN_LYNIS, AuditCategory.DEEP_SCAN_ROOTKIT):
+            last_result = get_last_deep_scan(category)
+            if last_result is not None:
+                self._show_deep_scan_results(last_result)
+
         return False  # Don't repeat
 
-    def _finalize_audit(self, report: AuditReport) -> bool:
+    def _finalize_audit(
+        self, report: AuditReport, changes: list[AuditChange] | None = None
+    ) -> bool:
         """Complete the audit: update summary banner, cache results, and notify."""
         if self._destroyed:
             return False
 
         self._cached_report = report
+        self._audit_changes = changes or []
         self._update_summary_banner(report)
         self._set_checking_state(False)
 
@@ -746,6 +768,17 @@ class AuditView(Gtk.Box):
         else:
             title = _("Audit complete")
 
+        if self._audit_changes:
+            count = len(self._audit_changes)
+            title = _("{summary} · {changes}").format(
+                summary=title,
+                changes=ngettext(
+                    "{count} change since last audit",
+                    "{count} changes since last audit",
+                    count,
+                ).format(count=count),
+            )
+
         self._summary_banner.set_title(title)
         self._summary_banner.set_revealed(True)
 
@@ -809,7 +842,7 @@ class AuditView(Gtk.Box):
         if self._is_checking:
             return
         self._cached_report = None
-        self._run_audit()
+        self._run_audit(force=True)
 
     def _on_launch_clicked(self, button: Gtk.Button, command: str):
         """Launch an application (e.g., firewall GUI) in the background.
@@ -923,66 +956,110 @@ class AuditView(Gtk.Box):
         )
 
     def _on_run_lynis(self, button: Gtk.Button):
-        """Run Lynis deep scan in background."""
-        if self._lynis_running or self._lynis_button is None:
-            return
-        self._lynis_running = True
-        self._lynis_button.set_sensitive(False)
-        if self._lynis_spinner:
-            self._lynis_spinner.set_visible(True)
-            self._lynis_spinner.start()
-
-        thread = threading.Thread(target=self._run_lynis_background, daemon=True)
-        thread.start()
+        """Run Lynis deep scan in background, or cancel it if running."""
+        self._toggle_deep_scan("lynis", self._run_lynis_background)
 
     def _run_lynis_background(self):
         """Execute Lynis audit in background thread."""
         if self._destroyed:
             return
-        result = run_lynis_audit()
+        is_cancelled = self._deep_scan_cancel_check("lynis")
+        result = run_lynis_audit(
+            progress_callback=lambda progress: GLib.idle_add(
+                self._on_deep_scan_progress, progress, "lynis"
+            ),
+            is_cancelled=is_cancelled,
+        )
         if not self._destroyed:
             GLib.idle_add(self._on_deep_scan_complete, result, "lynis")
 
     def _on_run_rootkit(self, button: Gtk.Button):
-        """Run chkrootkit scan in background."""
-        if self._rootkit_running or self._rootkit_button is None:
-            return
-        self._rootkit_running = True
-        self._rootkit_button.set_sensitive(False)
-        if self._rootkit_spinner:
-            self._rootkit_spinner.set_visible(True)
-            self._rootkit_spinner.start()
-
-        thread = threading.Thread(target=self._run_rootkit_background, daemon=True)
-        thread.start()
+        """Run chkrootkit scan in background, or cancel it if running."""
+        self._toggle_deep_scan("rootkit", self._run_rootkit_background)
 
     def _run_rootkit_background(self):
         """Execute chkrootkit in background thread."""
         if self._destroyed:
             return
-        result = run_rootkit_check()
+        is_cancelled = self._deep_scan_cancel_check("rootkit")
+        result = run_rootkit_check(
+            progress_callback=lambda progress: GLib.idle_add(
+                self._on_deep_scan_progress, progress, "rootkit"
+            ),
+            is_cancelled=is_cancelled,
+        )
         if not self._destroyed:
             GLib.idle_add(self._on_deep_scan_complete, result, "rootkit")
 
+    def _toggle_deep_scan(self, scan_type: str, target) -> None:
+        """Start a deep scan, or request cancellation of the running one."""
+        button = getattr(self, f"_{scan_type}_button")
+        if button is None:
+            return
+        if getattr(self, f"_{scan_type}_running"):
+            cancel = self._deep_scan_cancel.get(scan_type)
+            if cancel is not None and not cancel.is_set():
+                cancel.set()
+                button.set_sensitive(False)
+            return
+
+        setattr(self, f"_{scan_type}_running", True)
+        self._deep_scan_cancel[scan_type] = threading.Event()
+        button.set_label(_("Cancel"))
+        button.remove_css_class("suggested-action")
+        row = self._lynis_row if scan_type == "lynis" else self._rootkit_row
+        row.set_subtitle(_("Waiting for authentication..."))
+        spinner = getattr(self, f"_{scan_type}_spinner")
+        if spinner:
+            spinner.set_visible(True)
+            spinner.start()
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+
+    def _deep_scan_cancel_check(self, scan_type: str):
+        """Return the is_cancelled callable for a deep scan thread."""
+        cancel = self._deep_scan_cancel.setdefault(scan_type, threading.Event())
+        return lambda: self._destroyed or cancel.is_set()
+
+    def _on_deep_scan_progress(self, progress: DeepScanProgress, scan_type: str) -> bool:
+        """Show the running test phase and findings so far in the scan's row."""
+        if self._destroyed or not getattr(self, f"_{scan_type}_running"):
+            return False
+        row = self._lynis_row if scan_type == "lynis" else self._rootkit_row
+        findings = len(progress.findings)
+        if findings:
+            row.set_subtitle(
+                ngettext(
+                    "{phase} — {count} finding so far",
+                    "{phase} — {count} findings so far",
+                    findings,
+                ).format(phase=progress.phase, count=findings)
+            )
+        else:
+            row.set_subtitle(progress.phase)
+        return False  # Don't repeat
+
     def _on_deep_scan_complete(self, result: AuditSectionResult, scan_type: str) -> bool:
         """Handle deep scan completion on main thread."""
         if self._destroyed:
             return False
 
-        if scan_type == "lynis":
-            self._lynis_running = False
-            if self._lynis_button:
-                self._lynis_button.set_sensitive(True)
-            if self._lynis_spinner:
-                self._lynis_spinner.stop()
-                self._lynis_spinner.set_visible(False)
-        elif scan_type == "rootkit":
-            self._rootkit_running = False
-            if self._rootkit_button:
-                self._rootkit_button.set_sensitive(True)
-            if self._rootkit_spinner:
-                self._rootkit_spinner.stop()
-                self._rootkit_spinner.set_visible(False)
+        setattr(self, f"_{scan_type}_running", False)
+        self._deep_scan_cancel.pop(scan_type, None)
+        button = getattr(self, f"_{scan_type}_button")
+        if button:
+            button.set_label(_("Run"))
+            button.add_css_class("suggested-action")
+            button.set_sensitive(True)
+        spinner = getattr(self, f"_{scan_type}_spinner")
+        if spinner:
+            spinner.stop()
+            spinner.set_visible(False)
+        subtitle = self._deep_scan_subtitles.get(scan_type)
+        row = self._lynis_row if scan_type == "lynis" else self._rootkit_row
+        if subtitle and row is not None:
+            row.set_subtitle(subtitle)
 
         # Show results in the deep scan results area
         self._show_deep_scan_results(result)
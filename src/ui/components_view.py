@@ -19,6 +19,7 @@ from ..core.utils import (
     check_clamav_installed,
     check_clamdscan_installed,
     check_freshclam_installed,
+    refresh_clamav_probes,
 )
 from .compat import safe_add_suffix
 from .utils import add_row_icon, resolve_icon_name
@@ -435,7 +436,7 @@ class ComponentsView(Gtk.Box):
         if self._is_checking:
             return
 
-        self._check_all_components()
+        self._check_all_components(force=True)
 
     def _set_checking_state(self, is_checking: bool):
         """
@@ -455,18 +456,27 @@ class ComponentsView(Gtk.Box):
             self._refresh_spinner.stop()
             self._refresh_spinner.set_visible(False)
 
-    def _check_all_components(self):
-        """Start background component status check."""
+    def _check_all_components(self, force: bool = False):
+        """Start background component status check.
+
+        Args:
+            force: Re-run the probes instead of using cached results
+        """
         self._set_checking_state(True)
-        thread = threading.Thread(target=self._check_components_background, daemon=True)
+        thread = threading.Thread(
+            target=self._check_components_background, args=(force,), daemon=True
+        )
         thread.start()
         return False  # Don't repeat (for GLib.idle_add)
 
-    def _check_components_background(self):
+    def _check_components_background(self, force: bool = False):
         """Run all subprocess checks in a background thread.
 
         Collects results from all ClamAV component checks, then
         schedules a UI update on the main thread via GLib.idle_add.
+
+        Args:
+            force: Re-run the probes instead of using cached results
         """
         if self._destroyed:
             return
@@ -474,6 +484,9 @@ class ComponentsView(Gtk.Box):
         results = {}
 
         try:
+            # Run the probes concurrently; the checks below read the cache
+            refresh_clamav_probes(force=force, include_daemon=False)
+
             # Check clamscan
             results["clamscan"] = check_clamav_installed()
 
@@ -6,6 +6,7 @@ This module provides the DatabasePage class which handles the UI and logic
 for configuring ClamAV database update settings (freshclam.conf).
 """
 
+import threading
 from urllib.parse import urlparse
 
 import gi
@@ -21,13 +22,15 @@ except (TypeError, AttributeError):
     _HAS_FILE_DIALOG = False
 
 from ...core.clamav_detection import detect_freshclam_conf_path
+from ...core.clipboard import format_size
+from ...core.database_inventory import DatabaseInventorySnapshot, get_database_inventory
 from ...core.flatpak import (
     format_flatpak_portal_path,
     is_flatpak,
     is_portal_path,
     resolve_portal_path,
 )
-from ...core.i18n import N_, _
+from ...core.i18n import N_, _, ngettext
 from ..compat import create_entry_row, create_switch_row
 from ..utils import resolve_icon_name
 from .base import (
@@ -173,6 +176,7 @@ class DatabasePage(PreferencesPageMixin):
 
     The page includes:
     - File location display for freshclam.conf
+    - Installed databases (version, signatures and age from the CVD headers)
     - Paths group (database directory, log files, clamd notification)
     - Update behavior group (check frequency, database mirrors)
     - Proxy settings group (HTTP proxy configuration)
@@ -243,6 +247,9 @@ class DatabasePage(PreferencesPageMixin):
             on_browse=on_browse,
         )
 
+        # Create installed databases group
+        DatabasePage._create_installed_group(page)
+
         # Create paths group
         DatabasePage._create_paths_group(page, widgets_dict, temp_instance)
 
@@ -346,6 +353,85 @@ class DatabasePage(PreferencesPageMixin):
             dialog.connect("response", _on_response)
             dialog.show()
 
+    @staticmethod
+    def _create_installed_group(page: Adw.PreferencesPage):
+        """
+        Create the group listing installed signature databases.
+
+        The headers are read from the shared database inventory on a worker
+        thread, since in Flatpak they come from the host.
+
+        Args:
+            page: The preferences page to add the group to
+        """
+        group = Adw.PreferencesGroup()
+        group.set_title(_("Installed Databases"))
+
+        loading_row = Adw.ActionRow()
+        loading_row.set_title(_("Reading database headers…"))
+        loading_row.set_activatable(False)
+        group.add(loading_row)
+        page.add(group)
+
+        def load():
+            snapshot = get_database_inventory().get()
+            GLib.idle_add(DatabasePage._populate_installed_group, group, loading_row, snapshot)
+
+        threading.Thread(target=load, daemon=True).start()
+
+    @staticmethod
+    def _populate_installed_group(
+        group: Adw.PreferencesGroup, loading_row, snapshot: DatabaseInventorySnapshot
+    ) -> bool:
+        """Replace the loading row with one row per installed database."""
+        group.remove(loading_row)
+
+        if snapshot.is_empty:
+            row = Adw.ActionRow()
+            row.set_title(_("No database files found"))
+            row.set_subtitle("\n".join(snapshot.errors.values()))
+            row.add_prefix(
+                styled_prefix_icon(
+                    resolve_icon_name("dialog-warning-symbolic") or "dialog-warning-symbolic"
+                )
+            )
+            row.set_activatable(False)
+            group.add(row)
+            return False
+
+        group.set_description(
+            ngettext(
+                "{count} signature in total",
+                "{count} signatures in total",
+                snapshot.total_signatures,
+            ).format(count=f"{snapshot.total_signatures:,}")
+        )
+        for info in snapshot.databases():
+            row = Adw.ActionRow()
+            row.set_title(info.name)
+            if info.version is None:
+                row.set_subtitle(info.error or _("Unreadable"))
+            else:
+                parts = [
+                    _("Version {version}").format(version=info.version),
+                    ngettext(
+                        "{count} signature", "{count} signatures", info.signatures or 0
+                    ).format(count=f"{info.signatures or 0:,}"),
+                    format_size(info.size),
+                ]
+                age = info.age_days()
+                if age is not None:
+                    parts.append(
+                        ngettext("built {days} day ago", "built {days} days ago", age).format(
+                            days=age
+                        )
+                    )
+                row.set_subtitle(" \u2022 ".join(parts))
+            row.set_tooltip_text(info.path)
+            row.set_activatable(False)
+            group.add(row)
+        return False
+
     @staticmethod
     def _create_paths_group(page: Adw.PreferencesPage, widgets_dict: dict, helper):
         """
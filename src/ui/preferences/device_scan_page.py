@@ -13,6 +13,7 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Adw
 
+from ...core.device_scan_plan import DEVICE_SCAN_MODE_FULL, DEVICE_SCAN_MODE_QUICK
 from ...core.i18n import _
 from ..compat import create_switch_row
 from ..utils import resolve_icon_name
@@ -49,6 +50,7 @@ class DeviceScanPage(PreferencesPageMixin):
     - Enabling/disabling device auto-scan
     - Selecting which device types to scan
     - Configuring scan options (size limit, delay, quarantine, etc.)
+    - Quick scan mode (risky files first, large media files skipped)
 
     All settings auto-save immediately when changed.
     """
@@ -76,6 +78,10 @@ class DeviceScanPage(PreferencesPageMixin):
         self._notify_handler_id = None
         self._battery_row = None
         self._battery_handler_id = None
+        self._quick_row = None
+        self._quick_handler_id = None
+        self._quick_max_file_spin = None
+        self._quick_max_file_handler_id = None
 
     def create_page(self) -> Adw.PreferencesPage:
         """
@@ -244,6 +250,45 @@ class DeviceScanPage(PreferencesPageMixin):
         )
         group.add(self._battery_row)
 
+        # Quick scan mode
+        self._quick_row = create_switch_row(icon_name="system-run-symbolic")
+        self._quick_row.set_title(_("Quick Scan"))
+        self._quick_row.set_subtitle(
+            _("Scan autorun files and executables first and skip large media files")
+        )
+        self._quick_handler_id = self._quick_row.connect("notify::active", self._on_quick_changed)
+        quick_enabled = False
+        if self._settings_manager:
+            quick_enabled = (
+                self._settings_manager.get("device_auto_scan_mode", "full")
+                == DEVICE_SCAN_MODE_QUICK
+            )
+        self._quick_row.handler_block(self._quick_handler_id)
+        self._quick_row.set_active(quick_enabled)
+        self._quick_row.handler_unblock(self._quick_handler_id)
+        group.add(self._quick_row)
+
+        # Quick scan file size limit
+        quick_max_row, self._quick_max_file_spin = create_spin_row(
+            title=_("Quick Scan File Limit (MB)"),
+            subtitle=_("Skip low-risk files larger than this in quick mode (0 = no limit)"),
+            min_val=0,
+            max_val=100000,
+            step=10,
+            page_step=100,
+        )
+        quick_max_row.add_prefix(styled_prefix_icon("document-open-symbolic"))
+        current_quick_max = 100
+        if self._settings_manager:
+            current_quick_max = self._settings_manager.get(
+                "device_auto_scan_quick_max_file_mb", 100
+            )
+        self._quick_max_file_spin.set_value(current_quick_max)
+        self._quick_max_file_handler_id = self._quick_max_file_spin.connect(
+            "value-changed", self._on_quick_max_file_changed
+        )
+        group.add(quick_max_row)
+
         return group
 
     # --- Auto-save handlers ---
@@ -290,6 +335,19 @@ class DeviceScanPage(PreferencesPageMixin):
         if self._settings_manager:
             self._settings_manager.set("device_auto_scan_skip_on_battery", row.get_active())
 
+    def _on_quick_changed(self, row, _pspec):
+        """Handle quick scan mode toggle change."""
+        if self._settings_manager:
+            mode = DEVICE_SCAN_MODE_QUICK if row.get_active() else DEVICE_SCAN_MODE_FULL
+            self._settings_manager.set("device_auto_scan_mode", mode)
+
+    def _on_quick_max_file_changed(self, spin_button):
+        """Handle quick scan file size limit change."""
+        if self._settings_manager:
+            self._settings_manager.set(
+                "device_auto_scan_quick_max_file_mb", int(spin_button.get_value())
+            )
+
     # --- Helpers ---
 
     def _load_switch(self, row, handler_id, setting_key: str, default: bool):
@@ -474,9 +474,10 @@ class SavePage(PreferencesPageMixin):
 
             # Save scheduled scan settings
             if scheduled_updates:
-                for key, value in scheduled_updates.items():
-                    self._settings_manager.set(key, value)
-                if not self._settings_manager.save():
+                with self._settings_manager.batch() as batch:
+                    for key, value in scheduled_updates.items():
+                        self._settings_manager.set(key, value)
+                if not batch.saved:
                     raise Exception("Failed to save scheduled scan settings")
 
                 # Enable or disable scheduler based on settings
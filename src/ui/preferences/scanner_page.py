@@ -34,6 +34,7 @@ from ...core.flatpak import (
     resolve_portal_path,
 )
 from ...core.i18n import _
+from ...core.resource_governor import PRIORITY_LEVELS, PRIORITY_LOW, PRIORITY_NORMAL
 from ..compat import create_entry_row, create_switch_row, create_toolbar_view
 from ..utils import resolve_icon_name
 from .base import (
@@ -62,6 +63,7 @@ class ScannerPage(PreferencesPageMixin):
 
     The page includes:
     - Scan backend selection (auto, daemon, clamscan) with auto-save
+    - Scan resource limits (priority, systemd scope ceilings) with auto-save
     - File location display for clamd.conf
     - File type scanning group (PE, ELF, OLE2, PDF, HTML, Archive)
     - Performance group (file size limits, recursion, max files)
@@ -110,6 +112,9 @@ class ScannerPage(PreferencesPageMixin):
             config_path=config_path,
         )
 
+        # Create scan resources group (ClamUI settings, auto-saved)
+        ScannerPage._create_resources_group(page, widgets_dict, settings_manager)
+
         # Create file location group with detect/browse callbacks
         def _on_detect_clamd():
             detected = detect_clamd_conf_path()
@@ -318,6 +323,12 @@ class ScannerPage(PreferencesPageMixin):
         widgets_dict["backend_row"] = backend_row
         group.add(backend_row)
 
+        # Private on-demand daemon for systems without a clamd service.
+        # It runs as the user under $XDG_RUNTIME_DIR, which Flatpak cannot
+        # offer on the host.
+        if not is_flatpak():
+            ScannerPage._add_private_daemon_rows(group, widgets_dict, settings_manager)
+
         # Daemon status indicator - show loading state initially
         status_row, status_icon = create_status_row(
             title=_("Daemon Status"),
@@ -368,6 +379,159 @@ class ScannerPage(PreferencesPageMixin):
 
         page.add(group)
 
+    @staticmethod
+    def _add_private_daemon_rows(group: Adw.PreferencesGroup, widgets_dict: dict, settings_manager):
+        """
+        Add the private daemon switch and idle timeout rows to the backend group.
+
+        Both rows auto-save; the idle timeout applies the next time the
+        private daemon is started.
+
+        Args:
+            group: The Scan Backend group
+            widgets_dict: Dictionary to store widget references
+            settings_manager: SettingsManager for auto-saving
+        """
+        private_row = create_switch_row(icon_name="media-playback-start-symbolic")
+        private_row.set_title(_("Start Private Daemon on Demand"))
+        private_row.set_subtitle(
+            _(
+                "In Auto mode without a clamd service, keep a personal clamd warm "
+                "between scans instead of reloading signatures for each one"
+            )
+        )
+        private_row.set_active(bool(settings_manager.get("private_clamd_enabled", False)))
+        private_row.connect(
+            "notify::active",
+            lambda row, _pspec: settings_manager.set("private_clamd_enabled", row.get_active()),
+        )
+        widgets_dict["private_clamd_row"] = private_row
+        group.add(private_row)
+
+        idle_row, idle_spin = create_spin_row(
+            title=_("Private Daemon Idle Timeout (minutes)"),
+            subtitle=_("Stop the private daemon after this long without scans"),
+            min_val=1,
+            max_val=240,
+            step=1,
+            page_step=15,
+        )
+        idle_row.add_prefix(styled_prefix_icon("alarm-symbolic"))
+        idle_spin.set_value(settings_manager.get("private_clamd_idle_minutes", 15))
+        idle_spin.connect(
+            "value-changed",
+            lambda spin: settings_manager.set("private_clamd_idle_minutes", int(spin.get_value())),
+        )
+        widgets_dict["private_clamd_idle_spin"] = idle_spin
+        group.add(idle_row)
+
+    @staticmethod
+    def _create_resources_group(page: Adw.PreferencesPage, widgets_dict: dict, settings_manager):
+        """
+        Create the Scan Resources preferences group.
+
+        Sets the priority of scans started by the user and of scheduled and
+        device scans, plus optional systemd scope ceilings. Scan profiles can
+        override the priority. All rows auto-save.
+
+        Args:
+            page: The preferences page to add the group to
+            widgets_dict: Dictionary to store widget references
+            settings_manager: SettingsManager for auto-saving
+        """
+        group = Adw.PreferencesGroup()
+        group.set_title(_("Scan Resources"))
+        group.set_description(
+            _("Keep scans from slowing down other work. Profiles can override the priority.")
+        )
+
+        for key, title, subtitle, default in (
+            (
+                "scan_priority_interactive",
+                _("Priority of Manual Scans"),
+                _("Scans you start from ClamUI or the command line"),
+                PRIORITY_NORMAL,
+            ),
+            (
+                "scan_priority_background",
+                _("Priority of Background Scans"),
+                _("Scheduled scans and device auto-scans"),
+                PRIORITY_LOW,
+            ),
+        ):
+            row = ScannerPage._create_priority_row(title, subtitle)
+            current = settings_manager.get(key, default)
+            row.set_selected(PRIORITY_LEVELS.index(current) if current in PRIORITY_LEVELS else 0)
+            row.connect(
+                "notify::selected",
+                lambda row, _pspec, key=key: settings_manager.set(
+                    key, PRIORITY_LEVELS[row.get_selected()]
+                ),
+            )
+            widgets_dict[f"{key}_row"] = row
+            group.add(row)
+
+        scope_row = create_switch_row(icon_name="system-run-symbolic")
+        scope_row.set_title(_("Limit Scans with systemd"))
+        scope_row.set_subtitle(
+            _("Run scans in a systemd user scope with the CPU and memory limits below")
+        )
+        scope_row.set_active(settings_manager.get("scan_systemd_scope", False) is True)
+        scope_row.connect(
+            "notify::active",
+            lambda row, _pspec: settings_manager.set("scan_systemd_scope", row.get_active()),
+        )
+        widgets_dict["scan_systemd_scope_row"] = scope_row
+        group.add(scope_row)
+
+        for key, title, subtitle, max_val, icon in (
+            (
+                "scan_cpu_quota_percent",
+                _("CPU Limit (%)"),
+                _("100 = one full CPU (0 = unlimited)"),
+                6400,
+                "utilities-system-monitor-symbolic",
+            ),
+            (
+                "scan_memory_max_mb",
+                _("Memory Limit (MB)"),
+                _("clamscan needs over 1 GB for its signatures (0 = unlimited)"),
+                65536,
+                "drive-harddisk-symbolic",
+            ),
+        ):
+            spin_row, spin = create_spin_row(
+                title=title,
+                subtitle=subtitle,
+                min_val=0,
+                max_val=max_val,
+                step=10,
+                page_step=100,
+            )
+            spin_row.add_prefix(styled_prefix_icon(icon))
+            spin.set_value(settings_manager.get(key, 0))
+            spin.connect(
+                "value-changed",
+                lambda spin, key=key: settings_manager.set(key, int(spin.get_value())),
+            )
+            widgets_dict[f"{key}_spin"] = spin
+            group.add(spin_row)
+
+        page.add(group)
+
+    @staticmethod
+    def _create_priority_row(title: str, subtitle: str) -> Adw.ComboRow:
+        """Create a ComboRow listing the scan priorities in PRIORITY_LEVELS order."""
+        row = Adw.ComboRow()
+        model = Gtk.StringList()
+        model.append(_("Normal"))
+        model.append(_("Low (nice, lower I/O priority, yields under load)"))
+        model.append(_("Idle (only uses otherwise idle CPU and disk)"))
+        row.set_model(model)
+        row.set_title(title)
+        row.set_subtitle(subtitle)
+        return row
+
     @staticmethod
     def _update_backend_subtitle(row: Adw.ComboRow, selected: int):
         """
@@ -49,6 +49,7 @@ class ScheduledPage(PreferencesPageMixin):
     - Scan targets (comma-separated paths)
     - Skip on battery option
     - Auto-quarantine option
+    - Run scans from the running ClamUI app instead of a fresh process
 
     Note: This class uses PreferencesPageMixin for shared utilities. Unlike
     other pages, scheduled scans are configured in ClamUI settings (not ClamAV
@@ -90,6 +91,7 @@ class ScheduledPage(PreferencesPageMixin):
         - Scan targets (comma-separated paths)
         - Skip on battery option
         - Auto-quarantine option
+        - Resident scheduler option
 
         Args:
             page: The preferences page to add the group to
@@ -184,6 +186,19 @@ class ScheduledPage(PreferencesPageMixin):
         widgets_dict["auto_quarantine"] = auto_quarantine_row
         group.add(auto_quarantine_row)
 
+        # Resident scheduler switch
+        resident_row = create_switch_row("system-run-symbolic")
+        resident_row.set_title(_("Run Inside ClamUI"))
+        resident_row.set_subtitle(
+            _(
+                "While ClamUI is running, start scheduled scans from it to avoid start-up "
+                "costs; the system timer is used otherwise"
+            )
+        )
+        resident_row.set_active(False)
+        widgets_dict["resident"] = resident_row
+        group.add(resident_row)
+
         page.add(group)
 
     @staticmethod
@@ -239,6 +254,9 @@ class ScheduledPage(PreferencesPageMixin):
             config.get("schedule_auto_quarantine", False),
         )
 
+        # Resident scheduler switch
+        set_widget_active(widgets_dict, "resident", config.get("schedule_resident", False))
+
     @staticmethod
     def collect_data(widgets_dict: dict) -> dict:
         """
@@ -292,6 +310,10 @@ class ScheduledPage(PreferencesPageMixin):
         if auto_quarantine is None:
             auto_quarantine = False
 
+        resident = get_widget_active(widgets_dict, "resident")
+        if resident is None:
+            resident = False
+
         return {
             "scheduled_scans_enabled": enabled,
             "schedule_frequency": frequency_map[selected_frequency],
@@ -301,4 +323,5 @@ class ScheduledPage(PreferencesPageMixin):
             "schedule_day_of_month": day_of_month,
             "schedule_skip_on_battery": skip_on_battery,
             "schedule_auto_quarantine": auto_quarantine,
+            "schedule_resident": resident,
         }
@@ -16,6 +16,7 @@ from typing import TYPE_CHECKING
 from gi.repository import Adw, GLib, GObject, Gtk
 
 from ..core.i18n import _, ngettext
+from ..core.resource_governor import PRIORITY_LEVELS
 from .compat import (
     create_entry_row,
     create_toolbar_view,
@@ -38,6 +39,7 @@ class ProfileDialog(Adw.Window):
     - Profile name and description
     - Target directories/files to scan
     - Exclusion paths and patterns
+    - Scan priority (resource limits)
 
     Uses Adw.Window instead of Adw.Dialog for compatibility with
     libadwaita < 1.5 (Ubuntu 22.04, Pop!_OS 22.04).
@@ -82,6 +84,8 @@ class ProfileDialog(Adw.Window):
         self._targets: list[str] = []
         self._exclusion_paths: list[str] = []
         self._exclusion_patterns: list[str] = []
+        # Profile options, including keys this dialog does not edit
+        self._options: dict = {}
 
         # Callback for when a profile is saved
         self._on_profile_saved = None
@@ -151,6 +155,9 @@ class ProfileDialog(Adw.Window):
         # Exclusions group
         self._create_exclusions_group(preferences_page)
 
+        # Resources group
+        self._create_resources_group(preferences_page)
+
         scrolled.set_child(preferences_page)
         toolbar_view.set_content(scrolled)
 
@@ -274,6 +281,36 @@ class ProfileDialog(Adw.Window):
         self._exclusions_group.add(self._exclusions_listbox)
         preferences_page.add(self._exclusions_group)
 
+    def _create_resources_group(self, preferences_page: Adw.PreferencesPage):
+        """Create the scan priority group."""
+        resources_group = Adw.PreferencesGroup()
+        resources_group.set_title(_("Resources"))
+        resources_group.set_description(
+            _("How much CPU and disk time scans with this profile may take")
+        )
+
+        self._priority_row = Adw.ComboRow()
+        priority_model = Gtk.StringList()
+        priority_model.append(_("Default"))
+        priority_model.append(_("Normal"))
+        priority_model.append(_("Low (yields to other programs)"))
+        priority_model.append(_("Idle (only uses idle CPU and disk)"))
+        self._priority_row.set_model(priority_model)
+        self._priority_row.set_title(_("Scan Priority"))
+        self._priority_row.set_subtitle(_("Default follows the Scanner preferences"))
+        self._priority_row.connect("notify::selected", self._on_priority_changed)
+        resources_group.add(self._priority_row)
+
+        preferences_page.add(resources_group)
+
+    def _on_priority_changed(self, row, _pspec):
+        """Store the selected priority in the profile options."""
+        selected = row.get_selected()
+        if 1 <= selected <= len(PRIORITY_LEVELS):
+            self._options["priority"] = PRIORITY_LEVELS[selected - 1]
+        else:
+            self._options.pop("priority", None)
+
     def _load_profile_data(self):
         """Load existing profile data into the form."""
         if self._profile is None:
@@ -301,6 +338,12 @@ class ProfileDialog(Adw.Window):
         for pattern in exclusions.get("patterns", []):
             self._add_exclusion_pattern_to_list(pattern)
 
+        # Load options; unknown priorities show as "Default"
+        self._options = dict(getattr(self._profile, "options", None) or {})
+        priority = self._options.get("priority")
+        if priority in PRIORITY_LEVELS:
+            self._priority_row.set_selected(PRIORITY_LEVELS.index(priority) + 1)
+
     def _on_name_changed(self, entry_row):
         """Handle name entry changes for validation."""
         name = entry_row.get_text().strip()
@@ -630,6 +673,7 @@ class ProfileDialog(Adw.Window):
                         description=description,
                         targets=self._targets.copy(),
                         exclusions=exclusions,
+                        options=self._options.copy(),
                     )
                     saved_profile = self._profile_manager.get_profile(self._profile.id)
                 else:
@@ -639,6 +683,7 @@ class ProfileDialog(Adw.Window):
                         targets=self._targets.copy(),
                         exclusions=exclusions,
                         description=description,
+                        options=self._options.copy(),
                     )
 
                 # Notify callback
@@ -679,6 +724,7 @@ class ProfileDialog(Adw.Window):
             "description": self._description_row.get_text().strip(),
             "targets": self._targets.copy(),
             "exclusions": exclusions,
+            "options": self._options.copy(),
         }
 
 
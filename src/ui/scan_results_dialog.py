@@ -14,11 +14,13 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Adw, GLib, Gtk
 
-from ..core.clipboard import copy_to_clipboard
-from ..core.i18n import _, ngettext
+from ..core.clipboard import copy_to_clipboard, format_size
+from ..core.i18n import N_, _, ngettext
 from ..core.quarantine import QuarantineManager, QuarantineStatus
+from ..core.scan_timing import ScanTiming
 from ..core.scanner import ScanResult, ScanStatus, ThreatDetail
 from ..core.utils import format_flatpak_portal_path
+from ..core.virustotal import VTScanResult, VTScanStatus
 from .clipboard_helper import ClipboardHelper
 from .compat import create_toolbar_view, safe_add_suffix
 from .file_export import TEXT_FILTER, FileExportHelper
@@ -26,6 +28,8 @@ from .utils import enable_escape_to_close, resolve_icon_name
 
 if TYPE_CHECKING:
     from ..core.settings_manager import SettingsManager
+    from ..core.virustotal import VirusTotalClient
+    from ..core.virustotal_batch import VirusTotalBatch
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +38,18 @@ INITIAL_DISPLAY_LIMIT = 25
 LOAD_MORE_BATCH_SIZE = 25
 LARGE_RESULT_THRESHOLD = 50
 
+# Display names for ScanTiming phases
+PHASE_LABELS = {
+    "validate": N_("Path validation"),
+    "probe": N_("Backend check"),
+    "count": N_("Counting files"),
+    "file_list": N_("Writing file list"),
+    "scan": N_("Scanning"),
+    "parse": N_("Reading results"),
+    "filter": N_("Applying exclusions"),
+    "log": N_("Saving log"),
+}
+
 
 class ScanResultsDialog(Adw.Window):
     """
@@ -92,6 +108,13 @@ class ScanResultsDialog(Adw.Window):
         self._quarantine_all_button: Gtk.Button | None = None
         self._threats_list: Gtk.ListBox | None = None
 
+        # VirusTotal batch check state
+        self._vt_button: Gtk.Button | None = None
+        self._vt_client: VirusTotalClient | None = None
+        self._vt_batch: VirusTotalBatch | None = None
+        self._vt_labels: dict[str, list[Gtk.Label]] = {}
+        self._vt_results: dict[str, VTScanResult] = {}
+
         # Configure and set up the dialog
         self._setup_dialog()
         self._setup_ui()
@@ -106,6 +129,9 @@ class ScanResultsDialog(Adw.Window):
         enable_escape_to_close(self)
         self.set_deletable(True)
 
+        # Stop any VirusTotal batch still queued when the dialog goes away
+        self.connect("close-request", self._on_close_request)
+
     def _setup_ui(self):
         """Set up the dialog UI layout."""
         # Toast overlay for notifications
@@ -141,6 +167,14 @@ class ScanResultsDialog(Adw.Window):
             self._quarantine_all_button.connect("clicked", self._on_quarantine_all_clicked)
             header_bar.pack_end(self._quarantine_all_button)
 
+        # Check All on VirusTotal (needs settings for the API key and cache)
+        if self._scan_result.infected_count > 0 and self._settings_manager is not None:
+            self._vt_button = Gtk.Button()
+            self._vt_button.set_label(_("Check All on VirusTotal"))
+            self._vt_button.set_tooltip_text(_("Look up every detected file's hash on VirusTotal"))
+            self._vt_button.connect("clicked", self._on_vt_check_all_clicked)
+            header_bar.pack_end(self._vt_button)
+
         toolbar_view.add_top_bar(header_bar)
 
         # Create scrolled content area
@@ -163,6 +197,10 @@ class ScanResultsDialog(Adw.Window):
         if self._scan_result.infected_count > 0:
             self._create_threats_section(content_box)
 
+        # Add performance section when the scanner recorded phase timing
+        if isinstance(self._scan_result.timing, ScanTiming):
+            self._create_timing_section(content_box, self._scan_result.timing)
+
         # Add skipped files section if there are skipped files
         if self._scan_result.skipped_count > 0:
             self._create_skipped_files_section(content_box)
@@ -292,6 +330,58 @@ class ScanResultsDialog(Adw.Window):
 
         return row
 
+    def _create_timing_section(self, parent: Gtk.Box, timing: ScanTiming):
+        """Create the collapsed section showing where the scan time went."""
+        timing_group = Adw.PreferencesGroup()
+        timing_group.set_title(_("Performance"))
+
+        expander = Adw.ExpanderRow()
+        expander.set_title(_("Scan Timing"))
+        subtitle = _("Completed in {seconds:.1f} s").format(seconds=timing.total_seconds)
+        files_per_second = timing.files_per_second
+        if files_per_second is not None:
+            subtitle += " · " + _("{rate:,.0f} files/s").format(rate=files_per_second)
+        expander.set_subtitle(subtitle)
+
+        timing_content = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
+        timing_content.set_margin_start(12)
+        timing_content.set_margin_end(12)
+        timing_content.set_margin_top(8)
+        timing_content.set_margin_bottom(8)
+
+        for phase in timing.phases:
+            label = _(PHASE_LABELS[phase.name]) if phase.name in PHASE_LABELS else phase.name
+            timing_content.append(
+                self._create_stat_row(
+                    label + ":", _("{seconds:.2f} s").format(seconds=phase.duration)
+                )
+            )
+
+        bytes_per_second = timing.bytes_per_second
+        if bytes_per_second is not None:
+            timing_content.append(
+                self._create_stat_row(
+                    _("Throughput:"),
+                    _("{size}/s").format(size=format_size(int(bytes_per_second))),
+                )
+            )
+
+        if timing.stalls:
+            timing_content.append(
+                self._create_stat_row(
+                    _("Stalls:"),
+                    ngettext(
+                        "{n} period without output ({seconds:.1f} s)",
+                        "{n} periods without output ({seconds:.1f} s)",
+                        len(timing.stalls),
+                    ).format(n=len(timing.stalls), seconds=timing.stalled_seconds),
+                )
+            )
+
+        expander.add_row(timing_content)
+        timing_group.add(expander)
+        parent.append(timing_group)
+
     def _create_skipped_files_section(self, parent: Gtk.Box):
         """Create the skipped files section for files that couldn't be scanned."""
         skipped_group = Adw.PreferencesGroup()
@@ -461,6 +551,17 @@ class ScanResultsDialog(Adw.Window):
         path_label.set_size_request(400, -1)
         content_box.append(path_label)
 
+        # VirusTotal verdict (hidden until a batch check reports this file)
+        vt_label = Gtk.Label()
+        vt_label.set_xalign(0)
+        vt_label.set_wrap(True)
+        vt_label.add_css_class("caption")
+        vt_label.set_visible(False)
+        content_box.append(vt_label)
+        self._vt_labels.setdefault(threat.file_path, []).append(vt_label)
+        if threat.file_path in self._vt_results:
+            self._apply_vt_result(vt_label, self._vt_results[threat.file_path])
+
         # Action buttons
         actions_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
         actions_box.add_css_class("threat-actions")
@@ -633,6 +734,109 @@ class ScanResultsDialog(Adw.Window):
                 ).format(n=count)
             )
 
+    def _on_vt_check_all_clicked(self, button: Gtk.Button):
+        """Check every detected file against VirusTotal in one batch."""
+        from ..core import keyring_manager
+        from ..core.virustotal import VirusTotalClient
+        from ..core.virustotal_batch import VirusTotalBatch
+        from ..core.virustotal_cache import create_verdict_cache
+
+        if self._vt_batch is not None:
+            return
+
+        api_key = keyring_manager.get_api_key(self._settings_manager)
+        if not api_key:
+            self._show_toast(_("VirusTotal API key not configured"))
+            return
+
+        file_paths = list(dict.fromkeys(t.file_path for t in self._all_threat_details))
+        if not file_paths:
+            return
+
+        self._vt_client = VirusTotalClient(
+            api_key, cache=create_verdict_cache(self._settings_manager)
+        )
+        self._vt_batch = VirusTotalBatch(
+            self._vt_client,
+            file_paths,
+            on_result=lambda result: GLib.idle_add(self._on_vt_result, result),
+            on_complete=lambda results: GLib.idle_add(self._on_vt_batch_complete, results),
+        )
+
+        button.set_sensitive(False)
+        self._update_vt_button_progress()
+        self._vt_batch.start()
+
+    def _on_vt_result(self, result: VTScanResult):
+        """Show a single VirusTotal verdict on the matching threat rows."""
+        self._vt_results[result.file_path] = result
+        for label in self._vt_labels.get(result.file_path, []):
+            self._apply_vt_result(label, result)
+        self._update_vt_button_progress()
+        return False
+
+    def _on_vt_batch_complete(self, results: list[VTScanResult]):
+        """Summarize a finished VirusTotal batch and release the client."""
+        flagged = sum(1 for r in results if r.status == VTScanStatus.DETECTED)
+
+        if self._vt_button is not None:
+            self._vt_button.set_label(_("Checked on VirusTotal"))
+
+        self._show_toast(
+            ngettext(
+                "VirusTotal: {flagged} of {n} file flagged",
+                "VirusTotal: {flagged} of {n} files flagged",
+                len(results),
+            ).format(flagged=flagged, n=len(results))
+        )
+        self._close_vt_client()
+        return False
+
+    def _update_vt_button_progress(self):
+        """Show batch progress on the VirusTotal button."""
+        if self._vt_button is None or self._vt_batch is None:
+            return
+        self._vt_button.set_label(
+            _("Checking {done}/{total}...").format(
+                done=len(self._vt_results), total=self._vt_batch.total
+            )
+        )
+
+    def _apply_vt_result(self, label: Gtk.Label, result: VTScanResult):
+        """Render a VirusTotal verdict into a threat row label."""
+        if result.status == VTScanStatus.DETECTED:
+            text = _("VirusTotal: {detections}/{total} engines flagged this file").format(
+                detections=result.detections, total=result.total_engines
+            )
+            label.add_css_class("error")
+        elif result.status == VTScanStatus.CLEAN:
+            text = _("VirusTotal: no engine flagged this file")
+            label.add_css_class("success")
+        elif result.status == VTScanStatus.NOT_FOUND:
+            text = _("VirusTotal: file not known to VirusTotal")
+            label.add_css_class("dim-label")
+        else:
+            text = _("VirusTotal: {error}").format(error=result.error_message or _("check failed"))
+            label.add_css_class("warning")
+
+        if result.from_cache:
+            text = _("{verdict} (cached)").format(verdict=text)
+        label.set_label(text)
+        label.set_visible(True)
+
+    def _close_vt_client(self):
+        """Cancel any running VirusTotal batch and close its client."""
+        if self._vt_batch is not None and self._vt_client is not None:
+            self._vt_batch.cancel()
+        if self._vt_client is not None:
+            self._vt_client.close()
+        self._vt_client = None
+
+    def _on_close_request(self, window):
+        """Release VirusTotal resources when the dialog closes."""
+        self._close_vt_client()
+        return False
+
     def _on_export_clicked(self, button: Gtk.Button):
         """Handle export button click.
 
@@ -17,7 +17,9 @@ from gi.repository import Adw, Gdk, Gio, GLib, Gtk
 
 from ..core.i18n import _, ngettext
 from ..core.quarantine import QuarantineManager
+from ..core.resource_governor import resolve_policy
 from ..core.result_formatters import clean_scan_status_message, compose_scan_warning
+from ..core.scan_scheduler import QueueState, get_scan_scheduler
 from ..core.scanner import Scanner, ScanProgress, ScanResult, ScanStatus
 from ..core.utils import (
     format_scan_path,
@@ -208,6 +210,9 @@ class ScanView(Gtk.Box):
         # Create the backend indicator
         self._create_backend_indicator()
 
+        # Create the background scan queue indicator (hidden while idle)
+        self._create_queue_indicator()
+
         # Create the status bar
         self._create_status_bar()
         self._create_status_detail_section()
@@ -1977,10 +1982,22 @@ class ScanView(Gtk.Box):
         """Run the scan in a background thread."""
         import threading
 
-        thread = threading.Thread(target=self._scan_worker, daemon=True)
+        thread = threading.Thread(target=self._run_scheduled_scan_worker, daemon=True)
         thread.start()
         return False
 
+    def _run_scheduled_scan_worker(self):
+        """
+        Run _scan_worker while holding a user slot in the shared scan scheduler.
+
+        User scans start immediately; queued device scans wait until a slot
+        is free again.
+        """
+        targets = list(self._selected_paths)
+        label = targets[0] if len(targets) == 1 else _("Scan")
+        with get_scan_scheduler().run_interactive(label, cancel=self._scanner.cancel):
+            self._scan_worker()
+
     def _scan_worker(self):
         """
         Perform the actual scan on all selected paths.
@@ -2019,13 +2036,18 @@ class ScanView(Gtk.Box):
 
             scan_session_id = getattr(self, "_progress_session_id", 0)
 
-            # Get profile exclusions if a profile is selected
+            # Get profile exclusions and resource limits if a profile is selected
             profile_exclusions = None
+            profile_options = None
             if self._selected_profile is not None:
                 profile_exclusions = {
                     "paths": self._selected_profile.exclusions.get("paths", []),
                     "patterns": self._selected_profile.exclusions.get("patterns", []),
                 }
+                profile_options = self._selected_profile.options
+            resource_policy = resolve_policy(
+                self._settings_manager, profile_options=profile_options
+            )
 
             # Track aggregated results
             total_scanned_files = 0
@@ -2084,6 +2106,7 @@ class ScanView(Gtk.Box):
                     progress_callback=progress_callback,
                     backend_override=backend_override,
                     daemon_force_stream=daemon_force_stream,
+                    resource_policy=resource_policy,
                 )
 
                 # Aggregate results (also partial results from a cancelled target)
@@ -2361,6 +2384,57 @@ class ScanView(Gtk.Box):
         self._update_backend_label()
         self.append(self._backend_label)
 
+    def _create_queue_indicator(self):
+        """Create a small indicator showing queued and running background scans."""
+        self._queue_label = Gtk.Label()
+        self._queue_label.set_halign(Gtk.Align.CENTER)
+        self._queue_label.add_css_class("dim-label")
+        self._queue_label.add_css_class("caption")
+        self._queue_label.set_visible(False)
+        self.append(self._queue_label)
+
+        scheduler = get_scan_scheduler()
+        scheduler.add_listener(self._on_scan_queue_changed)
+        self._update_queue_label(scheduler.state())
+
+    def _on_scan_queue_changed(self, state: QueueState) -> None:
+        """Refresh the queue indicator; called from scheduler threads."""
+        GLib.idle_add(self._update_queue_label, state)
+
+    def cleanup(self) -> None:
+        """Stop following the shared scan scheduler when the view is disposed."""
+        get_scan_scheduler().remove_listener(self._on_scan_queue_changed)
+
+    def _update_queue_label(self, state: QueueState) -> bool:
+        """Show how many background scans are running and waiting."""
+        running = state.background_running
+        waiting = len(state.queued)
+        if not running and not waiting:
+            self._queue_label.set_visible(False)
+            return False
+
+        parts = []
+        if running:
+            parts.append(
+                ngettext(
+                    "{count} background scan running",
+                    "{count} background scans running",
+                    running,
+                ).format(count=running)
+            )
+        if waiting:
+            parts.append(
+                ngettext(
+                    "{count} waiting",
+                    "{count} waiting",
+                    waiting,
+                ).format(count=waiting)
+            )
+        self._queue_label.set_label(" · ".join(parts))
+        self._queue_label.set_tooltip_text("\n".join(job.label for job in state.queued) or None)
+        self._queue_label.set_visible(True)
+        return False
+
     def _get_eicar_tooltip_text(self, backend: str) -> str:
         """Get EICAR button tooltip text for the active backend."""
         return _("Run a scan with EICAR test file to verify antivirus detection")
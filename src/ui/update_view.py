@@ -12,6 +12,8 @@ gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
 from gi.repository import Adw, GLib, Gtk
 
+from ..core.clipboard import format_size
+from ..core.freshclam_progress import DatabaseProgress, DatabaseStage, DownloadKind
 from ..core.i18n import _, ngettext
 from ..core.updater import (
     FreshclamServiceStatus,
@@ -53,6 +55,10 @@ class UpdateView(Gtk.Box):
         # Updating state
         self._is_updating = False
 
+        # Start-of-update message and the latest progress line per database
+        self._update_intro = ""
+        self._database_progress: dict[str, str] = {}
+
         # Freshclam availability
         self._freshclam_available = False
 
@@ -486,9 +492,8 @@ class UpdateView(Gtk.Box):
         self._clear_results()
 
         # Update results text with appropriate message
-        buffer = self._results_text.get_buffer()
         if force:
-            buffer.set_text(
+            intro = (
                 _("Force updating virus database...")
                 + "\n\n"
                 + _(
@@ -500,17 +505,73 @@ class UpdateView(Gtk.Box):
                 + _("Please wait, this may take a few minutes.")
             )
         else:
-            buffer.set_text(
+            intro = (
                 _("Updating virus database...")
                 + "\n\n"
                 + _("Please wait, this may take a few minutes.")
             )
+        self._results_text.get_buffer().set_text(intro)
+        self._update_intro = intro
+        self._database_progress = {}
 
         # Hide any previous status banner
         self._status_banner.set_revealed(False)
 
         # Start async update
-        self._updater.update_async(callback=self._on_update_complete, force=force)
+        self._updater.update_async(
+            callback=self._on_update_complete,
+            force=force,
+            progress_callback=self._on_update_progress,
+        )
+
+    @staticmethod
+    def _format_database_progress(event: DatabaseProgress) -> str:
+        """Format one database's latest progress event as a single line."""
+        if event.stage == DatabaseStage.DOWNLOADING:
+            if event.kind == DownloadKind.CDIFF:
+                what = _("downloading patches")
+            elif event.kind == DownloadKind.FULL:
+                what = _("downloading full database")
+            else:
+                what = _("downloading")
+            percent = event.percent
+            if percent is not None:
+                what = _("{what}, {percent:.0f}% of {size}").format(
+                    what=what, percent=percent, size=format_size(event.bytes_total)
+                )
+            return f"{event.database}: {what}"
+        if event.stage == DatabaseStage.TESTING:
+            return _("{database}: testing").format(database=event.database)
+        if event.stage == DatabaseStage.UPDATED:
+            if event.bytes_downloaded:
+                return _("{database}: updated ({size} downloaded)").format(
+                    database=event.database, size=format_size(event.bytes_downloaded)
+                )
+            return _("{database}: updated").format(database=event.database)
+        if event.stage == DatabaseStage.UP_TO_DATE:
+            return _("{database}: up to date").format(database=event.database)
+        if event.stage == DatabaseStage.RATE_LIMITED:
+            if event.message:
+                return _("{database}: rate limited until {time}").format(
+                    database=event.database, time=event.message
+                )
+            return _("{database}: rate limited").format(database=event.database)
+        return _("{database}: download failed").format(database=event.database)
+
+    def _on_update_progress(self, event: DatabaseProgress):
+        """
+        Show per-database progress below the start-of-update message.
+
+        Args:
+            event: Progress event from the updater (main thread)
+        """
+        if not self._is_updating:
+            return False
+        self._database_progress[event.database] = self._format_database_progress(event)
+        self._results_text.get_buffer().set_text(
+            self._update_intro + "\n\n" + "\n".join(self._database_progress.values())
+        )
+        return False  # Don't repeat GLib.idle_add
 
     def _set_updating_state(self, is_updating: bool):
         """
@@ -668,6 +729,19 @@ class UpdateView(Gtk.Box):
             lines.append(
                 _("  Rate limited: {databases}").format(databases=", ".join(rate_limited_details))
             )
+        if result.clamd_reload is not None:
+            if result.clamd_reload.reloaded:
+                lines.append(
+                    _("  Scanner daemon reloaded in {seconds:.1f}s").format(
+                        seconds=result.clamd_reload.latency
+                    )
+                )
+            else:
+                lines.append(
+                    _("  Scanner daemon reload not confirmed: {error}").format(
+                        error=result.clamd_reload.error
+                    )
+                )
         lines.append("")
 
         # Service-specific message
@@ -215,6 +215,22 @@ class VirusTotalResultsDialog(Adw.Window):
             date_row.add_prefix(date_icon)
             summary_group.add(date_row)
 
+        # Note when the verdict was served from the local cache
+        if self._vt_result.cached_at:
+            cache_row = Adw.ActionRow()
+            cache_row.set_title(_("Cached result"))
+            cache_row.set_subtitle(
+                _("Fetched {date}, no API quota used").format(
+                    date=self._format_scan_date(self._vt_result.cached_at)
+                )
+            )
+            cache_icon = Gtk.Image.new_from_icon_name(
+                resolve_icon_name("document-open-recent-symbolic")
+            )
+            cache_icon.add_css_class("dim-label")
+            cache_row.add_prefix(cache_icon)
+            summary_group.add(cache_row)
+
         parent.append(summary_group)
 
     def _format_scan_date(self, iso_date: str) -> str:
@@ -0,0 +1,128 @@
+# ClamUI Audit Command Tests
+"""Tests for the audit CLI command."""
+
+import argparse
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.cli import audit_cmd
+from src.cli.audit_cmd import register, run
+from src.core.audit_cache import AuditChange, IncrementalAuditResult
+from src.core.system_audit import (
+    AuditCategory,
+    AuditCheckResult,
+    AuditReport,
+    AuditSectionResult,
+    AuditStatus,
+)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build a parser with only the audit subcommand registered."""
+    parser = argparse.ArgumentParser(prog="clamui")
+    subparsers = parser.add_subparsers(dest="command")
+    register(subparsers)
+    return parser
+
+
+def _report(status: AuditStatus) -> AuditReport:
+    section = AuditSectionResult(
+        category=AuditCategory.FIREWALL,
+        title="Firewall",
+        icon_name="security-medium-symbolic",
+        checks=[
+            AuditCheckResult(
+                name="UFW",
+                status=status,
+                detail="detail",
+                recommendation="Enable the firewall",
+                install_command="sudo ufw enable",
+            )
+        ],
+    )
+    return AuditReport(sections=[section], timestamp=1700000000.0)
+
+
+def _result(status: AuditStatus, changes=None) -> IncrementalAuditResult:
+    return IncrementalAuditResult(
+        report=_report(status), changes=changes or [], cached=[AuditCategory.FIREWALL]
+    )
+
+
+class TestAuditArguments:
+    """Tests for audit argument parsing."""
+
+    def test_defaults(self):
+        args = _build_parser().parse_args(["audit"])
+        assert args.json_output is False
+        assert args.timeout > 0
+
+    @pytest.mark.parametrize("value", ["0", "-1", "abc"])
+    def test_invalid_timeout_is_rejected(self, value):
+        with pytest.raises(SystemExit):
+            _build_parser().parse_args(["audit", "--timeout", value])
+
+
+class TestAuditRun:
+    """Tests for audit output and exit codes."""
+
+    def test_json_output(self, capsys):
+        args = _build_parser().parse_args(["audit", "--json", "--timeout", "5"])
+        with patch.object(
+            audit_cmd, "run_incremental_audit", return_value=_result(AuditStatus.PASS)
+        ) as m:
+            exit_code = run(args)
+
+        assert exit_code == 0
+        assert m.call_args.kwargs["check_timeout"] == 5.0
+        data = json.loads(capsys.readouterr().out)
+        assert data["summary"] == {"pass": 1}
+        assert data["sections"][0]["category"] == "firewall"
+        assert data["sections"][0]["checks"][0]["status"] == "pass"
+
+    def test_failure_sets_exit_code(self, capsys):
+        args = _build_parser().parse_args(["audit", "--json"])
+        with patch.object(
+            audit_cmd, "run_incremental_audit", return_value=_result(AuditStatus.FAIL)
+        ):
+            assert run(args) == 1
+
+    def test_text_output_streams_sections(self, capsys):
+        args = _build_parser().parse_args(["audit", "--force"])
+        result = _result(
+            AuditStatus.WARNING,
+            changes=[
+                AuditChange(AuditCategory.FIREWALL, "UFW", AuditStatus.PASS, AuditStatus.WARNING)
+            ],
+        )
+
+        def fake_run(force, check_timeout, on_result):
+            assert force is True
+            for section in result.report.sections:
+                on_result(section)
+            return result
+
+        with patch.object(audit_cmd, "run_incremental_audit", side_effect=fake_run):
+            assert run(args) == 0
+
+        out = capsys.readouterr().out
+        assert "[WARN] Firewall" in out
+        assert "sudo ufw enable" in out
+        assert "UFW: pass -> warning" in out
+
+    def test_json_includes_changes_and_cached(self, capsys):
+        args = _build_parser().parse_args(["audit", "--json"])
+        result = _result(
+            AuditStatus.PASS,
+            changes=[AuditChange(AuditCategory.FIREWALL, "UFW", None, AuditStatus.PASS)],
+        )
+        with patch.object(audit_cmd, "run_incremental_audit", return_value=result):
+            run(args)
+
+        data = json.loads(capsys.readouterr().out)
+        assert data["cached"] == ["firewall"]
+        assert data["changes"] == [
+            {"category": "firewall", "name": "UFW", "old_status": None, "new_status": "pass"}
+        ]
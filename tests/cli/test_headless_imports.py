@@ -0,0 +1,50 @@
+# ClamUI Headless Import Tests
+"""
+Tests that the CLI and scheduled-scan entry points never import GObject.
+
+The test suite mocks ``gi`` in-process, so the check runs in a fresh
+interpreter.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+HEADLESS_MODULES = [
+    "src.main",
+    "src.cli.router",
+    "src.cli.scan_cmd",
+    "src.cli.status_cmd",
+    "src.cli.quarantine_cmd",
+    "src.cli.history_cmd",
+    "src.cli.profile_cmd",
+    "src.cli.audit_cmd",
+    "src.cli.scheduled_scan",
+    "src.core.scanner",
+    "src.core.daemon_scanner",
+    "src.core.log_manager",
+    "src.core.quarantine.manager",
+    "src.core.updater",
+]
+
+
+@pytest.mark.parametrize("module", HEADLESS_MODULES)
+def test_module_imports_without_gi(module):
+    code = (
+        "import importlib, sys\n"
+        f"importlib.import_module({module!r})\n"
+        "print(','.join(sorted(m for m in sys.modules if m == 'gi' or m.startswith('gi.'))))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
@@ -8,9 +8,11 @@ terminal and must be sanitized to prevent ANSI/control-sequence injection.
 """
 
 import argparse
+import json
 from unittest.mock import patch
 
-from src.cli.scan_cmd import _print_text_output, run
+from src.cli.scan_cmd import _format_json_output, _print_text_output, _write_trace, run
+from src.core.scan_timing import PhaseTiming, ScanTiming
 from src.core.scanner_types import ScanResult, ScanStatus, ThreatDetail
 
 
@@ -116,6 +118,7 @@ class TestRunWiresSettingsManager:
             no_recursive=False,
             quarantine=False,
             json_output=False,
+            trace=None,
         )
 
         with (
@@ -132,3 +135,42 @@ class TestRunWiresSettingsManager:
         assert (
             mock_scanner_cls.call_args.kwargs["settings_manager"] is mock_settings_cls.return_value
         )
+
+
+def _timed_result(path: str) -> ScanResult:
+    """Build a CLEAN ScanResult carrying phase timing."""
+    result = _clean_result(path)
+    result.timing = ScanTiming(
+        total_seconds=3.0,
+        phases=[PhaseTiming("count", 0.0, 1.0), PhaseTiming("scan", 1.0, 2.0)],
+        files_scanned=10,
+    )
+    return result
+
+
+class TestScanTimingOutput:
+    """Phase timing appears in --json output and --trace files."""
+
+    def test_json_output_includes_timings(self):
+        output = _format_json_output(
+            [_timed_result("/a"), _clean_result("/b")], ["/a", "/b"], 3.0, None
+        )
+
+        assert len(output["timings"]) == 1
+        assert output["timings"][0]["target"] == "/a"
+        assert output["timings"][0]["files_per_second"] == 5.0
+        assert "timings" not in _format_json_output([_clean_result("/b")], ["/b"], 1.0, None)
+
+    def test_write_trace(self, tmp_path):
+        trace_path = tmp_path / "trace.json"
+
+        _write_trace([_timed_result("/a")], str(trace_path))
+
+        trace = json.loads(trace_path.read_text())
+        phases = [e["name"] for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert phases == ["count", "scan"]
+
+    def test_write_trace_reports_errors(self, tmp_path, capsys):
+        _write_trace([_timed_result("/a")], str(tmp_path / "missing" / "trace.json"))
+
+        assert "Could not write trace file" in capsys.readouterr().err
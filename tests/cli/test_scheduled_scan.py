@@ -435,6 +435,128 @@ class TestMain:
         call_kwargs = mock_run.call_args[1]
         assert call_kwargs["targets"] == [home_dir]
 
+    def test_main_skips_when_resident_scheduler_active(self):
+        """Test a timer-triggered run exits when a resident scheduler handles it."""
+        from src.cli.scheduled_scan import main
+
+        with patch("sys.argv", ["clamui-scheduled-scan"]):
+            with patch("src.cli.scheduled_scan.is_resident_scheduler_running", return_value=True):
+                with patch("src.cli.scheduled_scan.run_scheduled_scan") as mock_run:
+                    result = main()
+
+        assert result == 0
+        mock_run.assert_not_called()
+
+    def test_main_skips_timer_run_with_schedule_targets(self):
+        """Test the installed timer command, which passes the saved targets, is skipped."""
+        from src.cli.scheduled_scan import main
+
+        mock_settings = MagicMock()
+        mock_settings.get.side_effect = lambda key, default=None: (
+            ["/data", "/home/user"] if key == "schedule_targets" else default
+        )
+
+        argv = ["clamui-scheduled-scan", "--target", "/home/user", "--target", "/data"]
+        with patch("sys.argv", argv):
+            with patch("src.cli.scheduled_scan.is_resident_scheduler_running", return_value=True):
+                with patch("src.cli.scheduled_scan.SettingsManager", return_value=mock_settings):
+                    with patch("src.cli.scheduled_scan.run_scheduled_scan") as mock_run:
+                        assert main() == 0
+
+        mock_run.assert_not_called()
+
+    def test_main_manual_target_runs_despite_resident_scheduler(self):
+        """Test a manual scan of other targets is not dropped by the resident lock."""
+        from src.cli.scheduled_scan import main
+
+        mock_settings = MagicMock()
+        mock_settings.get.side_effect = lambda key, default=None: (
+            ["/home/user"] if key == "schedule_targets" else default
+        )
+
+        with patch("sys.argv", ["clamui-scheduled-scan", "--target", "/media/usb"]):
+            with patch("src.cli.scheduled_scan.is_resident_scheduler_running", return_value=True):
+                with patch("src.cli.scheduled_scan.SettingsManager", return_value=mock_settings):
+                    with patch("src.cli.scheduled_scan.run_scheduled_scan") as mock_run:
+                        mock_run.return_value = 0
+                        main()
+
+        assert mock_run.call_args[1]["targets"] == ["/media/usb"]
+
+    def test_main_force_runs_despite_resident_scheduler(self):
+        """Test --force scans even while a resident scheduler is active."""
+        from src.cli.scheduled_scan import main
+
+        mock_settings = MagicMock()
+        mock_settings.get.side_effect = lambda key, default: default
+
+        with patch("sys.argv", ["clamui-scheduled-scan", "--force"]):
+            with patch("src.cli.scheduled_scan.is_resident_scheduler_running", return_value=True):
+                with patch("src.cli.scheduled_scan.SettingsManager", return_value=mock_settings):
+                    with patch("src.cli.scheduled_scan.run_scheduled_scan") as mock_run:
+                        mock_run.return_value = 0
+                        main()
+
+        mock_run.assert_called_once()
+
+    def test_main_resident_flag_runs_resident_scheduler(self):
+        """Test --resident hands over to run_resident."""
+        from src.cli.scheduled_scan import main
+
+        with patch("sys.argv", ["clamui-scheduled-scan", "--resident"]):
+            with patch("src.cli.scheduled_scan.run_resident", return_value=0) as mock_resident:
+                assert main() == 0
+
+        mock_resident.assert_called_once_with(verbose=False)
+
+
+class TestResidentScanRunner:
+    """Tests for ResidentScanRunner."""
+
+    def test_runs_reuse_one_scanner(self, tmp_path):
+        """Every run reuses the runner's managers and warm scanner."""
+        from src.cli.scheduled_scan import ResidentScanRunner, ScanResult, ScanStatus
+        from src.core.resource_governor import resolve_policy
+
+        settings = MagicMock()
+        settings.get.side_effect = lambda key, default: {
+            "schedule_targets": [str(tmp_path)],
+            "schedule_skip_on_battery": False,
+        }.get(key, default)
+        scanner = MagicMock()
+        scanner.check_available.return_value = (True, "ClamAV 1.0")
+        scanner.scan_sync.return_value = ScanResult(
+            status=ScanStatus.CLEAN,
+            path=str(tmp_path),
+            stdout="",
+            stderr="",
+            exit_code=0,
+            infected_files=[],
+            scanned_files=3,
+            scanned_dirs=1,
+            infected_count=0,
+            error_message=None,
+            threat_details=[],
+        )
+
+        with patch("src.cli.scheduled_scan.send_notification"):
+            runner = ResidentScanRunner(
+                settings,
+                battery_manager=MagicMock(),
+                log_manager=MagicMock(),
+                scanner=scanner,
+            )
+            assert runner.run() == 0
+            assert runner.run() == 0
+
+        assert scanner.scan_sync.call_count == 2
+        scanner.scan_sync.assert_called_with(
+            str(tmp_path), recursive=True, resource_policy=resolve_policy(None, background=True)
+        )
+
+        runner.cancel()
+        scanner.cancel.assert_called_once()
+
 
 class TestExecuteScans:
     """Tests for the _execute_scans function."""
@@ -0,0 +1,53 @@
+# ClamUI Status Command Tests
+"""
+Tests for the status CLI command's database section.
+"""
+
+from unittest.mock import patch
+
+from src.cli.status_cmd import _collect_database_info
+from src.core.database_inventory import DatabaseFileInfo, DatabaseInventorySnapshot
+
+
+def _collect(snapshot: DatabaseInventorySnapshot) -> dict:
+    with patch("src.cli.status_cmd.get_database_inventory") as inventory:
+        inventory.return_value.get.return_value = snapshot
+        return _collect_database_info()
+
+
+class TestCollectDatabaseInfo:
+    """Tests for _collect_database_info."""
+
+    def test_reports_each_database(self):
+        snapshot = DatabaseInventorySnapshot(
+            directories=["/var/lib/clamav"],
+            files=[
+                DatabaseFileInfo(
+                    name="daily.cld",
+                    path="/var/lib/clamav/daily.cld",
+                    version=27303,
+                    signatures=2071380,
+                    flevel=90,
+                    build_date="19 Oct 2026 08-21 +0000",
+                ),
+                DatabaseFileInfo(name="main.cvd", path="/var/lib/clamav/main.cvd", signatures=10),
+            ],
+        )
+
+        info = _collect(snapshot)
+
+        assert [db["name"] for db in info["databases"]] == ["daily.cld", "main.cvd"]
+        assert info["databases"][0]["version"] == 27303
+        assert info["total_signatures"] == 2071390
+        assert info["errors"] == {}
+
+    def test_directory_errors_only_when_nothing_found(self):
+        snapshot = DatabaseInventorySnapshot(
+            directories=["/var/lib/clamav"],
+            errors={"/var/lib/clamav": "Permission denied accessing: /var/lib/clamav"},
+        )
+
+        info = _collect(snapshot)
+
+        assert info["databases"] == []
+        assert info["errors"] == snapshot.errors
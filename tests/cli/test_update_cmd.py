@@ -0,0 +1,91 @@
+# ClamUI Update Command Tests
+"""
+Tests for the update CLI command, focusing on the --rollback path.
+"""
+
+import argparse
+from unittest.mock import patch
+
+import pytest
+
+from src.cli.update_cmd import EXIT_ERROR, EXIT_SUCCESS, register, run
+from src.core.updater import UpdateResult, UpdateStatus
+
+
+def _parse(*argv: str) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="clamui")
+    subparsers = parser.add_subparsers(dest="command")
+    register(subparsers)
+    return parser.parse_args(["update", *argv])
+
+
+def _result(status: UpdateStatus, **kwargs) -> UpdateResult:
+    defaults = {
+        "stdout": "",
+        "stderr": "",
+        "exit_code": 0 if status == UpdateStatus.SUCCESS else 1,
+        "databases_updated": 0,
+        "error_message": None,
+    }
+    defaults.update(kwargs)
+    return UpdateResult(status=status, **defaults)
+
+
+class TestUpdateArguments:
+    """Tests for update argument parsing."""
+
+    def test_force_and_rollback_are_exclusive(self):
+        with pytest.raises(SystemExit):
+            _parse("--force", "--rollback")
+
+
+class TestRollback:
+    """Tests for clamui update --rollback."""
+
+    def test_rolls_back_when_snapshot_exists(self, capsys):
+        with patch("src.cli.update_cmd.FreshclamUpdater") as updater_cls:
+            updater = updater_cls.return_value
+            updater.has_last_known_good.return_value = True
+            updater.rollback_sync.return_value = _result(UpdateStatus.SUCCESS, databases_updated=3)
+
+            assert run(_parse("--rollback")) == EXIT_SUCCESS
+
+        updater.rollback_sync.assert_called_once_with()
+        updater.update_sync.assert_not_called()
+        assert "3" in capsys.readouterr().out
+
+    def test_without_snapshot_does_not_escalate(self, capsys):
+        with patch("src.cli.update_cmd.FreshclamUpdater") as updater_cls:
+            updater = updater_cls.return_value
+            updater.has_last_known_good.return_value = False
+
+            assert run(_parse("--rollback")) == EXIT_ERROR
+
+        updater.rollback_sync.assert_not_called()
+        assert "error:" in capsys.readouterr().err
+
+    def test_failed_rollback_reports_json(self, capsys):
+        with patch("src.cli.update_cmd.FreshclamUpdater") as updater_cls:
+            updater = updater_cls.return_value
+            updater.has_last_known_good.return_value = True
+            updater.rollback_sync.return_value = _result(
+                UpdateStatus.ERROR, error_message="incomplete"
+            )
+
+            assert run(_parse("--rollback", "--json")) == EXIT_ERROR
+
+        assert '"error": "incomplete"' in capsys.readouterr().out
+
+
+class TestUpdate:
+    """Tests for plain clamui update."""
+
+    def test_passes_force(self):
+        with patch("src.cli.update_cmd.FreshclamUpdater") as updater_cls:
+            updater = updater_cls.return_value
+            updater.update_sync.return_value = _result(UpdateStatus.UP_TO_DATE)
+
+            assert run(_parse("--force")) == EXIT_SUCCESS
+
+        updater.update_sync.assert_called_once_with(force=True)
+        updater.rollback_sync.assert_not_called()
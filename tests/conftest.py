@@ -206,6 +206,35 @@ def reset_flatpak_cache():
     os.path.exists = original_exists
 
 
+@pytest.fixture(autouse=True)
+def reset_probe_registry():
+    """
+    Forget cached ClamAV probe results around each test.
+
+    clamav_detection memoizes check_clamav_installed() and friends in the
+    shared probe registry (and database headers in the database inventory),
+    so a result produced under one test's mocks would otherwise be served to
+    the next test. The process-wide VirusTotal request window is cleared for
+    the same reason.
+    """
+    import sys as _sys
+
+    def clear():
+        probe_module = _sys.modules.get("src.core.clamav_probe")
+        if probe_module is not None:
+            probe_module.get_probe_registry().invalidate()
+        inventory_module = _sys.modules.get("src.core.database_inventory")
+        if inventory_module is not None:
+            inventory_module.get_database_inventory().invalidate()
+        virustotal_module = _sys.modules.get("src.core.virustotal")
+        if virustotal_module is not None:
+            virustotal_module._request_window.times = []
+
+    clear()
+    yield
+    clear()
+
+
 # =============================================================================
 # Module Cache Management
 # =============================================================================
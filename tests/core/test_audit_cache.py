@@ -0,0 +1,253 @@
+# ClamUI Audit Cache Tests
+"""Unit tests for the persistent, incremental audit cache."""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core import audit_cache
+from src.core.audit_cache import (
+    AuditCache,
+    AuditChange,
+    compute_fingerprint,
+    diff_reports,
+    run_incremental_audit,
+    section_from_dict,
+    section_to_dict,
+)
+from src.core.system_audit import (
+    AuditCategory,
+    AuditCheckResult,
+    AuditInputs,
+    AuditReport,
+    AuditSectionResult,
+    AuditStatus,
+)
+
+
+def _section(category=AuditCategory.SSH_HARDENING, status=AuditStatus.PASS, name="Root Login"):
+    return AuditSectionResult(
+        category=category,
+        title="SSH Security",
+        icon_name="network-server-symbolic",
+        checks=[AuditCheckResult(name=name, status=status, detail="d", info_url="https://x")],
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AuditCache(str(tmp_path / "audit_cache.json"))
+
+
+@pytest.fixture
+def host_state(tmp_path):
+    """A fake sshd_config plus patched unit states and boot id."""
+    config = tmp_path / "sshd_config"
+    config.write_text("PermitRootLogin no\n")
+    with (
+        patch.object(audit_cache, "get_systemd_unit_states", return_value={"sshd": "active"}),
+        patch.object(audit_cache, "_read_boot_id", return_value="boot-1"),
+        patch.object(audit_cache, "is_flatpak", return_value=False),
+    ):
+        yield config
+
+
+def _ssh_check(config_path):
+    """A check registered with inputs, backed by a MagicMock."""
+    check = MagicMock(return_value=_section())
+    check.__name__ = "check_ssh"
+    inputs = {check: AuditInputs(paths=(str(config_path),))}
+    sections = {check: (AuditCategory.SSH_HARDENING, "SSH Security", "icon")}
+    return check, inputs, sections
+
+
+class TestSerialization:
+    """Tests for section round-tripping."""
+
+    def test_round_trip(self):
+        section = _section()
+        section.checks[0].launch_command = "gufw"
+        assert section_from_dict(json.loads(json.dumps(section_to_dict(section)))) == section
+
+
+class TestFingerprint:
+    """Tests for input fingerprints."""
+
+    def test_changes_when_file_changes(self, tmp_path):
+        path = tmp_path / "sshd_config"
+        path.write_text("a")
+        inputs = AuditInputs(paths=(str(path),))
+        with patch.object(audit_cache, "is_flatpak", return_value=False):
+            before = compute_fingerprint(inputs, {}, "boot")
+            assert compute_fingerprint(inputs, {}, "boot") == before
+            path.write_text("longer content")
+            assert compute_fingerprint(inputs, {}, "boot") != before
+
+    def test_tracks_directory_entries(self, tmp_path):
+        drop_ins = tmp_path / "sshd_config.d"
+        drop_ins.mkdir()
+        (drop_ins / "10-a.conf").write_text("a")
+        inputs = AuditInputs(dirs=(str(drop_ins),))
+        with patch.object(audit_cache, "is_flatpak", return_value=False):
+            before = compute_fingerprint(inputs, {}, "boot")
+            stat = os.stat(drop_ins / "10-a.conf")
+            (drop_ins / "10-a.conf").write_text("b-longer")
+            os.utime(drop_ins, ns=(stat.st_atime_ns, os.stat(drop_ins).st_mtime_ns))
+            assert compute_fingerprint(inputs, {}, "boot") != before
+
+    def test_changes_with_units_and_boot(self):
+        inputs = AuditInputs()
+        with patch.object(audit_cache, "is_flatpak", return_value=False):
+            base = compute_fingerprint(inputs, {"ufw": "active"}, "boot")
+            assert compute_fingerprint(inputs, {"ufw": "inactive"}, "boot") != base
+            assert compute_fingerprint(inputs, {"ufw": "active"}, "other") != base
+
+    def test_unobservable_state_has_no_fingerprint(self):
+        assert compute_fingerprint(AuditInputs(), None, "boot") is None
+        assert compute_fingerprint(AuditInputs(), {}, None) is None
+
+    def test_flatpak_without_broker_has_no_fingerprint(self):
+        with (
+            patch.object(audit_cache, "is_flatpak", return_value=True),
+            patch.object(audit_cache, "get_host_broker", return_value=None),
+        ):
+            assert compute_fingerprint(AuditInputs(paths=("/etc",)), {}, "boot") is None
+
+
+class TestAuditCache:
+    """Tests for AuditCache persistence."""
+
+    def test_hit_requires_matching_fingerprint(self, cache):
+        cache.put(_section(), "fp1")
+        assert cache.get(AuditCategory.SSH_HARDENING, "fp1", 3600) == _section()
+        assert cache.get(AuditCategory.SSH_HARDENING, "fp2", 3600) is None
+        assert cache.get(AuditCategory.SSH_HARDENING, None, 3600) is None
+
+    def test_max_age(self, cache):
+        cache.put(_section(), "fp")
+        assert cache.get(AuditCategory.SSH_HARDENING, "fp", 0) is None
+
+    def test_persists_entries_and_report(self, cache):
+        cache.put(_section(), "fp")
+        cache.set_report(AuditReport(sections=[_section()], timestamp=123.0))
+        assert cache.save()
+
+        reloaded = AuditCache(str(cache.path))
+        assert reloaded.get(AuditCategory.SSH_HARDENING, "fp", 3600) == _section()
+        assert reloaded.previous_report().timestamp == 123.0
+        assert oct(cache.path.stat().st_mode & 0o777) == "0o600"
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        path = tmp_path / "audit_cache.json"
+        path.write_text("{not json")
+        cache = AuditCache(str(path))
+        assert cache.previous_report() is None
+
+    def test_other_version_is_ignored(self, tmp_path):
+        path = tmp_path / "audit_cache.json"
+        path.write_text(json.dumps({"version": 0, "checks": {"x": {}}, "report": None}))
+        assert AuditCache(str(path)).get(AuditCategory.SSH_HARDENING, "fp", 3600) is None
+
+
+class TestDiffReports:
+    """Tests for change detection between audits."""
+
+    def test_first_audit_has_no_changes(self):
+        assert diff_reports(None, AuditReport(sections=[_section()])) == []
+
+    def test_status_added_and_removed(self):
+        old = AuditReport(sections=[_section(name="A"), _section(name="B")])
+        old.sections[0].checks[0].status = AuditStatus.PASS
+        new = AuditReport(
+            sections=[_section(name="A", status=AuditStatus.FAIL), _section(name="C")]
+        )
+
+        changes = diff_reports(old, new)
+
+        cat = AuditCategory.SSH_HARDENING
+        assert changes == [
+            AuditChange(cat, "A", AuditStatus.PASS, AuditStatus.FAIL),
+            AuditChange(cat, "C", None, AuditStatus.PASS),
+            AuditChange(cat, "B", AuditStatus.PASS, None),
+        ]
+
+
+class TestIncrementalAudit:
+    """Tests for run_incremental_audit()."""
+
+    def test_unchanged_inputs_are_served_from_cache(self, cache, host_state):
+        check, inputs, sections = _ssh_check(host_state)
+        with (
+            patch.dict(audit_cache.CHECK_INPUTS, inputs),
+            patch.dict("src.core.system_audit._CHECK_SECTIONS", sections),
+        ):
+            first = run_incremental_audit([check], cache=cache)
+            second = run_incremental_audit([check], cache=AuditCache(str(cache.path)))
+
+        check.assert_called_once()
+        assert first.cached == []
+        assert second.cached == [AuditCategory.SSH_HARDENING]
+        assert second.report.sections == [_section()]
+        assert second.changes == []
+
+    def test_changed_input_reruns_and_reports_diff(self, cache, host_state):
+        check, inputs, sections = _ssh_check(host_state)
+        with (
+            patch.dict(audit_cache.CHECK_INPUTS, inputs),
+            patch.dict("src.core.system_audit._CHECK_SECTIONS", sections),
+        ):
+            run_incremental_audit([check], cache=cache)
+            host_state.write_text("PermitRootLogin yes\n")
+            check.return_value = _section(status=AuditStatus.FAIL)
+            result = run_incremental_audit([check], cache=cache)
+
+        assert check.call_count == 2
+        assert result.cached == []
+        assert result.changes == [
+            AuditChange(
+                AuditCategory.SSH_HARDENING, "Root Login", AuditStatus.PASS, AuditStatus.FAIL
+            )
+        ]
+
+    def test_force_reruns_everything(self, cache, host_state):
+        check, inputs, sections = _ssh_check(host_state)
+        with (
+            patch.dict(audit_cache.CHECK_INPUTS, inputs),
+            patch.dict("src.core.system_audit._CHECK_SECTIONS", sections),
+        ):
+            run_incremental_audit([check], cache=cache)
+            run_incremental_audit([check], cache=cache, force=True)
+
+        assert check.call_count == 2
+
+    def test_checks_without_inputs_always_run(self, cache, host_state):
+        check = MagicMock(return_value=_section(AuditCategory.PORTMASTER))
+        run_incremental_audit([check], cache=cache)
+        run_incremental_audit([check], cache=cache)
+        assert check.call_count == 2
+
+    def test_unknown_sections_are_not_cached(self, cache, host_state):
+        check, inputs, sections = _ssh_check(host_state)
+        check.return_value = _section(status=AuditStatus.UNKNOWN)
+        with (
+            patch.dict(audit_cache.CHECK_INPUTS, inputs),
+            patch.dict("src.core.system_audit._CHECK_SECTIONS", sections),
+        ):
+            run_incremental_audit([check], cache=cache)
+            run_incremental_audit([check], cache=cache)
+
+        assert check.call_count == 2
+
+    def test_cached_sections_are_reported_first(self, cache, host_state):
+        check, inputs, sections = _ssh_check(host_state)
+        seen = []
+        with (
+            patch.dict(audit_cache.CHECK_INPUTS, inputs),
+            patch.dict("src.core.system_audit._CHECK_SECTIONS", sections),
+        ):
+            run_incremental_audit([check], cache=cache)
+            run_incremental_audit([check], cache=cache, on_result=seen.append)
+
+        assert seen == [_section()]
@@ -4,6 +4,8 @@
 import subprocess
 from unittest import mock
 
+import pytest
+
 from src.core import clamav_detection
 
 
@@ -91,24 +93,19 @@ class TestCheckClamavInstalled:
                 assert installed is False
                 assert "error" in message.lower()
 
-    def test_check_clamav_uses_wrap_host_command(self):
-        """Test check_clamav_installed uses wrap_host_command for Flatpak support."""
+    def test_check_clamav_uses_run_host_command(self):
+        """Test check_clamav_installed runs the version check on the host."""
         with mock.patch.object(
             clamav_detection, "which_host_command", return_value="/usr/bin/clamscan"
         ):
-            with mock.patch.object(
-                clamav_detection,
-                "wrap_host_command",
-                return_value=["clamscan", "--version"],
-            ) as mock_wrap:
-                with mock.patch("subprocess.run") as mock_run:
-                    mock_run.return_value = mock.Mock(
-                        returncode=0,
-                        stdout="ClamAV 1.2.3\n",
-                        stderr="",
-                    )
-                    clamav_detection.check_clamav_installed()
-                    mock_wrap.assert_called_once_with(["clamscan", "--version"])
+            with mock.patch.object(clamav_detection, "run_host_command") as mock_host:
+                mock_host.return_value = mock.Mock(
+                    returncode=0,
+                    stdout="ClamAV 1.2.3\n",
+                    stderr="",
+                )
+                clamav_detection.check_clamav_installed()
+                mock_host.assert_called_once_with(["clamscan", "--version"], timeout=10)
 
 
 class TestCheckFreshclamInstalled:
@@ -195,24 +192,19 @@ class TestCheckFreshclamInstalled:
                 assert installed is False
                 assert "error" in message.lower()
 
-    def test_check_freshclam_uses_wrap_host_command(self):
-        """Test check_freshclam_installed uses wrap_host_command for Flatpak support."""
+    def test_check_freshclam_uses_run_host_command(self):
+        """Test check_freshclam_installed runs the version check on the host."""
         with mock.patch.object(
             clamav_detection, "which_host_command", return_value="/usr/bin/freshclam"
         ):
-            with mock.patch.object(
-                clamav_detection,
-                "wrap_host_command",
-                return_value=["freshclam", "--version"],
-            ) as mock_wrap:
-                with mock.patch("subprocess.run") as mock_run:
-                    mock_run.return_value = mock.Mock(
-                        returncode=0,
-                        stdout="ClamAV 1.2.3\n",
-                        stderr="",
-                    )
-                    clamav_detection.check_freshclam_installed()
-                    mock_wrap.assert_called_once_with(["freshclam", "--version"])
+            with mock.patch.object(clamav_detection, "run_host_command") as mock_host:
+                mock_host.return_value = mock.Mock(
+                    returncode=0,
+                    stdout="ClamAV 1.2.3\n",
+                    stderr="",
+                )
+                clamav_detection.check_freshclam_installed()
+                mock_host.assert_called_once_with(["freshclam", "--version"], timeout=10)
 
     def test_check_freshclam_flatpak_uses_host_version_command(self):
         """Flatpak freshclam check should not generate sandbox config."""
@@ -220,27 +212,17 @@ class TestCheckFreshclamInstalled:
             clamav_detection, "which_host_command", return_value="/usr/bin/freshclam"
         ):
             with mock.patch.object(clamav_detection, "is_flatpak", return_value=True):
-                with mock.patch.object(
-                    clamav_detection,
-                    "wrap_host_command",
-                    return_value=[
-                        "flatpak-spawn",
-                        "--host",
-                        "freshclam",
-                        "--version",
-                    ],
-                ) as mock_wrap:
-                    with mock.patch("subprocess.run") as mock_run:
-                        mock_run.return_value = mock.Mock(
-                            returncode=0,
-                            stdout="ClamAV 1.2.3\n",
-                            stderr="",
-                        )
-                        installed, version = clamav_detection.check_freshclam_installed()
+                with mock.patch.object(clamav_detection, "run_host_command") as mock_host:
+                    mock_host.return_value = mock.Mock(
+                        returncode=0,
+                        stdout="ClamAV 1.2.3\n",
+                        stderr="",
+                    )
+                    installed, version = clamav_detection.check_freshclam_installed()
 
         assert installed is True
         assert "ClamAV" in version
-        mock_wrap.assert_called_once_with(["freshclam", "--version"])
+        mock_host.assert_called_once_with(["freshclam", "--version"], timeout=10)
 
 
 class TestCheckClamdscanInstalled:
@@ -337,25 +319,20 @@ class TestCheckClamdscanInstalled:
             assert installed is False
             assert "not installed" in message.lower()
 
-    def test_check_clamdscan_uses_wrap_host_command_with_force_host(self):
-        """Test check_clamdscan_installed uses wrap_host_command with force_host=True."""
+    def test_check_clamdscan_uses_run_host_command(self):
+        """Test check_clamdscan_installed runs clamdscan on the host."""
         with mock.patch.object(
             clamav_detection, "which_host_command", return_value="/usr/bin/clamdscan"
         ):
-            with mock.patch.object(
-                clamav_detection,
-                "wrap_host_command",
-                return_value=["clamdscan", "--version"],
-            ) as mock_wrap:
-                with mock.patch("subprocess.run") as mock_run:
-                    mock_run.return_value = mock.Mock(
-                        returncode=0,
-                        stdout="ClamAV 1.2.3\n",
-                        stderr="",
-                    )
-                    clamav_detection.check_clamdscan_installed()
-                    # Uses force_host=True because clamdscan must talk to HOST's daemon
-                    mock_wrap.assert_called_once_with(["clamdscan", "--version"], force_host=True)
+            with mock.patch.object(clamav_detection, "run_host_command") as mock_host:
+                mock_host.return_value = mock.Mock(
+                    returncode=0,
+                    stdout="ClamAV 1.2.3\n",
+                    stderr="",
+                )
+                clamav_detection.check_clamdscan_installed()
+                # clamdscan must talk to the HOST's daemon
+                mock_host.assert_called_once_with(["clamdscan", "--version"], timeout=10)
 
 
 class TestGetClamdSocketPath:
@@ -659,36 +636,25 @@ class TestCheckClamdConnection:
                         "detect_clamd_conf_path",
                         return_value="/etc/clamd.d/scan.conf",
                     ):
-                        with mock.patch.object(
-                            clamav_detection,
-                            "wrap_host_command",
-                            return_value=[
-                                "clamdscan",
-                                "--config-file",
-                                "/etc/clamd.d/scan.conf",
-                                "--ping",
-                                "3",
-                            ],
-                        ) as mock_wrap:
-                            with mock.patch("subprocess.run") as mock_run:
-                                mock_run.return_value = mock.Mock(
-                                    returncode=0,
-                                    stdout="PONG\n",
-                                    stderr="",
-                                )
-                                is_connected, message = clamav_detection.check_clamd_connection()
-                                assert is_connected is True
-                                assert message == "PONG"
-                                mock_wrap.assert_called_once_with(
-                                    [
-                                        "clamdscan",
-                                        "--config-file",
-                                        "/etc/clamd.d/scan.conf",
-                                        "--ping",
-                                        "3",
-                                    ],
-                                    force_host=True,
-                                )
+                        with mock.patch.object(clamav_detection, "run_host_command") as mock_host:
+                            mock_host.return_value = mock.Mock(
+                                returncode=0,
+                                stdout="PONG\n",
+                                stderr="",
+                            )
+                            is_connected, message = clamav_detection.check_clamd_connection()
+                            assert is_connected is True
+                            assert message == "PONG"
+                            mock_host.assert_called_once_with(
+                                [
+                                    "clamdscan",
+                                    "--config-file",
+                                    "/etc/clamd.d/scan.conf",
+                                    "--ping",
+                                    "3",
+                                ],
+                                timeout=10,
+                            )
 
     def test_check_clamd_connection_permission_denied_mentions_socket_permissions(self):
         """Test permission errors mention LocalSocket permissions when config is known."""
@@ -723,30 +689,23 @@ class TestCheckClamdConnection:
                         assert "localsocketgroup" in message.lower()
                         assert "/etc/clamd.d/scan.conf" in message
 
-    def test_check_clamd_connection_uses_wrap_host_command_with_force_host(self):
-        """Test check_clamd_connection uses wrap_host_command with force_host=True."""
+    def test_check_clamd_connection_uses_run_host_command(self):
+        """Test check_clamd_connection pings the daemon from the host."""
         with mock.patch.object(
             clamav_detection,
             "check_clamdscan_installed",
             return_value=(True, "ClamAV 1.2.3"),
         ):
             with mock.patch.object(clamav_detection, "is_flatpak", return_value=True):
-                with mock.patch.object(
-                    clamav_detection,
-                    "wrap_host_command",
-                    return_value=["clamdscan", "--ping", "3"],
-                ) as mock_wrap:
-                    with mock.patch("subprocess.run") as mock_run:
-                        mock_run.return_value = mock.Mock(
-                            returncode=0,
-                            stdout="PONG\n",
-                            stderr="",
-                        )
-                        clamav_detection.check_clamd_connection()
-                        # Uses force_host=True because daemon runs on HOST
-                        mock_wrap.assert_called_once_with(
-                            ["clamdscan", "--ping", "3"], force_host=True
-                        )
+                with mock.patch.object(clamav_detection, "run_host_command") as mock_host:
+                    mock_host.return_value = mock.Mock(
+                        returncode=0,
+                        stdout="PONG\n",
+                        stderr="",
+                    )
+                    clamav_detection.check_clamd_connection()
+                    # The daemon runs on the HOST
+                    mock_host.assert_called_once_with(["clamdscan", "--ping", "3"], timeout=10)
 
 
 class TestGetClamavPath:
@@ -806,138 +765,116 @@ class TestGetFreshclamPath:
 class TestCheckDatabaseAvailable:
     """Tests for check_database_available() function."""
 
-    def test_check_database_available_with_cvd_file(self, tmp_path):
-        """Test check_database_available returns True when .cvd file exists."""
-        # Create a mock database file
-        db_file = tmp_path / "main.cvd"
-        db_file.write_text("mock database content")
-
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=tmp_path) as mock_path:
-                # Make Path("/var/lib/clamav") return tmp_path
-                mock_path.return_value = tmp_path
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is True
-                assert error is None
-
-    def test_check_database_available_with_cld_file(self, tmp_path):
-        """Test check_database_available returns True when .cld file exists."""
-        db_file = tmp_path / "daily.cld"
-        db_file.write_text("mock database content")
+    @pytest.fixture
+    def database_dirs(self, tmp_path):
+        """Point the database inventory at tmp_path in native mode."""
+        dirs = [str(tmp_path)]
+        with (
+            mock.patch.object(clamav_detection, "is_flatpak", return_value=False),
+            mock.patch("src.core.database_inventory.is_flatpak", return_value=False),
+            mock.patch.object(clamav_detection, "get_host_database_dirs", return_value=dirs),
+        ):
+            yield dirs
 
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=tmp_path):
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is True
-                assert error is None
+    @pytest.mark.parametrize("name", ["main.cvd", "daily.cld", "bytecode.cud", "main.CVD"])
+    def test_check_database_available_with_database_file(self, tmp_path, database_dirs, name):
+        """Test check_database_available returns True for any database extension."""
+        (tmp_path / name).write_text("mock database content")
 
-    def test_check_database_available_with_cud_file(self, tmp_path):
-        """Test check_database_available returns True when .cud file exists."""
-        db_file = tmp_path / "bytecode.cud"
-        db_file.write_text("mock database content")
+        is_available, error = clamav_detection.check_database_available()
+        assert is_available is True
+        assert error is None
 
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=tmp_path):
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is True
-                assert error is None
-
-    def test_check_database_available_empty_directory(self, tmp_path):
+    def test_check_database_available_empty_directory(self, database_dirs):
         """Test check_database_available returns False when directory is empty."""
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=tmp_path):
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is False
-                assert "No virus database files found" in error
+        is_available, error = clamav_detection.check_database_available()
+        assert is_available is False
+        assert "No virus database files found" in error
 
-    def test_check_database_available_no_database_files(self, tmp_path):
+    def test_check_database_available_no_database_files(self, tmp_path, database_dirs):
         """Test check_database_available returns False when no .cvd/.cld/.cud files exist."""
-        # Create some non-database files
         (tmp_path / "readme.txt").write_text("readme")
         (tmp_path / "config.conf").write_text("config")
 
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=tmp_path):
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is False
-                assert "No virus database files found" in error
+        is_available, error = clamav_detection.check_database_available()
+        assert is_available is False
+        assert "No virus database files found" in error
 
-    def test_check_database_available_directory_not_exists(self, tmp_path):
+    def test_check_database_available_directory_not_exists(self, tmp_path, database_dirs):
         """Test check_database_available returns False when directory doesn't exist."""
-        non_existent = tmp_path / "non_existent"
+        database_dirs[0] = str(tmp_path / "non_existent")
 
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=non_existent):
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is False
-                assert "does not exist" in error
+        is_available, error = clamav_detection.check_database_available()
+        assert is_available is False
+        assert "does not exist" in error
 
-    def test_check_database_available_permission_error(self, tmp_path):
+    def test_check_database_available_permission_error(self, database_dirs):
         """Test check_database_available handles permission errors."""
-        # Create a mock Path object that raises PermissionError on iterdir()
-        mock_path = mock.MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.iterdir.side_effect = PermissionError("Access denied")
-
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=mock_path):
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is False
-                assert "Permission denied" in error
+        with mock.patch("os.scandir", side_effect=PermissionError("Access denied")):
+            is_available, error = clamav_detection.check_database_available()
+        assert is_available is False
+        assert "Permission denied" in error
 
-    def test_check_database_available_oserror(self, tmp_path):
+    def test_check_database_available_oserror(self, database_dirs):
         """Test check_database_available handles OS errors."""
-        # Create a mock Path object that raises OSError on iterdir()
-        mock_path = mock.MagicMock()
-        mock_path.exists.return_value = True
-        mock_path.iterdir.side_effect = OSError("Disk error")
-
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=mock_path):
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is False
-                assert "Error accessing database" in error
+        with mock.patch("os.scandir", side_effect=OSError("Disk error")):
+            is_available, error = clamav_detection.check_database_available()
+        assert is_available is False
+        assert "Error accessing database" in error
+
+    def test_check_database_available_uses_secondary_directory(self, tmp_path, database_dirs):
+        """Test databases outside the primary directory still count."""
+        secondary = tmp_path / "local"
+        secondary.mkdir()
+        (secondary / "main.cvd").write_text("mock database content")
+        database_dirs[0] = str(tmp_path / "missing")
+        database_dirs.append(str(secondary))
+
+        is_available, error = clamav_detection.check_database_available()
+        assert is_available is True
+        assert error is None
 
     def test_check_database_available_flatpak_with_host_database(self):
         """Test check_database_available in Flatpak checks host database dirs."""
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=True):
-            with mock.patch.object(
-                clamav_detection, "_host_database_dirs_to_check", return_value=["/var/lib/clamav"]
-            ):
-                with mock.patch.object(
-                    clamav_detection,
-                    "_host_path_contains_database_file",
-                    return_value=(True, None),
-                ):
-                    is_available, error = clamav_detection.check_database_available()
-                    assert is_available is True
-                    assert error is None
+        broker = mock.MagicMock()
+        broker.batch.side_effect = lambda requests: [
+            {"paths": ["/var/lib/clamav/main.cvd"]}
+            if op == "glob"
+            else {"data": ""}
+            if op == "read_range"
+            else {"size": 1, "mtime_ns": 1}
+            for op, _params in requests
+        ]
+        with (
+            mock.patch.object(clamav_detection, "is_flatpak", return_value=True),
+            mock.patch("src.core.database_inventory.is_flatpak", return_value=True),
+            mock.patch("src.core.database_inventory.get_host_broker", return_value=broker),
+            mock.patch.object(
+                clamav_detection, "get_host_database_dirs", return_value=["/var/lib/clamav"]
+            ),
+        ):
+            is_available, error = clamav_detection.check_database_available()
+        assert is_available is True
+        assert error is None
 
     def test_check_database_available_flatpak_no_host_database(self):
         """Test check_database_available in Flatpak when host databases are missing."""
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=True):
-            with mock.patch.object(
-                clamav_detection, "_host_database_dirs_to_check", return_value=["/var/lib/clamav"]
-            ):
-                with mock.patch.object(
-                    clamav_detection,
-                    "_host_path_contains_database_file",
-                    return_value=(False, "No virus database files found"),
-                ):
-                    is_available, error = clamav_detection.check_database_available()
-                    assert is_available is False
-                    assert "host ClamAV virus database" in error
-
-    def test_check_database_available_case_insensitive_extension(self, tmp_path):
-        """Test check_database_available handles uppercase extensions."""
-        db_file = tmp_path / "main.CVD"
-        db_file.write_text("mock database content")
-
-        with mock.patch.object(clamav_detection, "is_flatpak", return_value=False):
-            with mock.patch("src.core.clamav_detection.Path", return_value=tmp_path):
-                is_available, error = clamav_detection.check_database_available()
-                assert is_available is True
-                assert error is None
+        with (
+            mock.patch.object(clamav_detection, "is_flatpak", return_value=True),
+            mock.patch("src.core.database_inventory.is_flatpak", return_value=True),
+            mock.patch("src.core.database_inventory.get_host_broker", return_value=None),
+            mock.patch(
+                "src.core.database_inventory.run_host_command",
+                return_value=mock.MagicMock(returncode=0, stdout=b""),
+            ),
+            mock.patch.object(
+                clamav_detection, "get_host_database_dirs", return_value=["/var/lib/clamav"]
+            ),
+        ):
+            is_available, error = clamav_detection.check_database_available()
+        assert is_available is False
+        assert "host ClamAV virus database" in error
+        assert "/var/lib/clamav" in error
 
 
 class TestConfigFileExists:
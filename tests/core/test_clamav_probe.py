@@ -0,0 +1,230 @@
+# ClamUI ClamAV Probe Registry Tests
+"""Unit tests for the shared ClamAV probe registry."""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from src.core import clamav_detection
+from src.core.clamav_probe import ProbeRegistry, get_probe_registry
+
+
+@pytest.fixture
+def registry():
+    """Create an isolated registry."""
+    return ProbeRegistry(max_workers=4)
+
+
+class TestProbeRegistry:
+    """Tests for caching, TTLs and invalidation."""
+
+    def test_result_is_cached(self, registry):
+        probe = mock.Mock(return_value=(True, "ClamAV 1.4"))
+        registry.register("clamscan", probe)
+
+        assert registry.get("clamscan") == (True, "ClamAV 1.4")
+        assert registry.get("clamscan") == (True, "ClamAV 1.4")
+
+        probe.assert_called_once()
+        assert registry.get_stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    def test_arguments_are_part_of_key(self, registry):
+        probe = mock.Mock(side_effect=lambda socket, config: (True, f"{socket}:{config}"))
+        registry.register("clamd", probe)
+
+        assert registry.get("clamd", None, "/etc/a.conf") == (True, "None:/etc/a.conf")
+        assert registry.get("clamd", None, "/etc/b.conf") == (True, "None:/etc/b.conf")
+        assert probe.call_count == 2
+
+    def test_failures_use_negative_ttl(self, registry):
+        probe = mock.Mock(side_effect=[(False, "not installed"), (True, "ClamAV 1.4")])
+        registry.register("clamscan", probe, ttl=300, negative_ttl=0)
+
+        assert registry.get("clamscan") == (False, "not installed")
+        assert registry.get("clamscan") == (True, "ClamAV 1.4")
+
+    def test_expired_entry_reruns_probe(self, registry):
+        probe = mock.Mock(return_value=(True, "v"))
+        registry.register("clamscan", probe, ttl=10)
+        registry.get("clamscan")
+
+        with mock.patch("src.core.clamav_probe.time.monotonic", return_value=time.monotonic() + 11):
+            registry.get("clamscan")
+
+        assert probe.call_count == 2
+
+    def test_refresh_flag_bypasses_cache(self, registry):
+        probe = mock.Mock(return_value=(True, "v"))
+        registry.register("clamscan", probe)
+        registry.get("clamscan")
+
+        registry.get("clamscan", refresh=True)
+
+        assert probe.call_count == 2
+
+    def test_watched_path_change_invalidates(self, registry, tmp_path):
+        binary = tmp_path / "clamscan"
+        binary.write_text("v1")
+        probe = mock.Mock(return_value=(True, "v"))
+        registry.register("clamscan", probe, watch=lambda: [str(binary)])
+        registry.get("clamscan")
+        registry.get("clamscan")
+        assert probe.call_count == 1
+
+        # An upgrade replaces the binary (new inode)
+        binary.unlink()
+        binary.write_text("v2-longer")
+        registry.get("clamscan")
+
+        assert probe.call_count == 2
+
+    def test_new_file_in_watched_directory_invalidates(self, registry, tmp_path):
+        db_dir = tmp_path / "clamav"
+        db_dir.mkdir()
+        probe = mock.Mock(return_value=(True, None))
+        registry.register("database", probe, watch=lambda: [str(db_dir)])
+        registry.get("database")
+
+        (db_dir / "daily.cld").write_bytes(b"db")
+        registry.get("database")
+
+        assert probe.call_count == 2
+
+    def test_invalidate_by_name(self, registry):
+        clamscan = mock.Mock(return_value=(True, "v"))
+        freshclam = mock.Mock(return_value=(True, "v"))
+        registry.register("clamscan", clamscan)
+        registry.register("freshclam", freshclam)
+        registry.get("clamscan")
+        registry.get("freshclam")
+
+        registry.invalidate("clamscan")
+        registry.get("clamscan")
+        registry.get("freshclam")
+
+        assert clamscan.call_count == 2
+        assert freshclam.call_count == 1
+
+    @pytest.mark.parametrize(
+        "invalidate",
+        [
+            lambda registry: registry.invalidate("clamscan"),
+            lambda registry: registry.invalidate(),
+        ],
+    )
+    def test_invalidate_during_run_discards_result(self, registry, invalidate):
+        started, release = threading.Event(), threading.Event()
+        results = iter([(False, "old"), (True, "new")])
+
+        def probe():
+            started.set()
+            release.wait(5)
+            return next(results)
+
+        registry.register("clamscan", probe)
+        thread = threading.Thread(target=registry.get, args=("clamscan",))
+        thread.start()
+        assert started.wait(5)
+        invalidate(registry)
+        release.set()
+        thread.join()
+
+        assert registry.peek("clamscan") is None
+        assert registry.get("clamscan") == (True, "new")
+
+    def test_exception_is_not_cached(self, registry):
+        probe = mock.Mock(side_effect=[OSError("boom"), (True, "v")])
+        registry.register("clamscan", probe)
+
+        with pytest.raises(OSError):
+            registry.get("clamscan")
+        assert registry.get("clamscan") == (True, "v")
+
+    def test_concurrent_lookups_share_one_run(self, registry):
+        release = threading.Event()
+        calls = []
+
+        def slow_probe():
+            calls.append(1)
+            release.wait(5)
+            return (True, "v")
+
+        registry.register("clamscan", slow_probe)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(registry.get("clamscan")))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(0.1)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert results == [(True, "v")] * 5
+
+    def test_refresh_runs_probes_concurrently(self, registry):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def probe(name):
+            def run():
+                # Deadlocks (BrokenBarrierError) unless all three run at once
+                barrier.wait()
+                return (True, name)
+
+            return run
+
+        for name in ("clamscan", "freshclam", "clamdscan"):
+            registry.register(name, probe(name))
+
+        results = registry.refresh(["clamscan", "freshclam", "clamdscan"])
+
+        assert results == {
+            "clamscan": (True, "clamscan"),
+            "freshclam": (True, "freshclam"),
+            "clamdscan": (True, "clamdscan"),
+        }
+
+    def test_unknown_probe(self, registry):
+        with pytest.raises(KeyError):
+            registry.get("missing")
+
+
+class TestClamAVDetectionProbes:
+    """Tests for the cached check_* functions in clamav_detection."""
+
+    def test_back_to_back_checks_spawn_once(self):
+        with (
+            mock.patch.object(
+                clamav_detection, "which_host_command", return_value="/usr/bin/clamscan"
+            ),
+            mock.patch.object(clamav_detection, "run_host_command") as mock_host,
+        ):
+            mock_host.return_value = mock.Mock(returncode=0, stdout="ClamAV 1.4.1\n", stderr="")
+            first = clamav_detection.check_clamav_installed()
+            second = clamav_detection.check_clamav_installed()
+
+        assert first == second == (True, "ClamAV 1.4.1")
+        mock_host.assert_called_once()
+
+    def test_refresh_clamav_probes_forces_rerun(self):
+        with (
+            mock.patch.object(
+                clamav_detection, "which_host_command", return_value="/usr/bin/clamscan"
+            ),
+            mock.patch.object(clamav_detection, "run_host_command") as mock_host,
+            mock.patch.object(clamav_detection, "_probe_database", return_value=(True, None)),
+        ):
+            mock_host.return_value = mock.Mock(returncode=0, stdout="ClamAV 1.4.1\n", stderr="")
+            clamav_detection.check_clamav_installed()
+            clamav_detection.refresh_clamav_probes(include_daemon=False)
+
+        # clamscan twice, plus freshclam and clamdscan once each
+        assert mock_host.call_count == 4
+
+    def test_shared_instance(self):
+        assert get_probe_registry() is get_probe_registry()
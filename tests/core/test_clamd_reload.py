@@ -0,0 +1,181 @@
+# ClamUI clamd Reload Tests
+"""Unit tests for post-update clamd reload coordination."""
+
+import socket
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core import clamd_reload
+from src.core.clamd_reload import (
+    parse_daily_version,
+    reload_clamd,
+    wait_for_clamd_reload,
+)
+
+
+class _FakeClock:
+    """Monotonic clock advanced by the fake sleep."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _replies(*replies):
+    """Patch the socket transport to answer commands from a script."""
+    sent = []
+    script = list(replies)
+
+    def fake(socket_path, command):
+        sent.append(command)
+        reply = script.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    return patch.object(clamd_reload, "_socket_command", side_effect=fake), sent
+
+
+class TestParseDailyVersion:
+    """Tests for VERSION reply parsing."""
+
+    def test_parses_daily(self):
+        assert parse_daily_version("ClamAV 1.0.3/27303/Mon Oct 19 08:21:02 2026") == 27303
+
+    def test_without_database(self):
+        assert parse_daily_version("ClamAV 1.0.3") is None
+
+
+class TestSocketCommand:
+    """Tests for the NUL-delimited socket protocol."""
+
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "clamd.sock")
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(path)
+        server.listen(1)
+        received = []
+
+        def serve():
+            conn, _addr = server.accept()
+            with conn:
+                received.append(conn.recv(64))
+                conn.sendall(b"RELOADING\0")
+
+        thread = threading.Thread(target=serve, daemon=True)
+        thread.start()
+        try:
+            assert clamd_reload._socket_command(path, "RELOAD") == "RELOADING"
+        finally:
+            thread.join(timeout=5)
+            server.close()
+        assert received == [b"zRELOAD\0"]
+
+    def test_missing_socket_raises(self, tmp_path):
+        with pytest.raises(OSError):
+            clamd_reload._socket_command(str(tmp_path / "missing.sock"), "VERSION")
+
+
+class TestReloadClamd:
+    """Tests for reload_clamd()."""
+
+    def test_waits_for_expected_daily(self):
+        clock = _FakeClock()
+        patcher, sent = _replies(
+            "ClamAV 1.0.3/27302/x",
+            "RELOADING",
+            "ClamAV 1.0.3/27302/x",
+            OSError("busy"),
+            "ClamAV 1.0.3/27303/x",
+        )
+        with patcher:
+            result = reload_clamd(27303, "/sock", clock=clock, sleep=clock.sleep)
+
+        assert result.reloaded is True
+        assert result.daily_version == 27303
+        assert result.latency == pytest.approx(1.0)
+        assert sent == ["VERSION", "RELOAD", "VERSION", "VERSION", "VERSION"]
+
+    @pytest.mark.parametrize("expected", [None, 27302])
+    def test_first_reply_counts_when_no_change_is_expected(self, expected):
+        clock = _FakeClock()
+        patcher, _sent = _replies("ClamAV 1.0.3/27302/x", "RELOADING", "ClamAV 1.0.3/27302/x")
+        with patcher:
+            result = reload_clamd(expected, "/sock", clock=clock, sleep=clock.sleep)
+        assert result.reloaded is True
+        assert result.latency == 0.0
+
+    def test_waits_for_rollback_to_older_daily(self):
+        clock = _FakeClock()
+        patcher, _sent = _replies(
+            "ClamAV 1.0.3/27303/x",
+            "RELOADING",
+            "ClamAV 1.0.3/27303/x",
+            "ClamAV 1.0.3/27302/x",
+        )
+        with patcher:
+            result = reload_clamd(27302, "/sock", clock=clock, sleep=clock.sleep)
+        assert result.reloaded is True
+        assert result.daily_version == 27302
+        assert result.latency == pytest.approx(0.5)
+
+    def test_times_out(self):
+        clock = _FakeClock()
+        patcher, _sent = _replies("ClamAV 1/1/x", "RELOADING", *["ClamAV 1/1/x"] * 10)
+        with patcher:
+            result = reload_clamd(2, "/sock", timeout=2.0, clock=clock, sleep=clock.sleep)
+        assert result.reloaded is False
+        assert "2s" in result.error
+        assert wait_for_clamd_reload(timeout=0) is True
+
+    def test_unreachable_clamd_is_not_held(self):
+        with (
+            patch.object(clamd_reload, "_socket_command", side_effect=OSError("refused")),
+            patch.object(clamd_reload, "_clamdscan_command", side_effect=OSError("no clamd")),
+        ):
+            result = reload_clamd(1, "/sock")
+        assert result.reloaded is False
+        assert result.error == "no clamd"
+
+    def test_falls_back_to_clamdscan(self):
+        clock = _FakeClock()
+        replies = iter(["ClamAV 1/5/x", "", "ClamAV 1/6/x"])
+        with (
+            patch.object(clamd_reload, "_socket_command", side_effect=OSError("denied")),
+            patch.object(
+                clamd_reload, "_clamdscan_command", side_effect=lambda cmd: next(replies)
+            ) as clamdscan,
+        ):
+            result = reload_clamd(6, "/sock", clock=clock, sleep=clock.sleep)
+        assert result.reloaded is True
+        assert [call.args[0] for call in clamdscan.call_args_list] == [
+            "VERSION",
+            "RELOAD",
+            "VERSION",
+        ]
+
+
+class TestScanHold:
+    """Tests for holding daemon scans during a reload."""
+
+    def test_scans_wait_while_reloading(self):
+        observed = []
+        clock = _FakeClock()
+
+        def sleep(seconds):
+            observed.append(wait_for_clamd_reload(timeout=0))
+            clock.sleep(seconds)
+
+        patcher, _sent = _replies("ClamAV 1/1/x", "RELOADING", "ClamAV 1/1/x", "ClamAV 1/2/x")
+        with patcher:
+            reload_clamd(2, "/sock", clock=clock, sleep=sleep)
+
+        assert observed == [False]
+        assert wait_for_clamd_reload(timeout=0) is True
@@ -108,6 +108,15 @@ class TestConnectionPoolCreateConnection:
         assert result[0] == 1
         conn.close()
 
+    def test_create_connection_applies_throughput_pragmas(self, pool):
+        """Test _create_connection applies synchronous, cache and temp_store tuning."""
+        conn = pool._create_connection()
+        # synchronous=NORMAL is 1, temp_store=MEMORY is 2
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8192
+        conn.close()
+
     def test_create_connection_sets_timeout(self, pool):
         """Test _create_connection sets timeout to 30 seconds."""
         # The timeout is set during sqlite3.connect, not as a PRAGMA
@@ -316,6 +325,70 @@ class TestConnectionPoolRelease:
         assert pool._total_connections == 3
 
 
+class TestConnectionPoolStats:
+    """Tests for ConnectionPool.get_stats() usage counters."""
+
+    @pytest.fixture
+    def pool(self):
+        """Create a ConnectionPool instance."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            p = ConnectionPool(str(Path(tmpdir) / "test_stats.db"), pool_size=2)
+            yield p
+            p.close_all()
+
+    def test_initial_stats(self, pool):
+        """Test a fresh pool reports zeroed counters."""
+        stats = pool.get_stats()
+        assert stats["acquisitions"] == 0
+        assert stats["waits"] == 0
+        assert stats["total_wait_time"] == 0.0
+        assert stats["avg_wait_time"] == 0.0
+        assert stats["max_wait_time"] == 0.0
+        assert stats["connections_created"] == 0
+        assert stats["connections_discarded"] == 0
+
+    def test_stats_count_acquisitions_and_reuse(self, pool):
+        """Test acquisitions are counted and reused connections are not re-created."""
+        for _ in range(5):
+            with pool.get_connection() as conn:
+                conn.execute("SELECT 1")
+
+        stats = pool.get_stats()
+        assert stats["acquisitions"] == 5
+        assert stats["connections_created"] == 1
+        assert stats["waits"] == 0
+        assert stats["avg_wait_time"] >= 0.0
+
+    def test_stats_record_wait_when_exhausted(self, pool):
+        """Test a blocked acquire is recorded as a wait with non-zero wait time."""
+        conn1 = pool.acquire()
+        conn2 = pool.acquire()
+
+        def release_later():
+            time.sleep(0.2)
+            pool.release(conn1)
+
+        t = threading.Thread(target=release_later)
+        t.start()
+        conn3 = pool.acquire(timeout=2.0)
+        t.join()
+
+        stats = pool.get_stats()
+        assert stats["waits"] == 1
+        assert stats["acquisitions"] == 3
+        assert stats["max_wait_time"] >= 0.1
+        pool.release(conn2)
+        pool.release(conn3)
+
+    def test_stats_count_discarded_connections(self, pool):
+        """Test release() of a broken connection increments connections_discarded."""
+        conn = pool.acquire()
+        conn.close()
+        pool.release(conn)
+
+        assert pool.get_stats()["connections_discarded"] == 1
+
+
 class TestConnectionPoolGetConnection:
     """Tests for ConnectionPool.get_connection() context manager."""
 
@@ -659,6 +659,32 @@ class TestDaemonScannerThreatClassification:
         assert category == "Ransomware"
 
 
+class TestDaemonScannerReloadHold:
+    """Tests for holding scans while clamd reloads after an update."""
+
+    def test_scan_waits_for_reload_before_checking_daemon(self, daemon_scanner_class, tmp_path):
+        """Test the reload gate is consulted before the daemon is contacted."""
+        scanner = daemon_scanner_class()
+        calls = []
+
+        with (
+            patch(
+                "src.core.daemon_scanner.wait_for_clamd_reload",
+                side_effect=lambda: calls.append("wait") or False,
+            ),
+            patch.object(
+                scanner,
+                "check_available",
+                side_effect=lambda: calls.append("check") or (False, "down"),
+            ),
+            patch.object(scanner, "_save_scan_log"),
+        ):
+            result = scanner.scan_sync(str(tmp_path))
+
+        assert calls == ["wait", "check"]
+        assert result.status == ScanStatus.ERROR
+
+
 class TestDaemonScannerCancel:
     """Tests for DaemonScanner.cancel method."""
 
@@ -1026,7 +1052,7 @@ class TestDaemonScannerCountTargets:
 
         with (
             patch.object(scanner, "scan_sync") as mock_sync,
-            patch("src.core.daemon_scanner.GLib.idle_add"),
+            patch("src.core.daemon_scanner.idle_add"),
         ):
             from src.core.scanner import ScanResult, ScanStatus
 
@@ -1078,7 +1104,7 @@ class TestDaemonScannerCountTargets:
         with (
             patch("src.core.daemon_scanner.check_clamdscan_installed") as mock_installed,
             patch("src.core.daemon_scanner.check_clamd_connection") as mock_connection,
-            patch("src.core.daemon_scanner.os.unlink"),
+            patch("src.core.scanner_base.os.unlink"),
             patch("subprocess.Popen") as mock_popen,
         ):
             mock_installed.return_value = (True, "ClamAV 1.0.0")
@@ -1104,6 +1130,43 @@ class TestDaemonScannerCountTargets:
         assert str(included_file) in file_list_content
         assert str(excluded_file) not in file_list_content
 
+    def test_scan_sync_records_file_list_phases(
+        self, tmp_path, daemon_scanner_class, scan_status_class
+    ):
+        """File-list scans time counting, list writing and exclusion filtering."""
+        test_dir = tmp_path / "scan_test"
+        (test_dir / "excluded").mkdir(parents=True)
+        (test_dir / "keep.txt").write_text("keep")
+        profile_exclusions = {"paths": [str(test_dir / "excluded")], "patterns": []}
+        scanner = daemon_scanner_class(log_manager=MagicMock())
+
+        with (
+            patch("src.core.daemon_scanner.check_clamdscan_installed") as mock_installed,
+            patch("src.core.daemon_scanner.check_clamd_connection") as mock_connection,
+            patch("subprocess.Popen") as mock_popen,
+        ):
+            mock_installed.return_value = (True, "ClamAV 1.0.0")
+            mock_connection.return_value = (True, "PONG")
+            mock_process = MagicMock()
+            mock_process.communicate.return_value = ("", "")
+            mock_process.returncode = 0
+            mock_popen.return_value = mock_process
+
+            result = scanner.scan_sync(str(test_dir), profile_exclusions=profile_exclusions)
+
+        assert result.status == scan_status_class.CLEAN
+        assert [phase.name for phase in result.timing.phases] == [
+            "validate",
+            "probe",
+            "count",
+            "file_list",
+            "scan",
+            "parse",
+            "filter",
+            "log",
+        ]
+        assert result.timing.bytes_scanned is None
+
     def test_filter_excludes_profile_path_subdirectory(
         self, daemon_scanner_class, scan_status_class, tmp_path
     ):
@@ -1878,8 +1941,8 @@ class TestDaemonScannerFlatpakSupport:
         scanner = daemon_scanner_class()
 
         with (
-            patch("src.core.daemon_scanner.is_flatpak", return_value=True),
-            patch("src.core.daemon_scanner.Path.home", return_value=tmp_path),
+            patch("src.core.scanner_base.is_flatpak", return_value=True),
+            patch("src.core.scanner_base.Path.home", return_value=tmp_path),
         ):
             temp_dir = scanner._get_file_list_temp_dir()
 
@@ -1895,7 +1958,7 @@ class TestDaemonScannerFlatpakSupport:
         scanner = daemon_scanner_class()
         monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
 
-        with patch("src.core.daemon_scanner.is_flatpak", return_value=False):
+        with patch("src.core.scanner_base.is_flatpak", return_value=False):
             assert scanner._get_file_list_temp_dir() == str(tmp_path)
 
     def test_build_command_uses_optimal_flags_in_flatpak(self, tmp_path, daemon_scanner_class):
@@ -0,0 +1,226 @@
+# ClamUI Database Inventory Tests
+"""Unit tests for the shared ClamAV database inventory."""
+
+import base64
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.database_inventory import (
+    DatabaseFileInfo,
+    DatabaseInventory,
+    DatabaseInventorySnapshot,
+    parse_cvd_header,
+)
+from src.core.host_broker import HostBrokerError
+
+
+def _header(version=27000, sigs=2000000, days_old=3, date="24 Jun 2026") -> bytes:
+    build_ts = int(time.time()) - days_old * 86400 - 60
+    return f"ClamAV-VDB:{date}:{version}:{sigs}:90:md5:dsig:builder:{build_ts}".encode("ascii")
+
+
+@pytest.fixture
+def native():
+    with patch("src.core.database_inventory.is_flatpak", return_value=False):
+        yield
+
+
+class TestParseCvdHeader:
+    """Tests for parse_cvd_header()."""
+
+    def test_valid_header_padded_with_nulls(self):
+        raw = _header(days_old=2, date="02 Apr 2026")
+        raw += b"\x00" * (512 - len(raw))
+
+        parsed = parse_cvd_header(raw)
+
+        assert parsed["build_date"] == "02 Apr 2026"
+        assert parsed["version"] == 27000
+        assert parsed["signatures"] == 2000000
+        assert parsed["flevel"] == 90
+        assert DatabaseFileInfo("daily.cvd", "/x", **parsed).age_days() == 2
+
+    def test_not_a_database(self):
+        assert parse_cvd_header(b"not a valid cvd file") is None
+
+    def test_stime_followed_by_binary_payload(self):
+        """Regression: real .cld/.cvd files append the compressed payload
+        directly after the stime field with no delimiter, so only the leading
+        digit run is the build time."""
+        junk = b"\x1f\x08\x00\x1e-3<>i\x7f$2Yi\x01*X\x01wvi" + bytes(range(256)) * 2
+        parsed = parse_cvd_header(_header(days_old=3) + junk)
+
+        assert DatabaseFileInfo("daily.cld", "/x", **parsed).age_days() == 3
+
+    def test_stime_with_no_leading_digits(self):
+        header = b"ClamAV-VDB:24 Jun 2026:27000:2000000:90:md5:dsig:builder:"
+        parsed = parse_cvd_header(header + b"\x1f\x8b\x08\x00\x1e-3<>i")
+
+        assert parsed["build_time"] is None
+        assert DatabaseFileInfo("daily.cld", "/x", **parsed).age_days() is None
+
+
+class TestNativeInventory:
+    """Tests for DatabaseInventory on a directly readable filesystem."""
+
+    def test_reads_every_header(self, tmp_path, native):
+        (tmp_path / "daily.cld").write_bytes(_header(version=27303, sigs=2071380))
+        (tmp_path / "main.cvd").write_bytes(_header(version=62, sigs=6647427))
+        (tmp_path / "freshclam.dat").write_bytes(b"state")
+
+        snapshot = DatabaseInventory(lambda: [str(tmp_path)]).get()
+
+        assert [info.name for info in snapshot.files] == ["daily.cld", "main.cvd"]
+        assert snapshot.find("daily").version == 27303
+        assert snapshot.find("main").size > 0
+        assert snapshot.total_signatures == 2071380 + 6647427
+        assert snapshot.errors == {}
+
+    def test_invalid_file_is_listed_with_error(self, tmp_path, native):
+        (tmp_path / "bad.cvd").write_text("not a valid cvd file")
+
+        (info,) = DatabaseInventory(lambda: [str(tmp_path)]).get().files
+
+        assert info.version is None
+        assert info.error == "Invalid database file format"
+
+    def test_missing_directory_reports_error(self, tmp_path, native):
+        missing = str(tmp_path / "missing")
+
+        snapshot = DatabaseInventory(lambda: [missing]).get()
+
+        assert snapshot.is_empty
+        assert "does not exist" in snapshot.errors[missing]
+
+    def test_primary_directory_wins(self, tmp_path, native):
+        primary, stale = tmp_path / "primary", tmp_path / "stale"
+        primary.mkdir()
+        stale.mkdir()
+        (primary / "daily.cld").write_bytes(_header(version=2))
+        (stale / "daily.cvd").write_bytes(_header(version=1))
+        (stale / "main.cvd").write_bytes(_header(version=62))
+
+        snapshot = DatabaseInventory(lambda: [str(primary), str(stale)]).get()
+
+        assert snapshot.find("daily").version == 2
+        assert [info.name for info in snapshot.databases()] == ["daily.cld", "main.cvd"]
+
+    def test_cached_until_directory_changes(self, tmp_path, native):
+        (tmp_path / "daily.cld").write_bytes(_header(version=1))
+        inventory = DatabaseInventory(lambda: [str(tmp_path)])
+
+        first = inventory.get()
+        with patch("src.core.database_inventory._scan_local") as scan:
+            assert inventory.get() is first
+            scan.assert_not_called()
+
+        # freshclam renames the new file into place, bumping the directory mtime
+        (tmp_path / "daily.tmp").write_bytes(_header(version=2))
+        os.replace(tmp_path / "daily.tmp", tmp_path / "daily.cld")
+        stat = os.stat(tmp_path)
+        os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert inventory.get().find("daily").version == 2
+
+    def test_invalidate_forces_rescan(self, tmp_path, native):
+        inventory = DatabaseInventory(lambda: [str(tmp_path)])
+        first = inventory.get()
+        inventory.invalidate()
+        assert inventory.get() is not first
+
+
+class TestFlatpakInventory:
+    """Tests for reading host databases from inside Flatpak."""
+
+    @pytest.fixture
+    def flatpak(self):
+        with patch("src.core.database_inventory.is_flatpak", return_value=True):
+            yield
+
+    def test_broker_reads_headers_in_one_batch(self, flatpak):
+        raw = _header(version=27303) + b"\x1f\x8b\x08\x00" + bytes(range(255, -1, -1))
+        replies = {
+            "glob": {"paths": ["/var/lib/clamav/daily.cld"]},
+            "stat": {"exists": True, "size": 4096, "mtime_ns": 5},
+            "read_range": {"data": base64.b64encode(raw[:512]).decode("ascii")},
+        }
+        broker = MagicMock()
+        broker.batch.side_effect = lambda requests: [replies[op] for op, _params in requests]
+
+        with patch("src.core.database_inventory.get_host_broker", return_value=broker):
+            inventory = DatabaseInventory(lambda: ["/var/lib/clamav"])
+            snapshot = inventory.get()
+            assert inventory.get() is snapshot
+
+        (daily,) = snapshot.files
+        assert daily.version == 27303
+        assert daily.size == 4096
+        assert daily.age_days() == 3
+        # fingerprint, glob, headers; then only the fingerprint on the cache hit
+        assert broker.batch.call_count == 4
+
+    def test_broker_directory_errors(self, flatpak):
+        broker = MagicMock()
+        broker.batch.side_effect = lambda requests: [
+            {"exists": False} if op == "stat" else HostBrokerError("denied", code="permission")
+            for op, _params in requests
+        ]
+
+        with patch("src.core.database_inventory.get_host_broker", return_value=broker):
+            snapshot = DatabaseInventory(lambda: ["/var/lib/clamav"]).get()
+
+        assert snapshot.is_empty
+        assert "Permission denied" in snapshot.errors["/var/lib/clamav"]
+
+    def test_dead_broker_falls_back_to_shell(self, flatpak):
+        broker = MagicMock()
+        broker.batch.side_effect = HostBrokerError("helper exited")
+
+        with (
+            patch("src.core.database_inventory.get_host_broker", return_value=broker),
+            patch(
+                "src.core.database_inventory.run_host_command",
+                return_value=MagicMock(returncode=0, stdout=b""),
+            ) as run,
+        ):
+            snapshot = DatabaseInventory(lambda: ["/var/lib/clamav"]).get()
+
+        assert snapshot.is_empty
+        run.assert_called_once()
+
+    def test_shell_fallback_parses_listing(self, flatpak):
+        """Regression for issue #162: the host header arrives as raw bytes
+        with the gzip payload glued onto the stime digits."""
+        raw = (_header(version=27000) + b"\x1f\x8b\x08\x00")[:512]
+        listing = b"/var/lib/clamav/daily.cld\t1234\t" + raw + b"\n"
+
+        with (
+            patch("src.core.database_inventory.get_host_broker", return_value=None),
+            patch(
+                "src.core.database_inventory.run_host_command",
+                return_value=MagicMock(returncode=0, stdout=listing),
+            ) as run,
+        ):
+            inventory = DatabaseInventory(lambda: ["/var/lib/clamav"])
+            snapshot = inventory.get()
+            # Without the helper the directory mtime is not observable; reuse
+            assert inventory.get() is snapshot
+
+        (daily,) = snapshot.files
+        assert daily.path == "/var/lib/clamav/daily.cld"
+        assert daily.size == 1234
+        assert daily.age_days() == 3
+        run.assert_called_once()
+
+
+class TestSnapshot:
+    """Tests for DatabaseInventorySnapshot helpers."""
+
+    def test_empty(self):
+        snapshot = DatabaseInventorySnapshot()
+        assert snapshot.is_empty
+        assert snapshot.find("daily") is None
+        assert snapshot.total_signatures == 0
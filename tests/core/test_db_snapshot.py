@@ -0,0 +1,100 @@
+# ClamUI Database Snapshot Tests
+"""Unit tests for database file snapshots."""
+
+import errno
+from unittest.mock import patch
+
+import pytest
+
+from src.core import db_snapshot
+from src.core.db_snapshot import (
+    COPY,
+    HARDLINK,
+    clone_file,
+    iter_database_files,
+    replace_from_snapshot,
+    snapshot_matches,
+)
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = tmp_path / "main.cvd"
+    path.write_bytes(b"ClamAV-VDB:header" + b"\0" * 600 + b"body")
+    return path
+
+
+class TestCloneFile:
+    """Tests for clone_file()."""
+
+    def test_hard_link_on_same_filesystem(self, database, tmp_path):
+        snapshot = tmp_path / "snapshot.cvd"
+
+        assert clone_file(database, snapshot) == HARDLINK
+        assert snapshot.stat().st_ino == database.stat().st_ino
+
+    def test_falls_back_to_copy(self, database, tmp_path):
+        snapshot = tmp_path / "snapshot.cvd"
+        with (
+            patch.object(db_snapshot.os, "link", side_effect=OSError(errno.EXDEV, "cross-device")),
+            patch.object(db_snapshot, "_reflink", return_value=False),
+        ):
+            assert clone_file(database, snapshot) == COPY
+
+        assert snapshot.read_bytes() == database.read_bytes()
+        assert snapshot.stat().st_ino != database.stat().st_ino
+
+    def test_real_errors_are_raised(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            clone_file(tmp_path / "missing.cvd", tmp_path / "snapshot.cvd")
+
+
+class TestSnapshotMatches:
+    """Tests for snapshot_matches()."""
+
+    def test_copy_with_same_size_and_header(self, database, tmp_path):
+        snapshot = tmp_path / "snapshot.cvd"
+        snapshot.write_bytes(database.read_bytes())
+        assert snapshot_matches(database, snapshot)
+
+    def test_size_mismatch(self, database, tmp_path):
+        snapshot = tmp_path / "snapshot.cvd"
+        snapshot.write_bytes(database.read_bytes()[:-1])
+        assert not snapshot_matches(database, snapshot)
+
+    def test_header_mismatch(self, database, tmp_path):
+        snapshot = tmp_path / "snapshot.cvd"
+        snapshot.write_bytes(b"X" + database.read_bytes()[1:])
+        assert not snapshot_matches(database, snapshot)
+
+    def test_missing_snapshot(self, database, tmp_path):
+        assert not snapshot_matches(database, tmp_path / "missing.cvd")
+
+
+class TestReplaceFromSnapshot:
+    """Tests for replace_from_snapshot()."""
+
+    def test_replaces_target_and_keeps_snapshot(self, tmp_path):
+        snapshot = tmp_path / "snapshot" / "daily.cvd"
+        snapshot.parent.mkdir()
+        snapshot.write_bytes(b"old")
+        target = tmp_path / "daily.cvd"
+        target.write_bytes(b"new")
+
+        replace_from_snapshot(snapshot, target)
+
+        assert target.read_bytes() == b"old"
+        assert snapshot.read_bytes() == b"old"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["daily.cvd", "snapshot"]
+
+
+def test_iter_database_files(tmp_path):
+    for name in ("main.cvd", "daily.cld", "bytecode.cud", "freshclam.dat", "mirrors.txt"):
+        (tmp_path / name).write_text("x")
+    (tmp_path / "dir.cvd").mkdir()
+
+    assert [p.name for p in iter_database_files(tmp_path)] == [
+        "bytecode.cud",
+        "daily.cld",
+        "main.cvd",
+    ]
@@ -477,197 +477,189 @@ class TestStartStop:
         assert monitor.is_running is True
 
 
-class TestRequeueSourceTracking:
-    """BUG-009: Re-queued GLib timeout sources must be tracked.
+class TestSchedulerIntegration:
+    """Device scans are queued with the shared ScanScheduler instead of polling."""
 
-    When MAX_CONCURRENT_SCANS is reached, _start_background_scan re-queues
-    via GLib.timeout_add_seconds(10, ...). The returned source id must be
-    stored in _scheduled_sources so stop() can cancel it. Otherwise, a
-    pending re-queue can fire after monitor shutdown and instantiate a
-    Scanner against a torn-down DeviceMonitor.
-    """
-
-    def _make_monitor(self):
-        mock_settings = MagicMock()
-        mock_settings.get.side_effect = lambda key, default=None: {
+    def _make_monitor(self, scanner=None, **settings):
+        values = {
             "device_auto_scan_enabled": True,
             "device_auto_scan_delay_seconds": 0,
-        }.get(key, default)
+            **settings,
+        }
+        mock_settings = MagicMock()
+        mock_settings.get.side_effect = lambda key, default=None: values.get(key, default)
+        scheduler = MagicMock()
         monitor = DeviceMonitor(
             settings_manager=mock_settings,
-            scanner=MagicMock(),
+            scanner=scanner or MagicMock(),
+            scheduler=scheduler,
         )
         monitor._battery_manager = MagicMock()
         monitor._battery_manager.is_on_battery.return_value = False
-        return monitor
+        return monitor, scheduler
 
-    @patch("src.core.device_monitor.GLib")
-    def test_requeue_source_tracked_in_scheduled_sources(self, mock_glib):
-        """When concurrent limit hits, the re-queue source id is tracked."""
-        mock_glib.SOURCE_REMOVE = False
-        mock_glib.timeout_add_seconds.return_value = 12345  # fake source id
-
-        monitor = self._make_monitor()
-
-        info = MountInfo(
-            mount_point="/media/usb1",
-            device_name="USB1",
+    def _info(self, mount_point="/media/usb1", size_bytes=0):
+        return MountInfo(
+            mount_point=mount_point,
+            device_name=mount_point.rsplit("/", 1)[-1],
             device_type=DeviceType.REMOVABLE,
+            size_bytes=size_bytes,
         )
 
-        # Simulate two active scans (hits MAX_CONCURRENT_SCANS = 2)
-        monitor._active_scans["/media/scanA"] = MagicMock()
-        monitor._active_scans["/media/scanB"] = MagicMock()
+    def test_start_submits_background_job_with_size(self):
+        """A mount is queued as a background job carrying its size."""
+        from src.core.scan_scheduler import JobPriority
+
+        monitor, scheduler = self._make_monitor()
+        info = self._info(size_bytes=4 * 1024**3)
 
         monitor._start_background_scan(info)
 
-        # The re-queued source id must be in _scheduled_sources
-        assert info.mount_point in monitor._scheduled_sources
-        assert monitor._scheduled_sources[info.mount_point] == 12345
-        # And no Scanner should have been started (still requeued)
-        assert info.mount_point not in monitor._active_scans
+        job = scheduler.submit.call_args.args[0]
+        assert job.priority == JobPriority.BACKGROUND
+        assert job.size_bytes == 4 * 1024**3
+        assert monitor._jobs[info.mount_point] is job
 
-    @patch("src.core.device_monitor.GLib")
-    def test_stop_removes_pending_requeue_sources(self, mock_glib):
-        """stop() must call GLib.source_remove for any tracked re-queue source."""
-        mock_glib.SOURCE_REMOVE = False
-        mock_glib.timeout_add_seconds.return_value = 67890
+    def test_duplicate_start_is_noop(self):
+        """A second start for a queued or running mount does not queue again."""
+        monitor, scheduler = self._make_monitor()
+        info = self._info()
 
-        monitor = self._make_monitor()
-        monitor._running = True  # bypass start() VolumeMonitor side-effects
+        monitor._start_background_scan(info)
+        monitor._start_background_scan(info)
 
-        info = MountInfo(
-            mount_point="/media/usb2",
-            device_name="USB2",
-            device_type=DeviceType.REMOVABLE,
+        scheduler.submit.assert_called_once()
+
+    @patch("src.core.device_monitor.idle_add")
+    def test_run_reuses_pooled_scanner(self, mock_idle_add):
+        """Jobs run with pooled scanners and report completion on the main loop."""
+        scanner = MagicMock()
+        monitor, scheduler = self._make_monitor(scanner=scanner)
+        first, second = self._info("/media/a"), self._info("/media/b")
+        monitor._start_background_scan(first)
+        monitor._start_background_scan(second)
+
+        for call in scheduler.submit.call_args_list:
+            call.args[0].run()
+
+        from src.core.resource_governor import resolve_policy
+
+        background = resolve_policy(None, background=True)
+        assert scanner.scan_sync.call_args_list == [
+            (("/media/a",), {"resource_policy": background}),
+            (("/media/b",), {"resource_policy": background}),
+        ]
+        assert monitor._idle_scanners == [scanner]
+        assert monitor.active_scan_count == 0
+        mock_idle_add.assert_any_call(
+            monitor._on_scan_complete, first, scanner.scan_sync.return_value, None
         )
 
-        # Force the re-queue branch
-        monitor._active_scans["/media/scanA"] = MagicMock()
-        monitor._active_scans["/media/scanB"] = MagicMock()
+    def test_mount_removed_cancels_job(self):
+        """Removing a device drops its queued job or stops its running scan."""
+        monitor, scheduler = self._make_monitor()
+        info = self._info()
         monitor._start_background_scan(info)
-        # Drop the active sentinels so stop() doesn't try to cancel them too
-        monitor._active_scans.clear()
+        job = monitor._jobs[info.mount_point]
 
-        # Sanity: source is tracked
-        assert monitor._scheduled_sources.get(info.mount_point) == 67890
+        mount = MagicMock()
+        mount.get_root.return_value.get_path.return_value = info.mount_point
+        monitor._on_mount_removed(MagicMock(), mount)
 
-        # Now stop the monitor
-        monitor.stop()
-
-        # GLib.source_remove must have been called with the re-queue id
-        calls = [c.args[0] for c in mock_glib.source_remove.call_args_list]
-        assert 67890 in calls
-        # And the dict must be empty
-        assert monitor._scheduled_sources == {}
-
-    @patch("src.core.device_monitor.GLib")
-    def test_requeue_lambda_clears_own_source_id_on_fire(self, mock_glib):
-        """When the re-queue lambda fires, it removes its own id from the dict."""
-        mock_glib.SOURCE_REMOVE = False
-        # First call (the re-queue itself): return source id 111.
-        # Second call (the inner _start_background_scan -> if the recursion
-        #  itself also hits the requeue branch): return 222.
-        mock_glib.timeout_add_seconds.side_effect = [111, 222]
+        scheduler.cancel.assert_called_once_with(job.job_id)
+        assert info.mount_point not in monitor._jobs
 
-        monitor = self._make_monitor()
-
-        info = MountInfo(
-            mount_point="/media/usb3",
-            device_name="USB3",
-            device_type=DeviceType.REMOVABLE,
-        )
-
-        monitor._active_scans["/media/A"] = MagicMock()
-        monitor._active_scans["/media/B"] = MagicMock()
+    def test_job_cancel_stops_running_scanner(self):
+        """The job's cancel hook cancels the scanner of the running scan."""
+        monitor, _scheduler = self._make_monitor()
+        info = self._info()
         monitor._start_background_scan(info)
+        running_scanner = MagicMock()
+        monitor._active_scans[info.mount_point] = running_scanner
 
-        assert monitor._scheduled_sources[info.mount_point] == 111
-
-        # Capture the lambda passed to timeout_add_seconds and invoke it.
-        # Simulate the limit being lifted before fire so the recursive
-        # _start_background_scan would proceed normally — but we also drop
-        # the active scans to ensure that path is taken.
-        cb = mock_glib.timeout_add_seconds.call_args_list[0].args[1]
-        monitor._active_scans.clear()
-        with patch.object(monitor, "_start_background_scan") as mock_inner:
-            cb()
-            mock_inner.assert_called_once_with(info)
+        monitor._jobs[info.mount_point].cancel()
 
-        # After firing, the source id for this mount_point must be gone
-        assert info.mount_point not in monitor._scheduled_sources
+        running_scanner.cancel.assert_called_once()
 
+    @patch("src.core.device_monitor.GLib")
+    def test_stop_cancels_queued_jobs(self, mock_glib):
+        """stop() cancels pending delay timers and every queued job."""
+        monitor, scheduler = self._make_monitor()
+        monitor._running = True
+        monitor._scheduled_sources["/media/late"] = 777
+        monitor._start_background_scan(self._info("/media/a"))
+        monitor._start_background_scan(self._info("/media/b"))
 
-class TestRequeueTimerCancellation:
-    """A pending requeue timer must be cancelled when the scan actually starts.
+        monitor.stop()
 
-    When MAX_CONCURRENT_SCANS is reached, _start_background_scan stores a 10s
-    requeue timer in _scheduled_sources. When a slot frees, _on_scan_complete
-    restarts the queued mount via _start_background_scan directly. The stale
-    requeue source must be removed so it cannot later fire and start a SECOND
-    concurrent scan of the same mount.
-    """
+        mock_glib.source_remove.assert_called_once_with(777)
+        assert scheduler.cancel.call_count == 2
+        assert monitor._jobs == {}
 
-    def _make_monitor(self):
-        mock_settings = MagicMock()
-        mock_settings.get.side_effect = lambda key, default=None: {
-            "device_auto_scan_enabled": True,
-            "device_auto_scan_delay_seconds": 0,
-        }.get(key, default)
-        monitor = DeviceMonitor(
-            settings_manager=mock_settings,
-            scanner=MagicMock(),
-        )
-        monitor._battery_manager = MagicMock()
-        monitor._battery_manager.is_on_battery.return_value = False
-        return monitor
+    @patch("src.core.device_monitor.idle_add")
+    def test_limit_follows_backend_seen_by_scans(self, mock_idle_add):
+        """The limit uses the backend resolved on scan threads, not a fresh probe."""
+        from src.core.scan_scheduler import concurrency_limit
 
-    @patch("src.core.device_monitor.Scanner")
-    @patch("src.core.device_monitor.GLib")
-    def test_start_removes_pending_requeue_source(self, mock_glib, mock_scanner):
-        """Starting a scan cancels any pending requeue timer for that mount."""
-        mock_glib.SOURCE_REMOVE = False
+        scanner = MagicMock()
+        scanner.get_active_backend.return_value = "daemon"
+        monitor, scheduler = self._make_monitor(scanner=scanner)
 
-        monitor = self._make_monitor()
+        assert monitor._concurrency_limit() == concurrency_limit("clamscan")
+        scanner.get_active_backend.assert_not_called()
 
-        info = MountInfo(
-            mount_point="/media/usb1",
-            device_name="USB1",
-            device_type=DeviceType.REMOVABLE,
-        )
+        monitor._start_background_scan(self._info())
+        scheduler.submit.call_args.args[0].run()
 
-        # Simulate a previously stored requeue timer for this mount.
-        monitor._scheduled_sources[info.mount_point] = 54321
+        assert monitor._concurrency_limit() >= 2
 
-        # A free slot: the scan should now actually start.
+    @patch("src.core.device_monitor.idle_add")
+    def test_failed_scan_releases_mount(self, mock_idle_add):
+        """A scan that raises does not leave its mount marked as queued."""
+        scanner = MagicMock()
+        scanner.scan_sync.side_effect = RuntimeError("boom")
+        monitor, scheduler = self._make_monitor(scanner=scanner)
+        info = self._info()
         monitor._start_background_scan(info)
 
-        # The stale requeue source must have been removed and popped.
-        mock_glib.source_remove.assert_called_once_with(54321)
-        assert info.mount_point not in monitor._scheduled_sources
-        # The scan started: a Scanner is now tracked as active.
-        assert info.mount_point in monitor._active_scans
-
-    @patch("src.core.device_monitor.Scanner")
-    @patch("src.core.device_monitor.GLib")
-    def test_duplicate_start_while_active_is_noop(self, mock_glib, mock_scanner):
-        """A start for a mount that is already scanning bails out without restarting."""
-        mock_glib.SOURCE_REMOVE = False
-
-        monitor = self._make_monitor()
+        with pytest.raises(RuntimeError):
+            scheduler.submit.call_args.args[0].run()
 
-        info = MountInfo(
-            mount_point="/media/usb2",
-            device_name="USB2",
-            device_type=DeviceType.REMOVABLE,
+        assert info.mount_point not in monitor._jobs
+        assert monitor._idle_scanners == [scanner]
+        monitor._start_background_scan(info)
+        assert scheduler.submit.call_count == 2
+
+    @patch("src.core.device_monitor.idle_add")
+    def test_quick_mode_scans_planned_files(self, mock_idle_add, tmp_path):
+        """Quick mode scans the planned file list and reports its estimate."""
+        (tmp_path / "autorun.inf").write_text("[autorun]")
+        (tmp_path / "movie.mkv").write_bytes(b"\0" * 2048)
+        (tmp_path / "notes.txt").write_text("hello")
+        scanner = MagicMock()
+        scanner.scan_sync.return_value.timing = None
+        callback = MagicMock()
+        monitor, scheduler = self._make_monitor(
+            scanner=scanner,
+            device_auto_scan_mode="quick",
+            device_auto_scan_quick_max_file_mb=0,
         )
+        monitor._notification_callback = callback
+        info = self._info(str(tmp_path))
+        monitor._start_background_scan(info)
 
-        # Mark the mount as already being scanned by an existing Scanner.
-        existing = MagicMock()
-        monitor._active_scans[info.mount_point] = existing
+        scheduler.submit.call_args.args[0].run()
 
-        monitor._start_background_scan(info)
+        file_paths = scanner.scan_sync.call_args.kwargs["file_paths"]
+        assert file_paths[0] == str(tmp_path / "autorun.inf")
+        assert len(file_paths) == 3
+        started = next(
+            c for c in mock_idle_add.call_args_list if c.args[0] == monitor._on_scan_started
+        )
+        plan = started.args[2]
+        assert plan.files == file_paths
 
-        # No new Scanner created and the existing one is untouched.
-        mock_scanner.assert_not_called()
-        assert monitor._active_scans[info.mount_point] is existing
+        monitor._on_scan_started(info, plan)
+        event = callback.call_args.args[1]
+        assert event["file_count"] == 3
+        assert event["estimated_seconds"] > 0
@@ -0,0 +1,126 @@
+# ClamUI Device Scan Plan Tests
+"""Tests for quick device-scan planning."""
+
+import os
+from unittest import mock
+
+import pytest
+
+from src.core.device_scan_plan import (
+    DEFAULT_BYTES_PER_SECOND,
+    RiskTier,
+    classify_file,
+    estimate_scan_seconds,
+    plan_quick_scan,
+)
+
+
+class TestClassifyFile:
+    """Tests for classify_file."""
+
+    @pytest.mark.parametrize(
+        ("name", "tier"),
+        [
+            ("AUTORUN.INF", RiskTier.AUTORUN),
+            ("Setup.lnk", RiskTier.AUTORUN),
+            ("installer.EXE", RiskTier.EXECUTABLE),
+            ("run.sh", RiskTier.EXECUTABLE),
+            ("report.docm", RiskTier.DOCUMENT),
+            ("backup.zip", RiskTier.DOCUMENT),
+            ("holiday.mp4", RiskTier.OTHER),
+            ("README", RiskTier.OTHER),
+        ],
+    )
+    def test_tiers(self, name, tier):
+        assert classify_file(name) == tier
+
+
+class TestEstimateScanSeconds:
+    """Tests for estimate_scan_seconds."""
+
+    def test_default_rate(self):
+        seconds = estimate_scan_seconds(0, DEFAULT_BYTES_PER_SECOND * 10)
+        assert seconds == pytest.approx(10)
+
+    def test_measured_rate_and_per_file_cost(self):
+        seconds = estimate_scan_seconds(100, 1000, bytes_per_second=100, seconds_per_file=0.1)
+        assert seconds == pytest.approx(20)
+
+
+class TestPlanQuickScan:
+    """Tests for plan_quick_scan."""
+
+    @pytest.fixture
+    def mount(self, tmp_path):
+        (tmp_path / "DCIM").mkdir()
+        (tmp_path / "DCIM" / "video.mp4").write_bytes(b"\0" * 4096)
+        (tmp_path / "DCIM" / "small.jpg").write_bytes(b"\0" * 10)
+        (tmp_path / "tools").mkdir()
+        (tmp_path / "tools" / "big.exe").write_bytes(b"\0" * 8192)
+        (tmp_path / "tools" / "tiny.exe").write_bytes(b"\0" * 16)
+        (tmp_path / "letter.docx").write_bytes(b"\0" * 100)
+        (tmp_path / "autorun.inf").write_text("[autorun]")
+        return tmp_path
+
+    def test_orders_by_risk_then_size(self, mount):
+        plan = plan_quick_scan(str(mount), max_file_bytes=0)
+
+        names = [os.path.relpath(path, mount) for path in plan.files]
+        assert names == [
+            "autorun.inf",
+            os.path.join("tools", "tiny.exe"),
+            os.path.join("tools", "big.exe"),
+            "letter.docx",
+            os.path.join("DCIM", "small.jpg"),
+            os.path.join("DCIM", "video.mp4"),
+        ]
+        assert plan.tier_counts[RiskTier.EXECUTABLE] == 2
+        assert plan.risky_files == 4
+        assert plan.skipped_files == 0
+
+    def test_skips_only_large_low_risk_files(self, mount):
+        plan = plan_quick_scan(str(mount), max_file_bytes=1024)
+
+        assert str(mount / "DCIM" / "video.mp4") not in plan.files
+        assert str(mount / "tools" / "big.exe") in plan.files
+        assert plan.skipped_files == 1
+        assert plan.skipped_bytes == 4096
+        assert plan.total_bytes == sum(os.path.getsize(path) for path in plan.files)
+
+    def test_does_not_follow_symlinks(self, mount, tmp_path_factory):
+        outside = tmp_path_factory.mktemp("outside")
+        (outside / "other.exe").write_bytes(b"\0")
+        os.symlink(outside, mount / "link")
+        os.symlink(outside / "other.exe", mount / "file-link.exe")
+
+        plan = plan_quick_scan(str(mount), max_file_bytes=0)
+
+        assert not any("other.exe" in path or "file-link" in path for path in plan.files)
+
+    def test_does_not_descend_into_other_devices(self, mount):
+        # Report the mount root on a different device than its directories,
+        # as for file systems mounted under it
+        root_stat = os.stat(mount)
+        other_device = mock.Mock(st_dev=root_stat.st_dev + 1)
+
+        with mock.patch("src.core.device_scan_plan.os.stat", return_value=other_device):
+            plan = plan_quick_scan(str(mount), max_file_bytes=0)
+
+        names = sorted(os.path.relpath(path, mount) for path in plan.files)
+        assert names == ["autorun.inf", "letter.docx"]
+
+    def test_should_stop_cancels_walk(self, mount):
+        plan = plan_quick_scan(str(mount), max_file_bytes=0, should_stop=lambda: True)
+
+        assert plan.cancelled is True
+        assert plan.files == []
+
+    def test_governor_is_consulted_per_directory(self, mount):
+        governor = mock.MagicMock()
+        stop = mock.MagicMock(return_value=False)
+
+        plan = plan_quick_scan(str(mount), max_file_bytes=0, should_stop=stop, governor=governor)
+
+        assert len(plan.files) == 6
+        assert governor.wait_for_headroom.call_count == 3
+        governor.wait_for_headroom.assert_called_with(stop)
@@ -1093,6 +1093,24 @@ class TestVerifyFileIntegrity:
         assert "mismatch" in error.lower()
         assert "corrupted" in error.lower()
 
+    def test_verify_integrity_rereads_memoized_file(self, tmp_path):
+        """Test tampering is detected even if the old content was memoized."""
+        handler = SecureFileHandler(str(tmp_path / "quarantine"))
+
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test content")
+        original_hash, _ = handler.calculate_hash(test_file)
+        st = test_file.stat()
+
+        # Same size and restored mtime: only a real read notices the change
+        test_file.write_text("TEST CONTENT")
+        os.utime(test_file, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        is_valid, error = handler.verify_file_integrity(str(test_file), original_hash)
+
+        assert is_valid is False
+        assert "mismatch" in error.lower()
+
     def test_verify_integrity_file_not_found(self, tmp_path):
         """Test verify_file_integrity handles missing files."""
         handler = SecureFileHandler(str(tmp_path / "quarantine"))
@@ -0,0 +1,161 @@
+# ClamUI Freshclam Progress Tests
+"""Unit tests for the freshclam output progress parser."""
+
+import itertools
+
+import pytest
+
+from src.core.freshclam_progress import (
+    DatabaseStage,
+    DatabaseStats,
+    DownloadKind,
+    FreshclamProgressParser,
+    format_database_stats,
+    is_transfer_line,
+    parse_size,
+)
+
+_CDIFF_RUN = """\
+ClamAV update process started at Mon Oct 19 10:00:00 2026
+daily database available for update (local version: 27301, remote version: 27303)
+Current database is 2 versions behind.
+Downloading database patch # 27302...
+Time:    0.1s, ETA:    0.0s [=============>          ]    4.00KiB/8.00KiB
+Time:    0.2s, ETA:    0.0s [========================>]    8.00KiB/8.00KiB
+Downloading database patch # 27303...
+Time:    0.3s, ETA:    0.0s [========================>]    2.00KiB/2.00KiB
+Testing database: '/var/lib/clamav/tmp.4d1/clamav-a7c.tmp-daily.cld' ...
+Database test passed.
+daily.cld updated (version: 27303, sigs: 2071380, f-level: 90, builder: raynman)
+main.cvd database is up-to-date (version: 62, sigs: 6647427, f-level: 90, builder: sigmgr)
+"""
+
+
+def _feed_all(parser, text):
+    events = []
+    for line in text.splitlines():
+        events.extend(parser.feed(line))
+    return events
+
+
+@pytest.fixture
+def parser():
+    # Each clock reading is one second after the previous one
+    return FreshclamProgressParser(clock=itertools.count().__next__)
+
+
+class TestParseSize:
+    """Tests for progress-bar size parsing."""
+
+    @pytest.mark.parametrize(
+        "value,unit,expected",
+        [("512", "B", 512), ("1.5", "KiB", 1536), ("2", "MiB", 2 * 1024**2), ("1", "KB", 1000)],
+    )
+    def test_units(self, value, unit, expected):
+        assert parse_size(value, unit) == expected
+
+    def test_transfer_line_detection(self):
+        assert is_transfer_line("Time:    0.2s, ETA:    0.0s [====>] 1.00KiB/1.00KiB")
+        assert not is_transfer_line("Testing database: 'daily.cld' ...")
+
+
+class TestFreshclamProgressParser:
+    """Tests for FreshclamProgressParser.feed() and finish()."""
+
+    def test_cdiff_update_events(self, parser):
+        events = _feed_all(parser, _CDIFF_RUN)
+
+        daily = [event for event in events if event.database == "daily"]
+        assert daily[0].stage == DatabaseStage.DOWNLOADING
+        assert daily[-1].stage == DatabaseStage.UPDATED
+        assert DatabaseStage.TESTING in {event.stage for event in daily}
+        assert {event.kind for event in daily[1:]} == {DownloadKind.CDIFF}
+        halfway = next(event for event in daily if event.percent == 50.0)
+        assert halfway.bytes_done == 4096
+        assert events[-1].database == "main"
+        assert events[-1].stage == DatabaseStage.UP_TO_DATE
+
+    def test_cdiff_stats_sum_every_patch(self, parser):
+        _feed_all(parser, _CDIFF_RUN)
+        daily, main = parser.finish()
+
+        assert daily.outcome == DatabaseStage.UPDATED
+        assert daily.kind == DownloadKind.CDIFF
+        assert daily.patches == 2
+        assert daily.bytes_downloaded == 10 * 1024
+        assert daily.duration > 0
+        assert main.outcome == DatabaseStage.UP_TO_DATE
+        assert main.bytes_downloaded == 0
+
+    def test_unchanged_percentage_is_not_repeated(self, parser):
+        parser.feed("daily database available for update (local version: 1, remote version: 2)")
+        parser.feed("Downloading database patch # 2...")
+        first = parser.feed("Time: 0.1s, ETA: 0.1s [>    ] 1.00KiB/100.00KiB")
+        again = parser.feed("Time: 0.1s, ETA: 0.1s [>    ] 1.00KiB/100.00KiB")
+        assert len(first) == 1
+        assert again == []
+
+    def test_full_download_after_incremental_failure(self, parser):
+        _feed_all(
+            parser,
+            "daily database available for update (local version: 1, remote version: 9)\n"
+            "Downloading database patch # 2...\n"
+            "WARNING: Incremental update failed, trying to download daily.cvd\n"
+            "Time: 9.0s, ETA: 0.0s [=====>] 60.00MiB/60.00MiB\n"
+            "daily.cvd updated (version: 9, sigs: 1, f-level: 90, builder: x)\n",
+        )
+        (daily,) = parser.finish()
+        assert daily.kind == DownloadKind.FULL
+        assert daily.bytes_downloaded == 60 * 1024**2
+
+    def test_rate_limit_with_cooldown(self, parser):
+        events = _feed_all(
+            parser,
+            "daily database available for download (remote version: 27303)\n"
+            "WARNING: FreshClam received error code 429 from the ClamAV CDN.\n"
+            "WARNING: You are on cool-down until after: 2026-10-19 12:00:00\n"
+            "ERROR: Can't download daily.cvd from https://database.clamav.net/daily.cvd\n",
+        )
+
+        assert events[0].kind == DownloadKind.FULL
+        assert events[-1].stage == DatabaseStage.RATE_LIMITED
+        assert events[-1].message == "2026-10-19 12:00:00"
+        (daily,) = parser.finish()
+        assert daily.outcome == DatabaseStage.RATE_LIMITED
+
+    def test_download_failure(self, parser):
+        events = _feed_all(
+            parser,
+            "bytecode database available for download (remote version: 335)\n"
+            "ERROR: Can't download bytecode.cvd from https://database.clamav.net/bytecode.cvd\n",
+        )
+        assert events[-1].stage == DatabaseStage.FAILED
+        assert "bytecode.cvd" in events[-1].message
+
+    def test_legacy_retrieving_lines(self, parser):
+        events = _feed_all(
+            parser,
+            "Retrieving https://database.clamav.net/daily-27302.cdiff\n"
+            "Retrieving https://database.clamav.net/daily-27303.cdiff\n",
+        )
+        assert events[-1].kind == DownloadKind.CDIFF
+        (daily,) = parser.finish()
+        assert daily.patches == 2
+
+    def test_unrelated_lines_produce_nothing(self, parser):
+        assert parser.feed("ClamAV update process started at Mon Oct 19 2026") == []
+        assert parser.feed("") == []
+        assert parser.feed("Time: 0.1s, ETA: 0.0s [=>] 1.00KiB/1.00KiB") == []
+
+
+class TestFormatDatabaseStats:
+    """Tests for the update log formatting."""
+
+    def test_formats_one_line_per_database(self):
+        text = format_database_stats(
+            [
+                DatabaseStats("daily", DatabaseStage.UPDATED, DownloadKind.CDIFF, 3072, 3, 1.25),
+                DatabaseStats("main", DatabaseStage.UP_TO_DATE),
+            ]
+        )
+        assert text == "daily: updated, 3 CDIFF patch(es), 3.0 KB in 1.2s\nmain: up to date"
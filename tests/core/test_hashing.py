@@ -0,0 +1,127 @@
+# ClamUI Hashing Tests
+"""Unit tests for the shared file hashing service."""
+
+import hashlib
+import os
+
+import pytest
+
+from src.core.hashing import (
+    Digester,
+    FileDigests,
+    HashingService,
+    get_hashing_service,
+)
+
+
+@pytest.fixture
+def service():
+    """Create an isolated hashing service with a small buffer."""
+    s = HashingService(max_entries=2, max_workers=2, buffer_size=7)
+    yield s
+    s.shutdown()
+
+
+@pytest.fixture
+def sample(tmp_path):
+    """Create a file spanning several read buffers."""
+    path = tmp_path / "sample.bin"
+    path.write_bytes(b"ClamUI hashing sample " * 10)
+    return path
+
+
+class TestDigester:
+    """Tests for the incremental Digester."""
+
+    def test_incremental_updates(self):
+        """Test blocks fed one by one digest like the whole content."""
+        digester = Digester()
+        digester.update(b"abc")
+        digester.update(b"def")
+
+        digests = digester.result()
+
+        assert digests.sha256 == hashlib.sha256(b"abcdef").hexdigest()
+        assert digests.size == 6
+
+
+class TestHashingService:
+    """Tests for HashingService reads and memoization."""
+
+    def test_hash_file_matches_hashlib(self, service, sample):
+        """Test buffered reads produce the same digest as hashlib."""
+        digests = service.hash_file(sample)
+
+        content = sample.read_bytes()
+        assert digests.sha256 == hashlib.sha256(content).hexdigest()
+        assert digests.size == len(content)
+
+    def test_unchanged_file_is_memoized(self, service, sample):
+        """Test a second lookup of an unchanged file is a cache hit."""
+        service.sha256(sample)
+        service.sha256(sample)
+
+        stats = service.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_modified_file_is_rehashed(self, service, sample):
+        """Test a content change (new size/mtime) invalidates the memo."""
+        first = service.sha256(sample)
+        sample.write_bytes(b"different content")
+        os.utime(sample, ns=(1, 1))
+
+        assert service.sha256(sample) != first
+        assert service.sha256(sample) == hashlib.sha256(b"different content").hexdigest()
+
+    def test_use_cache_false_always_reads(self, service, sample):
+        """Test integrity checks can bypass the memo."""
+        service.sha256(sample)
+        service.hash_file(sample, use_cache=False)
+
+        assert service.get_stats()["hits"] == 0
+
+    def test_lru_eviction(self, service, tmp_path):
+        """Test the memo is bounded by max_entries."""
+        for name in ("a", "b", "c"):
+            path = tmp_path / name
+            path.write_bytes(name.encode())
+            service.sha256(path)
+
+        assert service.get_stats()["entries"] == 2
+
+    def test_symlink_rejected_without_follow(self, service, sample, tmp_path):
+        """Test follow_symlinks=False refuses to hash through a symlink."""
+        link = tmp_path / "link"
+        link.symlink_to(sample)
+
+        with pytest.raises(OSError):
+            service.hash_file(link, follow_symlinks=False)
+        assert service.sha256(link) == service.sha256(sample)
+
+    def test_missing_file_raises(self, service, tmp_path):
+        """Test a missing file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            service.sha256(tmp_path / "missing")
+
+    def test_hash_files_concurrently(self, service, tmp_path):
+        """Test hash_files returns digests and per-file errors."""
+        good = tmp_path / "good"
+        good.write_bytes(b"good")
+        missing = str(tmp_path / "missing")
+
+        results = service.hash_files([str(good), missing])
+
+        assert results[str(good)].sha256 == hashlib.sha256(b"good").hexdigest()
+        assert isinstance(results[missing], FileNotFoundError)
+
+    def test_remember_seeds_memo(self, service, sample):
+        """Test digests computed during a copy are reused for the file."""
+        fake = FileDigests(sha256="f" * 64, size=sample.stat().st_size)
+        service.remember(os.stat(sample), fake)
+
+        assert service.sha256(sample) == "f" * 64
+
+    def test_shared_instance(self):
+        """Test get_hashing_service returns a process-wide instance."""
+        assert get_hashing_service() is get_hashing_service()
@@ -0,0 +1,254 @@
+# ClamUI Host Broker Tests
+"""Tests for the host-command broker, running the helper locally as a stub host."""
+
+import subprocess
+import sys
+import threading
+from unittest import mock
+
+import pytest
+
+from src.core import flatpak, host_broker
+from src.core.host_broker import HELPER_SCRIPT, HostBroker, HostBrokerError
+
+
+@pytest.fixture
+def broker():
+    """Start the helper with the local interpreter instead of flatpak-spawn."""
+    b = HostBroker(command=[sys.executable, str(HELPER_SCRIPT)])
+    b.start()
+    yield b
+    b.close()
+
+
+@pytest.fixture
+def reset_shared_broker():
+    """Isolate the module-level broker singleton."""
+    host_broker.shutdown_host_broker()
+    host_broker._broker_failed_at = None
+    yield
+    host_broker.shutdown_host_broker()
+    host_broker._broker_failed_at = None
+
+
+class TestHostBrokerOperations:
+    """Tests for each helper operation."""
+
+    def test_handshake(self, broker):
+        assert broker.is_alive
+        assert broker.request("hello")["version"] == 1
+
+    def test_run_captures_output(self, broker):
+        result = broker.run([sys.executable, "-c", "import sys; print('out'); sys.exit(3)"])
+
+        assert isinstance(result, subprocess.CompletedProcess)
+        assert result.returncode == 3
+        assert result.stdout == b"out\n"
+
+    def test_run_timeout(self, broker):
+        with pytest.raises(subprocess.TimeoutExpired):
+            broker.run([sys.executable, "-c", "import time; time.sleep(5)"], timeout=0.2)
+
+    def test_run_without_timeout_waits_for_command(self, broker, monkeypatch):
+        monkeypatch.setattr(host_broker, "REQUEST_TIMEOUT", 0.1)
+        monkeypatch.setattr(host_broker, "EXEC_REPLY_GRACE", 0.1)
+
+        result = broker.run([sys.executable, "-c", "import time; time.sleep(0.5); print('done')"])
+
+        assert result.stdout == b"done\n"
+
+    def test_run_missing_binary(self, broker):
+        with pytest.raises(FileNotFoundError):
+            broker.run(["clamui-no-such-binary"])
+
+    def test_stat(self, broker, tmp_path):
+        path = tmp_path / "clamd.conf"
+        path.write_text("LocalSocket /run/clamd.sock\n")
+
+        st = broker.stat(str(path))
+
+        assert st["exists"] and st["is_file"] and not st["is_dir"]
+        assert st["size"] == path.stat().st_size
+        assert broker.stat(str(tmp_path / "missing")) == {"exists": False}
+
+    def test_read_range(self, broker, tmp_path):
+        path = tmp_path / "daily.cvd"
+        path.write_bytes(b"ClamAV-VDB:header" + bytes(range(256)))
+
+        assert broker.read_range(str(path), 0, 10) == b"ClamAV-VDB"
+        assert broker.read_range(str(path), 17, 3) == bytes([0, 1, 2])
+
+    def test_read_range_missing_file(self, broker, tmp_path):
+        with pytest.raises(HostBrokerError) as exc_info:
+            broker.read_range(str(tmp_path / "missing"))
+        assert exc_info.value.code == "not_found"
+
+    def test_glob_is_case_insensitive(self, broker, tmp_path):
+        (tmp_path / "DAILY.CLD").write_bytes(b"x")
+        (tmp_path / "main.cvd").write_bytes(b"x")
+        (tmp_path / "daily.cvd.d").mkdir()
+
+        found = broker.glob(
+            str(tmp_path), ["daily.cvd", "daily.cld"], ignore_case=True, files_only=True
+        )
+
+        assert found == [str(tmp_path / "DAILY.CLD")]
+
+    def test_which(self, broker):
+        assert broker.which("clamui-no-such-binary") is None
+        assert broker.which("sh") is not None
+
+
+class TestHostBrokerMultiplexing:
+    """Tests for batching and concurrent use of one helper."""
+
+    def test_batch_preserves_order_and_errors(self, broker, tmp_path):
+        (tmp_path / "a").write_text("a")
+
+        results = broker.batch(
+            [
+                ("stat", {"path": str(tmp_path / "a")}),
+                ("read_range", {"path": str(tmp_path / "missing")}),
+                ("which", {"name": "clamui-no-such-binary"}),
+            ]
+        )
+
+        assert results[0]["is_file"] is True
+        assert isinstance(results[1], HostBrokerError)
+        assert results[2] == {"path": None}
+
+    def test_slow_exec_does_not_block_other_requests(self, broker):
+        slow = threading.Thread(
+            target=broker.run, args=([sys.executable, "-c", "import time; time.sleep(1)"],)
+        )
+        slow.start()
+        try:
+            # Replies are matched by id, so stat answers while exec still runs
+            assert broker.request("hello", timeout=0.5)["version"] == 1
+        finally:
+            slow.join()
+
+    def test_concurrent_callers_share_helper(self, broker, tmp_path):
+        results = {}
+
+        def worker(n):
+            path = tmp_path / f"f{n}"
+            path.write_bytes(bytes([n]) * n)
+            results[n] = broker.stat(str(path))["size"]
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(1, 21)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == {n: n for n in range(1, 21)}
+
+
+class TestHostBrokerLifecycle:
+    """Tests for start failures and helper exit."""
+
+    def test_start_failure(self):
+        b = HostBroker(command=["clamui-no-such-binary"])
+
+        with pytest.raises(HostBrokerError):
+            b.start()
+        assert not b.is_alive
+
+    def test_helper_exit_fails_pending_requests(self, broker):
+        broker._process.kill()
+        broker._reader.join(timeout=5)
+
+        assert not broker.is_alive
+        with pytest.raises(HostBrokerError):
+            broker.stat("/")
+
+    def test_get_host_broker_outside_flatpak(self, reset_shared_broker):
+        with mock.patch.object(host_broker, "is_flatpak", return_value=False):
+            assert host_broker.get_host_broker() is None
+
+    def test_get_host_broker_starts_once(self, reset_shared_broker):
+        command = [sys.executable, str(HELPER_SCRIPT)]
+        with (
+            mock.patch.object(host_broker, "is_flatpak", return_value=True),
+            mock.patch.object(host_broker, "helper_command", return_value=command) as build,
+        ):
+            first = host_broker.get_host_broker()
+            second = host_broker.get_host_broker()
+
+        assert first is not None and first is second
+        build.assert_called_once()
+
+    def test_get_host_broker_backs_off_after_failure(self, reset_shared_broker):
+        with (
+            mock.patch.object(host_broker, "is_flatpak", return_value=True),
+            mock.patch.object(
+                host_broker, "helper_command", return_value=["clamui-no-such-binary"]
+            ) as build,
+        ):
+            assert host_broker.get_host_broker() is None
+            assert host_broker.get_host_broker() is None
+
+        build.assert_called_once()
+
+    def test_disabled_by_environment(self, reset_shared_broker, monkeypatch):
+        monkeypatch.setenv(host_broker.BROKER_ENV_VAR, "0")
+        with mock.patch.object(host_broker, "is_flatpak", return_value=True):
+            assert host_broker.get_host_broker() is None
+
+
+class TestFlatpakHelpersUseBroker:
+    """Tests for the flatpak.py helpers routing through the broker."""
+
+    def test_run_host_command_decodes_text(self, broker):
+        with (
+            mock.patch.object(flatpak, "is_flatpak", return_value=True),
+            mock.patch.object(flatpak, "_get_host_broker", return_value=broker),
+            mock.patch("subprocess.run") as mock_run,
+        ):
+            result = flatpak.run_host_command([sys.executable, "-c", "print('hi')"], timeout=5)
+
+        assert result.stdout == "hi\n"
+        mock_run.assert_not_called()
+
+    def test_run_host_command_falls_back_without_broker(self):
+        with (
+            mock.patch.object(flatpak, "is_flatpak", return_value=True),
+            mock.patch.object(flatpak, "_get_host_broker", return_value=None),
+            mock.patch("subprocess.run") as mock_run,
+        ):
+            flatpak.run_host_command(["clamscan", "--version"], timeout=5)
+
+        assert mock_run.call_args.args[0] == ["flatpak-spawn", "--host", "clamscan", "--version"]
+
+    def test_host_path_exists_uses_stat(self, broker, tmp_path):
+        with (
+            mock.patch.object(flatpak, "_get_host_broker", return_value=broker),
+            mock.patch("subprocess.run") as mock_run,
+        ):
+            assert flatpak.host_path_exists(tmp_path, kind="dir") is True
+            assert flatpak.host_path_exists(tmp_path, kind="file") is False
+
+        mock_run.assert_not_called()
+
+    def test_which_host_command_uses_broker(self, broker):
+        with (
+            mock.patch.object(flatpak, "is_flatpak", return_value=True),
+            mock.patch.object(flatpak, "_get_host_broker", return_value=broker),
+            mock.patch("subprocess.run") as mock_run,
+        ):
+            assert flatpak.which_host_command("sh") is not None
+
+        mock_run.assert_not_called()
+
+    def test_read_host_file_uses_broker(self, broker, tmp_path):
+        path = tmp_path / "scan.conf"
+        path.write_text("LogFile /var/log/clamd.log\n")
+        with (
+            mock.patch.object(flatpak, "is_flatpak", return_value=True),
+            mock.patch.object(flatpak, "_get_host_broker", return_value=broker),
+        ):
+            content, error = flatpak.read_host_file(str(path))
+
+        assert error is None
+        assert content == "LogFile /var/log/clamd.log\n"
@@ -119,6 +119,24 @@ class TestLogEntry:
         assert entry.path == "/home/user"
         assert entry.duration == 120.5
 
+    def test_from_dict_keeps_scan_timing(self):
+        """Test from_dict restores timing and drops malformed timing data."""
+        timing = {
+            "total_seconds": 2.0,
+            "phases": [{"name": "scan\x1b[2J", "start": 0.0, "duration": 2.0}],
+            "stalls": [],
+            "files_scanned": 10,
+            "bytes_scanned": None,
+        }
+        data = {"id": "t1", "type": "scan", "status": "clean", "timing": timing}
+
+        entry = LogEntry.from_dict(data)
+
+        assert entry.timing["phases"] == [{"name": "scan", "start": 0.0, "duration": 2.0}]
+        assert entry.timing["files_per_second"] == 5.0
+        assert LogEntry.from_dict({**data, "timing": "fast"}).timing is None
+        assert LogEntry.from_dict({"id": "t2"}).timing is None
+
     def test_from_dict_regenerates_traversal_id(self):
         """Test from_dict rejects a path-traversal id and regenerates a safe one."""
         import uuid
@@ -1189,9 +1207,9 @@ class TestLogManagerAsync:
             callback_event.set()
 
         # Mock GLib.idle_add to call the callback directly
-        with mock.patch("src.core.log_manager.GLib") as mock_glib:
+        with mock.patch("src.core.log_manager.idle_add") as mock_idle_add:
             # Make idle_add call the function immediately
-            mock_glib.idle_add.side_effect = lambda func, *args: func(*args)
+            mock_idle_add.side_effect = lambda func, *args: func(*args)
 
             log_manager.get_logs_async(mock_callback)
 
@@ -1210,8 +1228,8 @@ class TestLogManagerAsync:
             callback_results.append(entries)
             callback_event.set()
 
-        with mock.patch("src.core.log_manager.GLib") as mock_glib:
-            mock_glib.idle_add.side_effect = lambda func, *args: func(*args)
+        with mock.patch("src.core.log_manager.idle_add") as mock_idle_add:
+            mock_idle_add.side_effect = lambda func, *args: func(*args)
 
             log_manager.get_logs_async(mock_callback)
             callback_event.wait(timeout=5)
@@ -1238,8 +1256,8 @@ class TestLogManagerAsync:
             callback_results.append(entries)
             callback_event.set()
 
-        with mock.patch("src.core.log_manager.GLib") as mock_glib:
-            mock_glib.idle_add.side_effect = lambda func, *args: func(*args)
+        with mock.patch("src.core.log_manager.idle_add") as mock_idle_add:
+            mock_idle_add.side_effect = lambda func, *args: func(*args)
 
             log_manager.get_logs_async(mock_callback, limit=5)
             callback_event.wait(timeout=5)
@@ -1272,8 +1290,8 @@ class TestLogManagerAsync:
             callback_results.append(entries)
             callback_event.set()
 
-        with mock.patch("src.core.log_manager.GLib") as mock_glib:
-            mock_glib.idle_add.side_effect = lambda func, *args: func(*args)
+        with mock.patch("src.core.log_manager.idle_add") as mock_idle_add:
+            mock_idle_add.side_effect = lambda func, *args: func(*args)
 
             log_manager.get_logs_async(mock_callback, log_type="scan")
             callback_event.wait(timeout=5)
@@ -1289,9 +1307,9 @@ class TestLogManagerAsync:
         def mock_callback(entries):
             callback_event.set()
 
-        with mock.patch("src.core.log_manager.GLib") as mock_glib:
+        with mock.patch("src.core.log_manager.idle_add") as mock_idle_add:
             # Track calls to idle_add without executing
-            mock_glib.idle_add.side_effect = lambda func, *args: (
+            mock_idle_add.side_effect = lambda func, *args: (
                 func(*args),
                 callback_event.set(),
             )
@@ -1300,7 +1318,7 @@ class TestLogManagerAsync:
             callback_event.wait(timeout=5)
 
             # Verify GLib.idle_add was called
-            assert mock_glib.idle_add.called
+            assert mock_idle_add.called
 
     def test_get_logs_async_runs_in_daemon_thread(self, log_manager):
         """Test that get_logs_async runs in a daemon thread."""
@@ -1317,8 +1335,8 @@ class TestLogManagerAsync:
             thread_info["daemon"] = self.daemon
             original_start(self)
 
-        with mock.patch("src.core.log_manager.GLib") as mock_glib:
-            mock_glib.idle_add.side_effect = lambda func, *args: func(*args)
+        with mock.patch("src.core.log_manager.idle_add") as mock_idle_add:
+            mock_idle_add.side_effect = lambda func, *args: func(*args)
 
             with mock.patch.object(threading.Thread, "start", patched_start):
                 log_manager.get_logs_async(mock_callback)
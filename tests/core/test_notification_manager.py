@@ -1013,6 +1013,19 @@ class TestDeviceScanNotifications:
             assert "USB Drive" in body
             assert "/media/usb" in body
 
+    def test_device_started_body_includes_estimate(self, notification_manager):
+        """Test device scan started body mentions the estimate when given."""
+        with mock.patch("src.core.notification_manager.Gio") as mock_gio:
+            mock_notification = mock.Mock()
+            mock_gio.Notification.new.return_value = mock_notification
+
+            notification_manager.notify_device_scan_started(
+                device_name="USB Drive", mount_point="/media/usb", estimated_seconds=300
+            )
+
+            body = mock_notification.set_body.call_args[0][0]
+            assert "about 5 minutes" in body
+
     def test_device_started_uses_correct_id(self, notification_manager):
         """Test device scan started uses correct notification ID."""
         with mock.patch("src.core.notification_manager.Gio") as mock_gio:
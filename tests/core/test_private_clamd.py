@@ -0,0 +1,174 @@
+# ClamUI Private clamd Tests
+"""Unit tests for the on-demand private clamd supervisor."""
+
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core import private_clamd
+from src.core.clamav_config import ClamAVConfig
+from src.core.private_clamd import PrivateClamd, build_private_config
+
+# Stands in for clamd: serves PING on the LocalSocket from its config file
+_FAKE_CLAMD = """\
+import socket, sys
+config = sys.argv[1].split("=", 1)[1]
+path = next(
+    line.split(" ", 1)[1].strip()
+    for line in open(config)
+    if line.startswith("LocalSocket ")
+)
+server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+server.bind(path)
+server.listen(4)
+while True:
+    conn, _addr = server.accept()
+    with conn:
+        if b"PING" in conn.recv(64):
+            conn.sendall(b"PONG\\0")
+"""
+
+
+@pytest.fixture
+def runtime_dir():
+    # Unix socket paths are limited to ~108 bytes; keep this one short
+    path = Path(tempfile.mkdtemp(prefix="cu"))
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture
+def fake_clamd(tmp_path):
+    script = tmp_path / "clamd"
+    script.write_text(f"#!{sys.executable}\n{_FAKE_CLAMD}")
+    script.chmod(0o755)
+    with (
+        patch.object(private_clamd, "is_flatpak", return_value=False),
+        patch.object(private_clamd, "_find_clamd", return_value=str(script)),
+        patch.object(private_clamd, "detect_clamd_conf_path", return_value=None),
+        patch.object(private_clamd, "get_host_database_dirs", return_value=["/var/lib/clamav"]),
+    ):
+        yield script
+
+
+class TestBuildPrivateConfig:
+    """Tests for the generated clamd.conf."""
+
+    def test_inherits_scan_options_only(self):
+        system = ClamAVConfig(file_path=Path("/etc/clamav/clamd.conf"))
+        system.add_value("MaxFileSize", "100M")
+        system.add_value("ExcludePath", "^/proc/")
+        system.add_value("ExcludePath", "^/sys/")
+        system.add_value("LocalSocket", "/run/clamav/clamd.ctl")
+        system.add_value("User", "clamav")
+
+        text = build_private_config("/run/user/1000/clamui/clamd.sock", system, "/db").to_string()
+
+        assert "LocalSocket /run/user/1000/clamui/clamd.sock\n" in text
+        assert "DatabaseDirectory /db\n" in text
+        assert "MaxFileSize 100M\n" in text
+        assert text.count("ExcludePath") == 2
+        assert "clamd.ctl" not in text
+        assert "User" not in text
+
+
+class TestPrivateClamd:
+    """Tests for PrivateClamd lifecycle."""
+
+    def test_unavailable_in_flatpak(self, runtime_dir):
+        with patch.object(private_clamd, "is_flatpak", return_value=True):
+            ok, error = PrivateClamd(runtime_dir).ensure_running()
+        assert ok is False
+        assert "Flatpak" in error
+
+    def test_unavailable_without_runtime_dir(self, monkeypatch):
+        monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+        with patch.object(private_clamd, "is_flatpak", return_value=False):
+            assert "XDG_RUNTIME_DIR" in PrivateClamd().unavailable_reason()
+
+    def test_starts_reuses_and_idles_out(self, runtime_dir, fake_clamd):
+        daemon = PrivateClamd(runtime_dir)
+        try:
+            assert daemon.ensure_running(idle_timeout=2, timeout=10) == (True, None)
+            assert daemon.is_running()
+            assert "LocalSocketMode 600" in Path(daemon.config_path).read_text()
+
+            # A second caller finds the warm daemon instead of starting another
+            with patch.object(private_clamd.subprocess, "Popen") as popen:
+                assert PrivateClamd(runtime_dir).ensure_running(idle_timeout=2) == (True, None)
+                popen.assert_not_called()
+
+            deadline = time.monotonic() + 10
+            while daemon.is_running() and time.monotonic() < deadline:
+                time.sleep(0.2)
+            assert not daemon.is_running()
+        finally:
+            daemon.stop()
+
+    def test_stop(self, runtime_dir, fake_clamd):
+        daemon = PrivateClamd(runtime_dir)
+        assert daemon.ensure_running(idle_timeout=600, timeout=10)[0] is True
+        daemon.stop()
+        deadline = time.monotonic() + 5
+        while daemon.is_running() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert not daemon.is_running()
+
+    def test_start_failure_reports_log(self, runtime_dir, fake_clamd):
+        fake_clamd.write_text("#!/bin/sh\necho 'ERROR: Can not open database' >&2\nexit 1\n")
+        ok, error = PrivateClamd(runtime_dir).ensure_running(timeout=10)
+        assert ok is False
+        assert "Can not open database" in error
+
+    def test_lease_touches_stamp(self, runtime_dir):
+        daemon = PrivateClamd(runtime_dir)
+        stamp = runtime_dir / "last-used"
+        with daemon.lease():
+            assert stamp.exists()
+
+
+class TestScannerRouting:
+    """Tests for routing auto-backend scans to the private daemon."""
+
+    def _scanner(self, enabled):
+        from src.core.scanner import Scanner
+
+        settings = MagicMock()
+        settings.get.side_effect = lambda key, default=None: {
+            "scan_backend": "auto",
+            "private_clamd_enabled": enabled,
+            "private_clamd_idle_minutes": 5,
+        }.get(key, default)
+        return Scanner(log_manager=MagicMock(), settings_manager=settings)
+
+    def test_auto_uses_private_daemon_without_system_clamd(self, tmp_path):
+        scanner = self._scanner(enabled=True)
+        private = MagicMock(config_path="/run/user/1/clamui/clamd.conf")
+        private.ensure_running.return_value = (True, None)
+
+        with (
+            patch("src.core.scanner.get_private_clamd", return_value=private),
+            patch.object(scanner, "_is_daemon_available_cached", return_value=False),
+            patch("src.core.daemon_scanner.DaemonScanner.scan_sync") as daemon_scan,
+        ):
+            scanner.scan_sync(str(tmp_path))
+
+        private.ensure_running.assert_called_once_with(idle_timeout=300)
+        private.lease.assert_called_once()
+        daemon_scan.assert_called_once()
+        assert scanner._private_daemon_scanner._get_clamd_config_path() == private.config_path
+
+    def test_disabled_private_daemon_is_not_started(self, tmp_path):
+        scanner = self._scanner(enabled=False)
+        with (
+            patch("src.core.scanner.get_private_clamd") as get_private,
+            patch.object(scanner, "_is_daemon_available_cached", return_value=False),
+            patch("src.core.scanner.check_clamav_installed", return_value=(False, "missing")),
+        ):
+            scanner.scan_sync(str(tmp_path))
+        get_private.assert_not_called()
@@ -7,10 +7,12 @@ import tempfile
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
 from src.core.quarantine.database import (
+    SCHEMA_VERSION,
     QuarantineDatabase,
     QuarantineEntry,
 )
@@ -470,6 +472,73 @@ class TestQuarantineDatabase:
         assert len(old_entries) == 0
 
 
+class TestQuarantineDatabaseSchemaVersion:
+    """Tests for PRAGMA user_version based schema versioning."""
+
+    @pytest.fixture
+    def temp_db_path(self):
+        """Create a temporary database path."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield os.path.join(tmpdir, "test_quarantine.db")
+
+    def test_new_database_is_stamped_with_schema_version(self, temp_db_path):
+        """Test a freshly created database records SCHEMA_VERSION."""
+        db = QuarantineDatabase(db_path=temp_db_path)
+        db.close()
+
+        conn = sqlite3.connect(temp_db_path)
+        try:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        finally:
+            conn.close()
+
+    def test_current_database_skips_migration(self, temp_db_path):
+        """Test reopening an up-to-date database does not run schema migration."""
+        QuarantineDatabase(db_path=temp_db_path).close()
+
+        with mock.patch.object(QuarantineDatabase, "_migrate_schema") as mock_migrate:
+            db = QuarantineDatabase(db_path=temp_db_path)
+            db.close()
+
+        mock_migrate.assert_not_called()
+
+    def test_legacy_database_is_migrated(self, temp_db_path):
+        """Test an unversioned database missing newer columns is upgraded."""
+        conn = sqlite3.connect(temp_db_path)
+        conn.execute(
+            """
+            CREATE TABLE quarantine (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                original_path TEXT NOT NULL,
+                quarantine_path TEXT NOT NULL UNIQUE,
+                threat_name TEXT NOT NULL,
+                detection_date TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                file_hash TEXT NOT NULL
+            )
+            """
+        )
+        conn.commit()
+        conn.close()
+
+        db = QuarantineDatabase(db_path=temp_db_path)
+        entry_id = db.add_entry("/legacy/file", "/q/legacy.quar", "Threat", 10, "hash", 0o600)
+        entry = db.get_entry(entry_id)
+        db.close()
+
+        assert entry is not None
+        assert entry.original_permissions == 0o600
+
+        conn = sqlite3.connect(temp_db_path)
+        try:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(quarantine)")]
+            assert "original_permissions" in columns
+            assert "state" in columns
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        finally:
+            conn.close()
+
+
 class TestQuarantineDatabasePermissionMasking:
     """Regression tests for VULN-004 — defense-in-depth permission masking.
 
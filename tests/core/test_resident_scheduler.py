@@ -0,0 +1,163 @@
+# ClamUI Resident Scheduler Tests
+"""Tests for the in-process scheduled scan timer."""
+
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+from src.core.resident_scheduler import (
+    ResidentScheduler,
+    is_resident_scheduler_running,
+    next_run_after,
+    parse_schedule_time,
+)
+from src.core.scan_scheduler import JobPriority, JobState
+
+# A Wednesday
+NOW = datetime(2026, 3, 11, 10, 30)
+
+
+class TestNextRunAfter:
+    """Tests for next_run_after."""
+
+    @pytest.mark.parametrize(
+        ("frequency", "time", "day_of_week", "day_of_month", "expected"),
+        [
+            ("hourly", "02:00", 0, 1, datetime(2026, 3, 11, 11, 0)),
+            ("daily", "12:15", 0, 1, datetime(2026, 3, 11, 12, 15)),
+            ("daily", "02:00", 0, 1, datetime(2026, 3, 12, 2, 0)),
+            ("weekly", "09:00", 4, 1, datetime(2026, 3, 13, 9, 0)),
+            ("weekly", "09:00", 2, 1, datetime(2026, 3, 18, 9, 0)),
+            ("monthly", "02:00", 0, 20, datetime(2026, 3, 20, 2, 0)),
+            ("monthly", "02:00", 0, 31, datetime(2026, 3, 28, 2, 0)),
+            ("monthly", "02:00", 0, 1, datetime(2026, 4, 1, 2, 0)),
+            ("unknown", "bad", 0, 1, datetime(2026, 3, 12, 2, 0)),
+        ],
+    )
+    def test_next_run(self, frequency, time, day_of_week, day_of_month, expected):
+        assert next_run_after(NOW, frequency, time, day_of_week, day_of_month) == expected
+
+    def test_monthly_rolls_over_year(self):
+        now = datetime(2026, 12, 15, 8, 0)
+        assert next_run_after(now, "monthly", "02:00", 0, 1) == datetime(2027, 1, 1, 2, 0)
+
+    def test_run_time_is_strictly_after_now(self):
+        now = datetime(2026, 3, 11, 2, 0)
+        assert next_run_after(now, "daily", "02:00") == datetime(2026, 3, 12, 2, 0)
+
+    @pytest.mark.parametrize("value", ["25:00", "noon", "", None])
+    def test_invalid_time_defaults_to_two(self, value):
+        assert parse_schedule_time(value) == (2, 0)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def settings():
+    values = {
+        "scheduled_scans_enabled": True,
+        "schedule_frequency": "hourly",
+        "schedule_time": "02:00",
+    }
+    manager = mock.MagicMock()
+    manager.get.side_effect = lambda key, default=None: values.get(key, default)
+    manager.values = values
+    return manager
+
+
+def make_resident(settings, tmp_path, clock):
+    scheduler = mock.MagicMock()
+    scheduler.submit.side_effect = lambda job: job
+    resident = ResidentScheduler(
+        settings,
+        run_scan=mock.MagicMock(),
+        scheduler=scheduler,
+        lock_path=tmp_path / "resident.lock",
+        clock=clock,
+    )
+    return resident, scheduler
+
+
+class TestResidentScheduler:
+    """Tests for ResidentScheduler."""
+
+    def test_submits_background_job_when_due(self, settings, tmp_path):
+        clock = FakeClock(NOW)
+        resident, scheduler = make_resident(settings, tmp_path, clock)
+
+        resident._tick()
+        assert resident.next_run == datetime(2026, 3, 11, 11, 0)
+        scheduler.submit.assert_not_called()
+
+        clock.now = datetime(2026, 3, 11, 11, 0, 5)
+        resident._tick()
+
+        job = scheduler.submit.call_args.args[0]
+        assert job.priority == JobPriority.BACKGROUND
+        assert resident.next_run == datetime(2026, 3, 11, 12, 0)
+
+    def test_missed_run_after_suspend_runs_once(self, settings, tmp_path):
+        clock = FakeClock(NOW)
+        resident, scheduler = make_resident(settings, tmp_path, clock)
+        resident._tick()
+
+        clock.now = datetime(2026, 3, 11, 15, 20)
+        resident._tick()
+        resident._tick()
+
+        scheduler.submit.assert_called_once()
+        assert resident.next_run == datetime(2026, 3, 11, 16, 0)
+
+    def test_skips_run_while_previous_is_active(self, settings, tmp_path):
+        clock = FakeClock(NOW)
+        resident, scheduler = make_resident(settings, tmp_path, clock)
+        resident._tick()
+        clock.now = datetime(2026, 3, 11, 11, 0)
+        resident._tick()
+        scheduler.submit.call_args.args[0].state = JobState.RUNNING
+
+        clock.now = datetime(2026, 3, 11, 12, 0)
+        resident._tick()
+
+        scheduler.submit.assert_called_once()
+
+    def test_disabled_schedule_has_no_next_run(self, settings, tmp_path):
+        settings.values["scheduled_scans_enabled"] = False
+        resident, scheduler = make_resident(settings, tmp_path, FakeClock(NOW))
+
+        assert resident._tick() == pytest.approx(60.0)
+        assert resident.next_run is None
+        scheduler.submit.assert_not_called()
+
+    def test_schedule_change_recomputes_next_run(self, settings, tmp_path):
+        resident, _scheduler = make_resident(settings, tmp_path, FakeClock(NOW))
+        resident._tick()
+
+        settings.values["schedule_frequency"] = "daily"
+        settings.values["schedule_time"] = "18:00"
+        resident._tick()
+
+        assert resident.next_run == datetime(2026, 3, 11, 18, 0)
+
+    def test_lock_marks_scheduler_active(self, settings, tmp_path):
+        lock_path = tmp_path / "resident.lock"
+        first, _ = make_resident(settings, tmp_path, FakeClock(NOW))
+        second, _ = make_resident(settings, tmp_path, FakeClock(NOW))
+
+        assert is_resident_scheduler_running(lock_path) is False
+        assert first.start() is True
+        try:
+            assert is_resident_scheduler_running(lock_path) is True
+            assert second.start() is False
+        finally:
+            first.stop()
+
+        assert first.is_running is False
+        assert is_resident_scheduler_running(lock_path) is False
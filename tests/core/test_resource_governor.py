@@ -0,0 +1,270 @@
+# ClamUI Resource Governor Tests
+"""Tests for scan resource policies and pressure throttling."""
+
+import signal
+from unittest import mock
+
+import pytest
+
+from src.core import resource_governor
+from src.core.resource_governor import (
+    PRIORITY_IDLE,
+    ResourceGovernor,
+    ResourcePolicy,
+    governed_command,
+    read_pressure,
+    resolve_policy,
+    system_pressure,
+)
+
+
+class FakeClock:
+    """Monotonic clock advanced by the fake sleep."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def tools():
+    """Pretend nice, ionice and a working systemd-run are installed."""
+    with (
+        mock.patch.object(resource_governor, "_find_tool", side_effect=lambda name: name),
+        mock.patch.object(resource_governor, "systemd_scope_available", return_value=True),
+    ):
+        yield
+
+
+class TestResolvePolicy:
+    """Tests for resolve_policy."""
+
+    def test_interactive_default_is_unchanged_priority(self):
+        policy = resolve_policy(None)
+        assert policy == ResourcePolicy()
+        assert not policy.throttles
+
+    def test_background_default_is_low_priority(self):
+        policy = resolve_policy(None, background=True)
+        assert policy.nice == 10
+        assert policy.io_class == "best-effort"
+        assert policy.io_level == 7
+        assert policy.pressure_threshold == 20.0
+        assert policy.load_threshold == 1.5
+        assert not policy.pause_process
+
+    def test_profile_options_override_settings(self):
+        settings = {
+            "scan_priority_interactive": "low",
+            "scan_cpu_quota_percent": 50,
+            "scan_memory_max_mb": 2048,
+            "scan_pressure_threshold": 10.0,
+        }
+        policy = resolve_policy(
+            settings,
+            profile_options={
+                "priority": PRIORITY_IDLE,
+                "memory_max_mb": 1024,
+                "systemd_scope": True,
+            },
+        )
+        assert policy.nice == 19
+        assert policy.io_class == "idle"
+        assert policy.pause_process
+        assert policy.pressure_threshold == 10.0
+        assert policy.cpu_quota_percent == 50
+        assert policy.memory_max_mb == 1024
+        assert policy.systemd_scope
+
+    def test_invalid_values_fall_back_to_defaults(self):
+        settings = mock.MagicMock()
+        policy = resolve_policy(
+            settings,
+            background=True,
+            profile_options={"priority": "turbo", "cpu_quota_percent": -5},
+        )
+        assert policy == resolve_policy(None, background=True)
+
+
+class TestGovernedCommand:
+    """Tests for governed_command."""
+
+    def test_no_policy_keeps_command(self):
+        assert governed_command(["clamscan", "-i"], None) == ["clamscan", "-i"]
+        assert governed_command(["clamscan"], ResourcePolicy()) == ["clamscan"]
+
+    def test_low_priority_prefixes_nice_and_ionice(self, tools):
+        policy = resolve_policy(None, background=True)
+        assert governed_command(["clamscan", "/home"], policy) == [
+            "nice", "-n", "10", "ionice", "-c", "2", "-n", "7", "clamscan", "/home",
+        ]  # fmt: skip
+
+    def test_scope_with_limits(self, tools):
+        policy = ResourcePolicy(
+            nice=19,
+            io_class="idle",
+            systemd_scope=True,
+            cpu_quota_percent=50,
+            io_weight=10,
+            memory_max_mb=2048,
+        )
+        assert governed_command(["clamscan"], policy) == [
+            "systemd-run", "--user", "--scope", "--quiet", "--collect",
+            "-p", "CPUQuota=50%", "-p", "IOWeight=10", "-p", "MemoryMax=2048M", "--",
+            "nice", "-n", "19", "ionice", "-c", "3", "clamscan",
+        ]  # fmt: skip
+
+    def test_scope_skipped_without_limits_or_systemd(self, tools):
+        assert governed_command(["clamscan"], ResourcePolicy(systemd_scope=True)) == ["clamscan"]
+        policy = ResourcePolicy(systemd_scope=True, memory_max_mb=512)
+        with mock.patch.object(resource_governor, "systemd_scope_available", return_value=False):
+            assert governed_command(["clamscan"], policy) == ["clamscan"]
+
+    def test_missing_tools_are_skipped(self):
+        policy = resolve_policy(None, background=True)
+        with mock.patch.object(resource_governor, "_find_tool", return_value=None):
+            assert governed_command(["clamscan"], policy) == ["clamscan"]
+
+
+class TestPressure:
+    """Tests for reading pressure stall information."""
+
+    def test_read_pressure(self, tmp_path):
+        (tmp_path / "io").write_text(
+            "some avg10=12.50 avg60=3.00 avg300=1.00 total=123\n"
+            "full avg10=8.00 avg60=2.00 avg300=0.50 total=99\n"
+        )
+        (tmp_path / "cpu").write_text("some avg10=30.25 avg60=1.00 avg300=0.00 total=5\n")
+
+        assert read_pressure("io", tmp_path) == 12.5
+        assert read_pressure("memory", tmp_path) is None
+        assert system_pressure(tmp_path) == 30.25
+
+    def test_no_psi(self, tmp_path):
+        assert system_pressure(tmp_path) is None
+
+
+class TestResourceGovernor:
+    """Tests for ResourceGovernor."""
+
+    def _governor(self, pressures, policy=None, load=0.0):
+        clock = FakeClock()
+        readings = iter(pressures)
+        governor = ResourceGovernor(
+            policy or ResourcePolicy(pressure_threshold=20.0),
+            pressure_reader=lambda: next(readings, 0.0),
+            load_reader=lambda: load,
+            sleep=clock.sleep,
+            clock=clock,
+        )
+        return governor, clock
+
+    def test_waits_until_pressure_drops(self):
+        governor, clock = self._governor([50.0, 40.0, 5.0])
+        assert governor.wait_for_headroom() == pytest.approx(4.0)
+        assert clock.now == pytest.approx(104.0)
+
+    def test_checks_are_rate_limited(self):
+        governor, _clock = self._governor([5.0, 90.0])
+        assert governor.wait_for_headroom() == 0.0
+        # The second call within the check interval does not read pressure
+        assert governor.wait_for_headroom() == 0.0
+
+    def test_wait_is_bounded_and_stoppable(self):
+        governor, clock = self._governor(iter(lambda: 99.0, None))
+        waited = governor.wait_for_headroom()
+        assert waited >= resource_governor.MAX_WAIT_SECONDS
+
+        clock.now += resource_governor.MIN_RUN_SECONDS
+        stop_after = iter([False, True])
+        assert governor.wait_for_headroom(lambda: next(stop_after)) == pytest.approx(2.0)
+
+    def test_capped_wait_is_followed_by_a_run_window(self):
+        governor, clock = self._governor(iter(lambda: 99.0, None))
+        assert governor.wait_for_headroom() >= resource_governor.MAX_WAIT_SECONDS
+
+        clock.now += resource_governor.MIN_RUN_SECONDS - 1
+        assert governor.wait_for_headroom() == 0.0
+        clock.now += 2
+        assert governor.wait_for_headroom() > 0.0
+
+    def test_load_threshold(self):
+        policy = ResourcePolicy(load_threshold=1.0)
+        assert self._governor([], policy, load=2.5)[0].is_pressured()
+        assert not self._governor([], policy, load=0.5)[0].is_pressured()
+
+    def test_normal_policy_never_waits(self):
+        governor, _clock = self._governor([99.0], ResourcePolicy())
+        assert governor.wait_for_headroom() == 0.0
+
+    def test_pause_under_pressure_stops_and_resumes_process(self):
+        policy = ResourcePolicy(pressure_threshold=20.0, pause_process=True)
+        readings = iter([90.0, 5.0])
+        governor = ResourceGovernor(policy, pressure_reader=lambda: next(readings, 5.0))
+        process = mock.MagicMock()
+        process.poll.return_value = None
+        done = mock.MagicMock()
+        done.wait.side_effect = [False, False, True]
+
+        governor._watch_process(process, None, done)
+
+        assert process.send_signal.call_args_list == [
+            mock.call(signal.SIGSTOP),
+            mock.call(signal.SIGCONT),
+        ]
+
+    def test_pause_resumes_process_on_exit(self):
+        policy = ResourcePolicy(pressure_threshold=20.0, pause_process=True)
+        governor = ResourceGovernor(policy, pressure_reader=lambda: 90.0)
+        process = mock.MagicMock()
+        process.poll.return_value = None
+        done = mock.MagicMock()
+        done.wait.side_effect = [False, True]
+
+        governor._watch_process(process, None, done)
+
+        assert process.send_signal.call_args_list[-1] == mock.call(signal.SIGCONT)
+
+    def test_forced_resume_is_not_stopped_again_immediately(self):
+        clock = FakeClock()
+        policy = ResourcePolicy(pressure_threshold=20.0, pause_process=True)
+        governor = ResourceGovernor(policy, pressure_reader=lambda: 90.0, clock=clock)
+        process = mock.MagicMock()
+        process.poll.return_value = None
+        polls = int(
+            (resource_governor.MAX_WAIT_SECONDS + resource_governor.MIN_RUN_SECONDS)
+            / resource_governor.POLL_INTERVAL_SECONDS
+        )
+        signals = []
+        process.send_signal.side_effect = lambda sig: signals.append((clock.now, sig))
+
+        def wait(timeout):
+            clock.sleep(timeout)
+            return clock.now > 100.0 + polls * timeout + timeout
+
+        done = mock.MagicMock()
+        done.wait.side_effect = wait
+
+        governor._watch_process(process, None, done)
+
+        (stopped_at, first), (resumed_at, second), (stopped_again_at, third) = signals[:3]
+        assert (first, second, third) == (signal.SIGSTOP, signal.SIGCONT, signal.SIGSTOP)
+        assert resumed_at - stopped_at >= resource_governor.MAX_WAIT_SECONDS
+        assert stopped_again_at - resumed_at >= resource_governor.MIN_RUN_SECONDS
+        assert signals[-1][1] == signal.SIGCONT
+
+    def test_pause_is_skipped_in_flatpak(self):
+        policy = ResourcePolicy(pressure_threshold=20.0, pause_process=True)
+        governor = ResourceGovernor(policy, pressure_reader=lambda: 90.0)
+        with (
+            mock.patch.object(resource_governor, "is_flatpak", return_value=True),
+            mock.patch.object(resource_governor.threading, "Thread") as thread_cls,
+            governor.pause_under_pressure(mock.MagicMock()),
+        ):
+            pass
+        thread_cls.assert_not_called()
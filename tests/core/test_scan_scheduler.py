@@ -0,0 +1,181 @@
+# ClamUI Scan Scheduler Tests
+"""Tests for the shared scan job scheduler."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from src.core.scan_scheduler import (
+    JobPriority,
+    JobState,
+    ScanJob,
+    ScanScheduler,
+    concurrency_limit,
+)
+
+
+class BlockingJobs:
+    """Creates jobs that run until released, recording their start order."""
+
+    def __init__(self):
+        self.started: list[str] = []
+        self._gates: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._started_event = threading.Condition(self._lock)
+
+    def job(self, label, priority=JobPriority.BACKGROUND, size_bytes=0):
+        gate = threading.Event()
+        self._gates[label] = gate
+
+        def run():
+            with self._lock:
+                self.started.append(label)
+                self._started_event.notify_all()
+            gate.wait(timeout=10)
+
+        return ScanJob(
+            label=label, priority=priority, run=run, cancel=gate.set, size_bytes=size_bytes
+        )
+
+    def wait_started(self, count):
+        with self._lock:
+            assert self._started_event.wait_for(lambda: len(self.started) >= count, timeout=10)
+
+    def release(self, label):
+        self._gates[label].set()
+
+    def release_all(self):
+        for gate in self._gates.values():
+            gate.set()
+
+
+@pytest.fixture
+def jobs():
+    blocking = BlockingJobs()
+    yield blocking
+    blocking.release_all()
+
+
+class TestConcurrencyLimit:
+    """Tests for concurrency_limit."""
+
+    @pytest.mark.parametrize(
+        ("backend", "cpus", "expected"),
+        [
+            ("clamscan", 4, 1),
+            ("clamscan", 16, 2),
+            ("unavailable", 16, 2),
+            ("daemon", 2, 2),
+            ("daemon", 6, 3),
+            ("daemon", 32, 4),
+        ],
+    )
+    def test_limits(self, backend, cpus, expected):
+        assert concurrency_limit(backend, cpus) == expected
+
+
+class TestScanScheduler:
+    """Tests for ScanScheduler."""
+
+    def test_queued_jobs_start_when_slot_frees(self, jobs):
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+        first = scheduler.submit(jobs.job("a"))
+        second = scheduler.submit(jobs.job("b"))
+        jobs.wait_started(1)
+
+        assert second.state is JobState.QUEUED
+        assert [job.label for job in scheduler.state().queued] == ["b"]
+
+        jobs.release("a")
+        jobs.wait_started(2)
+
+        assert jobs.started == ["a", "b"]
+        assert first.state is JobState.FINISHED
+
+    def test_smaller_devices_first_unknown_size_last(self, jobs):
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+        scheduler.submit(jobs.job("blocker"))
+        jobs.wait_started(1)
+        scheduler.submit(jobs.job("unknown"))
+        scheduler.submit(jobs.job("large", size_bytes=64 * 1024**3))
+        scheduler.submit(jobs.job("small", size_bytes=8 * 1024**3))
+
+        assert [job.label for job in scheduler.state().queued] == ["small", "large", "unknown"]
+
+        for count, label in enumerate(["blocker", "small", "large"], start=2):
+            jobs.release(label)
+            jobs.wait_started(count)
+        assert jobs.started == ["blocker", "small", "large", "unknown"]
+
+    def test_user_jobs_never_wait(self, jobs):
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+        scheduler.submit(jobs.job("device"))
+        jobs.wait_started(1)
+
+        scheduler.submit(jobs.job("user", priority=JobPriority.USER))
+        jobs.wait_started(2)
+
+        assert len(scheduler.state().running) == 2
+
+    def test_interactive_scan_holds_back_background_jobs(self, jobs):
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+
+        with scheduler.run_interactive("/home/user") as user_job:
+            queued = scheduler.submit(jobs.job("device"))
+            state = scheduler.state()
+            assert user_job.state is JobState.RUNNING
+            assert queued.state is JobState.QUEUED
+            assert state.background_running == 0
+
+        jobs.wait_started(1)
+        assert user_job.state is JobState.FINISHED
+
+    def test_cancel_queued_and_running_jobs(self, jobs):
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+        running = scheduler.submit(jobs.job("running"))
+        queued = scheduler.submit(jobs.job("queued"))
+        jobs.wait_started(1)
+
+        assert scheduler.cancel(queued.job_id) is True
+        assert queued.state is JobState.CANCELLED
+        assert scheduler.state().queued == ()
+
+        # Cancelling the running job releases its gate through job.cancel
+        assert scheduler.cancel(running.job_id) is True
+        assert scheduler.cancel(12345678) is False
+        assert jobs.started == ["running"]
+
+    def test_listeners_see_queue_changes(self, jobs):
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+        listener = mock.MagicMock()
+        scheduler.add_listener(listener)
+
+        scheduler.submit(jobs.job("a"))
+        scheduler.submit(jobs.job("b"))
+        jobs.wait_started(1)
+
+        last_state = listener.call_args.args[0]
+        assert [job.label for job in last_state.queued] == ["b"]
+        assert last_state.limit == 1
+
+        scheduler.remove_listener(listener)
+        listener.reset_mock()
+        jobs.release("a")
+        jobs.wait_started(2)
+        listener.assert_not_called()
+
+    def test_raising_limit_dispatches_waiting_jobs(self, jobs):
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+        scheduler.submit(jobs.job("a"))
+        scheduler.submit(jobs.job("b"))
+        jobs.wait_started(1)
+
+        scheduler.set_limit_provider(lambda: 2)
+
+        jobs.wait_started(2)
+        assert scheduler.state().limit == 2
+
+    def test_submit_requires_run(self):
+        with pytest.raises(ValueError, match="run"):
+            ScanScheduler().submit(ScanJob(label="nothing"))
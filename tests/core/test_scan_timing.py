@@ -0,0 +1,172 @@
+# ClamUI Scan Timing Tests
+"""Tests for ScanTimer, ScanTiming and the Chrome trace export."""
+
+import pytest
+
+from src.core.scan_timing import (
+    PHASE_COUNT,
+    PHASE_PARSE,
+    PHASE_SCAN,
+    PHASE_VALIDATE,
+    ScanTimer,
+    ScanTiming,
+    build_chrome_trace,
+    parse_data_scanned,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestScanTimer:
+    """Tests for ScanTimer."""
+
+    def test_records_sequential_phases(self, clock):
+        timer = ScanTimer(clock=clock)
+        timer.begin(PHASE_VALIDATE)
+        clock.advance(0.5)
+        timer.begin(PHASE_COUNT)
+        clock.advance(2.0)
+        timer.begin(PHASE_SCAN)
+        clock.advance(10.0)
+
+        timing = timer.snapshot(files_scanned=500)
+
+        assert [(p.name, p.start, p.duration) for p in timing.phases] == [
+            (PHASE_VALIDATE, 0.0, 0.5),
+            (PHASE_COUNT, 0.5, 2.0),
+            (PHASE_SCAN, 2.5, 10.0),
+        ]
+        assert timing.total_seconds == 12.5
+        assert timing.files_per_second == 50.0
+
+    def test_snapshot_can_be_taken_twice(self, clock):
+        timer = ScanTimer(clock=clock)
+        timer.begin(PHASE_PARSE)
+        clock.advance(1.0)
+        first = timer.snapshot()
+        timer.begin("log")
+        clock.advance(0.25)
+        second = timer.snapshot()
+
+        assert [p.name for p in first.phases] == [PHASE_PARSE]
+        assert [p.name for p in second.phases] == [PHASE_PARSE, "log"]
+        assert second.total_seconds == 1.25
+
+    def test_detects_stalls_between_and_after_output(self, clock):
+        timer = ScanTimer(stall_threshold=5.0, clock=clock)
+        timer.begin(PHASE_SCAN, watch_output=True)
+        clock.advance(1.0)
+        timer.output_received()
+        clock.advance(7.0)
+        timer.output_received()
+        clock.advance(4.0)
+        timer.output_received()
+        clock.advance(6.0)
+
+        timing = timer.snapshot()
+
+        assert [(s.start, s.duration) for s in timing.stalls] == [(1.0, 7.0), (12.0, 6.0)]
+        assert timing.stalled_seconds == 13.0
+
+    def test_unwatched_phases_never_stall(self, clock):
+        timer = ScanTimer(stall_threshold=5.0, clock=clock)
+        timer.begin(PHASE_SCAN)
+        clock.advance(60.0)
+        timer.output_received()
+
+        assert timer.snapshot().stalls == []
+
+    def test_observe_counts_callback_as_output(self, clock):
+        received = []
+        timer = ScanTimer(stall_threshold=5.0, clock=clock)
+        timer.begin(PHASE_SCAN, watch_output=True)
+        callback = timer.observe(received.append)
+        clock.advance(6.0)
+        callback("progress")
+
+        timing = timer.snapshot()
+
+        assert received == ["progress"]
+        assert [(s.start, s.duration) for s in timing.stalls] == [(0.0, 6.0)]
+
+
+class TestScanTiming:
+    """Tests for ScanTiming serialization."""
+
+    def _timing(self):
+        timer_clock = FakeClock()
+        timer = ScanTimer(clock=timer_clock)
+        timer.begin(PHASE_SCAN, watch_output=True)
+        timer_clock.advance(8.0)
+        return timer.snapshot(files_scanned=80, bytes_scanned=8 * 1024 * 1024)
+
+    def test_rates(self):
+        timing = self._timing()
+        assert timing.files_per_second == 10.0
+        assert timing.bytes_per_second == 1024 * 1024
+        assert ScanTiming(total_seconds=1.0).files_per_second is None
+
+    def test_dict_round_trip(self):
+        timing = self._timing()
+        data = timing.to_dict()
+
+        assert data["files_per_second"] == 10.0
+        assert ScanTiming.from_dict(data) == timing
+
+    @pytest.mark.parametrize(
+        "data",
+        [None, "fast", {"phases": [{"name": "scan"}]}, {"total_seconds": "slow"}],
+    )
+    def test_from_dict_rejects_malformed_data(self, data):
+        assert ScanTiming.from_dict(data) is None
+
+    def test_chrome_trace(self):
+        trace = build_chrome_trace([("/home/a", self._timing()), ("/home/b", self._timing())])
+
+        complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        assert [(e["pid"], e["name"], e["tid"]) for e in complete] == [
+            (1, "scan", 1),
+            (1, "stall", 2),
+            (2, "scan", 1),
+            (2, "stall", 2),
+        ]
+        assert complete[0]["dur"] == 8_000_000
+        names = [e["args"]["name"] for e in trace["traceEvents"] if e["name"] == "process_name"]
+        assert names == ["/home/a", "/home/b"]
+
+
+class TestParseDataScanned:
+    """Tests for parse_data_scanned."""
+
+    @pytest.mark.parametrize(
+        ("line", "expected"),
+        [
+            ("Data scanned: 2.00 MB", 2 * 1024 * 1024),
+            ("Data scanned: 1.50 MiB", int(1.5 * 1024 * 1024)),
+            ("Data scanned: 0.00 MB", 0),
+            ("Data scanned: 512 B", 512),
+        ],
+    )
+    def test_parses_summary(self, line, expected):
+        stdout = f"----------- SCAN SUMMARY -----------\nScanned files: 3\n{line}\n"
+        assert parse_data_scanned(stdout) == expected
+
+    def test_missing_summary(self):
+        assert parse_data_scanned("/tmp/a: OK\n") is None
+        assert parse_data_scanned("") is None
@@ -164,6 +164,38 @@ class TestScannerBuildCommand:
         assert "-i" in cmd
         assert str(tmp_path) in cmd
 
+    def test_build_command_file_list_replaces_path(self, tmp_path, scanner_class):
+        """Test _build_command passes --file-list instead of the scan path."""
+        scanner = scanner_class()
+        file_list = tmp_path / "files.txt"
+
+        with mock.patch("src.core.scanner.get_clamav_path", return_value="/usr/bin/clamscan"):
+            with mock.patch("src.core.scanner.wrap_host_command", side_effect=lambda x: x):
+                cmd = scanner._build_command(
+                    str(tmp_path), recursive=True, file_list_path=str(file_list)
+                )
+
+        assert cmd[-1] == f"--file-list={file_list}"
+        assert str(tmp_path) not in cmd
+        assert "-r" not in cmd
+
+    def test_build_command_applies_resource_policy(self, tmp_path, scanner_class):
+        """Test _build_command prefixes nice/ionice before the Flatpak wrapper."""
+        from src.core.resource_governor import ResourcePolicy
+
+        scanner = scanner_class()
+        policy = ResourcePolicy(nice=19, io_class="idle")
+
+        with (
+            mock.patch("src.core.scanner.get_clamav_path", return_value="/usr/bin/clamscan"),
+            mock.patch("src.core.resource_governor._find_tool", side_effect=lambda name: name),
+            mock.patch("src.core.scanner.wrap_host_command", side_effect=lambda x: x),
+        ):
+            cmd = scanner._build_command(str(tmp_path), recursive=True, resource_policy=policy)
+
+        assert cmd[:6] == ["nice", "-n", "19", "ionice", "-c", "3"]
+        assert cmd[6] == "/usr/bin/clamscan"
+
     def test_build_command_fallback_to_clamscan(self, tmp_path, scanner_class):
         """Test _build_command falls back to 'clamscan' when path not found."""
         test_file = tmp_path / "test.txt"
@@ -413,6 +445,51 @@ class TestScannerBuildCommand:
 
         assert not any(arg.startswith("--max-") for arg in cmd)
 
+    def test_clamd_limits_reparsed_only_when_file_changes(self, tmp_path):
+        """The parsed limits are reused until clamd.conf changes on disk."""
+        from src.core.clamav_config import parse_config
+
+        conf = tmp_path / "clamd.conf"
+        conf.write_text("MaxScanSize 200M\n")
+        scanner = Scanner(settings_manager=self._settings_with_clamd_conf(str(conf)))
+
+        with mock.patch("src.core.scanner.resolve_clamd_conf_path", return_value=str(conf)):
+            with mock.patch("src.core.scanner.parse_config", wraps=parse_config) as parse:
+                assert scanner._get_clamscan_limit_args() == ["--max-scansize=200M"]
+                assert scanner._get_clamscan_limit_args() == ["--max-scansize=200M"]
+                assert parse.call_count == 1
+
+                conf.write_text("MaxScanSize 300M\nMaxFiles 10\n")
+                assert scanner._get_clamscan_limit_args() == [
+                    "--max-scansize=300M",
+                    "--max-files=10",
+                ]
+                assert parse.call_count == 2
+
+    def test_exclusion_args_follow_settings_version(self, tmp_path):
+        """Cached exclusion arguments are rebuilt after the exclusions change."""
+        from src.core.settings_manager import SettingsManager
+
+        settings = SettingsManager(config_dir=tmp_path)
+        settings.set(
+            "exclusion_patterns",
+            [{"pattern": "*.tmp", "type": "file", "enabled": True}],
+        )
+        scanner = Scanner(settings_manager=settings)
+
+        with mock.patch("src.core.scanner.get_clamav_path", return_value="/usr/bin/clamscan"):
+            with mock.patch("src.core.scanner.wrap_host_command", side_effect=lambda x: x):
+                first = scanner._build_command(str(tmp_path), recursive=True)
+                settings.set(
+                    "exclusion_patterns",
+                    [{"pattern": "node_modules", "type": "directory", "enabled": True}],
+                )
+                second = scanner._build_command(str(tmp_path), recursive=True)
+
+        assert first[first.index("--exclude") + 1] == glob_to_regex("*.tmp")
+        assert "--exclude" not in second
+        assert second[second.index("--exclude-dir") + 1] == glob_to_regex("node_modules")
+
 
 class TestScannerFlatpakIntegration:
     """Tests for Flatpak integration in Scanner."""
@@ -2521,6 +2598,60 @@ class TestScannerCancelFlagReset:
         assert result.status == ScanStatus.CLEAN
 
 
+class TestScannerFilePaths:
+    """Tests for scanning an explicit file selection."""
+
+    def test_file_paths_written_to_file_list_and_removed(self, tmp_path):
+        """Selected files are passed in order through a temporary --file-list."""
+        first = tmp_path / "autorun.inf"
+        second = tmp_path / "photo.jpg"
+        first.write_text("[autorun]")
+        second.write_text("jpeg")
+        list_dir = tmp_path / "lists"
+        list_dir.mkdir()
+        seen_lists = []
+
+        def fake_popen(cmd, **_kwargs):
+            list_arg = next(arg for arg in cmd if arg.startswith("--file-list="))
+            list_path = list_arg.split("=", 1)[1]
+            with open(list_path, encoding="utf-8") as f:
+                seen_lists.append(f.read().splitlines())
+            process = mock.MagicMock()
+            process.communicate.return_value = ("", "")
+            process.returncode = 0
+            return process
+
+        scanner = Scanner()
+        with mock.patch("src.core.scanner.get_clamav_path", return_value="/usr/bin/clamscan"):
+            with mock.patch("src.core.scanner.wrap_host_command", side_effect=lambda x: x):
+                with mock.patch(
+                    "src.core.scanner.check_clamav_installed",
+                    return_value=(True, "1.0.0"),
+                ):
+                    with mock.patch(
+                        "src.core.scanner.file_list_temp_dir", return_value=str(list_dir)
+                    ):
+                        with mock.patch("subprocess.Popen", side_effect=fake_popen):
+                            result = scanner.scan_sync(
+                                str(tmp_path), file_paths=[str(first), str(second)]
+                            )
+
+        assert result.status == ScanStatus.CLEAN
+        assert seen_lists == [[str(first), str(second)]]
+        assert list(list_dir.iterdir()) == []
+
+    def test_empty_file_paths_is_clean_without_scanning(self, tmp_path):
+        """An empty selection finishes clean without starting clamscan."""
+        scanner = Scanner()
+        with mock.patch("src.core.scanner.check_clamav_installed", return_value=(True, "1.0.0")):
+            with mock.patch("subprocess.Popen") as mock_popen:
+                result = scanner.scan_sync(str(tmp_path), file_paths=[])
+
+        assert result.status == ScanStatus.CLEAN
+        assert result.scanned_files == 0
+        mock_popen.assert_not_called()
+
+
 class TestScannerBackendSelection:
     """Tests for Scanner._get_backend method and Flatpak backend support."""
 
@@ -3069,6 +3200,51 @@ class TestSaveScanLog:
         assert call_args[0][2] == 2.0
 
 
+class TestScanTiming:
+    """Tests for the per-phase timing attached to scan results."""
+
+    def test_clamscan_phases_are_recorded_and_persisted(self, tmp_path):
+        """A clamscan run records probe/scan/parse phases and logs them."""
+        test_file = tmp_path / "clean.txt"
+        test_file.write_text("clean content")
+        mock_log_manager = mock.MagicMock()
+        scanner = Scanner(log_manager=mock_log_manager)
+        mock_stdout = "Scanned files: 1\nInfected files: 0\nData scanned: 1.00 MB\n"
+
+        with (
+            mock.patch("src.core.scanner.get_clamav_path", return_value="/usr/bin/clamscan"),
+            mock.patch("src.core.scanner.wrap_host_command", side_effect=lambda x: x),
+            mock.patch("src.core.scanner.check_clamav_installed", return_value=(True, "1.0.0")),
+            mock.patch("subprocess.Popen") as mock_popen,
+        ):
+            mock_process = mock.MagicMock()
+            mock_process.communicate.return_value = (mock_stdout, "")
+            mock_process.returncode = 0
+            mock_popen.return_value = mock_process
+
+            result = scanner.scan_sync(str(test_file), backend_override="clamscan")
+
+        phases = [phase.name for phase in result.timing.phases]
+        assert phases == ["validate", "probe", "scan", "parse", "log"]
+        assert result.timing.bytes_scanned == 1024 * 1024
+        entry = mock_log_manager.save_log.call_args[0][0]
+        # The persisted timing stops where log persistence starts
+        assert [phase["name"] for phase in entry.timing["phases"]] == phases[:-1]
+        assert entry.duration == pytest.approx(entry.timing["total_seconds"], abs=1e-3)
+
+    def test_early_error_still_has_timing(self):
+        """Results returned before the scan runs carry the phases that did run."""
+        scanner = Scanner(log_manager=mock.MagicMock())
+
+        with mock.patch(
+            "src.core.scanner.validate_path",
+            return_value=(False, "Path does not exist"),
+        ):
+            result = scanner.scan_sync("/nonexistent/path/to/scan")
+
+        assert [phase.name for phase in result.timing.phases] == ["validate", "log"]
+
+
 class TestScannerBackendOverride:
     """Tests for one-shot backend overrides during scans."""
 
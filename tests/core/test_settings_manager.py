@@ -3,12 +3,18 @@
 
 import json
 import tempfile
+import threading
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
-from src.core.settings_manager import SettingsManager
+from src.core.settings_manager import (
+    SettingsManager,
+    SettingsSnapshot,
+    SnapshotCache,
+    settings_view,
+)
 
 
 class TestSettingsManagerInit:
@@ -337,6 +343,316 @@ class TestSettingsManagerListeners:
         callback.assert_called_once_with("auto")
 
 
+class TestSettingsManagerBatch:
+    """Tests for batch() and the deferred write mode."""
+
+    @pytest.fixture
+    def temp_config_dir(self):
+        """Create a temporary directory for settings storage."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield tmpdir
+
+    @pytest.fixture
+    def settings_manager(self, temp_config_dir):
+        """Create a SettingsManager with a temporary directory."""
+        return SettingsManager(config_dir=temp_config_dir)
+
+    def test_batch_saves_and_notifies_once(self, settings_manager):
+        """Test a batch writes once and notifies each changed key once."""
+        backend_listener = mock.MagicMock()
+        change_listener = mock.MagicMock()
+        settings_manager.add_listener("scan_backend", backend_listener)
+        settings_manager.add_change_listener(change_listener)
+
+        with mock.patch.object(settings_manager, "save", return_value=True) as save:
+            with settings_manager.batch() as batch:
+                settings_manager.set("scan_backend", "clamscan")
+                settings_manager.set("scan_backend", "daemon")
+                settings_manager.set("schedule_time", "03:00")
+                settings_manager.set("schedule_frequency", "weekly")  # unchanged default
+                assert settings_manager.get("scan_backend") == "daemon"
+                save.assert_not_called()
+                backend_listener.assert_not_called()
+
+        save.assert_called_once()
+        backend_listener.assert_called_once_with("daemon")
+        change_listener.assert_called_once_with(frozenset({"scan_backend", "schedule_time"}))
+        assert batch.changed_keys == {"scan_backend", "schedule_time"}
+        assert batch.saved is True
+
+    def test_nested_batches_commit_at_outermost(self, settings_manager):
+        """Test nested batches defer everything to the outermost block."""
+        change_listener = mock.MagicMock()
+        settings_manager.add_change_listener(change_listener)
+
+        with settings_manager.batch():
+            with settings_manager.batch():
+                settings_manager.set("scan_backend", "daemon")
+            change_listener.assert_not_called()
+            settings_manager.set("schedule_time", "03:00")
+
+        change_listener.assert_called_once_with(frozenset({"scan_backend", "schedule_time"}))
+
+    def test_batch_without_changes_does_not_save(self, settings_manager):
+        """Test a batch that changes nothing skips the write."""
+        with mock.patch.object(settings_manager, "save") as save:
+            with settings_manager.batch() as batch:
+                settings_manager.set("scan_backend", "auto")
+
+        save.assert_not_called()
+        assert batch.changed_keys == frozenset()
+
+    def test_batch_does_not_capture_other_threads(self, settings_manager):
+        """Test set() from another thread saves immediately and survives a rollback."""
+        listener = mock.MagicMock()
+        settings_manager.add_listener("schedule_time", listener)
+
+        def set_from_worker():
+            settings_manager.set("schedule_time", "04:00")
+
+        def change_then_fail():
+            with settings_manager.batch():
+                settings_manager.set("scan_backend", "daemon")
+                worker = threading.Thread(target=set_from_worker)
+                worker.start()
+                worker.join()
+                listener.assert_called_once_with("04:00")
+                raise RuntimeError("validation failed")
+
+        with pytest.raises(RuntimeError):
+            change_then_fail()
+
+        assert settings_manager.get("schedule_time") == "04:00"
+        assert settings_manager.get("scan_backend") == "auto"
+
+    def test_batch_values_stay_private_until_commit(self, settings_manager, temp_config_dir):
+        """Test a save from another thread does not publish uncommitted batch values."""
+        seen = {}
+
+        def set_from_worker():
+            seen["backend"] = settings_manager.get("scan_backend")
+            settings_manager.set("schedule_time", "04:00")
+
+        def change_then_fail():
+            with settings_manager.batch():
+                settings_manager.set("scan_backend", "clamscan")
+                worker = threading.Thread(target=set_from_worker)
+                worker.start()
+                worker.join()
+                assert settings_manager.get("scan_backend") == "clamscan"
+                assert settings_manager.snapshot()["scan_backend"] == "auto"
+                raise RuntimeError("validation failed")
+
+        with pytest.raises(RuntimeError):
+            change_then_fail()
+
+        assert seen["backend"] == "auto"
+        assert settings_manager.get("scan_backend") == "auto"
+        assert settings_manager.snapshot()["scan_backend"] == "auto"
+        saved = json.loads((Path(temp_config_dir) / "settings.json").read_text())
+        assert saved["scan_backend"] == "auto"
+        assert saved["schedule_time"] == "04:00"
+
+    def test_batch_saves_value_mutated_in_place(self, settings_manager):
+        """Test a list changed in place and set again counts as a change."""
+        types = settings_manager.get("device_auto_scan_types")
+
+        with mock.patch.object(settings_manager, "save", return_value=True) as save:
+            with settings_manager.batch() as batch:
+                types.append("internal")
+                settings_manager.set("device_auto_scan_types", types)
+
+        save.assert_called_once()
+        assert batch.changed_keys == {"device_auto_scan_types"}
+
+    def test_batch_original_is_a_copy(self, settings_manager):
+        """Test the original value is snapshotted, not referenced."""
+        types = settings_manager.get("device_auto_scan_types")
+
+        with mock.patch.object(settings_manager, "save", return_value=True) as save:
+            with settings_manager.batch() as batch:
+                settings_manager.set("device_auto_scan_types", [])
+                types.append("internal")
+                settings_manager.set("device_auto_scan_types", types)
+
+        save.assert_called_once()
+        assert batch.changed_keys == {"device_auto_scan_types"}
+
+    def test_exception_rolls_back_batch(self, settings_manager, temp_config_dir):
+        """Test an exception leaving the batch restores previous values."""
+        listener = mock.MagicMock()
+        settings_manager.add_change_listener(listener)
+
+        def change_then_fail():
+            with settings_manager.batch():
+                settings_manager.set("scan_backend", "daemon")
+                settings_manager.set("brand_new_key", 1)
+                raise RuntimeError("validation failed")
+
+        with pytest.raises(RuntimeError):
+            change_then_fail()
+
+        assert settings_manager.get("scan_backend") == "auto"
+        assert "brand_new_key" not in settings_manager.get_all()
+        listener.assert_not_called()
+        assert not (Path(temp_config_dir) / "settings.json").exists()
+
+    def test_plain_set_notifies_change_listeners(self, settings_manager):
+        """Test change listeners also hear about single set() calls."""
+        listener = mock.MagicMock()
+        settings_manager.add_change_listener(listener)
+        settings_manager.set("scan_backend", "daemon")
+        settings_manager.remove_change_listener(listener)
+        settings_manager.set("scan_backend", "clamscan")
+
+        listener.assert_called_once_with(frozenset({"scan_backend"}))
+
+    def test_write_delay_coalesces_until_flush(self, temp_config_dir):
+        """Test deferred writes reach disk on flush()."""
+        manager = SettingsManager(config_dir=temp_config_dir, write_delay=60)
+        settings_file = Path(temp_config_dir) / "settings.json"
+
+        assert manager.set("scan_backend", "daemon") is True
+        assert manager.set("schedule_time", "03:00") is True
+        assert not settings_file.exists()
+
+        assert manager.flush() is True
+        saved = json.loads(settings_file.read_text())
+        assert saved["scan_backend"] == "daemon"
+        assert saved["schedule_time"] == "03:00"
+
+    def test_write_delay_timer_writes(self, temp_config_dir):
+        """Test the deferred write happens by itself after the delay."""
+        manager = SettingsManager(config_dir=temp_config_dir, write_delay=0.05)
+        manager.set("scan_backend", "daemon")
+        timer = manager._write_timer
+
+        timer.join(timeout=5)
+
+        saved = json.loads((Path(temp_config_dir) / "settings.json").read_text())
+        assert saved["scan_backend"] == "daemon"
+
+    def test_flush_without_pending_changes(self, settings_manager):
+        """Test flush() is a no-op when nothing is pending."""
+        with mock.patch.object(settings_manager, "save") as save:
+            assert settings_manager.flush() is True
+        save.assert_not_called()
+
+
+class TestSettingsManagerSnapshot:
+    """Tests for snapshot(), SnapshotCache and settings_view()."""
+
+    @pytest.fixture
+    def settings_manager(self):
+        """Create a SettingsManager with a temporary directory."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield SettingsManager(config_dir=tmpdir)
+
+    def test_snapshot_is_frozen_copy(self, settings_manager):
+        """Test snapshots are immutable and unaffected by later changes."""
+        settings_manager.set("exclusion_patterns", [{"pattern": "*.tmp", "enabled": True}])
+        snapshot = settings_manager.snapshot()
+
+        assert isinstance(snapshot, SettingsSnapshot)
+        assert snapshot["exclusion_patterns"][0]["pattern"] == "*.tmp"
+        with pytest.raises(TypeError):
+            snapshot["exclusion_patterns"][0]["pattern"] = "*.log"
+        assert not hasattr(snapshot["exclusion_patterns"], "append")
+
+        settings_manager.set("exclusion_patterns", [])
+        assert snapshot["exclusion_patterns"][0]["pattern"] == "*.tmp"
+        assert settings_manager.snapshot()["exclusion_patterns"] == ()
+
+    def test_version_increases_with_each_commit(self, settings_manager):
+        """Test set(), batch() and reset_to_defaults() publish new versions."""
+        versions = [settings_manager.version]
+        settings_manager.set("scan_backend", "daemon")
+        versions.append(settings_manager.version)
+        with settings_manager.batch():
+            settings_manager.set("scan_backend", "clamscan")
+            settings_manager.set("schedule_time", "03:00")
+            assert settings_manager.version == versions[-1]
+            assert settings_manager.snapshot()["scan_backend"] == "daemon"
+        versions.append(settings_manager.version)
+        settings_manager.reset_to_defaults()
+        versions.append(settings_manager.version)
+
+        assert versions == sorted(set(versions))
+        assert settings_manager.snapshot()["scan_backend"] == "auto"
+
+    def test_rolled_back_batch_keeps_snapshot(self, settings_manager):
+        """Test a failed batch publishes nothing."""
+        snapshot = settings_manager.snapshot()
+
+        def fail_in_batch():
+            with settings_manager.batch():
+                settings_manager.set("scan_backend", "daemon")
+                raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError):
+            fail_in_batch()
+
+        assert settings_manager.snapshot() is snapshot
+
+    def test_snapshot_cache_recomputes_on_new_version(self, settings_manager):
+        """Test SnapshotCache derives once per version."""
+        derive = mock.MagicMock(side_effect=lambda settings: settings.get("scan_backend"))
+        cache = SnapshotCache(derive)
+
+        assert cache.get(settings_view(settings_manager)) == "auto"
+        assert cache.get(settings_view(settings_manager)) == "auto"
+        settings_manager.set("scan_backend", "daemon")
+        assert cache.get(settings_view(settings_manager)) == "daemon"
+
+        assert derive.call_count == 2
+
+    def test_settings_view_passes_other_objects_through(self):
+        """Test objects without real snapshots are used as they are."""
+        fake_settings = mock.MagicMock()
+        cache = SnapshotCache(lambda settings: settings.get("scan_backend"))
+
+        assert settings_view(None) is None
+        assert settings_view(fake_settings) is fake_settings
+        cache.get(fake_settings)
+        cache.get(fake_settings)
+        assert fake_settings.get.call_count == 2
+
+
+class TestSettingsManagerReload:
+    """Tests for reload()."""
+
+    def test_reload_picks_up_changes_from_another_process(self):
+        """Test reload() applies a file written by another SettingsManager."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            resident = SettingsManager(config_dir=tmpdir)
+            app = SettingsManager(config_dir=tmpdir)
+            listener = mock.MagicMock()
+            resident.add_listener("schedule_frequency", listener)
+            version = resident.version
+
+            assert resident.reload() is False
+
+            app.set("schedule_frequency", "hourly")
+
+            assert resident.reload() is True
+            assert resident.get("schedule_frequency") == "hourly"
+            assert resident.version > version
+            listener.assert_called_once_with("hourly")
+            assert resident.reload() is False
+
+    def test_reload_keeps_pending_local_changes(self):
+        """Test reload() does not drop changes waiting for the write delay."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = SettingsManager(config_dir=tmpdir, write_delay=60)
+            other = SettingsManager(config_dir=tmpdir)
+            settings.set("scan_backend", "daemon")
+            other.set("schedule_frequency", "hourly")
+
+            assert settings.reload() is False
+            assert settings.get("scan_backend") == "daemon"
+            settings.flush()
+
+
 class TestSettingsManagerErrorHandling:
     """Tests for SettingsManager error handling."""
 
@@ -2,8 +2,14 @@
 """Unit tests for the system audit module."""
 
 import subprocess
+import sys
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
+import pytest
+
+from src.core.database_inventory import DatabaseFileInfo, DatabaseInventorySnapshot
 from src.core.flatpak import get_clean_env
 from src.core.portmaster_client import (
     PortmasterModuleRow,
@@ -20,11 +26,13 @@ from src.core.system_audit import (
     _check_open_ports,
     _check_systemd_service,
     _check_ufw_enabled,
+    _command_memo,
+    _CommandMemo,
     _database_age_from_daemon,
     _get_database_age,
-    _parse_cvd_age,
     _parse_sshd_config,
     _run_command,
+    _stream_deep_scan,
     check_auto_updates,
     check_clamav_health,
     check_firewall,
@@ -32,8 +40,11 @@ from src.core.system_audit import (
     check_mac_framework,
     check_portmaster,
     check_ssh_hardening,
+    get_last_deep_scan,
+    iter_tier1_audit,
     run_lynis_audit,
     run_rootkit_check,
+    run_tier1_audit,
 )
 
 # =============================================================================
@@ -199,106 +210,6 @@ class TestCheckSystemdService:
         assert status == "systemctl not found"
 
 
-class TestParseCvdAge:
-    """Tests for _parse_cvd_age helper."""
-
-    def test_valid_cvd_header(self, tmp_path):
-        """Test parsing a valid CVD header."""
-        import time
-
-        # Build timestamp 2 days ago
-        build_ts = int(time.time()) - (2 * 86400)
-        header = f"ClamAV-VDB:02 Apr 2026:100:1000000:77:md5:dsig:builder:{build_ts}"
-        header_bytes = header.encode("ascii")
-        # Pad with null bytes to 512 bytes (real CVD format)
-        header_bytes += b"\x00" * (512 - len(header_bytes))
-
-        cvd_file = tmp_path / "daily.cvd"
-        cvd_file.write_bytes(header_bytes)
-
-        days_old, date_str = _parse_cvd_age(str(cvd_file))
-        assert days_old is not None
-        assert days_old >= 1  # At least 1 day old (rounding)
-        assert date_str == "02 Apr 2026"
-
-    def test_missing_file(self):
-        days_old, error = _parse_cvd_age("/nonexistent/path/daily.cvd")
-        assert days_old is None
-        assert error is not None
-
-    def test_invalid_format(self, tmp_path):
-        cvd_file = tmp_path / "bad.cvd"
-        cvd_file.write_text("not a valid cvd file")
-
-        days_old, error = _parse_cvd_age(str(cvd_file))
-        assert days_old is None
-        assert error is not None
-
-    def test_stime_followed_by_binary_payload(self, tmp_path):
-        """Regression: real .cld/.cvd files append the gzip-compressed payload
-        directly after the stime field with no delimiter.
-
-        ascii-decoding the raw 512-byte header (errors="ignore") drops bytes
-        >= 128 but keeps the many payload bytes that fall in 0-127 by chance,
-        appending them straight onto the stime digits. The old
-        strip().strip("\\x00") did not remove those arbitrary binary bytes, so
-        int(stime) raised ValueError and a healthy database was reported as
-        "age could not be determined". The fix takes only the leading digit run.
-        """
-        import time
-
-        build_ts = int(time.time()) - (3 * 86400)
-        header_text = f"ClamAV-VDB:24 Jun 2026:27000:2000000:90:md5:dsig:builder:{build_ts}"
-        # Binary payload appended directly after the stime digits -- NO null
-        # padding and NO newline, exactly as observed on a real daily.cld.
-        junk = b"\x1f\x08\x00\x1e-3<>i\x7f$2Yi\x01*X\x01wvi" + bytes(range(256)) * 2
-        cvd_file = tmp_path / "daily.cld"
-        cvd_file.write_bytes(header_text.encode("ascii") + junk)
-
-        days_old, date_str = _parse_cvd_age(str(cvd_file))
-        assert days_old == 3
-        assert date_str == "24 Jun 2026"
-
-    @patch("src.core.system_audit.subprocess.run")
-    @patch("src.core.system_audit.is_flatpak", return_value=True)
-    def test_flatpak_head_bytes_stdout_with_gzip_payload(self, mock_is_flatpak, mock_run):
-        """Regression for issue #162 (reported on Flatpak): the header is read
-        via ``flatpak-spawn --host head -c 512`` WITHOUT text=True, so stdout
-        is raw BYTES with the gzip payload glued straight onto the stime
-        digits. The bytes path must decode and parse just like direct file I/O.
-        """
-        import time
-
-        build_ts = int(time.time()) - (3 * 86400)
-        header_text = f"ClamAV-VDB:24 Jun 2026:27000:2000000:90:md5:dsig:builder:{build_ts}"
-        # gzip magic then a spread of high and low bytes, appended directly
-        # after the stime digits with no separator; exactly 512 bytes total,
-        # as `head -c 512` returns on a real daily.cld.
-        junk = b"\x1f\x8b\x08\x00" + bytes(range(255, -1, -1)) * 2
-        raw = (header_text.encode("ascii") + junk)[:512]
-        assert len(raw) == 512
-        mock_run.return_value = MagicMock(returncode=0, stdout=raw, stderr=b"")
-
-        days_old, date_str = _parse_cvd_age("/var/lib/clamav/daily.cld")
-
-        assert days_old == 3
-        assert date_str == "24 Jun 2026"
-        mock_is_flatpak.assert_called_once()
-
-    def test_stime_with_no_leading_digits(self, tmp_path):
-        """When the 9th field starts directly with non-digit binary bytes
-        (payload where the stime should be), the digit-run match returns None
-        and the ValueError path must report the timestamp parse error."""
-        header_text = "ClamAV-VDB:24 Jun 2026:27000:2000000:90:md5:dsig:builder:"
-        junk = b"\x1f\x8b\x08\x00\x1e-3<>i\x7f$2Yi\x01*X\x01wvi"
-        cvd_file = tmp_path / "daily.cld"
-        cvd_file.write_bytes(header_text.encode("ascii") + junk)
-
-        days_old, error = _parse_cvd_age(str(cvd_file))
-        assert days_old is None
-        assert error == "Could not parse database timestamp"
-
-
 class TestRunCommand:
     """Tests for the _run_command helper."""
 
@@ -354,26 +265,40 @@ class TestDatabaseAgeDaemonFallback:
         assert _database_age_from_daemon() == (None, None)
 
     @patch("src.core.system_audit._database_age_from_daemon")
-    @patch("src.core.system_audit._find_daily_cvd_path")
-    def test_get_database_age_falls_back_to_daemon(self, mock_find, mock_daemon):
+    @patch("src.core.system_audit.get_database_inventory")
+    def test_get_database_age_falls_back_to_daemon(self, mock_inventory, mock_daemon):
         # File not found / unreadable -> consult the daemon.
-        mock_find.return_value = None
+        mock_inventory.return_value.get.return_value = DatabaseInventorySnapshot()
         mock_daemon.return_value = (2, "Thu May 28 09:00:00 2026")
 
         assert _get_database_age() == (2, "Thu May 28 09:00:00 2026")
         mock_daemon.assert_called_once()
 
     @patch("src.core.system_audit._database_age_from_daemon")
-    @patch("src.core.system_audit._parse_cvd_age")
-    @patch("src.core.system_audit._find_daily_cvd_path")
-    def test_get_database_age_prefers_readable_file(self, mock_find, mock_parse, mock_daemon):
+    @patch("src.core.system_audit.get_database_inventory")
+    def test_get_database_age_prefers_readable_file(self, mock_inventory, mock_daemon):
         # A readable file header wins; the daemon is not consulted.
-        mock_find.return_value = "/var/lib/clamav/daily.cvd"
-        mock_parse.return_value = (1, "28 May 2026")
+        daily = DatabaseFileInfo(
+            name="daily.cvd",
+            path="/var/lib/clamav/daily.cvd",
+            build_date="28 May 2026",
+            build_time=int(time.time()) - 86400 - 60,
+        )
+        mock_inventory.return_value.get.return_value = DatabaseInventorySnapshot(files=[daily])
 
         assert _get_database_age() == (1, "28 May 2026")
         mock_daemon.assert_not_called()
 
+    @patch("src.core.system_audit._database_age_from_daemon")
+    @patch("src.core.system_audit.get_database_inventory")
+    def test_get_database_age_unparseable_header_uses_daemon(self, mock_inventory, mock_daemon):
+        daily = DatabaseFileInfo(name="daily.cld", path="/var/lib/clamav/daily.cld")
+        mock_inventory.return_value.get.return_value = DatabaseInventorySnapshot(files=[daily])
+        mock_daemon.return_value = (None, None)
+
+        assert _get_database_age() == (None, None)
+        mock_daemon.assert_called_once()
+
 
 # =============================================================================
 # Check Function Tests
@@ -395,13 +320,13 @@ class TestCheckClamavHealth:
     @patch("src.core.system_audit._database_age_from_daemon")
     @patch("src.core.system_audit._check_systemd_service")
     @patch("src.core.system_audit.check_clamd_connection")
-    @patch("src.core.system_audit._find_daily_cvd_path")
+    @patch("src.core.system_audit.get_database_inventory")
     @patch("src.core.system_audit.check_clamav_installed")
     def test_clamav_healthy(
-        self, mock_installed, mock_cvd_path, mock_clamd, mock_systemd, mock_daemon_age
+        self, mock_installed, mock_inventory, mock_clamd, mock_systemd, mock_daemon_age
     ):
         mock_installed.return_value = (True, "ClamAV 1.0.0")
-        mock_cvd_path.return_value = None
+        mock_inventory.return_value.get.return_value = DatabaseInventorySnapshot()
         mock_daemon_age.return_value = (None, None)
         mock_clamd.return_value = (True, "PONG")
         # Simulate: clamav-daemon active on first call,
@@ -692,6 +617,32 @@ class TestCheckAutoUpdates:
 # =============================================================================
 
 
+def _fake_stream(returncode=0, stdout="", stderr="", cancelled=False):
+    """Build a _stream_deep_scan replacement that replays stdout line by line."""
+
+    def stream(argv, on_line, is_cancelled=None, timeout=300):
+        for line in stdout.splitlines():
+            on_line(line)
+        return (None if cancelled else returncode), stdout, stderr, cancelled
+
+    return stream
+
+
+_LYNIS_OUTPUT = """[+] Boot and services
+  - Service Manager                                           [ systemd ]
+  - Checking UEFI boot                                        [ DISABLED ]
+[+] Kernel
+  - Checking core dumps configuration                         [ WARNING ]
+[+] Networking
+  - Checking promiscuous interfaces                           [ OK ]
+  - Checking for exposed services                             [ EXPOSED ]
+
+  Lynis security scan details:
+
+  Hardening index : 64 [############        ]
+"""
+
+
 class TestRunLynisAudit:
     """Tests for run_lynis_audit function."""
 
@@ -703,14 +654,75 @@ class TestRunLynisAudit:
         assert result.checks[0].status == AuditStatus.UNKNOWN
 
     @patch("src.core.system_audit._parse_lynis_report")
-    @patch("src.core.system_audit.subprocess.run")
+    @patch("src.core.system_audit._stream_deep_scan", new=_fake_stream(returncode=126))
     @patch("src.core.system_audit._run_command")
-    def test_lynis_pkexec_cancelled(self, mock_cmd, mock_run, mock_report):
+    def test_lynis_pkexec_cancelled(self, mock_cmd, mock_report):
         mock_cmd.return_value = (0, "/usr/bin/lynis", "")
-        mock_run.return_value = MagicMock(returncode=126, stdout="", stderr="")
         result = run_lynis_audit()
         assert result.checks[0].status == AuditStatus.SKIPPED
 
+    @patch("src.core.system_audit._parse_lynis_report")
+    @patch("src.core.system_audit._run_command")
+    def test_streams_phases_and_findings(self, mock_cmd, mock_report):
+        mock_cmd.return_value = (0, "/usr/bin/lynis", "")
+        progress = []
+        with patch(
+            "src.core.system_audit._stream_deep_scan", new=_fake_stream(stdout=_LYNIS_OUTPUT)
+        ):
+            result = run_lynis_audit(progress_callback=progress.append)
+
+        assert [p.phase for p in progress] == [
+            "Boot and services",
+            "Kernel",
+            "Kernel",
+            "Networking",
+            "Networking",
+        ]
+        assert progress[-1].phases == 3
+        assert len(progress[-1].findings) == 2
+        # The score printed in stdout is used; the report file is not read
+        mock_report.assert_not_called()
+        assert result.checks[0].name == "Hardening Index"
+        assert result.checks[0].status == AuditStatus.WARNING
+        assert "64" in result.checks[0].detail
+        assert [c.detail for c in result.checks[1:]] == [
+            "Checking core dumps configuration: warning",
+            "Checking for exposed services: exposed",
+        ]
+
+    @patch("src.core.system_audit._parse_lynis_report", return_value=82)
+    @patch("src.core.system_audit._run_command")
+    def test_falls_back_to_report_file(self, mock_cmd, mock_report):
+        mock_cmd.return_value = (0, "/usr/bin/lynis", "")
+        with patch(
+            "src.core.system_audit._stream_deep_scan",
+            new=_fake_stream(stdout="[+] Kernel\n"),
+        ):
+            result = run_lynis_audit()
+        assert result.checks[0].status == AuditStatus.PASS
+        assert "82" in result.checks[0].detail
+
+    @patch.dict("src.core.system_audit._last_deep_scans", clear=True)
+    @patch("src.core.system_audit._run_command")
+    def test_cancelled_scan_is_skipped_and_not_remembered(self, mock_cmd):
+        mock_cmd.return_value = (0, "/usr/bin/lynis", "")
+        with patch(
+            "src.core.system_audit._stream_deep_scan",
+            new=_fake_stream(stdout="[+] Kernel\n", cancelled=True),
+        ):
+            result = run_lynis_audit()
+        assert result.checks[0].status == AuditStatus.SKIPPED
+        assert get_last_deep_scan(AuditCategory.DEEP_SCAN_LYNIS) is None
+
+    @patch.dict("src.core.system_audit._last_deep_scans", clear=True)
+    @patch("src.core.system_audit._parse_lynis_report", return_value=75)
+    @patch("src.core.system_audit._run_command")
+    def test_completed_scan_is_remembered(self, mock_cmd, mock_report):
+        mock_cmd.return_value = (0, "/usr/bin/lynis", "")
+        with patch("src.core.system_audit._stream_deep_scan", new=_fake_stream()):
+            result = run_lynis_audit()
+        assert get_last_deep_scan(AuditCategory.DEEP_SCAN_LYNIS) is result
+
 
 class TestRunRootkitCheck:
     """Tests for run_rootkit_check function."""
@@ -722,66 +734,130 @@ class TestRunRootkitCheck:
         assert result.category == AuditCategory.DEEP_SCAN_ROOTKIT
         assert result.checks[0].status == AuditStatus.UNKNOWN
 
-    @patch("src.core.system_audit.subprocess.run")
+    @patch(
+        "src.core.system_audit._stream_deep_scan",
+        new=_fake_stream(
+            stdout="Checking `amd'... not found\nChecking `basename'... not infected\n"
+        ),
+    )
     @patch("src.core.system_audit._run_command")
-    def test_chkrootkit_clean(self, mock_cmd, mock_run):
+    def test_chkrootkit_clean(self, mock_cmd):
         mock_cmd.return_value = (0, "/usr/sbin/chkrootkit", "")
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="Checking `amd'... not found\nChecking `basename'... not infected\n",
-            stderr="",
-        )
         result = run_rootkit_check()
         assert any(c.status == AuditStatus.PASS for c in result.checks)
 
-    @patch("src.core.system_audit.subprocess.run")
+    @patch(
+        "src.core.system_audit._stream_deep_scan",
+        new=_fake_stream(returncode=2, stderr="chkrootkit: cannot find a temporary directory\n"),
+    )
     @patch("src.core.system_audit._run_command")
-    def test_chkrootkit_nonzero_exit_is_not_clean(self, mock_cmd, mock_run):
+    def test_chkrootkit_nonzero_exit_is_not_clean(self, mock_cmd):
         """A non-zero chkrootkit exit means the scan did not complete; we must
         report UNKNOWN, never a false 'No rootkits detected' PASS."""
         mock_cmd.return_value = (0, "/usr/sbin/chkrootkit", "")
-        mock_run.return_value = MagicMock(
-            returncode=2,
-            stdout="",
-            stderr="chkrootkit: cannot find a temporary directory\n",
-        )
         result = run_rootkit_check()
         statuses = [c.status for c in result.checks]
         assert AuditStatus.UNKNOWN in statuses
         assert not any(c.status == AuditStatus.PASS for c in result.checks)
 
-    @patch("src.core.system_audit.subprocess.run")
+    @patch(
+        "src.core.system_audit._stream_deep_scan",
+        new=_fake_stream(stdout="Checking `bindshell'... INFECTED\n"),
+    )
     @patch("src.core.system_audit._run_command")
-    def test_chkrootkit_infected(self, mock_cmd, mock_run):
+    def test_chkrootkit_infected(self, mock_cmd):
         mock_cmd.return_value = (0, "/usr/sbin/chkrootkit", "")
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout="Checking `bindshell'... INFECTED\n",
-            stderr="",
-        )
         result = run_rootkit_check()
         assert any(c.status == AuditStatus.FAIL for c in result.checks)
 
-    @patch("src.core.system_audit.subprocess.run")
+    @patch(
+        "src.core.system_audit._stream_deep_scan",
+        new=_fake_stream(
+            stdout=(
+                "Checking `bindshell'... INFECTED\n"
+                "Checking `lkm'... INFECTED\n"
+                "Checking `sniffer'... INFECTED\n"
+            )
+        ),
+    )
     @patch("src.core.system_audit._run_command")
-    def test_chkrootkit_multiple_infected_counted_individually(self, mock_cmd, mock_run):
+    def test_chkrootkit_multiple_infected_counted_individually(self, mock_cmd):
         """Each INFECTED line must be parsed as a separate finding. Sanitizing the
         whole multiline stdout with a single-line sanitizer collapses newlines and
         would merge every finding into one, undercounting the rootkits."""
         mock_cmd.return_value = (0, "/usr/sbin/chkrootkit", "")
-        mock_run.return_value = MagicMock(
-            returncode=0,
-            stdout=(
-                "Checking `bindshell'... INFECTED\n"
-                "Checking `lkm'... INFECTED\n"
-                "Checking `sniffer'... INFECTED\n"
-            ),
-            stderr="",
-        )
         result = run_rootkit_check()
         findings = [c for c in result.checks if "INFECTED" in (c.detail or "")]
         assert len(findings) == 3
 
+    @patch("src.core.system_audit._run_command")
+    def test_reports_progress_per_test(self, mock_cmd):
+        mock_cmd.return_value = (0, "/usr/sbin/chkrootkit", "")
+        output = (
+            "ROOTDIR is `/'\n"
+            "Checking `amd'... not found\n"
+            "Checking `bindshell'... INFECTED PORTS: ( 465)\n"
+            "Searching for sniffer's logs, it may take a while... nothing found\n"
+        )
+        progress = []
+        with patch("src.core.system_audit._stream_deep_scan", new=_fake_stream(stdout=output)):
+            run_rootkit_check(progress_callback=progress.append)
+
+        assert [(p.phase, p.phases, len(p.findings)) for p in progress] == [
+            ("amd", 1, 0),
+            ("bindshell", 2, 1),
+            ("sniffer's logs, it may take a while", 3, 1),
+        ]
+
+
+class TestStreamDeepScan:
+    """Tests for _stream_deep_scan against a real child process."""
+
+    def _script(self, body):
+        return [sys.executable, "-u", "-c", body]
+
+    def test_streams_lines_and_returns_exit_code(self):
+        lines = []
+        returncode, stdout, _stderr, cancelled = _stream_deep_scan(
+            self._script("print('one'); print('two'); raise SystemExit(3)"), lines.append
+        )
+        assert lines == ["one", "two"]
+        assert stdout == "one\ntwo\n"
+        assert (returncode, cancelled) == (3, False)
+
+    def test_cancel_stops_running_scan(self):
+        lines = []
+        start = time.monotonic()
+        returncode, _stdout, _stderr, cancelled = _stream_deep_scan(
+            self._script("import time\nprint('start')\ntime.sleep(30)"),
+            lines.append,
+            is_cancelled=lambda: bool(lines),
+        )
+        assert cancelled
+        assert returncode is None
+        assert time.monotonic() - start < 10
+
+    def test_timeout_raises(self):
+        with pytest.raises(subprocess.TimeoutExpired):
+            _stream_deep_scan(
+                self._script("import time; time.sleep(30)"), lambda line: None, timeout=0.3
+            )
+
+    def test_unkillable_process_is_detached(self):
+        process = MagicMock()
+        with (
+            patch("src.core.system_audit.subprocess.Popen", return_value=process),
+            patch(
+                "src.core.system_audit.stream_process_output",
+                side_effect=PermissionError("root process"),
+            ),
+        ):
+            returncode, _stdout, _stderr, cancelled = _stream_deep_scan(
+                ["pkexec", "lynis"], lambda line: None, is_cancelled=lambda: True
+            )
+        assert (returncode, cancelled) == (None, True)
+        process.stdout.close.assert_called_once()
+
 
 # =============================================================================
 # TIER1_CHECKS List
@@ -875,3 +951,196 @@ class TestCheckPortmaster:
         section = check_portmaster()
         assert section.overall_status == AuditStatus.UNKNOWN
         assert not any(c.status == AuditStatus.FAIL for c in section.checks)
+
+
+# =============================================================================
+# Audit Runner Tests
+# =============================================================================
+
+
+def _section(category: AuditCategory, status: AuditStatus = AuditStatus.PASS):
+    return AuditSectionResult(
+        category=category,
+        title=category.value,
+        icon_name="x",
+        checks=[AuditCheckResult(name="c", status=status, detail="d")],
+    )
+
+
+class TestCommandMemo:
+    """Tests for sharing host commands between checks in one audit run."""
+
+    @patch("src.core.system_audit.run_host_command")
+    def test_identical_commands_run_once(self, mock_host):
+        mock_host.return_value = MagicMock(returncode=0, stdout="/usr/bin/apt", stderr="")
+        token = _command_memo.set(_CommandMemo())
+        try:
+            first = _run_command(["which", "apt"])
+            second = _run_command(["which", "apt"])
+        finally:
+            _command_memo.reset(token)
+
+        assert first == second == (0, "/usr/bin/apt", "")
+        mock_host.assert_called_once()
+
+    @patch("src.core.system_audit.run_host_command")
+    def test_no_memo_outside_runner(self, mock_host):
+        mock_host.return_value = MagicMock(returncode=0, stdout="", stderr="")
+        _run_command(["which", "apt"])
+        _run_command(["which", "apt"])
+        assert mock_host.call_count == 2
+
+    @patch("src.core.system_audit.run_host_command")
+    def test_systemd_states_come_from_one_snapshot(self, mock_host):
+        from src.core.system_audit import _SYSTEMD_UNITS
+
+        states = ["active" if unit == "ufw" else "inactive" for unit in _SYSTEMD_UNITS]
+        mock_host.return_value = MagicMock(returncode=3, stdout="\n".join(states), stderr="")
+        token = _command_memo.set(_CommandMemo())
+        try:
+            assert _check_systemd_service("ufw") == (True, "active")
+            assert _check_systemd_service("fail2ban") == (False, "inactive")
+            assert _check_systemd_service("sshd") == (False, "inactive")
+        finally:
+            _command_memo.reset(token)
+
+        mock_host.assert_called_once()
+        assert mock_host.call_args.args[0] == ["systemctl", "is-active", *_SYSTEMD_UNITS]
+
+    @patch("src.core.system_audit.run_host_command")
+    def test_unlisted_unit_falls_back_to_single_query(self, mock_host):
+        mock_host.side_effect = [
+            FileNotFoundError(),  # snapshot unusable
+            MagicMock(returncode=0, stdout="active\n", stderr=""),
+        ]
+        token = _command_memo.set(_CommandMemo())
+        try:
+            assert _check_systemd_service("custom.service") == (True, "active")
+            assert _check_systemd_service("custom.service") == (True, "active")
+        finally:
+            _command_memo.reset(token)
+
+        assert mock_host.call_count == 2
+
+
+class TestTier1AuditRunner:
+    """Tests for the concurrent audit runner."""
+
+    def test_checks_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def make_check(category):
+            def check():
+                # Raises BrokenBarrierError unless all three run at once
+                barrier.wait()
+                return _section(category)
+
+            return check
+
+        categories = [AuditCategory.FIREWALL, AuditCategory.SSH_HARDENING, AuditCategory.PORTMASTER]
+        results = list(iter_tier1_audit([make_check(c) for c in categories], max_workers=3))
+
+        assert sorted(r.category.value for r in results) == sorted(c.value for c in categories)
+
+    def test_results_stream_in_completion_order(self):
+        release_slow = threading.Event()
+
+        def slow():
+            release_slow.wait(5)
+            return _section(AuditCategory.FIREWALL)
+
+        def fast():
+            return _section(AuditCategory.SSH_HARDENING)
+
+        results = iter_tier1_audit([slow, fast], max_workers=2)
+        assert next(results).category == AuditCategory.SSH_HARDENING
+        release_slow.set()
+        assert next(results).category == AuditCategory.FIREWALL
+
+    def test_timed_out_check_yields_placeholder(self):
+        release = threading.Event()
+
+        def hangs():
+            release.wait(5)
+            return _section(AuditCategory.FIREWALL)
+
+        with patch.dict("src.core.system_audit._CHECK_SECTIONS") as sections:
+            sections[hangs] = (AuditCategory.FIREWALL, "Firewall", "icon")
+            start = time.monotonic()
+            results = list(iter_tier1_audit([hangs], check_timeout=0.2))
+            elapsed = time.monotonic() - start
+        release.set()
+
+        assert elapsed < 2
+        assert len(results) == 1
+        assert results[0].category == AuditCategory.FIREWALL
+        assert results[0].overall_status == AuditStatus.UNKNOWN
+
+    def test_failing_check_yields_placeholder(self):
+        def boom():
+            raise RuntimeError("kaput")
+
+        with patch.dict("src.core.system_audit._CHECK_SECTIONS") as sections:
+            sections[boom] = (AuditCategory.MAC_FRAMEWORK, "Access Control", "icon")
+            results = list(iter_tier1_audit([boom]))
+
+        assert results[0].category == AuditCategory.MAC_FRAMEWORK
+        assert "kaput" in results[0].checks[0].detail
+
+    def test_failing_unknown_check_is_skipped(self):
+        def boom():
+            raise RuntimeError("kaput")
+
+        assert list(iter_tier1_audit([boom])) == []
+
+    def test_cancel_stops_run(self):
+        release = threading.Event()
+
+        def slow():
+            release.wait(5)
+            return _section(AuditCategory.FIREWALL)
+
+        results = list(iter_tier1_audit([slow], should_cancel=lambda: True))
+        release.set()
+
+        assert results == []
+
+    def test_checks_share_commands(self):
+        def check_a():
+            _run_command(["which", "apt"])
+            return _section(AuditCategory.AUTO_UPDATES)
+
+        def check_b():
+            _run_command(["which", "apt"])
+            return _section(AuditCategory.INTRUSION_DETECTION)
+
+        with patch("src.core.system_audit.run_host_command") as mock_host:
+            mock_host.return_value = MagicMock(returncode=0, stdout="/usr/bin/apt", stderr="")
+            list(iter_tier1_audit([check_a, check_b]))
+
+        mock_host.assert_called_once()
+
+    def test_run_tier1_audit_orders_sections(self):
+        def first():
+            time.sleep(0.3)
+            return _section(AuditCategory.CLAMAV_HEALTH)
+
+        def second():
+            return _section(AuditCategory.FIREWALL)
+
+        seen = []
+        with patch.dict("src.core.system_audit._CHECK_SECTIONS") as sections:
+            sections[first] = (AuditCategory.CLAMAV_HEALTH, "ClamAV Health", "icon")
+            sections[second] = (AuditCategory.FIREWALL, "Firewall", "icon")
+            report = run_tier1_audit([first, second], on_result=seen.append)
+
+        assert [s.category for s in seen] == [AuditCategory.FIREWALL, AuditCategory.CLAMAV_HEALTH]
+        assert [s.category for s in report.sections] == [
+            AuditCategory.CLAMAV_HEALTH,
+            AuditCategory.FIREWALL,
+        ]
+
+    def test_every_tier1_check_has_section_metadata(self):
+        from src.core.system_audit import _CHECK_SECTIONS
+
+        assert all(check in _CHECK_SECTIONS for check in TIER1_CHECKS)
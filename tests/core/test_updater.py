@@ -10,9 +10,11 @@ Tests cover:
 - Force update backup/restore methods
 """
 
+import io
 import os
 import signal
 import subprocess
+import sys
 import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -20,6 +22,19 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 
+def _set_process_output(process, stdout, stderr=""):
+    """Give a mocked freshclam process readable stdout/stderr pipes."""
+    process.stdout = io.StringIO(stdout)
+    process.stderr = io.StringIO(stderr)
+
+
+@pytest.fixture(autouse=True)
+def no_clamd():
+    """Keep tests from reloading a clamd that happens to run on this machine."""
+    with patch("src.core.updater.check_clamd_connection", return_value=(False, "not running")):
+        yield
+
+
 @pytest.fixture
 def updater_module():
     """Import updater module and provide mocked GLib for async tests."""
@@ -692,7 +707,7 @@ class TestFreshclamUpdaterUpdateSync:
                     with patch("src.core.updater.wrap_host_command", side_effect=lambda x: x):
                         with patch("subprocess.Popen") as mock_popen:
                             mock_process = MagicMock()
-                            mock_process.communicate.return_value = (mock_stdout, "")
+                            _set_process_output(mock_process, mock_stdout, "")
                             mock_process.returncode = 0
                             mock_process.kill = MagicMock()
                             mock_process.wait = MagicMock()
@@ -723,7 +738,7 @@ class TestFreshclamUpdaterUpdateSync:
                     with patch("src.core.updater.wrap_host_command", side_effect=lambda x: x):
                         with patch("subprocess.Popen") as mock_popen:
                             mock_process = MagicMock()
-                            mock_process.communicate.return_value = (mock_stdout, "")
+                            _set_process_output(mock_process, mock_stdout, "")
                             mock_process.returncode = 0
                             mock_process.kill = MagicMock()
                             mock_process.wait = MagicMock()
@@ -752,10 +767,7 @@ class TestFreshclamUpdaterUpdateSync:
                     with patch("src.core.updater.wrap_host_command", side_effect=lambda x: x):
                         with patch("subprocess.Popen") as mock_popen:
                             mock_process = MagicMock()
-                            mock_process.communicate.return_value = (
-                                "",
-                                "Error occurred",
-                            )
+                            _set_process_output(mock_process, "", "Error occurred")
                             mock_process.returncode = 1
                             mock_process.kill = MagicMock()
                             mock_process.wait = MagicMock()
@@ -876,14 +888,14 @@ class TestFreshclamUpdaterUpdateSync:
                             updater = FreshclamUpdater(log_manager=mock_log_manager)
 
                             def simulate_cancel(*args, **kwargs):
-                                # Simulate cancellation happening during communicate()
+                                # Simulate cancellation happening while waiting
                                 updater._update_cancelled = True
-                                return ("", "")
+                                return 0
 
-                            mock_process.communicate.side_effect = simulate_cancel
+                            _set_process_output(mock_process, "")
                             mock_process.returncode = 0
                             mock_process.kill = MagicMock()
-                            mock_process.wait = MagicMock()
+                            mock_process.wait = MagicMock(side_effect=simulate_cancel)
                             mock_process.poll = MagicMock(return_value=0)  # Process already done
                             mock_popen.return_value = mock_process
 
@@ -1022,10 +1034,10 @@ class TestFreshclamUpdaterCancel:
 
 
 class TestFreshclamUpdaterCommunicateTimeout:
-    """Tests for FreshclamUpdater communicate() timeout handling."""
+    """Tests for FreshclamUpdater wait() timeout handling."""
 
-    def test_communicate_timeout_kills_process_and_returns_error(self, updater_module):
-        """Test that communicate() timeout kills process and returns ERROR status."""
+    def test_wait_timeout_kills_process_and_returns_error(self, updater_module):
+        """Test that a wait() timeout kills the process and returns ERROR status."""
         FreshclamUpdater = updater_module["FreshclamUpdater"]
         UpdateStatus = updater_module["UpdateStatus"]
         mock_log_manager = MagicMock()
@@ -1036,19 +1048,19 @@ class TestFreshclamUpdaterCommunicateTimeout:
                     with patch("src.core.updater.wrap_host_command", side_effect=lambda x: x):
                         with patch("subprocess.Popen") as mock_popen:
                             mock_process = MagicMock()
-                            # Simulate timeout on communicate
+                            # Simulate timeout while waiting for freshclam
                             timeout_exc = subprocess.TimeoutExpired(cmd="freshclam", timeout=600)
-                            timeout_exc.stdout = "partial output"
-                            timeout_exc.stderr = ""
-                            mock_process.communicate = MagicMock(
+                            _set_process_output(mock_process, "partial output")
+                            mock_process.kill = MagicMock()
+                            mock_process.poll = MagicMock(return_value=None)
+                            mock_process.wait = MagicMock(
                                 side_effect=[
                                     timeout_exc,  # First call times out
-                                    ("", ""),  # Second call after kill
+                                    None,  # Later calls after terminate/kill
+                                    None,
+                                    None,
                                 ]
                             )
-                            mock_process.kill = MagicMock()
-                            mock_process.poll = MagicMock(return_value=None)
-                            mock_process.wait = MagicMock()
                             mock_popen.return_value = mock_process
 
                             updater = FreshclamUpdater(log_manager=mock_log_manager)
@@ -1385,7 +1397,7 @@ class TestFreshclamUpdaterUpdateAsync:
         mock_log_manager = MagicMock()
         mock_callback = MagicMock()
 
-        with patch("src.core.updater.GLib", mock_glib):
+        with patch("src.core.updater.idle_add", mock_glib.idle_add):
             with patch(
                 "src.core.updater.check_freshclam_installed",
                 return_value=(True, "1.0.0"),
@@ -1398,10 +1410,7 @@ class TestFreshclamUpdaterUpdateAsync:
                         ):
                             with patch("subprocess.Popen") as mock_popen:
                                 mock_process = MagicMock()
-                                mock_process.communicate.return_value = (
-                                    "database is up-to-date",
-                                    "",
-                                )
+                                _set_process_output(mock_process, "database is up-to-date", "")
                                 mock_process.returncode = 0
                                 mock_process.kill = MagicMock()
                                 mock_process.wait = MagicMock()
@@ -1424,6 +1433,153 @@ class TestFreshclamUpdaterUpdateAsync:
                                 mock_callback.assert_called_once()
 
 
+class TestFreshclamUpdaterStreaming:
+    """Tests for streaming freshclam output while the update runs."""
+
+    _SCRIPT = (
+        "import sys, time\n"
+        "print('daily database available for update (local version: 1, remote version: 2)')\n"
+        "print('Downloading database patch # 2...')\n"
+        "sys.stdout.write('Time: 0.1s, ETA: 0.1s [=>   ] 1.00KiB/2.00KiB\\r')\n"
+        "sys.stdout.write('Time: 0.2s, ETA: 0.0s [====>] 2.00KiB/2.00KiB\\n')\n"
+        "sys.stdout.flush()\n"
+        "print('WARNING: rate limited by the CDN', file=sys.stderr)\n"
+        "print('daily.cld updated (version: 2, sigs: 10, f-level: 90, builder: x)')\n"
+    )
+
+    def test_lines_stream_from_both_pipes(self, updater_module):
+        """Test on_line sees every line and progress redraws collapse in stdout."""
+        FreshclamUpdater = updater_module["FreshclamUpdater"]
+        updater = FreshclamUpdater(log_manager=MagicMock())
+        seen = []
+
+        stdout, stderr, exit_code, timed_out = updater._run_update_process(
+            [sys.executable, "-c", self._SCRIPT], seen.append
+        )
+
+        assert exit_code == 0
+        assert timed_out is False
+        assert "Time: 0.1s, ETA: 0.1s [=>   ] 1.00KiB/2.00KiB" in seen
+        assert "WARNING: rate limited by the CDN" in seen
+        assert "1.00KiB/2.00KiB" not in stdout
+        assert "2.00KiB/2.00KiB" in stdout
+        assert stderr == "WARNING: rate limited by the CDN"
+
+    def test_update_sync_reports_progress_and_stats(self, updater_module):
+        """Test progress_callback receives per-database events and stats land on the result."""
+        FreshclamUpdater = updater_module["FreshclamUpdater"]
+        UpdateStatus = updater_module["UpdateStatus"]
+        updater = FreshclamUpdater(log_manager=MagicMock())
+        events = []
+
+        with (
+            patch("src.core.updater.check_freshclam_installed", return_value=(True, "1.0.0")),
+            patch.object(updater, "_check_freshclam_running", return_value=(False, None)),
+            patch.object(
+                updater, "_build_command", return_value=[sys.executable, "-c", self._SCRIPT]
+            ),
+        ):
+            result = updater.update_sync(prefer_service=False, progress_callback=events.append)
+
+        assert result.status == UpdateStatus.SUCCESS
+        assert [event.database for event in events] == ["daily"] * len(events)
+        assert events[-1].stage.value == "updated"
+        assert any(event.percent == 50.0 for event in events)
+        assert len(result.database_stats) == 1
+        assert result.database_stats[0].bytes_downloaded == 2048
+        assert result.database_stats[0].patches == 1
+
+
+class TestFreshclamUpdaterClamdReload:
+    """Tests for reloading clamd after a successful update."""
+
+    def _run_update(self, updater_module, stdout, connected=True):
+        from src.core.clamd_reload import ClamdReloadResult
+
+        FreshclamUpdater = updater_module["FreshclamUpdater"]
+        mock_log_manager = MagicMock()
+        updater = FreshclamUpdater(log_manager=mock_log_manager)
+        mock_process = MagicMock()
+        _set_process_output(mock_process, stdout)
+        mock_process.returncode = 0
+        reload_result = ClamdReloadResult(reloaded=True, latency=1.25, daily_version=27303)
+
+        with (
+            patch("src.core.updater.check_freshclam_installed", return_value=(True, "1.0.0")),
+            patch("src.core.updater.get_freshclam_path", return_value="freshclam"),
+            patch("src.core.updater.get_pkexec_path", return_value=None),
+            patch("src.core.updater.wrap_host_command", side_effect=lambda x: x),
+            patch("subprocess.Popen", return_value=mock_process),
+            patch(
+                "src.core.updater.check_clamd_connection",
+                return_value=(connected, "PONG" if connected else "down"),
+            ),
+            patch("src.core.updater.reload_clamd", return_value=reload_result) as reload,
+            patch.object(updater, "_check_freshclam_running", return_value=(False, None)),
+        ):
+            result = updater.update_sync(prefer_service=False)
+        return result, reload, mock_log_manager
+
+    def test_reloads_with_new_daily_version(self, updater_module):
+        """Test clamd is reloaded and asked for the freshly installed daily version."""
+        result, reload, log_manager = self._run_update(
+            updater_module, "daily.cld updated (version: 27303, sigs: 1)"
+        )
+
+        reload.assert_called_once_with(expected_daily=27303)
+        assert result.clamd_reload.latency == 1.25
+        details = log_manager.save_log.call_args[0][0].details
+        assert "--- clamd ---\nReloaded in 1.2s (daily 27303)" in details
+
+    def test_no_reload_when_up_to_date(self, updater_module):
+        """Test nothing is reloaded when no database changed."""
+        result, reload, _log = self._run_update(updater_module, "daily.cld database is up-to-date")
+        reload.assert_not_called()
+        assert result.clamd_reload is None
+
+    def test_no_reload_without_clamd(self, updater_module):
+        """Test nothing is reloaded when clamd is not running."""
+        result, reload, _log = self._run_update(
+            updater_module, "daily.cld updated (version: 27303, sigs: 1)", connected=False
+        )
+        reload.assert_not_called()
+        assert result.clamd_reload is None
+
+    def test_installed_daily_version_when_not_logged(self, updater_module):
+        """Test the daily version on disk is expected when freshclam did not log one."""
+        daily = MagicMock(version=27304)
+        with patch("src.core.updater.get_database_inventory") as inventory:
+            inventory.return_value.get.return_value.find.return_value = daily
+            _result, reload, _log = self._run_update(
+                updater_module, "main.cvd updated (version: 62, sigs: 1)"
+            )
+        reload.assert_called_once_with(expected_daily=27304)
+
+    def test_scripts_leave_reload_to_updater(self):
+        """Test the privileged scripts do not reload clamd behind the scan hold."""
+        from src.core.updater import _build_force_update_script, _build_rollback_script
+
+        assert "clamdscan" not in _build_force_update_script()
+        assert "clamdscan" not in _build_rollback_script()
+
+    def test_rollback_reloads_clamd(self, updater_module):
+        """Test a successful rollback reloads clamd with the held scans."""
+        FreshclamUpdater = updater_module["FreshclamUpdater"]
+        updater = FreshclamUpdater(log_manager=MagicMock())
+
+        with (
+            patch.object(
+                updater,
+                "_run_update_process",
+                return_value=("Restored 2 database file(s)\n", "", 0, False),
+            ),
+            patch.object(updater, "_reload_clamd", return_value=None) as reload,
+        ):
+            updater.rollback_sync()
+
+        reload.assert_called_once_with("")
+
+
 # =============================================================================
 # FreshclamUpdater._save_update_log() Tests
 # =============================================================================
@@ -1552,6 +1708,33 @@ class TestFreshclamUpdaterSaveUpdateLog:
         # LogEntry uses 'type' not 'log_type' as the attribute
         assert log_entry.type == "update"
 
+    def test_log_details_include_database_stats(self, updater_module):
+        """Test per-database telemetry is appended to the log details."""
+        from src.core.freshclam_progress import DatabaseStage, DatabaseStats, DownloadKind
+
+        FreshclamUpdater = updater_module["FreshclamUpdater"]
+        UpdateResult = updater_module["UpdateResult"]
+        UpdateStatus = updater_module["UpdateStatus"]
+        mock_log_manager = MagicMock()
+        updater = FreshclamUpdater(log_manager=mock_log_manager)
+
+        result = UpdateResult(
+            status=UpdateStatus.SUCCESS,
+            stdout="daily.cld updated (version: 2)",
+            stderr="",
+            exit_code=0,
+            databases_updated=1,
+            error_message=None,
+            database_stats=[
+                DatabaseStats("daily", DatabaseStage.UPDATED, DownloadKind.CDIFF, 2048, 2, 0.5)
+            ],
+        )
+
+        updater._save_update_log(result, 1.0)
+
+        details = mock_log_manager.save_log.call_args[0][0].details
+        assert "--- Databases ---\ndaily: updated, 2 CDIFF patch(es), 2.0 KB in 0.5s" in details
+
 
 # =============================================================================
 # FreshclamUpdater Force Update Backup/Restore Tests
@@ -1588,9 +1771,14 @@ class TestFreshclamUpdaterBackupLocalDatabases:
                 assert len(files) == 3
                 assert updater._force_update_backup_dir is not None
                 assert updater._force_update_backup_dir.exists()
+                # Snapshots are hard links inside the database directory
+                assert updater._force_update_backup_dir.parent == db_dir
+                for backup in files:
+                    assert backup.stat().st_ino == (db_dir / backup.name).stat().st_ino
 
                 # Clean up
                 updater._cleanup_backup()
+                assert not any(p.name.startswith(".clamui-snapshot-") for p in db_dir.iterdir())
 
     def test_backup_local_databases_no_directory(self, updater_module, tmp_path):
         """Test backup fails when database directory doesn't exist."""
@@ -1648,7 +1836,7 @@ class TestFreshclamUpdaterBackupLocalDatabases:
                 return_value=db_dir,
             ):
                 updater = FreshclamUpdater(log_manager=mock_log_manager)
-                with patch("shutil.copy2", side_effect=OSError("Permission denied")):
+                with patch("src.core.updater.clone_file", side_effect=OSError("Permission denied")):
                     success, error, _ = updater._backup_local_databases()
 
                 assert success is False
@@ -1764,7 +1952,10 @@ class TestFreshclamUpdaterRestoreDatabasesFromBackup:
                 updater = FreshclamUpdater(log_manager=mock_log_manager)
                 updater._force_update_backup_dir = backup_dir
 
-                with patch("shutil.copy2", side_effect=OSError("Permission denied")):
+                with patch(
+                    "src.core.updater.replace_from_snapshot",
+                    side_effect=OSError("Permission denied"),
+                ):
                     success, error = updater._restore_databases_from_backup()
 
                 assert success is False
@@ -2394,7 +2585,7 @@ class TestUpdateSyncPreferService:
 
         # Mock successful manual update
         mock_process = MagicMock()
-        mock_process.communicate.return_value = ("daily.cvd updated (version: 26929", "")
+        _set_process_output(mock_process, "daily.cvd updated (version: 26929", "")
         mock_process.returncode = 0
         mock_process.poll.return_value = 0
 
@@ -2433,7 +2624,7 @@ class TestUpdateSyncPreferService:
 
         # Mock successful manual update
         mock_process = MagicMock()
-        mock_process.communicate.return_value = ("daily.cvd updated (version: 26929", "")
+        _set_process_output(mock_process, "daily.cvd updated (version: 26929", "")
         mock_process.returncode = 0
         mock_process.poll.return_value = 0
 
@@ -2473,7 +2664,7 @@ class TestUpdateSyncPreferService:
 
         # Mock successful manual update
         mock_process = MagicMock()
-        mock_process.communicate.return_value = ("daily.cvd updated (version: 26929", "")
+        _set_process_output(mock_process, "daily.cvd updated (version: 26929", "")
         mock_process.returncode = 0
         mock_process.poll.return_value = 0
 
@@ -3174,7 +3365,7 @@ class TestUpdateAsyncService:
         mock_callback = MagicMock()
         mock_glib = updater_module["glib"]
 
-        with patch("src.core.updater.GLib", mock_glib):
+        with patch("src.core.updater.idle_add", mock_glib.idle_add):
             with patch("src.core.updater.is_flatpak", return_value=False):
                 with patch(
                     "src.core.updater.check_freshclam_installed", return_value=(True, "0.103.8")
@@ -3217,11 +3408,11 @@ class TestUpdateAsyncService:
         mock_glib = updater_module["glib"]
 
         mock_process = MagicMock()
-        mock_process.communicate.return_value = ("daily.cvd updated (version: 26929", "")
+        _set_process_output(mock_process, "daily.cvd updated (version: 26929", "")
         mock_process.returncode = 0
         mock_process.poll.return_value = 0
 
-        with patch("src.core.updater.GLib", mock_glib):
+        with patch("src.core.updater.idle_add", mock_glib.idle_add):
             with patch("src.core.updater.is_flatpak", return_value=False):
                 with patch(
                     "src.core.updater.check_freshclam_installed", return_value=(True, "0.103.8")
@@ -3487,3 +3678,131 @@ class TestForceUpdateStaging:
 
         assert live_database.is_file()
         assert live_database.read_bytes() == original_bytes
+
+
+def _run_force_update(tmp_path: Path, database_dir: Path, replacement: str) -> None:
+    """Run a complete, successful forced update with the blocking fake freshclam."""
+    from src.core.updater import _build_force_update_script
+
+    fake_freshclam = _write_blocking_fake_freshclam(tmp_path, outcome="success")
+    environment = os.environ.copy()
+    environment.update(
+        {
+            "FAKE_STARTED_MARKER": str(tmp_path / "started"),
+            "FAKE_DATADIR_MARKER": str(tmp_path / "datadir"),
+            "FAKE_OUTCOME": "success",
+            "FAKE_REPLACEMENT": replacement,
+            "FAKE_FAILURE_CANDIDATE": "unused",
+        }
+    )
+    process = subprocess.Popen(
+        [
+            "sh",
+            "-c",
+            _build_force_update_script(str(database_dir)),
+            "clamui-force-update",
+            str(fake_freshclam),
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=environment,
+    )
+    _finish_blocked_update(process, expected_returncode=0)
+
+
+def _run_rollback(database_dir: Path) -> subprocess.CompletedProcess:
+    from src.core.updater import _build_rollback_script
+
+    return subprocess.run(
+        ["sh", "-c", _build_rollback_script(str(database_dir)), "clamui-rollback"],
+        capture_output=True,
+        text=True,
+        timeout=10,
+    )
+
+
+class TestLastKnownGoodDatabases:
+    """Exercise the last-known-good set kept by forced updates."""
+
+    @pytest.fixture
+    def database_dir(self, tmp_path: Path) -> Path:
+        database_dir = tmp_path / "clamav"
+        database_dir.mkdir()
+        (database_dir / "main.cvd").write_bytes(b"old-main")
+        (database_dir / "daily.cvd").write_bytes(b"old-daily")
+        return database_dir
+
+    def test_forced_update_keeps_replaced_generation(self, tmp_path, database_dir):
+        from src.core.db_snapshot import LAST_KNOWN_GOOD_DIRNAME
+
+        _run_force_update(tmp_path, database_dir, "new-main")
+
+        last_good = database_dir / LAST_KNOWN_GOOD_DIRNAME
+        assert (database_dir / "main.cvd").read_bytes() == b"new-main"
+        assert not (database_dir / "daily.cvd").exists()
+        assert (last_good / "main.cvd").read_bytes() == b"old-main"
+        assert (last_good / "daily.cvd").read_bytes() == b"old-daily"
+        assert sorted((last_good / ".manifest").read_text().splitlines()) == [
+            "8 main.cvd",
+            "9 daily.cvd",
+        ]
+        # Only the live names and the last-known-good set remain
+        assert sorted(p.name for p in database_dir.iterdir()) == [
+            LAST_KNOWN_GOOD_DIRNAME,
+            "main.cvd",
+        ]
+
+    def test_rollback_restores_last_known_good(self, tmp_path, database_dir):
+        from src.core.db_snapshot import LAST_KNOWN_GOOD_DIRNAME
+
+        _run_force_update(tmp_path, database_dir, "new-main")
+        (database_dir / "bytecode.cvd").write_bytes(b"added-later")
+
+        result = _run_rollback(database_dir)
+
+        assert result.returncode == 0, result.stderr
+        assert "Restored 2 database file(s)" in result.stdout
+        assert (database_dir / "main.cvd").read_bytes() == b"old-main"
+        assert (database_dir / "daily.cvd").read_bytes() == b"old-daily"
+        assert not (database_dir / "bytecode.cvd").exists()
+        # The set stays available for another rollback
+        assert (database_dir / LAST_KNOWN_GOOD_DIRNAME / "main.cvd").read_bytes() == b"old-main"
+
+    def test_rollback_without_snapshot(self, database_dir):
+        from src.core.updater import _ROLLBACK_NO_SNAPSHOT
+
+        assert _run_rollback(database_dir).returncode == _ROLLBACK_NO_SNAPSHOT
+        assert (database_dir / "main.cvd").read_bytes() == b"old-main"
+
+    def test_damaged_snapshot_is_not_restored(self, tmp_path, database_dir):
+        from src.core.db_snapshot import LAST_KNOWN_GOOD_DIRNAME
+        from src.core.updater import _ROLLBACK_DAMAGED_SNAPSHOT
+
+        _run_force_update(tmp_path, database_dir, "new-main")
+        (database_dir / LAST_KNOWN_GOOD_DIRNAME / "daily.cvd").write_bytes(b"x")
+
+        assert _run_rollback(database_dir).returncode == _ROLLBACK_DAMAGED_SNAPSHOT
+        assert (database_dir / "main.cvd").read_bytes() == b"new-main"
+
+    @pytest.mark.parametrize(
+        ("exit_code", "stdout", "status", "restored"),
+        [
+            (0, "Restored 2 database file(s)\n", "SUCCESS", 2),
+            (3, "", "ERROR", 0),
+            (4, "", "ERROR", 0),
+        ],
+    )
+    def test_rollback_sync_result(self, updater_module, exit_code, stdout, status, restored):
+        FreshclamUpdater = updater_module["FreshclamUpdater"]
+        UpdateStatus = updater_module["UpdateStatus"]
+        updater = FreshclamUpdater(log_manager=MagicMock())
+
+        with patch.object(
+            updater, "_run_update_process", return_value=(stdout, "", exit_code, False)
+        ):
+            result = updater.rollback_sync()
+
+        assert result.status == UpdateStatus[status]
+        assert result.databases_updated == restored
+        assert (result.error_message is None) == (exit_code == 0)
@@ -0,0 +1,392 @@
+# ClamUI VirusTotal Async Engine Tests
+"""Tests for the asyncio VirusTotal engine against a local stub HTTP server."""
+
+import asyncio
+import json
+import ssl
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import pytest
+
+from src.core import virustotal_async
+from src.core.virustotal import VirusTotalClient, VTScanStatus
+from src.core.virustotal_async import (
+    AsyncHTTPTransport,
+    AsyncVirusTotalEngine,
+    MultipartFileBody,
+    TransportError,
+    create_ssl_context,
+    parse_retry_after,
+)
+from src.core.virustotal_batch import VirusTotalScheduler, VTRequestKind
+
+KNOWN_SHA = "a" * 64
+UPLOADED_SHA = "b" * 64
+
+REPORT = {
+    "data": {
+        "attributes": {
+            "last_analysis_stats": {"malicious": 2, "undetected": 68},
+            "last_analysis_results": {
+                "EngineA": {"category": "malicious", "result": "Trojan.Test"},
+            },
+        }
+    }
+}
+
+
+class _StubVirusTotal(BaseHTTPRequestHandler):
+    """Minimal VirusTotal API stand-in (HTTP/1.1 keep-alive)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        state["api_keys"].append(self.headers.get("x-apikey"))
+        if self.path == f"/api/v3/files/{KNOWN_SHA}":
+            if state["rate_limit_once"]:
+                state["rate_limit_once"] = False
+                self._send_json(429, {"error": "QuotaExceeded"}, {"Retry-After": "0"})
+                return
+            if state["unavailable_once"]:
+                state["unavailable_once"] = False
+                self._send_json(503, {"error": "TransientError"}, {"Retry-After": "0"})
+                return
+            self._send_json(200, REPORT)
+        elif self.path == f"/api/v3/files/{UPLOADED_SHA}":
+            if state["analysis_done"]:
+                self._send_json(200, REPORT)
+            else:
+                self._send_json(404, {"error": "NotFoundError"})
+        elif self.path == "/api/v3/files/upload_url":
+            port = self.server.server_address[1]
+            self._send_json(200, {"data": f"http://127.0.0.1:{port}/one-time-upload"})
+        elif self.path == "/api/v3/analyses/an-1":
+            state["polls"] += 1
+            status = "completed" if state["polls"] >= 2 else "queued"
+            state["analysis_done"] = status == "completed"
+            self._send_json(200, {"data": {"attributes": {"status": status}}})
+        else:
+            self._send_json(404, {"error": "NotFoundError"})
+
+    def do_POST(self):
+        state = self.server.state
+        length = int(self.headers["Content-Length"])
+        remaining = length
+        received = 0
+        while remaining:
+            chunk = self.rfile.read(min(65536, remaining))
+            received += len(chunk)
+            remaining -= len(chunk)
+        state["uploads"].append((self.path, received, self.headers["Content-Type"]))
+        self._send_json(200, {"data": {"id": "an-1"}})
+
+
+@pytest.fixture
+def stub_server():
+    """Run the stub VirusTotal API on a random local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubVirusTotal)
+    server.daemon_threads = True
+    server.state = {
+        "api_keys": [],
+        "uploads": [],
+        "polls": 0,
+        "analysis_done": False,
+        "rate_limit_once": False,
+        "unavailable_once": False,
+    }
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def engine(stub_server):
+    """Create an engine pointed at the stub server."""
+    client = VirusTotalClient(api_key="stub-key")
+    # Uploads make several calls; don't spend a real minute per 4 requests
+    client.try_acquire_request_slot = mock.MagicMock(return_value=True)
+    port = stub_server.server_address[1]
+    eng = AsyncVirusTotalEngine(
+        client,
+        transport=AsyncHTTPTransport(retry_base_delay=0.01),
+        base_url=f"http://127.0.0.1:{port}/api/v3",
+        poll_interval=0.01,
+    )
+    yield eng
+    eng.close()
+    client.close()
+
+
+class TestRetryAfter:
+    """Tests for Retry-After parsing."""
+
+    def test_delta_seconds(self):
+        assert parse_retry_after("7") == 7.0
+
+    def test_missing_or_invalid(self):
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+    def test_clamped(self):
+        assert parse_retry_after("-5") == 0.0
+        assert parse_retry_after("100000") == virustotal_async.MAX_RETRY_AFTER
+
+    def test_http_date_in_past_is_zero(self):
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+class TestSSLContext:
+    """Tests for the TLS policy."""
+
+    def test_uses_certifi_and_verifies(self):
+        with mock.patch.object(
+            virustotal_async.ssl, "create_default_context", wraps=ssl.create_default_context
+        ) as create:
+            context = create_ssl_context()
+
+        create.assert_called_once_with(cafile=virustotal_async.certifi.where())
+        assert context.verify_mode == ssl.CERT_REQUIRED
+        assert context.check_hostname is True
+
+
+class TestMultipartFileBody:
+    """Tests for the streamed multipart body."""
+
+    def test_content_length_matches_written_bytes(self, tmp_path):
+        path = tmp_path / 'we"ird\nname.bin'
+        path.write_bytes(b"x" * 1000)
+        body = MultipartFileBody(str(path), chunk_size=64)
+        written = bytearray()
+        writer = mock.MagicMock()
+        writer.write.side_effect = written.extend
+        writer.drain = mock.AsyncMock()
+
+        asyncio.run(body.write_to(writer))
+
+        assert len(written) == body.content_length
+        assert b'filename="we_ird_name.bin"' in written
+        # Streamed in chunks rather than one buffer
+        assert writer.drain.await_count > 10
+
+    def test_file_is_read_off_the_event_loop(self, tmp_path):
+        path = tmp_path / "sample"
+        path.write_bytes(b"x" * 1000)
+        body = MultipartFileBody(str(path), chunk_size=64)
+        writer = mock.MagicMock()
+        writer.drain = mock.AsyncMock()
+        read_threads = set()
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            f = real_open(*args, **kwargs)
+            read = f.read
+            read_threads.add(threading.get_ident())
+
+            def tracked_read(size):
+                read_threads.add(threading.get_ident())
+                return read(size)
+
+            return mock.Mock(read=tracked_read, close=f.close)
+
+        with mock.patch("builtins.open", tracking_open):
+            asyncio.run(body.write_to(writer))
+
+        assert read_threads
+        assert threading.get_ident() not in read_threads
+
+    def test_shrunk_file_raises(self, tmp_path):
+        path = tmp_path / "sample"
+        path.write_bytes(b"x" * 100)
+        body = MultipartFileBody(str(path))
+        path.write_bytes(b"x" * 10)
+        writer = mock.MagicMock()
+        writer.drain = mock.AsyncMock()
+
+        with pytest.raises(OSError):
+            asyncio.run(body.write_to(writer))
+
+
+class TestAsyncHTTPTransport:
+    """Tests for AsyncHTTPTransport against the stub server."""
+
+    def test_keep_alive_reuses_connection(self, stub_server):
+        port = stub_server.server_address[1]
+        transport = AsyncHTTPTransport()
+
+        async def run():
+            for _ in range(3):
+                response = await transport.request(
+                    "GET", f"http://127.0.0.1:{port}/api/v3/files/{KNOWN_SHA}"
+                )
+                assert response.status_code == 200
+            await transport.close()
+
+        asyncio.run(run())
+        assert transport.connections_opened == 1
+
+    def test_retries_503_using_retry_after(self, stub_server):
+        stub_server.state["unavailable_once"] = True
+        port = stub_server.server_address[1]
+        transport = AsyncHTTPTransport(retry_base_delay=30)
+        acquire = mock.AsyncMock(return_value=True)
+
+        async def run():
+            with mock.patch.object(virustotal_async.asyncio, "sleep", wraps=asyncio.sleep) as sleep:
+                response = await transport.request(
+                    "GET",
+                    f"http://127.0.0.1:{port}/api/v3/files/{KNOWN_SHA}",
+                    acquire_retry=acquire,
+                )
+            await transport.close()
+            return response, sleep
+
+        response, sleep = asyncio.run(run())
+        assert response.status_code == 200
+        # Retry-After: 0 overrides the 30 s exponential base delay
+        sleep.assert_awaited_once_with(0.0)
+        # The resend took its own rate-limit slot
+        acquire.assert_awaited_once()
+
+    def test_429_is_not_resent(self, stub_server):
+        stub_server.state["rate_limit_once"] = True
+        port = stub_server.server_address[1]
+        transport = AsyncHTTPTransport(retry_base_delay=0)
+
+        async def run():
+            response = await transport.request(
+                "GET", f"http://127.0.0.1:{port}/api/v3/files/{KNOWN_SHA}"
+            )
+            await transport.close()
+            return response
+
+        assert asyncio.run(run()).status_code == 429
+        assert len(stub_server.state["api_keys"]) == 1
+
+    def test_retry_stops_without_rate_limit_slot(self, stub_server):
+        stub_server.state["unavailable_once"] = True
+        port = stub_server.server_address[1]
+        transport = AsyncHTTPTransport(retry_base_delay=0)
+
+        async def run():
+            response = await transport.request(
+                "GET",
+                f"http://127.0.0.1:{port}/api/v3/files/{KNOWN_SHA}",
+                acquire_retry=mock.AsyncMock(return_value=False),
+            )
+            await transport.close()
+            return response
+
+        assert asyncio.run(run()).status_code == 503
+
+    def test_post_is_not_resent_after_timeout(self):
+        transport = AsyncHTTPTransport(max_retries=3, retry_base_delay=0)
+
+        async def run():
+            with (
+                mock.patch.object(transport, "_send", side_effect=TimeoutError) as send,
+                pytest.raises(TransportError),
+            ):
+                await transport.request("POST", "http://127.0.0.1:1/api/v3/files", body=b"x")
+            return send
+
+        assert asyncio.run(run()).call_count == 1
+
+    def test_connection_failure_raises_transport_error(self):
+        transport = AsyncHTTPTransport(max_retries=2, retry_base_delay=0)
+
+        with pytest.raises(TransportError):
+            asyncio.run(transport.request("GET", "http://127.0.0.1:1/unreachable"))
+
+
+class TestAsyncVirusTotalEngine:
+    """Tests for engine operations against the stub server."""
+
+    def test_check_file_hash(self, engine, stub_server):
+        result = engine.run(engine.check_file_hash(KNOWN_SHA))
+
+        assert result.status == VTScanStatus.DETECTED
+        assert result.detections == 2
+        assert stub_server.state["api_keys"] == ["stub-key"]
+
+    def test_unknown_hash_not_found(self, engine):
+        result = engine.run(engine.check_file_hash("c" * 64))
+
+        assert result.status == VTScanStatus.NOT_FOUND
+
+    def test_upload_streams_and_polls(self, engine, stub_server, tmp_path):
+        path = tmp_path / "sample.bin"
+        path.write_bytes(b"payload" * 1000)
+
+        result = engine.run(engine.upload_file(str(path), UPLOADED_SHA))
+
+        assert result.status == VTScanStatus.DETECTED
+        assert result.file_path == str(path)
+        upload_path, received, content_type = stub_server.state["uploads"][0]
+        assert upload_path == "/api/v3/files"
+        assert received > 7000
+        assert content_type.startswith("multipart/form-data; boundary=")
+        assert stub_server.state["polls"] == 2
+
+    def test_large_upload_uses_upload_url(self, engine, stub_server, tmp_path):
+        path = tmp_path / "large.bin"
+        path.write_bytes(b"0" * 64)
+
+        with mock.patch.object(virustotal_async, "VT_DIRECT_UPLOAD_MAX", 16):
+            engine.run(engine.upload_file(str(path), UPLOADED_SHA))
+
+        assert stub_server.state["uploads"][0][0] == "/one-time-upload"
+
+    def test_upload_missing_file(self, engine):
+        result = engine.run(engine.upload_file("/nonexistent/file", UPLOADED_SHA))
+
+        assert result.status == VTScanStatus.ERROR
+
+    def test_cancelled_client_short_circuits(self, engine, stub_server):
+        engine._client.cancel()
+
+        result = engine.run(engine.check_file_hash(KNOWN_SHA))
+
+        assert result.status == VTScanStatus.ERROR
+        assert stub_server.state["api_keys"] == []
+
+    def test_waits_for_rate_limit_slot(self, engine):
+        engine._client.try_acquire_request_slot.side_effect = [False, True]
+
+        with mock.patch.object(engine._client, "rate_limit_delay", return_value=0.01):
+            result = engine.run(engine.check_file_hash(KNOWN_SHA))
+
+        assert result.status == VTScanStatus.DETECTED
+        assert engine._client.try_acquire_request_slot.call_count == 2
+
+    def test_scheduler_dispatches_through_engine(self, engine):
+        scheduler = VirusTotalScheduler(engine._client, engine=engine)
+        done = threading.Event()
+        results = []
+
+        def callback(result):
+            results.append(result)
+            done.set()
+
+        scheduler.submit(VTRequestKind.HASH_LOOKUP, KNOWN_SHA, callback)
+
+        assert done.wait(5)
+        assert results[0].status == VTScanStatus.DETECTED
+        scheduler.shutdown()
@@ -0,0 +1,324 @@
+# ClamUI VirusTotal Batch Tests
+"""Unit tests for the VirusTotal request scheduler and batch jobs."""
+
+import threading
+from unittest import mock
+
+import pytest
+
+from src.core.hashing import get_hashing_service
+from src.core.virustotal import (
+    VT_RATE_LIMIT_REQUESTS,
+    VirusTotalClient,
+    VTScanResult,
+    VTScanStatus,
+)
+from src.core.virustotal_batch import (
+    VirusTotalBatch,
+    VirusTotalScheduler,
+    VTRequestKind,
+    VTRequestOrigin,
+    get_virustotal_scheduler,
+)
+from src.core.virustotal_cache import VTVerdictCache
+
+
+def _result(status: VTScanStatus, sha256: str) -> VTScanResult:
+    return VTScanResult(status=status, file_path="", sha256=sha256, detections=0)
+
+
+@pytest.fixture
+def client():
+    """Create a client whose network calls are mocked."""
+    c = VirusTotalClient(api_key="test-key")
+    c.check_file_hash = mock.MagicMock(side_effect=lambda sha: _result(VTScanStatus.CLEAN, sha))
+    c.upload_file = mock.MagicMock(side_effect=lambda path, sha: _result(VTScanStatus.PENDING, sha))
+    # Dispatch on the worker thread through the mocked blocking methods
+    c._scheduler = VirusTotalScheduler(c)
+    yield c
+    c.close()
+
+
+def _gated_delay(gate: threading.Event):
+    """Rate-limit delay that keeps the scheduler waiting until gate is set."""
+    return lambda: 0.0 if gate.is_set() else 0.05
+
+
+def _run_batch(client, paths, **kwargs):
+    """Run a batch to completion and return (per-file results, final results)."""
+    streamed = []
+    done = threading.Event()
+    final = []
+
+    def on_complete(results):
+        final.extend(results)
+        done.set()
+
+    batch = VirusTotalBatch(
+        client, paths, on_result=streamed.append, on_complete=on_complete, **kwargs
+    )
+    batch.start()
+    assert done.wait(5), "batch did not complete"
+    return streamed, final
+
+
+class TestVirusTotalScheduler:
+    """Tests for VirusTotalScheduler ordering and deduplication."""
+
+    def test_hash_lookups_before_uploads_and_user_before_background(self, client):
+        """Test queued requests are dispatched in priority order."""
+        order = []
+        client.check_file_hash.side_effect = lambda sha: (
+            order.append(("lookup", sha)) or _result(VTScanStatus.CLEAN, sha)
+        )
+        client.upload_file.side_effect = lambda path, sha: (
+            order.append(("upload", sha)) or _result(VTScanStatus.PENDING, sha)
+        )
+        scheduler = VirusTotalScheduler(client)
+        all_done = threading.Event()
+        remaining = [4]
+
+        def callback(_result):
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                all_done.set()
+
+        # Hold dispatch until everything is queued
+        gate = threading.Event()
+        with mock.patch.object(client, "rate_limit_delay", side_effect=_gated_delay(gate)):
+            scheduler.submit(VTRequestKind.UPLOAD, "u", callback, file_path="/f")
+            scheduler.submit(
+                VTRequestKind.HASH_LOOKUP, "bg", callback, origin=VTRequestOrigin.BACKGROUND
+            )
+            scheduler.submit(VTRequestKind.HASH_LOOKUP, "user", callback)
+            scheduler.submit(
+                VTRequestKind.UPLOAD, "bg-up", callback, origin=VTRequestOrigin.BACKGROUND
+            )
+            gate.set()
+            assert all_done.wait(5)
+
+        assert order == [
+            ("lookup", "user"),
+            ("lookup", "bg"),
+            ("upload", "u"),
+            ("upload", "bg-up"),
+        ]
+        scheduler.shutdown()
+
+    def test_identical_requests_are_merged(self, client):
+        """Test two callers waiting on the same hash cost one request."""
+        scheduler = VirusTotalScheduler(client)
+        results = []
+        done = threading.Event()
+
+        def callback(result):
+            results.append(result)
+            if len(results) == 2:
+                done.set()
+
+        gate = threading.Event()
+        with mock.patch.object(client, "rate_limit_delay", side_effect=_gated_delay(gate)):
+            scheduler.submit(VTRequestKind.HASH_LOOKUP, "same", callback)
+            scheduler.submit(VTRequestKind.HASH_LOOKUP, "same", callback)
+            assert scheduler.pending_count == 1
+            gate.set()
+            assert done.wait(5)
+
+        assert client.check_file_hash.call_count == 1
+        scheduler.shutdown()
+
+    def test_request_in_flight_is_joined(self, client):
+        """Test a submit for a hash already being looked up costs no new request."""
+        scheduler = VirusTotalScheduler(client)
+        started, release, finished = threading.Event(), threading.Event(), threading.Event()
+        results = []
+
+        def slow_lookup(sha):
+            started.set()
+            release.wait(5)
+            return _result(VTScanStatus.CLEAN, sha)
+
+        def late_callback(result):
+            results.append(result)
+            finished.set()
+
+        client.check_file_hash.side_effect = slow_lookup
+        scheduler.submit(VTRequestKind.HASH_LOOKUP, "x", mock.MagicMock())
+        assert started.wait(5)
+        scheduler.submit(VTRequestKind.HASH_LOOKUP, "x", late_callback)
+        assert scheduler.pending_count == 0
+        release.set()
+
+        assert finished.wait(5)
+        assert results[0].status == VTScanStatus.CLEAN
+        assert client.check_file_hash.call_count == 1
+        scheduler.shutdown()
+
+    def test_cancel_drops_owner_callbacks(self, client):
+        """Test cancelling an owner removes its queued requests."""
+        scheduler = VirusTotalScheduler(client)
+        owner = object()
+        callback = mock.MagicMock()
+
+        with mock.patch.object(client, "rate_limit_delay", return_value=10.0):
+            scheduler.submit(VTRequestKind.HASH_LOOKUP, "x", callback, owner=owner)
+            scheduler.cancel(owner)
+            assert scheduler.pending_count == 0
+
+        scheduler.shutdown()
+        callback.assert_not_called()
+
+    def test_submit_after_shutdown_raises(self, client):
+        """Test a shut-down scheduler rejects new work."""
+        scheduler = VirusTotalScheduler(client)
+        scheduler.shutdown()
+
+        with pytest.raises(RuntimeError):
+            scheduler.submit(VTRequestKind.HASH_LOOKUP, "x", mock.MagicMock())
+
+    def test_cancel_drops_in_flight_callbacks(self, client):
+        """Test cancelling an owner while its request runs skips its callback."""
+        scheduler = VirusTotalScheduler(client)
+        owner = object()
+        callback = mock.MagicMock()
+        started, release, finished = threading.Event(), threading.Event(), threading.Event()
+
+        def slow_lookup(sha):
+            started.set()
+            release.wait(5)
+            return _result(VTScanStatus.CLEAN, sha)
+
+        client.check_file_hash.side_effect = slow_lookup
+        scheduler.submit(VTRequestKind.HASH_LOOKUP, "x", callback, owner=owner)
+        scheduler.submit(VTRequestKind.HASH_LOOKUP, "x", lambda _r: finished.set())
+        assert started.wait(5)
+        scheduler.cancel(owner)
+        release.set()
+
+        assert finished.wait(5)
+        callback.assert_not_called()
+        scheduler.shutdown()
+
+    def test_client_get_scheduler_is_shared(self, client):
+        """Test the client hands out a single scheduler."""
+        assert client.get_scheduler() is client.get_scheduler()
+
+    def test_clients_share_the_process_wide_scheduler(self):
+        """Test separate clients submit to one scheduler and one rate window."""
+        first = VirusTotalClient(api_key="test-key")
+        second = VirusTotalClient(api_key="test-key")
+
+        assert first.get_scheduler() is second.get_scheduler() is get_virustotal_scheduler()
+        for _ in range(VT_RATE_LIMIT_REQUESTS):
+            assert first.try_acquire_request_slot()
+        assert not second.try_acquire_request_slot()
+        assert second.rate_limit_delay() > 0
+
+    def test_scan_file_async_goes_through_scheduler(self, client, tmp_path):
+        """Test single-file scans are queued on the scheduler, not a thread each."""
+        path = tmp_path / "sample"
+        path.write_bytes(b"payload")
+        done = threading.Event()
+        results = []
+
+        def callback(result):
+            results.append(result)
+            done.set()
+
+        with mock.patch.object(client._scheduler, "submit", wraps=client._scheduler.submit) as sub:
+            with mock.patch.dict("sys.modules", {"gi": None, "gi.repository": None}):
+                client.scan_file_async(str(path), callback)
+                assert done.wait(5)
+
+        assert sub.call_args.args[0] == VTRequestKind.HASH_LOOKUP
+        assert results[0].status == VTScanStatus.CLEAN
+        assert results[0].file_path == str(path)
+
+
+class TestVirusTotalBatch:
+    """Tests for VirusTotalBatch file handling and result streaming."""
+
+    def test_streams_one_result_per_file(self, client, tmp_path):
+        """Test every file gets its own result with its own path."""
+        paths = []
+        for name in ("a", "b"):
+            path = tmp_path / name
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+
+        streamed, final = _run_batch(client, paths)
+
+        assert sorted(r.file_path for r in streamed) == sorted(paths)
+        assert [r.file_path for r in final] == paths
+        assert all(r.status == VTScanStatus.CLEAN for r in final)
+
+    def test_files_are_hashed_in_one_pooled_call(self, client, tmp_path):
+        """Test the batch hands all valid paths to the hashing pool at once."""
+        paths = []
+        for name in ("a", "b"):
+            path = tmp_path / name
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+        missing = str(tmp_path / "missing")
+        service = get_hashing_service()
+
+        with mock.patch.object(service, "hash_files", wraps=service.hash_files) as hash_files:
+            _run_batch(client, [paths[0], missing, paths[1]])
+
+        hash_files.assert_called_once_with(paths)
+
+    def test_duplicate_content_is_looked_up_once(self, client, tmp_path):
+        """Test files with identical content share one hash lookup."""
+        paths = []
+        for name in ("one", "two", "three"):
+            path = tmp_path / name
+            path.write_bytes(b"same payload")
+            paths.append(str(path))
+
+        streamed, _final = _run_batch(client, paths)
+
+        assert len(streamed) == 3
+        assert client.check_file_hash.call_count == 1
+
+    def test_invalid_file_reports_error_without_request(self, client, tmp_path):
+        """Test missing files fail locally without using API quota."""
+        streamed, _final = _run_batch(client, [str(tmp_path / "missing")])
+
+        assert streamed[0].status == VTScanStatus.ERROR
+        client.check_file_hash.assert_not_called()
+
+    def test_cached_verdict_skips_request(self, client, tmp_path):
+        """Test fresh cached verdicts are answered locally."""
+        path = tmp_path / "sample"
+        path.write_bytes(b"cached")
+        sha256 = client.calculate_sha256(str(path))
+        cache = VTVerdictCache(db_path=str(tmp_path / "cache.db"))
+        cache.put(_result(VTScanStatus.DETECTED, sha256))
+        client.set_cache(cache)
+
+        streamed, _final = _run_batch(client, [str(path)])
+
+        assert streamed[0].status == VTScanStatus.DETECTED
+        assert streamed[0].from_cache
+        client.check_file_hash.assert_not_called()
+
+    def test_not_found_uploads_only_when_requested(self, client, tmp_path):
+        """Test unknown files are uploaded only with upload_unknown."""
+        client.check_file_hash.side_effect = lambda sha: _result(VTScanStatus.NOT_FOUND, sha)
+        path = tmp_path / "unknown"
+        path.write_bytes(b"new sample")
+
+        streamed, _final = _run_batch(client, [str(path)])
+        assert streamed[0].status == VTScanStatus.NOT_FOUND
+        client.upload_file.assert_not_called()
+
+        streamed, _final = _run_batch(client, [str(path)], upload_unknown=True)
+        assert streamed[0].status == VTScanStatus.PENDING
+        client.upload_file.assert_called_once()
+
+    def test_empty_batch_completes(self, client):
+        """Test a batch with no files completes immediately."""
+        streamed, final = _run_batch(client, [])
+
+        assert streamed == []
+        assert final == []
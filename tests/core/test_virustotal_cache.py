@@ -0,0 +1,241 @@
+# ClamUI VirusTotal Verdict Cache Tests
+"""Unit tests for the VirusTotal verdict cache."""
+
+import os
+import stat
+import time
+from unittest import mock
+
+import pytest
+
+from src.core.virustotal import VirusTotalClient, VTDetection, VTScanResult, VTScanStatus
+from src.core.virustotal_cache import VTVerdictCache, create_verdict_cache
+
+SHA_A = "a" * 64
+SHA_B = "b" * 64
+SHA_C = "c" * 64
+
+
+def _detected_result(sha256: str = SHA_A) -> VTScanResult:
+    return VTScanResult(
+        status=VTScanStatus.DETECTED,
+        file_path="/tmp/sample",
+        sha256=sha256,
+        detections=2,
+        total_engines=70,
+        detection_details=[VTDetection("EngineA", "malicious", "Trojan.Test")],
+        scan_date="2024-01-01T00:00:00+00:00",
+        permalink=f"https://www.virustotal.com/gui/file/{sha256}",
+        duration=3.5,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a verdict cache in a temporary directory."""
+    c = VTVerdictCache(db_path=str(tmp_path / "vt_cache.db"))
+    yield c
+    c.close()
+
+
+class TestVTVerdictCache:
+    """Tests for VTVerdictCache storage, freshness and eviction."""
+
+    def test_get_missing_returns_none(self, cache):
+        """Test lookup of an unknown hash is a miss."""
+        assert cache.get(SHA_A) is None
+        assert cache.get_stats()["misses"] == 1
+
+    def test_put_and_get_roundtrip(self, cache):
+        """Test a stored verdict is returned with its parsed details."""
+        assert cache.put(_detected_result()) is True
+
+        result = cache.get(SHA_A)
+
+        assert result is not None
+        assert result.status == VTScanStatus.DETECTED
+        assert result.detections == 2
+        assert result.total_engines == 70
+        assert result.detection_details[0].result == "Trojan.Test"
+        assert result.permalink.endswith(SHA_A)
+        assert result.from_cache is True
+        # Per-call fields are not persisted
+        assert result.file_path == ""
+        assert result.duration == 0.0
+        assert cache.get_stats()["hits"] == 1
+
+    def test_error_results_are_not_cached(self, cache):
+        """Test transient statuses are never stored."""
+        for status in (VTScanStatus.ERROR, VTScanStatus.RATE_LIMITED, VTScanStatus.PENDING):
+            result = VTScanResult(status=status, file_path="/x", sha256=SHA_A)
+            assert cache.put(result) is False
+        assert cache.get(SHA_A) is None
+
+    def test_ttl_per_verdict_class(self, tmp_path):
+        """Test each verdict class expires after its own TTL."""
+        cache = VTVerdictCache(
+            db_path=str(tmp_path / "ttl.db"), ttl_clean=100, ttl_malicious=1000, ttl_not_found=10
+        )
+        cache.put(VTScanResult(status=VTScanStatus.CLEAN, file_path="", sha256=SHA_A))
+        cache.put(_detected_result(SHA_B))
+        cache.put(VTScanResult(status=VTScanStatus.NOT_FOUND, file_path="", sha256=SHA_C))
+
+        later = time.time() + 50
+        with mock.patch("src.core.virustotal_cache.time.time", return_value=later):
+            assert cache.get(SHA_A) is not None
+            assert cache.get(SHA_B) is not None
+            assert cache.get(SHA_C) is None
+
+        much_later = time.time() + 500
+        with mock.patch("src.core.virustotal_cache.time.time", return_value=much_later):
+            assert cache.get(SHA_A) is None
+            assert cache.get(SHA_B) is not None
+        cache.close()
+
+    def test_lru_eviction(self, tmp_path):
+        """Test the least recently used verdict is evicted when over capacity."""
+        cache = VTVerdictCache(db_path=str(tmp_path / "lru.db"), max_entries=2)
+        base = time.time()
+        with mock.patch("src.core.virustotal_cache.time.time") as mock_time:
+            mock_time.return_value = base
+            cache.put(_detected_result(SHA_A))
+            mock_time.return_value = base + 1
+            cache.put(_detected_result(SHA_B))
+            # Touch A so B becomes least recently used
+            mock_time.return_value = base + 2
+            assert cache.get(SHA_A) is not None
+            mock_time.return_value = base + 3
+            cache.put(_detected_result(SHA_C))
+
+            assert cache.get(SHA_B) is None
+            assert cache.get(SHA_A) is not None
+            assert cache.get(SHA_C) is not None
+        assert cache.get_stats()["entries"] == 2
+        cache.close()
+
+    def test_invalidate_and_clear(self, cache):
+        """Test invalidate() drops one entry and clear() drops all."""
+        cache.put(_detected_result(SHA_A))
+        cache.put(_detected_result(SHA_B))
+
+        cache.invalidate(SHA_A)
+        assert cache.get(SHA_A) is None
+        assert cache.get(SHA_B) is not None
+
+        cache.clear()
+        assert cache.get_stats()["entries"] == 0
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test verdicts survive closing and reopening the cache."""
+        db_path = str(tmp_path / "persist.db")
+        first = VTVerdictCache(db_path=db_path)
+        first.put(_detected_result())
+        first.close()
+
+        second = VTVerdictCache(db_path=db_path)
+        assert second.get(SHA_A) is not None
+        second.close()
+
+    def test_database_permissions(self, cache, tmp_path):
+        """Test the cache database is owner read/write only."""
+        cache.put(_detected_result())
+        mode = stat.S_IMODE(os.stat(tmp_path / "vt_cache.db").st_mode)
+        assert mode == 0o600
+
+
+class TestCreateVerdictCache:
+    """Tests for create_verdict_cache()."""
+
+    def test_disabled_returns_none(self):
+        """Test caching can be disabled from settings."""
+        settings = mock.MagicMock()
+        settings.get.side_effect = lambda key, default=None: (
+            False if key == "virustotal_cache_enabled" else default
+        )
+        assert create_verdict_cache(settings) is None
+
+    def test_ttls_from_settings(self):
+        """Test TTL settings in hours are converted to seconds."""
+        values = {
+            "virustotal_cache_enabled": True,
+            "virustotal_cache_ttl_clean_hours": 1,
+            "virustotal_cache_ttl_malicious_hours": 2,
+            "virustotal_cache_ttl_not_found_hours": 0.5,
+            "virustotal_cache_max_entries": 10,
+        }
+        settings = mock.MagicMock()
+        settings.get.side_effect = lambda key, default=None: values.get(key, default)
+
+        cache = create_verdict_cache(settings)
+
+        assert cache.ttl_for(VTScanStatus.CLEAN) == 3600
+        assert cache.ttl_for(VTScanStatus.DETECTED) == 7200
+        assert cache.ttl_for(VTScanStatus.NOT_FOUND) == 1800
+        assert cache.get_stats()["max_entries"] == 10
+        cache.close()
+
+
+class TestScanFileSyncWithCache:
+    """Tests for VirusTotalClient.scan_file_sync() cache integration."""
+
+    @pytest.fixture
+    def sample(self, tmp_path):
+        """Create a sample file."""
+        path = tmp_path / "sample.bin"
+        path.write_bytes(b"sample content")
+        return str(path)
+
+    @pytest.fixture
+    def client(self, cache):
+        """Create a client backed by the temporary cache."""
+        return VirusTotalClient(api_key="test_api_key", cache=cache)
+
+    def test_second_scan_served_from_cache(self, client, sample):
+        """Test re-scanning the same file does not call the API again."""
+        api_result = _detected_result()
+        with (
+            mock.patch.object(VirusTotalClient, "calculate_sha256", return_value=SHA_A),
+            mock.patch.object(
+                VirusTotalClient, "check_file_hash", return_value=api_result
+            ) as mock_check,
+        ):
+            first = client.scan_file_sync(sample)
+            second = client.scan_file_sync(sample)
+
+        assert mock_check.call_count == 1
+        assert first.from_cache is False
+        assert second.from_cache is True
+        assert second.file_path == sample
+        assert second.status == VTScanStatus.DETECTED
+
+    def test_force_refresh_bypasses_cache(self, client, cache, sample):
+        """Test force_refresh queries the API even with a fresh cached verdict."""
+        cache.put(_detected_result())
+        with (
+            mock.patch.object(VirusTotalClient, "calculate_sha256", return_value=SHA_A),
+            mock.patch.object(
+                VirusTotalClient, "check_file_hash", return_value=_detected_result()
+            ) as mock_check,
+        ):
+            result = client.scan_file_sync(sample, force_refresh=True)
+
+        mock_check.assert_called_once_with(SHA_A)
+        assert result.from_cache is False
+
+    def test_cached_not_found_skips_hash_lookup(self, client, cache, sample):
+        """Test a cached NOT_FOUND verdict goes straight to upload."""
+        cache.put(VTScanResult(status=VTScanStatus.NOT_FOUND, file_path="", sha256=SHA_A))
+        with (
+            mock.patch.object(VirusTotalClient, "calculate_sha256", return_value=SHA_A),
+            mock.patch.object(VirusTotalClient, "check_file_hash") as mock_check,
+            mock.patch.object(
+                VirusTotalClient, "upload_file", return_value=_detected_result()
+            ) as mock_upload,
+        ):
+            result = client.scan_file_sync(sample)
+
+        mock_check.assert_not_called()
+        mock_upload.assert_called_once_with(sample, SHA_A)
+        assert result.status == VTScanStatus.DETECTED
+        # The upload verdict replaces the NOT_FOUND entry
+        assert cache.get(SHA_A).status == VTScanStatus.DETECTED
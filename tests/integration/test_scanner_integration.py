@@ -560,7 +560,7 @@ Time: 0.100 sec (0 m 0 s)
 
                             # Mock GLib.idle_add in the scanner module
                             with mock.patch(
-                                "src.core.scanner.GLib.idle_add",
+                                "src.core.scanner.idle_add",
                                 side_effect=mock_glib_idle_add,
                             ):
                                 # Step 3: Execute async scan
@@ -649,7 +649,7 @@ Time: 0.100 sec (0 m 0 s)
                             mock_popen.return_value = mock_process
 
                             with mock.patch(
-                                "src.core.scanner.GLib.idle_add",
+                                "src.core.scanner.idle_add",
                                 side_effect=mock_glib_idle_add,
                             ):
                                 scanner.scan_async(str(test_file), test_callback)
@@ -710,7 +710,7 @@ Time: 0.100 sec (0 m 0 s)
                             mock_popen.return_value = mock_process
 
                             with mock.patch(
-                                "src.core.scanner.GLib.idle_add",
+                                "src.core.scanner.idle_add",
                                 side_effect=mock_glib_idle_add,
                             ):
                                 scanner.scan_async(str(test_file), test_callback)
@@ -770,7 +770,7 @@ Time: 0.100 sec (0 m 0 s)
                             mock_popen.return_value = mock_process
 
                             with mock.patch(
-                                "src.core.scanner.GLib.idle_add",
+                                "src.core.scanner.idle_add",
                                 side_effect=mock_glib_idle_add,
                             ):
                                 # Record time before calling scan_async
@@ -846,7 +846,7 @@ Time: 0.200 sec (0 m 0 s)
                             mock_popen.return_value = mock_process
 
                             with mock.patch(
-                                "src.core.scanner.GLib.idle_add",
+                                "src.core.scanner.idle_add",
                                 side_effect=mock_glib_idle_add,
                             ):
                                 # Scan directory with recursive=True
@@ -911,7 +911,7 @@ Infected files: 4
                             mock_popen.return_value = mock_process
 
                             with mock.patch(
-                                "src.core.scanner.GLib.idle_add",
+                                "src.core.scanner.idle_add",
                                 side_effect=mock_glib_idle_add,
                             ):
                                 scanner.scan_async(str(scan_dir), test_callback, recursive=True)
@@ -1003,7 +1003,7 @@ def test_scan_cancellation(tmp_path):
                         mock_popen.return_value = mock_process
 
                         with mock.patch(
-                            "src.core.scanner.GLib.idle_add",
+                            "src.core.scanner.idle_add",
                             side_effect=mock_glib_idle_add,
                         ):
                             # Execute async scan
@@ -1115,7 +1115,7 @@ def test_scan_cancellation_via_cancel_method(tmp_path):
                         mock_popen.return_value = mock_process
 
                         with mock.patch(
-                            "src.core.scanner.GLib.idle_add",
+                            "src.core.scanner.idle_add",
                             side_effect=mock_glib_idle_add,
                         ):
                             # Start async scan
@@ -0,0 +1,2 @@
+# ClamUI Performance Tests Package
+"""Startup and import-time benchmarks for ClamUI."""
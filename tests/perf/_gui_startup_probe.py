@@ -0,0 +1,77 @@
+"""Real-GTK startup timing probe (run as a subprocess by startup_bench.py).
+
+Times importing src.app, ClamUIApp.do_startup, do_activate (MainWindow plus
+the default scan view) and the first access of every other lazy view
+property, then prints one ``CLAMUI_PERF {json}`` line with milliseconds.
+
+Not collected by pytest itself.
+"""
+
+import json
+import sys
+import time
+
+_t0 = time.perf_counter()
+
+import gi
+
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Gio, GLib
+
+from src.app import ClamUIApp
+
+timings: dict = {"import_app_ms": (time.perf_counter() - _t0) * 1000, "views": {}}
+
+# scan_view is built inside do_activate and is covered by its timing
+VIEW_PROPS = [
+    "update_view",
+    "logs_view",
+    "components_view",
+    "statistics_view",
+    "quarantine_view",
+    "audit_view",
+]
+
+
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class TimedClamUIApp(ClamUIApp):
+    """ClamUIApp with do_startup/do_activate wrapped in timers."""
+
+    def do_startup(self):
+        start = time.perf_counter()
+        super().do_startup()
+        timings["do_startup_ms"] = _ms_since(start)
+
+    def do_activate(self):
+        start = time.perf_counter()
+        super().do_activate()
+        timings["do_activate_ms"] = _ms_since(start)
+        GLib.idle_add(self._on_first_idle)
+
+    def _on_first_idle(self):
+        # The window has been presented and laid out by the time the loop idles
+        timings["first_idle_ms"] = _ms_since(_t0)
+        for name in VIEW_PROPS:
+            start = time.perf_counter()
+            getattr(self, name)
+            timings["views"][name] = _ms_since(start)
+        self.quit()
+        return False
+
+
+_app = TimedClamUIApp()
+# Never hand off to a ClamUI instance already running on the session bus
+_app.set_flags(_app.get_flags() | Gio.ApplicationFlags.NON_UNIQUE)
+_app.run([])
+
+if "do_activate_ms" not in timings:
+    sys.stderr.write("probe did not run (activate never fired)\n")
+    sys.exit(2)
+
+timings["import_app_ms"] = round(timings["import_app_ms"], 2)
+timings["total_ms"] = _ms_since(_t0)
+print("CLAMUI_PERF " + json.dumps(timings))
@@ -0,0 +1,439 @@
+# ClamUI Fake ClamAV
+"""
+Stand-in clamscan, clamdscan and clamd for scan-pipeline benchmarks.
+
+FakeClamAV installs three executables into a bin directory. Each one is a
+shim that runs the matching ``*_main`` function of this module:
+
+- ``clamscan`` walks its targets like the real tool (``-r``, ``--exclude``,
+  ``--exclude-dir``) and prints ``Scanning``/``: OK``/``FOUND`` lines in
+  ``-v`` mode, FOUND lines only in ``-i`` mode, then a SCAN SUMMARY.
+- ``clamd`` serves PING, VERSION, SCAN, MULTISCAN and IDSESSION on the
+  LocalSocket named in its config, using the newline-delimited (``n``)
+  command form.
+- ``clamdscan`` answers ``--version`` and ``--ping``, and for scans sends
+  every file (``--file-list`` or a directory walk) to clamd inside one
+  IDSESSION, or one MULTISCAN for a plain ``--multiscan`` directory scan.
+
+Detection is deterministic: a file is "infected" when the CRC32 of its path
+falls under ``CLAMUI_FAKE_DETECT_RATIO`` (see is_detected), so a benchmark
+knows the expected result up front. ``CLAMUI_FAKE_FILES_PER_SEC`` paces the
+engine (0 = as fast as possible) and ``CLAMUI_FAKE_STARTUP_MS`` simulates
+database loading in clamscan.
+
+Only the standard library is imported here; the shims load this module in a
+fresh interpreter for every invocation.
+"""
+
+import os
+import re
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+
+DETECT_RATIO_ENV = "CLAMUI_FAKE_DETECT_RATIO"
+FILES_PER_SEC_ENV = "CLAMUI_FAKE_FILES_PER_SEC"
+STARTUP_MS_ENV = "CLAMUI_FAKE_STARTUP_MS"
+
+THREAT_NAME = "Win.Test.EICAR_HDB-1"
+VERSION = "ClamAV 1.4.1/27303/Sun Oct 19 08:21:00 2026"
+KNOWN_VIRUSES = 8708688
+
+_SHIM = """\
+#!{python}
+import sys
+sys.path.insert(0, {root!r})
+from tests.perf.fake_clamav import {entry}
+sys.exit({entry}(sys.argv[1:]))
+"""
+
+_REPO_ROOT = str(Path(__file__).resolve().parents[2])
+
+
+def is_detected(path: str, ratio: float) -> bool:
+    """Return True if the fake engine reports ``path`` as infected."""
+    if ratio <= 0:
+        return False
+    return zlib.crc32(path.encode("utf-8", "surrogateescape")) % 10000 < ratio * 10000
+
+
+def _env_float(name: str) -> float:
+    try:
+        return float(os.environ.get(name, "0") or 0)
+    except ValueError:
+        return 0.0
+
+
+class _Pacer:
+    """Sleeps so that files are "scanned" at CLAMUI_FAKE_FILES_PER_SEC."""
+
+    def __init__(self):
+        self._rate = _env_float(FILES_PER_SEC_ENV)
+        self._start = time.monotonic()
+        self._count = 0
+
+    def tick(self) -> None:
+        self._count += 1
+        if self._rate <= 0:
+            return
+        delay = self._start + self._count / self._rate - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _verdict(path: str, ratio: float) -> str:
+    return f"{path}: {THREAT_NAME} FOUND" if is_detected(path, ratio) else f"{path}: OK"
+
+
+def _walk(target: str, recursive: bool, exclude: list, exclude_dir: list):
+    """Yield (kind, path) for every directory and file clamscan would visit."""
+    if not os.path.isdir(target):
+        yield "file", target
+        return
+    yield "dir", target
+    for root, dirs, files in os.walk(target):
+        if not recursive:
+            dirs[:] = []
+        kept = []
+        for name in sorted(dirs):
+            full = os.path.join(root, name)
+            if any(pattern.search(full) for pattern in exclude_dir):
+                continue
+            kept.append(name)
+            yield "dir", full
+        dirs[:] = kept
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            if not any(pattern.search(full) for pattern in exclude):
+                yield "file", full
+
+
+def _summary(infected: int, elapsed: float, dirs: int | None, files: int | None) -> list[str]:
+    lines = ["", "----------- SCAN SUMMARY -----------", f"Known viruses: {KNOWN_VIRUSES}"]
+    lines.append("Engine version: 1.4.1")
+    if dirs is not None:
+        lines.append(f"Scanned directories: {dirs}")
+        lines.append(f"Scanned files: {files}")
+    lines.append(f"Infected files: {infected}")
+    lines.append(f"Time: {elapsed:.3f} sec ({int(elapsed) // 60} m {int(elapsed) % 60} s)")
+    return lines
+
+
+def clamscan_main(argv: list[str]) -> int:
+    """Entry point of the fake clamscan."""
+    if "--version" in argv or "-V" in argv:
+        print(VERSION)
+        return 0
+
+    recursive = verbose = False
+    exclude: list = []
+    exclude_dir: list = []
+    targets: list[str] = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--":
+            targets.extend(args)
+        elif arg in ("-r", "--recursive"):
+            recursive = True
+        elif arg in ("-v", "--verbose"):
+            verbose = True
+        elif arg in ("--exclude", "--exclude-dir"):
+            (exclude if arg == "--exclude" else exclude_dir).append(re.compile(next(args)))
+        elif arg.startswith(("--exclude=", "--exclude-dir=")):
+            flag, value = arg.split("=", 1)
+            (exclude if flag == "--exclude" else exclude_dir).append(re.compile(value))
+        elif not arg.startswith("-"):
+            targets.append(arg)
+
+    time.sleep(_env_float(STARTUP_MS_ENV) / 1000)
+    if verbose:
+        sys.stdout.reconfigure(line_buffering=True)
+    ratio = _env_float(DETECT_RATIO_ENV)
+    pacer = _Pacer()
+    start = time.monotonic()
+    dirs = files = infected = 0
+    write = sys.stdout.write
+    for target in targets:
+        for kind, path in _walk(target, recursive, exclude, exclude_dir):
+            if kind == "dir":
+                dirs += 1
+                continue
+            files += 1
+            pacer.tick()
+            verdict = _verdict(path, ratio)
+            found = verdict.endswith(" FOUND")
+            infected += found
+            if verbose:
+                write(f"Scanning {path}\n{verdict}\n")
+            elif found:
+                write(verdict + "\n")
+    write("\n".join(_summary(infected, time.monotonic() - start, dirs, files)) + "\n")
+    return 1 if infected else 0
+
+
+def _local_socket(config_path: str | None) -> str | None:
+    if not config_path:
+        return None
+    with open(config_path, encoding="utf-8") as f:
+        for line in f:
+            key, _sep, value = line.strip().partition(" ")
+            if key == "LocalSocket":
+                return value.strip()
+    return None
+
+
+class _ClamdHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited subset of the clamd protocol."""
+
+    def _reply(self, text: str, request_id: int | None = None) -> None:
+        prefix = f"{request_id}: " if request_id is not None else ""
+        self.wfile.write(f"{prefix}{text}\n".encode("utf-8", "surrogateescape"))
+
+    def _scan(self, path: str) -> list[str]:
+        verdicts = []
+        for kind, full in _walk(path, True, [], []):
+            if kind == "file":
+                self.server.pacer.tick()
+                verdicts.append(_verdict(full, self.server.ratio))
+        return verdicts
+
+    def _dispatch(self, command: str, request_id: int | None = None) -> None:
+        name, _sep, arg = command.partition(" ")
+        if name == "PING":
+            self._reply("PONG", request_id)
+        elif name == "VERSION":
+            self._reply(VERSION, request_id)
+        elif name in ("SCAN", "CONTSCAN", "MULTISCAN"):
+            verdicts = self._scan(arg)
+            found = [v for v in verdicts if v.endswith(" FOUND")]
+            if os.path.isdir(arg) and not found:
+                self._reply(f"{arg}: OK", request_id)
+            for verdict in found if os.path.isdir(arg) else verdicts:
+                self._reply(verdict, request_id)
+        else:
+            self._reply("UNKNOWN COMMAND", request_id)
+
+    def handle(self) -> None:
+        session = False
+        request_id = 0
+        for raw in self.rfile:
+            command = raw.decode("utf-8", "surrogateescape").rstrip("\n")
+            if not command.startswith("n"):
+                self._reply("UNKNOWN COMMAND")
+                return
+            command = command[1:]
+            if command == "IDSESSION":
+                session = True
+                continue
+            if command == "END":
+                return
+            if session:
+                request_id += 1
+                self._dispatch(command, request_id)
+                self.wfile.flush()
+            else:
+                self._dispatch(command)
+                return
+
+
+class _ClamdServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+def clamd_main(argv: list[str]) -> int:
+    """Entry point of the fake clamd: ``clamd --config-file=PATH``."""
+    config = next((arg.split("=", 1)[1] for arg in argv if arg.startswith("--config-file=")), None)
+    socket_path = _local_socket(config)
+    if not socket_path:
+        print("ERROR: LocalSocket not configured", file=sys.stderr)
+        return 1
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    server = _ClamdServer(socket_path, _ClamdHandler)
+    server.ratio = _env_float(DETECT_RATIO_ENV)
+    server.pacer = _Pacer()
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+    return 0
+
+
+def _request(sock_file, command: str) -> str:
+    sock_file.write(f"n{command}\n".encode("utf-8", "surrogateescape"))
+    sock_file.flush()
+    return sock_file.readline().decode("utf-8", "surrogateescape").rstrip("\n")
+
+
+def clamdscan_main(argv: list[str]) -> int:
+    """Entry point of the fake clamdscan."""
+    if "--version" in argv or "-V" in argv:
+        print(VERSION)
+        return 0
+
+    config = file_list = None
+    ping = multiscan = verbose = False
+    targets: list[str] = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "--":
+            targets.extend(args)
+            break
+        if arg == "--config-file":
+            config = next(args)
+        elif arg.startswith("--config-file="):
+            config = arg.split("=", 1)[1]
+        elif arg == "--file-list":
+            file_list = next(args)
+        elif arg == "--ping":
+            ping = True
+            next(args, None)
+        elif arg == "--multiscan":
+            multiscan = True
+        elif arg in ("-v", "--verbose"):
+            verbose = True
+        elif not arg.startswith("-"):
+            targets.append(arg)
+
+    socket_path = _local_socket(config) or "/run/clamav/clamd.ctl"
+    try:
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    except OSError as e:
+        print(
+            f"ERROR: Could not connect to clamd on LocalSocket {socket_path}: {e}", file=sys.stderr
+        )
+        return 2
+
+    if verbose:
+        sys.stdout.reconfigure(line_buffering=True)
+    start = time.monotonic()
+    infected = 0
+    with conn, conn.makefile("rwb") as sock_file:
+        if ping:
+            print(_request(sock_file, "PING"))
+            return 0
+
+        if file_list:
+            with open(file_list, encoding="utf-8", errors="surrogateescape") as f:
+                paths = [line.rstrip("\n") for line in f if line.strip()]
+        else:
+            paths = targets
+
+        if multiscan and not file_list:
+            replies = (reply for path in paths for reply in _multiscan(socket_path, path))
+        else:
+            # Send from a thread so neither side blocks on a full socket buffer
+            sender = threading.Thread(target=_send_session, args=(sock_file, paths), daemon=True)
+            sender.start()
+            replies = (
+                raw.decode("utf-8", "surrogateescape").rstrip("\n").split(": ", 1)[1]
+                for raw in sock_file
+            )
+
+        for reply in replies:
+            found = reply.endswith(" FOUND")
+            infected += found
+            if verbose or found:
+                sys.stdout.write(reply + "\n")
+    sys.stdout.write("\n".join(_summary(infected, time.monotonic() - start, None, None)) + "\n")
+    return 1 if infected else 0
+
+
+def _send_session(sock_file, paths: list[str]) -> None:
+    sock_file.write(b"nIDSESSION\n")
+    for path in paths:
+        sock_file.write(f"nSCAN {path}\n".encode("utf-8", "surrogateescape"))
+    sock_file.write(b"nEND\n")
+    sock_file.flush()
+
+
+def _multiscan(socket_path: str, path: str) -> list[str]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.connect(socket_path)
+        with conn.makefile("rwb") as sock_file:
+            sock_file.write(f"nMULTISCAN {path}\n".encode("utf-8", "surrogateescape"))
+            sock_file.flush()
+            return [raw.decode("utf-8", "surrogateescape").rstrip("\n") for raw in sock_file]
+
+
+class FakeClamAV:
+    """
+    Installs the fake binaries and runs the fake clamd.
+
+    Use as a context manager; ``env`` holds the variables the scan process
+    needs (PATH first of all), to be applied to ``os.environ`` by the caller.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        detect_ratio: float = 0.0,
+        files_per_sec: float = 0,
+        startup_ms: float = 0,
+    ):
+        self.root = Path(root)
+        self.bin_dir = self.root / "bin"
+        self.config_path = str(self.root / "clamd.conf")
+        self.socket_path = str(self.root / "clamd.sock")
+        self.env = {
+            "PATH": f"{self.bin_dir}{os.pathsep}{os.environ.get('PATH', '')}",
+            DETECT_RATIO_ENV: str(detect_ratio),
+            FILES_PER_SEC_ENV: str(files_per_sec),
+            STARTUP_MS_ENV: str(startup_ms),
+        }
+        self._clamd: subprocess.Popen | None = None
+
+    def install(self) -> None:
+        """Write the executables and clamd.conf."""
+        self.bin_dir.mkdir(parents=True, exist_ok=True)
+        for name, entry in (
+            ("clamscan", "clamscan_main"),
+            ("clamdscan", "clamdscan_main"),
+            ("clamd", "clamd_main"),
+        ):
+            path = self.bin_dir / name
+            path.write_text(_SHIM.format(python=sys.executable, root=_REPO_ROOT, entry=entry))
+            path.chmod(0o755)
+        Path(self.config_path).write_text(
+            f"LocalSocket {self.socket_path}\nMaxFileSize 100M\nMaxScanSize 400M\n"
+        )
+
+    def start_clamd(self, timeout: float = 10) -> None:
+        """Start the fake clamd and wait until it answers PING."""
+        env = {**os.environ, **self.env}
+        self._clamd = subprocess.Popen(
+            [str(self.bin_dir / "clamd"), f"--config-file={self.config_path}"], env=env
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                    conn.connect(self.socket_path)
+                    with conn.makefile("rwb") as sock_file:
+                        if _request(sock_file, "PING") == "PONG":
+                            return
+            except OSError:
+                time.sleep(0.05)
+        self.stop()
+        raise RuntimeError("fake clamd did not start")
+
+    def stop(self) -> None:
+        """Stop the fake clamd."""
+        if self._clamd is not None:
+            self._clamd.terminate()
+            self._clamd.wait(timeout=10)
+            self._clamd = None
+
+    def __enter__(self) -> "FakeClamAV":
+        self.install()
+        self.start_clamd()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
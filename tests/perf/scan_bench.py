@@ -0,0 +1,367 @@
+# ClamUI Scan Throughput Benchmark
+"""
+Scan-pipeline throughput benchmark.
+
+Runs Scanner.scan_sync (clamscan backend) and DaemonScanner.scan_sync
+against synthetic trees (synthetic_tree.py) with fake ClamAV binaries and a
+fake clamd (fake_clamav.py), so the numbers measure ClamUI's own walking,
+output streaming and parsing rather than the signature engine.
+
+Each case runs in a fresh interpreter so peak RSS belongs to that case
+alone. A case reports:
+
+- ``wall_ms``: scan_sync end to end, availability probes excluded
+- ``walk_ms``: the pre-scan tree walk (Scanner._count_files or
+  DaemonScanner._count_scan_targets) on its own
+- ``parse_ms``: _parse_results on the scan's captured output
+- ``callbacks``: how often the progress callback ran, for ``-progress``
+  cases
+- ``peak_rss_mb``: peak RSS of the ClamUI process (the fakes excluded)
+- ``files_per_sec`` and ``ok`` (file and detection counts match the tree)
+
+The summary adds ``progress_overhead_ms`` per backend and tree: wall time
+with a progress callback minus wall time without one. This is the cost of
+progress dispatch; the benchmark's own callback does no work.
+
+Usage:
+    python -m tests.perf.scan_bench --files 1000,10000 --output scan.json
+    python -m tests.perf.scan_bench --files 1000000 --shapes wide \\
+        --backends daemon --tree-dir /var/tmp/clamui-trees --compare scan.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from tests.perf.fake_clamav import FakeClamAV, is_detected
+from tests.perf.startup_bench import REPO_ROOT, compare_metrics, git_commit, isolated_env
+from tests.perf.synthetic_tree import (
+    TreeSpec,
+    build_tree,
+    exclusion_settings,
+    scan_targets,
+)
+
+REPORT_SCHEMA = 1
+
+# Prefix of a case's result line on stdout
+CASE_MARKER = "CLAMUI_SCAN_BENCH "
+
+SHAPES = ("wide", "deep", "wide-excl", "deep-excl")
+BACKENDS = ("clamscan", "daemon")
+
+# Metrics compared between reports (lower is better for all of them)
+COMPARED_METRICS = ("wall_ms", "walk_ms", "parse_ms", "peak_rss_mb")
+
+
+@dataclass(frozen=True)
+class ScanCase:
+    """One benchmark run: a tree, a backend and progress on or off."""
+
+    tree: TreeSpec
+    backend: str
+    progress: bool
+    detect_ratio: float = 0.001
+    files_per_sec: float = 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.backend}-{self.tree.name}" + ("-progress" if self.progress else "")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScanCase":
+        return cls(**{**data, "tree": TreeSpec(**data["tree"])})
+
+
+def parse_shape(shape: str, files: int) -> TreeSpec:
+    """Turn ``wide``/``deep``/``wide-excl``/``deep-excl`` into a TreeSpec."""
+    base, _sep, suffix = shape.partition("-")
+    if base not in ("wide", "deep") or suffix not in ("", "excl"):
+        raise ValueError(f"unknown shape: {shape}")
+    return TreeSpec(files=files, shape=base, exclusion_heavy=suffix == "excl")
+
+
+def _ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def run_case(case: ScanCase, tree_root: str, expected_files: int, expected_infected: int) -> dict:
+    """
+    Run one case in this process and return its metrics.
+
+    Changes os.environ (PATH, fake-engine settings); run_benchmarks() runs
+    every case in a child process for that reason.
+    """
+    from src.core.clamav_detection import invalidate_clamav_probes
+    from src.core.daemon_scanner import DaemonScanner
+    from src.core.log_manager import LogManager
+    from src.core.scanner import Scanner
+    from src.core.settings_manager import SettingsManager
+
+    # Unix socket paths are limited to ~108 bytes; keep the fake's root short
+    with tempfile.TemporaryDirectory(prefix="cu") as tmp:
+        root = Path(tmp)
+        fake = FakeClamAV(
+            root / "fake", detect_ratio=case.detect_ratio, files_per_sec=case.files_per_sec
+        )
+        with fake:
+            os.environ.update(fake.env)
+            invalidate_clamav_probes()
+
+            settings = SettingsManager(config_dir=root / "config")
+            settings.set("exclusion_patterns", exclusion_settings(case.tree))
+            settings.set("clamd_conf_path", fake.config_path)
+            log_manager = LogManager(log_dir=str(root / "logs"))
+
+            if case.backend == "daemon":
+                scanner = DaemonScanner(log_manager, settings, config_path=fake.config_path)
+            else:
+                scanner = Scanner(log_manager, settings)
+            available, error = scanner.check_available()
+            if not available:
+                raise RuntimeError(f"fake {case.backend} unavailable: {error}")
+
+            start = time.perf_counter()
+            if case.backend == "daemon":
+                scanner._count_scan_targets(tree_root, collect_paths=True)
+            else:
+                scanner._count_files(tree_root)
+            walk_ms = _ms(start)
+
+            callbacks = 0
+
+            def on_progress(_progress) -> None:
+                nonlocal callbacks
+                callbacks += 1
+
+            kwargs = {"progress_callback": on_progress} if case.progress else {}
+            if case.backend == "clamscan":
+                kwargs["backend_override"] = "clamscan"
+            start = time.perf_counter()
+            result = scanner.scan_sync(tree_root, **kwargs)
+            wall_ms = _ms(start)
+
+            start = time.perf_counter()
+            if case.backend == "daemon":
+                scanner._parse_results(
+                    tree_root,
+                    result.stdout,
+                    result.stderr,
+                    result.exit_code,
+                    result.scanned_files,
+                    result.scanned_dirs,
+                )
+            else:
+                scanner._parse_results(tree_root, result.stdout, result.stderr, result.exit_code)
+            parse_ms = _ms(start)
+
+    peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "status": result.status.value,
+        "error": result.error_message,
+        "scanned_files": result.scanned_files,
+        "infected_count": result.infected_count,
+        "ok": result.scanned_files == expected_files and result.infected_count == expected_infected,
+        "wall_ms": wall_ms,
+        "walk_ms": walk_ms,
+        "parse_ms": parse_ms,
+        "callbacks": callbacks,
+        "peak_rss_mb": round(peak_rss_kb / 1024, 1),
+        "files_per_sec": round(expected_files / (wall_ms / 1000)) if wall_ms else None,
+    }
+
+
+def prepare_tree(spec: TreeSpec, tree_dir: Path) -> Path:
+    """
+    Build spec under tree_dir, reusing an earlier build of the same spec.
+
+    Large trees take minutes to create, so ``<name>.json`` next to the tree
+    records a finished build.
+    """
+    root = tree_dir / spec.name
+    marker = tree_dir / f"{spec.name}.json"
+    if marker.exists() and json.loads(marker.read_text()) == asdict(spec):
+        return root
+    if root.exists():
+        shutil.rmtree(root)
+    build_tree(root, spec)
+    marker.write_text(json.dumps(asdict(spec)))
+    return root
+
+
+def _run_case_subprocess(case: ScanCase, tree_root: Path, timeout: float) -> dict:
+    files = list(scan_targets(tree_root))
+    payload = {
+        "case": asdict(case),
+        "tree_root": str(tree_root),
+        "expected_files": len(files),
+        "expected_infected": sum(is_detected(path, case.detect_ratio) for path in files),
+    }
+    with tempfile.TemporaryDirectory(prefix="clamui-perf-") as tmp:
+        result = subprocess.run(
+            [sys.executable, "-m", "tests.perf.scan_bench", "--run-case", json.dumps(payload)],
+            cwd=REPO_ROOT,
+            env=isolated_env(Path(tmp)),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith(CASE_MARKER):
+            return json.loads(line[len(CASE_MARKER) :])
+    tail = (result.stderr or result.stdout).strip().splitlines()[-5:]
+    return {"ok": False, "error": f"case exited {result.returncode}", "stderr_tail": tail}
+
+
+def build_cases(
+    sizes: list[int],
+    shapes: list[str],
+    backends: list[str],
+    detect_ratio: float = 0.001,
+    files_per_sec: float = 0,
+) -> list[ScanCase]:
+    """Return the case matrix: every size, shape and backend, with and without progress."""
+    return [
+        ScanCase(
+            tree=parse_shape(shape, files),
+            backend=backend,
+            progress=progress,
+            detect_ratio=detect_ratio,
+            files_per_sec=files_per_sec,
+        )
+        for files in sizes
+        for shape in shapes
+        for backend in backends
+        for progress in (False, True)
+    ]
+
+
+def run_benchmarks(
+    cases: list[ScanCase], tree_dir: Path | None = None, timeout: float = 3600
+) -> dict:
+    """
+    Run every case and return the JSON-serializable report.
+
+    Args:
+        cases: Cases to run
+        tree_dir: Where to keep synthetic trees between runs; None uses a
+                  temporary directory removed afterwards
+        timeout: Per-case timeout in seconds
+    """
+    with tempfile.TemporaryDirectory(prefix="clamui-trees-") as tmp:
+        trees = Path(tree_dir) if tree_dir else Path(tmp)
+        trees.mkdir(parents=True, exist_ok=True)
+        results = {}
+        for case in cases:
+            tree_root = prepare_tree(case.tree, trees)
+            results[case.name] = _run_case_subprocess(case, tree_root, timeout)
+
+    overhead = {}
+    for name, entry in results.items():
+        if name.endswith("-progress"):
+            plain = results.get(name.removesuffix("-progress"), {})
+            if "wall_ms" in entry and "wall_ms" in plain:
+                overhead[name.removesuffix("-progress")] = round(
+                    entry["wall_ms"] - plain["wall_ms"], 2
+                )
+
+    return {
+        "schema": REPORT_SCHEMA,
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "cases": results,
+        "progress_overhead_ms": overhead,
+    }
+
+
+def flatten_report(report: dict) -> dict[str, float]:
+    """Flatten a report into ``{"<case>/<metric>": value}`` for COMPARED_METRICS."""
+    return {
+        f"{name}/{metric}": entry[metric]
+        for name, entry in report.get("cases", {}).items()
+        for metric in COMPARED_METRICS
+        if isinstance(entry.get(metric), int | float)
+    }
+
+
+def _print_table(report: dict) -> None:
+    header = f"{'case':<40} {'files/s':>9} {'wall':>9} {'walk':>8} {'parse':>8} {'rss MB':>7}"
+    print(header, file=sys.stderr)
+    for name, entry in report["cases"].items():
+        if "wall_ms" not in entry:
+            print(f"{name:<40} FAILED {entry.get('error')}", file=sys.stderr)
+            continue
+        flag = "" if entry["ok"] else "  MISMATCH"
+        print(
+            f"{name:<40} {entry['files_per_sec'] or 0:>9} {entry['wall_ms']:>9.1f} "
+            f"{entry['walk_ms']:>8.1f} {entry['parse_ms']:>8.1f} {entry['peak_rss_mb']:>7.1f}"
+            f"{flag}",
+            file=sys.stderr,
+        )
+
+
+def _csv(value: str) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="ClamUI scan throughput benchmark")
+    parser.add_argument("--files", default="1000,10000", help="comma-separated tree sizes")
+    parser.add_argument("--shapes", default=",".join(SHAPES), help="comma-separated shapes")
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="clamscan,daemon")
+    parser.add_argument("--detect-ratio", type=float, default=0.001)
+    parser.add_argument("--files-per-sec", type=float, default=0, help="fake engine pace")
+    parser.add_argument("--tree-dir", type=Path, help="keep synthetic trees here for reuse")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="baseline report to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        payload = json.loads(args.run_case)
+        metrics = run_case(
+            ScanCase.from_dict(payload["case"]),
+            payload["tree_root"],
+            payload["expected_files"],
+            payload["expected_infected"],
+        )
+        print(CASE_MARKER + json.dumps(metrics))
+        return 0
+
+    cases = build_cases(
+        [int(size) for size in _csv(args.files)],
+        _csv(args.shapes),
+        _csv(args.backends),
+        args.detect_ratio,
+        args.files_per_sec,
+    )
+    report = run_benchmarks(cases, tree_dir=args.tree_dir)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    _print_table(report)
+
+    status = 0 if all(entry.get("ok") for entry in report["cases"].values()) else 1
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare_metrics(
+            flatten_report(baseline), flatten_report(report), args.tolerance
+        ):
+            print(f"regression {line}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+# ClamUI Startup Benchmark
+"""
+Startup-time and import-time benchmark harness.
+
+Every measurement runs in a fresh interpreter with isolated XDG directories,
+so results do not depend on the developer's settings or on what the test
+process has already imported:
+
+- Commands (``clamui --help``, ``clamui status``,
+  ``clamui-scheduled-scan --dry-run``) are timed wall-clock. The cold run
+  starts with an empty bytecode cache (``PYTHONPYCACHEPREFIX`` pointing at a
+  new directory), i.e. the first launch after an install or upgrade; warm
+  runs reuse that cache and report the median.
+- One extra warm run per command uses ``python -X importtime`` to record the
+  cumulative import cost of every ``src.*`` module and every top-level import.
+- The GUI probe (``_gui_startup_probe.py``) times ``ClamUIApp.do_startup``,
+  ``do_activate`` (which builds MainWindow and the scan view) and the first
+  access of each lazy view property. It needs a display and real GTK.
+
+Reports are JSON. ``flatten_report`` turns one into ``{metric: milliseconds}``
+pairs, which is the form budgets.json uses and what ``compare_reports`` diffs.
+
+Usage:
+    python -m tests.perf.startup_bench --output perf.json
+    python -m tests.perf.startup_bench --check --compare baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+BUDGETS_PATH = Path(__file__).with_name("budgets.json")
+GUI_PROBE = Path(__file__).with_name("_gui_startup_probe.py")
+
+REPORT_SCHEMA = 1
+
+# Prefix of the probe's result line on stdout
+PROBE_MARKER = "CLAMUI_PERF "
+
+# Multiplies every budget; lets slow CI runners share budgets.json
+BUDGET_SCALE_ENV = "CLAMUI_PERF_BUDGET_SCALE"
+
+# Regressions smaller than this are measurement noise, whatever the ratio
+NOISE_FLOOR_MS = 5.0
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass(frozen=True)
+class BenchCommand:
+    """A command line whose startup is benchmarked."""
+
+    name: str
+    args: tuple[str, ...]
+    requires_gi: bool = False
+
+    def argv(self, *python_options: str) -> list[str]:
+        """Return the argv for running this command under sys.executable."""
+        return [sys.executable, *python_options, "-m", *self.args]
+
+
+COMMANDS = (
+    # --help goes through GApplication's option parsing, so GTK is imported
+    BenchCommand("clamui --help", ("src.main", "--help"), requires_gi=True),
+    BenchCommand("clamui status", ("src.main", "status")),
+    BenchCommand("clamui-scheduled-scan --dry-run", ("src.cli.scheduled_scan", "--dry-run")),
+)
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    """One line of ``python -X importtime`` output."""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def parse_importtime(stderr: str) -> dict[str, ImportTiming]:
+    """
+    Parse the stderr of a ``python -X importtime`` run.
+
+    Args:
+        stderr: Captured stderr; lines that are not importtime output are ignored
+
+    Returns:
+        Timings keyed by module name
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings[module] = ImportTiming(
+            module=module,
+            self_ms=int(self_us) / 1000,
+            cumulative_ms=int(cumulative_us) / 1000,
+            depth=len(indent) // 2,
+        )
+    return timings
+
+
+def _interesting_imports(timings: dict[str, ImportTiming]) -> dict[str, float]:
+    """Keep ClamUI's own modules and the top-level imports that pull in the rest."""
+    return {
+        module: round(timing.cumulative_ms, 2)
+        for module, timing in timings.items()
+        if module == "src" or module.startswith("src.") or timing.depth == 0
+    }
+
+
+def isolated_env(root: Path, pycache: Path | None = None) -> dict[str, str]:
+    """
+    Build the environment for a benchmark subprocess.
+
+    Args:
+        root: Directory holding the throwaway XDG config/data/cache/state dirs
+        pycache: Bytecode cache directory; a new one makes the run cold
+
+    Returns:
+        Environment mapping
+    """
+    env = {
+        **os.environ,
+        "XDG_CONFIG_HOME": str(root / "config"),
+        "XDG_DATA_HOME": str(root / "data"),
+        "XDG_CACHE_HOME": str(root / "cache"),
+        "XDG_STATE_HOME": str(root / "state"),
+        "LANGUAGE": "C",
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])),
+    }
+    if pycache is not None:
+        env["PYTHONPYCACHEPREFIX"] = str(pycache)
+    return env
+
+
+def _run(argv: list[str], env: dict[str, str], timeout: float) -> tuple[float, int, str]:
+    """Run argv to completion and return (elapsed ms, returncode, stderr)."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        argv,
+        cwd=REPO_ROOT,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=timeout,
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    return elapsed, result.returncode, result.stderr
+
+
+def gi_available() -> bool:
+    """Return True if a fresh interpreter can import GTK 4 and libadwaita."""
+    code = (
+        "import gi\n"
+        "gi.require_version('Gtk', '4.0')\n"
+        "gi.require_version('Adw', '1')\n"
+        "from gi.repository import Adw, Gtk\n"
+    )
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, timeout=60, check=False
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def display_available() -> bool:
+    """Return True if a display is available for the GUI probe."""
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def measure_command(command: BenchCommand, runs: int = 5, timeout: float = 120) -> dict:
+    """
+    Measure cold and warm start of one command.
+
+    Args:
+        command: Command to run
+        runs: Number of warm runs (the median is reported)
+        timeout: Per-run timeout in seconds
+
+    Returns:
+        Report entry for the command
+    """
+    with tempfile.TemporaryDirectory(prefix="clamui-perf-") as tmp:
+        root = Path(tmp)
+        env = isolated_env(root, pycache=root / "pycache")
+
+        cold_ms, returncode, stderr = _run(command.argv(), env, timeout)
+        warm = [_run(command.argv(), env, timeout)[0] for _ in range(runs)]
+        _elapsed, _rc, importtime_stderr = _run(command.argv("-X", "importtime"), env, timeout)
+
+    return {
+        "argv": list(command.args),
+        "returncode": returncode,
+        "crashed": returncode < 0 or "Traceback (most recent call last)" in stderr,
+        "stderr_tail": stderr.strip().splitlines()[-3:] if returncode else [],
+        "cold_ms": round(cold_ms, 2),
+        "warm_ms": round(statistics.median(warm), 2),
+        "warm_min_ms": round(min(warm), 2),
+        "warm_max_ms": round(max(warm), 2),
+        "imports": _interesting_imports(parse_importtime(importtime_stderr)),
+    }
+
+
+def measure_gui(timeout: float = 180) -> dict:
+    """
+    Run the GUI startup probe and return its timings.
+
+    Returns:
+        Report entry with do_startup/do_activate/view timings, or an
+        ``error`` key if the probe did not produce a result
+    """
+    with tempfile.TemporaryDirectory(prefix="clamui-perf-") as tmp:
+        result = subprocess.run(
+            [sys.executable, str(GUI_PROBE)],
+            cwd=REPO_ROOT,
+            env=isolated_env(Path(tmp)),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith(PROBE_MARKER):
+            return json.loads(line[len(PROBE_MARKER) :])
+    tail = (result.stderr or result.stdout).strip().splitlines()[-5:]
+    return {"error": f"probe exited {result.returncode}", "stderr_tail": tail}
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() or None
+
+
+def run_benchmarks(runs: int = 5, gui: bool | None = None) -> dict:
+    """
+    Run every startup benchmark.
+
+    Args:
+        runs: Warm runs per command
+        gui: Run the GUI probe; None runs it when GTK and a display are available
+
+    Returns:
+        The JSON-serializable report
+    """
+    has_gi = gi_available()
+    commands = {}
+    skipped = {}
+    for command in COMMANDS:
+        if command.requires_gi and not has_gi:
+            skipped[command.name] = "GTK 4 / libadwaita bindings not available"
+            continue
+        commands[command.name] = measure_command(command, runs=runs)
+
+    if gui is None:
+        gui = has_gi and display_available()
+    if gui:
+        gui_report = measure_gui()
+    else:
+        gui_report = None
+        skipped["gui"] = "no display or GTK bindings" if not has_gi else "disabled"
+
+    return {
+        "schema": REPORT_SCHEMA,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+        "commands": commands,
+        "gui": gui_report,
+        "skipped": skipped,
+    }
+
+
+def flatten_report(report: dict) -> dict[str, float]:
+    """
+    Flatten a report into ``{metric: milliseconds}``.
+
+    Metric names are ``commands/<command>/cold_ms``,
+    ``commands/<command>/warm_ms``, ``imports/<command>/<module>``,
+    ``gui/<phase>`` and ``gui/views/<property>``.
+    """
+    metrics = {}
+    for name, entry in report.get("commands", {}).items():
+        metrics[f"commands/{name}/cold_ms"] = entry["cold_ms"]
+        metrics[f"commands/{name}/warm_ms"] = entry["warm_ms"]
+        for module, cumulative_ms in entry.get("imports", {}).items():
+            metrics[f"imports/{name}/{module}"] = cumulative_ms
+    gui = report.get("gui") or {}
+    for phase, value in gui.items():
+        if phase == "views":
+            for view, view_ms in value.items():
+                metrics[f"gui/views/{view}"] = view_ms
+        elif isinstance(value, int | float):
+            metrics[f"gui/{phase}"] = value
+    return metrics
+
+
+def load_budgets(path: Path = BUDGETS_PATH) -> dict[str, float]:
+    """Load budgets.json, scaled by $CLAMUI_PERF_BUDGET_SCALE."""
+    with open(path, encoding="utf-8") as f:
+        budgets = json.load(f)["budgets"]
+    scale = float(os.environ.get(BUDGET_SCALE_ENV, "1") or 1)
+    return {metric: limit * scale for metric, limit in budgets.items()}
+
+
+def check_budgets(report: dict, budgets: dict[str, float]) -> list[str]:
+    """
+    Compare a report against budgets.
+
+    Metrics without a budget are not checked. A budgeted metric missing from
+    the report only fails when it was not deliberately skipped (e.g. the GUI
+    probe without a display), so a renamed module cannot silently drop out.
+
+    Returns:
+        Human-readable violations; empty if every budget holds
+    """
+    metrics = flatten_report(report)
+    skipped = report.get("skipped", {})
+    violations = []
+    if report.get("gui") and "error" in report["gui"]:
+        violations.append(f"gui probe failed: {report['gui']['error']}")
+    for name, entry in report.get("commands", {}).items():
+        if entry["crashed"]:
+            violations.append(f"{name}: crashed ({' '.join(entry['stderr_tail'])})")
+    for metric, limit in sorted(budgets.items()):
+        if metric not in metrics:
+            if _metric_scope(metric) not in skipped:
+                violations.append(f"{metric}: not measured")
+        elif metrics[metric] > limit:
+            violations.append(f"{metric}: {metrics[metric]:.1f} ms > budget {limit:.1f} ms")
+    return violations
+
+
+def _metric_scope(metric: str) -> str:
+    """Return the command name (or "gui") a flattened metric belongs to."""
+    kind, _sep, rest = metric.partition("/")
+    return "gui" if kind == "gui" else rest.split("/", 1)[0]
+
+
+def compare_metrics(
+    old: dict[str, float], new: dict[str, float], tolerance: float = 0.2
+) -> list[str]:
+    """
+    List metrics that grew between two flat ``{metric: value}`` mappings.
+
+    Growth counts only above the relative tolerance and above NOISE_FLOOR_MS
+    in absolute terms; metrics present in just one mapping are ignored.
+
+    Returns:
+        Human-readable regressions, worst first
+    """
+    regressions = []
+    for metric in old.keys() & new.keys():
+        delta = new[metric] - old[metric]
+        if delta > NOISE_FLOOR_MS and new[metric] > old[metric] * (1 + tolerance):
+            regressions.append((delta, metric))
+    return [
+        f"{metric}: {old[metric]:.1f} -> {new[metric]:.1f} (+{delta:.1f})"
+        for delta, metric in sorted(regressions, reverse=True)
+    ]
+
+
+def compare_reports(baseline: dict, current: dict, tolerance: float = 0.2) -> list[str]:
+    """
+    List metrics that regressed between two reports.
+
+    Args:
+        baseline: Earlier report
+        current: Report to check
+        tolerance: Allowed relative growth (0.2 = 20 %)
+
+    Returns:
+        Human-readable regressions, worst first
+    """
+    return compare_metrics(flatten_report(baseline), flatten_report(current), tolerance)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="ClamUI startup benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="warm runs per command")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--compare", type=Path, help="baseline report to diff against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument("--check", action="store_true", help="fail if a budget is exceeded")
+    gui_group = parser.add_mutually_exclusive_group()
+    gui_group.add_argument("--gui", dest="gui", action="store_true", default=None)
+    gui_group.add_argument("--no-gui", dest="gui", action="store_false")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(runs=args.runs, gui=args.gui)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    status = 0
+    for name, reason in report["skipped"].items():
+        print(f"skipped {name}: {reason}", file=sys.stderr)
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare_reports(baseline, report, args.tolerance):
+            print(f"regression {line}", file=sys.stderr)
+            status = 1
+    if args.check:
+        for line in check_budgets(report, load_budgets()):
+            print(f"over budget {line}", file=sys.stderr)
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+# ClamUI Synthetic Scan Trees
+"""
+Synthetic directory trees for scan-pipeline benchmarks.
+
+Shapes:
+- ``wide``: one level of directories holding ``files_per_dir`` files each.
+- ``deep``: chains ``depth`` directories deep with files at every level, the
+  shape of source checkouts and nested archives unpacked to disk.
+
+With ``exclusion_heavy`` every leaf directory also gets a ``node_modules``
+and a ``.cache`` subdirectory plus ``*.tmp``/``*.log`` files, and
+exclusion_settings() returns a long exclusion list that removes exactly
+those, so walkers spend most of their time matching patterns.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+# Files a scanner should visit; everything else is exclusion-heavy junk
+_TARGET_SUFFIX = ".dat"
+
+# Extra entries per leaf directory in exclusion-heavy trees
+_EXCLUDED_DIRS = ("node_modules", ".cache")
+_EXCLUDED_SUFFIXES = (".tmp", ".log")
+
+# Patterns that never match the synthetic tree but still cost a check each
+_FILLER_PATTERNS = [f"*.bak{i}" for i in range(40)]
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    """Parameters of a synthetic tree."""
+
+    files: int
+    shape: str = "wide"
+    files_per_dir: int = 100
+    depth: int = 24
+    exclusion_heavy: bool = False
+    file_size: int = 64
+
+    @property
+    def name(self) -> str:
+        """Short identifier such as ``wide-10k`` or ``deep-1m-excl``."""
+        if self.files >= 1_000_000 and self.files % 1_000_000 == 0:
+            size = f"{self.files // 1_000_000}m"
+        elif self.files >= 1000 and self.files % 1000 == 0:
+            size = f"{self.files // 1000}k"
+        else:
+            size = str(self.files)
+        return f"{self.shape}-{size}" + ("-excl" if self.exclusion_heavy else "")
+
+
+@dataclass(frozen=True)
+class TreeStats:
+    """What was created; ``files``/``dirs`` count only non-excluded entries."""
+
+    root: str
+    files: int
+    dirs: int
+    excluded_files: int
+    excluded_dirs: int
+
+
+def _leaf_dirs(root: Path, spec: TreeSpec) -> list[tuple[Path, int]]:
+    """Plan (directory, file count) pairs adding up to spec.files."""
+    per_dir = max(1, spec.files_per_dir)
+    if spec.shape == "wide":
+        count = -(-spec.files // per_dir)
+        dirs = [root / f"d{i:05d}" for i in range(count)]
+    elif spec.shape == "deep":
+        levels = max(1, spec.depth)
+        chains = -(-spec.files // (levels * per_dir))
+        dirs = []
+        for chain in range(chains):
+            current = root / f"c{chain:04d}"
+            for level in range(levels):
+                current = current / f"l{level:02d}"
+                dirs.append(current)
+    else:
+        raise ValueError(f"unknown tree shape: {spec.shape}")
+
+    plan = []
+    remaining = spec.files
+    for directory in dirs:
+        if remaining <= 0:
+            break
+        count = min(per_dir, remaining)
+        plan.append((directory, count))
+        remaining -= count
+    return plan
+
+
+def build_tree(root: Path, spec: TreeSpec) -> TreeStats:
+    """
+    Create the tree described by spec under root.
+
+    Args:
+        root: Empty or missing directory to fill
+        spec: Tree parameters
+
+    Returns:
+        Counts of what was created
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    payload = b"X" * spec.file_size
+    files = 0
+    created_dirs: set[Path] = set()
+    excluded_files = excluded_dirs = 0
+
+    for directory, count in _leaf_dirs(root, spec):
+        directory.mkdir(parents=True, exist_ok=True)
+        parent = directory
+        while parent != root and parent not in created_dirs:
+            created_dirs.add(parent)
+            parent = parent.parent
+        for i in range(count):
+            (directory / f"f{i:04d}{_TARGET_SUFFIX}").write_bytes(payload)
+        files += count
+        if spec.exclusion_heavy:
+            for name in _EXCLUDED_DIRS:
+                junk = directory / name
+                junk.mkdir(exist_ok=True)
+                (junk / "index.js").write_bytes(payload)
+                excluded_dirs += 1
+                excluded_files += 1
+            for suffix in _EXCLUDED_SUFFIXES:
+                (directory / f"scratch{suffix}").write_bytes(payload)
+                excluded_files += 1
+
+    return TreeStats(
+        root=str(root),
+        files=files,
+        dirs=len(created_dirs) + 1,
+        excluded_files=excluded_files,
+        excluded_dirs=excluded_dirs,
+    )
+
+
+def exclusion_settings(spec: TreeSpec) -> list[dict]:
+    """
+    Return an ``exclusion_patterns`` setting for the tree.
+
+    Exclusion-heavy trees get the patterns that remove the junk entries plus
+    filler patterns that never match; other trees get none.
+    """
+    if not spec.exclusion_heavy:
+        return []
+    # clamscan matches --exclude-dir against the full path, hence "*/"
+    patterns = [
+        {"pattern": f"*/{name}", "type": "directory", "enabled": True} for name in _EXCLUDED_DIRS
+    ]
+    patterns += [
+        {"pattern": f"*{suffix}", "type": "pattern", "enabled": True}
+        for suffix in _EXCLUDED_SUFFIXES
+    ]
+    patterns += [{"pattern": p, "type": "pattern", "enabled": True} for p in _FILLER_PATTERNS]
+    return patterns
+
+
+def scan_targets(root: Path):
+    """Yield every file under root that a scan with exclusion_settings() visits."""
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in _EXCLUDED_DIRS]
+        for name in files:
+            if name.endswith(_TARGET_SUFFIX):
+                yield os.path.join(current, name)
@@ -0,0 +1,168 @@
+# ClamUI Scan Throughput Benchmark Tests
+"""
+Tests for the synthetic trees, the fake ClamAV tools and the scan benchmark.
+
+The end-to-end benchmark test is marked ``perf``; the rest are fast checks
+that the fakes behave like the real tools where ClamUI depends on it.
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from tests.perf.fake_clamav import THREAT_NAME, FakeClamAV, is_detected
+from tests.perf.scan_bench import build_cases, flatten_report, parse_shape, run_benchmarks
+from tests.perf.synthetic_tree import TreeSpec, build_tree, exclusion_settings, scan_targets
+
+
+@pytest.fixture
+def fake():
+    # Unix socket paths are limited to ~108 bytes; pytest's tmp_path can exceed that
+    root = Path(tempfile.mkdtemp(prefix="cu"))
+    with FakeClamAV(root, detect_ratio=0.05) as clamav:
+        yield clamav
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def _run(fake, *argv):
+    return subprocess.run(
+        [str(fake.bin_dir / argv[0]), *argv[1:]],
+        env={**os.environ, **fake.env},
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+
+class TestSyntheticTree:
+    """Tests for build_tree and scan_targets."""
+
+    @pytest.mark.parametrize("shape", ["wide", "deep"])
+    def test_builds_requested_file_count(self, tmp_path, shape):
+        spec = TreeSpec(files=250, shape=shape, files_per_dir=10, depth=5)
+        stats = build_tree(tmp_path / "tree", spec)
+
+        assert stats.files == 250
+        assert len(list(scan_targets(tmp_path / "tree"))) == 250
+
+    def test_exclusion_heavy_junk_is_not_a_target(self, tmp_path):
+        spec = TreeSpec(files=50, files_per_dir=10, exclusion_heavy=True)
+        stats = build_tree(tmp_path / "tree", spec)
+
+        assert stats.excluded_dirs == 10
+        assert stats.excluded_files == 20
+        assert len(list(scan_targets(tmp_path / "tree"))) == 50
+        assert len(exclusion_settings(spec)) > 40
+        assert exclusion_settings(TreeSpec(files=50)) == []
+
+    def test_names(self):
+        assert TreeSpec(files=10_000).name == "wide-10k"
+        assert parse_shape("deep-excl", 1_000_000).name == "deep-1m-excl"
+        with pytest.raises(ValueError):
+            parse_shape("tall", 10)
+
+
+class TestFakeClamAV:
+    """Tests for the fake clamscan, clamdscan and clamd."""
+
+    def test_clamscan_verbose_output_and_exclusions(self, fake, tmp_path):
+        build_tree(tmp_path / "tree", TreeSpec(files=200, files_per_dir=20, exclusion_heavy=True))
+        targets = sorted(scan_targets(tmp_path / "tree"))
+        expected_found = [path for path in targets if is_detected(path, 0.05)]
+
+        result = _run(
+            fake,
+            "clamscan",
+            "-r",
+            "-v",
+            "--exclude-dir",
+            "^.*/node_modules$",
+            "--exclude-dir",
+            "^.*/\\.cache$",
+            "--exclude",
+            "^.*\\.(tmp|log)$",
+            "--",
+            str(tmp_path / "tree"),
+        )
+
+        lines = result.stdout.splitlines()
+        assert [line[9:] for line in lines if line.startswith("Scanning ")] == targets
+        assert [line for line in lines if line.endswith("FOUND")] == [
+            f"{path}: {THREAT_NAME} FOUND" for path in expected_found
+        ]
+        assert f"Scanned files: {len(targets)}" in lines
+        assert result.returncode == (1 if expected_found else 0)
+
+    def test_clamdscan_ping_and_file_list(self, fake, tmp_path):
+        build_tree(tmp_path / "tree", TreeSpec(files=100, files_per_dir=10))
+        targets = sorted(scan_targets(tmp_path / "tree"))
+        file_list = tmp_path / "list.txt"
+        file_list.write_text("\n".join(targets))
+
+        ping = _run(fake, "clamdscan", "--config-file", fake.config_path, "--ping", "3")
+        scan = _run(
+            fake,
+            "clamdscan",
+            "--config-file",
+            fake.config_path,
+            "--fdpass",
+            "-v",
+            "--file-list",
+            str(file_list),
+        )
+
+        assert ping.stdout.strip() == "PONG"
+        verdicts = [line for line in scan.stdout.splitlines() if line.startswith("/")]
+        assert [line.rsplit(": ", 1)[0] for line in verdicts] == targets
+
+    def test_clamdscan_multiscan_reports_only_detections(self, fake, tmp_path):
+        build_tree(tmp_path / "tree", TreeSpec(files=300, files_per_dir=30))
+        expected = sum(is_detected(p, 0.05) for p in scan_targets(tmp_path / "tree"))
+
+        scan = _run(
+            fake,
+            "clamdscan",
+            "--config-file",
+            fake.config_path,
+            "--multiscan",
+            "--fdpass",
+            "-i",
+            "--",
+            str(tmp_path / "tree"),
+        )
+
+        assert scan.stdout.count(" FOUND") == expected
+        assert f"Infected files: {expected}" in scan.stdout
+
+
+class TestScanBenchReport:
+    """Tests for report flattening."""
+
+    def test_flatten_keeps_compared_metrics(self):
+        report = {"cases": {"daemon-wide-1k": {"wall_ms": 10.0, "files_per_sec": 5, "ok": True}}}
+        assert flatten_report(report) == {"daemon-wide-1k/wall_ms": 10.0}
+
+
+@pytest.mark.perf
+@pytest.mark.slow
+class TestScanThroughput:
+    """Runs the benchmark end to end on a small tree."""
+
+    def test_every_backend_scans_the_whole_tree(self):
+        cases = build_cases([300], ["wide-excl"], ["clamscan", "daemon"], detect_ratio=0.05)
+
+        report = run_benchmarks(cases)
+
+        assert set(report["cases"]) == {case.name for case in cases}
+        for name, entry in report["cases"].items():
+            assert entry["ok"], (name, entry)
+            assert entry["wall_ms"] > 0
+        assert report["cases"]["daemon-wide-300-excl-progress"]["callbacks"] >= 300
+        assert set(report["progress_overhead_ms"]) == {
+            "clamscan-wide-300-excl",
+            "daemon-wide-300-excl",
+        }
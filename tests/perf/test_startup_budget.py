@@ -0,0 +1,137 @@
+# ClamUI Startup Budget Tests
+"""
+Tests for the startup benchmark harness and the startup-time budgets.
+
+The budget test launches real subprocesses; select or skip it with
+``-m perf``. Budgets live in budgets.json.
+"""
+
+import json
+
+import pytest
+
+from tests.perf.startup_bench import (
+    check_budgets,
+    compare_reports,
+    flatten_report,
+    load_budgets,
+    parse_importtime,
+    run_benchmarks,
+)
+
+IMPORTTIME_SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1528 |       9208 | src.cli.profile_cmd
+import time:      4821 |      18669 |   src.core.scanner
+Traceback lines and other stderr are ignored
+"""
+
+
+def _report(**overrides):
+    report = {
+        "commands": {
+            "clamui status": {
+                "returncode": 0,
+                "crashed": False,
+                "stderr_tail": [],
+                "cold_ms": 900.0,
+                "warm_ms": 400.0,
+                "imports": {"src.cli.router": 20.0},
+            }
+        },
+        "gui": {"do_startup_ms": 100.0, "views": {"logs_view": 50.0}},
+        "skipped": {},
+    }
+    report.update(overrides)
+    return report
+
+
+class TestParseImporttime:
+    """Tests for parse_importtime."""
+
+    def test_parses_timings_and_depth(self):
+        timings = parse_importtime(IMPORTTIME_SAMPLE)
+
+        assert set(timings) == {"_io", "src.cli.profile_cmd", "src.core.scanner"}
+        assert timings["src.cli.profile_cmd"].cumulative_ms == pytest.approx(9.208)
+        assert timings["src.cli.profile_cmd"].depth == 0
+        assert timings["src.core.scanner"].self_ms == pytest.approx(4.821)
+        assert timings["src.core.scanner"].depth == 1
+
+
+class TestFlattenReport:
+    """Tests for flatten_report."""
+
+    def test_metric_names(self):
+        assert flatten_report(_report()) == {
+            "commands/clamui status/cold_ms": 900.0,
+            "commands/clamui status/warm_ms": 400.0,
+            "imports/clamui status/src.cli.router": 20.0,
+            "gui/do_startup_ms": 100.0,
+            "gui/views/logs_view": 50.0,
+        }
+
+
+class TestCheckBudgets:
+    """Tests for check_budgets."""
+
+    def test_within_budget(self):
+        assert check_budgets(_report(), {"commands/clamui status/warm_ms": 500}) == []
+
+    def test_over_budget(self):
+        violations = check_budgets(_report(), {"imports/clamui status/src.cli.router": 10})
+        assert violations == ["imports/clamui status/src.cli.router: 20.0 ms > budget 10.0 ms"]
+
+    def test_missing_metric_fails_unless_skipped(self):
+        budgets = {"gui/do_activate_ms": 1000, "commands/clamui --help/warm_ms": 1000}
+
+        assert len(check_budgets(_report(), budgets)) == 2
+        skipped = {"gui": "no display", "clamui --help": "no GTK"}
+        assert check_budgets(_report(gui=None, skipped=skipped), budgets) == []
+
+    def test_crash_is_a_violation(self):
+        report = _report()
+        report["commands"]["clamui status"].update(crashed=True, stderr_tail=["ImportError"])
+        assert check_budgets(report, {}) == ["clamui status: crashed (ImportError)"]
+
+    def test_budget_scale(self, monkeypatch, tmp_path):
+        path = tmp_path / "budgets.json"
+        path.write_text(json.dumps({"budgets": {"gui/do_startup_ms": 100}}))
+        monkeypatch.setenv("CLAMUI_PERF_BUDGET_SCALE", "2.5")
+        assert load_budgets(path) == {"gui/do_startup_ms": 250}
+
+    def test_shipped_budgets_load(self):
+        assert load_budgets()
+
+
+class TestCompareReports:
+    """Tests for compare_reports."""
+
+    def test_reports_regressions_above_tolerance_and_noise(self):
+        current = _report()
+        current["commands"]["clamui status"]["warm_ms"] = 600.0
+        current["commands"]["clamui status"]["imports"]["src.cli.router"] = 24.0
+        current["gui"]["views"]["logs_view"] = 51.0
+
+        regressions = compare_reports(_report(), current, tolerance=0.2)
+
+        # router grew 20 % but only 4 ms; logs_view grew 1 ms
+        assert regressions == ["commands/clamui status/warm_ms: 400.0 -> 600.0 (+200.0)"]
+
+
+@pytest.fixture(scope="module")
+def startup_report():
+    return run_benchmarks(runs=3)
+
+
+@pytest.mark.perf
+@pytest.mark.slow
+class TestStartupBudgets:
+    """Runs the benchmarks and enforces budgets.json."""
+
+    def test_report_is_json(self, startup_report):
+        assert json.loads(json.dumps(startup_report))["commands"]
+
+    def test_within_budgets(self, startup_report):
+        assert check_budgets(startup_report, load_budgets()) == []
@@ -181,6 +181,49 @@ class TestDatabasePageCreation:
         assert adw.PreferencesGroup.call_count >= 3
 
 
+class TestDatabasePageInstalledGroup:
+    """Tests for the Installed Databases group."""
+
+    def test_rows_per_database(self, mock_gi_modules):
+        from src.core.database_inventory import DatabaseFileInfo, DatabaseInventorySnapshot
+        from src.ui.preferences.database_page import DatabasePage
+
+        adw = mock_gi_modules["adw"]
+        group, loading_row = mock.MagicMock(), mock.MagicMock()
+        snapshot = DatabaseInventorySnapshot(
+            files=[
+                DatabaseFileInfo("daily.cld", "/var/lib/clamav/daily.cld", 4096, 27303, 2071380),
+                DatabaseFileInfo("bad.cvd", "/var/lib/clamav/bad.cvd", error="Invalid"),
+            ]
+        )
+        adw.ActionRow.reset_mock()
+
+        assert DatabasePage._populate_installed_group(group, loading_row, snapshot) is False
+
+        group.remove.assert_called_once_with(loading_row)
+        assert group.add.call_count == 2
+        assert adw.ActionRow.call_count == 2
+        rows = [c.args[0] for c in group.add.call_args_list]
+        subtitles = [row.set_subtitle.call_args.args[0] for row in rows]
+        assert "Version 27303" in subtitles[0]
+        assert subtitles[1] == "Invalid"
+
+    def test_empty_inventory_shows_errors(self, mock_gi_modules):
+        from src.core.database_inventory import DatabaseInventorySnapshot
+        from src.ui.preferences.database_page import DatabasePage
+
+        adw = mock_gi_modules["adw"]
+        group = mock.MagicMock()
+        snapshot = DatabaseInventorySnapshot(errors={"/var/lib/clamav": "Permission denied"})
+        adw.ActionRow.reset_mock()
+
+        DatabasePage._populate_installed_group(group, mock.MagicMock(), snapshot)
+
+        group.add.assert_called_once()
+        row = group.add.call_args.args[0]
+        row.set_subtitle.assert_called_once_with("Permission denied")
+
+
 class TestDatabasePagePopulateFields:
     """Tests for DatabasePage.populate_fields() method."""
 
@@ -197,6 +197,41 @@ class TestSettingsPersistence:
         settings_manager.set.assert_called_with("device_auto_scan_auto_quarantine", True)
         _clear_src_modules()
 
+    def test_quick_mode_toggle_saves(self, mock_gi_modules):
+        """Test that the quick scan switch stores the scan mode."""
+        settings_manager = MagicMock()
+        settings_manager.get.return_value = "full"
+
+        from src.ui.preferences.device_scan_page import DeviceScanPage
+
+        instance = DeviceScanPage(settings_manager=settings_manager)
+
+        mock_row = MagicMock()
+        mock_row.get_active.return_value = True
+        instance._on_quick_changed(mock_row, None)
+        settings_manager.set.assert_called_with("device_auto_scan_mode", "quick")
+
+        mock_row.get_active.return_value = False
+        instance._on_quick_changed(mock_row, None)
+        settings_manager.set.assert_called_with("device_auto_scan_mode", "full")
+        _clear_src_modules()
+
+    def test_quick_max_file_change_saves(self, mock_gi_modules):
+        """Test that changing the quick scan file limit saves the setting."""
+        settings_manager = MagicMock()
+        settings_manager.get.return_value = 100
+
+        from src.ui.preferences.device_scan_page import DeviceScanPage
+
+        instance = DeviceScanPage(settings_manager=settings_manager)
+
+        mock_spin = MagicMock()
+        mock_spin.get_value.return_value = 250
+        instance._on_quick_max_file_changed(mock_spin)
+
+        settings_manager.set.assert_called_with("device_auto_scan_quick_max_file_mb", 250)
+        _clear_src_modules()
+
     def test_no_save_without_settings_manager(self, mock_gi_modules):
         """Test that handlers are safe when no settings manager is set."""
         from src.ui.preferences.device_scan_page import DeviceScanPage
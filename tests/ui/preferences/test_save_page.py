@@ -1036,8 +1036,9 @@ class TestSavePageSaveConfigsThread:
                     # Should set values on settings manager
                     assert save_page._settings_manager.set.call_count == len(scheduled_updates)
 
-                    # Should save settings
-                    save_page._settings_manager.save.assert_called_once()
+                    # Should save settings once, through a batch
+                    save_page._settings_manager.batch.assert_called_once()
+                    save_page._settings_manager.save.assert_not_called()
 
     def test_save_configs_thread_enables_scheduler(self, mock_gi_modules, save_page):
         """Test _save_configs_thread enables scheduler when enabled."""
@@ -1146,7 +1147,8 @@ class TestSavePageSaveConfigsThread:
         }
         glib = mock_gi_modules["glib"]
 
-        save_page._settings_manager.save.return_value = False
+        batch = save_page._settings_manager.batch.return_value.__enter__.return_value
+        batch.saved = False
 
         with mock.patch("src.ui.preferences.save_page.backup_config"):
             with mock.patch(
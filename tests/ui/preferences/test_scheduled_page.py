@@ -78,6 +78,7 @@ class TestScheduledPageCreation:
             "targets",
             "skip_on_battery",
             "auto_quarantine",
+            "resident",
         ]
 
         for widget_name in expected_widgets:
@@ -191,6 +192,7 @@ class TestScheduledPagePopulateFields:
             "targets": mock.MagicMock(),
             "skip_on_battery": mock.MagicMock(),
             "auto_quarantine": mock.MagicMock(),
+            "resident": mock.MagicMock(),
         }
 
     def test_populate_fields_with_none_config(self, mock_gi_modules, widgets_dict):
@@ -325,6 +327,14 @@ class TestScheduledPagePopulateFields:
 
         widgets_dict["skip_on_battery"].set_active.assert_called_with(False)
 
+    def test_populate_fields_sets_resident(self, mock_gi_modules, widgets_dict):
+        """Test populate_fields sets the resident scheduler switch."""
+        from src.ui.preferences.scheduled_page import ScheduledPage
+
+        ScheduledPage.populate_fields({"schedule_resident": True}, widgets_dict)
+
+        widgets_dict["resident"].set_active.assert_called_with(True)
+
     def test_populate_fields_sets_auto_quarantine(self, mock_gi_modules, widgets_dict):
         """Test populate_fields sets auto-quarantine correctly."""
         from src.ui.preferences.scheduled_page import ScheduledPage
@@ -390,6 +400,7 @@ class TestScheduledPageCollectData:
             "targets": mock.MagicMock(get_text=lambda: "/home/user"),
             "skip_on_battery": mock.MagicMock(get_active=lambda: True),
             "auto_quarantine": mock.MagicMock(get_active=lambda: False),
+            "resident": mock.MagicMock(get_active=lambda: False),
         }
 
     def test_collect_data_returns_dict(self, mock_gi_modules, widgets_dict):
@@ -575,6 +586,7 @@ class TestScheduledPageCollectData:
         widgets_dict["day_of_month"].get_value = lambda: 20.0
         widgets_dict["skip_on_battery"].get_active = lambda: False
         widgets_dict["auto_quarantine"].get_active = lambda: True
+        widgets_dict["resident"].get_active = lambda: True
 
         result = ScheduledPage.collect_data(widgets_dict)
 
@@ -588,6 +600,7 @@ class TestScheduledPageCollectData:
             "schedule_day_of_month": 20,
             "schedule_skip_on_battery": False,
             "schedule_auto_quarantine": True,
+            "schedule_resident": True,
         }
 
     def test_collect_data_has_all_required_keys(self, mock_gi_modules, widgets_dict):
@@ -605,6 +618,7 @@ class TestScheduledPageCollectData:
             "schedule_day_of_month",
             "schedule_skip_on_battery",
             "schedule_auto_quarantine",
+            "schedule_resident",
         ]
 
         for key in required_keys:
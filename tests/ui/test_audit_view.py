@@ -60,6 +60,7 @@ def _create_view(AuditView):
     view._is_checking = False
     view._destroyed = False
     view._cached_report = None
+    view._audit_changes = []
     view._notification_manager = None
     view._is_first_run = True
     view._initial_load_done = False
@@ -78,6 +79,8 @@ def _create_view(AuditView):
     view._lynis_spinner = MagicMock()
     view._rootkit_spinner = MagicMock()
     view._deep_scan_install_rows = {}
+    view._deep_scan_cancel = {}
+    view._deep_scan_subtitles = {}
     view._deep_scan_results_box = MagicMock()
 
     # Header widgets
@@ -277,9 +280,10 @@ class TestAuditExecutionFlow:
     @patch("src.ui.audit_view.TIER1_CHECKS")
     @patch("src.ui.audit_view.is_binary_installed")
     def test_run_checks_background_runs_all_checks(
-        self, mock_is_installed, mock_tier1, mock_glib, mock_gi_modules
+        self, mock_is_installed, mock_tier1, mock_glib, mock_gi_modules, tmp_path, monkeypatch
     ):
         """Background thread should execute each tier1 check and push updates."""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
         (
             AuditView,
             AuditCategory,
@@ -615,6 +619,22 @@ class TestUpdateSummaryBanner:
         view._summary_banner.set_revealed.assert_called_with(True)
         _clear_src_modules()
 
+    def test_shows_change_count(self, mock_gi_modules):
+        """Banner should mention checks that changed since the previous audit."""
+        AuditView, AuditCategory, _, AuditReport, _, AuditStatus = _import_all(mock_gi_modules)
+        from src.core.audit_cache import AuditChange
+
+        view = _create_view(AuditView)
+        view._audit_changes = [
+            AuditChange(AuditCategory.FIREWALL, "UFW", AuditStatus.PASS, AuditStatus.FAIL)
+        ]
+
+        view._update_summary_banner(_make_report(AuditReport))
+
+        title_arg = view._summary_banner.set_title.call_args[0][0]
+        assert "1 change since last audit" in title_arg
+        _clear_src_modules()
+
 
 class TestDisplayCachedReport:
     """Test _display_cached_report uses cached data."""
@@ -736,7 +756,7 @@ class TestEventHandlers:
         view._on_refresh_clicked(MagicMock())
 
         assert view._cached_report is None
-        view._run_audit.assert_called_once()
+        view._run_audit.assert_called_once_with(force=True)
         _clear_src_modules()
 
     def test_on_refresh_clicked_noop_when_checking(self, mock_gi_modules):
@@ -768,14 +788,20 @@ class TestEventHandlers:
         mock_glib.timeout_add.assert_called_once()
         _clear_src_modules()
 
-    def test_on_run_lynis_noop_when_already_running(self, mock_gi_modules):
+    def test_on_run_lynis_cancels_when_already_running(self, mock_gi_modules):
+        import threading
+
         AuditView, *_ = _import_all(mock_gi_modules)
         view = _create_view(AuditView)
         view._lynis_running = True
+        cancel = threading.Event()
+        view._deep_scan_cancel["lynis"] = cancel
 
+        view._on_run_lynis(MagicMock())
         view._on_run_lynis(MagicMock())
 
-        view._lynis_button.set_sensitive.assert_not_called()
+        assert cancel.is_set()
+        view._lynis_button.set_sensitive.assert_called_once_with(False)
         _clear_src_modules()
 
     def test_on_run_lynis_noop_when_button_is_none(self, mock_gi_modules):
@@ -796,21 +822,28 @@ class TestEventHandlers:
         view._on_run_lynis(MagicMock())
 
         assert view._lynis_running is True
-        view._lynis_button.set_sensitive.assert_called_with(False)
+        assert not view._deep_scan_cancel["lynis"].is_set()
+        view._lynis_button.set_label.assert_called_with("Cancel")
         view._lynis_spinner.set_visible.assert_called_with(True)
         view._lynis_spinner.start.assert_called_once()
         mock_thread.assert_called_once()
         mock_thread.return_value.start.assert_called_once()
         _clear_src_modules()
 
-    def test_on_run_rootkit_noop_when_already_running(self, mock_gi_modules):
+    def test_on_run_rootkit_cancels_when_already_running(self, mock_gi_modules):
+        import threading
+
         AuditView, *_ = _import_all(mock_gi_modules)
         view = _create_view(AuditView)
         view._rootkit_running = True
+        cancel = threading.Event()
+        view._deep_scan_cancel["rootkit"] = cancel
 
+        view._on_run_rootkit(MagicMock())
         view._on_run_rootkit(MagicMock())
 
-        view._rootkit_button.set_sensitive.assert_not_called()
+        assert cancel.is_set()
+        view._rootkit_button.set_sensitive.assert_called_once_with(False)
         _clear_src_modules()
 
     @patch("threading.Thread")
@@ -821,7 +854,8 @@ class TestEventHandlers:
         view._on_run_rootkit(MagicMock())
 
         assert view._rootkit_running is True
-        view._rootkit_button.set_sensitive.assert_called_with(False)
+        assert not view._deep_scan_cancel["rootkit"].is_set()
+        view._rootkit_button.set_label.assert_called_with("Cancel")
         view._rootkit_spinner.set_visible.assert_called_with(True)
         view._rootkit_spinner.start.assert_called_once()
         mock_thread.assert_called_once()
@@ -829,6 +863,36 @@ class TestEventHandlers:
         _clear_src_modules()
 
 
+class TestDeepScanProgress:
+    """Test _on_deep_scan_progress handler."""
+
+    def test_shows_phase_and_finding_count(self, mock_gi_modules):
+        from src.core.system_audit import DeepScanProgress
+
+        (AuditView, _, AuditCheckResult, _, _, AuditStatus) = _import_all(mock_gi_modules)
+        view = _create_view(AuditView)
+        view._lynis_running = True
+        finding = AuditCheckResult(name="Kernel", status=AuditStatus.WARNING, detail="d")
+
+        view._on_deep_scan_progress(DeepScanProgress("Kernel", 2), "lynis")
+        view._lynis_row.set_subtitle.assert_called_with("Kernel")
+
+        view._on_deep_scan_progress(DeepScanProgress("Kernel", 2, [finding] * 2), "lynis")
+        view._lynis_row.set_subtitle.assert_called_with("Kernel — 2 findings so far")
+        _clear_src_modules()
+
+    def test_ignored_after_completion(self, mock_gi_modules):
+        from src.core.system_audit import DeepScanProgress
+
+        AuditView, *_ = _import_all(mock_gi_modules)
+        view = _create_view(AuditView)
+
+        view._on_deep_scan_progress(DeepScanProgress("amd", 1), "rootkit")
+
+        view._rootkit_row.set_subtitle.assert_not_called()
+        _clear_src_modules()
+
+
 class TestDeepScanComplete:
     """Test _on_deep_scan_complete handler."""
 
@@ -843,6 +907,7 @@ class TestDeepScanComplete:
         ) = _import_all(mock_gi_modules)
         view = _create_view(AuditView)
         view._lynis_running = True
+        view._deep_scan_subtitles["lynis"] = "Hardening analysis"
         view._cached_report = _make_report(AuditReport)
         view._show_deep_scan_results = MagicMock()
 
@@ -859,8 +924,10 @@ class TestDeepScanComplete:
 
         assert view._lynis_running is False
         view._lynis_button.set_sensitive.assert_called_with(True)
+        view._lynis_button.set_label.assert_called_with("Run")
         view._lynis_spinner.stop.assert_called_once()
         view._lynis_spinner.set_visible.assert_called_with(False)
+        view._lynis_row.set_subtitle.assert_called_with("Hardening analysis")
         view._show_deep_scan_results.assert_called_once_with(result)
         assert ret is False
         _clear_src_modules()
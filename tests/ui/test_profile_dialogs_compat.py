@@ -68,6 +68,31 @@ class TestProfileDialogCompatibility:
         assert call_kwargs["multiple"] is True
 
 
+class TestProfileDialogPriority:
+    def test_priority_is_stored_in_options(self, profile_dialog_class):
+        dialog = profile_dialog_class()
+        row = MagicMock()
+
+        row.get_selected.return_value = 3
+        dialog._on_priority_changed(row, None)
+        assert dialog.get_profile_data()["options"] == {"priority": "idle"}
+
+        row.get_selected.return_value = 0
+        dialog._on_priority_changed(row, None)
+        assert dialog.get_profile_data()["options"] == {}
+
+    def test_edit_keeps_other_options(self, profile_dialog_class):
+        profile = MagicMock()
+        profile.targets = []
+        profile.exclusions = {}
+        profile.options = {"priority": "low", "memory_max_mb": 2048}
+
+        dialog = profile_dialog_class(profile=profile)
+
+        dialog._priority_row.set_selected.assert_called_with(2)
+        assert dialog.get_profile_data()["options"] == profile.options
+
+
 class TestProfileListDialogCompatibility:
     def test_export_profile_uses_compat_save_dialog(self, profile_list_dialog_class):
         dialog = profile_list_dialog_class(profile_manager=MagicMock())
@@ -97,6 +97,11 @@ def _create_dialog(ScanResultsDialog, scan_result, quarantine_manager=None, sett
     dialog._unquarantined_threats = list(dialog._all_threat_details)
     dialog._quarantine_all_button = None
     dialog._threats_list = None
+    dialog._vt_button = None
+    dialog._vt_client = None
+    dialog._vt_batch = None
+    dialog._vt_labels = {}
+    dialog._vt_results = {}
     dialog._toast_overlay = MagicMock()
     return dialog
 
@@ -462,6 +467,40 @@ class TestThreatRow:
         _clear_src_modules()
 
 
+class TestTimingSection:
+    """Test _create_timing_section."""
+
+    def test_shows_phases_rate_and_stalls(self, mock_gi_modules):
+        ScanResultsDialog, *_ = _import_dialog_module(mock_gi_modules)
+        from src.core.scan_timing import PhaseTiming, ScanTiming, StallPeriod
+
+        timing = ScanTiming(
+            total_seconds=12.0,
+            phases=[PhaseTiming("count", 0.0, 2.0), PhaseTiming("scan", 2.0, 10.0)],
+            stalls=[StallPeriod(4.0, 6.0)],
+            files_scanned=1000,
+            bytes_scanned=10 * 1024 * 1024,
+        )
+        dialog = _create_dialog(ScanResultsDialog, _make_scan_result())
+        expander = MagicMock()
+        mock_gi_modules["adw"].ExpanderRow = MagicMock(return_value=expander)
+        parent = MagicMock()
+
+        with patch.object(dialog, "_create_stat_row") as stat_row:
+            dialog._create_timing_section(parent, timing)
+
+        assert expander.set_subtitle.call_args[0][0] == "Completed in 12.0 s · 100 files/s"
+        rows = [call.args for call in stat_row.call_args_list]
+        assert rows == [
+            ("Counting files:", "2.00 s"),
+            ("Scanning:", "10.00 s"),
+            ("Throughput:", "1.0 MB/s"),
+            ("Stalls:", "1 period without output (6.0 s)"),
+        ]
+        parent.append.assert_called_once()
+        _clear_src_modules()
+
+
 class TestSkippedFilesSection:
     """Test _create_skipped_files_section."""
 
@@ -772,6 +811,93 @@ class TestUpdateQuarantineAllButton:
         _clear_src_modules()
 
 
+class TestVirusTotalCheckAll:
+    """Test the Check All on VirusTotal action."""
+
+    def test_missing_api_key_shows_toast(self, mock_gi_modules):
+        ScanResultsDialog, *_ = _import_dialog_module(mock_gi_modules)
+        threats = [_make_threat("/tmp/file0")]
+        result = _make_scan_result(status_name="INFECTED", infected_count=1, threat_details=threats)
+        dialog = _create_dialog(ScanResultsDialog, result, settings_manager=MagicMock())
+
+        with patch("src.core.keyring_manager.get_api_key", return_value=None):
+            dialog._on_vt_check_all_clicked(MagicMock())
+
+        dialog._toast_overlay.add_toast.assert_called_once()
+        assert dialog._vt_batch is None
+        _clear_src_modules()
+
+    def test_starts_batch_over_unique_paths(self, mock_gi_modules):
+        ScanResultsDialog, *_ = _import_dialog_module(mock_gi_modules)
+        threats = [
+            _make_threat("/tmp/a", threat_name="Eicar-A"),
+            _make_threat("/tmp/a", threat_name="Eicar-B"),
+            _make_threat("/tmp/b"),
+        ]
+        result = _make_scan_result(status_name="INFECTED", infected_count=3, threat_details=threats)
+        dialog = _create_dialog(ScanResultsDialog, result, settings_manager=MagicMock())
+        dialog._vt_button = MagicMock()
+        button = MagicMock()
+
+        with (
+            patch("src.core.keyring_manager.get_api_key", return_value="key"),
+            patch("src.core.virustotal_cache.create_verdict_cache", return_value=None),
+            patch("src.core.virustotal.VirusTotalClient") as mock_client,
+            patch("src.core.virustotal_batch.VirusTotalBatch") as mock_batch,
+        ):
+            dialog._on_vt_check_all_clicked(button)
+
+        mock_client.assert_called_once_with("key", cache=None)
+        assert mock_batch.call_args[0][1] == ["/tmp/a", "/tmp/b"]
+        mock_batch.return_value.start.assert_called_once()
+        button.set_sensitive.assert_called_with(False)
+        _clear_src_modules()
+
+    def test_result_updates_matching_labels(self, mock_gi_modules):
+        ScanResultsDialog, *_ = _import_dialog_module(mock_gi_modules)
+        from src.core.virustotal import VTScanResult, VTScanStatus
+
+        dialog = _create_dialog(ScanResultsDialog, _make_scan_result())
+        label = MagicMock()
+        dialog._vt_labels = {"/tmp/a": [label]}
+        vt_result = VTScanResult(
+            status=VTScanStatus.DETECTED, file_path="/tmp/a", detections=5, total_engines=70
+        )
+
+        assert dialog._on_vt_result(vt_result) is False
+
+        label.set_visible.assert_called_with(True)
+        assert "5/70" in label.set_label.call_args[0][0]
+        assert dialog._vt_results["/tmp/a"] is vt_result
+        _clear_src_modules()
+
+    def test_batch_complete_closes_client(self, mock_gi_modules):
+        ScanResultsDialog, *_ = _import_dialog_module(mock_gi_modules)
+        dialog = _create_dialog(ScanResultsDialog, _make_scan_result())
+        client = MagicMock()
+        dialog._vt_client = client
+        dialog._vt_batch = MagicMock()
+
+        assert dialog._on_vt_batch_complete([]) is False
+
+        client.close.assert_called_once()
+        assert dialog._vt_client is None
+        dialog._toast_overlay.add_toast.assert_called_once()
+        _clear_src_modules()
+
+    def test_close_request_cancels_batch(self, mock_gi_modules):
+        ScanResultsDialog, *_ = _import_dialog_module(mock_gi_modules)
+        dialog = _create_dialog(ScanResultsDialog, _make_scan_result())
+        batch = MagicMock()
+        dialog._vt_client = MagicMock()
+        dialog._vt_batch = batch
+
+        assert dialog._on_close_request(dialog) is False
+
+        batch.cancel.assert_called_once()
+        _clear_src_modules()
+
+
 class TestExport:
     """Test _on_export_clicked and _export_results_to_file."""
 
@@ -2824,6 +2824,72 @@ class TestRunScanAsync:
             mock_thread.start.assert_called_once()
             assert result is False  # Should return False to not repeat
 
+    def test_scheduled_worker_holds_user_slot(self, mock_scan_view):
+        """Test the scan worker runs as a user job in the scan scheduler."""
+        from src.core.scan_scheduler import JobPriority, ScanScheduler
+
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+        seen = []
+        mock_scan_view._selected_paths = ["/home/user/Downloads"]
+        mock_scan_view._scan_worker = lambda: seen.append(scheduler.state().running)
+
+        with mock.patch("src.ui.scan_view.get_scan_scheduler", return_value=scheduler):
+            mock_scan_view._run_scheduled_scan_worker()
+
+        (running,) = seen
+        assert [(job.label, job.priority) for job in running] == [
+            ("/home/user/Downloads", JobPriority.USER)
+        ]
+        assert scheduler.state().running == ()
+
+
+class TestQueueIndicator:
+    """Tests for the background scan queue indicator."""
+
+    def test_hidden_when_idle(self, mock_scan_view):
+        """Test the indicator hides without background work."""
+        from src.core.scan_scheduler import QueueState
+
+        mock_scan_view._queue_label = mock.MagicMock()
+
+        assert mock_scan_view._update_queue_label(QueueState()) is False
+
+        mock_scan_view._queue_label.set_visible.assert_called_once_with(False)
+
+    def test_shows_running_and_waiting_scans(self, mock_scan_view):
+        """Test the indicator counts background scans and lists waiting ones."""
+        from src.core.scan_scheduler import JobPriority, QueueState, ScanJob
+
+        mock_scan_view._queue_label = mock.MagicMock()
+        state = QueueState(
+            running=(
+                ScanJob(label="USB", priority=JobPriority.BACKGROUND),
+                ScanJob(label="/home/user", priority=JobPriority.USER),
+            ),
+            queued=(ScanJob(label="SD card"), ScanJob(label="Backup disk")),
+            limit=1,
+        )
+
+        mock_scan_view._update_queue_label(state)
+
+        label = mock_scan_view._queue_label.set_label.call_args.args[0]
+        assert "1 background scan running" in label
+        assert "2 waiting" in label
+        mock_scan_view._queue_label.set_tooltip_text.assert_called_once_with("SD card\nBackup disk")
+        mock_scan_view._queue_label.set_visible.assert_called_once_with(True)
+
+    def test_cleanup_removes_scheduler_listener(self, mock_scan_view):
+        """Test a disposed view no longer receives queue updates."""
+        from src.core.scan_scheduler import ScanScheduler
+
+        scheduler = ScanScheduler(limit_provider=lambda: 1)
+        scheduler.add_listener(mock_scan_view._on_scan_queue_changed)
+
+        with mock.patch("src.ui.scan_view.get_scan_scheduler", return_value=scheduler):
+            mock_scan_view.cleanup()
+
+        assert scheduler._listeners == []
+
 
 class TestDropWithValidationErrors:
     """Tests for drop handling with validation errors."""
@@ -1004,6 +1004,72 @@ class TestUpdateViewUpdateFlow:
             banner.set_revealed.assert_called_once_with(False)
 
 
+# =============================================================================
+# Per-Database Progress Tests
+# =============================================================================
+
+
+class TestUpdateViewDatabaseProgress:
+    """Tests for per-database progress lines during an update."""
+
+    def _view(self, update_view_module):
+        with mock.patch.object(update_view_module.UpdateView, "_setup_ui"):
+            view = update_view_module.UpdateView()
+        view._results_text = mock.MagicMock()
+        view._is_updating = True
+        view._update_intro = "Updating virus database..."
+        return view
+
+    def test_progress_lines_follow_intro(self, update_view_module):
+        """Test each database keeps one line, replaced by its latest event."""
+        from src.core.freshclam_progress import DatabaseProgress, DatabaseStage, DownloadKind
+
+        view = self._view(update_view_module)
+        view._on_update_progress(
+            DatabaseProgress("daily", DatabaseStage.DOWNLOADING, DownloadKind.CDIFF, 512, 1024, 512)
+        )
+        view._on_update_progress(DatabaseProgress("main", DatabaseStage.UP_TO_DATE))
+        result = view._on_update_progress(
+            DatabaseProgress("daily", DatabaseStage.UPDATED, DownloadKind.CDIFF, 0, None, 2048)
+        )
+
+        assert result is False
+        text = view._results_text.get_buffer.return_value.set_text.call_args[0][0]
+        assert text == (
+            "Updating virus database...\n\ndaily: updated (2.0 KB downloaded)\nmain: up to date"
+        )
+
+    def test_download_line_shows_percentage(self, update_view_module):
+        """Test a download event shows the transfer percentage and size."""
+        from src.core.freshclam_progress import DatabaseProgress, DatabaseStage, DownloadKind
+
+        line = update_view_module.UpdateView._format_database_progress(
+            DatabaseProgress("daily", DatabaseStage.DOWNLOADING, DownloadKind.FULL, 512, 1024)
+        )
+        assert line == "daily: downloading full database, 50% of 1.0 KB"
+
+    def test_progress_after_completion_is_ignored(self, update_view_module):
+        """Test late progress events do not overwrite the final results."""
+        from src.core.freshclam_progress import DatabaseProgress, DatabaseStage
+
+        view = self._view(update_view_module)
+        view._is_updating = False
+        view._on_update_progress(DatabaseProgress("daily", DatabaseStage.TESTING))
+
+        view._results_text.get_buffer.assert_not_called()
+
+    def test_start_update_passes_progress_callback(self, update_view_module):
+        """Test the update is started with the view's progress handler."""
+        view = self._view(update_view_module)
+        view._status_banner = mock.MagicMock()
+        view._updater = mock.MagicMock()
+        with mock.patch.object(view, "_set_updating_state"):
+            view._start_update(force=False)
+
+        kwargs = view._updater.update_async.call_args.kwargs
+        assert kwargs["progress_callback"] == view._on_update_progress
+
+
 # =============================================================================
 # Property Access Tests
 # =============================================================================
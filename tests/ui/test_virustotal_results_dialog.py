@@ -30,6 +30,7 @@ def mock_vt_result():
     result.total = 72
     result.scan_date = "2024-01-15T10:30:00Z"
     result.permalink = "https://www.virustotal.com/gui/file/abc123"
+    result.cached_at = None
     result.detection_details = [
         {"engine": "Engine1", "category": "malware", "result": "Trojan.Generic"},
         {"engine": "Engine2", "category": "malware", "result": "Malware.Agent"},
@@ -48,6 +49,7 @@ def mock_vt_result_minimal():
     result.total = 0
     result.scan_date = None
     result.permalink = None
+    result.cached_at = None
     result.detection_details = []
     return result
 
@@ -378,6 +380,7 @@ def _make_raw_dialog(dialog_class, **overrides):
     dialog._vt_result.file_path = overrides.get("file_path", "/test/file.exe")
     dialog._vt_result.sha256 = overrides.get("sha256", "a" * 64)
     dialog._vt_result.error_message = overrides.get("error_message")
+    dialog._vt_result.cached_at = overrides.get("cached_at")
     dialog._displayed_detection_count = 0
     dialog._all_detections = overrides.get("all_detections", [])
     dialog._load_more_row = None
@@ -491,6 +494,21 @@ class TestSummarySection:
         dialog._create_summary_section(parent)
         assert len(rows) == 1
 
+    def test_cached_row_added_for_cached_result(self, dialog_class, mock_gi_modules):
+        """Test a cache row is created when the verdict came from the local cache."""
+        dialog = _make_raw_dialog(
+            dialog_class, scan_date=None, cached_at="2024-01-15T10:00:00+00:00"
+        )
+        parent = mock.MagicMock()
+        rows = []
+        mock_gi_modules["adw"].ActionRow.side_effect = lambda *a, **kw: (
+            rows.append(mock.MagicMock()) or rows[-1]
+        )
+        dialog._create_summary_section(parent)
+        # 2 rows: status + cache
+        assert len(rows) == 2
+        assert "2024-01-15 10:00:00" in rows[1].set_subtitle.call_args[0][0]
+
     def test_error_status_falls_to_default_branch(self, dialog_class, mock_gi_modules):
         """Test unknown/ERROR status uses the else branch."""
         dialog = _make_raw_dialog(dialog_class, status_name="ERROR", error_message="Unknown error")